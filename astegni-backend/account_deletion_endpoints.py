@@ -19,7 +19,6 @@ On login:
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, timedelta
@@ -27,18 +26,17 @@ from dotenv import load_dotenv
 import json
 import bcrypt
 import psycopg
-import jwt
+from db_pool import pooled_connect
+from auth import get_current_user_dict
 import os
 import secrets
 from email_service import email_service
+from user_context_cache import invalidate_user_context
 
 load_dotenv()
 DATABASE_URL = os.getenv('DATABASE_URL')
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 router = APIRouter(prefix="/api/account", tags=["Account Deletion"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # ==================== DATABASE CONNECTION ====================
 
@@ -47,50 +45,8 @@ def get_db_connection():
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise HTTPException(status_code=500, detail="Database URL not configured")
-    return psycopg.connect(database_url)
+    return pooled_connect(database_url)
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current user from JWT token"""
-    credentials_exception = HTTPException(
-        status_code=401,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        # Decode JWT token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-
-        if user_id is None:
-            raise credentials_exception
-
-        # Convert to integer
-        user_id = int(user_id)
-
-        # Get user from database
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT id, email, first_name, father_name FROM users WHERE id = %s", (user_id,))
-            user = cursor.fetchone()
-
-            if not user:
-                raise credentials_exception
-
-            return {
-                "id": user[0],
-                "email": user[1],
-                "first_name": user[2],
-                "father_name": user[3]
-            }
-        finally:
-            cursor.close()
-            conn.close()
-
-    except jwt.PyJWTError:
-        raise credentials_exception
 
 # Profile table mapping for each role.
 # NOTE: 'advertiser' is intentionally absent — advertiser accounts are a separate
@@ -121,7 +77,7 @@ def _cleanup_advertiser_db(user_id: int):
     """
     adv_conn = None
     try:
-        adv_conn = psycopg.connect(ADVERTISER_DATABASE_URL)
+        adv_conn = pooled_connect(ADVERTISER_DATABASE_URL)
         adv_cursor = adv_conn.cursor()
         try:
             adv_cursor.execute(
@@ -187,7 +143,7 @@ def generate_otp() -> str:
 # ==================== ENDPOINTS ====================
 
 @router.post("/delete/send-otp")
-async def send_deletion_otp(current_user: dict = Depends(get_current_user)):
+def send_deletion_otp(current_user: dict = Depends(get_current_user_dict)):
     """
     Send OTP to user's email for account deletion verification
     """
@@ -250,7 +206,7 @@ async def send_deletion_otp(current_user: dict = Depends(get_current_user)):
 
 
 @router.post("/restore/send-otp")
-async def send_restoration_otp(email: str):
+def send_restoration_otp(email: str):
     """
     Send OTP to user's email for account restoration verification
     This endpoint does NOT require authentication (user can't log in yet)
@@ -335,7 +291,7 @@ async def send_restoration_otp(email: str):
 
 
 @router.get("/delete/reasons")
-async def get_deletion_reasons():
+def get_deletion_reasons():
     """
     Get list of available deletion reasons for the UI
     """
@@ -368,7 +324,7 @@ async def get_deletion_reasons():
 
 
 @router.get("/delete/status")
-async def get_deletion_status(current_user: dict = Depends(get_current_user)):
+def get_deletion_status(current_user: dict = Depends(get_current_user_dict)):
     """
     Check if user has a pending account deletion request
     """
@@ -418,10 +374,10 @@ async def get_deletion_status(current_user: dict = Depends(get_current_user)):
 
 
 @router.post("/delete/initiate")
-async def initiate_account_deletion(
+def initiate_account_deletion(
     request_data: DeletionInitiateRequest,
     request: Request,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Initiate complete account deletion process
@@ -562,6 +518,7 @@ async def initiate_account_deletion(
             """, (reason, current_month))
 
         conn.commit()
+        invalidate_user_context(current_user["id"])
 
         return {
             "success": True,
@@ -588,7 +545,7 @@ async def initiate_account_deletion(
 
 
 @router.post("/delete/cancel")
-async def cancel_account_deletion(current_user: dict = Depends(get_current_user)):
+def cancel_account_deletion(current_user: dict = Depends(get_current_user_dict)):
     """
     Cancel a pending account deletion request
 
@@ -632,6 +589,7 @@ async def cancel_account_deletion(current_user: dict = Depends(get_current_user)
         """, (current_user["id"],))
 
         conn.commit()
+        invalidate_user_context(current_user["id"])
 
         return {
             "success": True,
@@ -700,6 +658,7 @@ def restore_account_on_login(user_id: int, conn=None):
         """, (user_id,))
 
         conn.commit()
+        invalidate_user_context(user_id)
         return True
 
     except Exception as e:
@@ -760,6 +719,7 @@ def process_expired_deletions():
                 # the advertiser portal.)
                 cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
                 conn.commit()
+                invalidate_user_context(user_id)
                 deleted_count += 1
                 print(f"Permanently deleted user {user_id} ({email})")
 
@@ -784,7 +744,7 @@ def process_expired_deletions():
 # ==================== ANALYTICS ENDPOINTS ====================
 
 @router.get("/delete/stats")
-async def get_deletion_stats(current_user: dict = Depends(get_current_user)):
+def get_deletion_stats(current_user: dict = Depends(get_current_user_dict)):
     """
     Get deletion statistics (admin only)
     """
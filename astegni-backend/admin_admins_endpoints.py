@@ -14,6 +14,7 @@ from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Depends, Header
 from pydantic import BaseModel
 import psycopg
+from db_pool import pooled_connect
 from psycopg.types.json import Json
 from dotenv import load_dotenv
 import jwt
@@ -84,7 +85,7 @@ def parse_database_url(database_url):
 def get_admin_db_connection():
     """Get admin database connection (astegni_admin_db)"""
     params = parse_database_url(ADMIN_DATABASE_URL)
-    return psycopg.connect(**params)
+    return pooled_connect(**params)
 
 def get_admin_id_from_token(authorization: str):
     """Extract admin_id from JWT token"""
@@ -190,7 +191,7 @@ async def get_admin_admins_profile(admin_id: int):
         raise HTTPException(status_code=500, detail=f"Failed to fetch admin profile: {str(e)}")
 
 @router.get("/profile/by-email/{email}")
-async def get_admin_admins_profile_by_email(email: str):
+def get_admin_admins_profile_by_email(email: str):
     """
     Get admin profile with admins profile data by email from astegni_admin_db
     """
@@ -425,7 +426,7 @@ async def get_admin_reviews(admin_id: int, limit: int = 10):
         raise HTTPException(status_code=500, detail=f"Failed to fetch admin reviews: {str(e)}")
 
 @router.get("/reviews/by-email/{email}")
-async def get_admin_reviews_by_email(email: str, limit: int = 10):
+def get_admin_reviews_by_email(email: str, limit: int = 10):
     """Get admin reviews by email from admin_reviews table"""
     try:
         conn = get_admin_db_connection()
@@ -483,7 +484,7 @@ async def get_admin_reviews_by_email(email: str, limit: int = 10):
         raise HTTPException(status_code=500, detail=f"Failed to fetch admin reviews: {str(e)}")
 
 @router.get("/reviews/stats/{admin_id}")
-async def get_admin_review_stats(admin_id: int):
+def get_admin_review_stats(admin_id: int):
     """Get admin review statistics from admin_reviews table"""
     try:
         conn = get_admin_db_connection()
@@ -540,7 +541,7 @@ async def upload_cover_picture(authorization: str = Header(None)):
 # ============================================
 
 @router.get("/stats")
-async def get_admin_stats():
+def get_admin_stats():
     """Get admin statistics for dashboard"""
     try:
         conn = get_admin_db_connection()
@@ -28,6 +28,7 @@ Relationships:
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 import os
@@ -58,15 +59,15 @@ ADVERTISER_DATABASE_URL = os.getenv(
 
 def get_user_db():
     """Get user database connection (users table only)"""
-    return psycopg.connect(USER_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(USER_DATABASE_URL, row_factory=dict_row)
 
 def get_admin_db():
     """Get admin database connection (brand_packages)"""
-    return psycopg.connect(ADMIN_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADMIN_DATABASE_URL, row_factory=dict_row)
 
 def get_adv_db():
     """Get advertiser database connection (all advertiser tables)"""
-    return psycopg.connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
 
 
 def _fetch_users_by_ids(user_ids):
@@ -106,7 +107,7 @@ def _full_name(u):
 # ============================================================
 
 @router.get("/brands")
-async def get_brands(
+def get_brands(
     status: Optional[str] = None,
     search: Optional[str] = None,
     page: int = Query(default=1, ge=1),
@@ -202,7 +203,7 @@ async def get_brands(
 
 
 @router.get("/brands/{brand_id}")
-async def get_brand(brand_id: int):
+def get_brand(brand_id: int):
     """Get specific brand by ID.
     Post-restructure JOIN chain:
       brand_profile.company_id -> company_profile.id
@@ -274,7 +275,7 @@ async def get_brand(brand_id: int):
 # ============================================================
 
 @router.get("/campaigns")
-async def get_campaigns(
+def get_campaigns(
     status: Optional[str] = None,
     brand_id: Optional[int] = None,
     search: Optional[str] = None,
@@ -435,7 +436,7 @@ async def get_campaigns(
 
 
 @router.get("/campaigns/counts")
-async def get_campaign_counts():
+def get_campaign_counts():
     """Get campaign counts by status"""
     try:
         with get_adv_db() as conn:
@@ -461,7 +462,7 @@ async def get_campaign_counts():
 
 
 @router.post("/campaigns/{campaign_id}/verify")
-async def verify_campaign(campaign_id: int, admin_id: Optional[int] = None):
+def verify_campaign(campaign_id: int, admin_id: Optional[int] = None):
     """Verify a campaign"""
     try:
         with get_adv_db() as conn:
@@ -490,7 +491,7 @@ async def verify_campaign(campaign_id: int, admin_id: Optional[int] = None):
 
 
 @router.post("/campaigns/{campaign_id}/reject")
-async def reject_campaign(campaign_id: int, data: dict):
+def reject_campaign(campaign_id: int, data: dict):
     """Reject a campaign"""
     try:
         reason = data.get('reason', 'No reason provided')
@@ -519,7 +520,7 @@ async def reject_campaign(campaign_id: int, data: dict):
 
 
 @router.post("/campaigns/{campaign_id}/suspend")
-async def suspend_campaign(campaign_id: int, data: dict):
+def suspend_campaign(campaign_id: int, data: dict):
     """Suspend a campaign"""
     try:
         reason = data.get('reason', 'No reason provided')
@@ -547,7 +548,7 @@ async def suspend_campaign(campaign_id: int, data: dict):
 
 
 @router.post("/campaigns/{campaign_id}/restore")
-async def restore_campaign(campaign_id: int):
+def restore_campaign(campaign_id: int):
     """Restore a suspended/rejected campaign to pending"""
     try:
         with get_adv_db() as conn:
@@ -573,7 +574,7 @@ async def restore_campaign(campaign_id: int):
 
 
 @router.post("/campaigns/{campaign_id}/reinstate")
-async def reinstate_campaign(campaign_id: int):
+def reinstate_campaign(campaign_id: int):
     """Reinstate a suspended campaign to verified status"""
     try:
         with get_adv_db() as conn:
@@ -606,7 +607,7 @@ async def reinstate_campaign(campaign_id: int):
 # ============================================================
 
 @router.get("/recent/brands")
-async def get_recent_brands(limit: int = Query(default=5, le=20)):
+def get_recent_brands(limit: int = Query(default=5, le=20)):
     """Get most recent brand submissions.
     Post-restructure JOIN via brand_profile.company_id -> company_profile."""
     try:
@@ -639,7 +640,7 @@ async def get_recent_brands(limit: int = Query(default=5, le=20)):
 
 
 @router.get("/recent/campaigns")
-async def get_recent_campaigns(limit: int = Query(default=5, le=20)):
+def get_recent_campaigns(limit: int = Query(default=5, le=20)):
     """Get most recent campaign submissions with brand names.
     Joins with brand_profile using brand_id (proper foreign key relationship)"""
     try:
@@ -691,7 +692,7 @@ async def get_recent_campaigns(limit: int = Query(default=5, le=20)):
 # ============================================================
 
 @router.get("/stats")
-async def get_advertiser_stats():
+def get_advertiser_stats():
     """Get combined stats for brands and campaigns"""
     try:
         with get_adv_db() as conn:
@@ -867,7 +868,7 @@ async def get_advertisers_profile_by_email(email: str):
 
 
 @router.put("/profile/{admin_id}")
-async def update_advertisers_profile(admin_id: int, data: dict):
+def update_advertisers_profile(admin_id: int, data: dict):
     """
     Update admin profile (both admin_profile and manage_advertisers_profile)
     """
@@ -972,7 +973,7 @@ async def update_advertisers_profile(admin_id: int, data: dict):
 
 
 @router.get("/reviews/by-email/{email}")
-async def get_advertisers_reviews_by_email(email: str):
+def get_advertisers_reviews_by_email(email: str):
     """Get admin reviews by email address"""
     try:
         with get_admin_db() as conn:
@@ -1026,7 +1027,7 @@ async def get_advertisers_reviews_by_email(email: str):
 # ============================================================
 
 @router.get("/campaigns/{campaign_id}")
-async def get_campaign_details(campaign_id: int):
+def get_campaign_details(campaign_id: int):
     """
     Get detailed campaign information for admin view modal
     Fetches from campaign_profile and brand_profile tables
@@ -1172,7 +1173,7 @@ async def get_campaign_details(campaign_id: int):
 
 
 @router.get("/campaigns/{campaign_id}/media")
-async def get_campaign_media(campaign_id: int):
+def get_campaign_media(campaign_id: int):
     """
     Get all media (images and videos) for a campaign
     Fetches from campaign_media table
@@ -1252,7 +1253,7 @@ async def get_campaign_media(campaign_id: int):
 # suspend, restore, reinstate.
 
 @router.get("/companies")
-async def admin_get_companies(
+def admin_get_companies(
     status: Optional[str] = None,
     search: Optional[str] = None,
     page: int = Query(default=1, ge=1),
@@ -1360,7 +1361,7 @@ async def admin_get_companies(
 
 
 @router.get("/companies/counts")
-async def admin_get_company_counts():
+def admin_get_company_counts():
     """Count companies by verification status (for admin dashboard tiles)."""
     try:
         with get_adv_db() as conn:
@@ -1386,7 +1387,7 @@ async def admin_get_company_counts():
 
 
 @router.get("/companies/{company_id}")
-async def admin_get_company(company_id: int):
+def admin_get_company(company_id: int):
     """Get full details for one company, including its brand + campaign counts."""
     try:
         with get_adv_db() as conn:
@@ -1456,7 +1457,7 @@ async def admin_get_company(company_id: int):
 
 
 @router.post("/companies/{company_id}/verify")
-async def admin_verify_company(company_id: int, admin_id: Optional[int] = None):
+def admin_verify_company(company_id: int, admin_id: Optional[int] = None):
     """Approve a company's KYC submission."""
     try:
         with get_adv_db() as conn:
@@ -1486,7 +1487,7 @@ async def admin_verify_company(company_id: int, admin_id: Optional[int] = None):
 
 
 @router.post("/companies/{company_id}/reject")
-async def admin_reject_company(company_id: int, data: dict):
+def admin_reject_company(company_id: int, data: dict):
     """Reject a company's KYC submission with a reason."""
     try:
         reason = data.get('reason', 'No reason provided')
@@ -1515,7 +1516,7 @@ async def admin_reject_company(company_id: int, data: dict):
 
 
 @router.post("/companies/{company_id}/suspend")
-async def admin_suspend_company(company_id: int, data: dict):
+def admin_suspend_company(company_id: int, data: dict):
     """Suspend a previously-verified company (e.g. policy violation)."""
     try:
         reason = data.get('reason', 'No reason provided')
@@ -1543,7 +1544,7 @@ async def admin_suspend_company(company_id: int, data: dict):
 
 
 @router.post("/companies/{company_id}/restore")
-async def admin_restore_company(company_id: int):
+def admin_restore_company(company_id: int):
     """Restore a suspended/rejected company to pending so it can be re-reviewed."""
     try:
         with get_adv_db() as conn:
@@ -1569,7 +1570,7 @@ async def admin_restore_company(company_id: int):
 
 
 @router.post("/companies/{company_id}/reinstate")
-async def admin_reinstate_company(company_id: int):
+def admin_reinstate_company(company_id: int):
     """Reinstate a suspended company back to verified (e.g. after appeal)."""
     try:
         with get_adv_db() as conn:
@@ -1605,7 +1606,7 @@ async def admin_reinstate_company(company_id: int):
 # ============================================================================
 
 @router.get("/person-kyc")
-async def list_person_kyc(status: Optional[str] = "manual_review", admin_id: Optional[int] = None):
+def list_person_kyc(status: Optional[str] = "manual_review", admin_id: Optional[int] = None):
     """List advertiser person-KYC verifications needing manual review."""
     try:
         with get_adv_db() as conn:
@@ -1652,7 +1653,7 @@ async def list_person_kyc(status: Optional[str] = "manual_review", admin_id: Opt
 
 
 @router.post("/person-kyc/{verification_id}/verify")
-async def admin_verify_person_kyc(verification_id: int, admin_id: Optional[int] = None):
+def admin_verify_person_kyc(verification_id: int, admin_id: Optional[int] = None):
     """Manually approve an advertiser's person-KYC and flip person_verified."""
     try:
         with get_adv_db() as conn:
@@ -1685,7 +1686,7 @@ async def admin_verify_person_kyc(verification_id: int, admin_id: Optional[int]
 
 
 @router.post("/person-kyc/{verification_id}/reject")
-async def admin_reject_person_kyc(verification_id: int, data: dict, admin_id: Optional[int] = None):
+def admin_reject_person_kyc(verification_id: int, data: dict, admin_id: Optional[int] = None):
     """Manually reject an advertiser's person-KYC with a reason."""
     try:
         reason = (data or {}).get('reason') or 'Rejected by admin'
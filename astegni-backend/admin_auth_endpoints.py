@@ -13,6 +13,7 @@ from pydantic import BaseModel, EmailStr
 from typing import Optional, List
 from datetime import timedelta
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 import os
 import jwt
@@ -85,7 +86,7 @@ class AccessCheckResponse(BaseModel):
 
 def get_connection():
     """Get admin database connection (astegni_admin_db)"""
-    return psycopg.connect(ADMIN_DATABASE_URL)
+    return pooled_connect(ADMIN_DATABASE_URL)
 
 def save_otp_to_table(cursor, admin_id: int, contact: str, otp_code: str, purpose: str, expires_at):
     """Save OTP to otps table"""
@@ -200,7 +201,7 @@ def get_current_admin(authorization: str = Header(None, alias="Authorization")):
 # ============================================
 
 @router.post("/login")
-async def admin_login(request: AdminLoginRequest):
+def admin_login(request: AdminLoginRequest):
     """
     Admin login - returns access token with ALL departments
 
@@ -293,7 +294,7 @@ class AdminRefreshRequest(BaseModel):
 
 
 @router.post("/refresh-token")
-async def admin_refresh_token(request: AdminRefreshRequest):
+def admin_refresh_token(request: AdminRefreshRequest):
     """Exchange a valid admin refresh token for a fresh access token.
 
     Lets the admin UI silently renew the 30-min access token in the background
@@ -345,7 +346,7 @@ async def admin_refresh_token(request: AdminRefreshRequest):
 # ============================================
 
 @router.post("/check-access", response_model=AccessCheckResponse)
-async def check_page_access(
+def check_page_access(
     request: AccessCheckRequest,
     authorization: str = Header(None)
 ):
@@ -408,7 +409,7 @@ async def check_page_access(
 # ============================================
 
 @router.get("/my-accessible-pages")
-async def get_accessible_pages(authorization: str = Header(None)):
+def get_accessible_pages(authorization: str = Header(None)):
     """
     Get list of ALL pages accessible to the current admin based on ALL their departments
     """
@@ -453,7 +454,7 @@ async def get_accessible_pages(authorization: str = Header(None)):
 # ============================================
 
 @router.get("/my-departments")
-async def get_my_departments(authorization: str = Header(None)):
+def get_my_departments(authorization: str = Header(None)):
     """
     Get detailed information about all departments admin has access to
     """
@@ -515,7 +516,7 @@ async def get_my_departments(authorization: str = Header(None)):
 # ============================================
 
 @router.post("/send-otp-current-email")
-async def send_otp_current_email(
+def send_otp_current_email(
     request: dict,
     authorization: str = Header(None)
 ):
@@ -603,7 +604,7 @@ async def send_otp_current_email(
             conn.close()
 
 @router.post("/verify-otp-current-email")
-async def verify_otp_current_email(
+def verify_otp_current_email(
     request: dict,
     authorization: str = Header(None)
 ):
@@ -669,7 +670,7 @@ async def verify_otp_current_email(
             conn.close()
 
 @router.post("/send-otp-email-change")
-async def send_admin_email_change_otp(
+def send_admin_email_change_otp(
     request: dict,
     authorization: str = Header(None)
 ):
@@ -753,7 +754,7 @@ async def send_admin_email_change_otp(
             conn.close()
 
 @router.post("/verify-otp-email-change")
-async def verify_admin_email_change_otp(
+def verify_admin_email_change_otp(
     request: dict,
     authorization: str = Header(None)
 ):
@@ -12,6 +12,7 @@ from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Depends, status, Header
 from pydantic import BaseModel
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 import jwt
 
@@ -74,12 +75,12 @@ def parse_database_url(database_url):
 def get_admin_db_connection():
     """Get admin database connection (astegni_admin_db)"""
     params = parse_database_url(ADMIN_DATABASE_URL)
-    return psycopg.connect(**params)
+    return pooled_connect(**params)
 
 def get_user_db_connection():
     """Get user database connection (astegni_user_db)"""
     params = parse_database_url(USER_DATABASE_URL)
-    return psycopg.connect(**params)
+    return pooled_connect(**params)
 
 def get_admin_id_from_token(authorization: str):
     """Extract admin_id from JWT token"""
@@ -98,7 +99,7 @@ def get_admin_id_from_token(authorization: str):
 # ============================================
 
 @router.get("/profile/{admin_id}")
-async def get_admin_courses_profile(admin_id: int):
+def get_admin_courses_profile(admin_id: int):
     """
     Get admin profile with courses profile data from astegni_admin_db
 
@@ -185,7 +186,7 @@ async def get_admin_courses_profile(admin_id: int):
         raise HTTPException(status_code=500, detail=f"Failed to fetch admin profile: {str(e)}")
 
 @router.get("/profile/by-email/{email}")
-async def get_admin_courses_profile_by_email(email: str):
+def get_admin_courses_profile_by_email(email: str):
     """
     Get admin profile with courses profile data by email from astegni_admin_db
     """
@@ -319,7 +320,7 @@ async def get_admin_reviews(admin_id: int, limit: int = 10):
         raise HTTPException(status_code=500, detail=f"Failed to fetch admin reviews: {str(e)}")
 
 @router.get("/reviews/stats/{admin_id}")
-async def get_admin_review_stats(admin_id: int):
+def get_admin_review_stats(admin_id: int):
     """Get admin review statistics from astegni_admin_db"""
     try:
         conn = get_admin_db_connection()
@@ -355,7 +356,7 @@ async def get_admin_review_stats(admin_id: int):
 # ============================================
 
 @router.get("/pending")
-async def get_pending_courses():
+def get_pending_courses():
     """Get all pending courses from astegni_user_db courses table"""
     try:
         conn = get_user_db_connection()
@@ -414,7 +415,7 @@ async def get_pending_courses():
         raise HTTPException(status_code=500, detail=f"Failed to fetch pending courses: {str(e)}")
 
 @router.get("/verified")
-async def get_verified_courses():
+def get_verified_courses():
     """Get all verified/active courses from astegni_user_db courses table"""
     try:
         conn = get_user_db_connection()
@@ -474,7 +475,7 @@ async def get_verified_courses():
         raise HTTPException(status_code=500, detail=f"Failed to fetch verified courses: {str(e)}")
 
 @router.get("/rejected")
-async def get_rejected_courses():
+def get_rejected_courses():
     """Get all rejected courses from astegni_user_db courses table"""
     try:
         conn = get_user_db_connection()
@@ -533,7 +534,7 @@ async def get_rejected_courses():
         raise HTTPException(status_code=500, detail=f"Failed to fetch rejected courses: {str(e)}")
 
 @router.get("/suspended")
-async def get_suspended_courses():
+def get_suspended_courses():
     """Get all suspended courses from astegni_user_db courses table"""
     try:
         conn = get_user_db_connection()
@@ -596,7 +597,7 @@ async def get_suspended_courses():
 # ============================================
 
 @router.get("/stats")
-async def get_course_statistics():
+def get_course_statistics():
     """Get course statistics grouped by status from astegni_user_db"""
     try:
         conn = get_user_db_connection()
@@ -637,7 +638,7 @@ async def get_course_statistics():
         raise HTTPException(status_code=500, detail=f"Failed to fetch course stats: {str(e)}")
 
 @router.get("/stats/by-status")
-async def get_courses_stats_by_status():
+def get_courses_stats_by_status():
     """Get detailed course statistics by status for dashboard"""
     try:
         conn = get_user_db_connection()
@@ -687,7 +688,7 @@ async def get_courses_stats_by_status():
 # ============================================
 
 @router.post("/{course_id}/verify")
-async def verify_course(course_id: int, authorization: str = Header(None)):
+def verify_course(course_id: int, authorization: str = Header(None)):
     """Verify/approve a pending course"""
     try:
         admin_id = get_admin_id_from_token(authorization)
@@ -735,7 +736,7 @@ async def verify_course(course_id: int, authorization: str = Header(None)):
         raise HTTPException(status_code=500, detail=f"Failed to verify course: {str(e)}")
 
 @router.post("/{course_id}/reject")
-async def reject_course(course_id: int, rejection: StatusUpdateRequest, authorization: str = Header(None)):
+def reject_course(course_id: int, rejection: StatusUpdateRequest, authorization: str = Header(None)):
     """Reject a course"""
     try:
         admin_id = get_admin_id_from_token(authorization)
@@ -776,7 +777,7 @@ async def reject_course(course_id: int, rejection: StatusUpdateRequest, authoriz
         raise HTTPException(status_code=500, detail=f"Failed to reject course: {str(e)}")
 
 @router.post("/{course_id}/suspend")
-async def suspend_course(course_id: int, suspension: StatusUpdateRequest, authorization: str = Header(None)):
+def suspend_course(course_id: int, suspension: StatusUpdateRequest, authorization: str = Header(None)):
     """Suspend a verified course"""
     try:
         admin_id = get_admin_id_from_token(authorization)
@@ -817,7 +818,7 @@ async def suspend_course(course_id: int, suspension: StatusUpdateRequest, author
         raise HTTPException(status_code=500, detail=f"Failed to suspend course: {str(e)}")
 
 @router.post("/{course_id}/reinstate")
-async def reinstate_course(course_id: int, authorization: str = Header(None)):
+def reinstate_course(course_id: int, authorization: str = Header(None)):
     """Reinstate a suspended course back to verified"""
     try:
         admin_id = get_admin_id_from_token(authorization)
@@ -866,7 +867,7 @@ async def reinstate_course(course_id: int, authorization: str = Header(None)):
         raise HTTPException(status_code=500, detail=f"Failed to reinstate course: {str(e)}")
 
 @router.post("/{course_id}/reconsider")
-async def reconsider_course(course_id: int, authorization: str = Header(None)):
+def reconsider_course(course_id: int, authorization: str = Header(None)):
     """Reconsider a rejected course - move back to pending"""
     try:
         admin_id = get_admin_id_from_token(authorization)
@@ -13,6 +13,7 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime, timedelta
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 import os
 
@@ -78,7 +79,7 @@ class PanelStatistic(BaseModel):
 
 def get_connection():
     """Get admin database connection (astegni_admin_db)"""
-    return psycopg.connect(ADMIN_DATABASE_URL)
+    return pooled_connect(ADMIN_DATABASE_URL)
 
 def calculate_admin_stats():
     """Calculate real-time statistics from course management tables"""
@@ -154,7 +155,7 @@ def calculate_admin_stats():
 # ============================================
 
 @router.get("/daily-quotas")
-async def get_daily_quotas(admin_id: int = 1) -> List[DailyQuotaResponse]:
+def get_daily_quotas(admin_id: int = 1) -> List[DailyQuotaResponse]:
     """
     Get today's daily quotas for the admin
     If not exists, calculate from real-time data
@@ -222,7 +223,7 @@ async def get_daily_quotas(admin_id: int = 1) -> List[DailyQuotaResponse]:
 
 
 @router.get("/achievements")
-async def get_achievements(admin_id: int = 1) -> List[Achievement]:
+def get_achievements(admin_id: int = 1) -> List[Achievement]:
     """Get all active achievements for the admin"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -258,7 +259,7 @@ async def get_achievements(admin_id: int = 1) -> List[Achievement]:
 
 
 @router.get("/fire-streak")
-async def get_fire_streak(admin_id: int = 1) -> FireStreakResponse:
+def get_fire_streak(admin_id: int = 1) -> FireStreakResponse:
     """Get fire streak data for the admin"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -297,7 +298,7 @@ async def get_fire_streak(admin_id: int = 1) -> FireStreakResponse:
 
 
 @router.get("/profile-stats")
-async def get_profile_stats(admin_id: int = 1) -> ProfileStatsResponse:
+def get_profile_stats(admin_id: int = 1) -> ProfileStatsResponse:
     """Get profile statistics for the admin"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -346,7 +347,7 @@ async def get_profile_stats(admin_id: int = 1) -> ProfileStatsResponse:
 
 
 @router.get("/panel-statistics/{panel_name}")
-async def get_panel_statistics(panel_name: str, admin_id: int = 1, force_refresh: bool = True) -> List[PanelStatistic]:
+def get_panel_statistics(panel_name: str, admin_id: int = 1, force_refresh: bool = True) -> List[PanelStatistic]:
     """
     Get statistics for a specific panel (dashboard, verified, requested, rejected, suspended)
     Always recalculates from real database tables to ensure accuracy
@@ -439,7 +440,7 @@ def generate_default_panel_stats(panel_name: str, admin_id: int, cursor, conn) -
 
 
 @router.put("/profile")
-async def update_admin_profile(admin_id: int = 1, profile_data: Dict[str, Any] = None):
+def update_admin_profile(admin_id: int = 1, profile_data: Dict[str, Any] = None):
     """Update admin profile"""
     from pydantic import BaseModel
 
@@ -548,7 +549,7 @@ async def update_admin_profile(admin_id: int = 1, profile_data: Dict[str, Any] =
         conn.close()
 
 @router.post("/update-streak")
-async def update_fire_streak(admin_id: int = 1):
+def update_fire_streak(admin_id: int = 1):
     """Update fire streak when admin performs an action"""
     conn = get_connection()
     cursor = conn.cursor()
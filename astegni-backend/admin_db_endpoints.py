@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List
 from datetime import datetime
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 import os
@@ -23,7 +24,7 @@ ADMIN_DATABASE_URL = os.getenv(
 
 def get_admin_db():
     """Get admin database connection"""
-    return psycopg.connect(ADMIN_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADMIN_DATABASE_URL, row_factory=dict_row)
 
 
 # ============================================================
@@ -51,7 +52,7 @@ async def get_admin_profile(admin_id: int):
 
 
 @router.get("/profile/by-email/{email}")
-async def get_admin_profile_by_email(email: str):
+def get_admin_profile_by_email(email: str):
     """
     Get admin profile by email from admin database
 
@@ -76,7 +77,7 @@ async def get_admin_profile_by_email(email: str):
 
 
 @router.put("/profile/{admin_id}")
-async def update_admin_profile(admin_id: int, data: dict):
+def update_admin_profile(admin_id: int, data: dict):
     """Update admin profile in admin database"""
     try:
         with get_admin_db() as conn:
@@ -152,7 +153,7 @@ async def get_recent_admin_reviews(
 
 
 @router.post("/reviews")
-async def create_admin_review(data: dict):
+def create_admin_review(data: dict):
     """Create admin review in admin database"""
     try:
         with get_admin_db() as conn:
@@ -191,7 +192,7 @@ MANAGE_TABLES = [
 
 
 @router.get("/manage/{table_name}")
-async def get_manage_profile(table_name: str, admin_id: Optional[int] = None):
+def get_manage_profile(table_name: str, admin_id: Optional[int] = None):
     """Get management profile data from admin database"""
     if table_name not in MANAGE_TABLES:
         raise HTTPException(status_code=400, detail=f"Invalid table: {table_name}")
@@ -212,7 +213,7 @@ async def get_manage_profile(table_name: str, admin_id: Optional[int] = None):
 
 
 @router.get("/manage/{table_name}/by-email/{email}")
-async def get_manage_profile_by_email(table_name: str, email: str):
+def get_manage_profile_by_email(table_name: str, email: str):
     """
     Get management profile by email from admin database
 
@@ -247,7 +248,7 @@ async def get_manage_profile_by_email(table_name: str, email: str):
 
 
 @router.put("/manage/{table_name}/{profile_id}")
-async def update_manage_profile(table_name: str, profile_id: int, data: dict):
+def update_manage_profile(table_name: str, profile_id: int, data: dict):
     """Update management profile in admin database"""
     if table_name not in MANAGE_TABLES:
         raise HTTPException(status_code=400, detail=f"Invalid table: {table_name}")
@@ -288,7 +289,7 @@ async def update_manage_profile(table_name: str, profile_id: int, data: dict):
 # ============================================================
 
 @router.get("/credentials")
-async def get_admin_credentials(admin_id: Optional[int] = None, limit: int = 50):
+def get_admin_credentials(admin_id: Optional[int] = None, limit: int = 50):
     """Get admin credentials from admin database"""
     try:
         with get_admin_db() as conn:
@@ -310,7 +311,7 @@ async def get_admin_credentials(admin_id: Optional[int] = None, limit: int = 50)
 
 
 @router.post("/credentials")
-async def create_admin_credential(data: dict):
+def create_admin_credential(data: dict):
     """Create admin credential in admin database"""
     try:
         with get_admin_db() as conn:
@@ -347,7 +348,7 @@ async def create_admin_credential(data: dict):
 # ============================================================
 
 @router.get("/stats")
-async def get_admin_stats():
+def get_admin_stats():
     """Get admin statistics from admin database"""
     try:
         with get_admin_db() as conn:
@@ -369,7 +370,7 @@ async def get_admin_stats():
 
 
 @router.get("/profile-stats/{admin_id}")
-async def get_admin_profile_stats(admin_id: int):
+def get_admin_profile_stats(admin_id: int):
     """Get admin profile stats from admin database"""
     try:
         with get_admin_db() as conn:
@@ -389,7 +390,7 @@ async def get_admin_profile_stats(admin_id: int):
 # ============================================================
 
 @router.get("/verification-fee")
-async def get_verification_fees():
+def get_verification_fees():
     """Get all verification fee types from admin database"""
     try:
         with get_admin_db() as conn:
@@ -407,7 +408,7 @@ async def get_verification_fees():
 
 
 @router.get("/verification-fee/{fee_type}")
-async def get_verification_fee(fee_type: str):
+def get_verification_fee(fee_type: str):
     """Get specific verification fee by type"""
     try:
         with get_admin_db() as conn:
@@ -427,7 +428,7 @@ async def get_verification_fee(fee_type: str):
 
 
 @router.post("/verification-fee")
-async def save_verification_fee(data: dict):
+def save_verification_fee(data: dict):
     """Save or update verification fee in admin database"""
     try:
         with get_admin_db() as conn:
@@ -460,7 +461,7 @@ async def save_verification_fee(data: dict):
 
 
 @router.delete("/verification-fee/{fee_type}")
-async def delete_verification_fee(fee_type: str):
+def delete_verification_fee(fee_type: str):
     """Delete verification fee by type from admin database"""
     try:
         with get_admin_db() as conn:
@@ -496,7 +497,7 @@ async def delete_verification_fee(fee_type: str):
 # ============================================================
 
 @router.get("/subscription-plans")
-async def get_subscription_plans(active_only: bool = True, user_role: str = None, subscription_type: str = None):
+def get_subscription_plans(active_only: bool = True, user_role: str = None, subscription_type: str = None):
     """
     Get all subscription plans from admin database with role-based features
 
@@ -618,7 +619,7 @@ async def get_subscription_plans(active_only: bool = True, user_role: str = None
 
 
 @router.get("/subscription-plans/{plan_id}")
-async def get_subscription_plan(plan_id: int):
+def get_subscription_plan(plan_id: int):
     """Get specific subscription plan by ID with role-based features"""
     try:
         with get_admin_db() as conn:
@@ -685,7 +686,7 @@ async def get_subscription_plan(plan_id: int):
 
 
 @router.post("/subscription-plans")
-async def create_subscription_plan(data: dict):
+def create_subscription_plan(data: dict):
     """
     DEPRECATED: Use POST /api/admin/subscription-plans instead
     This endpoint still exists for backward compatibility but does NOT support role-based features
@@ -738,7 +739,7 @@ async def create_subscription_plan(data: dict):
 
 
 @router.put("/subscription-plans/{plan_id}")
-async def update_subscription_plan(plan_id: int, data: dict):
+def update_subscription_plan(plan_id: int, data: dict):
     """
     DEPRECATED: Use PUT /api/admin/subscription-plans/{plan_id} instead
     This endpoint still exists for backward compatibility but does NOT support role-based features
@@ -799,7 +800,7 @@ async def update_subscription_plan(plan_id: int, data: dict):
 
 
 @router.delete("/subscription-plans/{plan_id}")
-async def delete_subscription_plan(plan_id: int):
+def delete_subscription_plan(plan_id: int):
     """Delete subscription plan from admin database"""
     try:
         with get_admin_db() as conn:
@@ -818,7 +819,7 @@ async def delete_subscription_plan(plan_id: int):
 
 
 @router.post("/subscription-plans/reorder")
-async def reorder_subscription_plans(data: dict):
+def reorder_subscription_plans(data: dict):
     """Update display order of subscription plans"""
     try:
         with get_admin_db() as conn:
@@ -838,7 +839,7 @@ async def reorder_subscription_plans(data: dict):
 
 
 @router.post("/subscription-plans/{plan_id}/set-base")
-async def set_base_subscription_plan(plan_id: int):
+def set_base_subscription_plan(plan_id: int):
     """Set a subscription plan as the base plan for package-based discount calculations"""
     try:
         with get_admin_db() as conn:
@@ -871,7 +872,7 @@ async def set_base_subscription_plan(plan_id: int):
 # ============================================================
 
 @router.get("/affiliate-program")
-async def get_affiliate_program(business_type: str = None):
+def get_affiliate_program(business_type: str = None):
     """Get affiliate program global settings and tiers from admin database
 
     Args:
@@ -938,7 +939,7 @@ async def get_affiliate_program(business_type: str = None):
 
 
 @router.post("/affiliate-program")
-async def save_affiliate_program(data: dict):
+def save_affiliate_program(data: dict):
     """Save affiliate program global settings in admin database"""
     try:
         with get_admin_db() as conn:
@@ -987,7 +988,7 @@ async def save_affiliate_program(data: dict):
 # ============================================================
 
 @router.get("/affiliate-tiers")
-async def get_affiliate_tiers(program_id: int = None, business_type: str = None):
+def get_affiliate_tiers(program_id: int = None, business_type: str = None):
     """Get all affiliate tiers from admin database, optionally filtered by program_id and business_type
 
     Args:
@@ -1024,7 +1025,7 @@ async def get_affiliate_tiers(program_id: int = None, business_type: str = None)
 
 
 @router.get("/affiliate-tiers/{program_id}/{tier_level}")
-async def get_affiliate_tier(program_id: int, tier_level: int):
+def get_affiliate_tier(program_id: int, tier_level: int):
     """Get specific affiliate tier by program_id and level"""
     try:
         with get_admin_db() as conn:
@@ -1044,7 +1045,7 @@ async def get_affiliate_tier(program_id: int, tier_level: int):
 
 
 @router.post("/affiliate-tiers")
-async def save_affiliate_tier(data: dict):
+def save_affiliate_tier(data: dict):
     """Save or update affiliate tier in admin database
 
     Required fields:
@@ -1097,7 +1098,7 @@ async def save_affiliate_tier(data: dict):
 
 
 @router.delete("/affiliate-tiers/{program_id}/{tier_level}/{business_type}")
-async def delete_affiliate_tier(program_id: int, tier_level: int, business_type: str):
+def delete_affiliate_tier(program_id: int, tier_level: int, business_type: str):
     """Delete affiliate tier by program_id, tier_level, and business_type from admin database"""
     try:
         with get_admin_db() as conn:
@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
 import psycopg
+from db_pool import pooled_connect
 from psycopg.types.json import Json
 from dotenv import load_dotenv
 import os
@@ -73,7 +74,7 @@ class LeaveRequestApproval(BaseModel):
 
 def get_connection():
     """Get admin database connection (astegni_admin_db)"""
-    return psycopg.connect(ADMIN_DATABASE_URL)
+    return pooled_connect(ADMIN_DATABASE_URL)
 
 
 def calculate_days(start_date: str, end_date: str) -> int:
@@ -88,7 +89,7 @@ def calculate_days(start_date: str, end_date: str) -> int:
 # ============================================
 
 @router.get("/balance/{admin_id}")
-async def get_leave_balance(admin_id: int):
+def get_leave_balance(admin_id: int):
     """Get leave balance for an admin"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -130,7 +131,7 @@ async def get_leave_balance(admin_id: int):
 
 
 @router.get("/requests/{admin_id}")
-async def get_leave_requests(admin_id: int, status: Optional[str] = None):
+def get_leave_requests(admin_id: int, status: Optional[str] = None):
     """Get all leave requests for an admin"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -183,7 +184,7 @@ async def get_leave_requests(admin_id: int, status: Optional[str] = None):
 
 
 @router.post("/requests/{admin_id}")
-async def create_leave_request(admin_id: int, request_data: LeaveRequestCreate):
+def create_leave_request(admin_id: int, request_data: LeaveRequestCreate):
     """Create a new leave request"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -278,7 +279,7 @@ async def create_leave_request(admin_id: int, request_data: LeaveRequestCreate):
 
 
 @router.get("/request/{request_id}")
-async def get_leave_request(request_id: int):
+def get_leave_request(request_id: int):
     """Get a specific leave request"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -325,7 +326,7 @@ async def get_leave_request(request_id: int):
 
 
 @router.put("/request/{request_id}/approve")
-async def approve_leave_request(request_id: int, approver_id: int, approval: LeaveRequestApproval):
+def approve_leave_request(request_id: int, approver_id: int, approval: LeaveRequestApproval):
     """Approve or reject a leave request"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -398,7 +399,7 @@ async def approve_leave_request(request_id: int, approver_id: int, approval: Lea
 
 
 @router.delete("/request/{request_id}")
-async def cancel_leave_request(request_id: int, admin_id: int):
+def cancel_leave_request(request_id: int, admin_id: int):
     """Cancel a pending leave request"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -439,7 +440,7 @@ async def cancel_leave_request(request_id: int, admin_id: int):
 
 
 @router.get("/all-pending")
-async def get_all_pending_requests():
+def get_all_pending_requests():
     """Get all pending leave requests (for managers/admins to approve)"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -15,6 +15,7 @@ import secrets
 import string
 from pydantic import BaseModel, EmailStr
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 import os
 import sys
@@ -43,7 +44,7 @@ def get_db_connection():
     db_name = db_full.split("?")[0] if "?" in db_full else db_full
     host, port = host_port.split(":") if ":" in host_port else (host_port, "5432")
 
-    return psycopg.connect(dbname=db_name, user=user, password=password, host=host, port=port)
+    return pooled_connect(dbname=db_name, user=user, password=password, host=host, port=port)
 
 # ============================================
 # PYDANTIC MODELS
@@ -147,7 +148,7 @@ def get_department_table(department: str) -> str:
 # ============================================
 
 @router.post("/api/admin/send-otp")
-async def send_admin_otp(request: AdminInviteRequest):
+def send_admin_otp(request: AdminInviteRequest):
     """
     Send OTP for admin invitation (7-day expiration)
 
@@ -330,7 +331,7 @@ async def send_admin_otp(request: AdminInviteRequest):
 # ============================================
 
 @router.post("/api/admin/register")
-async def register_admin(request: AdminRegisterRequest):
+def register_admin(request: AdminRegisterRequest):
     """
     Complete admin registration by verifying OTP and setting password.
 
@@ -494,7 +495,7 @@ async def register_admin(request: AdminRegisterRequest):
 # ============================================
 
 @router.post("/api/admin/forgot-password")
-async def forgot_password(request: ForgotPasswordRequest):
+def forgot_password(request: ForgotPasswordRequest):
     """
     Send OTP for password reset
 
@@ -576,7 +577,7 @@ async def forgot_password(request: ForgotPasswordRequest):
 # ============================================
 
 @router.post("/api/admin/reset-password")
-async def reset_password(request: ResetPasswordRequest):
+def reset_password(request: ResetPasswordRequest):
     """Reset password using OTP"""
     conn = None
     try:
@@ -628,7 +629,7 @@ async def reset_password(request: ResetPasswordRequest):
 # ============================================
 
 @router.post("/api/admin/{admin_id}/add-department")
-async def add_department(admin_id: int, request: AddDepartmentRequest):
+def add_department(admin_id: int, request: AddDepartmentRequest):
     """Add a new department to an existing admin"""
     conn = None
     try:
@@ -686,7 +687,7 @@ async def add_department(admin_id: int, request: AddDepartmentRequest):
 # ============================================
 
 @router.delete("/api/admin/{admin_id}/remove-department/{department}")
-async def remove_department(admin_id: int, department: str):
+def remove_department(admin_id: int, department: str):
     """Remove a department from an admin"""
     conn = None
     try:
@@ -740,7 +741,7 @@ async def remove_department(admin_id: int, department: str):
 # ============================================
 
 @router.get("/api/admin/list")
-async def list_admins(department: Optional[str] = None, page: int = 1, limit: int = 20):
+def list_admins(department: Optional[str] = None, page: int = 1, limit: int = 20):
     """List all admins with optional department filtering"""
     conn = None
     try:
@@ -804,7 +805,7 @@ class RequestDepartmentOTPRequest(BaseModel):
     position: Optional[str] = "Staff"
 
 @router.post("/api/admin/request-department-otp")
-async def request_department_otp(request: RequestDepartmentOTPRequest):
+def request_department_otp(request: RequestDepartmentOTPRequest):
     """
     Request OTP for adding a new department to an existing admin.
 
@@ -936,7 +937,7 @@ class AddDepartmentWithOTPRequest(BaseModel):
     password: str
 
 @router.post("/api/admin/add-department")
-async def add_department_with_otp(request: AddDepartmentWithOTPRequest):
+def add_department_with_otp(request: AddDepartmentWithOTPRequest):
     """
     Add a new department to an existing admin after OTP verification.
 
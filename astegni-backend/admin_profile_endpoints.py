@@ -11,6 +11,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List
 import psycopg
+from db_pool import pooled_connect
 from psycopg.types.json import Json
 from dotenv import load_dotenv
 import os
@@ -109,7 +110,7 @@ class ProfileOTPVerifyRequest(BaseModel):
 
 def get_connection():
     """Get admin database connection (astegni_admin_db)"""
-    return psycopg.connect(ADMIN_DATABASE_URL)
+    return pooled_connect(ADMIN_DATABASE_URL)
 
 def generate_otp() -> str:
     """Generate a 6-digit OTP"""
@@ -174,7 +175,7 @@ def get_latest_otp_time(cursor, contact: str, purpose: str):
 # ============================================
 
 @router.post("/profile/send-otp")
-async def send_profile_otp(request: ProfileOTPSendRequest):
+def send_profile_otp(request: ProfileOTPSendRequest):
     """
     Send OTP for email or phone verification when adding to profile.
 
@@ -264,7 +265,7 @@ async def send_profile_otp(request: ProfileOTPSendRequest):
 
 
 @router.post("/profile/verify-otp")
-async def verify_profile_otp(request: ProfileOTPVerifyRequest):
+def verify_profile_otp(request: ProfileOTPVerifyRequest):
     """
     Verify OTP for email or phone verification.
 
@@ -8,6 +8,7 @@ from typing import List
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -67,7 +68,7 @@ def parse_database_url(database_url):
 def get_user_db_connection():
     """Get user database connection (astegni_user_db)"""
     params = parse_database_url(USER_DATABASE_URL)
-    return psycopg.connect(**params)
+    return pooled_connect(**params)
 
 # ============================================
 # RECOMMENDED TOPICS ENDPOINTS
@@ -9,6 +9,7 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -82,7 +83,7 @@ def get_db_connection():
         host = host_port
         port = "5432"
 
-    conn = psycopg.connect(
+    conn = pooled_connect(
         dbname=db_name,
         user=user,
         password=password,
@@ -96,7 +97,7 @@ def get_db_connection():
 # ============================================
 
 @router.get("/")
-async def get_all_reviews(
+def get_all_reviews(
     limit: int = 50,
     offset: int = 0,
     min_rating: Optional[float] = None,
@@ -194,7 +195,7 @@ async def get_all_reviews(
         raise HTTPException(status_code=500, detail=f"Failed to fetch reviews: {str(e)}")
 
 @router.get("/stats")
-async def get_admin_stats(admin_id: Optional[int] = None, department: Optional[str] = None):
+def get_admin_stats(admin_id: Optional[int] = None, department: Optional[str] = None):
     """Get admin performance statistics for a specific admin and department"""
     try:
         conn = get_db_connection()
@@ -320,7 +321,7 @@ async def get_admin_stats(admin_id: Optional[int] = None, department: Optional[s
         raise HTTPException(status_code=500, detail=f"Failed to fetch stats: {str(e)}")
 
 @router.get("/recent")
-async def get_recent_reviews(limit: int = 10, admin_id: Optional[int] = None, department: Optional[str] = None):
+def get_recent_reviews(limit: int = 10, admin_id: Optional[int] = None, department: Optional[str] = None):
     """Get most recent reviews for a specific admin and department"""
     try:
         conn = get_db_connection()
@@ -375,7 +376,7 @@ async def get_recent_reviews(limit: int = 10, admin_id: Optional[int] = None, de
         raise HTTPException(status_code=500, detail=f"Failed to fetch recent reviews: {str(e)}")
 
 @router.post("/")
-async def create_review(review: ReviewCreate):
+def create_review(review: ReviewCreate):
     """Create a new admin review"""
     try:
         conn = get_db_connection()
@@ -423,7 +424,7 @@ async def create_review(review: ReviewCreate):
         raise HTTPException(status_code=500, detail=f"Failed to create review: {str(e)}")
 
 @router.get("/{review_id}")
-async def get_review(review_id: str):
+def get_review(review_id: str):
     """Get specific review by ID"""
     try:
         conn = get_db_connection()
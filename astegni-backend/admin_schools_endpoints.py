@@ -11,6 +11,7 @@ from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 import jwt
 
@@ -69,12 +70,12 @@ def parse_database_url(database_url):
 def get_admin_db_connection():
     """Get admin database connection (astegni_admin_db)"""
     params = parse_database_url(ADMIN_DATABASE_URL)
-    return psycopg.connect(**params)
+    return pooled_connect(**params)
 
 def get_user_db_connection():
     """Get user database connection (astegni_user_db)"""
     params = parse_database_url(USER_DATABASE_URL)
-    return psycopg.connect(**params)
+    return pooled_connect(**params)
 
 def get_admin_id_from_token(authorization: str):
     """Extract admin_id from JWT token"""
@@ -174,7 +175,7 @@ def row_to_school_dict(row, cursor):
 # ============================================
 
 @router.get("/profile/{admin_id}")
-async def get_admin_schools_profile(admin_id: int):
+def get_admin_schools_profile(admin_id: int):
     """Get admin profile with schools profile data from astegni_admin_db"""
     try:
         conn = get_admin_db_connection()
@@ -246,7 +247,7 @@ async def get_admin_schools_profile(admin_id: int):
 
 
 @router.get("/profile/by-email/{email}")
-async def get_admin_schools_profile_by_email(email: str):
+def get_admin_schools_profile_by_email(email: str):
     """Get admin profile by email with schools profile data"""
     try:
         conn = get_admin_db_connection()
@@ -384,7 +385,7 @@ async def get_recent_reviews(
 # ============================================
 
 @router.get("/pending")
-async def get_pending_schools():
+def get_pending_schools():
     """Get all pending schools from astegni_user_db schools table"""
     try:
         conn = get_user_db_connection()
@@ -409,7 +410,7 @@ async def get_pending_schools():
 
 
 @router.get("/verified")
-async def get_verified_schools():
+def get_verified_schools():
     """Get all verified schools from astegni_user_db schools table"""
     try:
         conn = get_user_db_connection()
@@ -434,7 +435,7 @@ async def get_verified_schools():
 
 
 @router.get("/rejected")
-async def get_rejected_schools():
+def get_rejected_schools():
     """Get all rejected schools from astegni_user_db schools table"""
     try:
         conn = get_user_db_connection()
@@ -459,7 +460,7 @@ async def get_rejected_schools():
 
 
 @router.get("/suspended")
-async def get_suspended_schools():
+def get_suspended_schools():
     """Get all suspended schools from astegni_user_db schools table"""
     try:
         conn = get_user_db_connection()
@@ -484,7 +485,7 @@ async def get_suspended_schools():
 
 
 @router.get("/stats")
-async def get_school_statistics():
+def get_school_statistics():
     """Get school statistics grouped by status"""
     try:
         conn = get_user_db_connection()
@@ -520,7 +521,7 @@ async def get_school_statistics():
 
 
 @router.get("/{school_id}")
-async def get_school(school_id: int):
+def get_school(school_id: int):
     """Get a specific school by ID"""
     try:
         conn = get_user_db_connection()
@@ -548,7 +549,7 @@ async def get_school(school_id: int):
 
 
 @router.post("/{school_id}/approve")
-async def approve_school(
+def approve_school(
     school_id: int,
     authorization: Optional[str] = Header(None)
 ):
@@ -597,7 +598,7 @@ async def approve_school(
 
 
 @router.post("/{school_id}/reject")
-async def reject_school(
+def reject_school(
     school_id: int,
     request: StatusUpdateRequest,
     authorization: Optional[str] = Header(None)
@@ -642,7 +643,7 @@ async def reject_school(
 
 
 @router.post("/{school_id}/suspend")
-async def suspend_school(
+def suspend_school(
     school_id: int,
     request: StatusUpdateRequest,
     authorization: Optional[str] = Header(None)
@@ -692,7 +693,7 @@ async def suspend_school(
 
 
 @router.post("/{school_id}/reinstate")
-async def reinstate_school(
+def reinstate_school(
     school_id: int,
     authorization: Optional[str] = Header(None)
 ):
@@ -741,7 +742,7 @@ async def reinstate_school(
 
 
 @router.post("/{school_id}/reconsider")
-async def reconsider_school(
+def reconsider_school(
     school_id: int,
     authorization: Optional[str] = Header(None)
 ):
@@ -790,7 +791,7 @@ async def reconsider_school(
 
 
 @router.delete("/{school_id}")
-async def delete_school(
+def delete_school(
     school_id: int,
     authorization: Optional[str] = Header(None)
 ):
@@ -65,7 +65,7 @@ def get_admin_db():
 
 
 @router.post("/subscription-plans")
-async def create_subscription_plan(
+def create_subscription_plan(
     plan_data: SubscriptionPlanCreate,
     admin_db: Session = Depends(get_admin_db)
 ):
@@ -168,7 +168,7 @@ async def create_subscription_plan(
 
 
 @router.put("/subscription-plans/{plan_id}")
-async def update_subscription_plan(
+def update_subscription_plan(
     plan_id: int,
     plan_data: SubscriptionPlanUpdate,
     admin_db: Session = Depends(get_admin_db)
@@ -283,7 +283,7 @@ async def update_subscription_plan(
 
 
 @router.delete("/subscription-plans/{plan_id}")
-async def delete_subscription_plan(
+def delete_subscription_plan(
     plan_id: int,
     admin_db: Session = Depends(get_admin_db)
 ):
@@ -319,7 +319,7 @@ async def delete_subscription_plan(
 
 
 @router.get("/subscription-plans/{plan_id}/features")
-async def get_plan_features(
+def get_plan_features(
     plan_id: int,
     role: Optional[str] = None,
     admin_db: Session = Depends(get_admin_db)
@@ -380,7 +380,7 @@ async def get_plan_features(
 
 
 @router.post("/subscription-plans/{plan_id}/assign-features")
-async def assign_plan_features(
+def assign_plan_features(
     plan_id: int,
     features: Dict[str, List[FeatureData]],
     admin_db: Session = Depends(get_admin_db)
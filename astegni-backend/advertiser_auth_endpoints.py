@@ -20,6 +20,7 @@ from pydantic import BaseModel, EmailStr
 from typing import Optional
 from datetime import timedelta, datetime, timezone
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 import os
 import jwt
@@ -57,7 +58,7 @@ def _libpq(url: str) -> str:
 
 def get_connection():
     """Connection to astegni_advertiser_db."""
-    return psycopg.connect(_libpq(ADVERTISER_DATABASE_URL))
+    return pooled_connect(_libpq(ADVERTISER_DATABASE_URL))
 
 
 # ============================================
@@ -218,7 +219,7 @@ def _issue_refresh_token(advertiser_id: int, email: str) -> str:
 # ============================================
 
 @router.post("/login")
-async def advertiser_login(request: AdvertiserLoginRequest):
+def advertiser_login(request: AdvertiserLoginRequest):
     """Authenticate an advertiser against advertiser_profiles."""
     conn = None
     try:
@@ -276,7 +277,7 @@ class AdvertiserRefreshRequest(BaseModel):
 
 
 @router.post("/auth/refresh")
-async def advertiser_refresh(request: AdvertiserRefreshRequest):
+def advertiser_refresh(request: AdvertiserRefreshRequest):
     """Exchange a valid advertiser refresh token for a fresh access token.
 
     The refresh token is signed with REFRESH_SECRET_KEY and carries
@@ -323,7 +324,7 @@ async def advertiser_refresh(request: AdvertiserRefreshRequest):
 
 
 @router.post("/send-registration-otp")
-async def send_registration_otp(request: SendOtpRequest):
+def send_registration_otp(request: SendOtpRequest):
     """Send an OTP to verify a NEW advertiser email before registration."""
     conn = None
     try:
@@ -363,7 +364,7 @@ async def send_registration_otp(request: SendOtpRequest):
 
 
 @router.post("/verify-registration-otp")
-async def verify_registration_otp(request: VerifyRegistrationRequest):
+def verify_registration_otp(request: VerifyRegistrationRequest):
     """Verify the OTP and create a new (users-less) advertiser account.
 
     Gated by ALLOW_NEW_REGISTRATION until Stage 3 (cross-feature drop +
@@ -423,7 +424,7 @@ async def verify_registration_otp(request: VerifyRegistrationRequest):
 
 
 @router.post("/send-password-otp")
-async def send_password_otp(request: SendOtpRequest):
+def send_password_otp(request: SendOtpRequest):
     """Send an OTP to an EXISTING advertiser email (for set/reset password)."""
     conn = None
     try:
@@ -458,7 +459,7 @@ async def send_password_otp(request: SendOtpRequest):
 
 
 @router.post("/set-password")
-async def set_password(request: SetPasswordRequest):
+def set_password(request: SetPasswordRequest):
     """Set/reset an advertiser password after OTP verification (e.g. OAuth-only accounts)."""
     conn = None
     try:
@@ -501,7 +502,7 @@ async def set_password(request: SetPasswordRequest):
 
 
 @router.get("/auth/me")
-async def advertiser_me(adv=Depends(get_current_advertiser)):
+def advertiser_me(adv=Depends(get_current_advertiser)):
     """Return the current advertiser's basic profile (validates the advertiser token).
 
     Path is /auth/me (not /me) to avoid being shadowed by the legacy
@@ -559,7 +560,7 @@ class AdvertiserIdentityUpdate(BaseModel):
 
 
 @router.get("/auth/identity")
-async def get_advertiser_identity(adv=Depends(get_current_advertiser)):
+def get_advertiser_identity(adv=Depends(get_current_advertiser)):
     """Return the owner's identity profile, in the shape the shared
     verify-personal-info modal expects (a `user`-like object)."""
     conn = None
@@ -603,7 +604,7 @@ async def get_advertiser_identity(adv=Depends(get_current_advertiser)):
 
 
 @router.put("/auth/identity")
-async def update_advertiser_identity(body: AdvertiserIdentityUpdate, adv=Depends(get_current_advertiser)):
+def update_advertiser_identity(body: AdvertiserIdentityUpdate, adv=Depends(get_current_advertiser)):
     """Update the owner's identity profile on advertiser_profiles."""
     conn = None
     try:
@@ -18,6 +18,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional, List
 import psycopg
+from db_pool import pooled_connect
 import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
@@ -56,7 +57,7 @@ class TransactionResponse(BaseModel):
 
 def get_db():
     """Get database connection"""
-    return psycopg.connect(DATABASE_URL)
+    return pooled_connect(DATABASE_URL)
 
 
 def _mirror_balance_to_company(cursor, advertiser_id: int) -> None:
@@ -115,7 +116,7 @@ def _mirror_balance_to_company(cursor, advertiser_id: int) -> None:
 # ============================================
 
 @router.get("/balance")
-async def get_advertiser_balance(advertiser_id: int):
+def get_advertiser_balance(advertiser_id: int):
     """
     Get advertiser's current balance and spending summary.
 
@@ -168,7 +169,7 @@ async def get_advertiser_balance(advertiser_id: int):
 
 
 @router.post("/balance/deposit")
-async def deposit_balance(advertiser_id: int, request: DepositRequest):
+def deposit_balance(advertiser_id: int, request: DepositRequest):
     """
     Deposit funds to advertiser balance.
 
@@ -274,7 +275,7 @@ async def deposit_balance(advertiser_id: int, request: DepositRequest):
 
 
 @router.get("/transactions")
-async def get_transactions(
+def get_transactions(
     advertiser_id: int,
     limit: int = 50,
     offset: int = 0,
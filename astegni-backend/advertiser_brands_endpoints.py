@@ -16,6 +16,7 @@ from fastapi import APIRouter, HTTPException, Query, Depends, File, UploadFile
 from pydantic import BaseModel
 from typing import Optional, List
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from psycopg.types.json import Jsonb
 from dotenv import load_dotenv
@@ -44,7 +45,7 @@ def get_db():
     former users.account_balance gate (the only user-DB access) has been
     removed, so no user-DB connection is needed here anymore.
     """
-    return psycopg.connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
 
 
 def _assert_brand_owned_by_advertiser(cur, advertiser_profile_id: int, brand_id: int) -> None:
@@ -180,7 +181,7 @@ class CampaignReapply(BaseModel):
 # ============================================================
 
 @router.get("/brands")
-async def get_my_brands(company_id: Optional[int] = None, current_user = Depends(resolve_advertiser)):
+def get_my_brands(company_id: Optional[int] = None, current_user = Depends(resolve_advertiser)):
     """List brands owned by the current advertiser, optionally scoped to one company.
 
     Reads via the new schema (brand_profile.company_id -> company_profile.advertiser_id).
@@ -263,7 +264,7 @@ async def get_my_brands(company_id: Optional[int] = None, current_user = Depends
 
 
 @router.post("/brands")
-async def create_brand(brand: BrandCreate, current_user = Depends(resolve_advertiser)):
+def create_brand(brand: BrandCreate, current_user = Depends(resolve_advertiser)):
     """Create a new brand under one of the advertiser's companies.
 
     company_id in the request body is preferred. If omitted (legacy frontend),
@@ -406,7 +407,7 @@ async def create_brand(brand: BrandCreate, current_user = Depends(resolve_advert
 
 
 @router.get("/brands/{brand_id}")
-async def get_brand(brand_id: int, current_user = Depends(resolve_advertiser)):
+def get_brand(brand_id: int, current_user = Depends(resolve_advertiser)):
     """Get a specific brand with its campaigns"""
     try:
         # Get advertiser profile ID from role_ids
@@ -433,7 +434,7 @@ async def get_brand(brand_id: int, current_user = Depends(resolve_advertiser)):
 
 
 @router.put("/brands/{brand_id}")
-async def update_brand(brand_id: int, brand: BrandUpdate, current_user = Depends(resolve_advertiser)):
+def update_brand(brand_id: int, brand: BrandUpdate, current_user = Depends(resolve_advertiser)):
     """Update a brand"""
     try:
         # Get advertiser profile ID from role_ids
@@ -549,7 +550,7 @@ async def update_brand(brand_id: int, brand: BrandUpdate, current_user = Depends
 
 
 @router.delete("/brands/{brand_id}")
-async def delete_brand(brand_id: int, current_user = Depends(resolve_advertiser)):
+def delete_brand(brand_id: int, current_user = Depends(resolve_advertiser)):
     """Delete a brand (soft delete - set is_active to false)"""
     try:
         # Get advertiser profile ID from role_ids
@@ -672,7 +673,7 @@ async def upload_brand_logo(
 # ============================================================
 
 @router.get("/brands/{brand_id}/campaigns")
-async def get_brand_campaigns(brand_id: int, current_user = Depends(resolve_advertiser)):
+def get_brand_campaigns(brand_id: int, current_user = Depends(resolve_advertiser)):
     """Get all campaigns for a specific brand"""
     try:
         # Get advertiser profile ID from role_ids
@@ -785,7 +786,7 @@ async def get_brand_campaigns(brand_id: int, current_user = Depends(resolve_adve
 
 
 @router.post("/brands/{brand_id}/campaigns")
-async def create_campaign(brand_id: int, campaign: CampaignCreate, current_user = Depends(resolve_advertiser)):
+def create_campaign(brand_id: int, campaign: CampaignCreate, current_user = Depends(resolve_advertiser)):
     """
     Create a new campaign for a brand with upfront payment
 
@@ -978,7 +979,7 @@ async def create_campaign(brand_id: int, campaign: CampaignCreate, current_user
 
 
 @router.get("/campaigns/{campaign_id}")
-async def get_campaign(campaign_id: int, current_user = Depends(resolve_advertiser)):
+def get_campaign(campaign_id: int, current_user = Depends(resolve_advertiser)):
     """Get a specific campaign"""
     try:
         # Get advertiser profile ID from role_ids
@@ -1059,7 +1060,7 @@ async def get_campaign(campaign_id: int, current_user = Depends(resolve_advertis
 
 
 @router.put("/campaigns/{campaign_id}")
-async def update_campaign(campaign_id: int, campaign: CampaignUpdate, current_user = Depends(resolve_advertiser)):
+def update_campaign(campaign_id: int, campaign: CampaignUpdate, current_user = Depends(resolve_advertiser)):
     """Update a campaign"""
     try:
         # Get advertiser profile ID from role_ids
@@ -1198,7 +1199,7 @@ async def update_campaign(campaign_id: int, campaign: CampaignUpdate, current_us
 
 
 @router.post("/campaigns/{campaign_id}/reapply")
-async def reapply_campaign(campaign_id: int, payload: CampaignReapply, current_user = Depends(resolve_advertiser)):
+def reapply_campaign(campaign_id: int, payload: CampaignReapply, current_user = Depends(resolve_advertiser)):
     """Reapply a REJECTED campaign without creating a new row.
 
     Keeps the SAME campaign id. Updates the editable fields + recomputes the
@@ -1324,7 +1325,7 @@ async def reapply_campaign(campaign_id: int, payload: CampaignReapply, current_u
 
 
 @router.delete("/campaigns/{campaign_id}")
-async def delete_campaign(campaign_id: int, current_user = Depends(resolve_advertiser)):
+def delete_campaign(campaign_id: int, current_user = Depends(resolve_advertiser)):
     """Delete a campaign"""
     try:
         # Get advertiser profile ID from role_ids
@@ -1434,7 +1435,7 @@ async def delete_campaign(campaign_id: int, current_user = Depends(resolve_adver
 # ============================================================
 
 @router.get("/stats")
-async def get_advertiser_stats(current_user = Depends(resolve_advertiser)):
+def get_advertiser_stats(current_user = Depends(resolve_advertiser)):
     """Get stats for the current advertiser"""
     try:
         # Get advertiser profile ID from role_ids
@@ -1524,7 +1525,7 @@ async def get_advertiser_stats(current_user = Depends(resolve_advertiser)):
 # ============================================================
 
 @router.post("/campaigns/{campaign_id}/submit-for-verification")
-async def submit_campaign_for_verification(campaign_id: int, current_user = Depends(resolve_advertiser)):
+def submit_campaign_for_verification(campaign_id: int, current_user = Depends(resolve_advertiser)):
     """
     Submit a campaign for admin verification.
     This marks the campaign as ready for review in the admin dashboard.
@@ -28,6 +28,7 @@ from datetime import datetime, timedelta
 from typing import List, Optional
 
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from psycopg.types.json import Jsonb
 from dotenv import load_dotenv
@@ -48,7 +49,7 @@ DATABASE_URL = os.getenv(
 
 
 def get_db():
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 
 # ============================================================
@@ -171,7 +172,7 @@ def _business_days_since(dt: Optional[datetime], now: datetime) -> int:
 # ============================================================
 
 @router.post("/companies", status_code=201)
-async def create_company(payload: CompanyCreate, current_user=Depends(resolve_advertiser)):
+def create_company(payload: CompanyCreate, current_user=Depends(resolve_advertiser)):
     """Create a new company under the current advertiser."""
     advertiser_profile_id = _current_advertiser_profile_id(current_user)
 
@@ -238,7 +239,7 @@ async def create_company(payload: CompanyCreate, current_user=Depends(resolve_ad
 
 
 @router.get("/companies")
-async def list_companies(current_user=Depends(resolve_advertiser)):
+def list_companies(current_user=Depends(resolve_advertiser)):
     """List companies owned by the current advertiser."""
     advertiser_profile_id = _current_advertiser_profile_id(current_user)
     try:
@@ -255,7 +256,7 @@ async def list_companies(current_user=Depends(resolve_advertiser)):
 
 
 @router.get("/companies/{company_id}")
-async def get_company(company_id: int, current_user=Depends(resolve_advertiser)):
+def get_company(company_id: int, current_user=Depends(resolve_advertiser)):
     """Get one company. Must belong to the current advertiser."""
     advertiser_profile_id = _current_advertiser_profile_id(current_user)
     try:
@@ -270,7 +271,7 @@ async def get_company(company_id: int, current_user=Depends(resolve_advertiser))
 
 
 @router.put("/companies/{company_id}")
-async def update_company(company_id: int, payload: CompanyUpdate, current_user=Depends(resolve_advertiser)):
+def update_company(company_id: int, payload: CompanyUpdate, current_user=Depends(resolve_advertiser)):
     """Update editable identity fields. Wallet / verification fields are not editable here.
 
     If company_name changes, B2 files under the company's subtree are re-migrated
@@ -387,7 +388,7 @@ async def update_company(company_id: int, payload: CompanyUpdate, current_user=D
 
 
 @router.delete("/companies/{company_id}")
-async def delete_company(company_id: int, current_user=Depends(resolve_advertiser)):
+def delete_company(company_id: int, current_user=Depends(resolve_advertiser)):
     """Delete a company. Refuses if any brands still exist under it (delete the brands first)."""
     advertiser_profile_id = _current_advertiser_profile_id(current_user)
     try:
@@ -418,7 +419,7 @@ async def delete_company(company_id: int, current_user=Depends(resolve_advertise
 # ============================================================
 
 @router.get("/companies/{company_id}/brands")
-async def list_brands_for_company(company_id: int, current_user=Depends(resolve_advertiser)):
+def list_brands_for_company(company_id: int, current_user=Depends(resolve_advertiser)):
     """List brands belonging to a single company."""
     advertiser_profile_id = _current_advertiser_profile_id(current_user)
     try:
@@ -461,7 +462,7 @@ VERIFICATION_SLA_BUSINESS_DAYS = 2
 
 
 @router.post("/companies/{company_id}/submit-verification")
-async def submit_company_verification(company_id: int, current_user=Depends(resolve_advertiser)):
+def submit_company_verification(company_id: int, current_user=Depends(resolve_advertiser)):
     """Submit a company for KYC review.
 
     Requirements (logo is optional):
@@ -521,7 +522,7 @@ async def submit_company_verification(company_id: int, current_user=Depends(reso
 
 
 @router.get("/companies/{company_id}/verification-status")
-async def get_company_verification_status(company_id: int, current_user=Depends(resolve_advertiser)):
+def get_company_verification_status(company_id: int, current_user=Depends(resolve_advertiser)):
     """Return verification state + reason + escalation eligibility for the company."""
     advertiser_profile_id = _current_advertiser_profile_id(current_user)
     try:
@@ -572,7 +573,7 @@ async def get_company_verification_status(company_id: int, current_user=Depends(
 
 
 @router.post("/companies/{company_id}/notify-admins")
-async def notify_admins_verification(company_id: int, current_user=Depends(resolve_advertiser)):
+def notify_admins_verification(company_id: int, current_user=Depends(resolve_advertiser)):
     """Advertiser escalates a long-pending verification (>2 business days).
 
     Flags the company as escalated so it surfaces in manage-companies. Idempotent:
@@ -24,6 +24,7 @@ import os
 import sys
 
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 
@@ -36,6 +37,7 @@ from kyc_endpoints import (
     save_image_to_storage,
     KYC_MAX_ATTEMPTS, KYC_RESET_HOURS,
 )
+from kyc_pipeline import pipeline as kyc_pipeline
 from advertiser_auth_endpoints import resolve_advertiser
 
 load_dotenv()
@@ -61,7 +63,7 @@ def _libpq(url: str) -> str:
 
 
 def get_db():
-    return psycopg.connect(_libpq(ADVERTISER_DATABASE_URL), row_factory=dict_row)
+    return pooled_connect(_libpq(ADVERTISER_DATABASE_URL), row_factory=dict_row)
 
 
 def _now():
@@ -158,7 +160,7 @@ def _insert_attempt(cur, verification_id, advertiser_id, attempt_number, step,
 # ============================================
 
 @router.post("/start")
-async def start_kyc(request: KYCStartRequest, current_user = Depends(resolve_advertiser)):
+def start_kyc(request: KYCStartRequest, current_user = Depends(resolve_advertiser)):
     advertiser_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
     if not advertiser_id:
         raise HTTPException(status_code=403, detail="Not authorized as advertiser")
@@ -231,7 +233,7 @@ def _load_verification(cur, verification_id, advertiser_id):
 
 
 @router.post("/upload-document")
-async def upload_document(
+def upload_document(
     verification_id: int = Form(...),
     image_data: str = Form(...),
     document_type: str = Form("digital_id"),
@@ -264,6 +266,7 @@ async def upload_document(
             raise HTTPException(status_code=400, detail="No face detected in document. Please upload a clear photo of your ID.")
 
         image_url = save_image_to_storage(image_bytes, advertiser_id, "document")
+        kyc_pipeline.prefetch_document(image_bytes)
         cur.execute(
             """UPDATE advertiser_kyc_verifications
                SET document_image_url = %s, document_type = %s, document_verified = TRUE,
@@ -287,7 +290,7 @@ async def upload_document(
 
 
 @router.post("/verify-liveliness")
-async def verify_liveliness(
+def verify_liveliness(
     verification_id: int = Form(...),
     challenge_type: str = Form(...),
     frame_data: str = Form(...),
@@ -363,7 +366,7 @@ async def verify_liveliness(
 
 
 @router.post("/upload-selfie")
-async def upload_selfie(
+def upload_selfie(
     request: Request,
     verification_id: int = Form(...),
     image_data: str = Form(..., max_length=10 * 1024 * 1024),
@@ -503,7 +506,7 @@ async def upload_selfie(
 
 
 @router.get("/status")
-async def get_status(current_user = Depends(resolve_advertiser)):
+def get_status(current_user = Depends(resolve_advertiser)):
     advertiser_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
     if not advertiser_id:
         raise HTTPException(status_code=403, detail="Not authorized as advertiser")
@@ -536,7 +539,7 @@ async def get_status(current_user = Depends(resolve_advertiser)):
 
 
 @router.post("/reset")
-async def reset_kyc(current_user = Depends(resolve_advertiser)):
+def reset_kyc(current_user = Depends(resolve_advertiser)):
     advertiser_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
     if not advertiser_id:
         raise HTTPException(status_code=403, detail="Not authorized as advertiser")
@@ -568,7 +571,7 @@ async def reset_kyc(current_user = Depends(resolve_advertiser)):
 
 
 @router.get("/check")
-async def check_kyc(current_user = Depends(resolve_advertiser)):
+def check_kyc(current_user = Depends(resolve_advertiser)):
     """Tell the modal whether the advertiser owner still needs person-KYC."""
     advertiser_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
     if not advertiser_id:
@@ -9,6 +9,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 import os
 import secrets
@@ -50,7 +51,7 @@ class TeamMemberResponse(BaseModel):
 # DB (advertiser_profiles, advertiser_team_members, company_profile,
 # brand_profile) — there are no users-table reads here anymore.
 def get_adv_db():
-    return psycopg.connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
 
 # Auth dependency: advertiser-token only.
 from advertiser_auth_endpoints import resolve_advertiser
@@ -64,7 +65,7 @@ BASE_URL = os.getenv("BASE_URL", "https://astegni.com")
 # ============================================
 
 @router.get("/team")
-async def get_team_members(current_user = Depends(resolve_advertiser)):
+def get_team_members(current_user = Depends(resolve_advertiser)):
     """Get all team members for the current advertiser"""
     try:
         advertiser_profile_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
@@ -167,7 +168,7 @@ async def get_team_members(current_user = Depends(resolve_advertiser)):
 
 
 @router.post("/team/invite")
-async def invite_team_member(invite: TeamMemberInvite, current_user = Depends(resolve_advertiser)):
+def invite_team_member(invite: TeamMemberInvite, current_user = Depends(resolve_advertiser)):
     """Invite a new Brand Manager to the team"""
     try:
         advertiser_profile_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
@@ -317,7 +318,7 @@ async def invite_team_member(invite: TeamMemberInvite, current_user = Depends(re
 
 
 @router.post("/team/accept/{token}")
-async def accept_invitation(token: str, current_user = Depends(resolve_advertiser)):
+def accept_invitation(token: str, current_user = Depends(resolve_advertiser)):
     """Accept a team invitation. The invitee accepts as an advertiser-portal user
     whose advertiser account email matches the invited email."""
     try:
@@ -367,7 +368,7 @@ async def accept_invitation(token: str, current_user = Depends(resolve_advertise
 
 
 @router.put("/team/{member_id}")
-async def update_team_member(member_id: int, update: TeamMemberUpdate, current_user = Depends(resolve_advertiser)):
+def update_team_member(member_id: int, update: TeamMemberUpdate, current_user = Depends(resolve_advertiser)):
     """Update a Brand Manager's permissions (can_set_price)"""
     try:
         advertiser_profile_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
@@ -418,7 +419,7 @@ async def update_team_member(member_id: int, update: TeamMemberUpdate, current_u
 
 
 @router.delete("/team/{member_id}")
-async def remove_team_member(member_id: int, current_user = Depends(resolve_advertiser)):
+def remove_team_member(member_id: int, current_user = Depends(resolve_advertiser)):
     """Remove a Brand Manager from the team"""
     try:
         advertiser_profile_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
@@ -464,7 +465,7 @@ async def remove_team_member(member_id: int, current_user = Depends(resolve_adve
 
 
 @router.post("/team/{member_id}/resend")
-async def resend_invitation(member_id: int, current_user = Depends(resolve_advertiser)):
+def resend_invitation(member_id: int, current_user = Depends(resolve_advertiser)):
     """Resend invitation to a pending team member"""
     try:
         advertiser_profile_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
@@ -544,7 +545,7 @@ async def resend_invitation(member_id: int, current_user = Depends(resolve_adver
 # ============================================
 
 @router.get("/team/search-users")
-async def search_users_for_invite(q: str, current_user = Depends(resolve_advertiser)):
+def search_users_for_invite(q: str, current_user = Depends(resolve_advertiser)):
     """Search for existing users to invite to the team"""
     try:
         advertiser_profile_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
@@ -629,7 +630,7 @@ async def search_users_for_invite(q: str, current_user = Depends(resolve_adverti
 # ============================================
 
 @router.get("/team/invitation/{token}")
-async def get_invitation_details(token: str):
+def get_invitation_details(token: str):
     """Get invitation details by token (public endpoint - no auth required)"""
     try:
         # SPLIT cross-DB join: invitation + brand live on the advertiser DB;
@@ -695,7 +696,7 @@ async def get_invitation_details(token: str):
 
 
 @router.post("/team/invitation/{token}/accept")
-async def accept_invitation_by_token(token: str, current_user = Depends(resolve_advertiser)):
+def accept_invitation_by_token(token: str, current_user = Depends(resolve_advertiser)):
     """Accept a team invitation using the token from email link"""
     try:
         # Advertiser-DB read + write of the team membership.
@@ -749,7 +750,7 @@ async def accept_invitation_by_token(token: str, current_user = Depends(resolve_
 
 
 @router.post("/team/invitation/{token}/decline")
-async def decline_invitation_by_token(token: str, current_user = Depends(resolve_advertiser)):
+def decline_invitation_by_token(token: str, current_user = Depends(resolve_advertiser)):
     """Decline a team invitation"""
     try:
         with get_adv_db() as conn:
@@ -797,7 +798,7 @@ async def decline_invitation_by_token(token: str, current_user = Depends(resolve
 
 
 @router.get("/team/stats")
-async def get_team_stats(current_user = Depends(resolve_advertiser)):
+def get_team_stats(current_user = Depends(resolve_advertiser)):
     """Get team statistics"""
     try:
         advertiser_profile_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
@@ -8,6 +8,7 @@ from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, date
 import psycopg
+from db_pool import pooled_connect
 from decimal import Decimal
 import os
 
@@ -117,7 +118,7 @@ class TierEarningsSummary(BaseModel):
 
 def get_user_profile(user_id: int, role: str) -> dict:
     """Get user's profile ID and type based on role"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     profile_table_map = {
@@ -145,11 +146,11 @@ def get_user_profile(user_id: int, role: str) -> dict:
 # ============================================================================
 
 @router.get("/api/affiliate/tiers", response_model=List[AffiliateTier])
-async def get_affiliate_tiers(
+def get_affiliate_tiers(
     current_user: dict = Depends(get_current_user)
 ):
     """Get all active affiliate tier levels from admin database"""
-    conn = psycopg.connect(ADMIN_DATABASE_URL)
+    conn = pooled_connect(ADMIN_DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -181,7 +182,7 @@ async def get_affiliate_tiers(
 # ============================================================================
 
 @router.get("/api/affiliate/summary")
-async def get_affiliate_summary(
+def get_affiliate_summary(
     months: int = Query(6, ge=1, le=12),
     role: str = Query("tutor", description="User role: tutor, student, parent, advertiser"),
     current_user: dict = Depends(get_current_user)
@@ -195,7 +196,7 @@ async def get_affiliate_summary(
     profile_id = profile_info['profile_id']
     profile_type = profile_info['profile_type']
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -280,7 +281,7 @@ async def get_affiliate_summary(
 # ============================================================================
 
 @router.get("/api/affiliate/earnings/advertisement")
-async def get_advertisement_earnings(
+def get_advertisement_earnings(
     months: int = Query(6, ge=1, le=12),
     limit: int = Query(20, ge=1, le=100),
     role: str = Query("tutor", description="User role"),
@@ -296,7 +297,7 @@ async def get_advertisement_earnings(
     profile_id = profile_info['profile_id']
     profile_type = profile_info['profile_type']
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -365,7 +366,7 @@ async def get_advertisement_earnings(
             tier_rows = cur.fetchall()
 
             # Get affiliate tiers from admin DB for names
-            admin_conn = psycopg.connect(ADMIN_DATABASE_URL)
+            admin_conn = pooled_connect(ADMIN_DATABASE_URL)
             admin_cur = admin_conn.cursor()
             admin_cur.execute("SELECT tier_level, tier_name, commission_rate FROM affiliate_tiers WHERE is_active = true")
             tier_info = {row[0]: {"name": row[1], "rate": float(row[2])} for row in admin_cur.fetchall()}
@@ -459,7 +460,7 @@ async def get_advertisement_earnings(
 # ============================================================================
 
 @router.get("/api/affiliate/earnings/subscription")
-async def get_subscription_affiliate_earnings(
+def get_subscription_affiliate_earnings(
     months: int = Query(6, ge=1, le=12),
     limit: int = Query(20, ge=1, le=100),
     tier_level: Optional[int] = Query(None, description="Filter by tier level"),
@@ -475,7 +476,7 @@ async def get_subscription_affiliate_earnings(
     profile_id = profile_info['profile_id']
     profile_type = profile_info['profile_type']
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -532,7 +533,7 @@ async def get_subscription_affiliate_earnings(
             tier_rows = cur.fetchall()
 
             # Get affiliate tiers from admin DB for names
-            admin_conn = psycopg.connect(ADMIN_DATABASE_URL)
+            admin_conn = pooled_connect(ADMIN_DATABASE_URL)
             admin_cur = admin_conn.cursor()
             admin_cur.execute("SELECT tier_level, tier_name, commission_rate FROM affiliate_tiers WHERE is_active = true")
             tier_info = {row[0]: {"name": row[1], "rate": float(row[2])} for row in admin_cur.fetchall()}
@@ -607,7 +608,7 @@ async def get_subscription_affiliate_earnings(
 # ============================================================================
 
 @router.get("/api/affiliate/earnings/commission")
-async def get_commission_earnings(
+def get_commission_earnings(
     months: int = Query(6, ge=1, le=12),
     limit: int = Query(20, ge=1, le=100),
     tier_level: Optional[int] = Query(None, description="Filter by tier level"),
@@ -623,7 +624,7 @@ async def get_commission_earnings(
     profile_id = profile_info['profile_id']
     profile_type = profile_info['profile_type']
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -679,7 +680,7 @@ async def get_commission_earnings(
             tier_rows = cur.fetchall()
 
             # Get affiliate tiers from admin DB for names
-            admin_conn = psycopg.connect(ADMIN_DATABASE_URL)
+            admin_conn = pooled_connect(ADMIN_DATABASE_URL)
             admin_cur = admin_conn.cursor()
             admin_cur.execute("SELECT tier_level, tier_name, commission_rate FROM affiliate_tiers WHERE is_active = true")
             tier_info = {row[0]: {"name": row[1], "rate": float(row[2])} for row in admin_cur.fetchall()}
@@ -754,7 +755,7 @@ async def get_commission_earnings(
 # ============================================================================
 
 @router.get("/api/earnings/combined-summary")
-async def get_combined_earnings_summary(
+def get_combined_earnings_summary(
     months: int = Query(6, ge=1, le=12),
     role: str = Query("tutor", description="User role"),
     current_user: dict = Depends(get_current_user)
@@ -768,7 +769,7 @@ async def get_combined_earnings_summary(
     profile_id = profile_info['profile_id']
     profile_type = profile_info['profile_type']
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
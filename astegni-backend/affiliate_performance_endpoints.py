@@ -5,6 +5,7 @@ Provides statistics and analytics for the affiliate program
 
 from fastapi import APIRouter, HTTPException
 import psycopg
+from db_pool import pooled_connect
 import os
 from dotenv import load_dotenv
 
@@ -14,12 +15,12 @@ DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://astegni_user:Astegni2025@
 router = APIRouter(prefix="/api/admin", tags=["Affiliate Performance"])
 
 @router.get("/affiliate-performance")
-async def get_affiliate_performance():
+def get_affiliate_performance():
     """Get affiliate performance statistics"""
 
     conn = None
     try:
-        conn = psycopg.connect(DATABASE_URL)
+        conn = pooled_connect(DATABASE_URL)
         cursor = conn.cursor()
 
         # Get active affiliates count
@@ -133,12 +134,12 @@ async def get_affiliate_performance():
             conn.close()
 
 @router.get("/affiliate-performance/detailed")
-async def get_detailed_affiliate_performance():
+def get_detailed_affiliate_performance():
     """Get detailed affiliate performance with breakdown by time period"""
 
     conn = None
     try:
-        conn = psycopg.connect(DATABASE_URL)
+        conn = pooled_connect(DATABASE_URL)
         cursor = conn.cursor()
 
         # Monthly statistics for the last 12 months
@@ -11,6 +11,7 @@ starlette.formparsers.MultiPartParser.max_file_size = 50 * 1024 * 1024  # 50MB f
 
 import os
 import sys
+import asyncio
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -45,15 +46,72 @@ from fastapi import File, UploadFile
 async def lifespan(app_instance: FastAPI):
     """Lifespan context manager for startup and shutdown events"""
     # Startup
+    # KYC face matching workers - forked first, before the pools below start threads (see kyc_pipeline.py)
+    from kyc_pipeline import pipeline as kyc_pipeline
+    kyc_pipeline.start()
+
     b2_service = get_backblaze_service()
     if b2_service.configured:
         print(f"[OK] Connected to Backblaze B2 bucket: {b2_service.bucket.name}")
     else:
         print("[WARNING] Backblaze B2 not configured - using mock implementation")
 
+    # Keep the tutor smart-ranking index fresh (see tutor_ranking_index.py)
+    from tutor_ranking_index import ranking_refresh_loop
+    ranking_task = asyncio.create_task(ranking_refresh_loop())
+
+    # Serve ad placements from memory (see ad_serving_index.py)
+    from ad_serving_index import ad_index_refresh_loop
+    ad_index_task = asyncio.create_task(ad_index_refresh_loop())
+
+    # Market pricing feature matrix for price suggestions (see market_pricing_index.py)
+    from market_pricing_index import market_index_refresh_loop
+    market_index_task = asyncio.create_task(market_index_refresh_loop())
+
+    # Tutor availability intervals for "free at" search and conflict checks (see tutor_availability_index.py)
+    from tutor_availability_index import availability_index_refresh_loop
+    availability_index_task = asyncio.create_task(availability_index_refresh_loop())
+
+    # Inverted index of job alerts, percolated on job publish/update (see job_alert_matcher.py)
+    from job_alert_matcher import job_alert_index_refresh_loop
+    job_alert_index_task = asyncio.create_task(job_alert_index_refresh_loop())
+
+    # Buffered search/view counts and trending scores (see view_counters.py)
+    from view_counters import view_counter_flush_loop, flush_view_counters
+    view_counter_task = asyncio.create_task(view_counter_flush_loop())
+
+    # Write-behind impression tracking and CPM billing (see impression_ingestion.py)
+    from impression_ingestion import ingestion as impression_ingestion
+    await impression_ingestion.start()
+
+    # Shared Postgres pools for raw-psycopg endpoints (see db_pool.py)
+    from db_pool import open_async_pools
+    await open_async_pools()
+
+    # Cross-worker WebSocket delivery and presence (see websocket_backplane.py)
+    from websocket_manager import manager as ws_manager
+    await ws_manager.start()
+
     yield
 
-    # Shutdown (cleanup code goes here if needed in future)
+    # Shutdown
+    ranking_task.cancel()
+    ad_index_task.cancel()
+    market_index_task.cancel()
+    availability_index_task.cancel()
+    job_alert_index_task.cancel()
+    view_counter_task.cancel()
+    try:
+        await asyncio.to_thread(flush_view_counters)
+    except Exception as e:
+        print(f"[WARNING] Final view counter flush failed: {e}")
+    await ws_manager.stop()
+    await impression_ingestion.stop()
+
+    from db_pool import close_async_pools, close_pools
+    await close_async_pools()
+    close_pools()
+    kyc_pipeline.shutdown()
 
 # ============================================
 # FASTAPI APP SETUP
@@ -161,10 +219,18 @@ app.include_router(tutor_schedule_router)
 from tutor_sessions_endpoints import router as tutor_sessions_router
 app.include_router(tutor_sessions_router)
 
+# Double-booked sessions for tutor, student and parent views (see booking_conflicts.py)
+from session_conflict_endpoints import router as session_conflict_router
+app.include_router(session_conflict_router)
+
 # Tutor subscription endpoints (subscriptions with performance metrics)
 from tutor_subscription_endpoints import router as tutor_subscription_router
 app.include_router(tutor_subscription_router)
 
+# Include tutor availability routes (free-tutor search, bulk slots, conflict checks)
+from availability_endpoints import router as availability_router
+app.include_router(availability_router)
+
 # Include view tutor routes (comprehensive endpoints for view-tutor.html)
 from view_tutor_endpoints import router as view_tutor_router
 app.include_router(view_tutor_router)
@@ -560,6 +626,22 @@ def health_check():
         "timestamp": datetime.utcnow().isoformat() + "Z"
     }
 
+@app.get("/api/health/db-pools")
+def db_pool_health():
+    """Connection pool metrics: checked-out connections, waiters and wait time per pool"""
+    from db_pool import get_pool_stats
+    from websocket_db import get_socket_db_stats
+    stats = get_pool_stats()
+    # Connections WebSocket handlers hold right now, and the SQLAlchemy pool they share with HTTP
+    stats["websocket"] = get_socket_db_stats()
+    return stats
+
+@app.get("/api/health/kyc-pipeline")
+def kyc_pipeline_health():
+    """KYC face matching pool: tasks, encoding cache and per-stage timings"""
+    from kyc_pipeline import pipeline as kyc_pipeline
+    return kyc_pipeline.stats()
+
 @app.get("/api/footer-stats")
 def footer_stats():
     """Public endpoint: live counts shown in the site footer."""
@@ -582,6 +664,7 @@ def footer_stats():
 
 from fastapi import WebSocket, WebSocketDisconnect
 from websocket_manager import manager, handle_chat_message, handle_session_message, handle_video_call_message, handle_get_online_users, handle_whiteboard_message
+from websocket_db import socket_db
 import json
 
 @app.websocket("/ws/{user_id}")
@@ -597,12 +680,11 @@ async def websocket_endpoint_user_based(websocket: WebSocket, user_id: int):
     # Create a unique connection key using user_id
     connection_key = f"user_{user_id}"
 
-    # Get database session for online status tracking
-    db = SessionLocal()
-
+    # DB access is per message (socket_db), never held for the socket's lifetime
     try:
         # Connect and mark user online
-        await manager.connect(websocket, connection_key, db)
+        with socket_db() as db:
+            await manager.connect(websocket, connection_key, db)
         print(f"🔌 WebSocket connected: user {user_id} (key: {connection_key})")
 
         while True:
@@ -625,15 +707,16 @@ async def websocket_endpoint_user_based(websocket: WebSocket, user_id: int):
                                       "video_call_cancelled", "video_call_participant_left",
                                       "call_invitation", "call_answer", "call_declined", "call_ended", "call_cancelled",
                                       "call_mode_switched", "webrtc_offer"]:
-                    await handle_video_call_message(message, connection_key, db)
+                    with socket_db() as db:
+                        await handle_video_call_message(message, connection_key, db)
 
                 elif message_type == "get_online_users":
-                    # Get list of online users
+                    # Get list of online users (all workers)
                     await manager.send_personal_message(
-                        json.dumps({
+                        {
                             "type": "online_users",
-                            "users": list(manager.active_connections.keys())
-                        }),
+                            "users": await manager.get_online_keys()
+                        },
                         connection_key
                     )
 
@@ -646,13 +729,13 @@ async def websocket_endpoint_user_based(websocket: WebSocket, user_id: int):
                 print(f"❌ Error handling WebSocket message: {e}")
 
     except WebSocketDisconnect:
-        await manager.disconnect(connection_key, db)
+        with socket_db() as db:
+            await manager.disconnect(websocket, connection_key, db)
         print(f"🔌 WebSocket disconnected: user {user_id}")
     except Exception as e:
         print(f"❌ WebSocket error for user {user_id}: {e}")
-        await manager.disconnect(connection_key, db)
-    finally:
-        db.close()
+        with socket_db() as db:
+            await manager.disconnect(websocket, connection_key, db)
 
 
 @app.websocket("/ws/{profile_id}/{role}")
@@ -672,12 +755,11 @@ async def websocket_endpoint(websocket: WebSocket, profile_id: int, role: str):
     # Create a unique connection key using profile_id and role
     connection_key = f"{role}_{profile_id}"
 
-    # Get database session for online status tracking
-    db = SessionLocal()
-
+    # DB access is per message (socket_db), never held for the socket's lifetime
     try:
         # Connect and mark user online in profile table
-        await manager.connect(websocket, connection_key, db)
+        with socket_db() as db:
+            await manager.connect(websocket, connection_key, db)
         print(f"🔌 WebSocket connected: {role} profile {profile_id} (key: {connection_key})")
 
         while True:
@@ -700,23 +782,26 @@ async def websocket_endpoint(websocket: WebSocket, profile_id: int, role: str):
                                       "video_call_cancelled", "video_call_participant_left",
                                       "call_invitation", "call_answer", "call_declined", "call_ended", "call_cancelled",
                                       "call_mode_switched", "webrtc_offer"]:
-                    await handle_video_call_message(message, connection_key, db)
+                    with socket_db() as db:
+                        await handle_video_call_message(message, connection_key, db)
 
                 elif message_type == "get_online_users":
                     # Get list of online users from database
                     profile_types = message.get("profile_types")  # Optional filter
-                    await handle_get_online_users(db, connection_key, profile_types)
+                    with socket_db() as db:
+                        await handle_get_online_users(db, connection_key, profile_types)
 
                 elif message_type in ["whiteboard_stroke", "whiteboard_cursor",
                                       "whiteboard_text_typing", "whiteboard_tool_change",
                                       "whiteboard_permission_request", "whiteboard_permission_granted",
                                       "whiteboard_permission_denied", "whiteboard_permission_revoked",
                                       "whiteboard_page_change", "whiteboard_clear", "whiteboard_undo"]:
-                    await handle_whiteboard_message(message, connection_key, db)
+                    with socket_db() as db:
+                        await handle_whiteboard_message(message, connection_key, db)
 
                 elif message_type == "ping":
                     # Heartbeat to keep connection alive
-                    await websocket.send_text(json.dumps({"type": "pong"}))
+                    await manager.reply(websocket, connection_key, {"type": "pong"})
 
                 else:
                     print(f"Unknown WebSocket message type: {message_type}")
@@ -726,10 +811,13 @@ async def websocket_endpoint(websocket: WebSocket, profile_id: int, role: str):
 
     except WebSocketDisconnect:
         # Disconnect and mark user offline in profile table
-        await manager.disconnect(websocket, connection_key, db)
+        with socket_db() as db:
+            await manager.disconnect(websocket, connection_key, db)
         print(f"🔌 WebSocket disconnected: {role} profile {profile_id}")
-    finally:
-        db.close()
+    except Exception as e:
+        print(f"❌ WebSocket error for {role} profile {profile_id}: {e}")
+        with socket_db() as db:
+            await manager.disconnect(websocket, connection_key, db)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -6,9 +6,9 @@ from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 from sqlalchemy import (
     Column, Integer, String, DateTime, Float, Boolean, Text, JSON,
-    ForeignKey, Date, Time, Numeric, create_engine, func
+    ForeignKey, Date, Time, Numeric, Computed, create_engine, func
 )
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from pydantic import BaseModel, EmailStr, validator, model_validator
@@ -1802,6 +1802,68 @@ class TutorAnalysis(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class TutorRankingIndex(Base):
+    """
+    Materialized smart-ranking components per tutor.
+    Refreshed incrementally by tutor_ranking_index.py so /api/tutors can sort
+    and paginate in SQL instead of scoring every tutor on each request.
+    """
+    __tablename__ = 'tutor_ranking_index'
+
+    tutor_id = Column(Integer, ForeignKey('tutor_profiles.id', ondelete='CASCADE'), primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+
+    # TutorScoringCalculator components (see tutor_scoring.py for ranges)
+    rating_score = Column(Integer, default=0)
+    total_students_score = Column(Integer, default=0)
+    completion_rate_score = Column(Integer, default=0)
+    response_time_score = Column(Integer, default=0)
+    experience_score = Column(Integer, default=0)
+    payment_penalty = Column(Integer, default=0)
+
+    # Request-independent bonuses from the smart sort
+    trending_bonus = Column(Float, default=0.0)
+    verification_bonus = Column(Integer, default=0)
+
+    # Sum of everything above - per-request boosts are added on top at query time
+    base_score = Column(Float, default=0.0, index=True)
+    breakdown = Column(JSON, nullable=True)  # calculate_all_new_scores() breakdown
+
+    computed_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class TutorSearchDocument(Base):
+    """
+    Searchable text per tutor for the /api/tutors search parameter.
+    Rebuilt by triggers whenever a source row changes (migrate_add_tutor_search.py);
+    queried through tutor_search.py with trigram and full-text GIN indexes.
+    """
+    __tablename__ = 'tutor_search_documents'
+
+    tutor_id = Column(Integer, ForeignKey('tutor_profiles.id', ondelete='CASCADE'), primary_key=True)
+
+    # Source fields, one value per line
+    names = Column(Text, nullable=False, default='')  # users.first_name, father_name
+    location = Column(Text, nullable=False, default='')  # users.location
+    languages = Column(Text, nullable=False, default='')  # users.languages (JSON text)
+    courses = Column(Text, nullable=False, default='')  # verified courses of public packages: name, category, tags
+    schools = Column(Text, nullable=False, default='')  # experience credential titles (current or verified school)
+
+    # Substring (ILIKE) target - fields are newline-separated so a match never spans two of them
+    document = Column(Text, Computed(
+        "names || E'\\n' || location || E'\\n' || languages || E'\\n' || courses || E'\\n' || schools",
+        persisted=True
+    ))
+    # Ranking: names A, courses B, schools C, location/languages D
+    search_vector = Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('simple', names), 'A') || "
+        "setweight(to_tsvector('simple', courses), 'B') || "
+        "setweight(to_tsvector('simple', schools), 'C') || "
+        "setweight(to_tsvector('simple', location || ' ' || languages), 'D')",
+        persisted=True
+    ))
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
 class Document(Base):
     """
     Store teaching/learning documents (PDFs, worksheets, assignments, etc.)
@@ -2976,7 +3038,11 @@ class Conversation(Base):
     is_muted = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow)
+    # Latest non-deleted message, maintained by chat_messages triggers (migrate_add_conversation_summary.py)
+    last_message_id = Column(Integer, nullable=True)
     last_message_at = Column(DateTime, nullable=True)
+    last_message_type = Column(String(50), nullable=True)
+    last_message_sender_user_id = Column(Integer, nullable=True)
 
 
 class ConversationParticipant(Base):
@@ -2993,6 +3059,8 @@ class ConversationParticipant(Base):
     is_pinned = Column(Boolean, default=False)
     last_read_at = Column(DateTime, nullable=True)
     last_read_message_id = Column(Integer, nullable=True)
+    unread_count = Column(Integer, default=0, nullable=False)  # Messages from others since last read (trigger-maintained)
+    last_activity_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # Conversation list sort key (trigger-maintained)
     is_active = Column(Boolean, default=True)
     joined_at = Column(DateTime, default=datetime.utcnow)
     left_at = Column(DateTime, nullable=True)
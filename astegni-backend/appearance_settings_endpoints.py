@@ -48,7 +48,7 @@ class AppearanceSettingsResponse(BaseModel):
 
 
 @router.get("/api/user/appearance-settings", response_model=AppearanceSettingsResponse)
-async def get_appearance_settings(
+def get_appearance_settings(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -81,7 +81,7 @@ async def get_appearance_settings(
 
 
 @router.put("/api/user/appearance-settings")
-async def update_appearance_settings(
+def update_appearance_settings(
     settings: AppearanceSettingsUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -147,7 +147,7 @@ async def update_appearance_settings(
 
 
 @router.post("/api/user/appearance-settings/reset")
-async def reset_appearance_settings(
+def reset_appearance_settings(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
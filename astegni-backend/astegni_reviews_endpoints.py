@@ -14,6 +14,7 @@ from typing import Optional, List
 from datetime import datetime
 import os
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 
@@ -29,14 +30,14 @@ router = APIRouter()
 
 def get_admin_db():
     """Get admin database connection with dict_row factory"""
-    return psycopg.connect(ADMIN_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADMIN_DATABASE_URL, row_factory=dict_row)
 
 # ============================================
 # ENDPOINTS
 # ============================================
 
 @router.get("/api/admin/reviews/stats")
-async def get_review_stats():
+def get_review_stats():
     """Get review statistics for admin dashboard from admin_reviews table"""
     try:
         with get_admin_db() as conn:
@@ -106,7 +107,7 @@ async def get_review_stats():
 
 
 @router.get("/api/admin/reviews")
-async def get_reviews(
+def get_reviews(
     role: Optional[str] = None,
     rating: Optional[int] = Query(None, ge=1, le=5),
     department: Optional[str] = None,
@@ -179,7 +180,7 @@ async def get_reviews(
 
 
 @router.delete("/api/admin/reviews/{review_id}")
-async def delete_review(review_id: int):
+def delete_review(review_id: int):
     """Delete a review from admin_reviews table"""
     try:
         with get_admin_db() as conn:
@@ -203,7 +204,7 @@ async def delete_review(review_id: int):
 
 
 @router.get("/api/admin/reviews/count")
-async def get_reviews_count(
+def get_reviews_count(
     role: Optional[str] = None,
     rating: Optional[int] = Query(None, ge=1, le=5),
     department: Optional[str] = None
@@ -248,7 +249,7 @@ async def toggle_featured(request: dict):
 
 
 @router.get("/api/admin/reviews/departments")
-async def get_departments():
+def get_departments():
     """Get list of unique departments from admin_reviews"""
     try:
         with get_admin_db() as conn:
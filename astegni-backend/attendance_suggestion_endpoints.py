@@ -20,41 +20,23 @@ from pydantic import BaseModel
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_claims
 import os
-import jwt
-from jwt.exceptions import PyJWTError
 from dotenv import load_dotenv
 
 load_dotenv()
 
 router = APIRouter()
 
-# JWT Configuration
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 def get_db_connection():
     """Get database connection"""
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise Exception("DATABASE_URL not found in environment variables")
-    return psycopg.connect(database_url)
+    return pooled_connect(database_url)
 
-def get_current_user(authorization: str):
-    """Extract user from JWT token"""
-    try:
-        token = authorization.replace("Bearer ", "").strip()
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {
-            "id": int(user_id),
-            "roles": payload.get("roles", []),
-            "active_role": payload.get("role")
-        }
-    except (PyJWTError, ValueError):
-        raise HTTPException(status_code=401, detail="Could not validate credentials")
 
 # ============================================
 # ATTENDANCE LOGIC - THE SMART ALGORITHM
@@ -191,9 +173,9 @@ class ManualAttendanceUpdate(BaseModel):
 # ============================================
 
 @router.get("/api/tutor/sessions/{session_id}/attendance-suggestion", response_model=AttendanceSuggestionResponse)
-async def get_attendance_suggestion(
+def get_attendance_suggestion(
     session_id: int,
-    authorization: str = Depends(lambda auth: auth)
+    current_user: dict = Depends(get_current_user_claims)
 ):
     """
     Get AI-powered attendance suggestion based on whiteboard connection data.
@@ -206,7 +188,6 @@ async def get_attendance_suggestion(
 
     If session has no whiteboard, returns default 'present' with low confidence.
     """
-    current_user = get_current_user(authorization)
 
     # Verify user is tutor
     if 'tutor' not in current_user.get('roles', []):
@@ -319,10 +300,10 @@ async def get_attendance_suggestion(
 
 
 @router.put("/api/tutor/sessions/{session_id}/attendance")
-async def update_session_attendance(
+def update_session_attendance(
     session_id: int,
     data: ManualAttendanceUpdate,
-    authorization: str = Depends(lambda auth: auth)
+    current_user: dict = Depends(get_current_user_claims)
 ):
     """
     Mark or override attendance for a session.
@@ -333,7 +314,6 @@ async def update_session_attendance(
 
     This endpoint updates the sessions table (source of truth for attendance).
     """
-    current_user = get_current_user(authorization)
 
     # Verify user is tutor
     if 'tutor' not in current_user.get('roles', []):
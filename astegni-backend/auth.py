@@ -0,0 +1,191 @@
+"""
+Authentication dependencies for user-facing endpoints
+One place to decode access tokens and resolve the current user.
+
+Pick the cheapest dependency that gives the endpoint what it needs:
+
+    get_token_claims          TokenClaims from the JWT - no database access
+    get_current_user_claims   same, as a dict ({"id", "user_id", "role", "role_ids", ...})
+    get_current_user          ORM User (user_context_cache - zero queries on a cache hit)
+    get_current_user_dict     users row as a dict ({"id", "first_name", "email", "roles", ...})
+
+The token is decoded once per request and the user is resolved once per request
+(memoized on request.state), however many dependencies ask for it.
+
+Admin and advertiser tokens have their own dependencies
+(admin_auth_endpoints.get_current_admin, advertiser_auth_endpoints.resolve_advertiser)
+and are rejected here.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import jwt
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
+
+from config import SECRET_KEY, ALGORITHM
+from models import User, get_db
+from user_context_cache import load_user
+
+# OAuth2 scheme
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+
+def _credentials_exception(detail: str = "Could not validate credentials") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+@dataclass
+class TokenClaims:
+    """Verified access-token claims"""
+    user_id: int
+    role: Optional[str]                      # role the user is logged in as
+    role_ids: Dict[str, Optional[str]]       # {"tutor": "12", ...} as issued (string ids)
+    issued_at: Optional[float]
+    payload: dict = field(repr=False)
+
+    @property
+    def profile_ids(self) -> Dict[str, Optional[int]]:
+        """role_ids with integer profile ids"""
+        return {
+            role: int(role_id) if role_id is not None and str(role_id).isdigit() else None
+            for role, role_id in (self.role_ids or {}).items()
+        }
+
+    @property
+    def profile_id(self) -> Optional[int]:
+        """Profile id for the active role"""
+        return self.profile_ids.get(self.role) if self.role else None
+
+    def as_dict(self) -> dict:
+        return {
+            **self.payload,
+            "id": self.user_id,
+            "user_id": self.user_id,
+            "sub": str(self.user_id),
+            "email": self.payload.get("email"),
+            "role": self.role,
+            "active_role": self.role,
+            "role_ids": self.role_ids,
+            "roles": self.payload.get("roles") or list(self.role_ids.keys()),
+        }
+
+
+def decode_access_token(token: Optional[str]) -> TokenClaims:
+    """Verify a user access token. Raises 401 for missing, invalid, expired or non-user tokens."""
+    if not token:
+        raise _credentials_exception("Not authenticated")
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Admin/advertiser tokens carry a "type"; user tokens don't
+        if payload.get("type") in ("admin", "advertiser"):
+            raise _credentials_exception()
+        user_id = int(payload["sub"])
+    except jwt.ExpiredSignatureError:
+        raise _credentials_exception("Token has expired")
+    except (jwt.PyJWTError, KeyError, ValueError, TypeError):
+        raise _credentials_exception()
+
+    return TokenClaims(
+        user_id=user_id,
+        role=payload.get("role"),
+        role_ids=payload.get("role_ids") or {},
+        issued_at=payload.get("iat"),
+        payload=payload,
+    )
+
+
+def claims_from_authorization(authorization: Optional[str]) -> TokenClaims:
+    """Decode a raw "Bearer <token>" header value (for code outside dependency injection)"""
+    token = authorization.replace("Bearer ", "").strip() if authorization else None
+    return decode_access_token(token)
+
+
+# ============================================
+# DEPENDENCIES
+# ============================================
+
+def get_token_claims(request: Request, token: str = Depends(oauth2_scheme)) -> TokenClaims:
+    """Zero-query auth: verified token claims"""
+    cached = getattr(request.state, "auth_claims", None)
+    if cached is not None and cached[0] == token:
+        return cached[1]
+
+    claims = decode_access_token(token)
+    request.state.auth_claims = (token, claims)
+    return claims
+
+
+def get_current_user_claims(claims: TokenClaims = Depends(get_token_claims)) -> dict:
+    """Zero-query auth for endpoints that only need ids and roles from the token"""
+    return claims.as_dict()
+
+
+def get_current_user(
+    request: Request,
+    claims: TokenClaims = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Current user as a persistent ORM User, with token context attached:
+    role_ids (int ids), current_role, profile_type, profile_id.
+    """
+    cached = getattr(request.state, "auth_user", None)
+    if cached is not None and cached[0] is db:
+        return cached[1]
+
+    user = load_user(db, claims.user_id, claims.issued_at)
+    if user is None:
+        raise _credentials_exception()
+
+    user.role_ids = claims.profile_ids
+    user.current_role = claims.role or user.active_role
+    user.profile_type = user.current_role
+    user.profile_id = user.role_ids.get(user.current_role) if user.role_ids else None
+
+    request.state.auth_user = (db, user)
+    return user
+
+
+def get_current_user_dict(
+    claims: TokenClaims = Depends(get_token_claims),
+    user: User = Depends(get_current_user)
+) -> dict:
+    """Current user as a plain dict, for endpoints built on raw psycopg rows"""
+    return {
+        "id": user.id,
+        "first_name": user.first_name,
+        "father_name": user.father_name,
+        "grandfather_name": user.grandfather_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "phone": user.phone,
+        "profile_picture": user.profile_picture,
+        "roles": user.roles if isinstance(user.roles, list) else [],
+        "active_role": user.active_role,
+        "is_verified": user.is_verified,
+        "is_active": user.is_active,
+        "role_ids": claims.role_ids,
+    }
+
+
+def get_current_user_optional(
+    authorization: Optional[str] = None,
+    db: Session = Depends(get_db)
+) -> Optional[User]:
+    """Get current user if authenticated, None otherwise"""
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+
+    try:
+        claims = claims_from_authorization(authorization)
+    except HTTPException:
+        return None
+    return load_user(db, claims.user_id, claims.issued_at)
@@ -0,0 +1,135 @@
+"""
+Tutor Availability Endpoints
+Bulk slot queries and conflict checks served from the availability index
+(tutor_availability_index.py)
+
+- GET  /api/availability/free-tutors   tutors free for a slot on a date
+- POST /api/availability/slots         free intervals of up to 100 tutors over up to 31 days
+- POST /api/availability/check         conflict checks for a batch of proposed slots
+- GET  /api/availability/stats         index size
+
+All require a user access token. /check only lists the ids of conflicting
+sessions for the caller's own tutor profile; for other tutors it gives the count.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from auth import TokenClaims, get_current_user_claims, get_token_claims
+from tutor_availability_index import DAY_MINUTES, from_minutes, get_availability_index
+
+router = APIRouter(prefix="/api/availability", tags=["availability"])
+
+MAX_SLOT_TUTORS = 100
+MAX_SLOT_DAYS = 31
+MAX_CHECKS = 200
+
+
+def parse_minutes(value: str) -> int:
+    """'HH:MM' or 'HH:MM:SS' -> minute of day ('24:00' allowed as an end)"""
+    if value.strip() == '24:00':
+        return DAY_MINUTES
+    try:
+        parsed = datetime.strptime(value.strip()[:5], '%H:%M')
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid time '{value}', expected HH:MM")
+    return parsed.hour * 60 + parsed.minute
+
+
+def parse_slot(start_time: str, end_time: str) -> tuple:
+    start, end = parse_minutes(start_time), parse_minutes(end_time)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+    return start, end
+
+
+def format_intervals(intervals) -> List[dict]:
+    return [{"start_time": from_minutes(start), "end_time": from_minutes(end)} for start, end in intervals]
+
+
+# Pydantic Models
+class SlotsRequest(BaseModel):
+    tutor_ids: List[int] = Field(min_length=1, max_length=MAX_SLOT_TUTORS)
+    start_date: date
+    end_date: date
+
+
+class SlotCheck(BaseModel):
+    tutor_id: int
+    date: date
+    start_time: str = Field(description="HH:MM")
+    end_time: str = Field(description="HH:MM")
+
+
+class CheckRequest(BaseModel):
+    slots: List[SlotCheck] = Field(min_length=1, max_length=MAX_CHECKS)
+
+
+@router.get("/free-tutors")
+def get_free_tutors(
+    date: date = Query(..., description="YYYY-MM-DD"),
+    start_time: str = Query(..., description="HH:MM"),
+    end_time: str = Query(..., description="HH:MM"),
+    current_user: dict = Depends(get_current_user_claims)
+):
+    """Tutor profile ids whose schedule covers the slot and who have no session booked in it"""
+    start, end = parse_slot(start_time, end_time)
+    tutor_ids = get_availability_index().free_tutors(date, start, end)
+    return {
+        "date": date.isoformat(),
+        "start_time": from_minutes(start),
+        "end_time": from_minutes(end),
+        "tutor_ids": tutor_ids,
+        "count": len(tutor_ids)
+    }
+
+
+@router.post("/slots")
+def get_free_slots(request: SlotsRequest, current_user: dict = Depends(get_current_user_claims)):
+    """Free intervals (schedule windows minus booked sessions) per tutor and date"""
+    days = (request.end_date - request.start_date).days + 1
+    if days < 1 or days > MAX_SLOT_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range must cover 1-{MAX_SLOT_DAYS} days")
+
+    index = get_availability_index()
+    dates = [request.start_date + timedelta(days=offset) for offset in range(days)]
+    tutors = {}
+    for tutor_id in dict.fromkeys(request.tutor_ids):
+        tutors[tutor_id] = [
+            {"date": day.isoformat(), "free": format_intervals(index.free_intervals(tutor_id, day))}
+            for day in dates
+        ]
+    return {"start_date": request.start_date.isoformat(), "end_date": request.end_date.isoformat(), "tutors": tutors}
+
+
+@router.post("/check")
+def check_slots(request: CheckRequest, claims: TokenClaims = Depends(get_token_claims)):
+    """For each proposed slot: inside the tutor's schedule? overlapping booked sessions?"""
+    own_tutor_id = claims.profile_ids.get("tutor")
+    index = get_availability_index()
+    results = []
+    for slot in request.slots:
+        start, end = parse_slot(slot.start_time, slot.end_time)
+        result = index.check(slot.tutor_id, slot.date, start, end)
+        conflicts = result.pop("conflicting_session_ids")
+        result["conflicts"] = len(conflicts)
+        # Other tutors' sessions belong to their students - don't expose the ids
+        if own_tutor_id is not None and slot.tutor_id == own_tutor_id:
+            result["conflicting_session_ids"] = conflicts
+        results.append({
+            "tutor_id": slot.tutor_id,
+            "date": slot.date.isoformat(),
+            "start_time": from_minutes(start),
+            "end_time": from_minutes(end),
+            **result
+        })
+    return {"results": results}
+
+
+@router.get("/stats")
+def get_availability_stats(current_user: dict = Depends(get_current_user_claims)):
+    """Availability index size"""
+    return get_availability_index().stats()
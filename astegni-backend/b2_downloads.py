@@ -0,0 +1,352 @@
+"""
+B2 Downloads
+Streaming B2 downloads: HTTP byte ranges, chunk iterators and a local LRU disk cache
+
+BackblazeService.open_download() returns a B2Download - an iterator of chunks
+that can be handed straight to StreamingResponse (Starlette pulls sync
+iterators in the threadpool) or joined for callers that need bytes:
+
+    download = b2_service.open_download(file_path, parse_range_header(request.headers.get('range')))
+    return StreamingResponse(download, status_code=206 if download.partial else 200,
+                             media_type=download.content_type, headers=download.headers())
+
+Whole-object downloads up to B2_DOWNLOAD_CACHE_MAX_OBJECT_MB are written to
+B2_DOWNLOAD_CACHE_DIR while they stream; later requests (including ranges)
+are served from disk. Least recently used entries are evicted once a worker's
+entries exceed B2_DOWNLOAD_CACHE_MB. Set B2_DOWNLOAD_CACHE_MB=0 to disable.
+"""
+
+import hashlib
+import mimetypes
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Tuple
+
+B2_DOWNLOAD_CHUNK_SIZE = int(os.getenv('B2_DOWNLOAD_CHUNK_SIZE', 256 * 1024))
+B2_DOWNLOAD_CACHE_DIR = os.getenv('B2_DOWNLOAD_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'astegni-b2-cache')
+B2_DOWNLOAD_CACHE_MB = float(os.getenv('B2_DOWNLOAD_CACHE_MB', 256))
+B2_DOWNLOAD_CACHE_MAX_OBJECT_MB = float(os.getenv('B2_DOWNLOAD_CACHE_MAX_OBJECT_MB', 10))
+
+# (first byte, last byte); (None, n) is a suffix range - the last n bytes
+RangeSpec = Tuple[Optional[int], Optional[int]]
+
+
+# ============================================
+# HTTP RANGES
+# ============================================
+
+class RangeNotSatisfiable(Exception):
+    """The requested range lies outside the object (HTTP 416)"""
+
+    def __init__(self, size: int):
+        super().__init__(f"Range not satisfiable for {size} bytes")
+        self.size = size
+
+
+def parse_range_header(header: Optional[str]) -> Optional[RangeSpec]:
+    """
+    Parse a single-range 'bytes=start-end' / 'bytes=start-' / 'bytes=-suffix' header.
+
+    Returns None (serve the whole object) for a missing, malformed or
+    multi-range header, as RFC 9110 allows.
+    """
+    if not header or not header.strip().lower().startswith('bytes='):
+        return None
+    spec = header.strip()[6:].strip()
+    if ',' in spec or '-' not in spec:
+        return None
+    first, last = (part.strip() for part in spec.split('-', 1))
+    try:
+        if not first:
+            return (None, int(last)) if last else None
+        start = int(first)
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if start < 0 or (end is not None and end < start):
+        return None
+    return start, end
+
+
+def resolve_range(spec: Optional[RangeSpec], size: int) -> Tuple[int, int]:
+    """Absolute (start, end) inclusive byte positions of spec within an object of `size` bytes"""
+    if spec is None:
+        return 0, size - 1
+    start, end = spec
+    if start is None:
+        if not end:
+            raise RangeNotSatisfiable(size)
+        return max(size - end, 0), size - 1
+    if start >= size:
+        raise RangeNotSatisfiable(size)
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+# ============================================
+# DOWNLOADS
+# ============================================
+
+class B2Download:
+    """
+    An open download of bytes start..end (inclusive) of a `size`-byte object.
+
+    Iterating yields chunks; the underlying response / file is released when
+    the chunks run out or the abandoned iterator is collected (a client that
+    disconnects mid-stream). close() releases it without reading.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterator[bytes],
+        size: int,
+        start: int,
+        end: int,
+        content_type: str,
+        partial: bool = False,
+        cached: bool = False,
+        release: Optional[Callable[[], None]] = None
+    ):
+        self._chunks = chunks
+        self._release = release
+        self.size = size
+        self.start = start
+        self.end = end
+        self.content_type = content_type
+        self.partial = partial
+        self.cached = cached
+
+    @property
+    def content_length(self) -> int:
+        return max(self.end - self.start + 1, 0)
+
+    def headers(self) -> Dict[str, str]:
+        """Content-Length / Accept-Ranges (and Content-Range for a partial download)"""
+        headers = {
+            'Accept-Ranges': 'bytes',
+            'Content-Length': str(self.content_length),
+        }
+        if self.partial:
+            headers['Content-Range'] = f"bytes {self.start}-{self.end}/{self.size}"
+        return headers
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        return next(self._chunks)
+
+    def read(self) -> bytes:
+        """The whole range as bytes"""
+        return b''.join(self._chunks)
+
+    def close(self):
+        self._chunks.close()
+        # An unstarted generator skips its finally on close()
+        if self._release:
+            self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def iter_file(f: BinaryIO, start: int, end: int, chunk_size: int = B2_DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """Chunks of bytes start..end of an open local file; closes it however iteration ends"""
+    try:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+def iter_response(response, on_chunk: Optional[Callable[[bytes], None]] = None,
+                  on_complete: Optional[Callable[[], None]] = None,
+                  on_abort: Optional[Callable[[], None]] = None,
+                  chunk_size: int = B2_DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """Chunks of a streaming requests response; closes it however iteration ends"""
+    completed = False
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if on_chunk:
+                on_chunk(chunk)
+            yield chunk
+        completed = True
+        if on_complete:
+            on_complete()
+    finally:
+        response.close()
+        if not completed and on_abort:
+            on_abort()
+
+
+# ============================================
+# DISK CACHE
+# ============================================
+
+class CacheEntry:
+    __slots__ = ('path', 'size', 'content_type')
+
+    def __init__(self, path: str, size: int, content_type: str):
+        self.path = path
+        self.size = size
+        self.content_type = content_type
+
+
+class CacheWriter:
+    """Writes one object to a temp file (created on the first chunk); commit() publishes it atomically"""
+
+    def __init__(self, cache: 'DownloadCache', key: str, content_type: str):
+        self.cache = cache
+        self.key = key
+        self.content_type = content_type
+        self.size = 0
+        self._file: Optional[BinaryIO] = None
+        self._temp_path: Optional[str] = None
+
+    def write(self, chunk: bytes):
+        if self._file is None:
+            self._file = tempfile.NamedTemporaryFile(dir=self.cache.directory, prefix='.partial_', delete=False)
+            self._temp_path = self._file.name
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self):
+        if self._file is None:
+            return
+        self._file.close()
+        os.replace(self._temp_path, self.cache.path_for(self.key))
+        self._file = self._temp_path = None
+        self.cache._add(self.key, self.size, self.content_type)
+
+    def abort(self):
+        if self._file is None:
+            return
+        self._file.close()
+        try:
+            os.unlink(self._temp_path)
+        except FileNotFoundError:
+            pass
+        self._file = self._temp_path = None
+
+
+class DownloadCache:
+    """
+    LRU cache of whole B2 objects on local disk, keyed by B2 file path.
+
+    Files are shared between workers (written atomically, named by the SHA-1
+    of the path); each worker tracks and evicts the entries it has used, up to
+    max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_object_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_object_bytes = max_object_bytes
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def cacheable(self, size: int) -> bool:
+        return 0 < size <= self.max_object_bytes
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._adopt(key)
+        elif not os.path.exists(entry.path):
+            # Evicted by another worker
+            self.discard(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def _adopt(self, key: str) -> Optional[CacheEntry]:
+        """Pick up a file another worker (or an earlier run) cached"""
+        path = self.path_for(key)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        content_type = mimetypes.guess_type(key)[0] or 'application/octet-stream'
+        return self._add(key, size, content_type)
+
+    def writer(self, key: str, content_type: str) -> CacheWriter:
+        return CacheWriter(self, key, content_type)
+
+    def _add(self, key: str, size: int, content_type: str) -> CacheEntry:
+        entry = CacheEntry(self.path_for(key), size, content_type)
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= old.size
+                evicted.append(old.path)
+        for path in evicted:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        return entry
+
+    def discard(self, key: str):
+        """Forget and delete an object (deleted or replaced in B2)"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+        try:
+            os.unlink(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+def create_download_cache() -> Optional[DownloadCache]:
+    """Disk cache configured by B2_DOWNLOAD_CACHE_* (None when B2_DOWNLOAD_CACHE_MB is 0)"""
+    if B2_DOWNLOAD_CACHE_MB <= 0:
+        return None
+    try:
+        return DownloadCache(
+            B2_DOWNLOAD_CACHE_DIR,
+            int(B2_DOWNLOAD_CACHE_MB * 1024 * 1024),
+            int(B2_DOWNLOAD_CACHE_MAX_OBJECT_MB * 1024 * 1024)
+        )
+    except OSError as e:
+        print(f"[B2Downloads] Cache disabled - cannot use {B2_DOWNLOAD_CACHE_DIR}: {e}")
+        return None
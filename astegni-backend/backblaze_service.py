@@ -3,23 +3,44 @@ Backblaze B2 Service for file uploads with organized folder structure
 """
 
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 import mimetypes
 from dotenv import load_dotenv
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 # Ensure environment variables are loaded
 load_dotenv()
 
 try:
-    from b2sdk.v2 import InMemoryAccountInfo, B2Api
+    from b2sdk.v2 import InMemoryAccountInfo, B2Api, UploadSourceLocalFile, WriteIntent
+    from b2sdk.v2.exception import FileNotPresent
     B2_AVAILABLE = True
 except ImportError:
     B2_AVAILABLE = False
 
+from b2_downloads import (
+    B2Download, RangeNotSatisfiable, RangeSpec, create_download_cache, iter_file, iter_response, resolve_range
+)
+from upload_spool import SpooledUpload, spool_upload
+import storage_index
+
 logger = logging.getLogger(__name__)
 
+# Disk-spooled uploads go up as B2 large files in parts of this size (B2 minimum: 5MB),
+# up to B2_MAX_UPLOAD_WORKERS parts in parallel
+B2_UPLOAD_PART_SIZE = int(os.getenv('B2_UPLOAD_PART_SIZE', 10 * 1024 * 1024))
+B2_MAX_UPLOAD_WORKERS = int(os.getenv('B2_MAX_UPLOAD_WORKERS', 10))
+
+# Identity documents and selfies: never served through /api/files or written to the download cache
+PRIVATE_FILE_PREFIXES = ('images/kyc/',)
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg']
+VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.mkv']
+DOCUMENT_EXTENSIONS = ['.pdf', '.doc', '.docx', '.txt', '.odt', '.rtf', '.jpg', '.jpeg', '.png']
+
 
 class BackblazeService:
     """Backblaze B2 service with organized folder structure"""
@@ -86,6 +107,11 @@ class BackblazeService:
         self.configured = False
         self.bucket = None
         self.b2_api = None
+        self.download_cache = create_download_cache()
+
+        # Record uploads/deletes in storage_objects (storage_index.py); per-user
+        # stats and listings read from there instead of scanning the bucket
+        self.index_storage = os.getenv('STORAGE_INDEX_ENABLED', 'true').lower() == 'true'
 
         # When B2 is unavailable/unconfigured, uploads MUST fail (return None) so
         # callers don't persist a fake mock URL as if it were a real file. Only
@@ -107,7 +133,7 @@ class BackblazeService:
 
             if key_id and app_key:
                 info = InMemoryAccountInfo()
-                self.b2_api = B2Api(info)
+                self.b2_api = B2Api(info, max_upload_workers=B2_MAX_UPLOAD_WORKERS)
                 self.b2_api.authorize_account("production", key_id, app_key)
                 self.bucket = self.b2_api.get_bucket_by_name(bucket_name)
                 self.configured = True
@@ -162,9 +188,56 @@ class BackblazeService:
 
         return f"{folder}{unique_name}"
 
+    def _put(self, file_data: Union[bytes, SpooledUpload], file_path: str, content_type: str):
+        """
+        Store file_data at file_path. Blocking - call from a worker thread in async code.
+
+        Disk-spooled uploads are sent as a B2 large file: the SDK uploads
+        B2_UPLOAD_PART_SIZE parts in parallel from the temp file, with the
+        SHA-1 computed while spooling. Everything else is a single upload_bytes.
+        """
+        if self.download_cache:
+            self.download_cache.discard(file_path)
+
+        if isinstance(file_data, SpooledUpload):
+            if file_data.on_disk:
+                source = UploadSourceLocalFile(local_path=file_data.path, content_sha1=file_data.sha1)
+                return self.bucket.create_file(
+                    [WriteIntent(source)],
+                    file_path,
+                    content_type=content_type,
+                    recommended_upload_part_size=B2_UPLOAD_PART_SIZE,
+                    large_file_sha1=file_data.sha1
+                )
+            file_data = file_data.getvalue()
+
+        return self.bucket.upload_bytes(
+            file_data,
+            file_path,
+            content_type=content_type
+        )
+
+    def _index_upload(self, file_info, file_path: str, content_type: str):
+        """Record an uploaded object in storage_objects; a failure is left for reconciliation"""
+        if not self.index_storage:
+            return
+        try:
+            storage_index.record_upload(file_path, file_info.id_, file_info.size,
+                                        content_type, file_info.upload_timestamp)
+        except Exception as e:
+            logger.warning(f"Failed to index upload {file_path}: {str(e)}")
+
+    def _index_delete(self, file_path: str):
+        if not self.index_storage:
+            return
+        try:
+            storage_index.record_delete(file_path)
+        except Exception as e:
+            logger.warning(f"Failed to remove {file_path} from storage index: {str(e)}")
+
     def upload_file(
         self,
-        file_data: bytes,
+        file_data: Union[bytes, SpooledUpload],
         file_name: str,
         file_type: str = None,
         content_type: str = None,
@@ -174,7 +247,7 @@ class BackblazeService:
         Upload file to Backblaze B2 with organized folder structure
 
         Args:
-            file_data: File content as bytes
+            file_data: File content as bytes or a SpooledUpload (upload_spool.py)
             file_name: Original file name
             file_type: Type of file for folder organization
             content_type: MIME type of the file
@@ -209,11 +282,8 @@ class BackblazeService:
 
         try:
             # Upload to B2
-            file_info = self.bucket.upload_bytes(
-                file_data,
-                file_path,
-                content_type=content_type
-            )
+            file_info = self._put(file_data, file_path, content_type)
+            self._index_upload(file_info, file_path, content_type)
 
             # Get public URL
             download_url = self.bucket.get_download_url(file_path)
@@ -236,7 +306,7 @@ class BackblazeService:
 
     def upload_file_to_folder(
         self,
-        file_data: bytes,
+        file_data: Union[bytes, SpooledUpload],
         file_name: str,
         folder_path: str,
         content_type: str = None
@@ -245,7 +315,7 @@ class BackblazeService:
         Upload file to a specific folder path in Backblaze B2
 
         Args:
-            file_data: File content as bytes
+            file_data: File content as bytes or a SpooledUpload (upload_spool.py)
             file_name: Original file name
             folder_path: Custom folder path (e.g., 'images/user_115/BrandName/CampaignName/')
             content_type: MIME type of the file
@@ -289,11 +359,8 @@ class BackblazeService:
 
         try:
             # Upload to B2
-            file_info = self.bucket.upload_bytes(
-                file_data,
-                file_path,
-                content_type=content_type
-            )
+            file_info = self._put(file_data, file_path, content_type)
+            self._index_upload(file_info, file_path, content_type)
 
             # Get public URL
             download_url = self.bucket.get_download_url(file_path)
@@ -314,24 +381,141 @@ class BackblazeService:
             logger.error(f"Failed to upload file to folder: {str(e)}")
             return None
 
-    def download_file(self, file_path: str) -> Optional[bytes]:
-        """Download file from B2"""
+    async def _upload_request_file(
+        self,
+        file: UploadFile,
+        folder: str,
+        max_size_mb: float,
+        allowed_extensions: list,
+        kind: str
+    ) -> Dict[str, Any]:
+        """
+        Stream an UploadFile into `folder` without holding it in memory or blocking the event loop
+
+        Returns the upload_file_to_folder result plus 'public_url'; raises HTTPException on failure.
+        """
+        extension = os.path.splitext(file.filename or '')[1].lower()
+        if extension not in allowed_extensions:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid {kind} type. Allowed: {', '.join(allowed_extensions)}"
+            )
+
+        spool = await spool_upload(
+            file,
+            max_bytes=int(max_size_mb * 1024 * 1024),
+            too_large_detail=f"{kind.capitalize()} size exceeds {max_size_mb:g}MB limit"
+        )
+        try:
+            result = await run_in_threadpool(
+                self.upload_file_to_folder,
+                file_data=spool,
+                file_name=file.filename,
+                folder_path=folder,
+                content_type=file.content_type
+            )
+        finally:
+            spool.close()
+
+        if not result:
+            raise HTTPException(status_code=500, detail=f"Failed to upload {kind}")
+        result['public_url'] = result['url']
+        result.setdefault('size', spool.size)
+        return result
+
+    async def upload_image(self, file: UploadFile, folder: str, max_size_mb: float = 5) -> Dict[str, Any]:
+        """Upload an image from a request to `folder`"""
+        return await self._upload_request_file(file, folder, max_size_mb, IMAGE_EXTENSIONS, 'image')
+
+    async def upload_video(self, file: UploadFile, folder: str, max_size_mb: float = 200) -> Dict[str, Any]:
+        """Upload a video from a request to `folder` (large videos go up as multi-part B2 files)"""
+        return await self._upload_request_file(file, folder, max_size_mb, VIDEO_EXTENSIONS, 'video')
+
+    async def upload_document(self, file: UploadFile, folder: str, max_size_mb: float = 10) -> Dict[str, Any]:
+        """Upload a document (or scanned image) from a request to `folder`"""
+        return await self._upload_request_file(file, folder, max_size_mb, DOCUMENT_EXTENSIONS, 'document')
+
+    def open_download(self, file_path: str, byte_range: Optional[RangeSpec] = None) -> Optional[B2Download]:
+        """
+        Open a streaming download of file_path, or of one byte range of it (b2_downloads.py)
+
+        Blocking - call from a worker thread in async code. Served from the local
+        disk cache when the object is there; whole downloads of small objects are
+        cached as they stream. PRIVATE_FILE_PREFIXES objects bypass the cache.
+
+        Returns None if B2 is not configured or the file does not exist;
+        raises RangeNotSatisfiable for a range outside the file.
+        """
+        cache = None if file_path.startswith(PRIVATE_FILE_PREFIXES) else self.download_cache
+        if cache:
+            entry = cache.get(file_path)
+            if entry:
+                start, end = resolve_range(byte_range, entry.size)
+                try:
+                    f = open(entry.path, 'rb')
+                except FileNotFoundError:
+                    cache.discard(file_path)  # Evicted by another worker - fetch from B2
+                else:
+                    return B2Download(
+                        iter_file(f, start, end), entry.size, start, end, entry.content_type,
+                        partial=byte_range is not None, cached=True, release=f.close
+                    )
+
         if not self.configured or not B2_AVAILABLE:
             logger.warning("B2 not configured - download simulated")
             return None
 
         try:
-            download = self.bucket.download_file_by_name(file_path)
-            content = b''
-            for chunk in download.response.iter_content(chunk_size=1024):
-                content += chunk
-            return content
+            b2_range = None
+            if byte_range is not None:
+                # The range may be open-ended or a suffix, so the size comes first
+                size = self.bucket.get_file_info_by_name(file_path).size
+                b2_range = resolve_range(byte_range, size)
+            download = self.bucket.download_file_by_name(file_path, range_=b2_range)
+        except RangeNotSatisfiable:
+            raise
+        except FileNotPresent:
+            return None
+        except Exception as e:
+            logger.error(f"Failed to download file: {str(e)}")
+            return None
+
+        response = download.response
+        size = download.download_version.size
+        content_type = download.download_version.content_type or 'application/octet-stream'
+        start, end = b2_range or (0, size - 1)
+
+        if byte_range is None and cache and cache.cacheable(size):
+            writer = cache.writer(file_path, content_type)
+            chunks = iter_response(response, on_chunk=writer.write, on_complete=writer.commit, on_abort=writer.abort)
+
+            def release():
+                response.close()
+                writer.abort()
+        else:
+            chunks = iter_response(response)
+            release = response.close
+
+        return B2Download(chunks, size, start, end, content_type, partial=byte_range is not None, release=release)
+
+    def download_file(self, file_path: str) -> Optional[bytes]:
+        """Download file from B2"""
+        download = self.open_download(file_path)
+        if download is None:
+            return None
+
+        try:
+            with download:
+                return download.read()
         except Exception as e:
             logger.error(f"Failed to download file: {str(e)}")
             return None
 
     def delete_file(self, file_path: str, file_id: str = None) -> bool:
         """Delete file from B2"""
+        if self.download_cache:
+            self.download_cache.discard(file_path)
+
         if not self.configured or not B2_AVAILABLE:
             logger.warning("B2 not configured - deletion simulated")
             return True
@@ -343,6 +527,7 @@ class BackblazeService:
                 file_id = file_info.id_
 
             self.bucket.delete_file_version(file_id, file_path)
+            self._index_delete(file_path)
             logger.info(f"Successfully deleted file: {file_path}")
             return True
         except Exception as e:
@@ -361,37 +546,23 @@ class BackblazeService:
         Returns:
             List of file information dictionaries
         """
-        if not self.configured or not B2_AVAILABLE:
-            logger.warning("B2 not configured - listing simulated")
-            return []
-
         try:
-            # Build the folder path to search
+            # Indexed by owner (storage_index.py) - no bucket listing
+            prefix = None
             if file_type and file_type in self.FOLDER_MAPPING:
-                base_folder = f"{self.FOLDER_MAPPING[file_type]}user_{user_id}/"
-            else:
-                # Search across all user folders
-                base_folder = None
-
-            files = []
-            search_pattern = f"user_{user_id}/" if base_folder is None else base_folder
-
-            for file_info, _ in self.bucket.ls(
-                folder_to_list=base_folder,
-                recursive=True if base_folder is None else False,
-                fetch_count=limit
-            ):
-                # Filter for user's files if searching across all folders
-                if search_pattern in file_info.file_name:
-                    files.append({
-                        'fileName': file_info.file_name,
-                        'fileId': file_info.id_,
-                        'size': file_info.size,
-                        'uploadTimestamp': file_info.upload_timestamp,
-                        'url': self.bucket.get_download_url(file_info.file_name)
-                    })
-
-            return files
+                prefix = f"{self.FOLDER_MAPPING[file_type]}user_{user_id}/"
+
+            return [
+                {
+                    'fileName': file_path,
+                    'fileId': file_id,
+                    'size': size,
+                    'uploadTimestamp': int(uploaded_at.replace(tzinfo=timezone.utc).timestamp() * 1000),
+                    'url': self.get_file_url(file_path)
+                }
+                for file_path, file_id, size, uploaded_at
+                in storage_index.list_owner_objects(str(user_id), prefix, limit)
+            ]
         except Exception as e:
             logger.error(f"Failed to list user files: {str(e)}")
             return []
@@ -419,6 +590,9 @@ class BackblazeService:
 
             file_info = self.bucket.get_file_info_by_name(file_path)
             self.bucket.delete_file_version(file_info.id_, file_path)
+            if self.download_cache:
+                self.download_cache.discard(file_path)
+            self._index_delete(file_path)
             logger.info(f"Successfully deleted user file: {file_path}")
             return True
         except Exception as e:
@@ -435,13 +609,6 @@ class BackblazeService:
         Returns:
             Dictionary with storage statistics
         """
-        if not self.configured or not B2_AVAILABLE:
-            return {
-                'totalFiles': 0,
-                'totalSize': 0,
-                'breakdown': {}
-            }
-
         try:
             stats = {
                 'totalFiles': 0,
@@ -454,26 +621,13 @@ class BackblazeService:
                 }
             }
 
-            search_pattern = f"user_{user_id}/"
-
-            for file_info, _ in self.bucket.ls(recursive=True, fetch_count=10000):
-                if search_pattern in file_info.file_name:
-                    stats['totalFiles'] += 1
-                    stats['totalSize'] += file_info.size
-
-                    # Categorize by type
-                    if '/images/' in file_info.file_name:
-                        stats['breakdown']['images']['count'] += 1
-                        stats['breakdown']['images']['size'] += file_info.size
-                    elif '/videos/' in file_info.file_name:
-                        stats['breakdown']['videos']['count'] += 1
-                        stats['breakdown']['videos']['size'] += file_info.size
-                    elif '/audio/' in file_info.file_name:
-                        stats['breakdown']['audio']['count'] += 1
-                        stats['breakdown']['audio']['size'] += file_info.size
-                    elif '/documents/' in file_info.file_name:
-                        stats['breakdown']['documents']['count'] += 1
-                        stats['breakdown']['documents']['size'] += file_info.size
+            # Aggregated from storage_objects (storage_index.py) - no bucket scan
+            for category, (count, size) in storage_index.get_owner_usage(str(user_id)).items():
+                stats['totalFiles'] += count
+                stats['totalSize'] += size
+                if category in stats['breakdown']:
+                    stats['breakdown'][category]['count'] += count
+                    stats['breakdown'][category]['size'] += size
 
             # Convert sizes to human readable format
             stats['totalSizeFormatted'] = self._format_size(stats['totalSize'])
@@ -78,7 +78,7 @@ def get_db():
 
 
 @router.get("", response_model=List[BasePriceRuleResponse])
-async def get_all_base_price_rules(
+def get_all_base_price_rules(
     db: Session = Depends(get_db)
 ):
     """Get all base price rules, ordered by priority and creation date"""
@@ -91,7 +91,7 @@ async def get_all_base_price_rules(
 
 
 @router.get("/{rule_id}", response_model=BasePriceRuleResponse)
-async def get_base_price_rule(
+def get_base_price_rule(
     rule_id: int,
     db: Session = Depends(get_db)
 ):
@@ -108,7 +108,7 @@ async def get_base_price_rule(
 
 
 @router.post("", response_model=BasePriceRuleResponse, status_code=status.HTTP_201_CREATED)
-async def create_base_price_rule(
+def create_base_price_rule(
     rule_data: BasePriceRuleCreate,
     db: Session = Depends(get_db)
 ):
@@ -159,7 +159,7 @@ async def create_base_price_rule(
 
 
 @router.put("/{rule_id}", response_model=BasePriceRuleResponse)
-async def update_base_price_rule(
+def update_base_price_rule(
     rule_id: int,
     rule_data: BasePriceRuleUpdate,
     db: Session = Depends(get_db)
@@ -219,7 +219,7 @@ async def update_base_price_rule(
 
 
 @router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_base_price_rule(
+def delete_base_price_rule(
     rule_id: int,
     db: Session = Depends(get_db)
 ):
@@ -239,7 +239,7 @@ async def delete_base_price_rule(
 
 
 @router.get("/match/tutor", response_model=Optional[BasePriceRuleResponse])
-async def get_matching_base_price(
+def get_matching_base_price(
     subject_category: str,
     session_format: str,
     db: Session = Depends(get_db)
@@ -0,0 +1,121 @@
+"""
+Ad serving benchmark
+Ad requests per second for /api/campaigns/ads/placement/{placement_type}:
+
+    sql     the previous implementation: pooled advertiser-DB connection, campaign_profile x
+            campaign_media join with the geographic / target_pages predicates, ORDER BY RANDOM()
+    index   ad_serving_index.AdIndex.pick() (what the endpoint does now)
+
+Both run in-process against the advertiser database, cycling through every
+placement with a mix of countries and pages. --threads runs the SQL path from
+several threads, as uvicorn's threadpool would.
+
+Usage:
+    python benchmark_ad_serving.py
+    python benchmark_ad_serving.py --seconds 10 --threads 8 --limit 3
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from ad_serving_index import ADVERTISER_DATABASE_URL, get_ad_index
+from db_pool import pooled_connect
+
+
+def sql_pick(placement, limit, user_country=None, page_location=None):
+    """The query get_ads_by_placement ran on every request before the index"""
+    conn = pooled_connect(ADVERTISER_DATABASE_URL)
+    cursor = conn.cursor()
+    try:
+        query = """
+            SELECT cp.id, cp.name, cp.advertiser_id, cp.brand_id, cm.id, cm.file_url,
+                   cm.content_type, cm.media_type, 0, cp.target_location,
+                   cp.target_audiences, cp.target_regions, cp.cpi_rate
+            FROM campaign_profile cp
+            INNER JOIN campaign_media cm ON cp.id = cm.campaign_id
+            WHERE cp.campaign_status = 'active'
+              AND cp.verification_status IN ('verified', 'approved')
+              AND cm.placement = %s
+        """
+        params = [placement]
+        if user_country:
+            query += """ AND (
+                cp.target_location = 'global'
+                OR cp.target_location IS NULL
+                OR (cp.target_location = 'national' AND cp.national_country_code = %s)
+                OR (cp.target_location = 'regional' AND %s = ANY(cp.target_regions))
+            )"""
+            params.extend([user_country, user_country])
+        else:
+            query += " AND (cp.target_location = 'global' OR cp.target_location IS NULL)"
+        if page_location:
+            query += """ AND (
+                cp.target_pages IS NULL
+                OR array_length(cp.target_pages, 1) IS NULL
+                OR %s = ANY(cp.target_pages)
+            )"""
+            params.append(page_location)
+        query += " ORDER BY RANDOM() LIMIT %s"
+        params.append(limit)
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def request_mix():
+    placements = list(get_ad_index().placements) or ["leaderboard-banner"]
+    countries = [None, "ET", "US", "KE"]
+    pages = [None, "home", "tutor_profile", "find_tutors"]
+    return list(itertools.product(placements, countries, pages))
+
+
+def run_for(seconds, fn, mix, limit):
+    done = 0
+    deadline = time.perf_counter() + seconds
+    for placement, country, page in itertools.cycle(mix):
+        fn(placement, limit, country, page)
+        done += 1
+        if time.perf_counter() >= deadline:
+            return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ad serving benchmark")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    index = get_ad_index()
+    mix = request_mix()
+    print("=" * 70)
+    print(f"Ad serving benchmark - {len(index.rows)} servable creatives, {len(mix)} request shapes")
+    print("=" * 70)
+
+    sql_single = run_for(args.seconds, sql_pick, mix, args.limit) / args.seconds
+    with ThreadPoolExecutor(args.threads) as pool:
+        counts = pool.map(lambda _: run_for(args.seconds, sql_pick, mix, args.limit), range(args.threads))
+        sql_threads = sum(counts) / args.seconds
+
+    def index_pick(placement, limit, country, page):
+        return index.pick(placement, limit, user_country=country, page_location=page)
+
+    index_single = run_for(args.seconds, index_pick, mix, args.limit) / args.seconds
+
+    print(f"{'sql (1 thread)':<28} {sql_single:>12,.0f} req/s  {1e6 / sql_single:>10,.1f} us/req")
+    print(f"{f'sql ({args.threads} threads)':<28} {sql_threads:>12,.0f} req/s")
+    print(f"{'index (1 thread)':<28} {index_single:>12,.0f} req/s  {1e6 / index_single:>10,.1f} us/req")
+    print(f"\nindex / sql (1 thread): {index_single / sql_single:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Auth overhead micro-benchmark
+Measures the per-request cost of each auth dependency in auth.py, in-process
+(FastAPI TestClient, no network), against the local database:
+
+    legacy        per-router copy: decode JWT + SELECT users row on every request
+    claims        get_current_user_claims - JWT only, no database access
+    user_cold     get_current_user with an empty user context cache (one SELECT)
+    user_cached   get_current_user with a warm cache (no queries)
+    user_dict     get_current_user_dict with a warm cache (no queries)
+
+Usage:
+    python benchmark_auth_overhead.py --user-id 1
+    python benchmark_auth_overhead.py --user-id 1 --requests 5000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+import jwt
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from auth import oauth2_scheme, get_current_user, get_current_user_claims, get_current_user_dict
+from config import SECRET_KEY, ALGORITHM
+from db_pool import pooled_connect, DATABASE_URL
+from models import engine
+from user_context_cache import clear_user_context_cache
+from utils import create_access_token
+
+
+def legacy_get_current_user(token: str = Depends(oauth2_scheme)):
+    """What the per-router copies did: decode, then fetch the users row"""
+    try:
+        user_id = int(jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])["sub"])
+    except (jwt.PyJWTError, KeyError, ValueError):
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+    with pooled_connect(DATABASE_URL) as conn:
+        row = conn.execute(
+            "SELECT id, first_name, father_name, email, phone, roles, active_role FROM users WHERE id = %s",
+            (user_id,)
+        ).fetchone()
+    if not row:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+    return {"id": row[0], "first_name": row[1], "email": row[3], "roles": row[5] or []}
+
+
+def build_app():
+    app = FastAPI()
+
+    @app.get("/legacy")
+    def legacy(user: dict = Depends(legacy_get_current_user)):
+        return {"id": user["id"]}
+
+    @app.get("/claims")
+    def claims(user: dict = Depends(get_current_user_claims)):
+        return {"id": user["id"]}
+
+    @app.get("/user")
+    def user(user=Depends(get_current_user)):
+        return {"id": user.id}
+
+    @app.get("/user-dict")
+    def user_dict(user: dict = Depends(get_current_user_dict)):
+        return {"id": user["id"]}
+
+    return app
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def measure(client, path, headers, requests, before_each=None):
+    samples = []
+    for _ in range(requests):
+        if before_each:
+            before_each()
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            sys.exit(f"{path} returned {response.status_code}: {response.text}")
+    samples.sort()
+    return {
+        "mean_ms": statistics.mean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+
+def run(user_id, role, requests):
+    token = create_access_token(data={"sub": str(user_id), "role": role, "role_ids": {}})
+    headers = {"Authorization": f"Bearer {token}"}
+    client = TestClient(build_app())
+
+    cases = [
+        ("legacy", "/legacy", None),
+        ("claims", "/claims", None),
+        ("user_cold", "/user", clear_user_context_cache),
+        ("user_cached", "/user", None),
+        ("user_dict", "/user-dict", None),
+    ]
+
+    # Warm up connections and the user context cache
+    for _, path, _ in cases:
+        client.get(path, headers=headers)
+
+    print("=" * 80)
+    print(f"Auth overhead per request ({requests} requests each, in-process)")
+    print("=" * 80)
+    baseline = None
+    for name, path, before_each in cases:
+        counter = QueryCounter()
+        event.listen(engine, "before_cursor_execute", counter)
+        try:
+            stats = measure(client, path, headers, requests, before_each)
+        finally:
+            event.remove(engine, "before_cursor_execute", counter)
+        baseline = baseline or stats["mean_ms"]
+        queries = "n/a (psycopg)" if name == "legacy" else f"{counter.count / requests:.2f}"
+        print(f"{name:12} mean={stats['mean_ms']:7.3f}ms p50={stats['p50_ms']:7.3f}ms "
+              f"p99={stats['p99_ms']:7.3f}ms  {stats['mean_ms'] / baseline * 100:5.0f}% of legacy  "
+              f"ORM queries/request={queries}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--role", default="student")
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.user_id, args.role, args.requests)
@@ -0,0 +1,145 @@
+"""
+Chat latency benchmark
+Simulates concurrent chat users against a running server and reports p50/p95/p99
+latency per endpoint. A /api/health probe runs alongside the load: it does no
+I/O, so its latency shows how long requests wait behind blocked event loops.
+
+Usage (server on a single worker so every request shares one event loop):
+    uvicorn app:app --workers 1
+    python benchmark_chat_latency.py --user-id 1 --label after
+    python benchmark_chat_latency.py --compare bench_before.json bench_after.json
+
+To get the "before" numbers, check out the commit before the async DB change,
+restart the server and run again with --label before.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "mean_ms": round(statistics.mean(samples), 2) if samples else 0.0,
+    }
+
+
+async def timed(client, results, name, method, url, **kwargs):
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    results.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+    if response.status_code >= 400:
+        results.setdefault("errors", []).append(f"{name}: {response.status_code}")
+    return response
+
+
+async def chat_user(client, results, user_id, conversation_id, deadline):
+    """One simulated user: list conversations, read a page of messages, send a message"""
+    sent = 0
+    while time.perf_counter() < deadline:
+        await timed(client, results, "GET /api/chat/conversations", "GET",
+                    "/api/chat/conversations", params={"user_id": user_id})
+        await timed(client, results, "GET /api/chat/messages", "GET",
+                    f"/api/chat/messages/{conversation_id}", params={"user_id": user_id, "limit": 50})
+        await timed(client, results, "POST /api/chat/messages", "POST",
+                    "/api/chat/messages", params={"user_id": user_id},
+                    json={"conversation_id": conversation_id, "content": f"benchmark message {sent}"})
+        sent += 1
+
+
+async def health_probe(client, results, deadline, interval=0.05):
+    while time.perf_counter() < deadline:
+        await timed(client, results, "GET /api/health (probe)", "GET", "/api/health")
+        await asyncio.sleep(interval)
+
+
+async def run(base_url, user_id, conversation_id, concurrency, duration):
+    limits = httpx.Limits(max_connections=concurrency + 5)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        if conversation_id is None:
+            response = await client.get("/api/chat/conversations", params={"user_id": user_id, "limit": 1})
+            conversations = response.json().get("conversations", [])
+            if not conversations:
+                sys.exit(f"User {user_id} has no conversations - pass --conversation-id")
+            conversation_id = conversations[0]["id"]
+
+        results = {}
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            health_probe(client, results, deadline),
+            *(chat_user(client, results, user_id, conversation_id, deadline) for _ in range(concurrency))
+        )
+
+    errors = results.pop("errors", [])
+    return {
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "errors": len(errors),
+        "endpoints": {name: summarize(samples) for name, samples in results.items()},
+    }
+
+
+def print_report(label, report):
+    print("=" * 80)
+    print(f"{label}: {report['concurrency']} users for {report['duration_s']}s, {report['errors']} errors")
+    print("=" * 80)
+    for name, stats in report["endpoints"].items():
+        print(f"{name:32} n={stats['count']:<6} p50={stats['p50_ms']:>8.1f}ms "
+              f"p95={stats['p95_ms']:>8.1f}ms p99={stats['p99_ms']:>8.1f}ms")
+
+
+def compare(before_path, after_path):
+    before = json.load(open(before_path))
+    after = json.load(open(after_path))
+    print("=" * 80)
+    print(f"p99 latency: {before_path} -> {after_path}")
+    print("=" * 80)
+    for name, stats in after["endpoints"].items():
+        old = before["endpoints"].get(name)
+        if not old:
+            continue
+        change = (stats["p99_ms"] - old["p99_ms"]) / old["p99_ms"] * 100 if old["p99_ms"] else 0
+        print(f"{name:32} {old['p99_ms']:>8.1f}ms -> {stats['p99_ms']:>8.1f}ms ({change:+.0f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--conversation-id", type=int)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=int, default=30)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        sys.exit(0)
+    if args.user_id is None:
+        parser.error("--user-id is required")
+
+    report = asyncio.run(run(args.base_url, args.user_id, args.conversation_id, args.concurrency, args.duration))
+    print_report(args.label, report)
+    with open(f"bench_{args.label}.json", "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved bench_{args.label}.json")
@@ -0,0 +1,84 @@
+"""
+Email rendering benchmark
+Messages rendered per second for each EmailService layout, two ways:
+
+    mime       what EmailService did per send before email_templates.py: format
+               the subject, text and HTML (string.Template.substitute, parsed on
+               every call like an f-string rebuild), build MIMEMultipart/MIMEText
+               objects and flatten them to bytes
+    template   email_templates.render_message(): precompiled chunks, pre-encoded
+               headers, base64 bodies - same bytes-ready result
+
+No SMTP server or database needed.
+
+Usage:
+    python benchmark_email_rendering.py
+    python benchmark_email_rendering.py --messages 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from string import Template
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from email_templates import get_template, render_message, template_names
+
+FROM = "Astegni <noreply@astegni.com>"
+SAMPLE = {
+    "otp_code": "482913", "purpose": "registration", "first_name": "Abebe", "department": "Finance",
+    "parent_name": "Almaz Tesfaye", "student_name": "Kebede Alemu", "child_name": "Lidya",
+    "temp_password": "Tmp-8f3k2", "relationship_type": "Mother", "inviter_name": "Sara",
+    "invitee_name": "Dawit", "brand_name": "EthioBrand", "invitation_link": "https://astegni.com/invite?token=abc123",
+    "subject": "Your Astegni partnership has been approved", "heading": "Partnership Approved",
+    "body_html": "<p>Dear Acme,</p><p>Your partnership application has been approved.</p>",
+    "body_text": "Dear Acme, Your partnership application has been approved.",
+}
+
+
+def mime_message(name: str, to_email: str, values: dict) -> bytes:
+    template = get_template(name)
+    sources = template.sources
+    values = dict(values, to_email=to_email)
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = Template(sources[0]).substitute(values)
+    msg['From'] = FROM
+    msg['To'] = to_email
+    msg.attach(MIMEText(Template(sources[1]).substitute(values), 'plain'))
+    msg.attach(MIMEText(Template(sources[2]).substitute(values), 'html'))
+    return msg.as_bytes()
+
+
+def rate(render, count: int) -> float:
+    started = time.perf_counter()
+    for i in range(count):
+        render(f"user{i}@example.com")
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Email messages rendered per second: email.mime vs precompiled templates")
+    parser.add_argument("--messages", type=int, default=2000, help="messages per layout and method")
+    args = parser.parse_args()
+
+    print(f"{'layout':24s} {'mime msg/s':>12s} {'template msg/s':>15s} {'speedup':>8s}")
+    totals = [0.0, 0.0]
+    for name in template_names():
+        values = {key: SAMPLE[key] for key in get_template(name).placeholders if key in SAMPLE}
+        mime = rate(lambda to: mime_message(name, to, values), args.messages)
+        compiled = rate(lambda to: render_message(name, FROM, to, **values), args.messages)
+        totals[0] += args.messages / mime
+        totals[1] += args.messages / compiled
+        print(f"{name:24s} {mime:12.0f} {compiled:15.0f} {compiled / mime:7.1f}x")
+
+    layouts = len(template_names())
+    print(f"{'all layouts':24s} {layouts * args.messages / totals[0]:12.0f} "
+          f"{layouts * args.messages / totals[1]:15.0f} {totals[0] / totals[1]:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
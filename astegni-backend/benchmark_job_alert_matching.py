@@ -0,0 +1,113 @@
+"""
+Job alert matching benchmark
+Time to match one job post against N active alerts, two ways:
+
+    scan        check every alert against the post (what a per-alert query loop does)
+    percolate   JobAlertIndex.percolate(): look up the post's keys, verify only those alerts
+
+Alerts are synthetic (keyword, location, job type, salary mixes) with a fixed
+share matching; percolate time should stay flat as N grows, scan time grows
+linearly. No database needed.
+
+Usage:
+    python benchmark_job_alert_matching.py
+    python benchmark_job_alert_matching.py --alerts 1000 10000 100000 --posts 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from job_alert_matcher import JobAlertIndex, _Post, match_alert
+
+SUBJECTS = ["mathematics", "physics", "chemistry", "biology", "english", "amharic", "history",
+            "geography", "economics", "programming", "accounting", "music", "art", "french"]
+ROLES = ["teacher", "tutor", "lecturer", "instructor", "coordinator", "assistant", "coach"]
+TOWNS = ["Addis Ababa", "Adama", "Hawassa", "Bahir Dar", "Mekelle", "Dire Dawa", "Gondar", "Jimma"]
+JOB_TYPES = ["full-time", "part-time", "contract", "internship", "freelance"]
+
+
+def make_alerts(count: int, rng: random.Random):
+    """Mostly keyword alerts with a long tail of vocabulary, some location/type/salary alerts"""
+    alerts = []
+    for alert_id in range(1, count + 1):
+        kind = rng.random()
+        keywords = locations = job_type = min_salary = None
+        if kind < 0.7:
+            # Rare keywords: one of many course codes, sometimes with a subject
+            keywords = [f"course{rng.randint(1, count)}"]
+            if rng.random() < 0.3:
+                keywords.append(f"{rng.choice(SUBJECTS)} {rng.choice(ROLES)}")
+        elif kind < 0.9:
+            locations = [f"{rng.choice(TOWNS)} {rng.randint(1, count // 10 + 1)}"]
+            job_type = rng.choice(JOB_TYPES)
+        else:
+            min_salary = rng.randint(1, 2000) * 100
+        alerts.append((alert_id, alert_id, keywords, None, job_type, None, locations,
+                       min_salary, None, None, 'immediate', True))
+    return alerts
+
+
+def make_posts(count: int, alert_count: int, rng: random.Random):
+    posts = []
+    for post_id in range(count):
+        subject, role = rng.choice(SUBJECTS), rng.choice(ROLES)
+        posts.append({
+            "id": post_id,
+            "title": f"{subject.title()} {role.title()} needed",
+            "description": f"We are hiring a {subject} {role} for course{rng.randint(1, alert_count)} "
+                           f"and course{rng.randint(1, alert_count)}. " * 3,
+            "requirements": "Degree and two years of experience",
+            "skills": [subject, "communication"],
+            "job_type": rng.choice(JOB_TYPES),
+            "location_type": "on-site",
+            "location": f"Kebele 01, {rng.choice(TOWNS)} {rng.randint(1, alert_count // 10 + 1)}",
+            "salary_min": 5000,
+            "salary_max": 8000,
+            "category_ids": []
+        })
+    return posts
+
+
+def scan(index: JobAlertIndex, job: dict):
+    post = _Post(job)
+    return sorted(alert.id for alert in index.by_id.values() if match_alert(alert, post) is not None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job alert matching: scan all alerts vs percolator index")
+    parser.add_argument("--alerts", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--posts", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'alerts':>8}  {'build':>8}  {'scan/post':>10}  {'percolate/post':>14}  {'candidates':>10}  {'matches':>8}")
+    for alert_count in args.alerts:
+        rng = random.Random(alert_count)
+        alerts = make_alerts(alert_count, rng)
+        posts = make_posts(args.posts, alert_count, rng)
+
+        started = time.perf_counter()
+        index = JobAlertIndex(alerts)
+        build_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        expected = [scan(index, job) for job in posts]
+        scan_ms = (time.perf_counter() - started) * 1000 / len(posts)
+
+        started = time.perf_counter()
+        found = [[match["alert_id"] for match in index.percolate(job)] for job in posts]
+        percolate_ms = (time.perf_counter() - started) * 1000 / len(posts)
+
+        assert found == expected
+        candidates = sum(len(index.candidates(_Post(job))) for job in posts) / len(posts)
+        matches = sum(len(ids) for ids in found) / len(posts)
+        print(f"{alert_count:>8}  {build_s:>7.2f}s  {scan_ms:>8.2f}ms  {percolate_ms:>12.3f}ms  "
+              f"{candidates:>10.1f}  {matches:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
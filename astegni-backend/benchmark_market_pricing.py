@@ -0,0 +1,247 @@
+"""
+Market pricing benchmark
+Time per /api/market-pricing/suggest-price computation on a synthetic market
+(default 50,000 enrollments over 12 months):
+
+    loop    the previous implementation's per-row Python loop: 9-factor similarity
+            and weighted price over the rows the market SQL returned. The rows are
+            prepared outside the timing - the old query (correlated credential
+            subqueries per row) came on top of this
+    index   market_pricing_index.MarketIndex: filter + per-group AVG(agreed_price)
+            + vectorized similarity and weighted price (what the endpoint does now)
+
+Both paths must agree on the weighted price and the similar-tutor count.
+
+Usage:
+    python benchmark_market_pricing.py
+    python benchmark_market_pricing.py --enrollments 200000 --tutors 5000 --requests 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from market_pricing_index import (GRADE_LEVEL_MAP, SIMILAR_THRESHOLD, MarketIndex,
+                                  country_of, grade_complexity)
+
+SESSION_FORMATS = ["Online", "In-person", "Hybrid", None]
+LOCATIONS = ["Addis Ababa, Ethiopia", "Bahir Dar, Ethiopia", "Nairobi, Kenya", "Kampala, Uganda", "Ethiopia", None]
+GRADE_BANDS = [
+    ["Grade 1", "Grade 2", "Grade 3", "Grade 4"],
+    ["Grade 5", "Grade 6", "Grade 7", "Grade 8"],
+    ["Grade 9", "Grade 10"],
+    ["Grade 11", "Grade 12"],
+    ["University"],
+    ["Certification"],
+    ["Grade 12", "University"],
+]
+
+
+def synthetic_market(enrollments: int, tutors: int, seed: int = 7):
+    """(package rows, enrollment rows) in the shape load_market_rows returns"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    packages = []
+    for tutor_id in range(1, tutors + 1):
+        rating = round(rng.uniform(0, 5), 1) if rng.random() > 0.1 else 2.0
+        completion = round(rng.random(), 2)
+        students = rng.randint(0, 150)
+        credentials = rng.randint(0, 25)
+        years = rng.randint(0, 30)
+        created_at = now - timedelta(days=rng.randint(0, 2000)) if rng.random() > 0.02 else None
+        location = rng.choice(LOCATIONS)
+        for _ in range(rng.randint(1, 3)):
+            packages.append((
+                len(packages) + 1, tutor_id, rating, completion, students, credentials, years,
+                created_at, location, rng.choice(SESSION_FORMATS), list(rng.choice(GRADE_BANDS)),
+                rng.sample(range(1, 200), rng.randint(1, 4)), now - timedelta(days=rng.randint(0, 400)),
+            ))
+    rows = [(rng.randint(1, len(packages)), now - timedelta(minutes=rng.randint(0, 360 * 24 * 60)),
+             float(rng.randint(10, 100) * 5)) for _ in range(enrollments)]
+    return packages, rows
+
+
+def legacy_market_rows(packages, enrollments, exclude_tutor_id, cutoff, course_ids=None,
+                       grade_level=None, session_format=None, packages_since=None):
+    """The rows the old market query returned (its WHERE clause and GROUP BY, in Python)"""
+    by_id = {row[0]: row for row in packages}
+    totals = defaultdict(lambda: [0.0, 0])
+    grades = None
+    if grade_level:
+        grades = set(grade_level if isinstance(grade_level, list) else [grade_level])
+    for package_id, enrolled_at, price in enrollments:
+        row = by_id[package_id]
+        if row[1] == exclude_tutor_id or enrolled_at < cutoff:
+            continue
+        if packages_since is not None and (row[12] is None or row[12] < packages_since):
+            continue
+        if course_ids and not set(course_ids) & set(row[11] or []):
+            continue
+        if grades and not grades & set(row[10] or []):
+            continue
+        if session_format and row[9] != session_format:
+            continue
+        key = (row[1], row[9], tuple(row[10] or []))
+        totals[key][0] += price
+        totals[key][1] += 1
+
+    tutors = {row[1]: row for row in packages}
+    market_data = []
+    for (tutor_id, fmt, grade_levels), (total, count) in totals.items():
+        row = tutors[tutor_id]
+        market_data.append((tutor_id, row[2], row[3], row[4], total / count, row[5], row[6], row[7],
+                            fmt, row[8], list(grade_levels)))
+    return market_data
+
+
+def legacy_suggestion(market_data, tutor: dict, session_format, now: datetime):
+    """The old per-row loop: (weighted average price, similar tutor count)"""
+    weighted_prices = []
+    similar_tutors_count = 0
+    for row in market_data:
+        market_tutor_id, rating, comp_rate, students, price, credentials, experience_years, market_created_at, market_session_format, market_location, market_grade_levels = row
+        rating = float(rating) if rating else 2.0
+        comp_rate = float(comp_rate) if comp_rate else 0.0
+        students = students or 0
+        price = float(price)
+        credentials = credentials or 0
+        experience_years = int(experience_years) if experience_years else 0
+        market_location = market_location or ""
+        market_grade_levels = market_grade_levels or []
+
+        market_credentials_score = min(100, credentials * 5)
+        market_experience_score = min(100, experience_years * 5)
+        market_account_age_days = (now - market_created_at).days if market_created_at else 0
+
+        market_country = ""
+        if market_location:
+            parts = market_location.split(',')
+            market_country = parts[-1].strip().upper() if parts else market_location.strip().upper()
+
+        market_grade_complexity = 7
+        if market_grade_levels:
+            numeric_grades = [GRADE_LEVEL_MAP.get(g, 7) for g in market_grade_levels]
+            market_grade_complexity = sum(numeric_grades) / len(numeric_grades) if numeric_grades else 7
+
+        rating_similarity = 1 - min(abs(rating - tutor["rating"]) / 5.0, 1.0)
+        comp_rate_similarity = 1 - abs(comp_rate - tutor["completion_rate"])
+        location_similarity = 1.0 if (tutor["country"] and market_country and tutor["country"] == market_country) else 0.3
+        student_diff = abs(students - tutor["student_count"]) / max(tutor["student_count"], students, 100)
+        student_similarity = 1 - min(student_diff, 1.0)
+        session_format_similarity = 1.0 if market_session_format == session_format else 0.5
+        grade_diff = abs(market_grade_complexity - tutor["grade_complexity"]) / 14.0
+        grade_level_similarity = 1 - min(grade_diff, 1.0)
+        exp_diff = abs(market_experience_score - tutor["experience_score"]) / max(tutor["experience_score"], market_experience_score, 100)
+        exp_similarity = 1 - min(exp_diff, 1.0)
+        cred_diff = abs(market_credentials_score - tutor["credentials_score"]) / max(tutor["credentials_score"], market_credentials_score, 100)
+        cred_similarity = 1 - min(cred_diff, 1.0)
+        age_diff = abs(market_account_age_days - tutor["account_age_days"]) / max(tutor["account_age_days"], market_account_age_days, 1095)
+        age_similarity = 1 - min(age_diff, 1.0)
+
+        similarity = (
+            rating_similarity * 0.20 +
+            comp_rate_similarity * 0.16 +
+            location_similarity * 0.15 +
+            student_similarity * 0.13 +
+            session_format_similarity * 0.12 +
+            grade_level_similarity * 0.10 +
+            exp_similarity * 0.08 +
+            cred_similarity * 0.04 +
+            age_similarity * 0.02
+        )
+        if similarity > 0.65:
+            similar_tutors_count += 1
+        weighted_prices.append((price, similarity))
+
+    total_weight = sum(weight for _, weight in weighted_prices)
+    weighted_avg = sum(price * weight for price, weight in weighted_prices) / total_weight
+    return weighted_avg, similar_tutors_count
+
+
+def indexed_suggestion(index: MarketIndex, tutor_id, tutor: dict, cutoff, now, **filters):
+    """What suggest_market_price does now: (weighted average price, similar tutor count)"""
+    groups, prices = index.market_sample(tutor_id, cutoff, packages_since=cutoff, **filters)
+    if len(groups) < 5:
+        groups, prices = index.market_sample(tutor_id, cutoff)
+    similarity = index.similarity(groups, session_format=filters.get("session_format"), now=now, **tutor)
+    return float((prices * similarity).sum() / similarity.sum()), int((similarity > SIMILAR_THRESHOLD).sum())
+
+
+def tutor_features(row, now: datetime) -> dict:
+    """The requesting tutor's side of the similarity, from one of its package rows"""
+    return {
+        "rating": float(row[2]) if row[2] else 2.0,
+        "completion_rate": float(row[3]) if row[3] else 0.0,
+        "student_count": row[4] or 0,
+        "country": country_of(row[8]),
+        "grade_complexity": grade_complexity(row[10]),
+        "experience_score": min(100, (row[6] or 0) * 5),
+        "credentials_score": min(100, (row[5] or 0) * 5),
+        "account_age_days": (now - row[7]).days if row[7] else 0,
+    }
+
+
+def request_mix(packages, count: int, seed: int = 11):
+    rng = random.Random(seed)
+    mix = []
+    for _ in range(count):
+        row = rng.choice(packages)
+        filters = {}
+        if rng.random() < 0.7:
+            filters["session_format"] = rng.choice(SESSION_FORMATS[:3])
+        if rng.random() < 0.5:
+            filters["grade_level"] = rng.choice([rng.choice(GRADE_BANDS), rng.choice(GRADE_BANDS)[0]])
+        if rng.random() < 0.2:
+            filters["course_ids"] = rng.sample(range(1, 200), 3)
+        mix.append((row, rng.randint(1, 12), filters))
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Market price suggestion: per-row loop vs feature matrix")
+    parser.add_argument("--enrollments", type=int, default=50000)
+    parser.add_argument("--tutors", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+
+    packages, enrollments = synthetic_market(args.enrollments, args.tutors)
+    started = time.perf_counter()
+    index = MarketIndex(packages, enrollments)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"Market: {index.stats()}")
+    print(f"Index build: {build_ms:.0f} ms\n")
+
+    now = datetime.now()
+    loop_seconds = index_seconds = 0.0
+    rows_total = 0
+    for row, months, filters in request_mix(packages, args.requests):
+        tutor = tutor_features(row, now)
+        cutoff = now - timedelta(days=months * 30)
+
+        market_data = legacy_market_rows(packages, enrollments, row[1], cutoff, packages_since=cutoff, **filters)
+        if len(market_data) < 5:
+            market_data = legacy_market_rows(packages, enrollments, row[1], cutoff)
+        rows_total += len(market_data)
+        started = time.perf_counter()
+        expected = legacy_suggestion(market_data, tutor, filters.get("session_format"), now)
+        loop_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        got = indexed_suggestion(index, row[1], tutor, cutoff, now, **filters)
+        index_seconds += time.perf_counter() - started
+
+        assert got[1] == expected[1] and abs(got[0] - expected[0]) < 1e-6, (got, expected)
+
+    print(f"{args.requests} suggestions, {rows_total / args.requests:.0f} market rows on average")
+    print(f"  loop   {loop_seconds / args.requests * 1000:8.2f} ms/request (similarity loop only)")
+    print(f"  index  {index_seconds / args.requests * 1000:8.2f} ms/request (filter + aggregate + similarity)")
+
+
+if __name__ == "__main__":
+    main()
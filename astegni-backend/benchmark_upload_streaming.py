@@ -0,0 +1,244 @@
+"""
+Upload streaming benchmark
+Concurrent large video uploads through an /api/upload/* style handler while a
+probe hits a cheap endpoint every few milliseconds:
+
+    buffered   the previous handlers: contents = await file.read(), then the
+               synchronous b2_service.upload_file(file_data=contents) on the event loop
+    streamed   what the handlers do now: spool_upload() to a temp file, then
+               run_in_threadpool(b2_service.upload_file, file_data=spool) - a B2
+               large file with B2_UPLOAD_PART_SIZE parts uploaded in parallel
+
+B2 is b2sdk's RawSimulator with a simulated network: each upload request reads
+its body in 1MB chunks, checks the SHA-1 and sleeps for --latency-ms plus the
+size over --bandwidth-mb per connection. Uploaded bytes are discarded so only
+the handler's own memory shows up. Requests go through httpx's ASGI
+transport, so the app, the uploads and the probe share one event loop.
+
+Each mode runs in a fresh process. Reports how far the uploads pushed peak
+RSS, total upload time and the probe latency (how late each probe completed
+after it was due).
+
+No database or B2 credentials needed.
+
+Usage:
+    python benchmark_upload_streaming.py
+    python benchmark_upload_streaming.py --uploads 8 --size-mb 50 --bandwidth-mb 20
+"""
+
+import argparse
+import asyncio
+import hashlib
+import inspect
+import io
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from b2sdk.v2 import B2Api, B2HttpApiConfig, InMemoryAccountInfo, RawSimulator
+from b2sdk.v2.raw_simulator import BucketSimulator
+from fastapi import FastAPI, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+import backblaze_service
+from backblaze_service import BackblazeService
+from upload_spool import spool_upload
+
+EMPTY_SHA1 = hashlib.sha1(b"").hexdigest()
+
+
+class SimulatedBucket(BucketSimulator):
+    """Bucket whose uploads take network time and keep no data"""
+
+    bandwidth = 25 * 1024 * 1024  # bytes per second per connection
+    latency = 0.05
+
+    def _transfer(self, stream, content_length):
+        stream.seek(0)
+        sha1 = hashlib.sha1()
+        remaining = content_length
+        while remaining > 0:
+            chunk = stream.read(min(1024 * 1024, remaining))
+            if not chunk:
+                break
+            sha1.update(chunk)
+            remaining -= len(chunk)
+        time.sleep(self.latency + content_length / self.bandwidth)
+        return sha1.hexdigest()
+
+    def upload_file(self, *args, **kwargs):
+        call = _UPLOAD_FILE.bind(self, *args, **kwargs).arguments
+        content_length, content_sha1 = call['content_length'], call['content_sha1']
+        assert self._transfer(call['data_stream'], content_length) == content_sha1
+        call.update(content_length=0, content_sha1=EMPTY_SHA1, data_stream=io.BytesIO())
+        result = BucketSimulator.upload_file(**call)
+        result.update(contentLength=content_length, contentSha1=content_sha1)
+        return result
+
+    def upload_part(self, *args, **kwargs):
+        call = _UPLOAD_PART.bind(self, *args, **kwargs).arguments
+        sha1_sum = call['sha1_sum']
+        assert self._transfer(call['input_stream'], call['content_length']) == sha1_sum
+        call.update(content_length=0, sha1_sum=EMPTY_SHA1, input_stream=io.BytesIO())
+        result = BucketSimulator.upload_part(**call)
+        # finish_large_file compares these against the client's part hashes
+        self.file_id_to_file[call['file_id']].parts[call['part_number']].content_sha1 = sha1_sum
+        result['contentSha1'] = sha1_sum
+        return result
+
+
+_UPLOAD_FILE = inspect.signature(BucketSimulator.upload_file)
+_UPLOAD_PART = inspect.signature(BucketSimulator.upload_part)
+
+
+class SimulatedNetwork(RawSimulator):
+    BUCKET_SIMULATOR_CLASS = SimulatedBucket
+    MIN_PART_SIZE = 5 * 1024 * 1024
+    MAX_SIMPLE_COPY_SIZE = MIN_PART_SIZE
+
+    def authorize_account(self, *args, **kwargs):
+        # B2's real part sizes (the simulator defaults to 200 bytes)
+        response = super().authorize_account(*args, **kwargs)
+        response['apiInfo']['storageApi']['recommendedPartSize'] = 100 * 1000 * 1000
+        return response
+
+
+def simulated_b2_service(workers: int) -> BackblazeService:
+    api = B2Api(
+        InMemoryAccountInfo(),
+        max_upload_workers=workers,
+        api_config=B2HttpApiConfig(_raw_api_class=SimulatedNetwork)
+    )
+    key_id, application_key = api.session.raw_api.create_account()
+    api.authorize_account("production", key_id, application_key)
+
+    service = BackblazeService.__new__(BackblazeService)
+    service.configured = True
+    service.allow_mock = False
+    service.download_cache = None
+    service.index_storage = False
+    service.b2_api = api
+    service.bucket = api.create_bucket("astegni-benchmark", "allPublic")
+    return service
+
+
+def build_app(b2_service: BackblazeService) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/buffered")
+    async def buffered(file: UploadFile = File(...)):
+        contents = await file.read()
+        result = b2_service.upload_file(file_data=contents, file_name=file.filename,
+                                        file_type='video', user_id='profile_1')
+        return {"size": len(contents), "ok": bool(result)}
+
+    @app.post("/streamed")
+    async def streamed(file: UploadFile = File(...)):
+        spool = await spool_upload(file)
+        try:
+            result = await run_in_threadpool(b2_service.upload_file, file_data=spool,
+                                             file_name=file.filename, file_type='video',
+                                             user_id='profile_1')
+            return {"size": spool.size, "ok": bool(result)}
+        finally:
+            spool.close()
+
+    return app
+
+
+def make_payload(size_mb: int) -> str:
+    handle = tempfile.NamedTemporaryFile(prefix="benchmark_upload_", suffix=".mp4", delete=False)
+    with handle:
+        for _ in range(size_mb):
+            handle.write(os.urandom(1024 * 1024))
+    return handle.name
+
+
+async def probe(client: httpx.AsyncClient, interval: float, done: asyncio.Event, lateness: list):
+    due = time.perf_counter()
+    while not done.is_set():
+        await client.get("/ping")
+        lateness.append(time.perf_counter() - due)
+        due += interval
+        await asyncio.sleep(max(due - time.perf_counter(), 0))
+
+
+async def run(mode: str, app: FastAPI, payload: str, uploads: int, probe_ms: float):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        async def upload():
+            with open(payload, "rb") as f:
+                response = await client.post(f"/{mode}", files={"file": ("video.mp4", f, "video/mp4")})
+            body = response.json()
+            assert response.status_code == 200 and body["ok"], body
+
+        done = asyncio.Event()
+        lateness = []
+        probe_task = asyncio.create_task(probe(client, probe_ms / 1000, done, lateness))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(upload() for _ in range(uploads)))
+        elapsed = time.perf_counter() - start
+
+        done.set()
+        await probe_task
+        return elapsed, lateness
+
+
+def measure(mode: str, payload: str, args) -> tuple:
+    """One mode in a fresh process, so each gets its own peak RSS"""
+    SimulatedBucket.bandwidth = args.bandwidth_mb * 1024 * 1024
+    SimulatedBucket.latency = args.latency_ms / 1000
+    app = build_app(simulated_b2_service(args.workers))
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    elapsed, lateness = asyncio.run(run(mode, app, payload, args.uploads, args.probe_ms))
+    peak_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline  # KB on Linux
+    return elapsed, peak_growth * 1024, sorted(lateness)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload streaming benchmark")
+    parser.add_argument("--uploads", type=int, default=4, help="Concurrent uploads")
+    parser.add_argument("--size-mb", type=int, default=50, help="Size of each upload")
+    parser.add_argument("--bandwidth-mb", type=float, default=25, help="Simulated MB/s per B2 connection")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Simulated per-request B2 latency")
+    parser.add_argument("--workers", type=int, default=backblaze_service.B2_MAX_UPLOAD_WORKERS,
+                        help="B2 part upload threads")
+    parser.add_argument("--probe-ms", type=float, default=20, help="Interval between probe requests")
+    args = parser.parse_args()
+
+    payload = make_payload(args.size_mb)
+    try:
+        print("=" * 96)
+        print(f"Upload streaming: {args.uploads} x {args.size_mb}MB, simulated B2 at "
+              f"{args.bandwidth_mb:g}MB/s per connection, {args.latency_ms:g}ms per request, "
+              f"{backblaze_service.B2_UPLOAD_PART_SIZE // (1024 * 1024)}MB parts")
+        print("=" * 96)
+        print(f"{'mode':<10} {'elapsed':>10} {'peak RSS growth':>16} {'probes':>8} "
+              f"{'probe p50':>11} {'probe p99':>11} {'probe max':>11}")
+        for mode in ("buffered", "streamed"):
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                elapsed, peak, lateness = pool.submit(measure, mode, payload, args).result()
+            p99 = lateness[min(int(len(lateness) * 0.99), len(lateness) - 1)]
+            print(f"{mode:<10} {elapsed:>9.2f}s {peak / (1024 * 1024):>14.1f}MB {len(lateness):>8} "
+                  f"{statistics.median(lateness) * 1000:>9.1f}ms {p99 * 1000:>9.1f}ms "
+                  f"{lateness[-1] * 1000:>9.1f}ms")
+    finally:
+        os.unlink(payload)
+
+
+if __name__ == "__main__":
+    main()
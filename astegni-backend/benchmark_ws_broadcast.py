@@ -0,0 +1,124 @@
+"""
+WebSocket broadcast load test (websocket_manager.py + websocket_sender.py)
+Connects thousands of simulated sockets to an in-process ConnectionManager -
+a fraction of them slow - and measures how long a broadcast holds up the
+caller and how long the healthy sockets wait for delivery:
+
+    sequential   the previous broadcast loop: await send_text on each socket in turn
+    queued       ConnectionManager.broadcast: enqueue per socket, writer tasks deliver
+
+No server or database needed.
+
+Usage:
+    python benchmark_ws_broadcast.py
+    python benchmark_ws_broadcast.py --sockets 1000 2000 4000 --slow-ratio 0.05 --slow-ms 200
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from websocket_manager import ConnectionManager
+
+
+class SimulatedWebSocket:
+    """Records when each message arrives; slow sockets take delay seconds per write"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.received_at = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        # Every socket write yields to the event loop, like a real transport
+        await asyncio.sleep(self.delay)
+        self.received_at.append(time.perf_counter())
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def make_sockets(count: int, slow_ratio: float, slow_ms: float):
+    slow_every = int(1 / slow_ratio) if slow_ratio > 0 else 0
+    return [
+        SimulatedWebSocket(slow_ms / 1000 if slow_every and i % slow_every == 0 else 0.0)
+        for i in range(count)
+    ]
+
+
+async def _wait_delivered(sockets, expected: int, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if all(len(ws.received_at) >= expected for ws in sockets):
+            return
+        await asyncio.sleep(0.005)
+
+
+async def run_sequential(sockets):
+    """Old ConnectionManager.broadcast: one awaited write after another"""
+    message_text = json.dumps({"type": "announcement"})
+    start = time.perf_counter()
+    for ws in sockets:
+        await ws.send_text(message_text)
+    returned = time.perf_counter() - start
+    return start, returned
+
+
+async def run_queued(sockets):
+    manager = ConnectionManager()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, ws in enumerate(sockets):
+            await manager.connect(ws, f"student_{i}")
+
+    start = time.perf_counter()
+    await manager.broadcast({"type": "announcement"})
+    returned = time.perf_counter() - start
+
+    await _wait_delivered(sockets, 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, ws in enumerate(sockets):
+            await manager.disconnect(ws, f"student_{i}")
+    return start, returned
+
+
+def delivery_stats(sockets, start: float):
+    fast = sorted(ws.received_at[0] - start for ws in sockets if ws.delay == 0 and ws.received_at)
+    everyone = max(ws.received_at[0] - start for ws in sockets if ws.received_at)
+    p99 = fast[min(len(fast) - 1, int(len(fast) * 0.99))]
+    return fast[-1], p99, everyone
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="WebSocket broadcast load test")
+    parser.add_argument("--sockets", type=int, nargs="+", default=[500, 1000, 2000, 4000])
+    parser.add_argument("--slow-ratio", type=float, default=0.01, help="Fraction of slow sockets")
+    parser.add_argument("--slow-ms", type=float, default=50, help="Per-write delay of a slow socket")
+    args = parser.parse_args()
+
+    print("=" * 96)
+    print(f"WebSocket broadcast load test ({args.slow_ratio:.0%} slow sockets at {args.slow_ms:.0f}ms per write)")
+    print("=" * 96)
+    print(f"{'sockets':>8} {'mode':<11} {'caller blocked':>15} {'fast p99':>12} {'fast max':>12} {'all delivered':>15}")
+
+    for count in args.sockets:
+        for mode, runner in (("sequential", run_sequential), ("queued", run_queued)):
+            sockets = make_sockets(count, args.slow_ratio, args.slow_ms)
+            start, returned = await runner(sockets)
+            fast_max, fast_p99, everyone = delivery_stats(sockets, start)
+            print(f"{count:>8} {mode:<11} {returned * 1000:>13.1f}ms {fast_p99 * 1000:>10.1f}ms "
+                  f"{fast_max * 1000:>10.1f}ms {everyone * 1000:>13.1f}ms")
+
+    print("\nqueued: the caller only pays for enqueueing, and fast sockets no longer wait behind slow ones")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
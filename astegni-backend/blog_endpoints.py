@@ -118,7 +118,7 @@ def get_author_info(db: Session, profile_id: int, role: str):
 # ============================================================================
 
 @router.get("/api/blogs", response_model=List[BlogResponse])
-async def get_all_blogs(
+def get_all_blogs(
     skip: int = 0,
     limit: int = 20,
     category: Optional[str] = None,
@@ -166,7 +166,7 @@ async def get_all_blogs(
     return result
 
 @router.get("/api/blogs/{blog_id}", response_model=BlogResponse)
-async def get_blog(blog_id: int, db: Session = Depends(get_db)):
+def get_blog(blog_id: int, db: Session = Depends(get_db)):
     """
     Get a specific blog by ID
     """
@@ -197,7 +197,7 @@ async def get_blog(blog_id: int, db: Session = Depends(get_db)):
     }
 
 @router.post("/api/blogs", response_model=BlogResponse, status_code=status.HTTP_201_CREATED)
-async def create_blog(
+def create_blog(
     blog: BlogCreate,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -247,7 +247,7 @@ async def create_blog(
     }
 
 @router.put("/api/blogs/{blog_id}", response_model=BlogResponse)
-async def update_blog(
+def update_blog(
     blog_id: int,
     blog_update: BlogUpdate,
     current_user: dict = Depends(get_current_user),
@@ -300,7 +300,7 @@ async def update_blog(
     }
 
 @router.delete("/api/blogs/{blog_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_blog(
+def delete_blog(
     blog_id: int,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -319,7 +319,7 @@ async def delete_blog(
     return None
 
 @router.post("/api/blogs/{blog_id}/like")
-async def like_blog(blog_id: int, db: Session = Depends(get_db)):
+def like_blog(blog_id: int, db: Session = Depends(get_db)):
     """
     Like a blog (increment likes count)
     """
@@ -334,7 +334,7 @@ async def like_blog(blog_id: int, db: Session = Depends(get_db)):
     return {"likes": blog.likes}
 
 @router.post("/api/blogs/{blog_id}/unlike")
-async def unlike_blog(blog_id: int, db: Session = Depends(get_db)):
+def unlike_blog(blog_id: int, db: Session = Depends(get_db)):
     """
     Unlike a blog (decrement likes count)
     """
@@ -350,7 +350,7 @@ async def unlike_blog(blog_id: int, db: Session = Depends(get_db)):
     return {"likes": blog.likes}
 
 @router.post("/api/blogs/{blog_id}/comments")
-async def add_comment(
+def add_comment(
     blog_id: int,
     comment_data: BlogCommentCreate,
     current_user: dict = Depends(get_current_user),
@@ -383,7 +383,7 @@ async def add_comment(
     return new_comment
 
 @router.get("/api/blogs/{blog_id}/comments")
-async def get_comments(blog_id: int, db: Session = Depends(get_db)):
+def get_comments(blog_id: int, db: Session = Depends(get_db)):
     """
     Get all comments for a blog
     """
@@ -397,7 +397,7 @@ async def get_comments(blog_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/api/blogs/by-profile/{profile_id}")
-async def get_blogs_by_profile(
+def get_blogs_by_profile(
     profile_id: int,
     role: str,
     skip: int = 0,
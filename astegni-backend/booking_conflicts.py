@@ -0,0 +1,199 @@
+"""
+Booking Conflicts
+Overlap detection for sessions (and schedules) before they are written
+
+Sessions: session_slots (migrate_add_session_slots.py) holds one TSRANGE per
+booked session and participant - the tutor and every student of the
+enrollment - kept in sync by triggers, with a GiST index on
+(participant_role, participant_id, slot). find_conflicts() is one index probe
+per participant, O(log n) in that participant's history, instead of joining
+and scanning all of their sessions.
+
+    with conn.cursor() as cur:
+        tutor_id, student_ids = enrollment_participants(cur, enrolled_courses_id)
+        lock_participants(cur, tutor_id, student_ids)   # until commit/rollback
+        conflicts = find_conflicts(cur, tutor_id, student_ids, session_date, start_time, end_time)
+        if conflicts and not allow_conflict:
+            raise HTTPException(409, ...)
+
+lock_participants() takes transaction-scoped advisory locks, so two requests
+booking the same tutor or student at once cannot both pass the check.
+
+Until migrate_add_session_slots.py has run, the session checks find no
+conflicts (with a warning) instead of failing the booking.
+
+- find_session_conflicts(): flags overlaps of sessions created in bulk (an
+  accepted session request creates up to 8 weeks of them)
+- participant_conflicts(): overlapping pairs among a tutor's, student's or
+  children's upcoming sessions (GET /api/sessions/conflicts)
+- schedule_conflicts(): overlap of a schedule with the owner's other
+  schedules (recurring rules expanded by the availability index)
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tutor_availability_index import AvailabilityIndex, BOOKED_SESSION_STATUSES
+
+
+_slots_ready = False
+_slots_warned = False
+
+
+def session_slots_ready(cur) -> bool:
+    """Whether the session_slots table exists (checked until it does)"""
+    global _slots_ready, _slots_warned
+    if not _slots_ready:
+        cur.execute("SELECT to_regclass('session_slots') IS NOT NULL")
+        _slots_ready = cur.fetchone()[0]
+        if not _slots_ready and not _slots_warned:
+            _slots_warned = True
+            print("⚠️ [BookingConflicts] session_slots is missing - run migrate_add_session_slots.py; "
+                  "session conflicts are not checked until then")
+    return _slots_ready
+
+
+def slot_range(session_date: date, start_time: time, end_time: time) -> Tuple[datetime, datetime]:
+    """[start, end) timestamps of a session (an end at or before the start is the next day)"""
+    start = datetime.combine(session_date, start_time)
+    end = datetime.combine(session_date, end_time)
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def _format_conflict(row) -> dict:
+    session_id, role, participant_id, slot_start, slot_end = row
+    return {
+        "session_id": session_id,
+        "participant_role": role,
+        "participant_id": participant_id,
+        "session_date": slot_start.date().isoformat(),
+        "start_time": slot_start.time().isoformat(),
+        "end_time": slot_end.time().isoformat()
+    }
+
+
+def enrollment_participants(cur, enrolled_courses_id: int) -> Tuple[Optional[int], List[int]]:
+    """(tutor profile id, student profile ids) of an enrollment"""
+    cur.execute("SELECT tutor_id, students_id FROM enrolled_courses WHERE id = %s", (enrolled_courses_id,))
+    row = cur.fetchone()
+    if not row:
+        return None, []
+    return row[0], list(row[1] or [])
+
+
+def lock_participants(cur, tutor_id: Optional[int], student_ids: Iterable[int]):
+    """Serialize bookings of these participants until the transaction ends"""
+    keys = {('student', student_id) for student_id in student_ids}
+    if tutor_id is not None:
+        keys.add(('tutor', tutor_id))
+    for role, participant_id in sorted(keys):  # Fixed order - no deadlocks between bookings
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s), %s)", (f"booking_{role}", participant_id))
+
+
+def find_conflicts(cur, tutor_id: Optional[int], student_ids: Iterable[int],
+                   session_date: date, start_time: time, end_time: time,
+                   exclude_session_id: Optional[int] = None) -> List[dict]:
+    """Booked sessions of the tutor or any of the students overlapping the proposed time"""
+    if not session_slots_ready(cur):
+        return []
+    start, end = slot_range(session_date, start_time, end_time)
+    cur.execute("""
+        SELECT DISTINCT ON (session_id) session_id, participant_role, participant_id, lower(slot), upper(slot)
+        FROM session_slots
+        WHERE slot && tsrange(%s, %s, '[)')
+          AND (
+              (participant_role = 'tutor' AND participant_id = %s)
+              OR (participant_role = 'student' AND participant_id = ANY(%s))
+          )
+          AND session_id <> %s
+        ORDER BY session_id, participant_role DESC
+    """, (start, end, tutor_id, list(student_ids), exclude_session_id or 0))
+    return [_format_conflict(row) for row in cur.fetchall()]
+
+
+def find_session_conflicts(cur, session_ids: List[int]) -> List[dict]:
+    """For each of session_ids: other booked sessions sharing a participant and overlapping it"""
+    if not session_ids or not session_slots_ready(cur):
+        return []
+    cur.execute("""
+        SELECT DISTINCT ON (a.session_id, b.session_id)
+               a.session_id, b.session_id, b.participant_role, b.participant_id, lower(b.slot), upper(b.slot)
+        FROM session_slots a
+        JOIN session_slots b
+          ON b.participant_role = a.participant_role
+         AND b.participant_id = a.participant_id
+         AND b.slot && a.slot
+         AND b.session_id <> a.session_id
+        WHERE a.session_id = ANY(%s)
+        ORDER BY a.session_id, b.session_id, b.participant_role DESC
+    """, (session_ids,))
+    return [
+        {"new_session_id": row[0], **_format_conflict(row[1:])}
+        for row in cur.fetchall()
+    ]
+
+
+def participant_conflicts(cur, role: str, participant_ids: List[int], since: datetime) -> List[dict]:
+    """Overlapping pairs among the participants' booked sessions that end after `since`"""
+    if not participant_ids or not session_slots_ready(cur):
+        return []
+    cur.execute("""
+        SELECT a.participant_id, a.session_id, lower(a.slot), upper(a.slot),
+               b.session_id, lower(b.slot), upper(b.slot)
+        FROM session_slots a
+        JOIN session_slots b
+          ON b.participant_role = a.participant_role
+         AND b.participant_id = a.participant_id
+         AND b.slot && a.slot
+         AND b.session_id > a.session_id
+        WHERE a.participant_role = %s
+          AND a.participant_id = ANY(%s)
+          AND upper(a.slot) > %s
+        ORDER BY lower(a.slot), a.session_id, b.session_id
+    """, (role, participant_ids, since))
+    return [
+        {
+            "participant_role": role,
+            "participant_id": participant_id,
+            "sessions": [
+                {"session_id": first_id, "start": first_start.isoformat(), "end": first_end.isoformat()},
+                {"session_id": second_id, "start": second_start.isoformat(), "end": second_end.isoformat()}
+            ]
+        }
+        for participant_id, first_id, first_start, first_end, second_id, second_start, second_end in cur.fetchall()
+    ]
+
+
+def schedule_conflicts(schedule: tuple, others: List[tuple]) -> List[int]:
+    """
+    Ids of `others` whose windows overlap `schedule` on some date
+
+    Rows are (id, schedule_type, year, months, days, specific_dates, start_time,
+    end_time). A user has a handful of schedules, so the check walks the dates
+    the new schedule applies on (at most one year) against an index of the rest.
+    """
+    def index_row(row):
+        schedule_id, schedule_type, year, months, days, specific_dates, start_time, end_time = row
+        # Keyed by schedule id in place of a tutor id
+        return (schedule_id, schedule_id, schedule_type, year, months, days, specific_dates, start_time, end_time)
+
+    own = AvailabilityIndex([index_row(schedule)], [])
+    rest = AvailabilityIndex([index_row(row) for row in others], [])
+    schedule_id = schedule[0]
+
+    if schedule[1] == 'specific':
+        days = sorted(own.tutor_specific.get(schedule_id, {}))
+    else:
+        year = schedule[2] or date.today().year
+        days = [date(year, 1, 1) + timedelta(days=offset) for offset in range(366)]
+        days = [day for day in days if day.year == year]
+
+    found: Dict[int, None] = {}
+    for day in days:
+        for start, end in own.windows(schedule_id, day):
+            for other_id in rest.overlapping_tutors(day, start, end):
+                found[other_id] = None
+    return list(found)
+
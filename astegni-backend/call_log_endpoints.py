@@ -59,7 +59,7 @@ class CallLogUpdate(BaseModel):
 # ============================================
 
 @router.post("/api/call-logs")
-async def create_call_log(
+def create_call_log(
     call_data: CallLogCreate,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -121,7 +121,7 @@ async def create_call_log(
 
 
 @router.put("/api/call-logs/{call_log_id}")
-async def update_call_log(
+def update_call_log(
     call_log_id: int,
     update_data: CallLogUpdate,
     current_user: dict = Depends(get_current_user),
@@ -177,7 +177,7 @@ async def update_call_log(
 
 
 @router.get("/api/call-logs/{conversation_id}")
-async def get_call_logs(
+def get_call_logs(
     conversation_id: int,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -14,6 +14,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 import os
@@ -33,7 +34,7 @@ ADVERTISER_DATABASE_URL = os.getenv(
 
 def get_db():
     """Get database connection (advertiser DB)"""
-    return psycopg.connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
 
 
 class CampaignCancellationRequest(BaseModel):
@@ -41,7 +42,7 @@ class CampaignCancellationRequest(BaseModel):
 
 
 @router.post("/cancel/{campaign_id}")
-async def cancel_campaign(campaign_id: int, request: CampaignCancellationRequest, current_user = Depends(resolve_advertiser)):
+def cancel_campaign(campaign_id: int, request: CampaignCancellationRequest, current_user = Depends(resolve_advertiser)):
     """
     Cancel a campaign with 5% fee on remaining balance
 
@@ -208,7 +209,7 @@ async def cancel_campaign(campaign_id: int, request: CampaignCancellationRequest
 
 
 @router.get("/cancellation-preview/{campaign_id}")
-async def get_cancellation_preview(campaign_id: int, current_user = Depends(resolve_advertiser)):
+def get_cancellation_preview(campaign_id: int, current_user = Depends(resolve_advertiser)):
     """
     Preview cancellation costs before actually cancelling
 
@@ -21,6 +21,8 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional
 import psycopg
+from db_pool import pooled_connect
+from ad_serving_index import invalidate_ad_index
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 import os
@@ -40,7 +42,7 @@ DATABASE_URL = os.getenv(
 
 def get_db():
     """Get database connection"""
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 
 class CampaignCancellationRequest(BaseModel):
@@ -113,7 +115,7 @@ def is_within_grace_period(campaign_created_at) -> bool:
 
 
 @router.get("/cancellation-calculator/{campaign_id}")
-async def get_cancellation_calculator(campaign_id: int, current_user = Depends(get_current_user)):
+def get_cancellation_calculator(campaign_id: int, current_user = Depends(get_current_user)):
     """
     Transparent cancellation calculator
     Shows exactly what advertiser will get if they cancel now
@@ -229,7 +231,7 @@ def _get_fee_tier_reason(fee_percent: float) -> str:
 
 
 @router.post("/pause/{campaign_id}")
-async def pause_campaign(campaign_id: int, request: CampaignPauseRequest, current_user = Depends(resolve_advertiser)):
+def pause_campaign(campaign_id: int, request: CampaignPauseRequest, current_user = Depends(resolve_advertiser)):
     """
     Pause a campaign with NO FEE
 
@@ -311,7 +313,7 @@ async def pause_campaign(campaign_id: int, request: CampaignPauseRequest, curren
 
 
 @router.post("/resume/{campaign_id}")
-async def resume_campaign(campaign_id: int, current_user = Depends(resolve_advertiser)):
+def resume_campaign(campaign_id: int, current_user = Depends(resolve_advertiser)):
     """
     Resume a paused campaign
 
@@ -374,7 +376,7 @@ async def resume_campaign(campaign_id: int, current_user = Depends(resolve_adver
 
 
 @router.post("/cancel-enhanced/{campaign_id}")
-async def cancel_campaign_enhanced(campaign_id: int, request: CampaignCancellationRequest, current_user = Depends(resolve_advertiser)):
+def cancel_campaign_enhanced(campaign_id: int, request: CampaignCancellationRequest, current_user = Depends(resolve_advertiser)):
     """
     Cancel an active campaign under the receipt-based, NO-REFUND model.
 
@@ -438,6 +440,7 @@ async def cancel_campaign_enhanced(campaign_id: int, request: CampaignCancellati
                 """, (campaign_id,))
 
                 conn.commit()
+                invalidate_ad_index()
 
                 return {
                     "success": True,
@@ -17,6 +17,7 @@ from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from pydantic import BaseModel
 from typing import Optional, List
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 import os
@@ -35,7 +36,7 @@ DATABASE_URL = os.getenv(
 
 def get_db():
     """Get database connection"""
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 
 # ============================================================
@@ -72,7 +73,7 @@ class CampaignCreateWithDeposit(BaseModel):
 # ============================================================
 
 @router.post("/campaigns/create-with-deposit")
-async def create_campaign_with_deposit(campaign: CampaignCreateWithDeposit, current_user = Depends(resolve_advertiser)):
+def create_campaign_with_deposit(campaign: CampaignCreateWithDeposit, current_user = Depends(resolve_advertiser)):
     """
     Create campaign with 20% deposit payment model
 
@@ -346,7 +347,7 @@ async def create_campaign_with_deposit(campaign: CampaignCreateWithDeposit, curr
 # ============================================================
 
 @router.post("/campaigns/{campaign_id}/complete-and-invoice")
-async def complete_campaign_and_generate_invoice(campaign_id: int, current_user = Depends(resolve_advertiser)):
+def complete_campaign_and_generate_invoice(campaign_id: int, current_user = Depends(resolve_advertiser)):
     """
     Complete campaign and generate invoice for remaining payment
 
@@ -479,7 +480,7 @@ async def complete_campaign_and_generate_invoice(campaign_id: int, current_user
 
 
 @router.get("/invoices")
-async def get_advertiser_invoices(current_user = Depends(resolve_advertiser)):
+def get_advertiser_invoices(current_user = Depends(resolve_advertiser)):
     """Get all invoices for current advertiser"""
     try:
         advertiser_profile_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
@@ -514,7 +515,7 @@ async def get_advertiser_invoices(current_user = Depends(resolve_advertiser)):
 
 
 @router.post("/invoices/{invoice_id}/pay")
-async def pay_invoice(invoice_id: int, current_user = Depends(resolve_advertiser)):
+def pay_invoice(invoice_id: int, current_user = Depends(resolve_advertiser)):
     """Pay an outstanding invoice"""
     try:
         advertiser_profile_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
@@ -4,6 +4,7 @@ Real-time impression tracking with automatic CPM billing
 
 Key Features:
 - Track impressions, clicks, conversions in real-time
+- Impressions are queued and written/billed in batches (impression_ingestion.py)
 - Automatic CPM billing every 1,000 impressions
 - Campaign analytics and reporting
 - Fraud detection (unique impressions, viewability)
@@ -17,13 +18,15 @@ from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional
 import psycopg
+from db_pool import pooled_connect
 import os
 from dotenv import load_dotenv
 from datetime import datetime
 import hashlib
 
-# Import balance deduction function
 from advertiser_balance_endpoints import deduct_from_balance, check_and_pause_campaign
+# Write-behind impression queue (billing runs in its batches)
+from impression_ingestion import ingestion
 
 load_dotenv()
 
@@ -46,7 +49,7 @@ class ImpressionTrack(BaseModel):
 
 def get_db():
     """Get database connection"""
-    return psycopg.connect(DATABASE_URL)
+    return pooled_connect(DATABASE_URL)
 
 
 # ============================================
@@ -54,82 +57,32 @@ def get_db():
 # ============================================
 
 @router.post("/track-impression")
-async def track_impression(request: Request, impression: ImpressionTrack):
+def track_impression(request: Request, impression: ImpressionTrack):
     """
     Track a campaign impression and handle CPM billing.
 
     Flow:
-    1. Log impression to campaign_impressions table
-    2. Increment campaign impressions_delivered counter
-    3. Check if billing threshold reached (every 1,000 impressions)
-    4. If threshold reached:
-       - Calculate charge (1,000 × CPI rate)
-       - Deduct from advertiser balance
-       - Update impressions_charged counter
-       - Check if balance too low, pause campaign if needed
-    5. Return success
+    1. Reserve an impression ID and decide uniqueness (same session within 24 hours)
+    2. Queue the impression (impression_ingestion.py)
+    3. The ingestion task then, in batches and in arrival order:
+       - Logs impressions to the campaign_impressions table
+       - Increments the campaign impressions_delivered counter
+       - Bills every billing_frequency (1,000) impressions:
+         charge, deduct from advertiser balance, update impressions_charged,
+         pause the campaign if the balance is too low
+       - Generates the final invoice for deposit-model campaigns
+    4. Return success
+
+    Impressions for a campaign that is missing, not active or paused by the
+    time its batch is written are dropped there.
 
     Args:
         impression: Impression tracking data
 
     Returns:
-        Success status and billing info
+        Queued impression ID (for click tracking) and uniqueness
     """
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-
-        # Get campaign details
-        cursor.execute("""
-            SELECT
-                id,
-                name,
-                cpi_rate,
-                impressions_delivered,
-                impressions_charged,
-                billing_frequency,
-                verification_status,
-                advertiser_id,
-                brand_id,
-                payment_model,
-                total_impressions_planned,
-                deposit_amount,
-                invoice_status
-            FROM campaign_profile
-            WHERE id = %s
-        """, (impression.campaign_id,))
-
-        campaign = cursor.fetchone()
-
-        if not campaign:
-            raise HTTPException(status_code=404, detail="Campaign not found")
-
-        campaign_id = campaign[0]
-        campaign_name = campaign[1]
-        cpi_rate = float(campaign[2]) if campaign[2] else 0.10
-        impressions_delivered = campaign[3] if campaign[3] else 0
-        impressions_charged = campaign[4] if campaign[4] else 0
-        billing_frequency = campaign[5] if campaign[5] else 1000
-        campaign_status = campaign[6]
-        advertiser_id = campaign[7]
-        brand_id = campaign[8]
-        payment_model = campaign[9]
-        total_impressions_planned = campaign[10] if campaign[10] else 0
-        deposit_amount = float(campaign[11]) if campaign[11] else 0
-        invoice_status = campaign[12]
-
-        # Check if campaign is active
-        if campaign_status != 'active':
-            return {
-                "success": False,
-                "message": f"Campaign is {campaign_status}, impression not tracked"
-            }
-
-        # Check advertiser ID exists
-        if not advertiser_id:
-            raise HTTPException(status_code=400, detail="Campaign has no advertiser ID assigned")
-
         # Get client IP and user agent
         client_ip = request.client.host if request.client else None
         user_agent = request.headers.get("user-agent", "")
@@ -138,231 +91,27 @@ async def track_impression(request: Request, impression: ImpressionTrack):
         session_data = f"{impression.user_id}_{client_ip}_{user_agent}"
         session_id = hashlib.md5(session_data.encode()).hexdigest()
 
-        # Check if this is a unique impression (within last 24 hours)
-        cursor.execute("""
-            SELECT id FROM campaign_impressions
-            WHERE campaign_id = %s
-              AND session_id = %s
-              AND created_at > NOW() - INTERVAL '24 hours'
-            LIMIT 1
-        """, (campaign_id, session_id))
-
-        existing_impression = cursor.fetchone()
-        is_unique = existing_impression is None
-
-        # Log impression
-        cursor.execute("""
-            INSERT INTO campaign_impressions (
-                campaign_id,
-                user_id,
-                profile_id,
-                profile_type,
-                placement,
-                location,
-                audience,
-                region,
-                device_type,
-                ip_address,
-                user_agent,
-                session_id,
-                is_unique_impression,
-                cpi_rate
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (
-            campaign_id,
-            impression.user_id,
-            impression.profile_id,
-            impression.profile_type,
-            impression.placement,
-            impression.location,
-            impression.audience,
-            impression.region,
-            impression.device_type,
-            client_ip,
-            user_agent,
-            session_id,
-            is_unique,
-            cpi_rate
-        ))
-
-        impression_id = cursor.fetchone()[0]
-
-        # Increment impressions_delivered counter
-        new_impressions_delivered = impressions_delivered + 1
-
-        cursor.execute("""
-            UPDATE campaign_profile
-            SET impressions_delivered = %s
-            WHERE id = %s
-        """, (new_impressions_delivered, campaign_id))
-
-        # Check if billing threshold reached
-        impressions_since_last_billing = new_impressions_delivered - impressions_charged
-        billing_triggered = False
-        transaction_id = None
-
-        if impressions_since_last_billing >= billing_frequency:
-            # Calculate charge for billing_frequency impressions
-            charge_amount = billing_frequency * cpi_rate
-
-            # Deduct from balance
-            transaction_id = deduct_from_balance(
-                advertiser_id=advertiser_id,
-                campaign_id=campaign_id,
-                amount=charge_amount,
-                impressions_count=billing_frequency,
-                description=f"Charged for {billing_frequency} impressions at {cpi_rate} ETB/impression",
-                conn=conn
-            )
-
-            if transaction_id:
-                # Update impressions_charged and total_charged
-                new_impressions_charged = impressions_charged + billing_frequency
-
-                cursor.execute("""
-                    SELECT total_charged FROM campaign_profile WHERE id = %s
-                """, (campaign_id,))
-
-                total_charged = cursor.fetchone()[0]
-                total_charged = float(total_charged) if total_charged else 0.00
-                new_total_charged = total_charged + charge_amount
-
-                cursor.execute("""
-                    UPDATE campaign_profile
-                    SET
-                        impressions_charged = %s,
-                        total_charged = %s,
-                        last_billing_at = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (new_impressions_charged, new_total_charged, campaign_id))
-
-                # Mark impressions as charged
-                cursor.execute("""
-                    UPDATE campaign_impressions
-                    SET
-                        charged = TRUE,
-                        charged_at = CURRENT_TIMESTAMP
-                    WHERE campaign_id = %s
-                      AND charged = FALSE
-                    LIMIT %s
-                """, (campaign_id, billing_frequency))
-
-                billing_triggered = True
-
-                # Check if campaign should be paused due to low balance
-                check_and_pause_campaign(campaign_id, advertiser_id, conn)
-
-            else:
-                # Insufficient balance - pause campaign
-                cursor.execute("""
-                    UPDATE campaign_profile
-                    SET
-                        verification_status = 'paused',
-                        pause_reason = 'insufficient_balance',
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (campaign_id,))
-
-        # CHECK IF DEPOSIT MODEL CAMPAIGN REACHED PLANNED IMPRESSIONS
-        campaign_completed = False
-        invoice_generated = False
-
-        if payment_model == 'deposit' and total_impressions_planned > 0:
-            if new_impressions_delivered >= total_impressions_planned and invoice_status != 'paid':
-                # Campaign reached planned impressions - auto-generate invoice
-                from datetime import datetime
-
-                actual_cost = new_impressions_delivered * cpi_rate
-                outstanding_amount = actual_cost - deposit_amount
-
-                # Ensure outstanding is not negative
-                if outstanding_amount < 0:
-                    outstanding_amount = 0
-
-                # Generate invoice number
-                invoice_number = f"INV-{campaign_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-
-                # Create invoice
-                cursor.execute("""
-                    INSERT INTO campaign_invoices (
-                        campaign_id, advertiser_id, brand_id,
-                        invoice_number, invoice_type,
-                        amount, impressions_delivered, cpi_rate,
-                        deposit_amount, outstanding_amount,
-                        status, issued_at, due_date,
-                        notes,
-                        created_at, updated_at
-                    ) VALUES (
-                        %s, %s, %s,
-                        %s, 'final_settlement',
-                        %s, %s, %s,
-                        %s, %s,
-                        'pending', NOW(), NOW() + INTERVAL '30 days',
-                        %s,
-                        NOW(), NOW()
-                    )
-                    RETURNING id
-                """, (
-                    campaign_id,
-                    advertiser_id,
-                    brand_id,
-                    invoice_number,
-                    actual_cost,
-                    new_impressions_delivered,
-                    cpi_rate,
-                    deposit_amount,
-                    outstanding_amount,
-                    f"Final settlement for campaign '{campaign_name}' - {new_impressions_delivered:,} impressions delivered at {cpi_rate:.4f} ETB per impression"
-                ))
-                invoice_id = cursor.fetchone()[0]
-
-                # Update campaign status
-                cursor.execute("""
-                    UPDATE campaign_profile
-                    SET
-                        verification_status = 'completed_pending_payment',
-                        invoice_id = %s,
-                        invoice_status = 'pending',
-                        final_settlement_amount = %s,
-                        ended_at = NOW(),
-                        updated_at = NOW()
-                    WHERE id = %s
-                """, (invoice_id, outstanding_amount, campaign_id))
-
-                campaign_completed = True
-                invoice_generated = True
-
-        conn.commit()
+        pending = ingestion.enqueue(impression, client_ip, user_agent, session_id)
+        if pending is None:
+            return {
+                "success": False,
+                "message": "Impression queue is full, impression not tracked"
+            }
 
         return {
             "success": True,
-            "impression_id": impression_id,
-            "is_unique": is_unique,
-            "impressions_delivered": new_impressions_delivered,
-            "impressions_charged": impressions_charged + (billing_frequency if billing_triggered else 0),
-            "billing_triggered": billing_triggered,
-            "charge_amount": billing_frequency * cpi_rate if billing_triggered else 0,
-            "transaction_id": transaction_id,
-            "campaign_completed": campaign_completed,
-            "invoice_generated": invoice_generated
+            "queued": True,
+            "impression_id": pending.id,
+            "is_unique": pending.is_unique
         }
 
-    except HTTPException:
-        raise
     except Exception as e:
         print(f"Error tracking impression: {e}")
-        if conn:
-            conn.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if conn:
-            cursor.close()
-            conn.close()
 
 
 @router.post("/track-click")
-async def track_click(campaign_id: int, impression_id: int):
+def track_click(campaign_id: int, impression_id: int):
     """
     Track a click on a campaign impression.
 
@@ -378,14 +127,15 @@ async def track_click(campaign_id: int, impression_id: int):
         conn = get_db()
         cursor = conn.cursor()
 
-        # Update impression with click
-        cursor.execute("""
-            UPDATE campaign_impressions
-            SET
-                clicked = TRUE,
-                clicked_at = CURRENT_TIMESTAMP
-            WHERE id = %s AND campaign_id = %s
-        """, (impression_id, campaign_id))
+        # Update impression with click (still queued impressions are updated in memory)
+        if not ingestion.mark_clicked(impression_id, campaign_id):
+            cursor.execute("""
+                UPDATE campaign_impressions
+                SET
+                    clicked = TRUE,
+                    clicked_at = CURRENT_TIMESTAMP
+                WHERE id = %s AND campaign_id = %s
+            """, (impression_id, campaign_id))
 
         # Increment campaign clicks counter
         cursor.execute("""
@@ -413,7 +163,7 @@ async def track_click(campaign_id: int, impression_id: int):
 
 
 @router.get("/analytics/{campaign_id}")
-async def get_campaign_analytics(campaign_id: int):
+def get_campaign_analytics(campaign_id: int):
     """
     Get comprehensive analytics for a campaign.
 
@@ -529,11 +279,12 @@ async def get_campaign_analytics(campaign_id: int):
 
 
 @router.post("/cancel/{campaign_id}")
-async def cancel_campaign(campaign_id: int):
+def cancel_campaign(campaign_id: int):
     """
     Cancel a campaign and apply cancellation fee.
 
     Flow:
+    0. Write and bill the campaign's impressions still queued on this worker
     1. Get campaign details and impression counts
     2. Calculate final charge for uncharged impressions
     3. Calculate cancellation fee (5% of remaining balance)
@@ -550,6 +301,14 @@ async def cancel_campaign(campaign_id: int):
     """
     conn = None
     try:
+        # Queued impressions are dropped once the campaign is cancelled - count them first
+        try:
+            while ingestion.flush(campaign_id=campaign_id):
+                pass
+        except Exception as e:
+            print(f"Error flushing impressions for campaign {campaign_id}: {e}")
+            raise HTTPException(status_code=503, detail="Could not record pending impressions. Please try again.")
+
         conn = get_db()
         cursor = conn.cursor()
 
@@ -16,6 +16,8 @@ from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel
 import psycopg
+from db_pool import pooled_connect
+from ad_serving_index import get_ad_index, invalidate_ad_index
 import os
 from dotenv import load_dotenv
 
@@ -32,7 +34,7 @@ class PauseRequest(BaseModel):
 
 def get_db():
     """Get database connection"""
-    return psycopg.connect(DATABASE_URL)
+    return pooled_connect(DATABASE_URL)
 
 
 # ============================================================================
@@ -40,7 +42,7 @@ def get_db():
 # ============================================================================
 
 @router.post("/{campaign_id}/launch")
-async def launch_campaign(campaign_id: int):
+def launch_campaign(campaign_id: int):
     """
     Launch a campaign (set status to 'active')
 
@@ -203,6 +205,7 @@ async def launch_campaign(campaign_id: int):
         launched_at = cursor.fetchone()[0]
 
         conn.commit()
+        invalidate_ad_index()
 
         return {
             "success": True,
@@ -229,7 +232,7 @@ async def launch_campaign(campaign_id: int):
 
 
 @router.post("/{campaign_id}/pause")
-async def pause_campaign(campaign_id: int, request: PauseRequest = Body(default=PauseRequest())):
+def pause_campaign(campaign_id: int, request: PauseRequest = Body(default=PauseRequest())):
     """
     Pause an active campaign
 
@@ -267,6 +270,7 @@ async def pause_campaign(campaign_id: int, request: PauseRequest = Body(default=
         campaign_name = result[0]
 
         conn.commit()
+        invalidate_ad_index()
 
         return {
             "success": True,
@@ -290,7 +294,7 @@ async def pause_campaign(campaign_id: int, request: PauseRequest = Body(default=
 
 
 @router.post("/{campaign_id}/resume")
-async def resume_campaign(campaign_id: int):
+def resume_campaign(campaign_id: int):
     """
     Resume a paused campaign
 
@@ -327,6 +331,7 @@ async def resume_campaign(campaign_id: int):
         campaign_name = result[0]
 
         conn.commit()
+        invalidate_ad_index()
 
         return {
             "success": True,
@@ -354,13 +359,14 @@ async def resume_campaign(campaign_id: int):
 # ============================================================================
 
 @router.get("/ads/placement/{placement_type}")
-async def get_ads_by_placement(
+def get_ads_by_placement(
     placement_type: str,
     limit: int = 5,
     profile_type: Optional[str] = None,
     page_location: Optional[str] = None,  # Page name (home, tutor_profile, etc.)
     audience: Optional[str] = None,
-    user_country: Optional[str] = None     # User's country code for geographic targeting
+    user_country: Optional[str] = None,    # User's country code for geographic targeting
+    weighted: bool = False                 # Favor higher cpi_rate creatives instead of a uniform pick
 ):
     """
     Get active campaign ads for a specific placement type
@@ -376,6 +382,7 @@ async def get_ads_by_placement(
     - user_country: User's country code for geographic targeting (ET, US, etc.)
     - profile_type: User's profile type (tutor, student, parent, etc.)
     - audience: Target audience filter
+    - weighted: Pick with probability proportional to cpi_rate (default: uniform random)
 
     Returns:
         List of active campaign media for the placement
@@ -384,87 +391,18 @@ async def get_ads_by_placement(
     # This handles both 'leaderboard_banner' (HTML data-placement) and 'leaderboard-banner' formats
     normalized_placement = placement_type.replace('_', '-')
 
-    conn = None
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-
-        # Build query based on placement type
-        query = """
-            SELECT
-                cp.id as campaign_id,
-                cp.name as campaign_name,
-                cp.advertiser_id,
-                cp.brand_id,
-                cm.id as media_id,
-                cm.file_url,
-                cm.content_type as file_type,
-                cm.media_type,
-                0 as duration,
-                cp.target_location,
-                cp.target_audiences,
-                cp.target_regions,
-                cp.cpi_rate
-            FROM campaign_profile cp
-            INNER JOIN campaign_media cm ON cp.id = cm.campaign_id
-            WHERE cp.campaign_status = 'active'
-              AND cp.verification_status IN ('verified', 'approved')
-              AND cm.placement = %s
-        """
-
-        params = [normalized_placement]  # Use normalized placement
-
-        # GEOGRAPHIC FILTERING (based on campaign's target_location)
-        # target_location values: 'global', 'national', 'regional'
-        if user_country:
-            # Show ads that match user's geography
-            query += """ AND (
-                cp.target_location = 'global'  -- Global campaigns show everywhere
-                OR cp.target_location IS NULL  -- NULL = show everywhere (legacy)
-                OR (cp.target_location = 'national' AND cp.national_country_code = %s)
-                OR (cp.target_location = 'regional' AND %s = ANY(cp.target_regions))
-            )"""
-            params.extend([user_country, user_country])
-        else:
-            # If user country unknown, only show global campaigns
-            query += " AND (cp.target_location = 'global' OR cp.target_location IS NULL)"
-
-        # PAGE FILTERING (based on campaign's target_pages array)
-        # target_pages: Array of page names ['home', 'tutor_profile', etc.]
-        # If NULL or empty array, show on all pages
-        if page_location:
-            query += """ AND (
-                cp.target_pages IS NULL           -- NULL = show on all pages
-                OR array_length(cp.target_pages, 1) IS NULL  -- Empty array = show on all pages
-                OR %s = ANY(cp.target_pages)      -- Page is in target list
-            )"""
-            params.append(page_location)
-
-        query += " ORDER BY RANDOM() LIMIT %s"
-        params.append(limit)
-
-        cursor.execute(query, params)
-
-        rows = cursor.fetchall()
-
-        ads = []
-        for row in rows:
-            ads.append({
-                "campaign_id": row[0],
-                "campaign_name": row[1],
-                "advertiser_id": row[2],
-                "brand_id": row[3],
-                "media_id": row[4],
-                "file_url": row[5],
-                "file_type": row[6],
-                "media_type": row[7],
-                "duration": row[8],
-                "target_location": row[9],
-                "target_audiences": row[10],
-                "target_regions": row[11],
-                "cpi_rate": float(row[12]) if row[12] else 0.10,
-                "placement_type": placement_type
-            })
+        # Served from the in-process index (ad_serving_index.py) - same eligibility,
+        # geographic (global/national/regional) and target_pages rules as the SQL it replaced
+        ads = get_ad_index().pick(
+            normalized_placement,
+            limit,
+            user_country=user_country,
+            page_location=page_location,
+            weighted=weighted
+        )
+        for ad in ads:
+            ad["placement_type"] = placement_type
 
         return {
             "success": True,
@@ -476,7 +414,3 @@ async def get_ads_by_placement(
     except Exception as e:
         print(f"Error fetching ads: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if conn:
-            cursor.close()
-            conn.close()
@@ -19,6 +19,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 import os
@@ -37,7 +38,7 @@ DATABASE_URL = os.getenv(
 
 def get_db():
     """Get database connection"""
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 
 # ============================================================
@@ -53,7 +54,7 @@ class CampaignStopRequest(BaseModel):
 # ============================================================
 
 @router.post("/{campaign_id}/stop")
-async def stop_campaign_with_settlement(
+def stop_campaign_with_settlement(
     campaign_id: int,
     stop_request: CampaignStopRequest,
     current_user = Depends(resolve_advertiser)
@@ -279,7 +280,7 @@ async def stop_campaign_with_settlement(
 
 
 @router.post("/{campaign_id}/pause")
-async def pause_campaign(campaign_id: int, current_user = Depends(resolve_advertiser)):
+def pause_campaign(campaign_id: int, current_user = Depends(resolve_advertiser)):
     """
     Pause campaign temporarily (no settlement, can resume later)
 
@@ -345,7 +346,7 @@ async def pause_campaign(campaign_id: int, current_user = Depends(resolve_advert
 
 
 @router.post("/{campaign_id}/resume")
-async def resume_campaign(campaign_id: int, current_user = Depends(resolve_advertiser)):
+def resume_campaign(campaign_id: int, current_user = Depends(resolve_advertiser)):
     """Resume a paused campaign"""
     try:
         advertiser_profile_id = current_user.role_ids.get('advertiser') if current_user.role_ids else None
@@ -17,8 +17,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File,
 from pydantic import BaseModel
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from functools import lru_cache
+from psycopg.rows import dict_row
+from db_pool import pooled_connect, async_connection
 import json
 import os
 from dotenv import load_dotenv
@@ -30,6 +31,8 @@ import threading
 # Import user-based helper functions
 from chat_user_based_helpers import (
     get_user_display_info,
+    get_user_display_info_async,
+    get_users_display_info_async,
     get_user_privacy_settings,
     are_users_connected,
     is_user_blocked,
@@ -70,7 +73,7 @@ DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://astegni_user:Astegni2025@
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 
 # =============================================
@@ -121,7 +124,7 @@ class BlockContactRequest(BaseModel):
 # =============================================
 
 @router.get("/contacts")
-async def get_contacts(user_id: int = Query(...)):
+def get_contacts(user_id: int = Query(...)):
     """
     Get all contacts for a user (accepted connections).
 
@@ -182,7 +185,7 @@ async def get_contacts(user_id: int = Query(...)):
 
 
 @router.get("/connection-requests")
-async def get_connection_requests(user_id: int = Query(...)):
+def get_connection_requests(user_id: int = Query(...)):
     """
     Get pending connection requests for a user.
 
@@ -295,7 +298,7 @@ async def get_connection_requests(user_id: int = Query(...)):
 
 
 @router.post("/connection-requests/{connection_id}/respond")
-async def respond_to_connection_request(
+def respond_to_connection_request(
     connection_id: int,
     user_id: int = Query(...),
     action: str = Query(..., regex="^(accept|reject)$")
@@ -359,167 +362,175 @@ async def respond_to_connection_request(
         conn.close()
 
 
+def _encode_conversation_cursor(last_activity_at: datetime, conversation_id: int) -> str:
+    return f"{last_activity_at.isoformat()}_{conversation_id}"
+
+
+def _decode_conversation_cursor(cursor: str):
+    try:
+        activity, conversation_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(activity), int(conversation_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@lru_cache(maxsize=4096)
+def _decrypt_preview(content: str) -> str:
+    """Decrypted last-message preview; ciphertexts repeat across list refreshes"""
+    return decrypt_message(content)
+
+
 @router.get("/conversations")
 async def get_conversations(
     user_id: int = Query(...),
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
 ):
     """
     Get all conversations for a user with pagination.
 
-    Returns conversations ordered by most recent activity.
-    """
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    try:
-        # Get conversations where user is a participant
-        cur.execute("""
-            SELECT
-                c.id,
-                c.type,
-                c.name,
-                c.description,
-                c.avatar_url,
-                c.created_by_user_id,
-                c.created_at,
-                c.updated_at,
-                cp.is_muted,
-                c.is_archived,
-                cp.last_read_at,
-                (
-                    SELECT COUNT(*)
-                    FROM chat_messages m
-                    WHERE m.conversation_id = c.id
-                    AND m.created_at > COALESCE(cp.last_read_at, '1970-01-01')
-                    AND m.sender_user_id != %s
-                    AND m.is_deleted = false
-                ) as unread_count,
-                (
-                    SELECT m2.content
-                    FROM chat_messages m2
-                    WHERE m2.conversation_id = c.id
-                    AND m2.is_deleted = false
-                    ORDER BY m2.created_at DESC
-                    LIMIT 1
-                ) as last_message_content,
-                (
-                    SELECT m2.message_type
-                    FROM chat_messages m2
-                    WHERE m2.conversation_id = c.id
-                    AND m2.is_deleted = false
-                    ORDER BY m2.created_at DESC
-                    LIMIT 1
-                ) as last_message_type,
-                (
-                    SELECT m2.sender_user_id
-                    FROM chat_messages m2
-                    WHERE m2.conversation_id = c.id
-                    AND m2.is_deleted = false
-                    ORDER BY m2.created_at DESC
-                    LIMIT 1
-                ) as last_message_sender_user_id,
-                (
-                    SELECT m2.created_at
-                    FROM chat_messages m2
-                    WHERE m2.conversation_id = c.id
-                    AND m2.is_deleted = false
-                    ORDER BY m2.created_at DESC
-                    LIMIT 1
-                ) as last_message_time
-            FROM conversations c
-            JOIN conversation_participants cp ON cp.conversation_id = c.id
-            WHERE cp.user_id = %s
-            AND cp.is_active = true
-            ORDER BY COALESCE(
-                (SELECT m3.created_at FROM chat_messages m3
-                 WHERE m3.conversation_id = c.id
-                 AND m3.is_deleted = false
-                 ORDER BY m3.created_at DESC LIMIT 1),
-                c.updated_at
-            ) DESC
-            LIMIT %s OFFSET %s
-        """, (user_id, user_id, limit, offset))
+    Returns conversations ordered by most recent activity. Pass next_cursor
+    back as cursor for the next page (offset still works but is slower).
 
-        conversations = []
+    Reads the denormalized summary (conversations.last_message_*,
+    conversation_participants.unread_count/last_activity_at - see
+    migrate_add_conversation_summary.py), so the cost does not depend on
+    message history: one page query, one participants query, one users query.
+    """
+    async with async_connection(row_factory=dict_row) as conn:
+        cur = conn.cursor()
 
-        for conv in cur.fetchall():
-            conv_dict = dict(conv)
+        try:
+            keyset = ""
+            params = [user_id]
+            if cursor:
+                keyset = "AND (cp.last_activity_at, cp.conversation_id) < (%s, %s)"
+                params.extend(_decode_conversation_cursor(cursor))
+            params.extend([limit, 0 if cursor else offset])
+
+            # Get conversations where user is a participant
+            await cur.execute(f"""
+                SELECT
+                    c.id,
+                    c.type,
+                    c.name,
+                    c.description,
+                    c.avatar_url,
+                    c.created_by_user_id,
+                    c.created_at,
+                    c.updated_at,
+                    cp.is_muted,
+                    c.is_archived,
+                    cp.last_read_at,
+                    cp.unread_count,
+                    cp.last_activity_at,
+                    m.content as last_message_content,
+                    c.last_message_type,
+                    c.last_message_sender_user_id,
+                    c.last_message_at as last_message_time
+                FROM conversation_participants cp
+                JOIN conversations c ON c.id = cp.conversation_id
+                LEFT JOIN chat_messages m ON m.id = c.last_message_id
+                WHERE cp.user_id = %s
+                AND cp.is_active = true
+                {keyset}
+                ORDER BY cp.last_activity_at DESC, cp.conversation_id DESC
+                LIMIT %s OFFSET %s
+            """, params)
 
-            # Decrypt last message if encrypted
-            if conv_dict.get('last_message_content'):
-                try:
-                    if is_encrypted(conv_dict['last_message_content']):
-                        conv_dict['last_message_content'] = decrypt_message(conv_dict['last_message_content'])
-                except Exception as e:
-                    print(f"[Chat API] Error decrypting last message: {e}")
-                    conv_dict['last_message_content'] = "[Encrypted message]"
+            rows = await cur.fetchall()
+            conversation_ids = [row['id'] for row in rows]
 
-            # For direct conversations, get the other participant's info
-            if conv_dict['type'] == 'direct':
-                cur.execute("""
-                    SELECT user_id
+            # Active participants of every conversation on the page
+            participants: Dict[int, List[int]] = {}
+            if conversation_ids:
+                await cur.execute("""
+                    SELECT conversation_id, user_id
                     FROM conversation_participants
-                    WHERE conversation_id = %s
-                    AND user_id != %s
+                    WHERE conversation_id = ANY(%s)
                     AND is_active = true
-                    LIMIT 1
-                """, (conv_dict['id'], user_id))
-
-                other_participant = cur.fetchone()
+                    ORDER BY conversation_id, id
+                """, (conversation_ids,))
+                for row in await cur.fetchall():
+                    participants.setdefault(row['conversation_id'], []).append(row['user_id'])
+
+            other_user_ids = {}
+            for row in rows:
+                if row['type'] == 'direct':
+                    other_user_ids[row['id']] = next(
+                        (pid for pid in participants.get(row['id'], []) if pid != user_id), None
+                    )
+
+            display_info = await get_users_display_info_async(
+                conn,
+                list(other_user_ids.values()) + [row['last_message_sender_user_id'] for row in rows]
+            )
 
-                if other_participant:
-                    other_user_info = get_user_display_info(conn, other_participant['user_id'])
+            conversations = []
+
+            for conv in rows:
+                conv_dict = dict(conv)
+                last_activity_at = conv_dict.pop('last_activity_at')
+
+                # Decrypt last message if encrypted
+                if conv_dict.get('last_message_content'):
+                    try:
+                        if is_encrypted(conv_dict['last_message_content']):
+                            conv_dict['last_message_content'] = _decrypt_preview(conv_dict['last_message_content'])
+                    except Exception as e:
+                        print(f"[Chat API] Error decrypting last message: {e}")
+                        conv_dict['last_message_content'] = "[Encrypted message]"
+
+                # For direct conversations, use the other participant's info
+                other_user_id = other_user_ids.get(conv_dict['id'])
+                if other_user_id:
+                    other_user_info = display_info[other_user_id]
                     conv_dict['name'] = other_user_info['name']
                     conv_dict['avatar_url'] = other_user_info['avatar']
-                    conv_dict['other_user_id'] = other_participant['user_id']
+                    conv_dict['other_user_id'] = other_user_id
 
-            # Get participant count
-            cur.execute("""
-                SELECT COUNT(*) as count
-                FROM conversation_participants
-                WHERE conversation_id = %s
-                AND is_active = true
-            """, (conv_dict['id'],))
+                conv_dict['participant_count'] = len(participants.get(conv_dict['id'], []))
 
-            participant_count = cur.fetchone()
-            conv_dict['participant_count'] = participant_count['count'] if participant_count else 0
+                # Last message sender info
+                if conv_dict.get('last_message_sender_user_id'):
+                    conv_dict['last_message_sender_name'] = display_info[conv_dict['last_message_sender_user_id']]['name']
 
-            # Get last message sender info
-            if conv_dict.get('last_message_sender_user_id'):
-                sender_info = get_user_display_info(conn, conv_dict['last_message_sender_user_id'])
-                conv_dict['last_message_sender_name'] = sender_info['name']
+                # Format timestamps
+                if conv_dict.get('last_message_time'):
+                    conv_dict['last_message_time'] = conv_dict['last_message_time'].isoformat()
+                if conv_dict.get('created_at'):
+                    conv_dict['created_at'] = conv_dict['created_at'].isoformat()
+                if conv_dict.get('updated_at'):
+                    conv_dict['updated_at'] = conv_dict['updated_at'].isoformat()
+                if conv_dict.get('last_read_at'):
+                    conv_dict['last_read_at'] = conv_dict['last_read_at'].isoformat()
 
-            # Format timestamps
-            if conv_dict.get('last_message_time'):
-                conv_dict['last_message_time'] = conv_dict['last_message_time'].isoformat()
-            if conv_dict.get('created_at'):
-                conv_dict['created_at'] = conv_dict['created_at'].isoformat()
-            if conv_dict.get('updated_at'):
-                conv_dict['updated_at'] = conv_dict['updated_at'].isoformat()
-            if conv_dict.get('last_read_at'):
-                conv_dict['last_read_at'] = conv_dict['last_read_at'].isoformat()
+                conversations.append(conv_dict)
 
-            conversations.append(conv_dict)
+            next_cursor = None
+            if len(rows) == limit:
+                next_cursor = _encode_conversation_cursor(rows[-1]['last_activity_at'], rows[-1]['id'])
 
-        return {
-            "conversations": conversations,
-            "total": len(conversations),
-            "limit": limit,
-            "offset": offset
-        }
+            return {
+                "conversations": conversations,
+                "total": len(conversations),
+                "limit": limit,
+                "offset": offset,
+                "next_cursor": next_cursor
+            }
 
-    except Exception as e:
-        print(f"[Chat API] Error fetching conversations for user {user_id}: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to fetch conversations: {str(e)}")
-    finally:
-        cur.close()
-        conn.close()
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"[Chat API] Error fetching conversations for user {user_id}: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to fetch conversations: {str(e)}")
+        finally:
+            await cur.close()
 
 
 @router.post("/conversations")
-async def create_conversation(
+def create_conversation(
     request: CreateConversationRequest,
     user_id: int = Query(...)
 ):
@@ -640,7 +651,7 @@ async def create_conversation(
 
 
 @router.get("/conversations/{conversation_id}")
-async def get_conversation_details(
+def get_conversation_details(
     conversation_id: int,
     user_id: int = Query(...)
 ):
@@ -741,164 +752,163 @@ async def get_messages(
     Messages are returned in reverse chronological order (newest first).
     Automatically decrypts encrypted messages.
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    try:
-        # Check if user is a participant
-        cur.execute("""
-            SELECT 1 FROM conversation_participants
-            WHERE conversation_id = %s
-            AND user_id = %s
-            AND is_active = true
-        """, (conversation_id, user_id))
-
-        if not cur.fetchone():
-            raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
-
-        # Build query based on pagination method
-        if before_message_id:
-            # Fetch messages before a specific message (for infinite scroll)
-            cur.execute("""
-                SELECT m.id, m.sender_user_id, m.message_type, m.content,
-                       m.media_url, m.media_metadata, m.is_edited, m.is_deleted,
-                       m.reply_to_id, m.is_forwarded, m.forwarded_from_id,
-                       m.forwarded_from_avatar, m.forwarded_from_id,
-                       m.created_at, m.updated_at,
-                       (SELECT COUNT(*) FROM message_reactions mr WHERE mr.message_id = m.id) as reaction_count
-                FROM chat_messages m
-                WHERE m.conversation_id = %s
-                AND m.id < %s
-                ORDER BY m.created_at DESC
-                LIMIT %s
-            """, (conversation_id, before_message_id, limit))
-        else:
-            # Standard offset pagination
-            cur.execute("""
-                SELECT m.id, m.sender_user_id, m.message_type, m.content,
-                       m.media_url, m.media_metadata, m.is_edited, m.is_deleted,
-                       m.reply_to_id, m.is_forwarded, m.forwarded_from_id,
-                       m.forwarded_from_avatar, m.forwarded_from_id,
-                       m.created_at, m.updated_at,
-                       (SELECT COUNT(*) FROM message_reactions mr WHERE mr.message_id = m.id) as reaction_count
-                FROM chat_messages m
-                WHERE m.conversation_id = %s
-                ORDER BY m.created_at DESC
-                LIMIT %s OFFSET %s
-            """, (conversation_id, limit, offset))
-
-        messages = []
-
-        for msg in cur.fetchall():
-            msg_dict = dict(msg)
+    async with async_connection(row_factory=dict_row) as conn:
+        cur = conn.cursor()
 
-            # Decrypt content if encrypted
-            if msg_dict.get('content') and not msg_dict.get('is_deleted'):
-                try:
-                    if is_encrypted(msg_dict['content']):
-                        msg_dict['content'] = decrypt_message(msg_dict['content'])
-                except Exception as e:
-                    print(f"[Chat API] Error decrypting message {msg_dict['id']}: {e}")
-                    msg_dict['content'] = "[Failed to decrypt message]"
-
-            # Get sender info
-            if msg_dict.get('sender_user_id'):
-                sender_info = get_user_display_info(conn, msg_dict['sender_user_id'])
-                msg_dict['sender_name'] = sender_info['name']
-                msg_dict['sender_avatar'] = sender_info['avatar']
-
-            # Get reactions
-            cur.execute("""
-                SELECT mr.reaction, mr.user_id, mr.created_at
-                FROM message_reactions mr
-                WHERE mr.message_id = %s
-                ORDER BY mr.created_at ASC
-            """, (msg_dict['id'],))
-
-            reactions = []
-            for reaction in cur.fetchall():
-                reactor_info = get_user_display_info(conn, reaction['user_id'])
-                reactions.append({
-                    "reaction": reaction['reaction'],
-                    "user_id": reaction['user_id'],
-                    "reactor_name": reactor_info['name'],
-                    "created_at": reaction['created_at'].isoformat()
-                })
-
-            msg_dict['reactions'] = reactions
-
-            # Get reply-to message if exists
-            if msg_dict.get('reply_to_id'):
-                cur.execute("""
-                    SELECT id, sender_user_id, content, message_type
-                    FROM chat_messages
-                    WHERE id = %s
-                """, (msg_dict['reply_to_id'],))
-
-                reply_to = cur.fetchone()
-                if reply_to:
-                    reply_to_dict = dict(reply_to)
-
-                    # Decrypt reply content if needed
-                    if reply_to_dict.get('content'):
-                        try:
-                            if is_encrypted(reply_to_dict['content']):
-                                reply_to_dict['content'] = decrypt_message(reply_to_dict['content'])
-                        except:
-                            reply_to_dict['content'] = "[Encrypted]"
-
-                    # Get reply sender info
-                    if reply_to_dict.get('sender_user_id'):
-                        reply_sender_info = get_user_display_info(conn, reply_to_dict['sender_user_id'])
-                        reply_to_dict['sender_name'] = reply_sender_info['name']
-
-                    msg_dict['reply_to'] = reply_to_dict
-
-            # Check if message is pinned
-            cur.execute("""
-                SELECT 1 FROM pinned_messages
-                WHERE message_id = %s
-                AND conversation_id = %s
-            """, (msg_dict['id'], conversation_id))
-
-            msg_dict['is_pinned'] = cur.fetchone() is not None
-
-            # Add is_mine flag to indicate if current user sent this message
-            msg_dict['is_mine'] = msg_dict.get('sender_user_id') == user_id
-
-            # Format timestamps
-            if msg_dict.get('created_at'):
-                msg_dict['created_at'] = msg_dict['created_at'].isoformat()
-            if msg_dict.get('updated_at'):
-                msg_dict['updated_at'] = msg_dict['updated_at'].isoformat()
+        try:
+            # Check if user is a participant
+            await cur.execute("""
+                SELECT 1 FROM conversation_participants
+                WHERE conversation_id = %s
+                AND user_id = %s
+                AND is_active = true
+            """, (conversation_id, user_id))
 
-            messages.append(msg_dict)
+            if not await cur.fetchone():
+                raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
+
+            # Build query based on pagination method
+            if before_message_id:
+                # Fetch messages before a specific message (for infinite scroll)
+                await cur.execute("""
+                    SELECT m.id, m.sender_user_id, m.message_type, m.content,
+                           m.media_url, m.media_metadata, m.is_edited, m.is_deleted,
+                           m.reply_to_id, m.is_forwarded, m.forwarded_from_id,
+                           m.forwarded_from_avatar, m.forwarded_from_id,
+                           m.created_at, m.updated_at,
+                           (SELECT COUNT(*) FROM message_reactions mr WHERE mr.message_id = m.id) as reaction_count
+                    FROM chat_messages m
+                    WHERE m.conversation_id = %s
+                    AND m.id < %s
+                    ORDER BY m.created_at DESC
+                    LIMIT %s
+                """, (conversation_id, before_message_id, limit))
+            else:
+                # Standard offset pagination
+                await cur.execute("""
+                    SELECT m.id, m.sender_user_id, m.message_type, m.content,
+                           m.media_url, m.media_metadata, m.is_edited, m.is_deleted,
+                           m.reply_to_id, m.is_forwarded, m.forwarded_from_id,
+                           m.forwarded_from_avatar, m.forwarded_from_id,
+                           m.created_at, m.updated_at,
+                           (SELECT COUNT(*) FROM message_reactions mr WHERE mr.message_id = m.id) as reaction_count
+                    FROM chat_messages m
+                    WHERE m.conversation_id = %s
+                    ORDER BY m.created_at DESC
+                    LIMIT %s OFFSET %s
+                """, (conversation_id, limit, offset))
+
+            messages = []
+
+            for msg in await cur.fetchall():
+                msg_dict = dict(msg)
+
+                # Decrypt content if encrypted
+                if msg_dict.get('content') and not msg_dict.get('is_deleted'):
+                    try:
+                        if is_encrypted(msg_dict['content']):
+                            msg_dict['content'] = decrypt_message(msg_dict['content'])
+                    except Exception as e:
+                        print(f"[Chat API] Error decrypting message {msg_dict['id']}: {e}")
+                        msg_dict['content'] = "[Failed to decrypt message]"
+
+                # Get sender info
+                if msg_dict.get('sender_user_id'):
+                    sender_info = await get_user_display_info_async(conn, msg_dict['sender_user_id'])
+                    msg_dict['sender_name'] = sender_info['name']
+                    msg_dict['sender_avatar'] = sender_info['avatar']
+
+                # Get reactions
+                await cur.execute("""
+                    SELECT mr.reaction, mr.user_id, mr.created_at
+                    FROM message_reactions mr
+                    WHERE mr.message_id = %s
+                    ORDER BY mr.created_at ASC
+                """, (msg_dict['id'],))
+
+                reactions = []
+                for reaction in await cur.fetchall():
+                    reactor_info = await get_user_display_info_async(conn, reaction['user_id'])
+                    reactions.append({
+                        "reaction": reaction['reaction'],
+                        "user_id": reaction['user_id'],
+                        "reactor_name": reactor_info['name'],
+                        "created_at": reaction['created_at'].isoformat()
+                    })
 
-        # Update last_read_at for user
-        cur.execute("""
-            UPDATE conversation_participants
-            SET last_read_at = NOW(), updated_at = NOW()
-            WHERE conversation_id = %s
-            AND user_id = %s
-        """, (conversation_id, user_id))
+                msg_dict['reactions'] = reactions
+
+                # Get reply-to message if exists
+                if msg_dict.get('reply_to_id'):
+                    await cur.execute("""
+                        SELECT id, sender_user_id, content, message_type
+                        FROM chat_messages
+                        WHERE id = %s
+                    """, (msg_dict['reply_to_id'],))
+
+                    reply_to = await cur.fetchone()
+                    if reply_to:
+                        reply_to_dict = dict(reply_to)
+
+                        # Decrypt reply content if needed
+                        if reply_to_dict.get('content'):
+                            try:
+                                if is_encrypted(reply_to_dict['content']):
+                                    reply_to_dict['content'] = decrypt_message(reply_to_dict['content'])
+                            except:
+                                reply_to_dict['content'] = "[Encrypted]"
+
+                        # Get reply sender info
+                        if reply_to_dict.get('sender_user_id'):
+                            reply_sender_info = await get_user_display_info_async(conn, reply_to_dict['sender_user_id'])
+                            reply_to_dict['sender_name'] = reply_sender_info['name']
+
+                        msg_dict['reply_to'] = reply_to_dict
+
+                # Check if message is pinned
+                await cur.execute("""
+                    SELECT 1 FROM pinned_messages
+                    WHERE message_id = %s
+                    AND conversation_id = %s
+                """, (msg_dict['id'], conversation_id))
+
+                msg_dict['is_pinned'] = await cur.fetchone() is not None
+
+                # Add is_mine flag to indicate if current user sent this message
+                msg_dict['is_mine'] = msg_dict.get('sender_user_id') == user_id
+
+                # Format timestamps
+                if msg_dict.get('created_at'):
+                    msg_dict['created_at'] = msg_dict['created_at'].isoformat()
+                if msg_dict.get('updated_at'):
+                    msg_dict['updated_at'] = msg_dict['updated_at'].isoformat()
+
+                messages.append(msg_dict)
+
+            # Update last_read_at for user
+            await cur.execute("""
+                UPDATE conversation_participants
+                SET last_read_at = NOW(), unread_count = 0, updated_at = NOW()
+                WHERE conversation_id = %s
+                AND user_id = %s
+            """, (conversation_id, user_id))
 
-        conn.commit()
+            await conn.commit()
 
-        return {
-            "messages": messages,
-            "total": len(messages),
-            "limit": limit,
-            "offset": offset
-        }
+            return {
+                "messages": messages,
+                "total": len(messages),
+                "limit": limit,
+                "offset": offset
+            }
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"[Chat API] Error fetching messages for conversation {conversation_id}: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to fetch messages: {str(e)}")
-    finally:
-        cur.close()
-        conn.close()
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"[Chat API] Error fetching messages for conversation {conversation_id}: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to fetch messages: {str(e)}")
+        finally:
+            await cur.close()
 
 
 @router.post("/messages")
@@ -911,113 +921,112 @@ async def send_message(
 
     Automatically encrypts the message content.
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
+    async with async_connection(row_factory=dict_row) as conn:
+        cur = conn.cursor()
 
-    try:
-        # Check if user is a participant
-        cur.execute("""
-            SELECT 1 FROM conversation_participants
-            WHERE conversation_id = %s
-            AND user_id = %s
-            AND is_active = true
-        """, (request.conversation_id, user_id))
+        try:
+            # Check if user is a participant
+            await cur.execute("""
+                SELECT 1 FROM conversation_participants
+                WHERE conversation_id = %s
+                AND user_id = %s
+                AND is_active = true
+            """, (request.conversation_id, user_id))
 
-        if not cur.fetchone():
-            raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
+            if not await cur.fetchone():
+                raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
 
-        # Encrypt content if it's a text message
-        encrypted_content = request.content
-        if request.message_type == "text" and request.content:
-            try:
-                encrypted_content = encrypt_message(request.content)
-            except Exception as e:
-                print(f"[Chat API] Warning: Failed to encrypt message: {e}")
-                # Continue with unencrypted content
-
-        # Insert message
-        cur.execute("""
-            INSERT INTO chat_messages
-            (conversation_id, sender_user_id, message_type, content, media_url,
-             media_metadata, reply_to_id, is_forwarded, forwarded_from_name,
-             forwarded_from_avatar, forwarded_from_id,
-             created_at, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
-            RETURNING id, conversation_id, sender_user_id, message_type, content,
-                      media_url, media_metadata, reply_to_id, is_forwarded,
-                      forwarded_from_name, forwarded_from_avatar, forwarded_from_id,
-                      created_at, updated_at
-        """, (
-            request.conversation_id,
-            user_id,
-            request.message_type,
-            encrypted_content,
-            request.media_url,
-            json.dumps(request.media_metadata) if request.media_metadata else None,
-            request.reply_to_id,
-            request.is_forwarded,
-            request.forwarded_from,
-            request.forwarded_from_avatar,
-            request.forwarded_from_user_id  # Fixed: was forwarded_from_id
-        ))
-
-        new_message = cur.fetchone()
-        msg_dict = dict(new_message)
-
-        # Update conversation's updated_at
-        cur.execute("""
-            UPDATE conversations
-            SET updated_at = NOW()
-            WHERE id = %s
-        """, (request.conversation_id,))
+            # Encrypt content if it's a text message
+            encrypted_content = request.content
+            if request.message_type == "text" and request.content:
+                try:
+                    encrypted_content = encrypt_message(request.content)
+                except Exception as e:
+                    print(f"[Chat API] Warning: Failed to encrypt message: {e}")
+                    # Continue with unencrypted content
+
+            # Insert message
+            await cur.execute("""
+                INSERT INTO chat_messages
+                (conversation_id, sender_user_id, message_type, content, media_url,
+                 media_metadata, reply_to_id, is_forwarded, forwarded_from_name,
+                 forwarded_from_avatar, forwarded_from_id,
+                 created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
+                RETURNING id, conversation_id, sender_user_id, message_type, content,
+                          media_url, media_metadata, reply_to_id, is_forwarded,
+                          forwarded_from_name, forwarded_from_avatar, forwarded_from_id,
+                          created_at, updated_at
+            """, (
+                request.conversation_id,
+                user_id,
+                request.message_type,
+                encrypted_content,
+                request.media_url,
+                json.dumps(request.media_metadata) if request.media_metadata else None,
+                request.reply_to_id,
+                request.is_forwarded,
+                request.forwarded_from,
+                request.forwarded_from_avatar,
+                request.forwarded_from_user_id  # Fixed: was forwarded_from_id
+            ))
+
+            new_message = await cur.fetchone()
+            msg_dict = dict(new_message)
+
+            # Update conversation's updated_at
+            await cur.execute("""
+                UPDATE conversations
+                SET updated_at = NOW()
+                WHERE id = %s
+            """, (request.conversation_id,))
 
-        # Update sender's last_read_at
-        cur.execute("""
-            UPDATE conversation_participants
-            SET last_read_at = NOW(), updated_at = NOW()
-            WHERE conversation_id = %s
-            AND user_id = %s
-        """, (request.conversation_id, user_id))
+            # Update sender's last_read_at
+            await cur.execute("""
+                UPDATE conversation_participants
+                SET last_read_at = NOW(), unread_count = 0, updated_at = NOW()
+                WHERE conversation_id = %s
+                AND user_id = %s
+            """, (request.conversation_id, user_id))
 
-        conn.commit()
+            await conn.commit()
 
-        # Decrypt content for response
-        if msg_dict.get('content'):
-            try:
-                if is_encrypted(msg_dict['content']):
-                    msg_dict['content'] = decrypt_message(msg_dict['content'])
-            except:
-                pass
+            # Decrypt content for response
+            if msg_dict.get('content'):
+                try:
+                    if is_encrypted(msg_dict['content']):
+                        msg_dict['content'] = decrypt_message(msg_dict['content'])
+                except:
+                    pass
 
-        # Get sender info
-        sender_info = get_user_display_info(conn, user_id)
-        msg_dict['sender_name'] = sender_info['name']
-        msg_dict['sender_avatar'] = sender_info['avatar']
+            # Get sender info
+            sender_info = await get_user_display_info_async(conn, user_id)
+            msg_dict['sender_name'] = sender_info['name']
+            msg_dict['sender_avatar'] = sender_info['avatar']
 
-        # Format timestamps
-        if msg_dict.get('created_at'):
-            msg_dict['created_at'] = msg_dict['created_at'].isoformat()
-        if msg_dict.get('updated_at'):
-            msg_dict['updated_at'] = msg_dict['updated_at'].isoformat()
+            # Format timestamps
+            if msg_dict.get('created_at'):
+                msg_dict['created_at'] = msg_dict['created_at'].isoformat()
+            if msg_dict.get('updated_at'):
+                msg_dict['updated_at'] = msg_dict['updated_at'].isoformat()
 
-        return {
-            "message": msg_dict,
-            "status": "sent"
-        }
+            return {
+                "message": msg_dict,
+                "status": "sent"
+            }
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        conn.rollback()
-        print(f"[Chat API] Error sending message: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to send message: {str(e)}")
-    finally:
-        cur.close()
-        conn.close()
+        except HTTPException:
+            raise
+        except Exception as e:
+            await conn.rollback()
+            print(f"[Chat API] Error sending message: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to send message: {str(e)}")
+        finally:
+            await cur.close()
 
 
 @router.put("/messages/{message_id}")
-async def edit_message(
+def edit_message(
     message_id: int,
     request: UpdateMessageRequest,
     user_id: int = Query(...)
@@ -1092,7 +1101,7 @@ async def edit_message(
 
 
 @router.delete("/messages/{message_id}")
-async def delete_message(
+def delete_message(
     message_id: int,
     user_id: int = Query(...)
 ):
@@ -1141,7 +1150,7 @@ async def delete_message(
 
 
 @router.post("/messages/{message_id}/reactions")
-async def add_reaction(
+def add_reaction(
     message_id: int,
     request: ReactionRequest,
     user_id: int = Query(...)
@@ -1198,7 +1207,7 @@ async def add_reaction(
 
 
 @router.delete("/messages/{message_id}/reactions/{reaction}")
-async def remove_reaction(
+def remove_reaction(
     message_id: int,
     reaction: str,
     user_id: int = Query(...)
@@ -1232,7 +1241,7 @@ async def remove_reaction(
 
 
 @router.post("/messages/{message_id}/pin")
-async def pin_message(
+def pin_message(
     message_id: int,
     user_id: int = Query(...)
 ):
@@ -1289,7 +1298,7 @@ async def pin_message(
 
 
 @router.delete("/messages/{message_id}/pin")
-async def unpin_message(
+def unpin_message(
     message_id: int,
     user_id: int = Query(...)
 ):
@@ -1346,7 +1355,7 @@ async def unpin_message(
 
 
 @router.post("/groups")
-async def create_group(
+def create_group(
     request: CreateGroupRequest,
     user_id: int = Query(...)
 ):
@@ -1361,11 +1370,11 @@ async def create_group(
         participant_user_ids=request.participant_user_ids
     )
 
-    return await create_conversation(conv_request, user_id)
+    return create_conversation(conv_request, user_id)
 
 
 @router.post("/conversations/{conversation_id}/participants")
-async def add_participants(
+def add_participants(
     conversation_id: int,
     request: AddParticipantsRequest,
     user_id: int = Query(...)
@@ -1447,7 +1456,7 @@ async def add_participants(
 
 
 @router.delete("/conversations/{conversation_id}/participants/{participant_user_id}")
-async def remove_participant(
+def remove_participant(
     conversation_id: int,
     participant_user_id: int,
     user_id: int = Query(...)
@@ -1500,7 +1509,7 @@ async def remove_participant(
 
 
 @router.put("/conversations/{conversation_id}")
-async def update_conversation(
+def update_conversation(
     conversation_id: int,
     name: Optional[str] = Body(None),
     description: Optional[str] = Body(None),
@@ -1581,7 +1590,7 @@ async def update_conversation(
 
 
 @router.post("/block")
-async def block_contact(
+def block_contact(
     request: BlockContactRequest,
     user_id: int = Query(...)
 ):
@@ -1615,7 +1624,7 @@ async def block_contact(
 
 
 @router.delete("/block/{blocked_user_id}")
-async def unblock_contact(
+def unblock_contact(
     blocked_user_id: int,
     user_id: int = Query(...)
 ):
@@ -1648,7 +1657,7 @@ async def unblock_contact(
 
 
 @router.get("/blocked")
-async def get_blocked_contacts(user_id: int = Query(...)):
+def get_blocked_contacts(user_id: int = Query(...)):
     """
     Get all blocked contacts for a user.
     """
@@ -1686,7 +1695,7 @@ async def get_blocked_contacts(user_id: int = Query(...)):
 
 
 @router.post("/calls")
-async def initiate_call(
+def initiate_call(
     conversation_id: int = Body(...),
     call_type: str = Body(..., regex="^(audio|video)$"),
     user_id: int = Query(...)
@@ -1766,7 +1775,7 @@ async def initiate_call(
 
 
 @router.put("/calls/{call_id}")
-async def update_call_status(
+def update_call_status(
     call_id: int,
     status: str = Body(..., regex="^(answered|missed|declined|ended)$"),
     user_id: int = Query(...)
@@ -1841,7 +1850,7 @@ async def update_call_status(
 
 
 @router.get("/calls")
-async def get_call_history(
+def get_call_history(
     user_id: int = Query(...),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0)
@@ -1901,7 +1910,7 @@ async def get_call_history(
 
 
 @router.delete("/conversations/{conversation_id}/history")
-async def clear_chat_history(
+def clear_chat_history(
     conversation_id: int,
     user_id: int = Query(...)
 ):
@@ -1928,7 +1937,7 @@ async def clear_chat_history(
         # Update last_read_at to now (effectively hiding all previous messages)
         cur.execute("""
             UPDATE conversation_participants
-            SET last_read_at = NOW(), updated_at = NOW()
+            SET last_read_at = NOW(), unread_count = 0, updated_at = NOW()
             WHERE conversation_id = %s
             AND user_id = %s
         """, (conversation_id, user_id))
@@ -1949,7 +1958,7 @@ async def clear_chat_history(
 
 
 @router.get("/conversations/{conversation_id}/read-status")
-async def get_message_read_status(
+def get_message_read_status(
     conversation_id: int,
     user_id: int = Query(...)
 ):
@@ -2005,7 +2014,7 @@ async def get_message_read_status(
 
 
 @router.get("/conversations/{conversation_id}/typing-allowed")
-async def check_typing_allowed(
+def check_typing_allowed(
     conversation_id: int,
     user_id: int = Query(...)
 ):
@@ -2045,7 +2054,7 @@ async def check_typing_allowed(
 
 
 @router.post("/conversations/{conversation_id}/typing")
-async def update_typing_status(
+def update_typing_status(
     conversation_id: int,
     user_id: int = Query(...),
     is_typing: bool = Body(..., embed=True)
@@ -2122,7 +2131,7 @@ async def get_typing_status(
 
 
 @router.get("/users/{target_user_id}/status")
-async def get_user_online_status(
+def get_user_online_status(
     target_user_id: int,
     user_id: int = Query(...)
 ):
@@ -2185,7 +2194,7 @@ async def get_user_online_status(
 
 
 @router.get("/users/online-status")
-async def get_multiple_users_status(
+def get_multiple_users_status(
     user_ids: str = Query(...),  # Comma-separated list
     user_id: int = Query(...)
 ):
@@ -2199,7 +2208,7 @@ async def get_multiple_users_status(
         statuses = []
 
         for target_user_id in target_user_ids:
-            status = await get_user_online_status(target_user_id, user_id)
+            status = get_user_online_status(target_user_id, user_id)
             statuses.append(status)
 
         return {"statuses": statuses}
@@ -2210,7 +2219,7 @@ async def get_multiple_users_status(
 
 
 @router.post("/users/status/update")
-async def update_user_status(
+def update_user_status(
     user_id: int = Query(...),
     device_name: str = Query(None),
     device_type: str = Query(None),
@@ -2255,7 +2264,7 @@ async def update_user_status(
 
 
 @router.get("/sessions")
-async def get_active_sessions(user_id: int = Query(...)):
+def get_active_sessions(user_id: int = Query(...)):
     """
     Get all active sessions for a user.
     """
@@ -2294,7 +2303,7 @@ async def get_active_sessions(user_id: int = Query(...)):
 
 
 @router.delete("/sessions/{session_id}")
-async def terminate_session(
+def terminate_session(
     session_id: int,
     user_id: int = Query(...)
 ):
@@ -2339,7 +2348,7 @@ async def terminate_session(
 
 
 @router.delete("/sessions")
-async def terminate_all_sessions(user_id: int = Query(...)):
+def terminate_all_sessions(user_id: int = Query(...)):
     """
     Terminate all sessions except current one.
     """
@@ -2366,7 +2375,7 @@ async def terminate_all_sessions(user_id: int = Query(...)):
 
 
 @router.post("/sessions/register")
-async def register_session(
+def register_session(
     device_type: str = Body(...),
     device_name: str = Body(...),
     ip_address: str = Body(...),
@@ -2408,7 +2417,7 @@ async def register_session(
 
 
 @router.put("/conversations/{conversation_id}/mute")
-async def mute_conversation(
+def mute_conversation(
     conversation_id: int,
     is_muted: bool = Body(...),
     user_id: int = Query(...)
@@ -2442,7 +2451,7 @@ async def mute_conversation(
 
 
 @router.put("/conversations/{conversation_id}/archive")
-async def archive_conversation(
+def archive_conversation(
     conversation_id: int,
     is_archived: bool = Body(...),
     user_id: int = Query(...)
@@ -2476,7 +2485,7 @@ async def archive_conversation(
 
 
 @router.get("/security/two-step")
-async def get_two_step_settings(user_id: int = Query(...)):
+def get_two_step_settings(user_id: int = Query(...)):
     """
     Get two-step verification settings for user.
     """
@@ -2515,7 +2524,7 @@ async def get_two_step_settings(user_id: int = Query(...)):
 
 
 @router.post("/security/two-step/enable")
-async def enable_two_step_verification(
+def enable_two_step_verification(
     password: str = Body(...),
     recovery_email: Optional[str] = Body(None),
     user_id: int = Query(...)
@@ -2557,7 +2566,7 @@ async def enable_two_step_verification(
 
 
 @router.post("/security/two-step/disable")
-async def disable_two_step_verification(
+def disable_two_step_verification(
     password: str = Body(...),
     user_id: int = Query(...)
 ):
@@ -2608,7 +2617,7 @@ async def disable_two_step_verification(
 
 
 @router.post("/security/two-step/change-password")
-async def change_two_step_password(
+def change_two_step_password(
     current_password: str = Body(...),
     new_password: str = Body(...),
     user_id: int = Query(...)
@@ -2661,7 +2670,7 @@ async def change_two_step_password(
 
 
 @router.post("/security/two-step/change-email")
-async def change_recovery_email(
+def change_recovery_email(
     password: str = Body(...),
     new_email: str = Body(...),
     user_id: int = Query(...)
@@ -2713,7 +2722,7 @@ async def change_recovery_email(
 
 
 @router.post("/security/two-step/verify")
-async def verify_two_step_password(
+def verify_two_step_password(
     password: str = Body(...),
     user_id: int = Query(...)
 ):
@@ -2753,7 +2762,7 @@ async def verify_two_step_password(
 
 
 @router.post("/security/two-step/forgot")
-async def forgot_two_step_password(
+def forgot_two_step_password(
     user_id: int = Query(...)
 ):
     """
@@ -2807,7 +2816,7 @@ async def forgot_two_step_password(
 
 
 @router.post("/security/two-step/reset")
-async def reset_two_step_password(
+def reset_two_step_password(
     reset_token: str = Body(...),
     new_password: str = Body(...),
     user_id: int = Query(...)
@@ -2867,7 +2876,7 @@ async def reset_two_step_password(
 
 
 @router.get("/settings")
-async def get_chat_settings(user_id: int = Query(...)):
+def get_chat_settings(user_id: int = Query(...)):
     """
     Get all chat settings for a user.
     """
@@ -2888,7 +2897,7 @@ async def get_chat_settings(user_id: int = Query(...)):
 
 
 @router.put("/settings")
-async def update_chat_settings(
+def update_chat_settings(
     who_can_message: Optional[str] = Body(None),
     read_receipts: Optional[bool] = Body(None),
     online_status: Optional[bool] = Body(None),
@@ -2988,7 +2997,7 @@ async def update_chat_settings(
 
 
 @router.delete("/data")
-async def delete_all_chat_data(
+def delete_all_chat_data(
     user_id: int = Query(...),
     confirm: bool = Query(...)
 ):
@@ -8,10 +8,37 @@ These functions work with user_id instead of profile_id/profile_type.
 Backward Compatible: Falls back to profile-based lookup if needed.
 """
 
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Iterable, Tuple
 from datetime import datetime
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+
+UNKNOWN_USER_INFO = {"name": "Unknown User", "avatar": None, "email": None, "username": None}
+
+
+def _display_info_from_row(user: Optional[dict]) -> dict:
+    """Build the display info dict from a users row (first_name, father_name, last_name, profile_picture, email)"""
+    if not user:
+        return dict(UNKNOWN_USER_INFO)
+
+    # Build full name
+    first_name = user.get('first_name') or ''
+    father_name = user.get('father_name') or ''
+    last_name = user.get('last_name') or ''
+
+    if last_name:
+        full_name = f"{first_name} {last_name}".strip()
+    else:
+        full_name = f"{first_name} {father_name}".strip()
+
+    if not full_name:
+        full_name = user.get('email', 'Unknown User').split('@')[0]
+
+    return {
+        "name": full_name,
+        "avatar": user.get('profile_picture'),
+        "email": user.get('email'),
+        "username": full_name  # Can be enhanced with actual username field
+    }
 
 
 def get_user_display_info(conn, user_id: int) -> dict:
@@ -32,36 +59,52 @@ def get_user_display_info(conn, user_id: int) -> dict:
             SELECT first_name, father_name, last_name, profile_picture, email
             FROM users WHERE id = %s
         """, (user_id,))
-        user = cur.fetchone()
+        return _display_info_from_row(cur.fetchone())
+    except Exception as e:
+        conn.rollback()
+        print(f"[Chat API] Error getting user display info for user_id {user_id}: {e}")
+        return dict(UNKNOWN_USER_INFO)
+    finally:
+        cur.close()
 
-        if not user:
-            return {"name": "Unknown User", "avatar": None, "email": None, "username": None}
 
-        # Build full name
-        first_name = user.get('first_name') or ''
-        father_name = user.get('father_name') or ''
-        last_name = user.get('last_name') or ''
+async def get_user_display_info_async(conn, user_id: int) -> dict:
+    """Same as get_user_display_info() for a psycopg AsyncConnection (dict_row)"""
+    cur = conn.cursor()
+    try:
+        await cur.execute("""
+            SELECT first_name, father_name, last_name, profile_picture, email
+            FROM users WHERE id = %s
+        """, (user_id,))
+        return _display_info_from_row(await cur.fetchone())
+    except Exception as e:
+        await conn.rollback()
+        print(f"[Chat API] Error getting user display info for user_id {user_id}: {e}")
+        return dict(UNKNOWN_USER_INFO)
+    finally:
+        await cur.close()
 
-        if last_name:
-            full_name = f"{first_name} {last_name}".strip()
-        else:
-            full_name = f"{first_name} {father_name}".strip()
 
-        if not full_name:
-            full_name = user.get('email', 'Unknown User').split('@')[0]
+async def get_users_display_info_async(conn, user_ids: Iterable[int]) -> Dict[int, dict]:
+    """Display info for many users in one query (AsyncConnection, dict_row) - {user_id: info}"""
+    user_ids = list({user_id for user_id in user_ids if user_id})
+    if not user_ids:
+        return {}
 
-        return {
-            "name": full_name,
-            "avatar": user.get('profile_picture'),
-            "email": user.get('email'),
-            "username": full_name  # Can be enhanced with actual username field
-        }
+    cur = conn.cursor()
+    try:
+        await cur.execute("""
+            SELECT id, first_name, father_name, last_name, profile_picture, email
+            FROM users WHERE id = ANY(%s)
+        """, (user_ids,))
+        rows = {row['id']: row for row in await cur.fetchall()}
+        return {user_id: _display_info_from_row(rows.get(user_id)) for user_id in user_ids}
     except Exception as e:
-        conn.rollback()
-        print(f"[Chat API] Error getting user display info for user_id {user_id}: {e}")
-        return {"name": "Unknown User", "avatar": None, "email": None, "username": None}
+        await conn.rollback()
+        print(f"[Chat API] Error getting user display info for {len(user_ids)} users: {e}")
+        return {user_id: dict(UNKNOWN_USER_INFO) for user_id in user_ids}
     finally:
-        cur.close()
+        await cur.close()
 
 
 def get_user_privacy_settings(conn, user_id: int) -> dict:
@@ -33,19 +33,20 @@ UPON ACCEPTANCE:
 - Student's parent_id array gets parent's parent_profile.id
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 import secrets
 import os
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
+from user_context_cache import invalidate_user_context
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 from dotenv import load_dotenv
 import jwt
-from jwt import PyJWTError
 import bcrypt
 from email_service import email_service
 
@@ -57,7 +58,6 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 router = APIRouter(tags=["child-invitations"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
 # ============================================
@@ -69,7 +69,7 @@ def get_db_connection():
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise HTTPException(status_code=500, detail="Database URL not configured")
-    return psycopg.connect(database_url, row_factory=dict_row)
+    return pooled_connect(database_url, row_factory=dict_row)
 
 
 # ============================================
@@ -102,56 +102,6 @@ def create_refresh_token(data: dict):
     return jwt.encode(to_encode, REFRESH_SECRET_KEY, algorithm=ALGORITHM)
 
 
-# ============================================
-# AUTHENTICATION
-# ============================================
-
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current user from JWT token"""
-    credentials_exception = HTTPException(
-        status_code=401,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-
-        if user_id is None:
-            raise credentials_exception
-
-        user_id = int(user_id)
-        role_ids = payload.get("role_ids", {})
-
-    except (PyJWTError, ValueError) as e:
-        print(f"[DEBUG get_current_user] JWT decode error: {e}")
-        raise credentials_exception
-
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, first_name, father_name, grandfather_name, email, phone, roles, active_role
-                FROM users WHERE id = %s
-            """, (user_id,))
-            row = cur.fetchone()
-
-            if not row:
-                raise credentials_exception
-
-            return {
-                "id": row['id'],
-                "first_name": row['first_name'],
-                "father_name": row['father_name'],
-                "grandfather_name": row['grandfather_name'],
-                "email": row['email'],
-                "phone": row['phone'],
-                "roles": row['roles'] if isinstance(row['roles'], list) else [],
-                "active_role": row['active_role'],
-                "role_ids": role_ids
-            }
-
-
 # ============================================
 # PYDANTIC SCHEMAS
 # ============================================
@@ -190,9 +140,9 @@ class ChildInvitationResponse(BaseModel):
 # ============================================
 
 @router.post("/api/parent/invite-child")
-async def invite_existing_child(
+def invite_existing_child(
     request: InviteExistingChildRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Invite an existing user to be a child.
@@ -305,9 +255,9 @@ async def invite_existing_child(
 # ============================================
 
 @router.post("/api/parent/invite-new-child")
-async def invite_new_child(
+def invite_new_child(
     request: InviteNewChildRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Invite a NEW user (not in system) as child.
@@ -428,8 +378,8 @@ async def invite_new_child(
 # ============================================
 
 @router.get("/api/child-invitations/received")
-async def get_received_child_invitations(
-    current_user: dict = Depends(get_current_user)
+def get_received_child_invitations(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get all child invitations received by the current user.
@@ -469,8 +419,8 @@ async def get_received_child_invitations(
 # ============================================
 
 @router.get("/api/parent/child-invitations/sent")
-async def get_sent_child_invitations(
-    current_user: dict = Depends(get_current_user)
+def get_sent_child_invitations(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get all child invitations sent by the current parent.
@@ -525,10 +475,10 @@ async def get_sent_child_invitations(
 # ============================================
 
 @router.post("/api/child-invitations/{invitation_id}/respond")
-async def respond_to_child_invitation(
+def respond_to_child_invitation(
     invitation_id: int,
     request: RespondToInvitationRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Accept or reject a child invitation.
@@ -625,6 +575,7 @@ async def respond_to_child_invitation(
             """, (datetime.utcnow(), invitation_id))
 
             conn.commit()
+            invalidate_user_context(current_user['id'])
 
     return {
         "message": "Invitation accepted! You are now linked as a child.",
@@ -639,9 +590,9 @@ async def respond_to_child_invitation(
 # ============================================
 
 @router.delete("/api/parent/child-invitations/{invitation_id}")
-async def cancel_child_invitation(
+def cancel_child_invitation(
     invitation_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Cancel a pending child invitation.
@@ -677,7 +628,7 @@ async def cancel_child_invitation(
 # ============================================
 
 @router.post("/api/child-invitation/login")
-async def login_with_child_invitation(
+def login_with_child_invitation(
     email: Optional[str] = None,
     phone: Optional[str] = None,
     password: str = None
@@ -805,9 +756,9 @@ async def login_with_child_invitation(
 # ============================================
 
 @router.post("/api/parent/child-invitations/{invitation_id}/resend")
-async def resend_child_invitation(
+def resend_child_invitation(
     invitation_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Resend invitation email/SMS for new users.
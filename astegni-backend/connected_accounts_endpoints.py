@@ -46,7 +46,7 @@ class UnlinkGoogleRequest(BaseModel):
 # ============================================
 
 @router.get("/connected-accounts", response_model=ConnectedAccountsResponse)
-async def get_connected_accounts(
+def get_connected_accounts(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -66,7 +66,7 @@ async def get_connected_accounts(
     )
 
 @router.post("/unlink-google")
-async def unlink_google_account(
+def unlink_google_account(
     request: UnlinkGoogleRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -109,7 +109,7 @@ async def unlink_google_account(
     return {"message": "Google account unlinked successfully"}
 
 @router.post("/set-password")
-async def set_password_for_oauth_user(
+def set_password_for_oauth_user(
     password: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
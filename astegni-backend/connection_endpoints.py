@@ -91,7 +91,7 @@ def get_all_user_roles(db: Session, user_id: int) -> List[str]:
 # ============================================
 
 @router.post("/api/connections", response_model=ConnectionResponse, status_code=status.HTTP_201_CREATED)
-async def create_connection(
+def create_connection(
     connection_data: ConnectionCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -281,7 +281,7 @@ def get_profile_id_for_role(db: Session, user_id: int, role: str) -> Optional[in
 
 
 @router.get("/api/connections", response_model=List[ConnectionResponse])
-async def get_my_connections(
+def get_my_connections(
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by status: pending, accepted, rejected, blocked"),
     direction: Optional[str] = Query("all", description="Filter by direction: outgoing, incoming, all"),
     role: Optional[str] = Query(None, description="Filter by role: tutor, student, parent, advertiser. If provided, filters by profile_id for that role."),
@@ -403,7 +403,7 @@ async def get_my_connections(
 
 
 @router.get("/api/connections/stats", response_model=dict)
-async def get_connection_stats(
+def get_connection_stats(
     role: Optional[str] = Query(None, description="Filter by role: tutor, student, parent, advertiser. If provided, filters by profile_id for that role."),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -550,7 +550,7 @@ async def get_connection_stats(
 
 
 @router.get("/api/connections/{connection_id}", response_model=ConnectionResponse)
-async def get_connection(
+def get_connection(
     connection_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -584,7 +584,7 @@ async def get_connection(
 
 
 @router.put("/api/connections/{connection_id}", response_model=ConnectionResponse)
-async def update_connection(
+def update_connection(
     connection_id: int,
     update_data: ConnectionUpdate,
     current_user: User = Depends(get_current_user),
@@ -653,7 +653,7 @@ async def update_connection(
 
 
 @router.delete("/api/connections/{connection_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_connection(
+def delete_connection(
     connection_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -683,7 +683,7 @@ async def delete_connection(
 
 
 @router.get("/api/users/{user_id}/connections", response_model=List[ConnectionResponse])
-async def get_user_connections(
+def get_user_connections(
     user_id: int,
     status_filter: Optional[str] = Query("accepted", alias="status", description="Filter by status"),
     db: Session = Depends(get_db)
@@ -733,7 +733,7 @@ async def get_user_connections(
 
 
 @router.post("/api/connections/check", response_model=dict)
-async def check_connection_status(
+def check_connection_status(
     request_data: dict,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -788,7 +788,7 @@ async def check_connection_status(
 
 
 @router.post("/api/connections/check-batch", response_model=dict)
-async def check_connection_status_batch(
+def check_connection_status_batch(
     request_data: dict,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
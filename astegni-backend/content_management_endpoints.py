@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 import psycopg
+from db_pool import pooled_connect
 import os
 from dotenv import load_dotenv
 
@@ -96,7 +97,7 @@ def get_db_connection():
     dbname = host_db[1].split('?')[0]
     host_port = host_db[0].split(':')
 
-    return psycopg.connect(
+    return pooled_connect(
         dbname=dbname,
         user=user_pass[0],
         password=user_pass[1],
@@ -109,7 +110,7 @@ def get_db_connection():
 # ========================================
 
 @router.get("/api/admin/contents/stats", response_model=ContentStatsResponse)
-async def get_content_stats():
+def get_content_stats():
     """Get dashboard statistics for content management"""
     try:
         conn = get_db_connection()
@@ -162,7 +163,7 @@ async def get_content_stats():
         raise HTTPException(status_code=500, detail=f"Failed to fetch content stats: {str(e)}")
 
 @router.get("/api/admin/contents", response_model=List[ContentResponse])
-async def get_contents(
+def get_contents(
     verification_status: Optional[str] = None,
     content_type: Optional[str] = None,
     grade_level: Optional[str] = None,
@@ -244,7 +245,7 @@ async def get_contents(
         raise HTTPException(status_code=500, detail=f"Failed to fetch contents: {str(e)}")
 
 @router.get("/api/admin/contents/{content_id}", response_model=ContentResponse)
-async def get_content_by_id(content_id: int):
+def get_content_by_id(content_id: int):
     """Get a specific content by ID"""
     try:
         conn = get_db_connection()
@@ -297,7 +298,7 @@ async def get_content_by_id(content_id: int):
         raise HTTPException(status_code=500, detail=f"Failed to fetch content: {str(e)}")
 
 @router.get("/api/admin/contents/recent/uploads", response_model=List[ContentResponse])
-async def get_recent_uploads(limit: int = 10):
+def get_recent_uploads(limit: int = 10):
     """Get recent uploads for live feed widget"""
     try:
         conn = get_db_connection()
@@ -354,7 +355,7 @@ async def get_recent_uploads(limit: int = 10):
 # ========================================
 
 @router.post("/api/admin/contents", response_model=ContentResponse, status_code=status.HTTP_201_CREATED)
-async def create_content(content: ContentCreate):
+def create_content(content: ContentCreate):
     """Create a new content entry"""
     try:
         conn = get_db_connection()
@@ -422,7 +423,7 @@ async def create_content(content: ContentCreate):
 # ========================================
 
 @router.put("/api/admin/contents/{content_id}", response_model=ContentResponse)
-async def update_content(content_id: int, content: ContentUpdate):
+def update_content(content_id: int, content: ContentUpdate):
     """Update content details"""
     try:
         conn = get_db_connection()
@@ -507,7 +508,7 @@ async def update_content(content_id: int, content: ContentUpdate):
         raise HTTPException(status_code=500, detail=f"Failed to update content: {str(e)}")
 
 @router.put("/api/admin/contents/{content_id}/verify")
-async def update_content_verification(content_id: int, verification: ContentVerificationUpdate):
+def update_content_verification(content_id: int, verification: ContentVerificationUpdate):
     """Update content verification status (verify/reject/suspend/pending)"""
     try:
         conn = get_db_connection()
@@ -590,7 +591,7 @@ async def update_content_verification(content_id: int, verification: ContentVeri
 # ========================================
 
 @router.delete("/api/admin/contents/{content_id}")
-async def delete_content(content_id: int):
+def delete_content(content_id: int):
     """Delete a content entry"""
     try:
         conn = get_db_connection()
@@ -19,6 +19,7 @@ from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Depends, status, Request
 from pydantic import BaseModel
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -106,12 +107,12 @@ def parse_database_url(database_url):
 def get_db_connection():
     """Get user database connection (astegni_user_db) for course data"""
     params = parse_database_url(USER_DATABASE_URL)
-    return psycopg.connect(**params)
+    return pooled_connect(**params)
 
 def get_admin_db_connection():
     """Get admin database connection (astegni_admin_db) for portfolio tracking"""
     params = parse_database_url(ADMIN_DATABASE_URL)
-    return psycopg.connect(**params)
+    return pooled_connect(**params)
 
 def update_admin_portfolio(admin_id: int, action_type: str, course_id: int = None, course_name: str = None):
     """
@@ -178,7 +179,7 @@ def update_admin_portfolio(admin_id: int, action_type: str, course_id: int = Non
 # ============================================
 
 @router.get("/requests")
-async def get_pending_requests():
+def get_pending_requests():
     """Get all pending course requests from courses table"""
     try:
         conn = get_db_connection()
@@ -237,7 +238,7 @@ async def get_pending_requests():
         raise HTTPException(status_code=500, detail=f"Failed to fetch pending requests: {str(e)}")
 
 @router.get("/active")
-async def get_active_courses():
+def get_active_courses():
     """Get all verified/active courses from courses table"""
     try:
         conn = get_db_connection()
@@ -298,7 +299,7 @@ async def get_active_courses():
 
 
 @router.get("/search")
-async def search_verified_courses(q: str = "", limit: int = 10):
+def search_verified_courses(q: str = "", limit: int = 10):
     """
     Search verified courses by name, category, or level.
     Used by tutors to find and add courses to their packages.
@@ -359,7 +360,7 @@ async def search_verified_courses(q: str = "", limit: int = 10):
 
 
 @router.get("/rejected")
-async def get_rejected_courses():
+def get_rejected_courses():
     """Get all rejected courses from courses table"""
     try:
         conn = get_db_connection()
@@ -418,7 +419,7 @@ async def get_rejected_courses():
         raise HTTPException(status_code=500, detail=f"Failed to fetch rejected courses: {str(e)}")
 
 @router.get("/suspended")
-async def get_suspended_courses():
+def get_suspended_courses():
     """Get all suspended courses from courses table"""
     try:
         conn = get_db_connection()
@@ -477,7 +478,7 @@ async def get_suspended_courses():
         raise HTTPException(status_code=500, detail=f"Failed to fetch suspended courses: {str(e)}")
 
 @router.get("/stats")
-async def get_course_statistics():
+def get_course_statistics():
     """Get course statistics grouped by status"""
     try:
         conn = get_db_connection()
@@ -523,7 +524,7 @@ async def get_course_statistics():
 # ============================================
 
 @router.post("/{request_id}/approve")
-async def approve_course(request_id: str, admin_id: Optional[int] = None):
+def approve_course(request_id: str, admin_id: Optional[int] = None):
     """Approve a pending course - change status from pending to verified"""
     try:
         conn = get_db_connection()
@@ -589,7 +590,7 @@ async def approve_course(request_id: str, admin_id: Optional[int] = None):
         raise HTTPException(status_code=500, detail=f"Failed to approve course: {str(e)}")
 
 @router.post("/{request_id}/reject")
-async def reject_course(request_id: str, rejection: StatusUpdateRequest, admin_id: Optional[int] = None):
+def reject_course(request_id: str, rejection: StatusUpdateRequest, admin_id: Optional[int] = None):
     """Reject a pending course - change status from pending to rejected"""
     try:
         conn = get_db_connection()
@@ -655,7 +656,7 @@ async def reject_course(request_id: str, rejection: StatusUpdateRequest, admin_i
         raise HTTPException(status_code=500, detail=f"Failed to reject course: {str(e)}")
 
 @router.post("/{course_id}/suspend")
-async def suspend_course(course_id: str, suspension: StatusUpdateRequest, admin_id: Optional[int] = None):
+def suspend_course(course_id: str, suspension: StatusUpdateRequest, admin_id: Optional[int] = None):
     """Suspend a verified course - change status from verified to suspended"""
     try:
         conn = get_db_connection()
@@ -721,7 +722,7 @@ async def suspend_course(course_id: str, suspension: StatusUpdateRequest, admin_
         raise HTTPException(status_code=500, detail=f"Failed to suspend course: {str(e)}")
 
 @router.post("/{suspended_id}/reinstate")
-async def reinstate_course(suspended_id: str, admin_id: Optional[int] = None):
+def reinstate_course(suspended_id: str, admin_id: Optional[int] = None):
     """Reinstate a suspended course - change status from suspended to verified"""
     try:
         conn = get_db_connection()
@@ -773,7 +774,7 @@ async def reinstate_course(suspended_id: str, admin_id: Optional[int] = None):
         raise HTTPException(status_code=500, detail=f"Failed to reinstate course: {str(e)}")
 
 @router.post("/{rejected_id}/reconsider")
-async def reconsider_course(rejected_id: str, admin_id: Optional[int] = None):
+def reconsider_course(rejected_id: str, admin_id: Optional[int] = None):
     """Reconsider a rejected course - change status from rejected to pending"""
     try:
         conn = get_db_connection()
@@ -825,7 +826,7 @@ async def reconsider_course(rejected_id: str, admin_id: Optional[int] = None):
         raise HTTPException(status_code=500, detail=f"Failed to reconsider course: {str(e)}")
 
 @router.post("/{course_id}/reject-active")
-async def reject_active_course(course_id: str, rejection: StatusUpdateRequest, admin_id: Optional[int] = None):
+def reject_active_course(course_id: str, rejection: StatusUpdateRequest, admin_id: Optional[int] = None):
     """Reject a verified course - change status from verified to rejected"""
     try:
         conn = get_db_connection()
@@ -891,7 +892,7 @@ async def reject_active_course(course_id: str, rejection: StatusUpdateRequest, a
         raise HTTPException(status_code=500, detail=f"Failed to reject course: {str(e)}")
 
 @router.post("/{suspended_id}/reject-suspended")
-async def reject_suspended_course(suspended_id: str, rejection: StatusUpdateRequest, admin_id: Optional[int] = None):
+def reject_suspended_course(suspended_id: str, rejection: StatusUpdateRequest, admin_id: Optional[int] = None):
     """Reject a suspended course - change status from suspended to rejected"""
     try:
         conn = get_db_connection()
@@ -957,7 +958,7 @@ async def reject_suspended_course(suspended_id: str, rejection: StatusUpdateRequ
         raise HTTPException(status_code=500, detail=f"Failed to reject suspended course: {str(e)}")
 
 @router.post("/{course_id}/report")
-async def report_course(course_id: str, report: StatusUpdateRequest, current_user = None):
+def report_course(course_id: str, report: StatusUpdateRequest, current_user = None):
     """
     Report a verified course — called by students or parents.
     Changes status from 'verified' to 'reported' so admin can review.
@@ -1131,7 +1132,7 @@ async def update_suspended_course(course_id: str, update_data: CourseUpdateReque
 # ============================================
 
 @router.post("/{course_id}/notify")
-async def send_course_notification(course_id: str, notification: NotificationRequest):
+def send_course_notification(course_id: str, notification: NotificationRequest):
     """Send notification about a course"""
     try:
         conn = get_db_connection()
@@ -1176,7 +1177,7 @@ async def send_course_notification(course_id: str, notification: NotificationReq
 # ============================================
 
 @router.get("/tutor/{tutor_id}/courses")
-async def get_tutor_courses(tutor_id: int):
+def get_tutor_courses(tutor_id: int):
     """Get all verified courses uploaded by a specific tutor"""
     try:
         conn = get_db_connection()
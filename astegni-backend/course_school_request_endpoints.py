@@ -2,26 +2,19 @@
 Course and School Request Endpoints
 Handles user requests for new courses and schools
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_claims
 from psycopg.rows import dict_row
 import os
-import jwt
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Import SECRET_KEY and ALGORITHM from config
-try:
-    from config import SECRET_KEY, ALGORITHM
-except ImportError:
-    # Fallback to environment variables if config not available
-    SECRET_KEY = os.getenv('SECRET_KEY')
-    ALGORITHM = "HS256"
-
 router = APIRouter()
 
 # Pydantic Models
@@ -69,68 +62,14 @@ def get_db_connection():
     database_url = os.getenv('DATABASE_URL')
     if database_url.startswith('postgresql://'):
         database_url = database_url.replace('postgresql://', 'postgresql://', 1)
-    return psycopg.connect(database_url, row_factory=dict_row)
-
-# Dependency to get current user from token
-async def get_current_user(authorization: Optional[str] = Header(None)):
-    """
-    Extract user from JWT token
-    """
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated - No authorization header"
-        )
-
-    try:
-        # Remove "Bearer " prefix if present
-        token = authorization.replace("Bearer ", "").strip()
-
-        # Decode JWT token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-
-        # Extract user_id from payload
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload - no user ID"
-            )
+    return pooled_connect(database_url, row_factory=dict_row)
 
-        # Convert to int (PyJWT requires string, but our DB uses int)
-        user_id = int(user_id_str)
-
-        # Return a dictionary with user info
-        return {
-            "user_id": user_id,
-            "email": payload.get("email"),
-            "role": payload.get("role")
-        }
-
-    except jwt.ExpiredSignatureError:
-        print(f"[course_school_request_endpoints] Token expired")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has expired"
-        )
-    except jwt.InvalidTokenError as e:
-        print(f"[course_school_request_endpoints] Invalid token: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token: {str(e)}"
-        )
-    except (ValueError, TypeError) as e:
-        print(f"[course_school_request_endpoints] Token validation error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
 
 # Course Request Endpoints
 @router.post("/api/course-requests", response_model=CourseRequestResponse)
-async def create_course_request(
+def create_course_request(
     request: CourseRequestCreate,
-    user = Depends(get_current_user)
+    user = Depends(get_current_user_claims)
 ):
     """Create a new course request"""
     try:
@@ -160,7 +99,7 @@ async def create_course_request(
         )
 
 @router.get("/api/course-requests", response_model=List[CourseRequestResponse])
-async def get_user_course_requests(user = Depends(get_current_user)):
+def get_user_course_requests(user = Depends(get_current_user_claims)):
     """Get all course requests for the current user"""
     try:
         with get_db_connection() as conn:
@@ -181,7 +120,7 @@ async def get_user_course_requests(user = Depends(get_current_user)):
         )
 
 @router.get("/api/course-requests/{request_id}", response_model=CourseRequestResponse)
-async def get_course_request(request_id: int, user = Depends(get_current_user)):
+def get_course_request(request_id: int, user = Depends(get_current_user_claims)):
     """Get a specific course request"""
     try:
         with get_db_connection() as conn:
@@ -209,9 +148,9 @@ async def get_course_request(request_id: int, user = Depends(get_current_user)):
 
 # School Request Endpoints
 @router.post("/api/school-requests", response_model=SchoolRequestResponse)
-async def create_school_request(
+def create_school_request(
     request: SchoolRequestCreate,
-    user = Depends(get_current_user)
+    user = Depends(get_current_user_claims)
 ):
     """Create a new school request"""
     try:
@@ -243,7 +182,7 @@ async def create_school_request(
         )
 
 @router.get("/api/school-requests", response_model=List[SchoolRequestResponse])
-async def get_user_school_requests(user = Depends(get_current_user)):
+def get_user_school_requests(user = Depends(get_current_user_claims)):
     """Get all school requests for the current user"""
     try:
         with get_db_connection() as conn:
@@ -264,7 +203,7 @@ async def get_user_school_requests(user = Depends(get_current_user)):
         )
 
 @router.get("/api/school-requests/{request_id}", response_model=SchoolRequestResponse)
-async def get_school_request(request_id: int, user = Depends(get_current_user)):
+def get_school_request(request_id: int, user = Depends(get_current_user_claims)):
     """Get a specific school request"""
     try:
         with get_db_connection() as conn:
@@ -14,6 +14,7 @@ from pydantic import BaseModel
 # Import from modular structure (path already set up by app.py)
 from models import SessionLocal
 from utils import get_current_user
+from view_counters import track_views
 
 router = APIRouter()
 
@@ -35,141 +36,44 @@ class CourseSchoolViewRequest(BaseModel):
     school_ids: Optional[List[int]] = []
 
 
-# ============================================
-# TRENDING CALCULATION FUNCTIONS
-# ============================================
-
-def calculate_trending_score_generic(search_count: int, last_search: Optional[datetime]) -> float:
-    """
-    Calculate time-weighted trending score
-
-    Formula:
-    - Recent searches (last 24h): weight = 1.0
-    - Searches 1-7 days ago: weight = 0.7
-    - Searches 7-30 days ago: weight = 0.3
-    - Searches older than 30 days: weight = 0.1
-
-    trending_score = search_count * time_weight
-    """
-    if not last_search:
-        return search_count * 0.1  # Old or never searched
-
-    # Calculate time since last search
-    time_since_search = datetime.utcnow() - last_search
-    hours_since = time_since_search.total_seconds() / 3600
-    days_since = hours_since / 24
-
-    # Apply time-based weight
-    if days_since < 1:
-        weight = 1.0  # Very recent (last 24 hours)
-    elif days_since < 7:
-        weight = 0.7  # Recent (last week)
-    elif days_since < 30:
-        weight = 0.3  # Somewhat recent (last month)
-    else:
-        weight = 0.1  # Old searches
-
-    return search_count * weight
-
-
 # ============================================
 # ENDPOINTS
 # ============================================
 
 @router.post("/api/courses-schools/track-views")
-async def track_course_school_views(
-    request: CourseSchoolViewRequest,
-    db: Session = Depends(get_db)
-):
+def track_course_school_views(request: CourseSchoolViewRequest):
     """
     Track when courses and schools are viewed/searched
 
-    This endpoint increments search_count and updates trending_score
-    for courses/schools that appear in search results or are viewed.
+    This endpoint counts a view for courses/schools that appear in search
+    results or are viewed. Counts are buffered (view_counters.py) and added
+    to search_count, with trending_score recomputed, every
+    VIEW_COUNTER_FLUSH_INTERVAL seconds.
 
     Call this endpoint when:
     - Search results are displayed
     - A course/school page is opened
     - Cards are rendered on screen
     """
-    updated_count = 0
     now = datetime.utcnow()
 
     try:
-        # Track courses
-        if request.course_ids:
-            result = db.execute(text("""
-                UPDATE courses
-                SET search_count = search_count + 1,
-                    last_search_increment = :now
-                WHERE id = ANY(:course_ids)
-            """), {"now": now, "course_ids": request.course_ids})
-
-            # Recalculate trending scores
-            courses = db.execute(text("""
-                SELECT id, search_count, last_search_increment
-                FROM courses
-                WHERE id = ANY(:course_ids)
-            """), {"course_ids": request.course_ids}).fetchall()
-
-            for course in courses:
-                trending_score = calculate_trending_score_generic(
-                    course.search_count,
-                    course.last_search_increment
-                )
-                db.execute(text("""
-                    UPDATE courses
-                    SET trending_score = :score
-                    WHERE id = :id
-                """), {"score": trending_score, "id": course.id})
-
-            updated_count += len(request.course_ids)
-
-        # Track schools
-        if request.school_ids:
-            result = db.execute(text("""
-                UPDATE schools
-                SET search_count = search_count + 1,
-                    last_search_increment = :now
-                WHERE id = ANY(:school_ids)
-            """), {"now": now, "school_ids": request.school_ids})
-
-            # Recalculate trending scores
-            schools = db.execute(text("""
-                SELECT id, search_count, last_search_increment
-                FROM schools
-                WHERE id = ANY(:school_ids)
-            """), {"school_ids": request.school_ids}).fetchall()
-
-            for school in schools:
-                trending_score = calculate_trending_score_generic(
-                    school.search_count,
-                    school.last_search_increment
-                )
-                db.execute(text("""
-                    UPDATE schools
-                    SET trending_score = :score
-                    WHERE id = :id
-                """), {"score": trending_score, "id": school.id})
-
-            updated_count += len(request.school_ids)
-
-        db.commit()
+        courses_tracked = track_views("course", request.course_ids or [])
+        schools_tracked = track_views("school", request.school_ids or [])
 
         return {
-            "message": f"Updated search tracking for {updated_count} items",
-            "courses_updated": len(request.course_ids) if request.course_ids else 0,
-            "schools_updated": len(request.school_ids) if request.school_ids else 0,
+            "message": f"Updated search tracking for {courses_tracked + schools_tracked} items",
+            "courses_updated": courses_tracked,
+            "schools_updated": schools_tracked,
             "timestamp": now.isoformat()
         }
 
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to track views: {str(e)}")
 
 
 @router.get("/api/trending/courses")
-async def get_trending_courses(
+def get_trending_courses(
     limit: int = 20,
     min_searches: int = 1,
     db: Session = Depends(get_db)
@@ -182,25 +86,7 @@ async def get_trending_courses(
     - min_searches: Minimum search count to be included (default: 1)
     """
     try:
-        # Recalculate trending scores first
-        courses = db.execute(text("""
-            SELECT id, search_count, last_search_increment
-            FROM courses
-        """)).fetchall()
-
-        for course in courses:
-            trending_score = calculate_trending_score_generic(
-                course.search_count or 0,
-                course.last_search_increment
-            )
-            db.execute(text("""
-                UPDATE courses
-                SET trending_score = :score
-                WHERE id = :id
-            """), {"score": trending_score, "id": course.id})
-
-        db.commit()
-
+        # trending_score is kept fresh by the view counter flush loop (view_counters.py)
         # Get trending courses
         trending_courses = db.execute(text("""
             SELECT
@@ -247,7 +133,7 @@ async def get_trending_courses(
 
 
 @router.get("/api/trending/schools")
-async def get_trending_schools(
+def get_trending_schools(
     limit: int = 20,
     min_searches: int = 1,
     db: Session = Depends(get_db)
@@ -260,25 +146,7 @@ async def get_trending_schools(
     - min_searches: Minimum search count to be included (default: 1)
     """
     try:
-        # Recalculate trending scores first
-        schools = db.execute(text("""
-            SELECT id, search_count, last_search_increment
-            FROM schools
-        """)).fetchall()
-
-        for school in schools:
-            trending_score = calculate_trending_score_generic(
-                school.search_count or 0,
-                school.last_search_increment
-            )
-            db.execute(text("""
-                UPDATE schools
-                SET trending_score = :score
-                WHERE id = :id
-            """), {"score": trending_score, "id": school.id})
-
-        db.commit()
-
+        # trending_score is kept fresh by the view counter flush loop (view_counters.py)
         # Get trending schools
         trending_schools = db.execute(text("""
             SELECT
@@ -323,7 +191,7 @@ async def get_trending_schools(
 
 
 @router.get("/api/courses-schools/search-stats")
-async def get_search_statistics(
+def get_search_statistics(
     db: Session = Depends(get_db)
 ):
     """
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime, timedelta
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 import os
 from dotenv import load_dotenv
@@ -79,12 +80,12 @@ class CourseworkGrade(BaseModel):
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 # ========== COURSEWORK ENDPOINTS ==========
 
 @router.post("/api/coursework/create")
-async def create_coursework(coursework_data: CourseworkCreate, current_user: User = Depends(get_current_user)):
+def create_coursework(coursework_data: CourseworkCreate, current_user: User = Depends(get_current_user)):
     """
     Create a new coursework.
 
@@ -207,7 +208,7 @@ async def create_coursework(coursework_data: CourseworkCreate, current_user: Use
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/coursework/tutor/list")
-async def get_tutor_courseworks(current_user: User = Depends(get_current_user)):
+def get_tutor_courseworks(current_user: User = Depends(get_current_user)):
     """Get all courseworks created by the tutor"""
     try:
         tutor_id = current_user.id
@@ -248,7 +249,7 @@ async def get_tutor_courseworks(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/coursework/student/{student_profile_id}/list")
-async def get_student_courseworks_by_tutor(student_profile_id: int, current_user: User = Depends(get_current_user)):
+def get_student_courseworks_by_tutor(student_profile_id: int, current_user: User = Depends(get_current_user)):
     """
     Get all courseworks assigned to a specific student by the current tutor.
 
@@ -295,7 +296,7 @@ async def get_student_courseworks_by_tutor(student_profile_id: int, current_user
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/coursework/{coursework_id}")
-async def get_coursework_details(coursework_id: str, current_user: User = Depends(get_current_user)):
+def get_coursework_details(coursework_id: str, current_user: User = Depends(get_current_user)):
     """Get coursework details with questions"""
     try:
         conn = get_db_connection()
@@ -350,7 +351,7 @@ async def get_coursework_details(coursework_id: str, current_user: User = Depend
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/api/coursework/{coursework_id}")
-async def update_coursework(coursework_id: str, coursework_data: CourseworkUpdate, current_user: User = Depends(get_current_user)):
+def update_coursework(coursework_id: str, coursework_data: CourseworkUpdate, current_user: User = Depends(get_current_user)):
     """
     Update an existing coursework.
 
@@ -495,7 +496,7 @@ async def update_coursework(coursework_id: str, coursework_data: CourseworkUpdat
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/api/coursework/{coursework_id}")
-async def delete_coursework(coursework_id: str, current_user: User = Depends(get_current_user)):
+def delete_coursework(coursework_id: str, current_user: User = Depends(get_current_user)):
     """Delete a coursework"""
     try:
         tutor_id = current_user.id
@@ -532,7 +533,7 @@ async def delete_coursework(coursework_id: str, current_user: User = Depends(get
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/coursework/student/list")
-async def get_student_courseworks(current_user: User = Depends(get_current_user)):
+def get_student_courseworks(current_user: User = Depends(get_current_user)):
     """
     Get all courseworks assigned to the current student.
 
@@ -598,7 +599,7 @@ async def get_student_courseworks(current_user: User = Depends(get_current_user)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/api/coursework/submit")
-async def submit_coursework(submission: CourseworkSubmission, current_user: User = Depends(get_current_user)):
+def submit_coursework(submission: CourseworkSubmission, current_user: User = Depends(get_current_user)):
     """Submit coursework answers
 
     Note: All coursework tables use student_profiles.id for student_id (profile-based, not user-based).
@@ -751,7 +752,7 @@ async def submit_coursework(submission: CourseworkSubmission, current_user: User
 
 
 @router.get("/api/coursework/{coursework_id}/results")
-async def get_coursework_results(coursework_id: str, current_user: User = Depends(get_current_user)):
+def get_coursework_results(coursework_id: str, current_user: User = Depends(get_current_user)):
     """
     Get coursework results for a student - includes questions, answers, and score.
 
@@ -852,7 +853,7 @@ async def get_coursework_results(coursework_id: str, current_user: User = Depend
 
 
 @router.post("/api/coursework/{coursework_id}/remind")
-async def remind_tutor_to_grade(coursework_id: str, current_user: User = Depends(get_current_user)):
+def remind_tutor_to_grade(coursework_id: str, current_user: User = Depends(get_current_user)):
     """
     Student reminds tutor to grade their coursework.
     Updates last_reminded_at timestamp to bump it to the top of tutor's grading queue.
@@ -917,7 +918,7 @@ async def remind_tutor_to_grade(coursework_id: str, current_user: User = Depends
 
 
 @router.get("/api/coursework/{coursework_id}/submission")
-async def get_coursework_submission_for_grading(coursework_id: str, current_user: User = Depends(get_current_user)):
+def get_coursework_submission_for_grading(coursework_id: str, current_user: User = Depends(get_current_user)):
     """
     Get coursework submission details for tutor to grade.
     Returns the student's answers along with question details.
@@ -997,7 +998,7 @@ async def get_coursework_submission_for_grading(coursework_id: str, current_user
 
 
 @router.get("/api/coursework/{coursework_id}/student-results")
-async def get_coursework_student_results(coursework_id: str, current_user: User = Depends(get_current_user)):
+def get_coursework_student_results(coursework_id: str, current_user: User = Depends(get_current_user)):
     """
     Get coursework results for a student to view their graded submission.
     Students can view their own answers and tutor feedback.
@@ -1086,7 +1087,7 @@ async def get_coursework_student_results(coursework_id: str, current_user: User
 
 
 @router.post("/api/coursework/grade")
-async def grade_coursework(grade_data: CourseworkGrade, current_user: User = Depends(get_current_user)):
+def grade_coursework(grade_data: CourseworkGrade, current_user: User = Depends(get_current_user)):
     """
     Tutor grades a coursework submission.
     Updates individual question scores and overall submission status.
@@ -31,6 +31,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional
 import psycopg
+from db_pool import pooled_connect
 import json
 import os
 from dotenv import load_dotenv
@@ -63,7 +64,7 @@ class CpiSettingsUpdate(BaseModel):
 
 def get_db():
     """Get database connection"""
-    return psycopg.connect(ADMIN_DATABASE_URL)
+    return pooled_connect(ADMIN_DATABASE_URL)
 
 
 # ============================================
@@ -72,7 +73,7 @@ def get_db():
 # ============================================
 
 @router.get("/cpi/base-rate")
-async def get_base_cpi_rate():
+def get_base_cpi_rate():
     """
     Get the base CPI rate for advertisers.
     This is the minimum cost per impression for untargeted campaigns.
@@ -123,7 +124,7 @@ async def get_base_cpi_rate():
 
 
 @router.get("/cpi/full-rates")
-async def get_full_cpi_rates():
+def get_full_cpi_rates():
     """
     Get all CPI rates (base + premiums) for advertisers.
     This helps advertisers understand the full pricing structure.
@@ -262,7 +263,7 @@ async def get_full_cpi_rates():
 # ============================================
 
 @router.get("/admin/cpi-settings")
-async def get_cpi_settings():
+def get_cpi_settings():
     """
     Get all CPI settings for admin panel.
     Returns country-specific region premiums from JSONB column.
@@ -439,7 +440,7 @@ async def get_cpi_settings():
 
 
 @router.post("/admin/cpi-settings")
-async def update_cpi_settings(settings: CpiSettingsUpdate):
+def update_cpi_settings(settings: CpiSettingsUpdate):
     """
     Update CPI settings (admin only).
     Saves region exclusion premiums to JSONB column for country-agnostic support.
@@ -561,7 +562,7 @@ async def update_cpi_settings(settings: CpiSettingsUpdate):
 # ============================================
 
 @router.post("/cpi/calculate")
-async def calculate_cpi_cost(
+def calculate_cpi_cost(
     impressions: int,
     audience: Optional[str] = None,  # tutor, student, parent, all
     location: Optional[str] = None,   # national, regional, international
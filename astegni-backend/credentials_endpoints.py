@@ -16,6 +16,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import date, datetime
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 import os
@@ -88,12 +89,12 @@ class DocumentVerificationUpdate(BaseModel):
 
 def get_db_connection():
     """Get database connection to astegni_user_db with dict row factory"""
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 
 def get_admin_db_connection():
     """Get database connection to astegni_admin_db with dict row factory"""
-    return psycopg.connect(ADMIN_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADMIN_DATABASE_URL, row_factory=dict_row)
 
 
 def update_admin_portfolio(admin_id: int, action: str, credential_id: int, reason: Optional[str] = None):
@@ -351,7 +352,7 @@ async def upload_tutor_document(
 
 
 @router.get("/api/tutor/documents", response_model=List[TutorDocumentResponse])
-async def get_tutor_documents(
+def get_tutor_documents(
     document_type: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
@@ -432,7 +433,7 @@ async def get_tutor_documents(
 
 
 @router.get("/api/tutor/documents/{document_id}", response_model=TutorDocumentResponse)
-async def get_single_document(
+def get_single_document(
     document_id: int,
     current_user: dict = Depends(get_current_user)
 ):
@@ -623,7 +624,7 @@ async def update_tutor_document(
 
 
 @router.delete("/api/tutor/documents/{document_id}")
-async def delete_tutor_document(
+def delete_tutor_document(
     document_id: int,
     current_user: dict = Depends(get_current_user)
 ):
@@ -667,7 +668,7 @@ async def delete_tutor_document(
 # ============================================================================
 
 @router.get("/api/view/tutor/{profile_id}/documents")
-async def get_tutor_credentials_public(profile_id: int):
+def get_tutor_credentials_public(profile_id: int):
     """
     Public endpoint to get tutor credentials for view-tutor.html
 
@@ -741,7 +742,7 @@ async def get_tutor_credentials_public(profile_id: int):
 # ============================================================================
 
 @router.put("/api/admin/tutor-documents/{document_id}/verify", response_model=TutorDocumentResponse)
-async def verify_tutor_document(
+def verify_tutor_document(
     document_id: int,
     verification: DocumentVerificationUpdate,
     current_user: dict = Depends(get_current_user)
@@ -845,7 +846,7 @@ async def verify_tutor_document(
 
 
 @router.put("/api/admin/tutor-documents/{document_id}/feature")
-async def toggle_document_featured(
+def toggle_document_featured(
     document_id: int,
     is_featured: bool,
     current_user: dict = Depends(get_current_user)
@@ -892,7 +893,7 @@ async def toggle_document_featured(
 # ============================================================================
 
 @router.get("/api/admin/credentials/stats")
-async def get_credentials_stats():
+def get_credentials_stats():
     """Get statistics for credentials dashboard - shows credentials from ALL user roles"""
     try:
         with get_db_connection() as conn:
@@ -920,7 +921,7 @@ async def get_credentials_stats():
 
 
 @router.get("/api/admin/credentials/pending")
-async def get_pending_credentials():
+def get_pending_credentials():
     """Get all pending credentials for admin review - shows credentials from ALL user roles"""
     try:
         with get_db_connection() as conn:
@@ -979,7 +980,7 @@ async def get_pending_credentials():
 
 
 @router.get("/api/admin/credentials/verified")
-async def get_verified_credentials():
+def get_verified_credentials():
     """Get all verified credentials - shows credentials from ALL user roles"""
     try:
         with get_db_connection() as conn:
@@ -1038,7 +1039,7 @@ async def get_verified_credentials():
 
 
 @router.get("/api/admin/credentials/rejected")
-async def get_rejected_credentials():
+def get_rejected_credentials():
     """Get all rejected credentials - shows credentials from ALL user roles"""
     try:
         with get_db_connection() as conn:
@@ -1101,7 +1102,7 @@ async def get_rejected_credentials():
 
 
 @router.get("/api/admin/credentials/suspended")
-async def get_suspended_credentials():
+def get_suspended_credentials():
     """Get all suspended credentials - shows credentials from ALL user roles"""
     try:
         with get_db_connection() as conn:
@@ -1171,7 +1172,7 @@ class CredentialVerificationRequest(BaseModel):
 
 
 @router.put("/api/admin/credentials/{credential_id}/verify")
-async def verify_credential(
+def verify_credential(
     credential_id: int,
     request: CredentialVerificationRequest
 ):
@@ -1334,7 +1335,7 @@ def get_profile_id_for_role(user_id: int, role: str) -> Optional[int]:
 
 
 @router.get("/api/documents", response_model=List[UnifiedCredentialResponse])
-async def get_unified_documents(
+def get_unified_documents(
     document_type: Optional[str] = None,
     uploader_role: str = 'student',
     current_user: dict = Depends(get_current_user)
@@ -1422,7 +1423,7 @@ async def get_unified_documents(
 
 
 @router.get("/api/documents/stats", response_model=UnifiedCredentialStats)
-async def get_unified_document_stats(
+def get_unified_document_stats(
     uploader_role: str = 'student',
     current_user: dict = Depends(get_current_user)
 ):
@@ -1845,7 +1846,7 @@ async def update_unified_document(
 
 
 @router.delete("/api/documents/{document_id}")
-async def delete_unified_document(
+def delete_unified_document(
     document_id: int,
     uploader_role: str = 'student',
     current_user: dict = Depends(get_current_user)
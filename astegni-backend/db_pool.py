@@ -0,0 +1,321 @@
+"""
+Shared PostgreSQL connection pools
+One bounded pool per database (user, admin, advertiser) for every module that
+talks to Postgres with raw psycopg instead of the SQLAlchemy session.
+
+Sync endpoints:
+    from db_pool import pooled_connect
+
+    def get_db_connection():
+        return pooled_connect(DATABASE_URL, row_factory=dict_row)
+
+    pooled_connect() is a drop-in replacement for psycopg.connect(): it takes the
+    same conninfo string / keyword arguments, and the returned connection behaves
+    the same, except close() (or leaving a `with` block) hands the connection
+    back to the pool instead of tearing down the TCP session.
+
+Async endpoints:
+    from db_pool import async_connection
+
+    async with async_connection("user", row_factory=dict_row) as conn:
+        cur = await conn.execute(...)
+
+    Async pools are opened/closed from the app.py lifespan.
+
+Configuration (environment, per-database overrides use the pool name, e.g.
+DB_POOL_ADMIN_MAX_SIZE):
+    DB_POOL_MIN_SIZE       connections kept open per pool (default 2)
+    DB_POOL_MAX_SIZE       hard cap per pool and per worker (default 10)
+    DB_POOL_TIMEOUT        seconds to wait for a free connection (default 30)
+    DB_POOL_MAX_IDLE       seconds before an idle extra connection is closed (default 300)
+    DB_POOL_MAX_LIFETIME   seconds before a connection is recycled (default 3600)
+    DB_POOL_CHECK          "true" to health-check connections on checkout (default true)
+
+Pool metrics are served at /api/health/db-pools (see get_pool_stats()).
+"""
+
+import os
+import sys
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+import psycopg
+from psycopg.conninfo import conninfo_to_dict, make_conninfo
+from psycopg.rows import tuple_row
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from config import DATABASE_URL, ADMIN_DATABASE_URL, ADVERTISER_DATABASE_URL
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 2))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", 300))
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", 3600))
+DB_POOL_CHECK = os.getenv("DB_POOL_CHECK", "true").lower() == "true"
+
+# Named databases; anything else passed to pooled_connect() gets its own lazy pool
+DATABASES = {
+    "user": DATABASE_URL,
+    "admin": ADMIN_DATABASE_URL,
+    "advertiser": ADVERTISER_DATABASE_URL,
+}
+
+
+def _normalize_conninfo(conninfo: str = "", **kwargs) -> str:
+    """SQLAlchemy-style URLs (postgresql+psycopg://) -> libpq conninfo"""
+    conninfo = (conninfo or "").replace("postgresql+psycopg://", "postgresql://", 1)
+    return make_conninfo(conninfo, **kwargs)
+
+
+def _pool_key(conninfo: str) -> tuple:
+    """Connections are interchangeable when they hit the same database as the same role"""
+    params = conninfo_to_dict(conninfo)
+    return (
+        params.get("host") or "localhost",
+        str(params.get("port") or 5432),
+        params.get("dbname"),
+        params.get("user"),
+    )
+
+
+def _pool_setting(name: str, setting: str, default):
+    """Per-database override (DB_POOL_<NAME>_<SETTING>) falling back to the global value"""
+    value = os.getenv(f"DB_POOL_{name.upper()}_{setting}")
+    return type(default)(value) if value is not None else default
+
+
+def _pool_options(name: str) -> dict:
+    return {
+        "min_size": _pool_setting(name, "MIN_SIZE", DB_POOL_MIN_SIZE),
+        "max_size": _pool_setting(name, "MAX_SIZE", DB_POOL_MAX_SIZE),
+        "timeout": _pool_setting(name, "TIMEOUT", DB_POOL_TIMEOUT),
+        "max_idle": _pool_setting(name, "MAX_IDLE", DB_POOL_MAX_IDLE),
+        "max_lifetime": _pool_setting(name, "MAX_LIFETIME", DB_POOL_MAX_LIFETIME),
+    }
+
+
+# ============================================
+# SYNC POOLS
+# ============================================
+
+_pools: Dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+_NAMED_KEYS = {
+    _pool_key(_normalize_conninfo(url)): name for name, url in DATABASES.items()
+}
+
+
+def _reset_connection(conn: psycopg.Connection):
+    """Undo per-checkout settings before a connection goes back into the pool"""
+    if conn.autocommit:
+        conn.autocommit = False
+    conn.row_factory = tuple_row
+
+
+def _get_pool(conninfo: str) -> ConnectionPool:
+    key = _pool_key(conninfo)
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            name = _NAMED_KEYS.get(key) or key[2] or "default"
+            pool = ConnectionPool(
+                conninfo,
+                name=name,
+                check=ConnectionPool.check_connection if DB_POOL_CHECK else None,
+                reset=_reset_connection,
+                open=True,
+                **_pool_options(name)
+            )
+            _pools[key] = pool
+    return pool
+
+
+class PooledConnection:
+    """
+    psycopg.Connection stand-in returned by pooled_connect().
+
+    Everything is delegated to the real connection; close() and the context
+    manager return it to the pool instead. A connection that is never closed is
+    returned when the wrapper is garbage collected.
+    """
+
+    __slots__ = ("_pool", "_conn")
+
+    def __init__(self, pool: ConnectionPool, conn: psycopg.Connection):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_conn", conn)
+
+    def __getattr__(self, name):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            raise psycopg.OperationalError("the connection is closed")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    @property
+    def closed(self) -> bool:
+        return self._conn is None or self._conn.closed
+
+    def close(self):
+        conn = self._conn
+        if conn is None:
+            return
+        object.__setattr__(self, "_conn", None)
+        try:
+            # Legacy code often closes without committing read-only work;
+            # roll back here so the pool doesn't warn on every return.
+            if not conn.closed and conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+                conn.rollback()
+        except psycopg.Error:
+            pass
+        self._pool.putconn(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Same semantics as psycopg.Connection: commit on success, roll back on error
+        try:
+            if self._conn is not None and not self._conn.closed:
+                if exc_type is None:
+                    self._conn.commit()
+                else:
+                    self._conn.rollback()
+        finally:
+            self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def pooled_connect(conninfo: str = "", row_factory=None, autocommit: bool = False, **kwargs) -> PooledConnection:
+    """
+    Drop-in replacement for psycopg.connect() backed by the shared pools.
+
+    Raises psycopg_pool.PoolTimeout (a psycopg.OperationalError) when no
+    connection frees up within DB_POOL_TIMEOUT seconds.
+    """
+    pool = _get_pool(_normalize_conninfo(conninfo, **kwargs))
+    conn = pool.getconn()
+    try:
+        if row_factory is not None:
+            conn.row_factory = row_factory
+        if autocommit:
+            conn.autocommit = True
+    except Exception:
+        pool.putconn(conn)
+        raise
+    return PooledConnection(pool, conn)
+
+
+def close_pools():
+    """Close every sync pool (app shutdown)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+# ============================================
+# ASYNC POOLS
+# ============================================
+
+_async_pools: Dict[str, AsyncConnectionPool] = {}
+
+
+async def _reset_async_connection(conn: psycopg.AsyncConnection):
+    if conn.autocommit:
+        await conn.set_autocommit(False)
+    conn.row_factory = tuple_row
+
+
+async def open_async_pools():
+    """Open one async pool per named database (called from app.py lifespan)"""
+    for name, url in DATABASES.items():
+        if name in _async_pools:
+            continue
+        pool = AsyncConnectionPool(
+            _normalize_conninfo(url),
+            name=f"{name}-async",
+            check=AsyncConnectionPool.check_connection if DB_POOL_CHECK else None,
+            reset=_reset_async_connection,
+            open=False,
+            **_pool_options(name)
+        )
+        await pool.open()
+        _async_pools[name] = pool
+
+
+async def close_async_pools():
+    for pool in _async_pools.values():
+        await pool.close()
+    _async_pools.clear()
+
+
+@asynccontextmanager
+async def async_connection(database: str = "user", row_factory=None):
+    """
+    Borrow a connection from the async pool for `database` ("user", "admin" or
+    "advertiser"). Commits on success, rolls back on error.
+    """
+    pool = _async_pools.get(database)
+    if pool is None:
+        raise RuntimeError(f"Async pool '{database}' is not open (see open_async_pools)")
+
+    async with pool.connection() as conn:
+        if row_factory is not None:
+            conn.row_factory = row_factory
+        yield conn
+
+
+# ============================================
+# METRICS
+# ============================================
+
+def _describe(pool) -> dict:
+    stats = pool.get_stats()
+    size = stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    requests = stats.get("requests_num", 0)
+    return {
+        "min_size": stats.get("pool_min", pool.min_size),
+        "max_size": stats.get("pool_max", pool.max_size),
+        "size": size,
+        "available": available,
+        "checked_out": size - available,
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": requests,
+        "requests_queued": stats.get("requests_queued", 0),
+        "avg_wait_ms": round(stats.get("requests_wait_ms", 0) / requests, 2) if requests else 0,
+        "timeouts": stats.get("requests_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
+
+
+def get_pool_stats() -> dict:
+    """Checked-out count, queue length and wait time for every open pool"""
+    return {
+        "sync": {pool.name: _describe(pool) for pool in list(_pools.values())},
+        "async": {pool.name: _describe(pool) for pool in list(_async_pools.values())},
+    }
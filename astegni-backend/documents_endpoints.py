@@ -16,6 +16,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 import os
@@ -78,7 +79,7 @@ class TeachingDocumentStats(BaseModel):
 
 def get_db_connection():
     """Get database connection with dict row factory"""
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 
 def get_profile_id_from_user(user_id: int, role: str) -> Optional[int]:
@@ -104,7 +105,7 @@ def get_profile_id_from_user(user_id: int, role: str) -> Optional[int]:
 # ============================================================================
 
 @router.get("/api/teaching-documents", response_model=List[TeachingDocumentResponse])
-async def get_teaching_documents(
+def get_teaching_documents(
     uploader_role: Optional[str] = Query(None, description="Filter by role: 'tutor' or 'student'"),
     category: Optional[str] = Query(None, description="Filter by category: 'notes', 'assignments', etc."),
     subject: Optional[str] = Query(None, description="Filter by subject"),
@@ -303,7 +304,7 @@ async def get_teaching_documents(
 
 
 @router.get("/api/teaching-documents/stats", response_model=TeachingDocumentStats)
-async def get_teaching_document_stats(
+def get_teaching_document_stats(
     uploader_role: Optional[str] = Query(None),
     current_user = Depends(get_current_user)
 ):
@@ -480,7 +481,7 @@ async def upload_teaching_document(
 
 
 @router.delete("/api/teaching-documents/{document_id}")
-async def delete_teaching_document(
+def delete_teaching_document(
     document_id: int,
     current_user = Depends(get_current_user)
 ):
@@ -8,6 +8,7 @@ from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, date
 import psycopg
+from db_pool import pooled_connect
 from decimal import Decimal
 
 # Import auth utilities
@@ -102,12 +103,12 @@ class InvestmentsSummaryResponse(BaseModel):
 # ============================================================================
 
 @router.get("/api/tutor/earnings/summary")
-async def get_earnings_summary(
+def get_earnings_summary(
     months: int = Query(6, ge=1, le=12),
     current_user: dict = Depends(get_current_user)
 ):
     """Get comprehensive earnings summary for tutor"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -195,12 +196,12 @@ async def get_earnings_summary(
         conn.close()
 
 @router.get("/api/tutor/earnings/direct-affiliate")
-async def get_direct_affiliate_earnings(
+def get_direct_affiliate_earnings(
     limit: int = Query(20, ge=1, le=100),
     current_user: dict = Depends(get_current_user)
 ):
     """Get direct affiliate earnings list"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -241,12 +242,12 @@ async def get_direct_affiliate_earnings(
         conn.close()
 
 @router.get("/api/tutor/earnings/indirect-affiliate")
-async def get_indirect_affiliate_earnings(
+def get_indirect_affiliate_earnings(
     limit: int = Query(20, ge=1, le=100),
     current_user: dict = Depends(get_current_user)
 ):
     """Get indirect affiliate earnings list"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -288,12 +289,12 @@ async def get_indirect_affiliate_earnings(
         conn.close()
 
 @router.get("/api/tutor/earnings/tutoring")
-async def get_tutoring_earnings(
+def get_tutoring_earnings(
     limit: int = Query(20, ge=1, le=100),
     current_user: dict = Depends(get_current_user)
 ):
     """Get tutoring earnings list"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -339,11 +340,11 @@ async def get_tutoring_earnings(
 # ============================================================================
 
 @router.get("/api/tutor/investments/summary")
-async def get_investments_summary(
+def get_investments_summary(
     current_user: dict = Depends(get_current_user)
 ):
     """Get comprehensive investments summary for tutor"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -405,12 +406,12 @@ async def get_investments_summary(
         conn.close()
 
 @router.get("/api/tutor/investments")
-async def get_investments(
+def get_investments(
     status: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
     """Get investments list with optional status filter"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -0,0 +1,378 @@
+"""
+Email Queue Worker
+Standalone sender for email_queue (job alerts, digests, application updates)
+
+    python email_queue_worker.py                 # run forever, poll when the queue is empty
+    python email_queue_worker.py --once          # drain the queue and exit (cron)
+    python email_queue_worker.py --once --smtp-host localhost --smtp-port 1025 --no-tls
+                                                 # against a local sink, e.g.
+                                                 # python -m aiosmtpd -n -l localhost:1025
+
+Per batch:
+1. claim   one UPDATE ... FROM (SELECT ... FOR UPDATE SKIP LOCKED) marks up to
+           --batch due rows 'sending' and bumps attempts - several workers can
+           run side by side without sending a row twice. Rows left 'sending'
+           by a crashed worker are reclaimed after EMAIL_WORKER_STALE_MINUTES,
+           or marked 'failed' if that was their last attempt.
+2. send    concurrently over a pool of --connections persistent aiosmtplib
+           connections (TLS + login once per connection, not per message),
+           at most --rate messages/second overall
+3. settle  one UPDATE per outcome:
+               sent      status 'sent'
+               bounced   recipient refused with a 5xx - status 'bounced'
+               failed    other 5xx, or out of attempts - status 'failed'
+               retry     4xx / connection errors - back to 'pending',
+                         scheduled attempts * EMAIL_WORKER_RETRY_MINUTES later
+
+SMTP settings come from EmailService (system_email_config, .env fallback);
+--smtp-* flags override them. Throughput (messages/s, send latency,
+connections opened) is printed per batch and at exit.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formataddr
+from typing import Dict, List, Optional, Tuple
+
+import aiosmtplib
+import psycopg
+from dotenv import load_dotenv
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from config import DATABASE_URL
+
+load_dotenv()
+
+EMAIL_WORKER_BATCH_SIZE = int(os.getenv("EMAIL_WORKER_BATCH_SIZE", 200))
+EMAIL_WORKER_CONNECTIONS = int(os.getenv("EMAIL_WORKER_CONNECTIONS", 4))
+# Messages per second across all connections (0 = no limit)
+EMAIL_WORKER_RATE = float(os.getenv("EMAIL_WORKER_RATE", 10))
+# Reconnect after this many messages - providers cap messages per session
+EMAIL_WORKER_MESSAGES_PER_CONNECTION = int(os.getenv("EMAIL_WORKER_MESSAGES_PER_CONNECTION", 100))
+EMAIL_WORKER_POLL_SECONDS = float(os.getenv("EMAIL_WORKER_POLL_SECONDS", 5))
+EMAIL_WORKER_STALE_MINUTES = int(os.getenv("EMAIL_WORKER_STALE_MINUTES", 15))
+EMAIL_WORKER_RETRY_MINUTES = int(os.getenv("EMAIL_WORKER_RETRY_MINUTES", 5))
+
+# Queue row: (id, recipient_email, recipient_name, subject, body_html, body_text, attempts, max_attempts)
+
+
+# ============================================
+# SMTP
+# ============================================
+
+class RateLimiter:
+    """Spaces acquisitions at least 1/rate seconds apart (shared by all senders)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class SmtpPool:
+    """
+    Up to `size` persistent SMTP connections, opened on first use. A connection
+    is reused for up to `messages_per_connection` messages, then replaced.
+    """
+
+    def __init__(self, hostname: str, port: int, username: str = "", password: str = "",
+                 use_tls: bool = False, start_tls: Optional[bool] = None, size: int = EMAIL_WORKER_CONNECTIONS,
+                 messages_per_connection: int = EMAIL_WORKER_MESSAGES_PER_CONNECTION, timeout: float = 30):
+        self.options = {
+            "hostname": hostname, "port": port, "use_tls": use_tls, "start_tls": start_tls,
+            "username": username or None, "password": password or None, "timeout": timeout
+        }
+        self.messages_per_connection = messages_per_connection
+        self.connections_opened = 0
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait([None, 0])  # [client, messages sent on it]
+
+    async def _connect(self, slot: list):
+        if slot[0] is not None:
+            await self._close(slot)
+        client = aiosmtplib.SMTP(**self.options)
+        try:
+            await client.connect()  # STARTTLS and login as configured
+        except Exception:
+            client.close()
+            raise
+        self.connections_opened += 1
+        slot[0], slot[1] = client, 0
+
+    @staticmethod
+    async def _close(slot: list):
+        client, slot[0] = slot[0], None
+        try:
+            if client.is_connected:
+                await client.quit()
+        except aiosmtplib.SMTPException:
+            client.close()
+
+    async def send(self, message) -> None:
+        """Send on an idle connection; reconnects once if the server dropped it"""
+        slot = await self._idle.get()
+        try:
+            if slot[0] is None or not slot[0].is_connected or slot[1] >= self.messages_per_connection:
+                await self._connect(slot)
+            try:
+                await slot[0].send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                await self._connect(slot)
+                await slot[0].send_message(message)
+            slot[1] += 1
+        except (aiosmtplib.SMTPException, OSError) as e:
+            if isinstance(e, (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPDataError)):
+                raise  # Message-level - the connection is fine
+            if slot[0] is not None:
+                slot[0].close()
+                slot[0] = None
+            raise
+        finally:
+            self._idle.put_nowait(slot)
+
+    async def close(self):
+        slots = [self._idle.get_nowait() for _ in range(self._idle.qsize())]
+        for slot in slots:
+            if slot[0] is not None:
+                await self._close(slot)
+            self._idle.put_nowait(slot)
+
+
+def build_message(from_header: str, row: tuple) -> MIMEMultipart:
+    _, recipient_email, recipient_name, subject, body_html, body_text = row[:6]
+    message = MIMEMultipart('alternative')
+    message['Subject'] = subject
+    message['From'] = from_header
+    message['To'] = formataddr((recipient_name or "", recipient_email))
+    if body_text:
+        message.attach(MIMEText(body_text, 'plain'))
+    message.attach(MIMEText(body_html, 'html'))
+    return message
+
+
+def classify_error(error: Exception) -> str:
+    """'bounced', 'failed' (permanent for this message) or 'retry'"""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        codes = [refused.code for refused in error.recipients]
+        return 'bounced' if codes and all(500 <= code < 600 for code in codes) else 'retry'
+    # Connection, login and sender errors are about our setup, not the message
+    if isinstance(error, (aiosmtplib.SMTPConnectError, aiosmtplib.SMTPAuthenticationError,
+                          aiosmtplib.SMTPSenderRefused)):
+        return 'retry'
+    if isinstance(error, aiosmtplib.SMTPResponseException) and 500 <= error.code < 600:
+        return 'failed'
+    return 'retry'
+
+
+async def send_rows(pool: SmtpPool, limiter: RateLimiter, from_header: str,
+                    rows: List[tuple]) -> Tuple[Dict[str, List[Tuple[int, str]]], List[float]]:
+    """Send claimed rows concurrently. Returns ({outcome: [(id, error)]}, send latencies in ms)"""
+    outcomes: Dict[str, List[Tuple[int, str]]] = {"sent": [], "bounced": [], "failed": [], "retry": []}
+    latencies: List[float] = []
+
+    async def send_one(row):
+        await limiter.wait()
+        started = time.perf_counter()
+        try:
+            await pool.send(build_message(from_header, row))
+        except Exception as e:
+            outcome = classify_error(e)
+            attempts, max_attempts = row[6], row[7]
+            if outcome == 'retry' and attempts >= max_attempts:
+                outcome = 'failed'
+            outcomes[outcome].append((row[0], str(e)[:500]))
+            return
+        latencies.append((time.perf_counter() - started) * 1000)
+        outcomes["sent"].append((row[0], ""))
+
+    await asyncio.gather(*(send_one(row) for row in rows))
+    return outcomes, latencies
+
+
+# ============================================
+# QUEUE
+# ============================================
+
+async def claim_batch(conn: psycopg.AsyncConnection, batch_size: int) -> List[tuple]:
+    """Mark up to batch_size due rows 'sending' (skipping rows other workers hold)"""
+    async with conn.cursor() as cur:
+        # Stale rows with no attempts left would never be claimed again
+        await cur.execute("""
+            UPDATE email_queue
+            SET status = 'failed', failed_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP,
+                error_message = 'Worker stopped while sending the last attempt'
+            WHERE id IN (
+                SELECT id FROM email_queue
+                WHERE status = 'sending'
+                  AND updated_at < CURRENT_TIMESTAMP - make_interval(mins => %s)
+                  AND attempts >= max_attempts
+                FOR UPDATE SKIP LOCKED
+            )
+        """, (EMAIL_WORKER_STALE_MINUTES,))
+        if cur.rowcount:
+            print(f"[EmailWorker] {cur.rowcount} stale 'sending' emails were out of attempts - marked failed")
+
+        await cur.execute("""
+            UPDATE email_queue q
+            SET status = 'sending', attempts = q.attempts + 1, updated_at = CURRENT_TIMESTAMP
+            FROM (
+                SELECT id FROM email_queue
+                WHERE (status = 'pending'
+                       OR (status = 'sending' AND updated_at < CURRENT_TIMESTAMP - make_interval(mins => %s)))
+                  AND attempts < max_attempts
+                  AND (scheduled_for IS NULL OR scheduled_for <= CURRENT_TIMESTAMP)
+                ORDER BY priority ASC, created_at ASC
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            ) due
+            WHERE q.id = due.id
+            RETURNING q.id, q.recipient_email, q.recipient_name, q.subject, q.body_html, q.body_text,
+                      q.attempts, q.max_attempts
+        """, (EMAIL_WORKER_STALE_MINUTES, batch_size))
+        rows = await cur.fetchall()
+    await conn.commit()
+    return rows
+
+
+async def settle_batch(conn: psycopg.AsyncConnection, outcomes: Dict[str, List[Tuple[int, str]]]):
+    """One UPDATE per outcome"""
+    async with conn.cursor() as cur:
+        if outcomes["sent"]:
+            await cur.execute("""
+                UPDATE email_queue
+                SET status = 'sent', sent_at = CURRENT_TIMESTAMP, error_message = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ANY(%s)
+            """, ([email_id for email_id, _ in outcomes["sent"]],))
+        for outcome in ('bounced', 'failed'):
+            if outcomes[outcome]:
+                await cur.execute("""
+                    UPDATE email_queue q
+                    SET status = %s, failed_at = CURRENT_TIMESTAMP, error_message = e.error,
+                        updated_at = CURRENT_TIMESTAMP
+                    FROM unnest(%s::integer[], %s::text[]) AS e(id, error)
+                    WHERE q.id = e.id
+                """, (outcome, *map(list, zip(*outcomes[outcome]))))
+        if outcomes["retry"]:
+            await cur.execute("""
+                UPDATE email_queue q
+                SET status = 'pending', error_message = e.error, updated_at = CURRENT_TIMESTAMP,
+                    scheduled_for = CURRENT_TIMESTAMP + make_interval(mins => q.attempts * %s)
+                FROM unnest(%s::integer[], %s::text[]) AS e(id, error)
+                WHERE q.id = e.id
+            """, (EMAIL_WORKER_RETRY_MINUTES, *map(list, zip(*outcomes["retry"]))))
+    await conn.commit()
+
+
+class Metrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.batches = 0
+        self.counts = {"sent": 0, "bounced": 0, "failed": 0, "retry": 0}
+        self.latencies: List[float] = []
+
+    def add(self, outcomes: dict, latencies: List[float]):
+        self.batches += 1
+        for outcome, items in outcomes.items():
+            self.counts[outcome] += len(items)
+        self.latencies += latencies
+
+    def report(self, pool: SmtpPool) -> dict:
+        elapsed = time.perf_counter() - self.started
+        latencies = sorted(self.latencies)
+        return {
+            **self.counts,
+            "batches": self.batches,
+            "elapsed_s": round(elapsed, 2),
+            "messages_per_s": round(sum(self.counts.values()) / elapsed, 1) if elapsed else 0.0,
+            "send_p50_ms": round(latencies[len(latencies) // 2], 1) if latencies else None,
+            "send_p95_ms": round(latencies[int(len(latencies) * 0.95)], 1) if latencies else None,
+            "connections_opened": pool.connections_opened,
+        }
+
+
+async def run_worker(pool: SmtpPool, from_header: str, batch_size: int = EMAIL_WORKER_BATCH_SIZE,
+                     rate: float = EMAIL_WORKER_RATE, once: bool = False) -> dict:
+    """Claim, send and settle batches until the queue is empty (once) or forever"""
+    limiter = RateLimiter(rate)
+    metrics = Metrics()
+    conn = await psycopg.AsyncConnection.connect(DATABASE_URL.replace('postgresql+psycopg://', 'postgresql://'))
+    try:
+        while True:
+            rows = await claim_batch(conn, batch_size)
+            if not rows:
+                if once:
+                    break
+                await asyncio.sleep(EMAIL_WORKER_POLL_SECONDS)
+                continue
+
+            batch_started = time.perf_counter()
+            outcomes, latencies = await send_rows(pool, limiter, from_header, rows)
+            await settle_batch(conn, outcomes)
+            metrics.add(outcomes, latencies)
+            elapsed = time.perf_counter() - batch_started
+            print(f"[EmailWorker] Batch of {len(rows)}: "
+                  + ", ".join(f"{len(items)} {outcome}" for outcome, items in outcomes.items() if items)
+                  + f" in {elapsed:.2f}s ({len(rows) / elapsed:.1f} msg/s)")
+    finally:
+        await conn.close()
+        await pool.close()
+    return metrics.report(pool)
+
+
+def smtp_pool_for(config, size: int = EMAIL_WORKER_CONNECTIONS, host: Optional[str] = None,
+                  port: Optional[int] = None, no_tls: bool = False) -> SmtpPool:
+    """SmtpPool for an EmailService's settings (465 = implicit TLS, otherwise STARTTLS)"""
+    host = host or config.smtp_host
+    port = port or config.smtp_port
+    if no_tls:
+        return SmtpPool(host, port, start_tls=False, size=size)
+    return SmtpPool(host, port, config.smtp_user, config.smtp_password,
+                    use_tls=port == 465, start_tls=None if port == 465 else True, size=size)
+
+
+def from_header_for(config) -> str:
+    return f"{config.from_name} <{config.from_email}>"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send email_queue over pooled SMTP connections")
+    parser.add_argument("--once", action="store_true", help="drain the queue and exit")
+    parser.add_argument("--batch", type=int, default=EMAIL_WORKER_BATCH_SIZE)
+    parser.add_argument("--connections", type=int, default=EMAIL_WORKER_CONNECTIONS)
+    parser.add_argument("--rate", type=float, default=EMAIL_WORKER_RATE, help="messages/second, 0 = unlimited")
+    parser.add_argument("--smtp-host")
+    parser.add_argument("--smtp-port", type=int)
+    parser.add_argument("--no-tls", action="store_true", help="plain SMTP, no login (local sink)")
+    args = parser.parse_args()
+
+    from email_service import EmailService
+    config = EmailService()
+    pool = smtp_pool_for(config, args.connections, args.smtp_host, args.smtp_port, args.no_tls)
+
+    try:
+        report = asyncio.run(run_worker(pool, from_header_for(config), args.batch, args.rate, args.once))
+    except KeyboardInterrupt:
+        return
+    print(f"[EmailWorker] {report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1153 @@
+"""
+Email Templates
+Layouts for EmailService, compiled once at import
+
+Each layout registered here is split once into static byte chunks (UTF-8
+encoded) and placeholder names. A send then only joins the chunks with the
+per-message values - HTML-escaped in the HTML part, except placeholders ending
+in `_html` - and base64-encodes each part. The message headers that do not
+depend on the recipient (MIME-Version, the multipart Content-Type with its
+boundary, the part headers) are pre-encoded per layout, the From header per
+sender. No email.mime objects are built per message.
+
+    message = render_message("otp", "Astegni <noreply@astegni.com>", to_email,
+                             otp_code="123456", purpose="verification")
+    server.sendmail(from_email, [to_email], message)       # bytes, CRLF line ends
+
+Placeholders use string.Template syntax (${name}, $$ for a literal $); a
+missing value raises KeyError, and CR or LF in a header value (the rendered
+subject, To, From) raises ValueError.
+
+Usage:
+    python email_templates.py    # list layouts and their placeholders
+"""
+
+import base64
+import html
+import secrets
+from email.header import Header
+from email.utils import formataddr, parseaddr
+from functools import lru_cache
+from string import Template
+from typing import Dict, List, Tuple
+
+
+class _Compiled:
+    """A template source split once into static chunks and placeholders"""
+
+    def __init__(self, source: str, escape: bool, encode: bool):
+        self.chunks: List = []
+        self.names: List[str] = []
+        self.escaped: List[bool] = []
+        self.encode = encode
+        static, position = [], 0
+        for match in Template.pattern.finditer(source):
+            static.append(source[position:match.start()])
+            position = match.end()
+            if match.group("escaped") is not None:
+                static.append("$")
+                continue
+            name = match.group("named") or match.group("braced")
+            if name is None:
+                raise ValueError(f"Invalid placeholder at position {match.start()}: {source[match.start():match.start() + 20]!r}")
+            self.chunks.append("".join(static))
+            static = []
+            self.names.append(name)
+            self.escaped.append(escape and not name.endswith("_html"))
+        static.append(source[position:])
+        self.chunks.append("".join(static))
+        if encode:
+            self.chunks = [chunk.encode("utf-8") for chunk in self.chunks]
+
+    def render(self, values: dict):
+        parts = [self.chunks[0]]
+        for name, escaped, chunk in zip(self.names, self.escaped, self.chunks[1:]):
+            value = values[name]
+            value = "" if value is None else str(value)
+            if escaped:
+                value = html.escape(value)
+            parts.append(value.encode("utf-8") if self.encode else value)
+            parts.append(chunk)
+        return (b"" if self.encode else "").join(parts)
+
+
+def _check_header(name: str, value: str) -> str:
+    """Refuse CR/LF in a header value, as email.message does: either would start a new header"""
+    if "\r" in value or "\n" in value:
+        raise ValueError(f"{name} header may not contain CR or LF characters: {value!r}")
+    return value
+
+
+def _address_header(name: str, value: str) -> bytes:
+    """'From: ...' / 'To: ...' line, RFC 2047-encoding a non-ASCII display name"""
+    _check_header(name, value)
+    if value.isascii():
+        return f"{name}: {value}\r\n".encode("ascii")
+    display_name, address = parseaddr(value)
+    return f"{name}: {formataddr((display_name, address))}\r\n".encode("ascii")
+
+
+@lru_cache(maxsize=16)
+def _from_header(value: str) -> bytes:
+    return _address_header("From", value)
+
+
+def _subject_header(subject: str) -> bytes:
+    _check_header("Subject", subject)
+    if subject.isascii() and len(subject) < 70:
+        return f"Subject: {subject}\r\n".encode("ascii")
+    encoded = Header(subject, "us-ascii" if subject.isascii() else "utf-8", header_name="Subject")
+    return b"Subject: " + encoded.encode(linesep="\r\n").encode("ascii") + b"\r\n"
+
+
+def _base64_body(body: bytes) -> bytes:
+    return base64.encodebytes(body).replace(b"\n", b"\r\n")
+
+
+class EmailTemplate:
+    """A registered layout: subject, plain-text and HTML parts"""
+
+    def __init__(self, name: str, subject: str, text: str, html: str):
+        self.name = name
+        self.sources = (subject, text, html)
+        self._subject = _Compiled(subject, escape=False, encode=False)
+        self._text = _Compiled(text, escape=False, encode=True)
+        self._html = _Compiled(html, escape=True, encode=True)
+        self.placeholders = sorted(set(self._subject.names + self._text.names + self._html.names))
+
+        # '=' and '_' never occur in base64 bodies, so the boundary cannot clash
+        boundary = f"=_astegni_{name}_{secrets.token_hex(8)}"
+        self._head = (
+            "MIME-Version: 1.0\r\n"
+            f'Content-Type: multipart/alternative; boundary="{boundary}"\r\n'
+        ).encode("ascii")
+        part_head = "\r\n--{}\r\nContent-Type: text/{}; charset=\"utf-8\"\r\nContent-Transfer-Encoding: base64\r\n\r\n"
+        self._text_head = part_head.format(boundary, "plain").encode("ascii")
+        self._html_head = part_head.format(boundary, "html").encode("ascii")
+        self._tail = f"\r\n--{boundary}--\r\n".encode("ascii")
+
+    def render(self, /, **values) -> Tuple[str, str, str]:
+        """(subject, text, html) as strings"""
+        return (
+            self._subject.render(values),
+            self._text.render(values).decode("utf-8"),
+            self._html.render(values).decode("utf-8")
+        )
+
+    def message(self, from_header: str, to_email: str, /, **values) -> bytes:
+        """The complete RFC 5322 message, ready for SMTP sendmail()"""
+        values.setdefault("to_email", to_email)
+        return b"".join((
+            _subject_header(self._subject.render(values)),
+            _from_header(from_header),
+            _address_header("To", to_email),
+            self._head,
+            self._text_head,
+            _base64_body(self._text.render(values)),
+            self._html_head,
+            _base64_body(self._html.render(values)),
+            self._tail
+        ))
+
+
+# ============================================
+# REGISTRY
+# ============================================
+
+_templates: Dict[str, EmailTemplate] = {}
+
+
+def register_template(name: str, subject: str, text: str, html: str) -> EmailTemplate:
+    """Compile and register a layout (replaces one registered under the same name)"""
+    template = EmailTemplate(name, subject, text, html)
+    _templates[name] = template
+    return template
+
+
+def get_template(name: str) -> EmailTemplate:
+    try:
+        return _templates[name]
+    except KeyError:
+        raise KeyError(f"Unknown email template '{name}'") from None
+
+
+def render_message(name: str, from_header: str, to_email: str, /, **values) -> bytes:
+    return get_template(name).message(from_header, to_email, **values)
+
+
+def template_names() -> List[str]:
+    return sorted(_templates)
+
+
+# ============================================
+# LAYOUTS
+# ============================================
+
+register_template(
+    "otp",
+    subject="Your Astegni OTP Code - ${otp_code}",
+    text="""
+Hello,
+
+Your Astegni OTP code is: ${otp_code}
+
+This code is valid for 5 minutes.
+
+Purpose: ${purpose}
+
+If you didn't request this code, please ignore this email.
+
+Best regards,
+Astegni Team
+            """,
+    html="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: #F59E0B; color: white; padding: 20px; text-align: center; border-radius: 5px 5px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 5px 5px; }
+        .otp-code { background: #fff; border: 2px solid #F59E0B; border-radius: 5px; padding: 15px; text-align: center; font-size: 32px; font-weight: bold; letter-spacing: 5px; margin: 20px 0; color: #F59E0B; }
+        .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Astegni OTP Verification</h1>
+        </div>
+        <div class="content">
+            <p>Hello,</p>
+            <p>Your Astegni verification code is:</p>
+            <div class="otp-code">${otp_code}</div>
+            <p><strong>Valid for: 5 minutes</strong></p>
+            <p><strong>Purpose:</strong> ${purpose}</p>
+            <p>If you didn't request this code, please ignore this email.</p>
+            <div class="footer">
+                <p>&copy; 2024 Astegni - Ethiopian Educational Platform</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+            """
+)
+
+
+register_template(
+    "admin_invitation",
+    subject="Welcome to Astegni - Your Administrator Access (OTP: ${otp_code})",
+    text="""
+Hello ${first_name},
+
+Welcome to Astegni! We have chosen you because we think you are qualified for '${department}' and you'll add value to our company, which most are fond of and rely on.
+
+So Welcome! We hope you get the best of your life, experience, and knowledge here at Astegni. May God our Father and the father of our company, our Lord and the Lord of the company, Jesus Christ, and the Holy Spirit that's always with us and the company be with you!
+
+Godspeed!
+
+---
+YOUR ADMINISTRATOR ACCESS CODE
+---
+
+Your OTP Code: ${otp_code}
+Valid for: 7 DAYS
+
+Please use this code to complete your administrator account setup.
+
+---
+
+Best regards,
+Astegni Team
+            """,
+    html="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: 'Georgia', serif; line-height: 1.8; color: #333; }
+        .container { max-width: 650px; margin: 0 auto; padding: 20px; background: #ffffff; }
+        .header { background: linear-gradient(135deg, #F59E0B 0%, #D97706 100%); color: white; padding: 40px 20px; text-align: center; border-radius: 10px 10px 0 0; }
+        .header h1 { margin: 0; font-size: 28px; }
+        .content { background: #f9fafb; padding: 40px 30px; }
+        .welcome-message { background: white; padding: 25px; border-left: 4px solid #F59E0B; margin: 20px 0; font-size: 16px; line-height: 1.8; }
+        .blessing { font-style: italic; color: #6B7280; margin: 20px 0; padding: 15px; background: #FEF3C7; border-radius: 5px; }
+        .otp-section { background: white; border: 3px solid #F59E0B; border-radius: 10px; padding: 30px; text-align: center; margin: 30px 0; }
+        .otp-code { background: #FEF3C7; border: 2px dashed #F59E0B; border-radius: 8px; padding: 20px; font-size: 36px; font-weight: bold; letter-spacing: 8px; margin: 20px 0; color: #D97706; font-family: 'Courier New', monospace; }
+        .validity { color: #DC2626; font-weight: bold; font-size: 18px; margin-top: 15px; }
+        .footer { text-align: center; margin-top: 30px; padding: 20px; color: #6B7280; font-size: 13px; border-top: 2px solid #E5E7EB; }
+        .department { display: inline-block; background: #DBEAFE; color: #1E40AF; padding: 5px 15px; border-radius: 20px; font-weight: bold; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🎓 Welcome to Astegni</h1>
+            <p style="margin: 10px 0 0 0; font-size: 16px;">Ethiopian Educational Platform</p>
+        </div>
+        <div class="content">
+            <div class="welcome-message">
+                <p><strong>Hello ${first_name},</strong></p>
+                <p>Welcome to Astegni! We have chosen you because we think you are qualified for <span class="department">${department}</span> and you'll add value to our company, which most are fond of and rely on.</p>
+                <p>So Welcome! We hope you get the best of your life, experience, and knowledge here at Astegni.</p>
+                <div class="blessing">
+                    <p>May God our Father and the father of our company, our Lord and the Lord of the company, Jesus Christ, and the Holy Spirit that's always with us and the company be with you!</p>
+                    <p style="text-align: right; margin: 10px 0 0 0;"><strong>Godspeed!</strong></p>
+                </div>
+            </div>
+
+            <div class="otp-section">
+                <h2 style="color: #F59E0B; margin-top: 0;">Your Administrator Access Code</h2>
+                <p>Please use this code to complete your administrator account setup:</p>
+                <div class="otp-code">${otp_code}</div>
+                <div class="validity">⏰ Valid for 7 DAYS</div>
+                <p style="margin-top: 20px; font-size: 14px; color: #6B7280;">Keep this code secure and do not share it with anyone.</p>
+            </div>
+
+            <div class="footer">
+                <p><strong>Astegni Educational Platform</strong></p>
+                <p>Building the future of Ethiopian education</p>
+                <p style="margin-top: 10px;">&copy; 2024 Astegni. All rights reserved.</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+            """
+)
+
+
+register_template(
+    "parent_invitation",
+    subject="Astegni - You've been invited as a ${relationship_type}",
+    text="""
+Hello ${parent_name},
+
+You have been invited to join Astegni as a ${relationship_type} by ${student_name}.
+
+Astegni is Ethiopia's leading educational platform connecting students with tutors and parents.
+
+YOUR ACCOUNT DETAILS
+--------------------
+Email: ${to_email}
+Temporary Password: ${temp_password}
+
+Please log in to Astegni and change your password immediately.
+
+Once logged in, you can:
+- View your child's academic progress
+- Track tutoring sessions
+- Communicate with tutors
+- Monitor learning activities
+
+NEXT STEPS
+----------
+1. Go to Astegni website/app
+2. Log in with your email and temporary password
+3. Accept the invitation from ${student_name}
+4. Change your password to something secure
+
+If you did not expect this invitation, please ignore this email.
+
+Best regards,
+Astegni Team
+            """,
+    html="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #8B5CF6 0%, #6366F1 100%); color: white; padding: 30px 20px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .credentials { background: white; border: 2px solid #8B5CF6; border-radius: 10px; padding: 20px; margin: 20px 0; }
+        .password-box { background: #EDE9FE; border: 2px dashed #8B5CF6; border-radius: 5px; padding: 15px; text-align: center; font-size: 24px; font-weight: bold; letter-spacing: 3px; margin: 15px 0; color: #6366F1; font-family: monospace; }
+        .steps { background: white; padding: 20px; border-radius: 10px; margin: 20px 0; }
+        .step { display: flex; align-items: center; margin: 10px 0; }
+        .step-number { background: #8B5CF6; color: white; width: 30px; height: 30px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold; }
+        .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+        .relationship { display: inline-block; background: #EDE9FE; color: #6366F1; padding: 5px 15px; border-radius: 20px; font-weight: bold; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Welcome to Astegni!</h1>
+            <p>You've been invited as a <span class="relationship">${relationship_type}</span></p>
+        </div>
+        <div class="content">
+            <p>Hello <strong>${parent_name}</strong>,</p>
+            <p>You have been invited to join Astegni by <strong>${student_name}</strong>.</p>
+            <p>Astegni is Ethiopia's leading educational platform connecting students with tutors and parents.</p>
+
+            <div class="credentials">
+                <h3 style="color: #8B5CF6; margin-top: 0;">Your Account Details</h3>
+                <p><strong>Email:</strong> ${to_email}</p>
+                <p><strong>Temporary Password:</strong></p>
+                <div class="password-box">${temp_password}</div>
+                <p style="color: #DC2626; font-size: 14px;">Please change this password after your first login!</p>
+            </div>
+
+            <div class="steps">
+                <h3 style="color: #8B5CF6; margin-top: 0;">Next Steps</h3>
+                <div class="step">
+                    <div class="step-number">1</div>
+                    <div>Go to Astegni website/app</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">2</div>
+                    <div>Log in with your email and temporary password</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">3</div>
+                    <div>Accept the invitation from ${student_name}</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">4</div>
+                    <div>Change your password to something secure</div>
+                </div>
+            </div>
+
+            <p style="font-size: 14px; color: #666;">If you did not expect this invitation, please ignore this email.</p>
+
+            <div class="footer">
+                <p>&copy; 2024 Astegni - Ethiopian Educational Platform</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+            """
+)
+
+
+register_template(
+    "parent_invitation_link",
+    subject="Astegni - ${student_name} has invited you as their ${relationship_type}",
+    text="""
+Hello ${parent_name},
+
+${student_name} has invited you to join Astegni as their ${relationship_type}.
+
+Astegni is Ethiopia's leading educational platform connecting students with tutors and parents.
+
+TO COMPLETE YOUR REGISTRATION:
+------------------------------
+1. Click this link: ${invitation_link}
+2. Enter your OTP code: ${otp_code}
+3. Set your password and complete registration
+
+This invitation expires in 7 days.
+
+Once registered, you can:
+- View your child's academic progress
+- Track tutoring sessions
+- Communicate with tutors
+- Monitor learning activities
+
+If you did not expect this invitation, please ignore this email.
+
+Best regards,
+Astegni Team
+            """,
+    html="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #8B5CF6 0%, #6366F1 100%); color: white; padding: 30px 20px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .cta-button { display: inline-block; background: linear-gradient(135deg, #8B5CF6 0%, #6366F1 100%); color: white; padding: 15px 40px; border-radius: 8px; text-decoration: none; font-weight: bold; font-size: 18px; margin: 20px 0; }
+        .otp-box { background: white; border: 2px solid #8B5CF6; border-radius: 10px; padding: 20px; margin: 20px 0; text-align: center; }
+        .otp-code { background: #EDE9FE; border: 2px dashed #8B5CF6; border-radius: 5px; padding: 15px; font-size: 32px; font-weight: bold; letter-spacing: 8px; margin: 10px 0; color: #6366F1; font-family: monospace; }
+        .validity { color: #059669; font-weight: bold; font-size: 14px; margin-top: 10px; }
+        .steps { background: white; padding: 20px; border-radius: 10px; margin: 20px 0; }
+        .step { display: flex; align-items: center; margin: 10px 0; }
+        .step-number { background: #8B5CF6; color: white; width: 30px; height: 30px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold; flex-shrink: 0; }
+        .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+        .relationship { display: inline-block; background: #EDE9FE; color: #6366F1; padding: 5px 15px; border-radius: 20px; font-weight: bold; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>You're Invited to Astegni!</h1>
+            <p>${student_name} wants you as their <span class="relationship">${relationship_type}</span></p>
+        </div>
+        <div class="content">
+            <p>Hello <strong>${parent_name}</strong>,</p>
+            <p><strong>${student_name}</strong> has invited you to join Astegni, Ethiopia's leading educational platform.</p>
+
+            <div style="text-align: center; margin: 30px 0;">
+                <a href="${invitation_link}" class="cta-button">Accept Invitation</a>
+            </div>
+
+            <div class="otp-box">
+                <h3 style="color: #8B5CF6; margin-top: 0;">Your Verification Code</h3>
+                <p>Enter this code when you click the link above:</p>
+                <div class="otp-code">${otp_code}</div>
+                <div class="validity">✓ Valid for 7 days</div>
+            </div>
+
+            <div class="steps">
+                <h3 style="color: #8B5CF6; margin-top: 0;">How to Complete Registration</h3>
+                <div class="step">
+                    <div class="step-number">1</div>
+                    <div>Click the "Accept Invitation" button above</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">2</div>
+                    <div>Enter the verification code: <strong>${otp_code}</strong></div>
+                </div>
+                <div class="step">
+                    <div class="step-number">3</div>
+                    <div>Set your password and complete your profile</div>
+                </div>
+            </div>
+
+            <p style="font-size: 14px; color: #666;">If you did not expect this invitation, please ignore this email.</p>
+
+            <div class="footer">
+                <p>&copy; 2024 Astegni - Ethiopian Educational Platform</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+            """
+)
+
+
+register_template(
+    "existing_parent_otp",
+    subject="Astegni - ${student_name} wants to add you as their ${relationship_type}",
+    text="""
+Hello ${parent_name},
+
+${student_name} has sent you a parent invitation on Astegni.
+
+They want to add you as their ${relationship_type}.
+
+YOUR VERIFICATION CODE
+----------------------
+OTP: ${otp_code}
+Valid for: 7 days
+
+TO ACCEPT THIS INVITATION:
+--------------------------
+1. Log in to your Astegni account
+2. Go to your Parent Profile
+3. Find the pending invitation from ${student_name}
+4. Enter the OTP code above to accept
+
+Once accepted, you can:
+- View ${student_name}'s academic progress
+- Track their tutoring sessions
+- Communicate with their tutors
+- Monitor their learning activities
+
+If you did not expect this invitation, you can ignore it or reject it in your account.
+
+Best regards,
+Astegni Team
+            """,
+    html="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #10B981 0%, #059669 100%); color: white; padding: 30px 20px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .otp-box { background: white; border: 2px solid #10B981; border-radius: 10px; padding: 20px; margin: 20px 0; text-align: center; }
+        .otp-code { background: #D1FAE5; border: 2px dashed #10B981; border-radius: 5px; padding: 20px; font-size: 36px; font-weight: bold; letter-spacing: 8px; margin: 15px 0; color: #059669; font-family: monospace; }
+        .validity { color: #059669; font-weight: bold; font-size: 14px; margin-top: 10px; }
+        .steps { background: white; padding: 20px; border-radius: 10px; margin: 20px 0; }
+        .step { display: flex; align-items: center; margin: 10px 0; }
+        .step-number { background: #10B981; color: white; width: 30px; height: 30px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold; flex-shrink: 0; }
+        .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+        .relationship { display: inline-block; background: #D1FAE5; color: #059669; padding: 5px 15px; border-radius: 20px; font-weight: bold; }
+        .student-name { font-size: 24px; font-weight: bold; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Parent Invitation</h1>
+            <p class="student-name">${student_name}</p>
+            <p>wants you as their <span class="relationship">${relationship_type}</span></p>
+        </div>
+        <div class="content">
+            <p>Hello <strong>${parent_name}</strong>,</p>
+            <p>You have received a parent invitation from <strong>${student_name}</strong> on Astegni.</p>
+
+            <div class="otp-box">
+                <h3 style="color: #059669; margin-top: 0;">Your Verification Code</h3>
+                <p>Use this code to accept the invitation:</p>
+                <div class="otp-code">${otp_code}</div>
+                <div class="validity">✓ Valid for 7 days</div>
+            </div>
+
+            <div class="steps">
+                <h3 style="color: #059669; margin-top: 0;">How to Accept</h3>
+                <div class="step">
+                    <div class="step-number">1</div>
+                    <div>Log in to your Astegni account</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">2</div>
+                    <div>Go to Parent Profile → Pending Invitations</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">3</div>
+                    <div>Find the invitation from ${student_name}</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">4</div>
+                    <div>Enter OTP: <strong>${otp_code}</strong> to accept</div>
+                </div>
+            </div>
+
+            <p style="font-size: 14px; color: #666;">If you did not expect this invitation, you can ignore it or reject it in your account.</p>
+
+            <div class="footer">
+                <p>&copy; 2024 Astegni - Ethiopian Educational Platform</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+            """
+)
+
+
+register_template(
+    "parent_invitation_otp",
+    subject="Astegni - You've been invited as a ${relationship_type} (OTP: ${otp_code})",
+    text="""
+Hello ${parent_name},
+
+You have been invited to join Astegni as a ${relationship_type} by ${student_name}.
+
+Astegni is Ethiopia's leading educational platform connecting students with tutors and parents.
+
+YOUR ONE-TIME PASSWORD (OTP)
+----------------------------
+OTP Code: ${otp_code}
+Valid for: 30 minutes
+
+Please use this OTP to verify your identity and complete your registration.
+
+Once logged in, you can:
+- View your child's academic progress
+- Track tutoring sessions
+- Communicate with tutors
+- Monitor learning activities
+
+NEXT STEPS
+----------
+1. Go to Astegni website/app
+2. Enter your email and the OTP code above
+3. Complete your registration
+4. Start monitoring your child's education
+
+If you did not expect this invitation, please ignore this email.
+
+Best regards,
+Astegni Team
+            """,
+    html="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #8B5CF6 0%, #6366F1 100%); color: white; padding: 30px 20px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .otp-box { background: white; border: 2px solid #8B5CF6; border-radius: 10px; padding: 20px; margin: 20px 0; text-align: center; }
+        .otp-code { background: #EDE9FE; border: 2px dashed #8B5CF6; border-radius: 5px; padding: 20px; font-size: 36px; font-weight: bold; letter-spacing: 8px; margin: 15px 0; color: #6366F1; font-family: monospace; }
+        .validity { color: #DC2626; font-weight: bold; font-size: 16px; margin-top: 10px; }
+        .steps { background: white; padding: 20px; border-radius: 10px; margin: 20px 0; }
+        .step { display: flex; align-items: center; margin: 10px 0; }
+        .step-number { background: #8B5CF6; color: white; width: 30px; height: 30px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold; }
+        .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+        .relationship { display: inline-block; background: #EDE9FE; color: #6366F1; padding: 5px 15px; border-radius: 20px; font-weight: bold; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Welcome to Astegni!</h1>
+            <p>You've been invited as a <span class="relationship">${relationship_type}</span></p>
+        </div>
+        <div class="content">
+            <p>Hello <strong>${parent_name}</strong>,</p>
+            <p>You have been invited to join Astegni by <strong>${student_name}</strong>.</p>
+            <p>Astegni is Ethiopia's leading educational platform connecting students with tutors and parents.</p>
+
+            <div class="otp-box">
+                <h3 style="color: #8B5CF6; margin-top: 0;">Your One-Time Password (OTP)</h3>
+                <p>Use this code to verify your identity:</p>
+                <div class="otp-code">${otp_code}</div>
+                <div class="validity">⏰ Valid for 30 minutes</div>
+            </div>
+
+            <div class="steps">
+                <h3 style="color: #8B5CF6; margin-top: 0;">Next Steps</h3>
+                <div class="step">
+                    <div class="step-number">1</div>
+                    <div>Go to Astegni website/app</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">2</div>
+                    <div>Enter your email and the OTP code above</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">3</div>
+                    <div>Complete your registration</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">4</div>
+                    <div>Start monitoring your child's education</div>
+                </div>
+            </div>
+
+            <p style="font-size: 14px; color: #666;">If you did not expect this invitation, please ignore this email.</p>
+
+            <div class="footer">
+                <p>&copy; 2024 Astegni - Ethiopian Educational Platform</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+            """
+)
+
+
+register_template(
+    "coparent_invitation",
+    subject="Astegni - Co-Parent Invitation from ${inviter_name}",
+    text="""
+Hello,
+
+You have been invited to join Astegni as a co-parent by ${inviter_name}.
+
+They want to share parenting access to their children with you as their ${relationship_type}.
+
+Astegni is Ethiopia's leading educational platform connecting students with tutors and parents.
+
+YOUR ACCOUNT DETAILS
+--------------------
+Email: ${to_email}
+Temporary Password: ${temp_password}
+
+Please log in to Astegni and change your password immediately.
+
+Once logged in, you can:
+- View shared children's academic progress
+- Track tutoring sessions together
+- Communicate with tutors
+- Monitor learning activities
+
+NEXT STEPS
+----------
+1. Go to Astegni website/app
+2. Log in with your email and temporary password
+3. Your account will be automatically linked
+4. Change your password to something secure
+
+If you did not expect this invitation, please ignore this email.
+
+Best regards,
+Astegni Team
+            """,
+    html="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #10B981 0%, #059669 100%); color: white; padding: 30px 20px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .credentials { background: white; border: 2px solid #10B981; border-radius: 10px; padding: 20px; margin: 20px 0; }
+        .password-box { background: #D1FAE5; border: 2px dashed #10B981; border-radius: 5px; padding: 15px; text-align: center; font-size: 24px; font-weight: bold; letter-spacing: 3px; margin: 15px 0; color: #059669; font-family: monospace; }
+        .steps { background: white; padding: 20px; border-radius: 10px; margin: 20px 0; }
+        .step { display: flex; align-items: center; margin: 10px 0; }
+        .step-number { background: #10B981; color: white; width: 30px; height: 30px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold; }
+        .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+        .relationship { display: inline-block; background: #D1FAE5; color: #059669; padding: 5px 15px; border-radius: 20px; font-weight: bold; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Co-Parent Invitation</h1>
+            <p>Share parenting together on Astegni</p>
+        </div>
+        <div class="content">
+            <p>Hello,</p>
+            <p>You have been invited to join Astegni as a co-parent by <strong>${inviter_name}</strong>.</p>
+            <p>They want to share parenting access to their children with you as their <span class="relationship">${relationship_type}</span>.</p>
+
+            <div class="credentials">
+                <h3 style="color: #10B981; margin-top: 0;">Your Account Details</h3>
+                <p><strong>Email:</strong> ${to_email}</p>
+                <p><strong>Temporary Password:</strong></p>
+                <div class="password-box">${temp_password}</div>
+                <p style="color: #DC2626; font-size: 14px;">Please change this password after your first login!</p>
+            </div>
+
+            <div class="steps">
+                <h3 style="color: #10B981; margin-top: 0;">Next Steps</h3>
+                <div class="step">
+                    <div class="step-number">1</div>
+                    <div>Go to Astegni website/app</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">2</div>
+                    <div>Log in with your email and temporary password</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">3</div>
+                    <div>Your account will be automatically linked to the children</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">4</div>
+                    <div>Change your password to something secure</div>
+                </div>
+            </div>
+
+            <p>As a co-parent, you'll be able to:</p>
+            <ul>
+                <li>View shared children's academic progress</li>
+                <li>Track tutoring sessions together</li>
+                <li>Communicate with tutors</li>
+                <li>Monitor learning activities</li>
+            </ul>
+
+            <p style="color: #666; font-size: 14px;">If you did not expect this invitation, please ignore this email.</p>
+        </div>
+        <div class="footer">
+            <p>&copy; 2025 Astegni. All rights reserved.</p>
+            <p>Ethiopia's Leading Educational Platform</p>
+        </div>
+    </div>
+</body>
+</html>
+            """
+)
+
+
+register_template(
+    "two_step_reset",
+    subject="Astegni Chat - Reset Your Security Password",
+    text="""
+Hello,
+
+You requested to reset your Astegni Chat security password (Two-Step Verification).
+
+Your reset code is: ${otp_code}
+
+This code is valid for 10 minutes.
+
+If you didn't request this reset, please ignore this email and your password will remain unchanged.
+
+For security, please do not share this code with anyone.
+
+Best regards,
+Astegni Team
+            """,
+    html="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #F59E0B 0%, #D97706 100%); color: white; padding: 30px 20px; text-align: center; border-radius: 10px 10px 0 0; }
+        .shield-icon { font-size: 48px; margin-bottom: 10px; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .otp-box { background: white; border: 2px solid #F59E0B; border-radius: 10px; padding: 25px; margin: 25px 0; text-align: center; }
+        .otp-code { background: #FEF3C7; border: 2px dashed #F59E0B; border-radius: 8px; padding: 20px; font-size: 36px; font-weight: bold; letter-spacing: 10px; margin: 15px 0; color: #D97706; font-family: 'Courier New', monospace; }
+        .validity { color: #DC2626; font-weight: bold; font-size: 14px; margin-top: 15px; }
+        .warning { background: #FEF2F2; border-left: 4px solid #DC2626; padding: 15px; margin: 20px 0; font-size: 14px; color: #991B1B; }
+        .footer { text-align: center; margin-top: 25px; color: #666; font-size: 12px; padding-top: 20px; border-top: 1px solid #e5e7eb; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <div class="shield-icon">🔐</div>
+            <h1>Reset Security Password</h1>
+            <p>Two-Step Verification</p>
+        </div>
+        <div class="content">
+            <p>Hello,</p>
+            <p>You requested to reset your <strong>Astegni Chat security password</strong> (Two-Step Verification).</p>
+
+            <div class="otp-box">
+                <h3 style="color: #F59E0B; margin-top: 0;">Your Reset Code</h3>
+                <p>Enter this code in the app to reset your password:</p>
+                <div class="otp-code">${otp_code}</div>
+                <div class="validity">⏰ Valid for 10 minutes</div>
+            </div>
+
+            <div class="warning">
+                <strong>⚠️ Security Notice:</strong><br>
+                If you didn't request this reset, please ignore this email. Your password will remain unchanged.
+                <br><br>
+                Never share this code with anyone, including Astegni support staff.
+            </div>
+
+            <div class="footer">
+                <p>&copy; 2025 Astegni - Ethiopian Educational Platform</p>
+                <p>This is an automated message. Please do not reply.</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+            """
+)
+
+
+register_template(
+    "child_invitation",
+    subject="Astegni - ${parent_name} has added you as their child",
+    text="""
+Hello ${child_name},
+
+${parent_name} has added you to their family on Astegni!
+
+Astegni is Ethiopia's leading educational platform connecting students with tutors and parents.
+
+YOUR ACCOUNT DETAILS
+--------------------
+Email: ${to_email}
+Temporary Password: ${temp_password}
+
+Please log in to Astegni and change your password immediately.
+
+Once logged in, you can:
+- Complete your student profile
+- Find tutors for any subject
+- Track your academic progress
+- Connect with your parents
+
+NEXT STEPS
+----------
+1. Go to Astegni website/app
+2. Log in with your email and temporary password
+3. Complete your student profile
+4. Change your password to something secure
+
+If you did not expect this, please contact your parent.
+
+Best regards,
+Astegni Team
+            """,
+    html="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #10B981 0%, #059669 100%); color: white; padding: 30px 20px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .credentials { background: white; border: 2px solid #10B981; border-radius: 10px; padding: 20px; margin: 20px 0; }
+        .password-box { background: #D1FAE5; border: 2px dashed #10B981; border-radius: 5px; padding: 15px; text-align: center; font-size: 24px; font-weight: bold; letter-spacing: 3px; margin: 15px 0; color: #059669; font-family: monospace; }
+        .steps { background: white; padding: 20px; border-radius: 10px; margin: 20px 0; }
+        .step { display: flex; align-items: center; margin: 10px 0; }
+        .step-number { background: #10B981; color: white; width: 30px; height: 30px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold; }
+        .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+        .parent-name { display: inline-block; background: #D1FAE5; color: #059669; padding: 5px 15px; border-radius: 20px; font-weight: bold; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Welcome to Astegni!</h1>
+            <p><span class="parent-name">${parent_name}</span> has added you to their family</p>
+        </div>
+        <div class="content">
+            <p>Hello <strong>${child_name}</strong>,</p>
+            <p>Great news! <strong>${parent_name}</strong> has added you as their child on Astegni.</p>
+            <p>Astegni is Ethiopia's leading educational platform connecting students with tutors and parents.</p>
+
+            <div class="credentials">
+                <h3 style="color: #10B981; margin-top: 0;">Your Account Details</h3>
+                <p><strong>Email:</strong> ${to_email}</p>
+                <p><strong>Temporary Password:</strong></p>
+                <div class="password-box">${temp_password}</div>
+                <p style="color: #DC2626; font-size: 14px;">Please change this password after your first login!</p>
+            </div>
+
+            <div class="steps">
+                <h3 style="color: #10B981; margin-top: 0;">Next Steps</h3>
+                <div class="step">
+                    <div class="step-number">1</div>
+                    <div>Go to Astegni website/app</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">2</div>
+                    <div>Log in with your email and temporary password</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">3</div>
+                    <div>Complete your student profile</div>
+                </div>
+                <div class="step">
+                    <div class="step-number">4</div>
+                    <div>Change your password to something secure</div>
+                </div>
+            </div>
+
+            <p style="font-size: 14px; color: #666;">If you did not expect this, please contact your parent.</p>
+
+            <div class="footer">
+                <p>&copy; 2025 Astegni - Ethiopian Educational Platform</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+            """
+)
+
+
+register_template(
+    "team_invitation",
+    subject="You're invited to join ${brand_name} on Astegni",
+    text="""
+Hello ${invitee_name},
+
+${inviter_name} has invited you to join ${brand_name} as a Brand Manager on Astegni.
+
+As a Brand Manager, you'll be able to:
+- Create and manage advertising campaigns
+- View campaign analytics and performance
+- Manage brand assets and creatives
+
+ACCEPT YOUR INVITATION
+----------------------
+Click this link to accept: ${invitation_link}
+
+Or copy and paste this URL into your browser:
+${invitation_link}
+
+This invitation link is unique to you. Please don't share it with others.
+
+If you don't have an Astegni account yet, you'll be asked to create one first.
+
+If you didn't expect this invitation, please ignore this email.
+
+Best regards,
+Astegni Team
+            """,
+    html="""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #3B82F6 0%, #8B5CF6 100%); color: white; padding: 30px 20px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .brand-badge { display: inline-block; background: rgba(255,255,255,0.2); padding: 8px 20px; border-radius: 25px; font-weight: bold; margin-top: 10px; }
+        .permissions { background: white; border-radius: 10px; padding: 20px; margin: 20px 0; }
+        .permission-item { display: flex; align-items: center; margin: 12px 0; }
+        .permission-icon { background: #DBEAFE; color: #3B82F6; width: 36px; height: 36px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin-right: 15px; font-size: 16px; }
+        .accept-btn { display: inline-block; background: linear-gradient(135deg, #3B82F6 0%, #8B5CF6 100%); color: white !important; padding: 15px 40px; border-radius: 30px; text-decoration: none; font-weight: bold; font-size: 16px; margin: 20px 0; }
+        .accept-btn:hover { opacity: 0.9; }
+        .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+        .link-fallback { background: #f3f4f6; padding: 15px; border-radius: 8px; word-break: break-all; font-size: 12px; color: #666; margin-top: 20px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 style="margin: 0;">You're Invited!</h1>
+            <div class="brand-badge">${brand_name}</div>
+        </div>
+        <div class="content">
+            <p>Hello <strong>${invitee_name}</strong>,</p>
+            <p><strong>${inviter_name}</strong> has invited you to join <strong>${brand_name}</strong> as a <span style="color: #3B82F6; font-weight: bold;">Brand Manager</span> on Astegni.</p>
+
+            <div class="permissions">
+                <h3 style="color: #3B82F6; margin-top: 0;">As a Brand Manager, you'll be able to:</h3>
+                <div class="permission-item">
+                    <div class="permission-icon">&#128640;</div>
+                    <div>Create and manage advertising campaigns</div>
+                </div>
+                <div class="permission-item">
+                    <div class="permission-icon">&#128200;</div>
+                    <div>View campaign analytics and performance</div>
+                </div>
+                <div class="permission-item">
+                    <div class="permission-icon">&#127912;</div>
+                    <div>Manage brand assets and creatives</div>
+                </div>
+            </div>
+
+            <div style="text-align: center;">
+                <a href="${invitation_link}" class="accept-btn">Accept Invitation</a>
+            </div>
+
+            <div class="link-fallback">
+                <strong>Can't click the button?</strong> Copy and paste this link into your browser:<br>
+                ${invitation_link}
+            </div>
+
+            <p style="color: #666; font-size: 13px; margin-top: 25px;">
+                This invitation link is unique to you. Please don't share it with others.<br>
+                If you don't have an Astegni account yet, you'll be asked to create one first.
+            </p>
+
+            <div class="footer">
+                <p>&copy; 2025 Astegni - Ethiopian Educational Platform</p>
+                <p style="font-size: 11px;">If you didn't expect this invitation, you can safely ignore this email.</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+            """
+)
+
+
+register_template(
+    "branded",
+    subject="${subject}",
+    text="${body_text}",
+    html="""
+<!DOCTYPE html>
+<html><head><style>
+  body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+  .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+  .header { background: #F59E0B; color: white; padding: 20px; text-align: center; border-radius: 5px 5px 0 0; }
+  .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 5px 5px; }
+  .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+</style></head><body>
+  <div class="container">
+    <div class="header"><h1>${heading}</h1></div>
+    <div class="content">${body_html}
+      <div class="footer"><p>&copy; Astegni - Ethiopian Educational Platform</p></div>
+    </div>
+  </div>
+</body></html>"""
+)
+
+
+if __name__ == "__main__":
+    for name in template_names():
+        print(f"{name:24s} {', '.join(get_template(name).placeholders)}")
@@ -9,6 +9,7 @@ from typing import Optional, List
 from datetime import datetime
 from utils import get_current_user
 import psycopg
+from db_pool import pooled_connect
 import os
 from dotenv import load_dotenv
 
@@ -86,9 +87,9 @@ class ClubUpdate(BaseModel):
 # ============================================
 
 @router.post("/api/events", status_code=status.HTTP_201_CREATED)
-async def create_event(event: EventCreate, current_user: dict = Depends(get_current_user)):
+def create_event(event: EventCreate, current_user: dict = Depends(get_current_user)):
     """Create a new event"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -156,7 +157,7 @@ async def create_event(event: EventCreate, current_user: dict = Depends(get_curr
 from fastapi import Header
 
 @router.get("/api/events")
-async def get_events(
+def get_events(
     status_filter: Optional[str] = None,
     type_filter: Optional[str] = None,
     search: Optional[str] = None,
@@ -171,7 +172,7 @@ async def get_events(
     - role: Filter by specific role (tutor, student, parent, advertiser).
             When provided, uses the corresponding profile_id for filtering.
     """
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     # Try to get current user from token (optional)
@@ -293,9 +294,9 @@ async def get_events(
         conn.close()
 
 @router.get("/api/events/{event_id}")
-async def get_event(event_id: int):
+def get_event(event_id: int):
     """Get a specific event by ID"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -375,13 +376,13 @@ async def get_event(event_id: int):
         conn.close()
 
 @router.put("/api/events/{event_id}")
-async def update_event(
+def update_event(
     event_id: int,
     event_update: EventUpdate,
     current_user: dict = Depends(get_current_user)
 ):
     """Update an event (only creator can update)"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -438,9 +439,9 @@ async def update_event(
         conn.close()
 
 @router.delete("/api/events/{event_id}")
-async def delete_event(event_id: int, current_user: dict = Depends(get_current_user)):
+def delete_event(event_id: int, current_user: dict = Depends(get_current_user)):
     """Delete an event (only creator can delete)"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -478,9 +479,9 @@ async def delete_event(event_id: int, current_user: dict = Depends(get_current_u
         conn.close()
 
 @router.get("/api/events/my/created")
-async def get_my_events(current_user: dict = Depends(get_current_user)):
+def get_my_events(current_user: dict = Depends(get_current_user)):
     """Get events created by current user"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -528,9 +529,9 @@ async def get_my_events(current_user: dict = Depends(get_current_user)):
         conn.close()
 
 @router.get("/api/events/by-parent/{parent_id}")
-async def get_events_by_parent(parent_id: int):
+def get_events_by_parent(parent_id: int):
     """Get events created by a specific parent (by parent_profiles.id)"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -601,9 +602,9 @@ async def get_events_by_parent(parent_id: int):
 # ============================================
 
 @router.post("/api/clubs", status_code=status.HTTP_201_CREATED)
-async def create_club(club: ClubCreate, current_user: dict = Depends(get_current_user)):
+def create_club(club: ClubCreate, current_user: dict = Depends(get_current_user)):
     """Create a new club"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -679,7 +680,7 @@ async def create_club(club: ClubCreate, current_user: dict = Depends(get_current
         conn.close()
 
 @router.get("/api/clubs")
-async def get_clubs(
+def get_clubs(
     status_filter: Optional[str] = None,
     category_filter: Optional[str] = None,
     search: Optional[str] = None,
@@ -694,7 +695,7 @@ async def get_clubs(
     - role: Filter by specific role (tutor, student, parent, advertiser).
             When provided, uses the corresponding profile_id for filtering.
     """
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     # Try to get current user from token (optional)
@@ -815,9 +816,9 @@ async def get_clubs(
         conn.close()
 
 @router.get("/api/clubs/{club_id}")
-async def get_club(club_id: int):
+def get_club(club_id: int):
     """Get a specific club by ID"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -896,13 +897,13 @@ async def get_club(club_id: int):
         conn.close()
 
 @router.put("/api/clubs/{club_id}")
-async def update_club(
+def update_club(
     club_id: int,
     club_update: ClubUpdate,
     current_user: dict = Depends(get_current_user)
 ):
     """Update a club (only creator can update)"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -959,9 +960,9 @@ async def update_club(
         conn.close()
 
 @router.delete("/api/clubs/{club_id}")
-async def delete_club(club_id: int, current_user: dict = Depends(get_current_user)):
+def delete_club(club_id: int, current_user: dict = Depends(get_current_user)):
     """Delete a club (only creator can delete)"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -999,9 +1000,9 @@ async def delete_club(club_id: int, current_user: dict = Depends(get_current_use
         conn.close()
 
 @router.get("/api/clubs/my/created")
-async def get_my_clubs(current_user: dict = Depends(get_current_user)):
+def get_my_clubs(current_user: dict = Depends(get_current_user)):
     """Get clubs created by current user"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -1048,9 +1049,9 @@ async def get_my_clubs(current_user: dict = Depends(get_current_user)):
         conn.close()
 
 @router.get("/api/clubs/by-parent/{parent_id}")
-async def get_clubs_by_parent(parent_id: int):
+def get_clubs_by_parent(parent_id: int):
     """Get clubs created by a specific parent (by parent_profiles.id)"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -1129,9 +1130,9 @@ async def get_clubs_by_parent(parent_id: int):
 # ============================================
 
 @router.get("/api/student/{student_id}/clubs")
-async def get_student_clubs(student_id: int, current_user: dict = Depends(get_current_user)):
+def get_student_clubs(student_id: int, current_user: dict = Depends(get_current_user)):
     """Get all clubs created by or joined by a specific student"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -1207,9 +1208,9 @@ async def get_student_clubs(student_id: int, current_user: dict = Depends(get_cu
 
 
 @router.get("/api/student/{student_id}/events")
-async def get_student_events(student_id: int, current_user: dict = Depends(get_current_user)):
+def get_student_events(student_id: int, current_user: dict = Depends(get_current_user)):
     """Get all events created by or registered by a specific student"""
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
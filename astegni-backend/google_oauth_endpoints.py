@@ -257,7 +257,7 @@ def format_user_response(user: User, role_ids: dict) -> dict:
 # ============================================
 
 @router.post("/google", response_model=GoogleAuthResponse)
-async def google_oauth_login(
+def google_oauth_login(
     auth_request: GoogleAuthRequest,
     db: Session = Depends(get_db)
 ):
@@ -0,0 +1,508 @@
+"""
+Job Alert Matcher
+Percolator-style matching of job posts against every active job alert
+
+Instead of running each alert as a query over the job posts, the alerts are
+indexed and each published/updated post is run against them ("percolated").
+An alert matches when every criterion it sets matches:
+
+    keywords          any keyword (phrase) in title, description, requirements or skills
+    job_categories    any category of the post (job_post_categories)
+    locations         any location equal to the post's location or one of its comma-separated parts
+    job_type / location_type / experience_level    equal
+    min_salary / max_salary    band overlaps the post's salary range
+
+Each alert is posted in an inverted index under the values of ONE criterion -
+the most selective it sets, in the order above - so a post only looks up its
+own keys (its words, categories, location parts, type, level) and verifies the
+alerts found there:
+
+    ('kw', longest word of each keyword)      ('cat', category id)
+    ('loc', location)   ('exp', level)   ('type', job type)   ('ltype', location type)
+    salary-only alerts: sorted by min_salary (bisect)
+    alerts without criteria: match everything
+
+Matching cost grows with the number of alerts sharing a key with the post -
+roughly the number that match - not with the total number of alerts.
+
+percolate_job() is called by job_board_endpoints.py (background task) when a
+post is published or an active post is updated: it bulk-inserts
+job_alert_matches (new pairs only) and queues one email per 'immediate' alert
+through JobEmailService. 'daily' / 'weekly' alerts keep their matches
+unnotified until send_alert_digests() sends them as one digest per alert.
+
+Freshness:
+- invalidate_job_alert_index() after this worker creates/updates/deletes an
+  alert - the next percolation reloads
+- job_alert_index_refresh_loop() (app.py lifespan) reloads every
+  JOB_ALERT_INDEX_REFRESH_SECONDS and rebuilds only if the alerts changed
+
+Usage:
+    python job_alert_matcher.py                    # print index stats
+    python job_alert_matcher.py --digest daily     # send daily digests (cron)
+    python job_alert_matcher.py --digest weekly
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import re
+import sys
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from config import DATABASE_URL
+from db_pool import pooled_connect
+
+load_dotenv()
+
+JOB_ALERT_INDEX_REFRESH_SECONDS = int(os.getenv("JOB_ALERT_INDEX_REFRESH_SECONDS", 60))
+
+_WORD = re.compile(r"\w+")
+
+# Alert row: (id, user_id, keywords, job_categories, job_type, location_type, locations,
+#             min_salary, max_salary, experience_level, notification_frequency, notify_via_email)
+
+
+def words(value: Optional[str]) -> List[str]:
+    """Lowercase words of a text"""
+    return _WORD.findall(value.lower()) if value else []
+
+
+def _normalize(value: Optional[str]) -> Optional[str]:
+    value = " ".join(words(value))
+    return value or None
+
+
+def location_keys(location: Optional[str]) -> Set[str]:
+    """'Bole, Addis Ababa' -> {'bole addis ababa', 'bole', 'addis ababa'}"""
+    if not location:
+        return set()
+    keys = {_normalize(part) for part in location.split(",")}
+    keys.add(_normalize(location))
+    keys.discard(None)
+    return keys
+
+
+def load_active_alerts() -> List[tuple]:
+    """Active alert rows, in a stable order"""
+    conn = pooled_connect(DATABASE_URL)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT id, user_id, keywords, job_categories, job_type, location_type, locations,
+                   min_salary, max_salary, experience_level, notification_frequency, notify_via_email
+            FROM job_alerts
+            WHERE is_active = TRUE
+            ORDER BY id
+        """)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# ============================================
+# INDEX
+# ============================================
+
+class _Alert:
+    """An alert row with its criteria normalized for matching"""
+    __slots__ = ("id", "user_id", "keywords", "categories", "job_type", "location_type",
+                 "locations", "min_salary", "max_salary", "experience_level",
+                 "frequency", "notify_via_email")
+
+    def __init__(self, row: tuple):
+        (self.id, self.user_id, keywords, categories, job_type, location_type, locations,
+         self.min_salary, self.max_salary, experience_level, frequency, notify_via_email) = row
+        # Keywords as word tuples, matched as phrases
+        self.keywords = [tuple(words(keyword)) for keyword in keywords or [] if words(keyword)]
+        self.categories = set(categories or [])
+        self.job_type = _normalize(job_type)
+        self.location_type = _normalize(location_type)
+        self.locations = {_normalize(location) for location in locations or []} - {None}
+        self.experience_level = _normalize(experience_level)
+        self.frequency = frequency or 'immediate'
+        self.notify_via_email = notify_via_email is not False
+
+    def postings(self) -> Optional[List[tuple]]:
+        """Index keys of the most selective criterion (None: salary band or nothing)"""
+        if self.keywords:
+            return [('kw', max(keyword, key=len)) for keyword in self.keywords]
+        if self.categories:
+            return [('cat', category) for category in self.categories]
+        if self.locations:
+            return [('loc', location) for location in self.locations]
+        if self.experience_level:
+            return [('exp', self.experience_level)]
+        if self.job_type:
+            return [('type', self.job_type)]
+        if self.location_type:
+            return [('ltype', self.location_type)]
+        return None
+
+
+class _Post:
+    """A job post's fields prepared once per percolation"""
+
+    def __init__(self, job: dict):
+        skills = job.get('skills') or []
+        if isinstance(skills, str):
+            skills = json.loads(skills)
+        text_words = []
+        for field in ('title', 'description', 'requirements'):
+            text_words += words(job.get(field))
+            text_words.append("|")  # no phrase across fields
+        for skill in skills:
+            text_words += words(skill)
+            text_words.append("|")
+        self.words = set(text_words)
+        self.text = " " + " ".join(text_words) + " "
+        self.categories = set(job.get('category_ids') or [])
+        self.locations = location_keys(job.get('location'))
+        self.job_type = _normalize(job.get('job_type'))
+        self.location_type = _normalize(job.get('location_type'))
+        self.experience_level = _normalize(job.get('experience_level'))
+        salary_min, salary_max = job.get('salary_min'), job.get('salary_max')
+        self.salary_min = salary_min if salary_min is not None else salary_max
+        self.salary_max = salary_max if salary_max is not None else salary_min
+
+    def keys(self) -> Iterable[tuple]:
+        for word in self.words:
+            yield ('kw', word)
+        for category in self.categories:
+            yield ('cat', category)
+        for location in self.locations:
+            yield ('loc', location)
+        if self.experience_level:
+            yield ('exp', self.experience_level)
+        if self.job_type:
+            yield ('type', self.job_type)
+        if self.location_type:
+            yield ('ltype', self.location_type)
+
+
+def match_alert(alert: _Alert, post: _Post) -> Optional[dict]:
+    """Reasons the post matches every criterion of the alert, or None"""
+    reasons = {}
+    if alert.keywords:
+        matched = [" ".join(keyword) for keyword in alert.keywords if f" {' '.join(keyword)} " in post.text]
+        if not matched:
+            return None
+        reasons["keywords"] = matched
+    if alert.categories:
+        matched = sorted(alert.categories & post.categories)
+        if not matched:
+            return None
+        reasons["job_categories"] = matched
+    if alert.locations:
+        matched = sorted(alert.locations & post.locations)
+        if not matched:
+            return None
+        reasons["locations"] = matched
+    for field in ('job_type', 'location_type', 'experience_level'):
+        wanted = getattr(alert, field)
+        if wanted:
+            if wanted != getattr(post, field):
+                return None
+            reasons[field] = wanted
+    if alert.min_salary is not None or alert.max_salary is not None:
+        if post.salary_min is None:
+            return None
+        if alert.min_salary is not None and post.salary_max < alert.min_salary:
+            return None
+        if alert.max_salary is not None and post.salary_min > alert.max_salary:
+            return None
+        reasons["salary"] = [post.salary_min, post.salary_max]
+    return reasons
+
+
+class JobAlertIndex:
+    """Immutable once built - a rebuild swaps in a new instance"""
+
+    def __init__(self, alerts: List[tuple]):
+        self.alerts = alerts
+        self.by_id: Dict[int, _Alert] = {}
+        self.postings: Dict[tuple, List[int]] = defaultdict(list)
+        salary_only: List[Tuple[int, int]] = []
+        self.match_all: List[int] = []
+
+        for row in alerts:
+            alert = _Alert(row)
+            self.by_id[alert.id] = alert
+            keys = alert.postings()
+            if keys is not None:
+                for key in set(keys):
+                    self.postings[key].append(alert.id)
+            elif alert.min_salary is not None or alert.max_salary is not None:
+                salary_only.append((alert.min_salary or 0, alert.id))
+            else:
+                self.match_all.append(alert.id)
+
+        self.postings = dict(self.postings)
+        salary_only.sort()
+        self.salary_floors = [floor for floor, _ in salary_only]
+        self.salary_alerts = [alert_id for _, alert_id in salary_only]
+
+    def candidates(self, post: _Post) -> Set[int]:
+        """Alerts sharing an index key with the post (a superset of the matches)"""
+        found = set(self.match_all)
+        for key in post.keys():
+            found.update(self.postings.get(key, ()))
+        if post.salary_max is not None:
+            # Salary-only alerts asking at most the post's maximum
+            found.update(self.salary_alerts[:bisect.bisect_right(self.salary_floors, post.salary_max)])
+        return found
+
+    def percolate(self, job: dict) -> List[dict]:
+        """Alerts the job post matches, with score and reasons"""
+        post = _Post(job)
+        matches = []
+        for alert_id in sorted(self.candidates(post)):
+            alert = self.by_id[alert_id]
+            reasons = match_alert(alert, post)
+            if reasons is None:
+                continue
+            score = 100.0
+            if alert.keywords:
+                score = round(100.0 * len(reasons["keywords"]) / len(alert.keywords), 2)
+            matches.append({
+                "alert_id": alert.id,
+                "user_id": alert.user_id,
+                "match_score": score,
+                "match_reasons": reasons,
+                "notification_frequency": alert.frequency,
+                "notify_via_email": alert.notify_via_email
+            })
+        return matches
+
+    def stats(self) -> dict:
+        sizes = [len(ids) for ids in self.postings.values()]
+        return {
+            "alerts": len(self.alerts),
+            "index_keys": len(self.postings),
+            "postings": sum(sizes),
+            "largest_posting": max(sizes, default=0),
+            "salary_only_alerts": len(self.salary_alerts),
+            "match_all_alerts": len(self.match_all),
+        }
+
+
+# ============================================
+# LIFECYCLE
+# ============================================
+
+_index: Optional[JobAlertIndex] = None
+_stale = False
+_refresh_lock = threading.Lock()
+
+
+def refresh_job_alert_index() -> bool:
+    """Reload active alerts; rebuild the index only if they changed. Returns True if rebuilt."""
+    global _index, _stale
+    with _refresh_lock:
+        _stale = False
+        alerts = load_active_alerts()
+        if _index is not None and alerts == _index.alerts:
+            return False
+        _index = JobAlertIndex(alerts)
+        return True
+
+
+def get_job_alert_index() -> JobAlertIndex:
+    """Current index (built on first use, reloaded if a local change made it stale)"""
+    if _index is None:
+        refresh_job_alert_index()
+    elif _stale:
+        try:
+            refresh_job_alert_index()
+        except Exception as e:
+            print(f"⚠️ [JobAlertIndex] Reload after alert change failed: {e}")
+    return _index
+
+
+def invalidate_job_alert_index():
+    """Mark the index stale after a local alert change (the next percolation reloads it)"""
+    global _stale
+    _stale = True
+
+
+async def job_alert_index_refresh_loop():
+    """Background task started from app.py lifespan"""
+    while True:
+        try:
+            if await asyncio.to_thread(refresh_job_alert_index):
+                print(f"[JobAlertIndex] Rebuilt with {len(_index.alerts)} active alerts")
+        except Exception as e:
+            print(f"⚠️ [JobAlertIndex] Refresh failed: {e}")
+        await asyncio.sleep(JOB_ALERT_INDEX_REFRESH_SECONDS)
+
+
+# ============================================
+# MATCHES AND EMAILS
+# ============================================
+
+def _load_job(conn, job_id: int) -> Optional[dict]:
+    job = conn.execute(text("""
+        SELECT id, title, description, requirements, skills, job_type, location_type, location,
+               salary_min, salary_max, salary_visibility, experience_level, status,
+               COALESCE(ARRAY(SELECT category_id FROM job_post_categories WHERE job_id = job_posts.id), '{}')
+        FROM job_posts
+        WHERE id = :job_id
+    """), {"job_id": job_id}).fetchone()
+    if not job:
+        return None
+    return {
+        "id": job[0], "title": job[1], "description": job[2], "requirements": job[3],
+        "skills": job[4], "job_type": job[5], "location_type": job[6], "location": job[7],
+        "salary_min": job[8], "salary_max": job[9], "salary_visibility": job[10],
+        "experience_level": job[11], "status": job[12], "category_ids": list(job[13])
+    }
+
+
+def _email_job(job: dict) -> dict:
+    """Fields JobEmailService.send_job_alert_email() renders (salary only if public)"""
+    public_salary = job.get("salary_visibility", "public") == "public"
+    return {
+        "id": job["id"],
+        "title": job["title"],
+        "location": job["location"],
+        "job_type": job["job_type"],
+        "salary_min": job["salary_min"] if public_salary else None,
+        "salary_max": job["salary_max"] if public_salary else None
+    }
+
+
+def _mark_notified(conn, pairs: List[Tuple[int, int]]):
+    """Flag (alert_id, job_id) matches as sent and count them on their alerts"""
+    if not pairs:
+        return
+    alert_ids = [alert_id for alert_id, _ in pairs]
+    conn.execute(text("""
+        UPDATE job_alert_matches m
+        SET notified = TRUE, notified_at = CURRENT_TIMESTAMP
+        FROM unnest(CAST(:alert_ids AS integer[]), CAST(:job_ids AS integer[])) AS p(alert_id, job_id)
+        WHERE m.alert_id = p.alert_id AND m.job_id = p.job_id
+    """), {"alert_ids": alert_ids, "job_ids": [job_id for _, job_id in pairs]})
+    conn.execute(text("""
+        UPDATE job_alerts a
+        SET total_jobs_sent = a.total_jobs_sent + c.sent, last_notified_at = CURRENT_TIMESTAMP
+        FROM (SELECT alert_id, COUNT(*) AS sent FROM unnest(CAST(:alert_ids AS integer[])) AS alert_id
+              GROUP BY alert_id) c
+        WHERE a.id = c.alert_id
+    """), {"alert_ids": alert_ids})
+
+
+def percolate_job(job_id: int) -> dict:
+    """
+    Match an active job post against all alerts: bulk-insert the new matches and
+    queue emails for the 'immediate' ones. Pairs matched before are skipped, so
+    an update only notifies alerts the post newly matches.
+    """
+    # Imported here: models creates its tables on import
+    from models import engine
+    from job_email_service import JobEmailService
+
+    with engine.connect() as conn:
+        job = _load_job(conn, job_id)
+        if not job or job["status"] != 'active':
+            return {"job_id": job_id, "matched": 0, "new": 0, "emails_queued": 0}
+
+        matches = get_job_alert_index().percolate(job)
+        if not matches:
+            return {"job_id": job_id, "matched": 0, "new": 0, "emails_queued": 0}
+
+        inserted = conn.execute(text("""
+            INSERT INTO job_alert_matches (alert_id, job_id, match_score, match_reasons)
+            SELECT m.alert_id, :job_id, m.score, CAST(m.reasons AS jsonb)
+            FROM unnest(CAST(:alert_ids AS integer[]), CAST(:scores AS numeric[]), CAST(:reasons AS text[]))
+                 AS m(alert_id, score, reasons)
+            WHERE EXISTS (SELECT 1 FROM job_alerts a WHERE a.id = m.alert_id AND a.is_active)
+            ON CONFLICT (alert_id, job_id) DO NOTHING
+            RETURNING alert_id
+        """), {
+            "job_id": job_id,
+            "alert_ids": [match["alert_id"] for match in matches],
+            "scores": [match["match_score"] for match in matches],
+            "reasons": [json.dumps(match["match_reasons"]) for match in matches]
+        })
+        new_alert_ids = {row[0] for row in inserted.fetchall()}
+        conn.commit()
+
+        immediate = [
+            match for match in matches
+            if match["alert_id"] in new_alert_ids
+            and match["notification_frequency"] == 'immediate' and match["notify_via_email"]
+        ]
+        email_service = JobEmailService(conn)
+        sent = []
+        for match in immediate:
+            try:
+                if email_service.send_job_alert_email(match["user_id"], match["alert_id"], [_email_job(job)]):
+                    sent.append((match["alert_id"], job_id))
+            except Exception as e:
+                conn.rollback()
+                print(f"⚠️ [JobAlertMatcher] Queueing alert {match['alert_id']} email failed: {e}")
+        _mark_notified(conn, sent)
+        conn.commit()
+
+        return {"job_id": job_id, "matched": len(matches), "new": len(new_alert_ids), "emails_queued": len(sent)}
+
+
+def send_alert_digests(frequency: str) -> dict:
+    """One email per 'daily' or 'weekly' alert with all its unnotified matches on active posts"""
+    from models import engine
+    from job_email_service import JobEmailService
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT a.id, a.user_id, m.job_id
+            FROM job_alert_matches m
+            JOIN job_alerts a ON a.id = m.alert_id
+            JOIN job_posts j ON j.id = m.job_id
+            WHERE m.notified = FALSE
+              AND a.is_active AND a.notify_via_email AND a.notification_frequency = :frequency
+              AND j.status = 'active'
+            ORDER BY a.id, m.match_score DESC, m.created_at DESC
+        """), {"frequency": frequency}).fetchall()
+
+        jobs: Dict[int, dict] = {}
+        digests: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for alert_id, user_id, job_id in rows:
+            digests[(alert_id, user_id)].append(job_id)
+            if job_id not in jobs:
+                jobs[job_id] = _email_job(_load_job(conn, job_id))
+
+        email_service = JobEmailService(conn)
+        sent = []
+        for (alert_id, user_id), job_ids in digests.items():
+            try:
+                if email_service.send_job_alert_email(user_id, alert_id, [jobs[job_id] for job_id in job_ids]):
+                    sent += [(alert_id, job_id) for job_id in job_ids]
+            except Exception as e:
+                conn.rollback()
+                print(f"⚠️ [JobAlertMatcher] Queueing alert {alert_id} digest failed: {e}")
+        _mark_notified(conn, sent)
+        conn.commit()
+
+        return {"frequency": frequency, "alerts": len(digests), "jobs": len(sent)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Job alert index stats / digest emails")
+    parser.add_argument("--digest", choices=["daily", "weekly"], help="queue digest emails for this frequency")
+    args = parser.parse_args()
+
+    if args.digest:
+        print(send_alert_digests(args.digest))
+    else:
+        refresh_job_alert_index()
+        print(get_job_alert_index().stats())
@@ -13,6 +13,7 @@ import logging
 
 # Import database connections
 from models import engine
+from job_alert_matcher import invalidate_job_alert_index
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -75,7 +76,7 @@ class NotificationPreferencesUpdate(BaseModel):
 # ============================================
 
 @router.post("/api/jobs/alerts", status_code=status.HTTP_201_CREATED)
-async def create_job_alert(
+def create_job_alert(
     alert_data: JobAlertCreate,
     current_user = Depends(get_current_user)
 ):
@@ -116,6 +117,7 @@ async def create_job_alert(
 
         alert_id = result.fetchone()[0]
         conn.commit()
+        invalidate_job_alert_index()
 
         logger.info(f"Job alert created: ID {alert_id} for user {user_id}")
 
@@ -127,7 +129,7 @@ async def create_job_alert(
 
 
 @router.get("/api/jobs/alerts")
-async def get_user_job_alerts(
+def get_user_job_alerts(
     current_user = Depends(get_current_user)
 ):
     """Get all job alerts for current user"""
@@ -178,7 +180,7 @@ async def get_user_job_alerts(
 
 
 @router.put("/api/jobs/alerts/{alert_id}")
-async def update_job_alert(
+def update_job_alert(
     alert_id: int,
     alert_data: JobAlertUpdate,
     current_user = Depends(get_current_user)
@@ -215,6 +217,7 @@ async def update_job_alert(
 
         conn.execute(query, params)
         conn.commit()
+        invalidate_job_alert_index()
 
         logger.info(f"Job alert updated: ID {alert_id}")
 
@@ -222,7 +225,7 @@ async def update_job_alert(
 
 
 @router.delete("/api/jobs/alerts/{alert_id}")
-async def delete_job_alert(
+def delete_job_alert(
     alert_id: int,
     current_user = Depends(get_current_user)
 ):
@@ -241,6 +244,7 @@ async def delete_job_alert(
 
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Job alert not found")
+        invalidate_job_alert_index()
 
         logger.info(f"Job alert deleted: ID {alert_id}")
 
@@ -252,7 +256,7 @@ async def delete_job_alert(
 # ============================================
 
 @router.get("/api/jobs/notifications")
-async def get_user_notifications(
+def get_user_notifications(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     unread_only: bool = False,
@@ -314,7 +318,7 @@ async def get_user_notifications(
 
 
 @router.put("/api/jobs/notifications/{notification_id}/read")
-async def mark_notification_read(
+def mark_notification_read(
     notification_id: int,
     current_user = Depends(get_current_user)
 ):
@@ -339,7 +343,7 @@ async def mark_notification_read(
 
 
 @router.put("/api/jobs/notifications/read-all")
-async def mark_all_notifications_read(
+def mark_all_notifications_read(
     current_user = Depends(get_current_user)
 ):
     """Mark all notifications as read for current user"""
@@ -363,7 +367,7 @@ async def mark_all_notifications_read(
 
 
 @router.get("/api/jobs/notifications/unread-count")
-async def get_unread_count(
+def get_unread_count(
     current_user = Depends(get_current_user)
 ):
     """Get count of unread notifications"""
@@ -386,7 +390,7 @@ async def get_unread_count(
 # ============================================
 
 @router.get("/api/jobs/notification-preferences")
-async def get_notification_preferences(
+def get_notification_preferences(
     current_user = Depends(get_current_user)
 ):
     """Get user's notification preferences"""
@@ -439,7 +443,7 @@ async def get_notification_preferences(
 
 
 @router.put("/api/jobs/notification-preferences")
-async def update_notification_preferences(
+def update_notification_preferences(
     prefs_data: NotificationPreferencesUpdate,
     current_user = Depends(get_current_user)
 ):
@@ -3,7 +3,7 @@ Job Board API Endpoints
 Comprehensive REST API for advertiser job posting system
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from datetime import datetime, date, timedelta
@@ -13,6 +13,7 @@ from sqlalchemy import text
 from utils import get_current_user
 from advertiser_auth_endpoints import resolve_advertiser
 from models import engine
+from job_alert_matcher import percolate_job
 
 router = APIRouter()
 
@@ -148,8 +149,9 @@ class JobApplicationResponse(BaseModel):
 # ============================================
 
 @router.post("/api/jobs/posts", status_code=status.HTTP_201_CREATED)
-async def create_job_post(
+def create_job_post(
     job_data: JobPostCreate,
+    background_tasks: BackgroundTasks,
     current_user = Depends(resolve_advertiser)
 ):
     """Create a new job posting"""
@@ -215,6 +217,8 @@ async def create_job_post(
                 {"job_id": job_id}
             )
             conn.commit()
+            # Match against job alerts after the response is sent
+            background_tasks.add_task(percolate_job, job_id)
 
         return {
             "id": job_id,
@@ -225,7 +229,7 @@ async def create_job_post(
 
 
 @router.get("/api/jobs/posts")
-async def get_job_posts(
+def get_job_posts(
     job_status: Optional[str] = Query(None, pattern="^(draft|active|paused|closed|all)$", alias="status"),
     page: int = Query(1, ge=1),
     limit: int = Query(15, ge=1, le=100),
@@ -310,7 +314,7 @@ async def get_job_posts(
 
 
 @router.get("/api/jobs/posts/{job_id}")
-async def get_job_post(
+def get_job_post(
     job_id: int,
     current_user = Depends(resolve_advertiser)
 ):
@@ -377,9 +381,10 @@ async def get_job_post(
 
 
 @router.put("/api/jobs/posts/{job_id}")
-async def update_job_post(
+def update_job_post(
     job_id: int,
     job_data: JobPostUpdate,
+    background_tasks: BackgroundTasks,
     current_user = Depends(resolve_advertiser)
 ):
     """Update a job post"""
@@ -472,11 +477,15 @@ async def update_job_post(
         conn.execute(text(query), params)
         conn.commit()
 
+        # Published or edited while active - alerts may match it now
+        if (job_data.status or job[1]) == 'active':
+            background_tasks.add_task(percolate_job, job_id)
+
         return {"message": "Job post updated successfully"}
 
 
 @router.delete("/api/jobs/posts/{job_id}")
-async def delete_job_post(
+def delete_job_post(
     job_id: int,
     current_user = Depends(resolve_advertiser)
 ):
@@ -513,9 +522,10 @@ async def delete_job_post(
 
 
 @router.put("/api/jobs/posts/{job_id}/status")
-async def update_job_status(
+def update_job_status(
     job_id: int,
     status_data: dict,
+    background_tasks: BackgroundTasks,
     current_user = Depends(resolve_advertiser)
 ):
     """Update job post status (close, repost, pause, etc.)"""
@@ -570,6 +580,9 @@ async def update_job_status(
         conn.execute(text(query), params)
         conn.commit()
 
+        if new_status == "active" and old_status != "active":
+            background_tasks.add_task(percolate_job, job_id)
+
         return {
             "message": f"Job status updated to {new_status}",
             "job_id": job_id,
@@ -583,7 +596,7 @@ async def update_job_status(
 # ============================================
 
 @router.get("/api/jobs/analytics/overview")
-async def get_job_analytics_overview(
+def get_job_analytics_overview(
     current_user = Depends(resolve_advertiser)
 ):
     """Get overall job posting analytics for the advertiser"""
@@ -660,7 +673,7 @@ async def get_job_analytics_overview(
 # ============================================
 
 @router.get("/api/jobs/applications")
-async def get_all_applications(
+def get_all_applications(
     job_id: Optional[int] = Query(None),
     application_status: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
@@ -744,7 +757,7 @@ async def get_all_applications(
 
 
 @router.get("/api/jobs/posts/{job_id}/applications")
-async def get_job_applications(
+def get_job_applications(
     job_id: int,
     application_status: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
@@ -838,7 +851,7 @@ class ApplicationStatusUpdate(BaseModel):
     rating: Optional[int] = None
 
 @router.put("/api/jobs/applications/{application_id}/status")
-async def update_application_status(
+def update_application_status(
     application_id: int,
     status_data: ApplicationStatusUpdate,
     current_user = Depends(resolve_advertiser)
@@ -4,6 +4,7 @@ Handles sending email notifications for job alerts, application updates, etc.
 """
 
 from email_service import EmailService
+import asyncio
 from sqlalchemy import text
 from datetime import datetime
 import logging
@@ -12,6 +13,9 @@ import uuid
 
 logger = logging.getLogger(__name__)
 
+# users has no full_name: first + father name (Ethiopian convention) or last name
+USER_NAME_SQL = "NULLIF(CONCAT_WS(' ', first_name, COALESCE(father_name, last_name)), '')"
+
 class JobEmailService:
     """Service for sending job-related email notifications"""
 
@@ -75,73 +79,23 @@ class JobEmailService:
         return email_id
 
     def process_email_queue(self, batch_size: int = 50):
-        """Process pending emails in queue"""
+        """
+        Send pending emails in queue until none are due (email_queue_worker.py runs this continuously).
+        Runs its own event loop (asyncio.run) - from async code, await process_email_queue_async instead.
+        """
+        return asyncio.run(self.process_email_queue_async(batch_size))
 
-        # Get pending emails
-        query = text("""
-            SELECT id, recipient_email, recipient_name, subject, body_html, body_text, tracking_id
-            FROM email_queue
-            WHERE status = 'pending'
-            AND attempts < max_attempts
-            AND (scheduled_for IS NULL OR scheduled_for <= CURRENT_TIMESTAMP)
-            ORDER BY priority ASC, created_at ASC
-            LIMIT :batch_size
-        """)
+    async def process_email_queue_async(self, batch_size: int = 50):
+        """process_email_queue for callers already on an event loop"""
+        from email_queue_worker import from_header_for, run_worker, smtp_pool_for
+
+        report = await run_worker(
+            smtp_pool_for(self.email_service), from_header_for(self.email_service), batch_size, once=True
+        )
+
+        logger.info(f"Email queue processed: {report}")
 
-        result = self.db.execute(query, {"batch_size": batch_size})
-        emails = result.fetchall()
-
-        sent_count = 0
-        failed_count = 0
-
-        for email in emails:
-            email_id, recipient_email, recipient_name, subject, body_html, body_text, tracking_id = email
-
-            try:
-                # Update status to sending
-                self.db.execute(
-                    text("UPDATE email_queue SET status = 'sending', attempts = attempts + 1 WHERE id = :id"),
-                    {"id": email_id}
-                )
-                self.db.commit()
-
-                # Send email (using existing email_service.py)
-                success = self.email_service.send_email(
-                    to_email=recipient_email,
-                    subject=subject,
-                    body=body_html,
-                    is_html=True
-                )
-
-                if success:
-                    # Mark as sent
-                    self.db.execute(
-                        text("UPDATE email_queue SET status = 'sent', sent_at = CURRENT_TIMESTAMP WHERE id = :id"),
-                        {"id": email_id}
-                    )
-                    sent_count += 1
-                else:
-                    # Mark as failed
-                    self.db.execute(
-                        text("UPDATE email_queue SET status = 'failed', failed_at = CURRENT_TIMESTAMP, error_message = 'Email service returned failure' WHERE id = :id"),
-                        {"id": email_id}
-                    )
-                    failed_count += 1
-
-                self.db.commit()
-
-            except Exception as e:
-                logger.error(f"Failed to send email {email_id}: {str(e)}")
-                self.db.execute(
-                    text("UPDATE email_queue SET status = 'failed', failed_at = CURRENT_TIMESTAMP, error_message = :error WHERE id = :id"),
-                    {"id": email_id, "error": str(e)}
-                )
-                self.db.commit()
-                failed_count += 1
-
-        logger.info(f"Email queue processed: {sent_count} sent, {failed_count} failed")
-
-        return {"sent": sent_count, "failed": failed_count}
+        return {"sent": report["sent"], "failed": report["failed"] + report["bounced"]}
 
     # ============================================
     # JOB ALERT EMAILS
@@ -151,7 +105,7 @@ class JobEmailService:
         """Send job alert notification email"""
 
         # Get user details
-        user_query = text("SELECT email, full_name FROM users WHERE id = :user_id")
+        user_query = text(f"SELECT email, {USER_NAME_SQL} FROM users WHERE id = :user_id")
         user = self.db.execute(user_query, {"user_id": user_id}).fetchone()
 
         if not user or not user[0]:
@@ -163,7 +117,7 @@ class JobEmailService:
         # Get alert details
         alert_query = text("SELECT alert_name FROM job_alerts WHERE id = :alert_id")
         alert = self.db.execute(alert_query, {"alert_id": alert_id}).fetchone()
-        alert_name = alert[0] if alert else "Your Job Alert"
+        alert_name = alert[0] if alert and alert[0] else "Your Job Alert"
 
         # Build email HTML
         subject = f"🔔 {len(matching_jobs)} New Job{'s' if len(matching_jobs) > 1 else ''} Match Your Alert: {alert_name}"
@@ -230,8 +184,8 @@ class JobEmailService:
         """Send email to advertiser when new application received"""
 
         # Get advertiser details
-        user_query = text("""
-            SELECT u.email, u.full_name
+        user_query = text(f"""
+            SELECT u.email, {USER_NAME_SQL}
             FROM users u
             WHERE u.id = :advertiser_id
         """)
@@ -289,7 +243,7 @@ class JobEmailService:
         """Send email to applicant when application status changes"""
 
         # Get applicant details
-        user_query = text("SELECT email, full_name FROM users WHERE id = :applicant_id")
+        user_query = text(f"SELECT email, {USER_NAME_SQL} FROM users WHERE id = :applicant_id")
         user = self.db.execute(user_query, {"applicant_id": applicant_id}).fetchone()
 
         if not user or not user[0]:
@@ -383,7 +337,7 @@ class JobEmailService:
         """Send deadline reminder to advertiser"""
 
         # Get advertiser details
-        user_query = text("SELECT email, full_name FROM users WHERE id = :advertiser_id")
+        user_query = text(f"SELECT email, {USER_NAME_SQL} FROM users WHERE id = :advertiser_id")
         user = self.db.execute(user_query, {"advertiser_id": advertiser_id}).fetchone()
 
         if not user or not user[0]:
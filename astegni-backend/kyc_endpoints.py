@@ -8,6 +8,9 @@ This module provides endpoints for:
 3. Capturing live selfie with liveliness detection
 4. Face comparison between document and selfie
 5. Getting verification status
+6. Background selfie jobs (POST /selfie-jobs, then poll GET /selfie-jobs/{job_id})
+
+Face detection and matching run on the KYC process pool (kyc_pipeline.py).
 
 Liveliness checks include:
 - Blink detection
@@ -15,7 +18,7 @@ Liveliness checks include:
 - Head turn detection (left/right)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Request
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import Optional, List
@@ -29,6 +32,7 @@ from models import (
 )
 from advertiser_models import AdvertiserProfile, AdvertiserSessionLocal
 from utils import get_current_user
+from kyc_pipeline import pipeline as kyc_pipeline
 
 def _nonempty(v) -> bool:
     return bool(v) and str(v).strip() != ''
@@ -142,6 +146,8 @@ router = APIRouter(prefix="/api/kyc", tags=["KYC Verification"])
 # Why: lets a user retry without contacting support after a cool-down.
 KYC_MAX_ATTEMPTS = 5
 KYC_RESET_HOURS = 3
+# A selfie job still 'processing' after this long was lost (worker restart) and is reported as an error
+KYC_JOB_TIMEOUT_MINUTES = 10
 
 
 def _reset_attempts_if_window_expired(verification, db: Session) -> bool:
@@ -231,48 +237,8 @@ def get_db():
         db.close()
 
 
-def _auto_orient_pil(image_data: bytes):
-    """
-    Open image bytes as a PIL RGB image and auto-rotate it to upright orientation.
-    Tries EXIF orientation tag first, then brute-forces all 4 rotations using
-    face_recognition HOG to find which rotation contains a detectable face.
-    Returns (PIL.Image in RGB, rotation_applied_degrees).
-    """
-    from PIL import Image as PilImage
-    import io as _io
-
-    pil_img = PilImage.open(_io.BytesIO(image_data)).convert("RGB")
-
-    # --- EXIF auto-orient ---
-    try:
-        from PIL import ExifTags
-        exif = pil_img._getexif()
-        if exif:
-            orient_tag = next((t for t, n in ExifTags.TAGS.items() if n == "Orientation"), None)
-            if orient_tag and orient_tag in exif:
-                orientation = exif[orient_tag]
-                rotation_map = {3: 180, 6: 270, 8: 90}
-                if orientation in rotation_map:
-                    pil_img = pil_img.rotate(rotation_map[orientation], expand=True)
-                    return pil_img, rotation_map[orientation]
-    except Exception:
-        pass
-
-    # --- Brute-force rotation: find which rotation has a face ---
-    if FACE_RECOGNITION_AVAILABLE:
-        import numpy as _np
-        for deg in [0, 90, 180, 270]:
-            candidate = pil_img.rotate(deg, expand=True) if deg != 0 else pil_img
-            arr = _np.array(candidate)
-            locs = face_recognition.face_locations(arr, number_of_times_to_upsample=1, model="hog")
-            if locs:
-                return candidate, deg
-
-    return pil_img, 0
-
-
 def detect_face_in_image(image_data: bytes) -> dict:
-    """Detect face in image and return face location/landmarks"""
+    """Detect face in image and return face location (runs on the KYC pool, see kyc_pipeline.py)"""
     if not OPENCV_AVAILABLE:
         # Placeholder - assume face detected
         return {
@@ -283,82 +249,13 @@ def detect_face_in_image(image_data: bytes) -> dict:
         }
 
     try:
-        # Auto-orient the image before detection
-        pil_img, rotation = _auto_orient_pil(image_data)
-        img_rgb = np.array(pil_img)
-        img = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
-
-        if img is None:
-            return {"face_detected": False, "error": "Could not decode image"}
-
-        # Downscale oversized images (e.g. high-res phone photos) for cascade detection
-        img, _ = _normalize_frame_for_detection(img)
-
-        # Convert to grayscale for face detection
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-        # Load face cascade
-        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-
-        # Detect faces (relaxed parameters for better recall on real-world ID photos)
-        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.05, minNeighbors=3, minSize=(20, 20))
-
-        if len(faces) == 0:
-            return {"face_detected": False, "face_count": 0}
-
-        # Get the largest face
-        largest_face = max(faces, key=lambda f: f[2] * f[3])
-        x, y, w, h = largest_face
-
-        return {
-            "face_detected": True,
-            "face_count": len(faces),
-            "face_location": [int(x), int(y), int(x+w), int(y+h)],
-            "confidence": 0.9
-        }
+        return kyc_pipeline.detect_face(image_data)
     except Exception as e:
         return {"face_detected": False, "error": str(e)}
 
 
-def _get_face_encodings_robust(image_data: bytes, label: str = "image") -> list:
-    """
-    Extract face encodings from image bytes with full robustness:
-    - Auto-orient/rotate the image (handles landscape IDs captured in portrait mode)
-    - Falls back from HOG to CNN model when HOG finds no face
-    - Tries up to 2x upsampling for small/low-res images
-    Returns list of encodings (may be empty).
-    """
-    try:
-        pil_img, rotation = _auto_orient_pil(image_data)
-        arr = np.array(pil_img)
-        print(f"[KYC] {label}: size={pil_img.size}, rotation_applied={rotation}deg")
-
-        # 1. Try HOG (fast) with upsampling
-        for upsample in [1, 2]:
-            locs = face_recognition.face_locations(arr, number_of_times_to_upsample=upsample, model="hog")
-            if locs:
-                encs = face_recognition.face_encodings(arr, known_face_locations=locs, num_jitters=1)
-                if encs:
-                    print(f"[KYC] {label}: HOG found {len(locs)} face(s) at upsample={upsample}")
-                    return encs
-
-        # 2. Fall back to CNN (slower but handles difficult angles/lighting)
-        locs = face_recognition.face_locations(arr, number_of_times_to_upsample=0, model="cnn")
-        if locs:
-            encs = face_recognition.face_encodings(arr, known_face_locations=locs, num_jitters=1)
-            if encs:
-                print(f"[KYC] {label}: CNN found {len(locs)} face(s)")
-                return encs
-
-        print(f"[KYC] {label}: No face found with HOG or CNN")
-        return []
-    except Exception as e:
-        print(f"[KYC] {label}: encoding error: {e}")
-        return []
-
-
 def compare_faces(image1_data: bytes, image2_data: bytes) -> dict:
-    """Compare two face images and return similarity score"""
+    """Compare a document and a selfie image and return similarity score (see kyc_pipeline.py)"""
     if not FACE_RECOGNITION_AVAILABLE:
         # Placeholder - return simulated match with higher scores for testing
         import random
@@ -370,32 +267,7 @@ def compare_faces(image1_data: bytes, image2_data: bytes) -> dict:
         }
 
     try:
-        # Robust encoding: auto-orient + HOG→CNN fallback
-        encodings1 = _get_face_encodings_robust(image1_data, label="document")
-        encodings2 = _get_face_encodings_robust(image2_data, label="selfie")
-
-        if len(encodings1) == 0 or len(encodings2) == 0:
-            return {
-                "match": False,
-                "score": 0,
-                "error": "Face not found in one or both images"
-            }
-
-        # Compare faces
-        distance = face_recognition.face_distance([encodings1[0]], encodings2[0])[0]
-        similarity = 1 - distance  # Convert distance to similarity (0-1)
-
-        # face_recognition distance <= 0.6 means "same person" by the library's own standard.
-        # Converted to similarity: 1 - 0.6 = 0.40.
-        # We use 0.40 (the library default) because webcam selfies vs. ID document photos
-        # naturally score lower due to lighting, angle, resolution, and JPEG compression
-        # differences. Scores in the 0.40-0.45 range are still legitimate matches.
-        print(f"[KYC] Face comparison: distance={distance:.4f}, similarity={similarity:.4f}")
-        return {
-            "match": bool(similarity >= 0.40),
-            "score": float(similarity),
-            "method": "face_recognition"
-        }
+        return kyc_pipeline.compare_faces(image1_data, image2_data)
     except Exception as e:
         return {"match": False, "score": 0, "error": str(e)}
 
@@ -899,7 +771,7 @@ def save_image_to_storage(image_data: bytes, user_id: int, image_type: str) -> s
 # ============================================
 
 @router.post("/start", response_model=KYCStartResponse)
-async def start_kyc_verification(
+def start_kyc_verification(
     request: KYCStartRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -978,7 +850,7 @@ async def start_kyc_verification(
 
 
 @router.post("/upload-document")
-async def upload_document(
+def upload_document(
     verification_id: int = Form(...),
     image_data: str = Form(...),  # Base64 encoded
     document_type: str = Form("digital_id"),
@@ -1041,6 +913,8 @@ async def upload_document(
 
         # Save image
         image_url = save_image_to_storage(image_bytes, current_user.id, "document")
+        # Encode the document face now; the selfie comparison picks it up from the cache
+        kyc_pipeline.prefetch_document(image_bytes)
 
         # Update verification
         verification.document_image_url = image_url
@@ -1078,24 +952,18 @@ async def upload_document(
         raise HTTPException(status_code=500, detail=f"Error processing document: {str(e)}")
 
 
-@router.post("/upload-selfie")
-async def upload_selfie(
-    request: Request,
-    verification_id: int = Form(...),
-    image_data: str = Form(..., max_length=10 * 1024 * 1024),  # 10MB limit for base64 selfie
-    liveliness_frames: str = Form(None, max_length=50 * 1024 * 1024),  # 50MB limit for multiple frames
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def _load_selfie_verification(db: Session, verification_id: int, user_id: int,
+                              lock: bool = False) -> KYCVerification:
     """
-    Upload selfie with liveliness detection frames.
-    Performs face comparison with document photo.
+    The user's verification, checked to be ready for a selfie (raises HTTPException otherwise).
+    lock=True holds the row (FOR UPDATE) until the caller commits, so concurrent
+    requests see each other's queued selfie jobs.
     """
-    # Get verification
-    verification = db.query(KYCVerification).filter(
+    query = db.query(KYCVerification).filter(
         KYCVerification.id == verification_id,
-        KYCVerification.user_id == current_user.id
-    ).first()
+        KYCVerification.user_id == user_id
+    )
+    verification = (query.with_for_update() if lock else query).first()
 
     if not verification:
         raise HTTPException(status_code=404, detail="Verification not found")
@@ -1116,246 +984,435 @@ async def upload_selfie(
             detail=f"Maximum attempts exceeded. Try again in {int(hours_remaining)}h {int((hours_remaining % 1) * 60)}m."
         )
 
-    try:
-        print(f"[KYC DEBUG] /upload-selfie called")
-        print(f"  user_id         : {current_user.id}")
-        print(f"  verification_id : {verification_id}")
-        print(f"  image_data_len  : {len(image_data)} chars")
-        print(f"  liveliness_frames provided: {liveliness_frames is not None}")
-        print(f"  doc_verified    : {verification.document_verified}")
-        print(f"  blink_detected  : {verification.blink_detected}")
-        print(f"  smile_detected  : {verification.smile_detected}")
-        print(f"  head_turn_detected: {verification.head_turn_detected}")
-        print(f"  opencv_available: {OPENCV_AVAILABLE}")
-        print(f"  face_recognition_available: {FACE_RECOGNITION_AVAILABLE}")
+    # A queued selfie job is only counted once it finishes - one at a time
+    if _selfie_job_in_flight(db, verification.id):
+        raise HTTPException(
+            status_code=409,
+            detail="A selfie is already being verified. Please wait for its result."
+        )
 
-        # Decode base64 selfie
-        selfie_bytes = base64.b64decode(image_data.split(',')[1] if ',' in image_data else image_data)
+    return verification
 
-        # Decode liveliness frames if provided
-        frames = []
-        if liveliness_frames:
-            try:
-                frames_list = json.loads(liveliness_frames)
-                for frame in frames_list:
-                    frame_data = frame.split(',')[1] if ',' in frame else frame
-                    frames.append(base64.b64decode(frame_data))
-            except:
-                pass
 
-        # Detect face in selfie
-        face_result = detect_face_in_image(selfie_bytes)
+def _selfie_job_in_flight(db: Session, verification_id: int) -> bool:
+    """Whether a selfie job for this verification is still processing (lost jobs time out)"""
+    return db.query(KYCVerificationAttempt.id).filter(
+        KYCVerificationAttempt.verification_id == verification_id,
+        KYCVerificationAttempt.step == 'selfie_capture',
+        KYCVerificationAttempt.status == 'processing',
+        KYCVerificationAttempt.started_at > datetime.utcnow() - timedelta(minutes=KYC_JOB_TIMEOUT_MINUTES)
+    ).first() is not None
 
-        if not face_result.get("face_detected"):
-            attempt = KYCVerificationAttempt(
-                verification_id=verification.id,
-                user_id=current_user.id,
-                attempt_number=verification.attempt_count + 1,
-                step='selfie_capture',
-                image_type='selfie',
-                status='failed',
-                error_message="No face detected in selfie",
-                analysis_result=face_result
-            )
-            db.add(attempt)
-            verification.attempt_count += 1
-            verification.last_attempt_at = datetime.utcnow()
-            db.commit()
 
-            raise HTTPException(
-                status_code=400,
-                detail="No face detected in selfie. Please position your face clearly."
-            )
+def _new_selfie_attempt(verification: KYCVerification, user_id: int) -> KYCVerificationAttempt:
+    return KYCVerificationAttempt(
+        verification_id=verification.id,
+        user_id=user_id,
+        attempt_number=(verification.attempt_count or 0) + 1,
+        step='selfie_capture',
+        image_type='selfie',
+        status='processing',
+        started_at=datetime.utcnow()
+    )
 
-        # Save selfie
-        selfie_url = save_image_to_storage(selfie_bytes, current_user.id, "selfie")
-
-        # Compare faces - fetch document from Backblaze B2
-        document_bytes = None
-        doc_url = verification.document_image_url
-        print(f"[KYC] Fetching document for face comparison from: {doc_url}")
-
-        try:
-            from backblaze_service import get_backblaze_service
-            b2_service = get_backblaze_service()
-
-            # URL format: https://f000.backblazeb2.com/file/bucket-name/path/to/file.jpg
-            if '/file/' in doc_url:
-                # Strip domain and bucket name to get the file path
-                after_file = doc_url.split('/file/', 1)[1]   # "bucket-name/path/to/file.jpg"
-                file_path = after_file.split('/', 1)[1] if '/' in after_file else after_file
-                print(f"[KYC] Downloading document from B2 path: {file_path}")
-                document_bytes = b2_service.download_file(file_path)
-                if document_bytes:
-                    print(f"[KYC] Successfully downloaded document from B2 ({len(document_bytes)} bytes)")
-                else:
-                    print(f"[KYC] download_file returned None for path: {file_path}")
-            else:
-                print(f"[KYC] Document URL does not contain '/file/' — cannot extract B2 path: {doc_url}")
-        except Exception as e:
-            import traceback
-            print(f"[KYC] Error downloading document from B2: {e}\n{traceback.format_exc()}")
 
-        # Perform face comparison - document bytes are required
-        if not document_bytes:
-            raise HTTPException(
-                status_code=500,
-                detail="Could not retrieve document image from storage for face comparison. Please try again."
-            )
+def _selfie_result(verification: KYCVerification) -> dict:
+    return {
+        "success": verification.status == 'passed',
+        "status": verification.status,
+        "face_match_passed": bool(verification.face_match_passed),
+        "face_match_score": float(verification.face_match_score) if verification.face_match_score is not None else 0.0,
+        "liveliness_passed": bool(verification.liveliness_passed),
+        "liveliness_score": float(verification.liveliness_score) if verification.liveliness_score is not None else 0.0,
+        "blink_detected": bool(verification.blink_detected),
+        "smile_detected": bool(verification.smile_detected),
+        "head_turn_detected": bool(verification.head_turn_detected),
+        "rejection_reason": verification.rejection_reason,
+        "attempts_remaining": KYC_MAX_ATTEMPTS - (verification.attempt_count or 0)
+    }
 
-        comparison_result = compare_faces(document_bytes, selfie_bytes)
-        print(f"[KYC] Face comparison result: {comparison_result}")
 
-        # Check liveliness from already-completed challenges
-        # The challenges are verified in real-time via /verify-liveliness endpoint
-        # Here we just check if all required challenges were passed
-        challenges_passed = (
-            verification.blink_detected and
-            verification.smile_detected and
-            verification.head_turn_detected
-        )
+def _process_selfie(
+    db: Session,
+    verification: KYCVerification,
+    user_id: int,
+    selfie_bytes: bytes,
+    attempt: KYCVerificationAttempt
+) -> dict:
+    """
+    Face detection, storage, face comparison and the final verification status
+    for one selfie. Records the outcome on `attempt` and returns the selfie
+    result; raises HTTPException when the selfie cannot be checked.
+    """
+    analysis = _analyze_selfie(verification.document_image_url, user_id, selfie_bytes)
+    return _record_selfie(db, verification, user_id, attempt, analysis)
 
-        # Calculate liveliness score based on challenges passed
-        challenges_completed = sum([
-            verification.blink_detected,
-            verification.smile_detected,
-            verification.head_turn_detected
-        ])
-        liveliness_score = challenges_completed / 3.0
 
-        # Update verification
-        verification.selfie_image_url = selfie_url
-        verification.face_match_score = comparison_result.get("score", 0)
-        verification.face_match_passed = comparison_result.get("match", False)
-        verification.liveliness_passed = challenges_passed
-        verification.liveliness_score = liveliness_score
-        verification.last_attempt_at = datetime.utcnow()
+def _analyze_selfie(document_url: str, user_id: int, selfie_bytes: bytes) -> dict:
+    """
+    The slow part of a selfie check, with no database access: face detection,
+    storage and comparison with the document photo. A selfie without a face is
+    returned unsaved; raises HTTPException if the document can't be fetched.
+    """
+    started = datetime.utcnow()
+    timings = {}
 
-        # Determine overall status
-        if verification.face_match_passed and verification.liveliness_passed:
-            # Biometrics passed. Only flip is_verified if the identity profile is
-            # also complete (names per naming_system + DOB + email + gender).
-            user = db.query(User).filter(User.id == current_user.id).first()
-            identity_ok, missing = identity_profile_complete(user) if user else (False, ['profile'])
-
-            if not identity_ok:
-                # Hold verification: biometrics are fine but profile is incomplete.
-                verification.status = 'pending_profile'
-                verification.rejection_reason = (
-                    "Identity check passed, but complete your profile to finish "
-                    "verification: " + ", ".join(missing) + "."
-                )
-                db.commit()
-            else:
-                verification.status = 'passed'
-                verification.verified_at = datetime.utcnow()
-
-                # NEW: Set is_verified as the canonical verification field
-                user.is_verified = True
-                user.verified_at = datetime.utcnow()
-                user.verification_method = 'kyc'
-
-                user.verification_status = 'verified'
-
-                # DEPRECATED: Keep kyc_verified for backward compatibility
-                user.kyc_verified = True
-                user.kyc_verified_at = datetime.utcnow()
-                user.kyc_verification_id = verification.id
-
-                db.commit()
-                db.refresh(user)
-                # Auto-verify all profiles (tutor, student, parent, advertiser)
-                verification_results = check_and_auto_verify_profiles(user, db)
-                print(f"[KYC] Auto-verification results: {verification_results}")
-        elif not verification.face_match_passed:
-            verification.status = 'failed'
-            verification.rejection_reason = "Face in selfie does not match document photo"
-        elif not verification.liveliness_passed:
-            verification.status = 'failed'
-            verification.rejection_reason = "Liveliness check failed. Please complete all challenges."
+    # Detect face in selfie
+    face_result = detect_face_in_image(selfie_bytes)
+    timings["face_detection"] = face_result.get("timings")
+    analysis = {"started": started, "timings": timings, "face_result": face_result}
 
-        verification.attempt_count += 1
+    if not face_result.get("face_detected"):
+        return analysis
 
-        # Create attempt record
-        # DEBUG: Log all values and their types before creating analysis_result
-        print(f"[KYC DEBUG] Creating analysis_result for selfie upload:")
-        print(f"  face_result type: {type(face_result)}, value: {face_result}")
-        print(f"  comparison_result type: {type(comparison_result)}, value: {comparison_result}")
-        print(f"  blink_detected type: {type(verification.blink_detected)}, value: {verification.blink_detected}")
-        print(f"  smile_detected type: {type(verification.smile_detected)}, value: {verification.smile_detected}")
-        print(f"  head_turn_detected type: {type(verification.head_turn_detected)}, value: {verification.head_turn_detected}")
-        print(f"  liveliness_score type: {type(liveliness_score)}, value: {liveliness_score}")
-        print(f"  challenges_passed type: {type(challenges_passed)}, value: {challenges_passed}")
+    # Save selfie
+    selfie_url = save_image_to_storage(selfie_bytes, user_id, "selfie")
 
-        attempt = KYCVerificationAttempt(
-            verification_id=verification.id,
-            user_id=current_user.id,
-            attempt_number=verification.attempt_count,
-            step='selfie_capture',
-            image_url=selfie_url,
-            image_type='selfie',
-            status='passed' if verification.status == 'passed' else 'failed',
-            analysis_result={
-                "face_detection": face_result,
-                "face_comparison": comparison_result,
-                "liveliness": {
-                    "blink_detected": bool(verification.blink_detected),
-                    "smile_detected": bool(verification.smile_detected),
-                    "head_turn_detected": bool(verification.head_turn_detected),
-                    "liveliness_score": float(liveliness_score),
-                    "passed": bool(challenges_passed),
-                    "method": "challenge_verification"
-                }
-            },
-            completed_at=datetime.utcnow()
+    # Compare faces - fetch document from Backblaze B2
+    document_bytes = None
+    doc_url = document_url
+    print(f"[KYC] Fetching document for face comparison from: {doc_url}")
+
+    try:
+        from backblaze_service import get_backblaze_service
+        b2_service = get_backblaze_service()
+
+        # URL format: https://f000.backblazeb2.com/file/bucket-name/path/to/file.jpg
+        if '/file/' in doc_url:
+            # Strip domain and bucket name to get the file path
+            after_file = doc_url.split('/file/', 1)[1]   # "bucket-name/path/to/file.jpg"
+            file_path = after_file.split('/', 1)[1] if '/' in after_file else after_file
+            print(f"[KYC] Downloading document from B2 path: {file_path}")
+            document_bytes = b2_service.download_file(file_path)
+            if document_bytes:
+                print(f"[KYC] Successfully downloaded document from B2 ({len(document_bytes)} bytes)")
+            else:
+                print(f"[KYC] download_file returned None for path: {file_path}")
+        else:
+            print(f"[KYC] Document URL does not contain '/file/' — cannot extract B2 path: {doc_url}")
+    except Exception as e:
+        import traceback
+        print(f"[KYC] Error downloading document from B2: {e}\n{traceback.format_exc()}")
+
+    # Perform face comparison - document bytes are required
+    if not document_bytes:
+        raise HTTPException(
+            status_code=500,
+            detail="Could not retrieve document image from storage for face comparison. Please try again."
         )
-        print(f"[KYC DEBUG] Attempt object created, now adding to db...")
+
+    comparison_result = compare_faces(document_bytes, selfie_bytes)
+    timings["face_comparison"] = comparison_result.get("timings")
+    print(f"[KYC] Face comparison result: {comparison_result}")
+
+    analysis.update(selfie_url=selfie_url, comparison_result=comparison_result)
+    return analysis
+
+
+def _record_selfie(
+    db: Session,
+    verification: KYCVerification,
+    user_id: int,
+    attempt: KYCVerificationAttempt,
+    analysis: dict
+) -> dict:
+    """
+    Apply an _analyze_selfie result: liveliness, the final verification status
+    and the attempt record. Raises HTTPException(400) for a selfie without a face.
+    """
+    face_result = analysis["face_result"]
+    timings = analysis["timings"]
+
+    if not face_result.get("face_detected"):
+        attempt.attempt_number = (verification.attempt_count or 0) + 1
+        attempt.status = 'failed'
+        attempt.error_message = "No face detected in selfie"
+        attempt.analysis_result = face_result
+        attempt.completed_at = datetime.utcnow()
         db.add(attempt)
-        print(f"[KYC DEBUG] Now committing to database...")
-        try:
+        verification.attempt_count += 1
+        verification.last_attempt_at = datetime.utcnow()
+        db.commit()
+
+        raise HTTPException(
+            status_code=400,
+            detail="No face detected in selfie. Please position your face clearly."
+        )
+
+    selfie_url = analysis["selfie_url"]
+    comparison_result = analysis["comparison_result"]
+
+    # Check liveliness from already-completed challenges
+    # The challenges are verified in real-time via /verify-liveliness endpoint
+    # Here we just check if all required challenges were passed
+    challenges_passed = (
+        verification.blink_detected and
+        verification.smile_detected and
+        verification.head_turn_detected
+    )
+
+    # Calculate liveliness score based on challenges passed
+    challenges_completed = sum([
+        verification.blink_detected,
+        verification.smile_detected,
+        verification.head_turn_detected
+    ])
+    liveliness_score = challenges_completed / 3.0
+
+    # Update verification
+    verification.selfie_image_url = selfie_url
+    verification.face_match_score = comparison_result.get("score", 0)
+    verification.face_match_passed = comparison_result.get("match", False)
+    verification.liveliness_passed = challenges_passed
+    verification.liveliness_score = liveliness_score
+    verification.last_attempt_at = datetime.utcnow()
+
+    # Determine overall status
+    if verification.face_match_passed and verification.liveliness_passed:
+        # Biometrics passed. Only flip is_verified if the identity profile is
+        # also complete (names per naming_system + DOB + email + gender).
+        user = db.query(User).filter(User.id == user_id).first()
+        identity_ok, missing = identity_profile_complete(user) if user else (False, ['profile'])
+
+        if not identity_ok:
+            # Hold verification: biometrics are fine but profile is incomplete.
+            verification.status = 'pending_profile'
+            verification.rejection_reason = (
+                "Identity check passed, but complete your profile to finish "
+                "verification: " + ", ".join(missing) + "."
+            )
             db.commit()
-            print(f"[KYC DEBUG] Commit successful!")
-        except Exception as commit_error:
-            print(f"[KYC DEBUG ERROR] Commit failed!")
-            print(f"  Error type: {type(commit_error)}")
-            print(f"  Error message: {str(commit_error)}")
-            import traceback
-            print(f"  Traceback: {traceback.format_exc()}")
-            raise
-
-        print(f"[KYC DEBUG] /upload-selfie final result:")
-        print(f"  status              : {verification.status}")
-        print(f"  face_match_passed   : {verification.face_match_passed}")
-        print(f"  face_match_score    : {verification.face_match_score}")
-        print(f"  liveliness_passed   : {verification.liveliness_passed}")
-        print(f"  liveliness_score    : {verification.liveliness_score}")
-        print(f"  blink_detected      : {verification.blink_detected}")
-        print(f"  smile_detected      : {verification.smile_detected}")
-        print(f"  head_turn_detected  : {verification.head_turn_detected}")
-        print(f"  rejection_reason    : {verification.rejection_reason}")
+        else:
+            verification.status = 'passed'
+            verification.verified_at = datetime.utcnow()
 
-        return {
-            "success": verification.status == 'passed',
-            "status": verification.status,
-            "face_match_passed": bool(verification.face_match_passed),
-            "face_match_score": float(verification.face_match_score) if verification.face_match_score is not None else 0.0,
-            "liveliness_passed": bool(verification.liveliness_passed),
-            "liveliness_score": float(verification.liveliness_score) if verification.liveliness_score is not None else 0.0,
+            # NEW: Set is_verified as the canonical verification field
+            user.is_verified = True
+            user.verified_at = datetime.utcnow()
+            user.verification_method = 'kyc'
+
+            user.verification_status = 'verified'
+
+            # DEPRECATED: Keep kyc_verified for backward compatibility
+            user.kyc_verified = True
+            user.kyc_verified_at = datetime.utcnow()
+            user.kyc_verification_id = verification.id
+
+            db.commit()
+            db.refresh(user)
+            # Auto-verify all profiles (tutor, student, parent, advertiser)
+            verification_results = check_and_auto_verify_profiles(user, db)
+            print(f"[KYC] Auto-verification results: {verification_results}")
+    elif not verification.face_match_passed:
+        verification.status = 'failed'
+        verification.rejection_reason = "Face in selfie does not match document photo"
+    elif not verification.liveliness_passed:
+        verification.status = 'failed'
+        verification.rejection_reason = "Liveliness check failed. Please complete all challenges."
+
+    verification.attempt_count += 1
+
+    completed = datetime.utcnow()
+    attempt.attempt_number = verification.attempt_count
+    attempt.image_url = selfie_url
+    attempt.status = 'passed' if verification.status == 'passed' else 'failed'
+    attempt.analysis_result = {
+        "face_detection": face_result,
+        "face_comparison": comparison_result,
+        "liveliness": {
             "blink_detected": bool(verification.blink_detected),
             "smile_detected": bool(verification.smile_detected),
             "head_turn_detected": bool(verification.head_turn_detected),
-            "rejection_reason": verification.rejection_reason,
-            "attempts_remaining": KYC_MAX_ATTEMPTS - (verification.attempt_count or 0)
-        }
+            "liveliness_score": float(liveliness_score),
+            "passed": bool(challenges_passed),
+            "method": "challenge_verification"
+        },
+        "timings": timings
+    }
+    attempt.completed_at = completed
+    attempt.processing_time_ms = int((completed - analysis["started"]).total_seconds() * 1000)
+    db.add(attempt)
+    db.commit()
+
+    print(f"[KYC] Selfie processed in {attempt.processing_time_ms}ms: status={verification.status}, "
+          f"face_match_score={verification.face_match_score}, liveliness_score={verification.liveliness_score}, "
+          f"rejection_reason={verification.rejection_reason}")
+
+    return {**_selfie_result(verification), "timings": timings}
+
 
+@router.post("/upload-selfie")
+def upload_selfie(
+    request: Request,
+    verification_id: int = Form(...),
+    image_data: str = Form(..., max_length=10 * 1024 * 1024),  # 10MB limit for base64 selfie
+    liveliness_frames: str = Form(None, max_length=50 * 1024 * 1024),  # 50MB limit for multiple frames
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload selfie and compare it with the document photo, waiting for the result.
+    Liveliness comes from the /verify-liveliness challenges; liveliness_frames is accepted but unused.
+    POST /selfie-jobs does the same work in the background.
+    """
+    verification = _load_selfie_verification(db, verification_id, current_user.id)
+
+    try:
+        # Decode base64 selfie
+        selfie_bytes = base64.b64decode(image_data.split(',')[1] if ',' in image_data else image_data)
+        return _process_selfie(
+            db, verification, current_user.id, selfie_bytes,
+            _new_selfie_attempt(verification, current_user.id)
+        )
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing selfie: {str(e)}")
 
 
+def _run_selfie_job(job_id: int, selfie_bytes: bytes):
+    """
+    Background task for POST /selfie-jobs: process the selfie and record the outcome on the attempt.
+    The verification row is locked only to check it and to write the result, not
+    during face detection and the document download.
+    """
+    db = SessionLocal()
+    try:
+        attempt = db.query(KYCVerificationAttempt).filter(KYCVerificationAttempt.id == job_id).first()
+        if not attempt:
+            return
+
+        def locked_verification() -> Optional[KYCVerification]:
+            return db.query(KYCVerification).filter(
+                KYCVerification.id == attempt.verification_id
+            ).with_for_update().populate_existing().first()
+
+        def blocked(verification: KYCVerification) -> Optional[str]:
+            # Another selfie may have passed or used up the attempts since queuing
+            if verification.status == 'passed':
+                return "Verification already completed"
+            if (verification.attempt_count or 0) >= KYC_MAX_ATTEMPTS:
+                return "Maximum attempts exceeded"
+            return None
+
+        verification = locked_verification()
+        if not verification:
+            return
+        error_message = blocked(verification)
+        document_url = verification.document_image_url
+        db.commit()  # Release the lock while the selfie is analyzed
+
+        if error_message is None:
+            try:
+                analysis = _analyze_selfie(document_url, attempt.user_id, selfie_bytes)
+                verification = locked_verification()
+                error_message = blocked(verification)
+                if error_message is None:
+                    _record_selfie(db, verification, attempt.user_id, attempt, analysis)
+                    return
+            except HTTPException as e:
+                error_message = e.detail
+            except Exception as e:
+                error_message = f"Error processing selfie: {str(e)}"
+
+        # The no-face path records its own failed attempt; anything else leaves the
+        # attempt uncounted, like a failed /upload-selfie request
+        db.rollback()
+        if attempt.status == 'processing':
+            attempt.status = 'error'
+            attempt.error_message = error_message
+            attempt.completed_at = datetime.utcnow()
+            db.commit()
+    except Exception as e:
+        print(f"[KYC] Selfie job {job_id} failed: {e}")
+    finally:
+        db.close()
+
+
+@router.post("/selfie-jobs", status_code=202)
+def create_selfie_job(
+    background_tasks: BackgroundTasks,
+    verification_id: int = Form(...),
+    image_data: str = Form(..., max_length=10 * 1024 * 1024),  # 10MB limit for base64 selfie
+    liveliness_frames: str = Form(None, max_length=50 * 1024 * 1024),  # accepted for parity with /upload-selfie
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue selfie processing and return immediately.
+    Poll GET /selfie-jobs/{job_id} for the result (same fields as /upload-selfie).
+    Only one job per verification runs at a time (409 while one is processing).
+    """
+    verification = _load_selfie_verification(db, verification_id, current_user.id, lock=True)
+
+    try:
+        selfie_bytes = base64.b64decode(image_data.split(',')[1] if ',' in image_data else image_data)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid selfie image data")
+
+    attempt = _new_selfie_attempt(verification, current_user.id)
+    db.add(attempt)
+    db.commit()
+    db.refresh(attempt)
+
+    background_tasks.add_task(_run_selfie_job, attempt.id, selfie_bytes)
+    return {
+        "job_id": attempt.id,
+        "job_status": "processing",
+        "poll_url": f"/api/kyc/selfie-jobs/{attempt.id}"
+    }
+
+
+@router.get("/selfie-jobs/{job_id}")
+def get_selfie_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Selfie job state: processing, done (with the selfie result and stage timings),
+    failed (no face in the selfie) or error (could not be checked - try again).
+    """
+    attempt = db.query(KYCVerificationAttempt).filter(
+        KYCVerificationAttempt.id == job_id,
+        KYCVerificationAttempt.user_id == current_user.id,
+        KYCVerificationAttempt.step == 'selfie_capture'
+    ).first()
+    if not attempt:
+        raise HTTPException(status_code=404, detail="Selfie job not found")
+
+    if attempt.status == 'processing':
+        # The worker that owned the job restarted before finishing it
+        if attempt.started_at and datetime.utcnow() - attempt.started_at > timedelta(minutes=KYC_JOB_TIMEOUT_MINUTES):
+            attempt.status = 'error'
+            attempt.error_message = "Verification timed out. Please try again."
+            attempt.completed_at = datetime.utcnow()
+            db.commit()
+        else:
+            return {"job_id": attempt.id, "job_status": "processing"}
+
+    verification = db.query(KYCVerification).filter(KYCVerification.id == attempt.verification_id).first()
+    attempts_remaining = KYC_MAX_ATTEMPTS - (verification.attempt_count or 0)
+
+    if attempt.status == 'error' or attempt.error_message:
+        return {
+            "job_id": attempt.id,
+            "job_status": "error" if attempt.status == 'error' else "failed",
+            "detail": attempt.error_message,
+            "attempts_remaining": attempts_remaining
+        }
+
+    return {
+        "job_id": attempt.id,
+        "job_status": "done",
+        **_selfie_result(verification),
+        "processing_time_ms": attempt.processing_time_ms,
+        "timings": (attempt.analysis_result or {}).get("timings")
+    }
+
+
 @router.post("/verify-liveliness")
-async def verify_liveliness_challenge(
+def verify_liveliness_challenge(
     verification_id: int = Form(...),
     challenge_type: str = Form(...),  # blink, smile, turn
     frame_data: str = Form(...),      # Base64 encoded frame (used for blink/smile; first frame for turn)
@@ -1487,7 +1544,7 @@ async def verify_liveliness_challenge(
 
 
 @router.get("/status", response_model=KYCVerificationStatus)
-async def get_kyc_status(
+def get_kyc_status(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1524,7 +1581,7 @@ async def get_kyc_status(
 
 
 @router.post("/reset")
-async def reset_kyc_verification(
+def reset_kyc_verification(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1571,7 +1628,7 @@ async def reset_kyc_verification(
 
 
 @router.get("/check")
-async def check_kyc_required(
+def check_kyc_required(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -0,0 +1,430 @@
+"""
+KYC Pipeline
+Face detection and face matching for KYC on a dedicated process pool
+
+face_recognition (dlib HOG / CNN) can hold a core for seconds per image, so
+the document/selfie work runs in KYC_POOL_WORKERS worker processes instead of
+the request thread. Each image goes through the same stages:
+
+    normalize   decode, apply the EXIF orientation, downsize to KYC_MAX_IMAGE_DIM
+    orient      no EXIF orientation: find the 90-degree rotation with a HOG face
+                (its face locations are reused by detect)
+    detect      HOG at upsample 1 and 2, then CNN
+    encode      128-d face encodings
+
+Document encodings are cached by image SHA-1 (KYC_ENCODING_CACHE_SIZE entries),
+and a document is encoded in the background as soon as it is uploaded, so a
+selfie (or a retry) only pays for its own half of the comparison.
+
+    from kyc_pipeline import pipeline
+
+    face_result = pipeline.detect_face(image_bytes)       # blocks this thread, not the loop
+    comparison = pipeline.compare_faces(document_bytes, selfie_bytes)
+
+Every result carries its stage timings in ms; running totals are served at
+/api/health/kyc-pipeline. Workers are forked at startup (pipeline.start() in
+the app.py lifespan) so they inherit the loaded models; KYC_POOL_WORKERS=0 runs
+everything in the calling thread.
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+try:
+    import cv2
+    import numpy as np
+    OPENCV_AVAILABLE = True
+except ImportError:
+    OPENCV_AVAILABLE = False
+
+try:
+    import face_recognition
+    import numpy as np
+    FACE_RECOGNITION_AVAILABLE = True
+except ImportError:
+    FACE_RECOGNITION_AVAILABLE = False
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+KYC_POOL_WORKERS = int(os.getenv('KYC_POOL_WORKERS', min(2, os.cpu_count() or 1)))
+KYC_MAX_IMAGE_DIM = int(os.getenv('KYC_MAX_IMAGE_DIM', 1280))
+KYC_ENCODING_CACHE_SIZE = int(os.getenv('KYC_ENCODING_CACHE_SIZE', 256))
+KYC_TASK_TIMEOUT = float(os.getenv('KYC_TASK_TIMEOUT', 120))
+
+# face_recognition distance <= 0.6 means "same person" by the library's own standard.
+# Converted to similarity: 1 - 0.6 = 0.40.
+# We use 0.40 (the library default) because webcam selfies vs. ID document photos
+# naturally score lower due to lighting, angle, resolution, and JPEG compression
+# differences. Scores in the 0.40-0.45 range are still legitimate matches.
+FACE_MATCH_THRESHOLD = 0.40
+
+_EXIF_ORIENTATION = 0x0112
+_ROTATIONS = {90: 'ROTATE_90', 180: 'ROTATE_180', 270: 'ROTATE_270'}
+
+
+# ============================================
+# STAGES (run in the worker processes)
+# ============================================
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def normalize_image(image_data: bytes):
+    """
+    Decode once: EXIF-orient, convert to RGB and shrink so the longest side is at most KYC_MAX_IMAGE_DIM.
+    Returns (PIL image, exif_oriented) - exif_oriented means the rotation is already known.
+    """
+    img = Image.open(io.BytesIO(image_data))
+    orientation = img.getexif().get(_EXIF_ORIENTATION, 1)
+    if orientation != 1:
+        img = ImageOps.exif_transpose(img)
+    img = img.convert("RGB")
+    if max(img.size) > KYC_MAX_IMAGE_DIM:
+        img.thumbnail((KYC_MAX_IMAGE_DIM, KYC_MAX_IMAGE_DIM), Image.LANCZOS)
+    return img, orientation != 1
+
+
+def _orient(img, exif_oriented: bool):
+    """
+    Upright image as an RGB array, the rotation applied, and the HOG (upsample 1)
+    face locations found while searching (None if no search was needed).
+    """
+    if exif_oriented or not FACE_RECOGNITION_AVAILABLE:
+        return np.array(img), 0, None
+    for degrees in (0, 90, 180, 270):
+        candidate = img.transpose(getattr(Image, _ROTATIONS[degrees])) if degrees else img
+        arr = np.array(candidate)
+        locations = face_recognition.face_locations(arr, number_of_times_to_upsample=1, model="hog")
+        if locations:
+            return arr, degrees, locations
+    return np.array(img), 0, []
+
+
+def _cascade(name: str):
+    """Haar cascades are loaded once per process"""
+    classifier = _CASCADES.get(name)
+    if classifier is None:
+        classifier = _CASCADES[name] = cv2.CascadeClassifier(cv2.data.haarcascades + name)
+    return classifier
+
+
+_CASCADES = {}
+
+
+def detect_face(image_data: bytes) -> dict:
+    """Largest frontal face (OpenCV cascade) in the upright image"""
+    timings = {}
+    try:
+        start = time.perf_counter()
+        img, exif_oriented = normalize_image(image_data)
+        timings['normalize_ms'] = _elapsed_ms(start)
+
+        start = time.perf_counter()
+        arr, rotation, _ = _orient(img, exif_oriented)
+        timings['orient_ms'] = _elapsed_ms(start)
+
+        start = time.perf_counter()
+        bgr = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
+        # Downscale for the cascade (very large close-up faces are missed otherwise)
+        h, w = bgr.shape[:2]
+        if max(h, w) > 640:
+            scale = 640 / max(h, w)
+            bgr = cv2.resize(bgr, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+
+        # Relaxed parameters for better recall on real-world ID photos
+        faces = _cascade('haarcascade_frontalface_default.xml').detectMultiScale(
+            gray, scaleFactor=1.05, minNeighbors=3, minSize=(20, 20)
+        )
+        timings['detect_ms'] = _elapsed_ms(start)
+
+        if len(faces) == 0:
+            return {"face_detected": False, "face_count": 0, "rotation": rotation, "timings": timings}
+
+        x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+        return {
+            "face_detected": True,
+            "face_count": len(faces),
+            "face_location": [int(x), int(y), int(x + w), int(y + h)],
+            "confidence": 0.9,
+            "rotation": rotation,
+            "timings": timings
+        }
+    except Exception as e:
+        return {"face_detected": False, "error": str(e), "timings": timings}
+
+
+def encode_faces(image_data: bytes, label: str = "image") -> dict:
+    """
+    Face encodings of the upright image: HOG at upsample 1 and 2, then CNN
+    for difficult angles/lighting. `encodings` may be empty.
+    """
+    timings = {}
+    try:
+        start = time.perf_counter()
+        img, exif_oriented = normalize_image(image_data)
+        timings['normalize_ms'] = _elapsed_ms(start)
+
+        start = time.perf_counter()
+        arr, rotation, locations = _orient(img, exif_oriented)
+        timings['orient_ms'] = _elapsed_ms(start)
+
+        start = time.perf_counter()
+        method = "hog"
+        # The orientation search already ran HOG at upsample 1
+        for upsample in ([1, 2] if locations is None else [2]):
+            if locations:
+                break
+            locations = face_recognition.face_locations(arr, number_of_times_to_upsample=upsample, model="hog")
+        if not locations:
+            method = "cnn"
+            locations = face_recognition.face_locations(arr, number_of_times_to_upsample=0, model="cnn")
+        timings['detect_ms'] = _elapsed_ms(start)
+
+        encodings = []
+        if locations:
+            start = time.perf_counter()
+            encodings = face_recognition.face_encodings(arr, known_face_locations=locations, num_jitters=1)
+            timings['encode_ms'] = _elapsed_ms(start)
+
+        print(f"[KYC] {label}: size={img.size}, rotation={rotation}deg, "
+              f"{len(encodings)} face(s) via {method if encodings else 'none'}, timings={timings}")
+        return {"encodings": encodings, "rotation": rotation, "method": method, "timings": timings}
+    except Exception as e:
+        print(f"[KYC] {label}: encoding error: {e}")
+        return {"encodings": [], "error": str(e), "timings": timings}
+
+
+def _warm_worker():
+    """Pool initializer: load the cascade (face_recognition models load on import)"""
+    if OPENCV_AVAILABLE:
+        _cascade('haarcascade_frontalface_default.xml')
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+# ============================================
+# PIPELINE (request side)
+# ============================================
+
+class KYCPipeline:
+    """Process pool, document encoding cache and stage timing totals"""
+
+    def __init__(self, workers: int = KYC_POOL_WORKERS, cache_size: int = KYC_ENCODING_CACHE_SIZE):
+        self.workers = workers
+        self.cache_size = cache_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._encodings: 'OrderedDict[str, dict]' = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._stages: Dict[str, list] = {}
+        self.tasks = 0
+        self.failures = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ---------- pool ----------
+
+    def start(self):
+        """Fork the workers now (before the app opens its pools/threads) and warm them up"""
+        if not (OPENCV_AVAILABLE or FACE_RECOGNITION_AVAILABLE):
+            return
+        executor = self._get_executor()
+        if executor is not None:
+            for future in [executor.submit(_ping) for _ in range(self.workers)]:
+                future.result(timeout=KYC_TASK_TIMEOUT)
+            print(f"[KYC] Pipeline started with {self.workers} worker process(es)")
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                methods = multiprocessing.get_all_start_methods()
+                # Forked workers inherit the imported libraries; spawn would re-import app.py
+                context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=context, initializer=_warm_worker
+                )
+            return self._executor
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Run fn(*args) on the pool (or inline when KYC_POOL_WORKERS=0)"""
+        with self._lock:
+            self.tasks += 1
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM in the CNN model): start a fresh pool
+                with self._lock:
+                    self.failures += 1
+                    if self._executor is executor:
+                        self._executor = None
+                return self._get_executor().submit(fn, *args)
+
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _wait(self, future: Future) -> dict:
+        try:
+            result = future.result(timeout=KYC_TASK_TIMEOUT)
+        except BrokenProcessPool:
+            with self._lock:
+                self.failures += 1
+                self._executor = None
+            raise
+        self._record(result.get("timings"))
+        return result
+
+    # ---------- stats ----------
+
+    def _record(self, timings: Optional[dict]):
+        if not timings:
+            return
+        with self._lock:
+            for stage, ms in timings.items():
+                totals = self._stages.setdefault(stage, [0, 0.0, 0.0])
+                totals[0] += 1
+                totals[1] += ms
+                totals[2] = max(totals[2], ms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stages = {
+                stage.replace('_ms', ''): {
+                    'count': count,
+                    'avg_ms': round(total / count, 1) if count else 0,
+                    'max_ms': peak
+                }
+                for stage, (count, total, peak) in self._stages.items()
+            }
+            cached = len(self._encodings)
+            pending = len(self._pending)
+        return {
+            'workers': self.workers,
+            'running': self._executor is not None,
+            'tasks': self.tasks,
+            'failures': self.failures,
+            'encoding_cache': {
+                'entries': cached,
+                'max_entries': self.cache_size,
+                'pending': pending,
+                'hits': self.cache_hits,
+                'misses': self.cache_misses
+            },
+            'stages': stages
+        }
+
+    # ---------- encodings ----------
+
+    def _cached_encoding(self, image_data: bytes, label: str) -> tuple:
+        """(future, cached) for the encodings of image_data; concurrent requests share one task"""
+        key = hashlib.sha1(image_data).hexdigest()
+        with self._lock:
+            result = self._encodings.get(key)
+            if result is not None:
+                self._encodings.move_to_end(key)
+                self.cache_hits += 1
+                future = Future()
+                future.set_result(result)
+                return future, True
+            future = self._pending.get(key)
+            if future is not None:
+                self.cache_hits += 1
+                return future, True
+            self.cache_misses += 1
+
+        future = self.submit(encode_faces, image_data, label)
+        with self._lock:
+            self._pending[key] = future
+        future.add_done_callback(lambda f: self._store(key, f))
+        return future, False
+
+    def _store(self, key: str, future: Future):
+        with self._lock:
+            self._pending.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        self._record(result.get("timings"))
+        if not result.get("encodings") or self.cache_size <= 0:
+            return
+        with self._lock:
+            self._encodings[key] = result
+            while len(self._encodings) > self.cache_size:
+                self._encodings.popitem(last=False)
+
+    def prefetch_document(self, image_data: bytes):
+        """Start encoding an uploaded document so the selfie comparison finds it cached"""
+        if FACE_RECOGNITION_AVAILABLE and PIL_AVAILABLE:
+            self._cached_encoding(image_data, "document")
+
+    # ---------- request API ----------
+
+    def detect_face(self, image_data: bytes) -> dict:
+        return self._wait(self.submit(detect_face, image_data))
+
+    def compare_faces(self, document_data: bytes, selfie_data: bytes) -> dict:
+        """Encode both images in parallel (document from cache when possible) and compare"""
+        start = time.perf_counter()
+        document_future, cached = self._cached_encoding(document_data, "document")
+        selfie_future = self.submit(encode_faces, selfie_data, "selfie")
+
+        # Timings of a document encoded for this request are recorded when it is cached
+        document = document_future.result(timeout=KYC_TASK_TIMEOUT)
+        selfie = self._wait(selfie_future)
+        timings = {
+            'document': {} if cached else document.get("timings", {}),
+            'selfie': selfie.get("timings", {}),
+            'document_cached': cached,
+            'total_ms': _elapsed_ms(start)
+        }
+
+        if not document["encodings"] or not selfie["encodings"]:
+            return {
+                "match": False,
+                "score": 0,
+                "error": "Face not found in one or both images",
+                "timings": timings
+            }
+
+        distance = float(np.linalg.norm(document["encodings"][0] - selfie["encodings"][0]))
+        similarity = 1 - distance  # Convert distance to similarity (0-1)
+        print(f"[KYC] Face comparison: distance={distance:.4f}, similarity={similarity:.4f}, "
+              f"total={timings['total_ms']}ms, document_cached={cached}")
+        return {
+            "match": bool(similarity >= FACE_MATCH_THRESHOLD),
+            "score": float(similarity),
+            "method": "face_recognition",
+            "timings": timings
+        }
+
+
+pipeline = KYCPipeline()
@@ -22,6 +22,7 @@ from typing import Optional
 from datetime import datetime
 
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Query
 from dotenv import load_dotenv
@@ -43,12 +44,12 @@ b2_service = BackblazeService()
 
 def _conn():
     """Open a user-db connection with dict rows."""
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 
 def _admin_conn():
     """Open an admin-db connection with dict rows (astegni_reviews lives here)."""
-    return psycopg.connect(ADMIN_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADMIN_DATABASE_URL, row_factory=dict_row)
 
 
 def _fetch_user_profiles(user_ids):
@@ -98,7 +99,7 @@ def _fetch_user_profiles(user_ids):
 # ============================================================
 
 @router.get("/api/partners")
-async def list_partners(
+def list_partners(
     include_inactive: bool = Query(False),
     featured_only: bool = Query(False),
 ):
@@ -142,7 +143,7 @@ async def list_partners(
 
 
 @router.post("/api/admin/partners/{partner_id}/feature")
-async def set_partner_featured(
+def set_partner_featured(
     partner_id: int,
     is_featured: bool = Form(...),
     admin=Depends(get_current_admin),
@@ -260,7 +261,7 @@ async def update_partner(
 
 
 @router.delete("/api/admin/partners/{partner_id}")
-async def delete_partner(partner_id: int, admin=Depends(get_current_admin)):
+def delete_partner(partner_id: int, admin=Depends(get_current_admin)):
     with _conn() as conn, conn.cursor() as cur:
         cur.execute("DELETE FROM partners WHERE id=%s", (partner_id,))
         if cur.rowcount == 0:
@@ -274,7 +275,7 @@ async def delete_partner(partner_id: int, admin=Depends(get_current_admin)):
 # ============================================================
 
 @router.get("/api/featured-videos")
-async def list_featured_videos(include_inactive: bool = Query(False)):
+def list_featured_videos(include_inactive: bool = Query(False)):
     """Public: featured videos for index.html "Featured Content" carousel."""
     where = "" if include_inactive else "WHERE is_active = TRUE"
     with _conn() as conn, conn.cursor() as cur:
@@ -348,7 +349,7 @@ async def create_featured_video(
 
 
 @router.put("/api/admin/featured-videos/{video_id}")
-async def update_featured_video(
+def update_featured_video(
     video_id: int,
     title: str = Form(...),
     description: str = Form(""),
@@ -377,7 +378,7 @@ async def update_featured_video(
 
 
 @router.delete("/api/admin/featured-videos/{video_id}")
-async def delete_featured_video(video_id: int, admin=Depends(get_current_admin)):
+def delete_featured_video(video_id: int, admin=Depends(get_current_admin)):
     with _conn() as conn, conn.cursor() as cur:
         cur.execute("DELETE FROM featured_videos WHERE id=%s", (video_id,))
         if cur.rowcount == 0:
@@ -409,7 +410,7 @@ def _testimonial_public(r):
 
 
 @router.get("/api/reviews")
-async def list_reviews(
+def list_reviews(
     type: str = Query("professional"),
     featured: Optional[bool] = Query(None),
     limit: int = Query(6, ge=1, le=50),
@@ -444,7 +445,7 @@ async def list_reviews(
 
 
 @router.get("/api/admin/testimonials")
-async def admin_list_testimonials(admin=Depends(get_current_admin)):
+def admin_list_testimonials(admin=Depends(get_current_admin)):
     """Admin: full list, raw columns for editing."""
     with _conn() as conn, conn.cursor() as cur:
         cur.execute(
@@ -574,7 +575,7 @@ async def update_testimonial(
 
 
 @router.post("/api/admin/testimonials/{testimonial_id}/feature")
-async def set_testimonial_featured(
+def set_testimonial_featured(
     testimonial_id: int,
     is_featured: bool = Form(...),
     admin=Depends(get_current_admin),
@@ -592,7 +593,7 @@ async def set_testimonial_featured(
 
 
 @router.delete("/api/admin/testimonials/{testimonial_id}")
-async def delete_testimonial(testimonial_id: int, admin=Depends(get_current_admin)):
+def delete_testimonial(testimonial_id: int, admin=Depends(get_current_admin)):
     with _conn() as conn, conn.cursor() as cur:
         cur.execute("DELETE FROM astegni_testimonials WHERE id=%s", (testimonial_id,))
         if cur.rowcount == 0:
@@ -616,7 +617,7 @@ def _applicant_email(app) -> Optional[str]:
 
 
 @router.get("/api/admin/partner-applications")
-async def list_partner_applications(
+def list_partner_applications(
     status: Optional[str] = Query(None),
     admin=Depends(get_current_admin),
 ):
@@ -676,7 +677,7 @@ async def list_partner_applications(
 
 
 @router.post("/api/admin/partner-applications/{request_id}/reject")
-async def reject_partner_application(
+def reject_partner_application(
     request_id: int,
     admin_notes: str = Form(""),
     admin=Depends(get_current_admin),
@@ -716,7 +717,7 @@ async def reject_partner_application(
 
 
 @router.post("/api/admin/partner-applications/{request_id}/approve")
-async def approve_partner_application(
+def approve_partner_application(
     request_id: int,
     admin_notes: str = Form(""),
     admin=Depends(get_current_admin),
@@ -772,7 +773,7 @@ async def approve_partner_application(
 
 
 @router.post("/api/admin/partners/{partner_id}/reject-partnership")
-async def reject_existing_partnership(
+def reject_existing_partnership(
     partner_id: int,
     reason: str = Form(""),
     admin=Depends(get_current_admin),
@@ -852,7 +853,7 @@ def _shape_user_review(r, profiles):
 
 
 @router.get("/api/admin/user-reviews")
-async def admin_list_user_reviews(
+def admin_list_user_reviews(
     featured_only: bool = Query(False),
     admin=Depends(get_current_admin),
 ):
@@ -875,7 +876,7 @@ async def admin_list_user_reviews(
 
 
 @router.post("/api/admin/user-reviews/{review_id}/feature")
-async def set_user_review_featured(
+def set_user_review_featured(
     review_id: int,
     is_featured: bool = Form(...),
     admin=Depends(get_current_admin),
@@ -893,7 +894,7 @@ async def set_user_review_featured(
 
 
 @router.get("/api/featured-reviews")
-async def list_featured_user_reviews(limit: int = Query(12, ge=1, le=50)):
+def list_featured_user_reviews(limit: int = Query(12, ge=1, le=50)):
     """Public: featured user reviews for index.html "Success Stories".
 
     Only reviews with written text are surfaced (a star-only review makes a poor
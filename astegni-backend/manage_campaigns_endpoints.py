@@ -11,6 +11,7 @@ from fastapi import APIRouter, HTTPException, Depends, Header
 from pydantic import BaseModel
 from typing import Optional, List
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 from dotenv import load_dotenv
@@ -125,15 +126,15 @@ class CampaignStatsResponse(BaseModel):
 
 def get_admin_db():
     """Get admin database connection with dict_row factory"""
-    return psycopg.connect(ADMIN_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADMIN_DATABASE_URL, row_factory=dict_row)
 
 def get_user_db():
     """Get user database connection with dict_row factory"""
-    return psycopg.connect(USER_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(USER_DATABASE_URL, row_factory=dict_row)
 
 def get_advertiser_db():
     """Get advertiser database connection with dict_row factory"""
-    return psycopg.connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
 
 def verify_department_access(admin_id: int, allowed_departments: List[str] = ALLOWED_DEPARTMENTS):
     """
@@ -187,7 +188,7 @@ def verify_department_access(admin_id: int, allowed_departments: List[str] = ALL
 # ============================================
 
 @router.get("/profile/{admin_id}")
-async def get_campaign_admin_profile(admin_id: int, department: str = "Campaign Management"):
+def get_campaign_admin_profile(admin_id: int, department: str = "Campaign Management"):
     """
     Get complete campaign admin profile (admin_profile + manage_campaigns_profile)
 
@@ -274,7 +275,7 @@ async def get_campaign_admin_profile(admin_id: int, department: str = "Campaign
         raise HTTPException(status_code=500, detail=f"Failed to fetch profile: {str(e)}")
 
 @router.put("/profile/{admin_id}")
-async def update_campaign_admin_profile(admin_id: int, profile_data: CampaignProfileUpdate):
+def update_campaign_admin_profile(admin_id: int, profile_data: CampaignProfileUpdate):
     """
     Update campaign admin profile
 
@@ -386,7 +387,7 @@ async def update_campaign_admin_profile(admin_id: int, profile_data: CampaignPro
         raise HTTPException(status_code=500, detail=f"Failed to update profile: {str(e)}")
 
 @router.get("/stats/{admin_id}")
-async def get_campaign_stats(admin_id: Optional[int] = None):
+def get_campaign_stats(admin_id: Optional[int] = None):
     """
     Get campaign statistics for dashboard
 
@@ -507,7 +508,7 @@ async def get_campaign_stats(admin_id: Optional[int] = None):
         raise HTTPException(status_code=500, detail=f"Failed to fetch stats: {str(e)}")
 
 @router.get("/campaigns")
-async def get_campaigns(
+def get_campaigns(
     status: Optional[str] = None,
     search: Optional[str] = None,
     industry: Optional[str] = None,
@@ -747,7 +748,7 @@ async def get_campaigns(
         raise HTTPException(status_code=500, detail=f"Failed to fetch campaigns: {str(e)}")
 
 @router.get("/campaigns/live-requests")
-async def get_live_campaign_requests(
+def get_live_campaign_requests(
     limit: int = 20,
     admin_id: Optional[int] = None
 ):
@@ -839,7 +840,7 @@ async def get_live_campaign_requests(
         raise HTTPException(status_code=500, detail=f"Failed to fetch live requests: {str(e)}")
 
 @router.get("/campaigns/{campaign_id}")
-async def get_campaign_details(
+def get_campaign_details(
     campaign_id: int,
     admin_id: Optional[int] = None
 ):
@@ -951,7 +952,7 @@ class CampaignStatusUpdate(BaseModel):
     admin_id: Optional[int] = None
 
 @router.put("/campaigns/{campaign_id}/status")
-async def update_campaign_status(
+def update_campaign_status(
     campaign_id: int,
     status_update: CampaignStatusUpdate
 ):
@@ -1100,7 +1101,7 @@ class CampaignPaymentStatusUpdate(BaseModel):
 
 
 @router.get("/campaigns/{campaign_id}/payment")
-async def get_campaign_payment(campaign_id: int, admin_id: Optional[int] = None):
+def get_campaign_payment(campaign_id: int, admin_id: Optional[int] = None):
     """Return the advance-payment invoice + receipt for admin review."""
     if admin_id:
         verify_department_access(admin_id)
@@ -1141,7 +1142,7 @@ async def get_campaign_payment(campaign_id: int, admin_id: Optional[int] = None)
 
 
 @router.put("/campaigns/{campaign_id}/payment-status")
-async def update_campaign_payment_status(campaign_id: int, body: CampaignPaymentStatusUpdate):
+def update_campaign_payment_status(campaign_id: int, body: CampaignPaymentStatusUpdate):
     """
     Admin verifies/rejects an advance-payment receipt (payment verification).
 
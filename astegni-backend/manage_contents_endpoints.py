@@ -47,7 +47,7 @@ def verify_department_access(email: str, db: Session):
     return True
 
 @router.get("/api/admin/manage-contents-profile/by-email/{email}")
-async def get_manage_contents_profile_by_email(email: str, db: Session = Depends(get_db)):
+def get_manage_contents_profile_by_email(email: str, db: Session = Depends(get_db)):
     """
     Get manage-contents profile data by admin email
     Fetches data from:
@@ -154,7 +154,7 @@ async def get_manage_contents_profile_by_email(email: str, db: Session = Depends
 
 
 @router.put("/api/admin/manage-contents-profile")
-async def update_manage_contents_profile(
+def update_manage_contents_profile(
     admin_id: int,
     first_name: Optional[str] = None,
     father_name: Optional[str] = None,
@@ -230,7 +230,7 @@ async def update_manage_contents_profile(
 
 
 @router.get("/api/admin/manage-contents-reviews/{admin_id}")
-async def get_manage_contents_reviews(admin_id: int, db: Session = Depends(get_db)):
+def get_manage_contents_reviews(admin_id: int, db: Session = Depends(get_db)):
     """
     Get recent reviews for manage-contents admin
     Filters by admin_id and department (manage-contents)
@@ -15,6 +15,7 @@ from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from pydantic import BaseModel
 from typing import Optional, List
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 import os
@@ -40,15 +41,15 @@ ALLOWED_DEPARTMENTS = ["manage-payments", "manage-system-settings"]
 
 
 def get_admin_db():
-    return psycopg.connect(ADMIN_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADMIN_DATABASE_URL, row_factory=dict_row)
 
 
 def get_advertiser_db():
-    return psycopg.connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADVERTISER_DATABASE_URL, row_factory=dict_row)
 
 
 def get_user_db():
-    return psycopg.connect(USER_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(USER_DATABASE_URL, row_factory=dict_row)
 
 
 def verify_payments_access(admin_id: Optional[int]):
@@ -189,7 +190,7 @@ def _resolve_advertiser_names(rows: List[dict]) -> dict:
 
 
 @router.get("/counts")
-async def payment_counts(admin_id: Optional[int] = None):
+def payment_counts(admin_id: Optional[int] = None):
     """Counts of advance payments by status (for the dashboard/sidebar)."""
     verify_payments_access(admin_id)
     conn = get_advertiser_db()
@@ -213,7 +214,7 @@ async def payment_counts(admin_id: Optional[int] = None):
 
 
 @router.get("/payments")
-async def list_payments(status: Optional[str] = None, limit: int = 50, admin_id: Optional[int] = None):
+def list_payments(status: Optional[str] = None, limit: int = 50, admin_id: Optional[int] = None):
     """List advance-payment receipts, optionally filtered by status."""
     verify_payments_access(admin_id)
     conn = get_advertiser_db()
@@ -300,7 +301,7 @@ async def list_payments(status: Optional[str] = None, limit: int = 50, admin_id:
 
 
 @router.put("/payments/{campaign_id}/status")
-async def update_payment_status(campaign_id: int, body: PaymentStatusUpdate):
+def update_payment_status(campaign_id: int, body: PaymentStatusUpdate):
     """Verify/reject a payment receipt (advance or remaining-balance settlement)."""
     valid = ['verified', 'rejected', 'pending']
     if body.new_status not in valid:
@@ -447,7 +448,7 @@ class SettlementInvoiceRequest(BaseModel):
 
 
 @router.post("/payments/{campaign_id}/settlement-invoice")
-async def issue_settlement_invoice(campaign_id: int, body: SettlementInvoiceRequest):
+def issue_settlement_invoice(campaign_id: int, body: SettlementInvoiceRequest):
     """Issue the remaining-balance settlement invoice for a campaign (the second
     payment, after the verified advance). Creates a 'final_settlement' row on
     campaign_invoices for (campaign_budget - advance), so every payment has its
@@ -4,39 +4,36 @@ Real-time market analysis for tutor pricing suggestions based on actual database
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any, Union
 from decimal import Decimal
 from datetime import datetime, timedelta
+import numpy as np
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
+from market_pricing_index import SIMILAR_THRESHOLD, country_of, get_market_index, grade_complexity
 import os
-import jwt
-from jwt import PyJWTError
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# OAuth2 scheme
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # Get config from environment
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 def get_db_connection():
     """Get database connection (user database)"""
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise Exception("DATABASE_URL not found in environment variables")
-    return psycopg.connect(database_url)
+    return pooled_connect(database_url)
 
 def get_admin_db_connection():
     """Get admin database connection"""
     admin_database_url = os.getenv("ADMIN_DATABASE_URL")
     if not admin_database_url:
         raise Exception("ADMIN_DATABASE_URL not found in environment variables")
-    return psycopg.connect(admin_database_url)
+    return pooled_connect(admin_database_url)
 
 def get_base_price_for_tutor(subject_category: str, session_format: str, credentials_count: int = 0, experience_years: float = 0):
     """
@@ -163,55 +160,6 @@ def is_new_tutor(tutor_id: int, conn) -> bool:
         print(f"Error checking if tutor is new: {e}")
         return False
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current authenticated user - returns dict with user data"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
-        user_id = int(user_id_str)
-    except (PyJWTError, ValueError, TypeError) as e:
-        print(f"JWT decode error: {e}")
-        raise credentials_exception
-
-    # Fetch user from database
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, email, phone, roles, active_role,
-                       first_name, father_name, grandfather_name, profile_picture
-                FROM users WHERE id = %s
-            """, (user_id,))
-            row = cur.fetchone()
-
-            if not row:
-                raise credentials_exception
-
-            return {
-                'id': row[0],
-                'email': row[1],
-                'phone': row[2],
-                'roles': row[3] or [],
-                'active_role': row[4],
-                'first_name': row[5],
-                'father_name': row[6],
-                'grandfather_name': row[7],
-                'profile_picture': row[8]
-            }
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Database error in get_current_user: {e}")
-        raise credentials_exception
-    finally:
-        conn.close()
 
 router = APIRouter(prefix="/api/market-pricing", tags=["market-pricing"])
 
@@ -244,9 +192,9 @@ class PriceSuggestionAnalytics(BaseModel):
 
 
 @router.post("/suggest-price", response_model=MarketPriceResponse)
-async def suggest_market_price(
+def suggest_market_price(
     request: MarketPriceRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Analyze real market data and suggest optimal pricing for tutor
@@ -328,24 +276,11 @@ async def suggest_market_price(
             account_age_days = (datetime.now() - created_at).days if created_at else 0
 
             # Extract country from location (format: "City, Country" or "Country")
-            tutor_country = ""
-            if tutor_location:
-                parts = tutor_location.split(',')
-                tutor_country = parts[-1].strip().upper() if parts else tutor_location.strip().upper()
+            tutor_country = country_of(tutor_location)
 
             # Calculate grade level complexity score (1-14 scale, average of all taught levels)
-            # 1-12 = Grades, 13 = University, 14 = Certification
-            grade_level_map = {
-                'Grade 1': 1, 'Grade 2': 2, 'Grade 3': 3, 'Grade 4': 4, 'Grade 5': 5, 'Grade 6': 6,
-                'Grade 7': 7, 'Grade 8': 8, 'Grade 9': 9, 'Grade 10': 10, 'Grade 11': 11, 'Grade 12': 12,
-                'University': 13, 'Certification': 14
-            }
-            tutor_grade_complexity = 0
-            if tutor_grade_levels:
-                numeric_grades = [grade_level_map.get(g, 7) for g in tutor_grade_levels]
-                tutor_grade_complexity = sum(numeric_grades) / len(numeric_grades) if numeric_grades else 7
-            else:
-                tutor_grade_complexity = 7  # Default to middle school level
+            # 1-12 = Grades, 13 = University, 14 = Certification, default 7 (middle school level)
+            tutor_grade_complexity = grade_complexity(tutor_grade_levels)
 
             # Credentials Score: Count of uploaded credentials (0-100 scale, capped)
             # Each credential contributes 5 points (certifications, achievements, experience letters, etc.)
@@ -355,115 +290,27 @@ async def suggest_market_price(
             # Each year contributes 5 points (max 20 years = 100 points)
             experience_score = min(100, total_experience_years * 5)
 
-            # Step 2: Build query for similar tutors based on filters
-            query_filters = []
-            query_params = []
-
-            # Base date filter for time period
+            # Step 2: Market data from the in-process market matrix (see market_pricing_index.py)
+            # IMPORTANT: Use agreed_price from enrolled_students (actual market prices),
+            # averaged per tutor, session format and grade levels
             cutoff_date = datetime.now() - timedelta(days=request.time_period_months * 30)
-            query_filters.append("pkg.created_at >= %s")
-            query_params.append(cutoff_date)
-
-            # Course filter
-            if request.course_ids:
-                query_filters.append("pkg.course_ids && %s")
-                query_params.append(request.course_ids)
-
-            # Grade level filter (grade_level is an array in database)
-            if request.grade_level:
-                if isinstance(request.grade_level, list):
-                    # Range: Match packages that have ANY of the requested grade levels
-                    query_filters.append("pkg.grade_level && %s")
-                    query_params.append(request.grade_level)
-                else:
-                    # Single value: Match packages that contain this grade level
-                    query_filters.append("%s = ANY(pkg.grade_level)")
-                    query_params.append(request.grade_level)
-
-            # Session format filter
-            if request.session_format:
-                query_filters.append("pkg.session_format = %s")
-                query_params.append(request.session_format)
+            market_index = get_market_index()
+            market_groups, market_prices = market_index.market_sample(
+                tutor_id, cutoff_date,
+                course_ids=request.course_ids,
+                grade_level=request.grade_level,
+                session_format=request.session_format,
+                packages_since=cutoff_date
+            )
 
-            where_clause = " AND ".join(query_filters) if query_filters else "1=1"
-
-            # Step 3: Query market data with all factors including session format, location, grade level (v2.4)
-            # IMPORTANT: Use agreed_price from enrolled_students (actual market prices)
-            cur.execute(f"""
-                SELECT
-                    tp.id,
-                    COALESCE(ta.average_rating, 2.0) as rating,
-                    COALESCE(ta.success_rate, 0.0) as completion_rate,
-                    COALESCE(ta.total_students, 0) as student_count,
-                    AVG(es.agreed_price) as avg_agreed_price,
-                    COALESCE(
-                        (SELECT COUNT(*) FROM credentials WHERE user_id = tp.user_id),
-                        0
-                    ) as credentials_count,
-                    COALESCE(
-                        (SELECT SUM(COALESCE(years, 0)) FROM credentials WHERE user_id = tp.user_id),
-                        0
-                    ) as total_experience_years,
-                    tp.created_at,
-                    pkg.session_format,
-                    u.location,
-                    pkg.grade_level
-                FROM tutor_profiles tp
-                INNER JOIN tutor_packages pkg ON tp.id = pkg.tutor_id
-                INNER JOIN enrolled_students es ON pkg.id = es.package_id
-                LEFT JOIN tutor_analysis ta ON tp.id = ta.tutor_id
-                LEFT JOIN users u ON tp.user_id = u.id
-                WHERE pkg.is_active = TRUE
-                  AND pkg.visibility = 'public'
-                  AND es.agreed_price > 0
-                  AND tp.id != %s
-                  AND es.enrolled_at >= %s
-                  AND {where_clause}
-                GROUP BY tp.id, ta.average_rating, ta.success_rate, ta.total_students, tp.created_at, pkg.session_format, u.location, pkg.grade_level
-            """, [tutor_id, cutoff_date] + query_params)
-
-            market_data = cur.fetchall()
-
-            if len(market_data) < 5:
-                # Not enough data - use broader criteria (all courses/grades) but still include location & grade_level (v2.4)
-                cur.execute("""
-                    SELECT
-                        tp.id,
-                        COALESCE(ta.average_rating, 2.0) as rating,
-                        COALESCE(ta.success_rate, 0.0) as completion_rate,
-                        COALESCE(ta.total_students, 0) as student_count,
-                        AVG(es.agreed_price) as avg_agreed_price,
-                        COALESCE(
-                            (SELECT COUNT(*) FROM credentials WHERE user_id = tp.user_id),
-                            0
-                        ) as credentials_count,
-                        COALESCE(
-                            (SELECT SUM(COALESCE(years, 0)) FROM credentials WHERE user_id = tp.user_id),
-                            0
-                        ) as total_experience_years,
-                        tp.created_at,
-                        pkg.session_format,
-                        u.location,
-                        pkg.grade_level
-                    FROM tutor_profiles tp
-                    INNER JOIN tutor_packages pkg ON tp.id = pkg.tutor_id
-                    INNER JOIN enrolled_students es ON pkg.id = es.package_id
-                    LEFT JOIN tutor_analysis ta ON tp.id = ta.tutor_id
-                    LEFT JOIN users u ON tp.user_id = u.id
-                    WHERE pkg.is_active = TRUE
-                      AND pkg.visibility = 'public'
-                      AND es.agreed_price > 0
-                      AND tp.id != %s
-                      AND es.enrolled_at >= %s
-                    GROUP BY tp.id, ta.average_rating, ta.success_rate, ta.total_students, tp.created_at, pkg.session_format, u.location, pkg.grade_level
-                """, (tutor_id, cutoff_date))
-
-                market_data = cur.fetchall()
+            if len(market_groups) < 5:
+                # Not enough data - use broader criteria (all courses/grades/formats)
+                market_groups, market_prices = market_index.market_sample(tutor_id, cutoff_date)
 
             # Check if tutor is new
             tutor_is_new = is_new_tutor(tutor_id, conn)
 
-            if len(market_data) == 0 or tutor_is_new:
+            if len(market_prices) == 0 or tutor_is_new:
                 # Use base price rules for new tutors or when no market data available
                 # Map course to subject category (simplified mapping for now)
                 subject_category = "all"  # Default to all subjects
@@ -536,126 +383,27 @@ async def suggest_market_price(
                     time_period_months=request.time_period_months
                 )
 
-            # Step 4: Calculate weighted prices based on 9-FACTOR similarity (v2.4 - Added Grade Level & Location)
-            weighted_prices = []
-            all_prices = []
-            similar_tutors_count = 0
-
-            for row in market_data:
-                market_tutor_id, rating, comp_rate, students, price, credentials, experience_years, market_created_at, market_session_format, market_location, market_grade_levels = row
-                rating = float(rating) if rating else 2.0
-                comp_rate = float(comp_rate) if comp_rate else 0.0
-                students = students or 0
-                price = float(price)
-                credentials = credentials or 0
-                experience_years = int(experience_years) if experience_years else 0
-                market_location = market_location or ""
-                market_grade_levels = market_grade_levels or []
-
-                all_prices.append(price)
-
-                # Calculate market tutor's metrics
-                market_credentials_score = min(100, credentials * 5)  # Credentials score (count-based)
-                market_experience_score = min(100, experience_years * 5)  # Experience score (years-based)
-                market_account_age_days = (datetime.now() - market_created_at).days if market_created_at else 0
-
-                # Extract country from market tutor's location
-                market_country = ""
-                if market_location:
-                    parts = market_location.split(',')
-                    market_country = parts[-1].strip().upper() if parts else market_location.strip().upper()
-
-                # Calculate market tutor's grade complexity
-                market_grade_complexity = 7  # Default
-                if market_grade_levels:
-                    numeric_grades = [grade_level_map.get(g, 7) for g in market_grade_levels]
-                    market_grade_complexity = sum(numeric_grades) / len(numeric_grades) if numeric_grades else 7
-
-                # Calculate similarity scores (0-1) for each of 9 factors
-
-                # 1. Rating similarity (0-5 scale)
-                rating_diff = abs(rating - tutor_rating)
-                rating_similarity = 1 - min(rating_diff / 5.0, 1.0)
-
-                # 2. Completion rate similarity (0-1 scale, quality indicator)
-                comp_rate_diff = abs(comp_rate - completion_rate)
-                comp_rate_similarity = 1 - comp_rate_diff
-
-                # 3. Location similarity (CRITICAL - market economics)
-                # Same country = 1.0, Different country = 0.0
-                # This ensures we compare tutors in similar economic markets
-                location_similarity = 1.0 if (tutor_country and market_country and tutor_country == market_country) else 0.3
-
-                # 4. Student count similarity (teaching load)
-                # Normalize to reasonable range (0-100 students)
-                student_diff = abs(students - student_count) / max(student_count, students, 100)
-                student_similarity = 1 - min(student_diff, 1.0)
-
-                # 5. Session format similarity (exact match or not)
-                # Online vs In-person have different market prices
-                session_format_similarity = 1.0 if market_session_format == request.session_format else 0.5
-
-                # 6. Grade level similarity (teaching complexity)
-                # Compare average grade complexity (1-14 scale)
-                grade_diff = abs(market_grade_complexity - tutor_grade_complexity) / 14.0
-                grade_level_similarity = 1 - min(grade_diff, 1.0)
-
-                # 7. Experience similarity (years-based)
-                exp_diff = abs(market_experience_score - experience_score) / max(experience_score, market_experience_score, 100)
-                exp_similarity = 1 - min(exp_diff, 1.0)
-
-                # 8. Credentials similarity (count-based)
-                cred_diff = abs(market_credentials_score - credentials_score) / max(credentials_score, market_credentials_score, 100)
-                cred_similarity = 1 - min(cred_diff, 1.0)
-
-                # 9. Account age similarity (platform tenure)
-                # Normalize to 3 years (1095 days) as typical range
-                age_diff = abs(market_account_age_days - account_age_days) / max(account_age_days, market_account_age_days, 1095)
-                age_similarity = 1 - min(age_diff, 1.0)
-
-                # NEW Weight distribution (v2.4 - 9 factors total 100%):
-                # - Rating: 20% (reputation)
-                # - Completion rate: 16% (quality/reliability)
-                # - Location: 15% (market economics - CRITICAL)
-                # - Student count: 13% (current teaching load)
-                # - Session format: 12% (online vs in-person pricing)
-                # - Grade level: 10% (teaching complexity)
-                # - Experience: 8% (years of experience)
-                # - Credentials: 4% (number of credentials)
-                # - Account age: 2% (platform tenure)
-                similarity = (
-                    rating_similarity * 0.20 +
-                    comp_rate_similarity * 0.16 +
-                    location_similarity * 0.15 +
-                    student_similarity * 0.13 +
-                    session_format_similarity * 0.12 +
-                    grade_level_similarity * 0.10 +
-                    exp_similarity * 0.08 +
-                    cred_similarity * 0.04 +
-                    age_similarity * 0.02
-                )
+            # Step 4: Calculate 9-FACTOR similarity of every market row (v2.4 - Added Grade Level & Location)
+            # Weights: rating 20%, completion rate 16%, location 15%, student count 13%,
+            # session format 12%, grade level 10%, experience 8%, credentials 4%, account age 2%
+            similarity = market_index.similarity(
+                market_groups,
+                rating=tutor_rating,
+                completion_rate=completion_rate,
+                student_count=student_count,
+                country=tutor_country,
+                session_format=request.session_format,
+                grade_complexity=tutor_grade_complexity,
+                experience_score=experience_score,
+                credentials_score=credentials_score,
+                account_age_days=account_age_days
+            )
 
-                # Consider tutors with similarity > 0.65 as "similar"
-                if similarity > 0.65:
-                    similar_tutors_count += 1
-
-                weighted_prices.append({
-                    'price': price,
-                    'weight': similarity,
-                    'rating': rating,
-                    'completion_rate': comp_rate,
-                    'students': students,
-                    'experience_score': market_experience_score,
-                    'credentials_score': market_credentials_score,
-                    'account_age_days': market_account_age_days
-                })
+            # Consider tutors with similarity > 0.65 as "similar"
+            similar_tutors_count = int(np.count_nonzero(similarity > SIMILAR_THRESHOLD))
 
             # Step 5: Calculate weighted average
-            if weighted_prices:
-                total_weight = sum(item['weight'] for item in weighted_prices)
-                weighted_avg = sum(item['price'] * item['weight'] for item in weighted_prices) / total_weight
-            else:
-                weighted_avg = sum(all_prices) / len(all_prices)
+            weighted_avg = float(np.dot(market_prices, similarity) / similarity.sum())
 
             # Step 6: Apply time-based adjustment (market trend factor)
             # Assumption: prices trend upward over time at 5% per 3 months
@@ -681,18 +429,18 @@ async def suggest_market_price(
             # Round to nearest 5 ETB for clean pricing
             suggested_price = round(suggested_price / 5) * 5
 
-            market_average = sum(all_prices) / len(all_prices)
+            market_average = float(market_prices.mean())
 
             return MarketPriceResponse(
                 suggested_price=float(suggested_price),
                 market_average=float(market_average),
                 price_range={
-                    "min": float(min(all_prices)),
-                    "max": float(max(all_prices)),
+                    "min": float(market_prices.min()),
+                    "max": float(market_prices.max()),
                     "suggested_min": float(min_bound),
                     "suggested_max": float(max_bound)
                 },
-                tutor_count=len(market_data),
+                tutor_count=len(market_prices),
                 similar_tutors_count=similar_tutors_count,
                 confidence_level=confidence,
                 factors={
@@ -748,9 +496,9 @@ async def suggest_market_price(
 
 
 @router.post("/log-suggestion")
-async def log_price_suggestion(
+def log_price_suggestion(
     analytics: PriceSuggestionAnalytics,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Log price suggestion for analytics tracking
@@ -806,10 +554,10 @@ async def log_price_suggestion(
 
 
 @router.post("/log-acceptance/{suggestion_id}")
-async def log_price_acceptance(
+def log_price_acceptance(
     suggestion_id: int,
     accepted_price: float,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Log when a tutor accepts and uses a suggested price
@@ -844,8 +592,8 @@ async def log_price_acceptance(
 
 
 @router.get("/analytics/summary")
-async def get_pricing_analytics_summary(
-    current_user: dict = Depends(get_current_user)
+def get_pricing_analytics_summary(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get summary analytics for tutor's pricing suggestions
@@ -901,9 +649,9 @@ async def get_pricing_analytics_summary(
 
 
 @router.post("/market-tutors")
-async def get_market_tutors(
+def get_market_tutors(
     request: MarketPriceRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get market tutor data for charts and tables (v2.4 - 9 Factors Including Grade Level & Location)
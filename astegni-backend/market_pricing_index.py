@@ -0,0 +1,365 @@
+"""
+Market Pricing Index
+In-process market feature matrix for /api/market-pricing/suggest-price
+
+Every active public package with a priced enrollment (agreed_price > 0) in the
+last MARKET_MAX_MONTHS * 30 days is loaded once, with its tutor's features
+(credential counts and years pre-aggregated in one GROUP BY instead of two
+correlated subqueries per row):
+
+    groups       one row per (tutor, session_format, grade_level) - the GROUP BY
+                 of the old market query - as NumPy feature columns: rating,
+                 completion rate, students, credentials / experience scores,
+                 account creation time, country, session format, grade complexity
+    packages     package -> group, created_at, and inverted lists by
+                 session_format, grade level and course id for the request filters
+    enrollments  (package, enrolled_at, agreed_price) sorted by enrolled_at, so the
+                 time window is a binary search
+
+A suggestion masks packages by the filters, sums the enrollments in the window
+per group (np.bincount) to get each group's AVG(agreed_price), and scores all
+groups against the tutor with the 9-factor similarity in one vectorized pass.
+
+Freshness:
+- invalidate_market_index() after this worker creates or re-prices an
+  enrollment - the next suggestion reloads
+- market_index_refresh_loop() (app.py lifespan) reloads every
+  MARKET_INDEX_REFRESH_SECONDS and rebuilds only if the rows changed - picks up
+  enrollments from other workers, rating and credential changes, packages that
+  were deactivated, ...
+
+Usage:
+    python market_pricing_index.py    # print index stats
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from config import DATABASE_URL
+from db_pool import pooled_connect
+
+load_dotenv()
+
+MARKET_INDEX_REFRESH_SECONDS = int(os.getenv("MARKET_INDEX_REFRESH_SECONDS", 60))
+# Longest time_period_months a suggestion may ask for (MarketPriceRequest allows 1-12)
+MARKET_MAX_MONTHS = 12
+
+# 1-12 = Grades, 13 = University, 14 = Certification (anything else counts as 7)
+GRADE_LEVEL_MAP = {
+    'Grade 1': 1, 'Grade 2': 2, 'Grade 3': 3, 'Grade 4': 4, 'Grade 5': 5, 'Grade 6': 6,
+    'Grade 7': 7, 'Grade 8': 8, 'Grade 9': 9, 'Grade 10': 10, 'Grade 11': 11, 'Grade 12': 12,
+    'University': 13, 'Certification': 14
+}
+
+# rating, completion rate, location, students, session format, grade level,
+# experience, credentials, account age
+SIMILARITY_WEIGHTS = (0.20, 0.16, 0.15, 0.13, 0.12, 0.10, 0.08, 0.04, 0.02)
+SIMILAR_THRESHOLD = 0.65
+
+
+def country_of(location: Optional[str]) -> str:
+    """Country part of "City, Country" (or "Country"), upper-cased"""
+    if not location:
+        return ""
+    return location.split(',')[-1].strip().upper()
+
+
+def grade_complexity(grade_levels: Optional[Iterable[str]]) -> float:
+    """Average teaching complexity (1-14) of a package's grade levels, 7 if none"""
+    numeric_grades = [GRADE_LEVEL_MAP.get(g, 7) for g in grade_levels or []]
+    return sum(numeric_grades) / len(numeric_grades) if numeric_grades else 7
+
+
+def _epoch(value: Optional[datetime]) -> float:
+    return value.timestamp() if value is not None else np.nan
+
+
+# ============================================
+# LOADING
+# ============================================
+
+def load_market_rows(since: datetime) -> Tuple[List[tuple], List[tuple]]:
+    """(package rows, enrollment rows) for priced enrollments since `since`"""
+    conn = pooled_connect(DATABASE_URL)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT
+                pkg.id,
+                tp.id,
+                COALESCE(ta.average_rating, 2.0) as rating,
+                COALESCE(ta.success_rate, 0.0) as completion_rate,
+                COALESCE(ta.total_students, 0) as student_count,
+                COALESCE(cr.credentials_count, 0) as credentials_count,
+                COALESCE(cr.total_experience_years, 0) as total_experience_years,
+                tp.created_at,
+                u.location,
+                pkg.session_format,
+                pkg.grade_level,
+                pkg.course_ids,
+                pkg.created_at
+            FROM tutor_packages pkg
+            INNER JOIN tutor_profiles tp ON tp.id = pkg.tutor_id
+            LEFT JOIN tutor_analysis ta ON tp.id = ta.tutor_id
+            LEFT JOIN users u ON tp.user_id = u.id
+            LEFT JOIN (
+                SELECT user_id,
+                       COUNT(*) as credentials_count,
+                       SUM(COALESCE(years, 0)) as total_experience_years
+                FROM credentials
+                GROUP BY user_id
+            ) cr ON cr.user_id = tp.user_id
+            WHERE pkg.is_active = TRUE
+              AND pkg.visibility = 'public'
+              AND EXISTS (
+                  SELECT 1 FROM enrolled_students es
+                  WHERE es.package_id = pkg.id
+                    AND es.agreed_price > 0
+                    AND es.enrolled_at >= %s
+              )
+            ORDER BY pkg.id
+        """, (since,))
+        packages = cursor.fetchall()
+
+        cursor.execute("""
+            SELECT es.package_id, es.enrolled_at, es.agreed_price
+            FROM enrolled_students es
+            INNER JOIN tutor_packages pkg ON pkg.id = es.package_id
+            WHERE pkg.is_active = TRUE
+              AND pkg.visibility = 'public'
+              AND es.agreed_price > 0
+              AND es.enrolled_at >= %s
+            ORDER BY es.id
+        """, (since,))
+        enrollments = cursor.fetchall()
+        return packages, enrollments
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# ============================================
+# INDEX
+# ============================================
+
+class MarketIndex:
+    """Immutable once built - a rebuild swaps in a new instance"""
+
+    def __init__(self, packages: List[tuple], enrollments: List[tuple]):
+        self.packages = packages
+        self.enrollments = enrollments
+
+        self.countries: Dict[str, int] = {"": 0}
+        self.formats: Dict[Optional[str], int] = {}
+        self.by_format: Dict[str, List[int]] = {}
+        self.by_grade: Dict[str, List[int]] = {}
+        self.by_course: Dict[int, List[int]] = {}
+
+        group_of: Dict[tuple, int] = {}
+        group_rows = []
+        pkg_group, pkg_tutor, pkg_created = [], [], []
+        package_position = {}
+
+        for position, row in enumerate(packages):
+            (package_id, tutor_id, rating, comp_rate, students, credentials, experience_years,
+             tutor_created_at, location, session_format, grade_levels, course_ids, created_at) = row
+            grade_levels = grade_levels or []
+
+            key = (tutor_id, session_format, tuple(grade_levels))
+            group = group_of.get(key)
+            if group is None:
+                group = group_of[key] = len(group_rows)
+                group_rows.append((
+                    tutor_id,
+                    float(rating) if rating else 2.0,
+                    float(comp_rate) if comp_rate else 0.0,
+                    students or 0,
+                    min(100, (credentials or 0) * 5),
+                    min(100, (int(experience_years) if experience_years else 0) * 5),
+                    _epoch(tutor_created_at),
+                    self.countries.setdefault(country_of(location), len(self.countries)),
+                    self.formats.setdefault(session_format, len(self.formats)),
+                    grade_complexity(grade_levels),
+                ))
+
+            package_position[package_id] = position
+            pkg_group.append(group)
+            pkg_tutor.append(tutor_id)
+            pkg_created.append(_epoch(created_at))
+            if session_format:
+                self.by_format.setdefault(session_format, []).append(position)
+            for grade in set(grade_levels):
+                self.by_grade.setdefault(grade, []).append(position)
+            for course_id in set(course_ids or []):
+                self.by_course.setdefault(course_id, []).append(position)
+
+        columns = list(zip(*group_rows)) or [()] * 10
+        self.group_tutor = np.array(columns[0], dtype=np.int64)
+        self.rating = np.array(columns[1], dtype=np.float64)
+        self.completion_rate = np.array(columns[2], dtype=np.float64)
+        self.students = np.array(columns[3], dtype=np.float64)
+        self.credentials_score = np.array(columns[4], dtype=np.float64)
+        self.experience_score = np.array(columns[5], dtype=np.float64)
+        self.created_at = np.array(columns[6], dtype=np.float64)
+        self.country = np.array(columns[7], dtype=np.int32)
+        self.session_format = np.array(columns[8], dtype=np.int32)
+        self.grade_complexity = np.array(columns[9], dtype=np.float64)
+
+        self.pkg_group = np.array(pkg_group, dtype=np.int64)
+        self.pkg_tutor = np.array(pkg_tutor, dtype=np.int64)
+        self.pkg_created = np.array(pkg_created, dtype=np.float64)
+
+        # Enrollments of packages that were not loaded (a race between the two queries) are dropped
+        kept = [(package_position[package_id], _epoch(enrolled_at), float(price))
+                for package_id, enrolled_at, price in enrollments if package_id in package_position]
+        enr_pkg, enr_time, enr_price = (list(column) for column in zip(*kept)) if kept else ([], [], [])
+        order = np.argsort(np.array(enr_time, dtype=np.float64), kind="stable")
+        self.enr_pkg = np.array(enr_pkg, dtype=np.int64)[order]
+        self.enr_time = np.array(enr_time, dtype=np.float64)[order]
+        self.enr_price = np.array(enr_price, dtype=np.float64)[order]
+
+    def _any_of(self, lists: dict, keys: Iterable) -> np.ndarray:
+        """Mask of packages listed under any of `keys`"""
+        mask = np.zeros(len(self.pkg_group), dtype=bool)
+        for key in keys:
+            positions = lists.get(key)
+            if positions:
+                mask[positions] = True
+        return mask
+
+    def market_sample(self, exclude_tutor_id: int, cutoff: datetime,
+                      course_ids: Optional[List[int]] = None,
+                      grade_level=None,
+                      session_format: Optional[str] = None,
+                      packages_since: Optional[datetime] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (groups, avg agreed price) for enrollments since `cutoff` - the rows of the
+        old market query. Filters follow its WHERE clause: course_ids and
+        grade_level (a value or list) match any, packages_since bounds
+        pkg.created_at. Falsy filters are not applied.
+        """
+        pkg_mask = self.pkg_tutor != exclude_tutor_id
+        if packages_since is not None:
+            pkg_mask &= self.pkg_created >= packages_since.timestamp()
+        if course_ids:
+            pkg_mask &= self._any_of(self.by_course, course_ids)
+        if grade_level:
+            grades = grade_level if isinstance(grade_level, list) else [grade_level]
+            pkg_mask &= self._any_of(self.by_grade, grades)
+        if session_format:
+            pkg_mask &= self._any_of(self.by_format, [session_format])
+
+        start = np.searchsorted(self.enr_time, cutoff.timestamp(), side="left")
+        enr_pkg = self.enr_pkg[start:]
+        kept = pkg_mask[enr_pkg]
+        groups = self.pkg_group[enr_pkg[kept]]
+
+        n_groups = len(self.group_tutor)
+        totals = np.bincount(groups, weights=self.enr_price[start:][kept], minlength=n_groups)
+        counts = np.bincount(groups, minlength=n_groups)
+        present = np.flatnonzero(counts)
+        return present, totals[present] / counts[present]
+
+    def similarity(self, groups: np.ndarray, *, rating: float, completion_rate: float,
+                   student_count: int, country: str, session_format: Optional[str],
+                   grade_complexity: float, experience_score: float,
+                   credentials_score: float, account_age_days: int,
+                   now: Optional[datetime] = None) -> np.ndarray:
+        """9-factor weighted similarity (0-1) of each group to the requesting tutor"""
+        now = now or datetime.now()
+
+        created_at = self.created_at[groups]
+        age_days = np.where(np.isnan(created_at), 0.0,
+                            np.floor((now.timestamp() - created_at) / 86400.0))
+
+        def relative(values: np.ndarray, own: float, floor: float) -> np.ndarray:
+            diff = np.abs(values - own) / np.maximum(np.maximum(values, own), floor)
+            return 1 - np.minimum(diff, 1.0)
+
+        country_code = self.countries.get(country, -1) if country else -1
+        factors = (
+            1 - np.minimum(np.abs(self.rating[groups] - rating) / 5.0, 1.0),
+            1 - np.abs(self.completion_rate[groups] - completion_rate),
+            np.where(self.country[groups] == country_code, 1.0, 0.3),
+            relative(self.students[groups], student_count, 100),
+            np.where(self.session_format[groups] == self.formats.get(session_format, -1), 1.0, 0.5),
+            1 - np.minimum(np.abs(self.grade_complexity[groups] - grade_complexity) / 14.0, 1.0),
+            relative(self.experience_score[groups], experience_score, 100),
+            relative(self.credentials_score[groups], credentials_score, 100),
+            relative(age_days, account_age_days, 1095),
+        )
+        return sum(weight * factor for weight, factor in zip(SIMILARITY_WEIGHTS, factors))
+
+    def stats(self) -> dict:
+        arrays = [value for value in vars(self).values() if isinstance(value, np.ndarray)]
+        return {
+            "packages": len(self.packages),
+            "enrollments": len(self.enr_pkg),
+            "groups": len(self.group_tutor),
+            "tutors": len(np.unique(self.group_tutor)),
+            "session_formats": {fmt: len(positions) for fmt, positions in self.by_format.items()},
+            "grade_levels": len(self.by_grade),
+            "courses": len(self.by_course),
+            "countries": len(self.countries) - 1,
+            "array_bytes": sum(array.nbytes for array in arrays),
+        }
+
+
+_index: Optional[MarketIndex] = None
+_stale = False
+_refresh_lock = threading.Lock()
+
+
+def refresh_market_index() -> bool:
+    """Reload the market rows; rebuild the index only if they changed. Returns True if rebuilt."""
+    global _index, _stale
+    with _refresh_lock:
+        _stale = False
+        packages, enrollments = load_market_rows(datetime.now() - timedelta(days=MARKET_MAX_MONTHS * 30))
+        if _index is not None and packages == _index.packages and enrollments == _index.enrollments:
+            return False
+        _index = MarketIndex(packages, enrollments)
+        return True
+
+
+def get_market_index() -> MarketIndex:
+    """Current index (built on first use, reloaded if a local enrollment change made it stale)"""
+    if _index is None:
+        refresh_market_index()
+    elif _stale:
+        try:
+            refresh_market_index()
+        except Exception as e:
+            print(f"⚠️ [MarketIndex] Reload after enrollment change failed: {e}")
+    return _index
+
+
+def invalidate_market_index():
+    """Mark the index stale after a local enrollment change (the next suggestion reloads it)"""
+    global _stale
+    _stale = True
+
+
+async def market_index_refresh_loop():
+    """Background task started from app.py lifespan"""
+    while True:
+        try:
+            if await asyncio.to_thread(refresh_market_index):
+                print(f"[MarketIndex] Rebuilt with {len(_index.enr_pkg)} enrollments")
+        except Exception as e:
+            print(f"⚠️ [MarketIndex] Refresh failed: {e}")
+        await asyncio.sleep(MARKET_INDEX_REFRESH_SECONDS)
+
+
+if __name__ == "__main__":
+    refresh_market_index()
+    print(get_market_index().stats())
@@ -39,7 +39,7 @@ def get_db():
 # ============================================
 
 @router.post("/", response_model=NoteResponse, status_code=status.HTTP_201_CREATED)
-async def create_note(
+def create_note(
     note_data: NoteCreate,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -70,7 +70,7 @@ async def create_note(
     return db_note
 
 @router.get("/", response_model=List[NoteListResponse])
-async def get_notes(
+def get_notes(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     sort_by: str = Query("date_desc", regex="^(date_desc|date_asc|title|course|created)$"),
@@ -127,7 +127,7 @@ async def get_notes(
     return notes
 
 @router.get("/stats", response_model=NotesStatsResponse)
-async def get_notes_stats(
+def get_notes_stats(
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -188,7 +188,7 @@ async def get_notes_stats(
     }
 
 @router.get("/courses", response_model=List[str])
-async def get_user_courses(
+def get_user_courses(
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -204,7 +204,7 @@ async def get_user_courses(
     return [course[0] for course in courses]
 
 @router.get("/tutors", response_model=List[str])
-async def get_user_tutors(
+def get_user_tutors(
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -220,7 +220,7 @@ async def get_user_tutors(
     return [tutor[0] for tutor in tutors]
 
 @router.get("/{note_id}", response_model=NoteResponse)
-async def get_note(
+def get_note(
     note_id: int,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -242,7 +242,7 @@ async def get_note(
     return note
 
 @router.put("/{note_id}", response_model=NoteResponse)
-async def update_note(
+def update_note(
     note_id: int,
     note_data: NoteUpdate,
     current_user = Depends(get_current_user),
@@ -275,7 +275,7 @@ async def update_note(
     return note
 
 @router.patch("/{note_id}/favorite", response_model=NoteResponse)
-async def toggle_favorite(
+def toggle_favorite(
     note_id: int,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -303,7 +303,7 @@ async def toggle_favorite(
     return note
 
 @router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_note(
+def delete_note(
     note_id: int,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -328,7 +328,7 @@ async def delete_note(
     return None
 
 @router.post("/{note_id}/duplicate", response_model=NoteResponse)
-async def duplicate_note(
+def duplicate_note(
     note_id: int,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -455,7 +455,7 @@ async def upload_note_media(
     return media
 
 @router.get("/{note_id}/media", response_model=List[NoteMediaResponse])
-async def get_note_media(
+def get_note_media(
     note_id: int,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -480,7 +480,7 @@ async def get_note_media(
     return media
 
 @router.delete("/{note_id}/media/{media_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_note_media(
+def delete_note_media(
     note_id: int,
     media_id: int,
     current_user = Depends(get_current_user),
@@ -530,7 +530,7 @@ async def delete_note_media(
 # ============================================
 
 @router.post("/{note_id}/export", response_model=NoteExportResponse, status_code=status.HTTP_201_CREATED)
-async def track_note_export(
+def track_note_export(
     note_id: int,
     export_data: NoteExportCreate,
     current_user = Depends(get_current_user),
@@ -567,7 +567,7 @@ async def track_note_export(
     return export
 
 @router.get("/{note_id}/exports", response_model=List[NoteExportResponse])
-async def get_note_exports(
+def get_note_exports(
     note_id: int,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
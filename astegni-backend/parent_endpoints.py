@@ -41,6 +41,7 @@ from models import (
     ParentReviewCreate, ParentReviewUpdate, ParentReviewResponse
 )
 from utils import get_current_user, hash_password
+from user_context_cache import invalidate_user_context
 
 router = APIRouter()
 
@@ -49,7 +50,7 @@ router = APIRouter()
 # ============================================
 
 @router.get("/api/parent/profile", response_model=ParentProfileResponse)
-async def get_parent_profile(
+def get_parent_profile(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -124,7 +125,7 @@ async def get_parent_profile(
 
 
 @router.put("/api/parent/profile")
-async def update_parent_profile(
+def update_parent_profile(
     profile_data: ParentProfileUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -186,7 +187,7 @@ async def update_parent_profile(
 # ============================================
 
 @router.get("/api/parent/children")
-async def get_parent_children(
+def get_parent_children(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -260,7 +261,7 @@ async def get_parent_children(
 # ============================================
 
 @router.get("/api/parent/coparents")
-async def get_coparents(
+def get_coparents(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -409,7 +410,7 @@ async def get_coparents(
 # ============================================
 
 @router.get("/api/parent/schedules")
-async def get_parent_schedules(
+def get_parent_schedules(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -482,7 +483,7 @@ async def get_parent_schedules(
 
 
 @router.patch("/api/parent/schedules/{schedule_id}/toggle-alarm")
-async def toggle_parent_schedule_alarm(
+def toggle_parent_schedule_alarm(
     schedule_id: int,
     data: dict,
     current_user: User = Depends(get_current_user),
@@ -514,7 +515,7 @@ async def toggle_parent_schedule_alarm(
 
 
 @router.patch("/api/parent/schedules/{schedule_id}/toggle-notification")
-async def toggle_parent_schedule_notification(
+def toggle_parent_schedule_notification(
     schedule_id: int,
     data: dict,
     current_user: User = Depends(get_current_user),
@@ -551,7 +552,7 @@ async def toggle_parent_schedule_notification(
 # ============================================
 
 @router.get("/api/parent/sessions")
-async def get_parent_sessions(
+def get_parent_sessions(
     status_filter: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -697,7 +698,7 @@ async def get_parent_sessions(
 # ============================================
 
 @router.get("/api/parent/tutors")
-async def get_parent_tutors(
+def get_parent_tutors(
     student_id: int = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -868,7 +869,7 @@ async def get_parent_tutors(
 # ============================================
 
 @router.get("/api/student/{student_profile_id}/tutors")
-async def get_tutors_for_specific_student(
+def get_tutors_for_specific_student(
     student_profile_id: int,
     db: Session = Depends(get_db)
 ):
@@ -993,7 +994,7 @@ async def get_tutors_for_specific_student(
 # ============================================
 
 @router.post("/api/parent/add-child")
-async def add_child(
+def add_child(
     first_name: str,
     father_name: str,
     grandfather_name: str,
@@ -1117,7 +1118,7 @@ async def add_child(
 # ============================================
 
 @router.post("/api/parent/add-coparent")
-async def add_coparent(
+def add_coparent(
     first_name: str,
     father_name: str,
     grandfather_name: str,
@@ -1353,7 +1354,7 @@ async def add_coparent(
 # ============================================
 
 @router.post("/api/parent/resend-coparent-invitation/{invitation_id}")
-async def resend_coparent_invitation(
+def resend_coparent_invitation(
     invitation_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1409,6 +1410,7 @@ async def resend_coparent_invitation(
             "user_id": invitation.invited_to_user_id
         })
         db.commit()
+        invalidate_user_context(invitation.invited_to_user_id)
 
     # Send email
     email_sent = email_service.send_coparent_invitation_email(
@@ -1433,7 +1435,7 @@ async def resend_coparent_invitation(
 
 
 @router.delete("/api/parent/cancel-coparent-invitation/{invitation_id}")
-async def cancel_coparent_invitation(
+def cancel_coparent_invitation(
     invitation_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1475,7 +1477,7 @@ async def cancel_coparent_invitation(
 
 
 @router.delete("/api/parent/remove-coparent/{coparent_user_id}")
-async def remove_coparent(
+def remove_coparent(
     coparent_user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1521,7 +1523,7 @@ async def remove_coparent(
 # ============================================
 
 @router.post("/api/parent/{parent_id}/review", response_model=ParentReviewResponse)
-async def create_parent_review(
+def create_parent_review(
     parent_id: int,
     review_data: ParentReviewCreate,
     current_user: User = Depends(get_current_user),
@@ -1568,7 +1570,7 @@ async def create_parent_review(
 
 
 @router.get("/api/parent/{parent_id}/reviews")
-async def get_parent_reviews(
+def get_parent_reviews(
     parent_id: int,
     skip: int = 0,
     limit: int = 20,
@@ -1630,7 +1632,7 @@ async def get_parent_reviews(
 # ============================================
 
 @router.get("/api/parent/my-courses")
-async def get_parent_requested_courses(
+def get_parent_requested_courses(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1680,7 +1682,7 @@ async def get_parent_requested_courses(
 
 
 @router.get("/api/parent/my-schools")
-async def get_parent_requested_schools(
+def get_parent_requested_schools(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1739,7 +1741,7 @@ async def get_parent_requested_schools(
 # ============================================
 
 @router.get("/api/parent/dashboard-stats")
-async def get_parent_dashboard_stats(
+def get_parent_dashboard_stats(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1852,7 +1854,7 @@ async def get_parent_dashboard_stats(
 # ============================================
 
 @router.get("/api/parent/reviews/stats/{parent_id}")
-async def get_parent_review_stats(
+def get_parent_review_stats(
     parent_id: int,
     db: Session = Depends(get_db)
 ):
@@ -1900,7 +1902,7 @@ async def get_parent_review_stats(
 # ============================================
 
 @router.get("/api/parent/{parent_id}")
-async def get_parent_by_id(
+def get_parent_by_id(
     parent_id: int,
     by_user_id: bool = False,
     db: Session = Depends(get_db)
@@ -26,18 +26,19 @@ INVITATION FLOW (Student invites Parent):
 """
 
 from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.security import OAuth2PasswordBearer
 from typing import List, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 import secrets
 import os
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
+from user_context_cache import invalidate_user_context
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 from dotenv import load_dotenv
 import jwt
-from jwt import PyJWTError
 import bcrypt
 from email_service import email_service
 
@@ -49,7 +50,6 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 router = APIRouter(tags=["parent-invitations"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
 # ============================================
@@ -61,7 +61,7 @@ def get_db_connection():
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise HTTPException(status_code=500, detail="Database URL not configured")
-    return psycopg.connect(database_url, row_factory=dict_row)
+    return pooled_connect(database_url, row_factory=dict_row)
 
 
 # ============================================
@@ -94,62 +94,6 @@ def create_refresh_token(data: dict):
     return jwt.encode(to_encode, REFRESH_SECRET_KEY, algorithm=ALGORITHM)
 
 
-# ============================================
-# AUTHENTICATION
-# ============================================
-
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current user from JWT token"""
-    credentials_exception = HTTPException(
-        status_code=401,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    print(f"[DEBUG get_current_user] Token received: {token[:50] if token else 'None'}...")
-    print(f"[DEBUG get_current_user] SECRET_KEY: {SECRET_KEY[:20]}...")
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        print(f"[DEBUG get_current_user] Decoded user_id: {user_id}")
-
-        if user_id is None:
-            print("[DEBUG get_current_user] user_id is None!")
-            raise credentials_exception
-
-        user_id = int(user_id)
-        role_ids = payload.get("role_ids", {})
-        print(f"[DEBUG get_current_user] User ID: {user_id}, Role IDs: {role_ids}")
-
-    except (PyJWTError, ValueError) as e:
-        print(f"[DEBUG get_current_user] JWT decode error: {e}")
-        raise credentials_exception
-
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, first_name, father_name, grandfather_name, email, phone, roles, active_role
-                FROM users WHERE id = %s
-            """, (user_id,))
-            row = cur.fetchone()
-
-            if not row:
-                raise credentials_exception
-
-            return {
-                "id": row['id'],
-                "first_name": row['first_name'],
-                "father_name": row['father_name'],
-                "grandfather_name": row['grandfather_name'],
-                "email": row['email'],
-                "phone": row['phone'],
-                "roles": row['roles'] if isinstance(row['roles'], list) else [],
-                "active_role": row['active_role'],
-                "role_ids": role_ids
-            }
-
-
 # ============================================
 # PYDANTIC SCHEMAS
 # ============================================
@@ -205,10 +149,10 @@ class LinkedParentResponse(BaseModel):
 # ============================================
 
 @router.get("/api/users/search", response_model=List[UserSearchResult])
-async def search_users(
+def search_users(
     q: str,
     limit: int = 10,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Search for users by name, email, or phone.
@@ -265,9 +209,9 @@ async def search_users(
 # ============================================
 
 @router.post("/api/student/invite-parent")
-async def invite_existing_parent(
+def invite_existing_parent(
     request: InviteExistingUserRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Invite an existing user to be a parent.
@@ -427,6 +371,7 @@ async def invite_existing_parent(
                 ))
 
             conn.commit()
+            invalidate_user_context(request.target_user_id)
 
     # Send OTP via email to existing user
     email_sent = False
@@ -451,9 +396,9 @@ async def invite_existing_parent(
 
 
 @router.post("/api/student/invite-new-parent")
-async def invite_new_parent(
+def invite_new_parent(
     request: InviteNewUserRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Invite a NEW user (not in system) as parent.
@@ -627,8 +572,8 @@ async def invite_new_parent(
 
 
 @router.get("/api/student/parent-invitations")
-async def get_student_invitations(
-    current_user: dict = Depends(get_current_user)
+def get_student_invitations(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """Get all parent invitations sent by current student (both existing and new users)"""
     if "student" not in current_user['roles']:
@@ -695,8 +640,8 @@ async def get_student_invitations(
 
 
 @router.get("/api/parent/pending-invitations")
-async def get_parent_pending_invitations(
-    current_user: dict = Depends(get_current_user)
+def get_parent_pending_invitations(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get all pending invitations for current user to accept/reject.
@@ -835,10 +780,10 @@ async def get_parent_pending_invitations(
 
 
 @router.get("/api/parent/sent-invitations")
-async def get_parent_sent_invitations(
+def get_parent_sent_invitations(
     status: Optional[str] = None,
     inviter_type: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get all invitations sent by the current user (inviting others to be parents).
@@ -907,9 +852,9 @@ async def get_parent_sent_invitations(
 
 
 @router.delete("/api/parent/cancel-invitation/{invitation_id}")
-async def cancel_parent_invitation(
+def cancel_parent_invitation(
     invitation_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Cancel a pending invitation that the current user sent.
@@ -944,10 +889,10 @@ async def cancel_parent_invitation(
 
 
 @router.post("/api/parent/respond-invitation/{invitation_id}")
-async def respond_to_invitation(
+def respond_to_invitation(
     invitation_id: int,
     accept: bool,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Accept or reject a parent invitation.
@@ -1078,6 +1023,7 @@ async def respond_to_invitation(
                 """, (datetime.utcnow(), invitation_id))
 
                 conn.commit()
+                invalidate_user_context(current_user['id'])
                 return {"message": message, "status": "accepted", "role_added": role_added, "requested_as": requested_as}
             else:
                 # Reject invitation
@@ -1099,9 +1045,9 @@ class AcceptInvitationWithOTPRequest(BaseModel):
 
 
 @router.post("/api/parent/accept-invitation-otp")
-async def accept_invitation_with_otp(
+def accept_invitation_with_otp(
     request: AcceptInvitationWithOTPRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Accept a parent invitation with OTP verification.
@@ -1211,6 +1157,7 @@ async def accept_invitation_with_otp(
             """, (otp_record['id'],))
 
             conn.commit()
+            invalidate_user_context(current_user['id'])
 
     return {
         "message": "Invitation accepted successfully! You are now linked as this student's parent.",
@@ -1220,8 +1167,8 @@ async def accept_invitation_with_otp(
 
 
 @router.get("/api/student/linked-parents")
-async def get_linked_parents(
-    current_user: dict = Depends(get_current_user)
+def get_linked_parents(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get all parents linked to current student.
@@ -1274,9 +1221,9 @@ async def get_linked_parents(
 
 
 @router.delete("/api/student/unlink-parent/{parent_profile_id}")
-async def unlink_parent(
+def unlink_parent(
     parent_profile_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Remove a parent from student's linked parents.
@@ -1323,7 +1270,7 @@ async def unlink_parent(
 # ============================================
 
 @router.get("/api/parent/invitation/{token}")
-async def get_invitation_by_token(token: str):
+def get_invitation_by_token(token: str):
     """
     Get invitation details by invitation token.
     This is used when a new parent clicks the invitation link in their email.
@@ -1403,7 +1350,7 @@ class OTPLoginRequest(BaseModel):
 
 
 @router.post("/api/parent/otp-login")
-async def login_with_otp(
+def login_with_otp(
     request: OTPLoginRequest
 ):
     """
@@ -1577,9 +1524,9 @@ async def login_with_otp(
 
 
 @router.post("/api/parent/change-temp-password")
-async def change_temp_password(
+def change_temp_password(
     new_password: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Allow parent to change their temporary password after first login.
@@ -1592,5 +1539,6 @@ async def change_temp_password(
             cur.execute("UPDATE users SET password_hash = %s WHERE id = %s",
                        (hash_password(new_password), current_user['id']))
             conn.commit()
+            invalidate_user_context(current_user['id'])
 
     return {"message": "Password changed successfully"}
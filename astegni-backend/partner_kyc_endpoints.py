@@ -25,6 +25,7 @@ from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from pydantic import BaseModel
 from fastapi import APIRouter, HTTPException, Form
@@ -35,6 +36,7 @@ from kyc_endpoints import (
     detect_blink_in_frame, detect_smile_in_frame, detect_head_turn_in_frames,
     save_image_to_storage,
 )
+from kyc_pipeline import pipeline as kyc_pipeline
 
 load_dotenv()
 
@@ -46,7 +48,7 @@ FACE_MATCH_THRESHOLD = 0.6
 
 
 def _conn():
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 
 def _now():
@@ -99,7 +101,7 @@ class LivelinessRequest(BaseModel):
 
 
 @router.get("/{request_id}/status")
-async def kyc_status(request_id: int):
+def kyc_status(request_id: int):
     with _conn() as conn, conn.cursor() as cur:
         _get_request(cur, request_id)
         cur.execute(
@@ -116,7 +118,7 @@ async def kyc_status(request_id: int):
 
 
 @router.post("/{request_id}/upload-document")
-async def upload_document(request_id: int, image: str = Form(...)):
+def upload_document(request_id: int, image: str = Form(...)):
     """Upload the applicant's ID photo. The image must contain a detectable face."""
     image_bytes = _decode(image)
     face = detect_face_in_image(image_bytes)
@@ -127,6 +129,7 @@ async def upload_document(request_id: int, image: str = Form(...)):
         _get_request(cur, request_id)
         v = _get_or_create_verification(cur, request_id)
         url = save_image_to_storage(image_bytes, request_id, "document")
+        kyc_pipeline.prefetch_document(image_bytes)
         cur.execute(
             """UPDATE partner_kyc_verifications
                SET document_image_url=%s, document_verified=TRUE,
@@ -139,7 +142,7 @@ async def upload_document(request_id: int, image: str = Form(...)):
 
 
 @router.post("/{request_id}/verify-liveliness")
-async def verify_liveliness(request_id: int, body: LivelinessRequest):
+def verify_liveliness(request_id: int, body: LivelinessRequest):
     """Run blink/smile/head-turn detection over the submitted frames."""
     if not body.frames:
         raise HTTPException(status_code=400, detail="No frames provided")
@@ -166,7 +169,7 @@ async def verify_liveliness(request_id: int, body: LivelinessRequest):
 
 
 @router.post("/{request_id}/upload-selfie")
-async def upload_selfie(request_id: int, image: str = Form(...)):
+def upload_selfie(request_id: int, image: str = Form(...)):
     """Compare the selfie against the stored ID face; finalize KYC status."""
     selfie_bytes = _decode(image)
 
@@ -7,6 +7,7 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from typing import Optional, List
 import json
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 import os
 from datetime import datetime
@@ -133,7 +134,7 @@ async def create_partner_request(
         ownership_proof_url = await _upload_to_b2(ownership_proof, "company_document", DOC_EXTENSIONS, slug)
         proposal_url = await _upload_to_b2(proposal, "company_document", ALLOWED_EXTENSIONS, slug)
 
-        with psycopg.connect(DATABASE_URL) as conn:
+        with pooled_connect(DATABASE_URL) as conn:
             with conn.cursor() as cur:
                 cur.execute("""
                     INSERT INTO partner_requests (
@@ -179,7 +180,7 @@ async def create_partner_request(
 
 
 @router.get("/api/partner-requests")
-async def get_partner_requests(
+def get_partner_requests(
     status: Optional[str] = None,
     partnership_type: Optional[str] = None,
     page: int = 1,
@@ -236,7 +237,7 @@ async def get_partner_requests(
             count_query += " AND partnership_type = %s"
             count_params.append(partnership_type)
 
-        with psycopg.connect(DATABASE_URL) as conn:
+        with pooled_connect(DATABASE_URL) as conn:
             with conn.cursor() as cur:
                 # Get requests
                 cur.execute(query, params)
@@ -281,11 +282,11 @@ async def get_partner_requests(
 
 
 @router.get("/api/partner-requests/{request_id}")
-async def get_partner_request(request_id: int):
+def get_partner_request(request_id: int):
     """Get a specific partnership request by ID"""
 
     try:
-        with psycopg.connect(DATABASE_URL) as conn:
+        with pooled_connect(DATABASE_URL) as conn:
             with conn.cursor() as cur:
                 cur.execute("""
                     SELECT id, company_name, contact_person, emails, phones,
@@ -3,23 +3,19 @@ Payment Processing Endpoints
 Handles payment processing for subscriptions and bookings
 """
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, Field
 from typing import Optional, List, Literal
 from datetime import datetime, date
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
 from dotenv import load_dotenv
 import os
-import jwt
-from jwt import PyJWTError
 
 load_dotenv()
 DATABASE_URL = os.getenv('DATABASE_URL')
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 router = APIRouter(tags=["payments"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # ============================================
 # AUTHENTICATION
@@ -30,50 +26,8 @@ def get_db_connection():
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise HTTPException(status_code=500, detail="Database URL not configured")
-    return psycopg.connect(database_url)
+    return pooled_connect(database_url)
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current user from JWT token"""
-    credentials_exception = HTTPException(
-        status_code=401,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-        user_id = int(user_id)
-    except (PyJWTError, ValueError):
-        raise credentials_exception
-
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    try:
-        cur.execute("""
-            SELECT id, first_name, father_name, email, roles, active_role
-            FROM users
-            WHERE id = %s
-        """, (user_id,))
-
-        row = cur.fetchone()
-        if not row:
-            raise credentials_exception
-
-        return {
-            "id": row[0],
-            "first_name": row[1],
-            "father_name": row[2],
-            "email": row[3],
-            "roles": row[4] if isinstance(row[4], list) else [],
-            "active_role": row[5]
-        }
-    finally:
-        cur.close()
-        conn.close()
 
 # ============================================
 # PYDANTIC MODELS
@@ -97,9 +51,9 @@ class PaymentResponse(BaseModel):
 # ============================================
 
 @router.post("/api/payments/process", response_model=PaymentResponse)
-async def process_payment(
+def process_payment(
     payment_request: ProcessPaymentRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Process payment for a subscription or booking
@@ -186,8 +140,8 @@ async def process_payment(
 
 
 @router.get("/api/payments/history")
-async def get_payment_history(
-    current_user: dict = Depends(get_current_user)
+def get_payment_history(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get payment history for current user
@@ -270,8 +224,8 @@ async def get_payment_history(
 
 
 @router.get("/api/payments/overdue")
-async def get_overdue_payments(
-    current_user: dict = Depends(get_current_user)
+def get_overdue_payments(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get overdue payments for current user
@@ -331,9 +285,9 @@ async def get_overdue_payments(
 
 
 @router.get("/api/payments/enrollment/{enrollment_id}")
-async def get_enrollment_payment(
+def get_enrollment_payment(
     enrollment_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get payment details for a specific enrollment
@@ -76,7 +76,7 @@ async def get_available_providers():
 
 
 @router.get("", response_model=List[PaymentMethodResponse])
-async def get_payment_methods(
+def get_payment_methods(
     method_type: Optional[str] = Query(None, description="Filter by method type"),
     is_active: bool = Query(True, description="Filter by active status"),
     current_user: User = Depends(get_current_user),
@@ -103,7 +103,7 @@ async def get_payment_methods(
 
 
 @router.get("/primary", response_model=Optional[PaymentMethodResponse])
-async def get_primary_payment_method(
+def get_primary_payment_method(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -118,7 +118,7 @@ async def get_primary_payment_method(
 
 
 @router.get("/{payment_method_id}", response_model=PaymentMethodResponse)
-async def get_payment_method(
+def get_payment_method(
     payment_method_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -136,7 +136,7 @@ async def get_payment_method(
 
 
 @router.post("", response_model=PaymentMethodResponse)
-async def create_payment_method(
+def create_payment_method(
     payment_data: PaymentMethodCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -198,7 +198,7 @@ async def create_payment_method(
 
 
 @router.put("/{payment_method_id}", response_model=PaymentMethodResponse)
-async def update_payment_method(
+def update_payment_method(
     payment_method_id: int,
     payment_data: PaymentMethodUpdate,
     current_user: User = Depends(get_current_user),
@@ -236,7 +236,7 @@ async def update_payment_method(
 
 
 @router.delete("/{payment_method_id}")
-async def delete_payment_method(
+def delete_payment_method(
     payment_method_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -260,7 +260,7 @@ async def delete_payment_method(
 
 
 @router.post("/{payment_method_id}/set-primary")
-async def set_primary_payment_method(
+def set_primary_payment_method(
     payment_method_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -295,7 +295,7 @@ async def set_primary_payment_method(
 # ==========================================
 
 @router.post("/{payment_method_id}/verify")
-async def verify_payment_method(
+def verify_payment_method(
     payment_method_id: int,
     status: str = Query(..., description="verified or rejected"),
     notes: Optional[str] = Query(None, description="Verification notes"),
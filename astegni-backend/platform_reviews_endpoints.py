@@ -9,6 +9,7 @@ from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 from utils import get_current_user
 import os
@@ -27,7 +28,7 @@ router = APIRouter()
 
 def get_admin_db():
     """Get admin database connection"""
-    return psycopg.connect(ADMIN_DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(ADMIN_DATABASE_URL, row_factory=dict_row)
 
 
 # ============================================
@@ -48,7 +49,7 @@ class PlatformReviewCreate(BaseModel):
 # ============================================
 
 @router.post("/api/platform-reviews/submit")
-async def submit_platform_review(
+def submit_platform_review(
     review: PlatformReviewCreate,
     current_user = Depends(get_current_user)
 ):
@@ -162,7 +163,7 @@ async def submit_platform_review(
 
 
 @router.get("/api/platform-reviews/my-review")
-async def get_my_platform_review(
+def get_my_platform_review(
     current_user = Depends(get_current_user)
 ):
     """
@@ -205,7 +206,7 @@ async def get_my_platform_review(
 
 
 @router.get("/api/platform-reviews/stats")
-async def get_platform_review_stats():
+def get_platform_review_stats():
     """
     Get aggregated statistics for Astegni platform reviews
     """
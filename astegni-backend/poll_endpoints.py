@@ -7,8 +7,8 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, timezone
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg.rows import dict_row
+from db_pool import pooled_connect
 import os
 from dotenv import load_dotenv
 
@@ -27,7 +27,7 @@ else:
 
 def get_db_connection():
     """Get database connection."""
-    return psycopg2.connect(db_url, cursor_factory=RealDictCursor)
+    return pooled_connect(db_url, row_factory=dict_row)
 
 
 # Pydantic models
@@ -167,7 +167,7 @@ def check_poll_ended(poll_id: int, conn) -> bool:
 # API Endpoints
 
 @router.post("", response_model=dict)
-async def create_poll(
+def create_poll(
     poll: PollCreate,
     user_id: int = Query(...),
     profile_id: int = Query(...),
@@ -353,7 +353,7 @@ def get_poll_data(poll_id: int, profile_id: int, conn=None):
 
 
 @router.get("/{poll_id}", response_model=dict)
-async def get_poll(
+def get_poll(
     poll_id: int,
     profile_id: int = Query(...),
     profile_type: str = Query(...)
@@ -366,7 +366,7 @@ async def get_poll(
 
 
 @router.get("/conversation/{conversation_id}", response_model=dict)
-async def get_conversation_polls(
+def get_conversation_polls(
     conversation_id: int,
     profile_id: int = Query(...),
     profile_type: str = Query(...)
@@ -401,7 +401,7 @@ async def get_conversation_polls(
 
 
 @router.post("/{poll_id}/vote", response_model=dict)
-async def vote_on_poll(
+def vote_on_poll(
     poll_id: int,
     vote: PollVote,
     user_id: int = Query(...),
@@ -490,7 +490,7 @@ async def vote_on_poll(
 
 
 @router.delete("/{poll_id}/vote", response_model=dict)
-async def remove_vote(
+def remove_vote(
     poll_id: int,
     option_id: int = Query(...),
     profile_id: int = Query(...),
@@ -527,7 +527,7 @@ async def remove_vote(
 
 
 @router.put("/{poll_id}/end", response_model=dict)
-async def end_poll(
+def end_poll(
     poll_id: int,
     profile_id: int = Query(...),
     profile_type: str = Query(...)
@@ -571,7 +571,7 @@ async def end_poll(
 
 
 @router.delete("/{poll_id}", response_model=dict)
-async def delete_poll(
+def delete_poll(
     poll_id: int,
     profile_id: int = Query(...),
     profile_type: str = Query(...)
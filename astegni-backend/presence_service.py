@@ -0,0 +1,122 @@
+"""
+presence_service.py - Coalesced is_online / last_seen writes for websocket_manager
+
+Connect and disconnect only record the change in memory. A background task
+flushes everything pending to the profile tables every PRESENCE_FLUSH_INTERVAL
+seconds, with one multi-row UPDATE per table. A client that reconnects ten
+times in one interval costs one row write instead of twenty.
+
+Who is online is answered by ConnectionManager (live sockets and the
+backplane), not by the profile tables. The is_online/last_seen columns are
+a persisted copy that can lag by up to one flush interval.
+
+Started and stopped with the manager (app.py lifespan). stop() flushes
+whatever is still pending, so it must run before the async pools close.
+"""
+
+import asyncio
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from db_pool import async_connection
+
+PRESENCE_FLUSH_INTERVAL = float(os.getenv("PRESENCE_FLUSH_INTERVAL", 5))
+
+PROFILE_TABLES = {
+    "tutor": "tutor_profiles",
+    "student": "student_profiles",
+    "parent": "parent_profiles",
+    "advertiser": "advertiser_profiles"
+}
+
+ProfileKey = Tuple[str, int]
+
+
+class PresenceService:
+    """Pending presence changes per profile, flushed in batches"""
+
+    def __init__(self, flush_interval: float = PRESENCE_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        # (profile_type, profile_id) -> (is_online, monotonic time of the change)
+        self._pending: Dict[ProfileKey, Tuple[bool, float]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.stats = {"changes": 0, "coalesced": 0, "flushes": 0, "rows_written": 0}
+
+    def mark(self, profile_type: str, profile_id: int, is_online: bool):
+        """Record a presence change; the latest change per profile wins"""
+        if profile_type not in PROFILE_TABLES:
+            print(f"⚠️ Unknown profile type: {profile_type}")
+            return
+        key = (profile_type, profile_id)
+        self.stats["changes"] += 1
+        if key in self._pending:
+            self.stats["coalesced"] += 1
+        self._pending[key] = (is_online, time.monotonic())
+
+    def pending_last_seen(self, profile_type: str, profile_id: int) -> Optional[datetime]:
+        """last_seen (UTC) of a change not flushed yet, else None - the table is current"""
+        pending = self._pending.get((profile_type, profile_id))
+        if pending is None:
+            return None
+        return datetime.utcnow() - timedelta(seconds=time.monotonic() - pending[1])
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"❌ Final presence flush failed ({len(self._pending)} profiles): {e}")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Presence flush failed, retrying next interval: {e}")
+
+    async def flush(self) -> int:
+        """Write all pending changes - one UPDATE ... FROM unnest(...) per profile table"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+
+            by_table = defaultdict(lambda: ([], [], []))
+            now = time.monotonic()
+            for (profile_type, profile_id), (is_online, changed_at) in batch.items():
+                ids, flags, ages = by_table[PROFILE_TABLES[profile_type]]
+                ids.append(profile_id)
+                flags.append(is_online)
+                ages.append(now - changed_at)
+
+            try:
+                async with async_connection("user") as conn:
+                    for table_name, (ids, flags, ages) in by_table.items():
+                        # last_seen keeps the database clock (NOW()), backdated to when the change happened
+                        await conn.execute(f"""
+                            UPDATE {table_name} AS p
+                            SET is_online = v.is_online,
+                                last_seen = NOW() - make_interval(secs => v.age)
+                            FROM unnest(%s::int[], %s::bool[], %s::float8[]) AS v(id, is_online, age)
+                            WHERE p.id = v.id
+                        """, (ids, flags, ages))
+            except Exception:
+                # Put the batch back unless a newer change arrived meanwhile
+                for key, value in batch.items():
+                    self._pending.setdefault(key, value)
+                raise
+
+            self.stats["flushes"] += 1
+            self.stats["rows_written"] += len(batch)
+            return len(batch)
@@ -13,6 +13,7 @@ import json
 import sys
 import os
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -44,7 +45,7 @@ def get_db_connection():
         port = "5432"
 
     # Connect
-    return psycopg.connect(
+    return pooled_connect(
         dbname=db_name,
         user=user,
         password=password,
@@ -93,7 +94,7 @@ router = APIRouter(prefix="/api/admin/pricing", tags=["pricing"])
 
 # Payment Gateway Endpoints
 @router.get("/payment-gateways")
-async def get_payment_gateways():
+def get_payment_gateways():
     """Get all payment gateway configurations"""
     conn = None
     try:
@@ -133,7 +134,7 @@ async def get_payment_gateways():
             conn.close()
 
 @router.post("/payment-gateways")
-async def save_payment_gateway(gateway: PaymentGatewayConfig):
+def save_payment_gateway(gateway: PaymentGatewayConfig):
     """Save or update payment gateway configuration"""
     conn = None
     try:
@@ -198,7 +199,7 @@ async def save_payment_gateway(gateway: PaymentGatewayConfig):
             conn.close()
 
 @router.delete("/payment-gateways/{gateway_id}")
-async def delete_payment_gateway(gateway_id: int):
+def delete_payment_gateway(gateway_id: int):
     """Delete a payment gateway by ID"""
     conn = None
     try:
@@ -243,7 +244,7 @@ async def delete_payment_gateway(gateway_id: int):
 
 # Verification Pricing Endpoints
 @router.get("/verification-tiers")
-async def get_verification_pricing():
+def get_verification_pricing():
     """Get all verification pricing tiers"""
     conn = None
     try:
@@ -277,7 +278,7 @@ async def get_verification_pricing():
             conn.close()
 
 @router.post("/verification-tiers")
-async def save_verification_pricing(tier: VerificationPricing):
+def save_verification_pricing(tier: VerificationPricing):
     """Save or update verification pricing tier"""
     conn = None
     try:
@@ -340,7 +341,7 @@ async def save_verification_pricing(tier: VerificationPricing):
 
 # Subscription Tiers Endpoints
 @router.get("/subscription-tiers")
-async def get_subscription_tiers():
+def get_subscription_tiers():
     """Get all subscription tiers"""
     conn = None
     try:
@@ -374,7 +375,7 @@ async def get_subscription_tiers():
             conn.close()
 
 @router.post("/subscription-tiers")
-async def save_subscription_tier(tier: SubscriptionTier):
+def save_subscription_tier(tier: SubscriptionTier):
     """Save or update subscription tier"""
     conn = None
     try:
@@ -442,7 +443,7 @@ async def save_subscription_tier(tier: SubscriptionTier):
 
 # Affiliate Settings Endpoints
 @router.get("/affiliate-settings")
-async def get_affiliate_settings():
+def get_affiliate_settings():
     """Get affiliate program settings"""
     conn = None
     try:
@@ -497,7 +498,7 @@ async def get_affiliate_settings():
             conn.close()
 
 @router.post("/affiliate-settings")
-async def save_affiliate_settings(settings: AffiliateSettings):
+def save_affiliate_settings(settings: AffiliateSettings):
     """Save affiliate program settings"""
     conn = None
     try:
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime, timedelta
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 import os
 from dotenv import load_dotenv
@@ -66,12 +67,12 @@ class QuizSubmission(BaseModel):
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 # ========== QUIZ ENDPOINTS ==========
 
 @router.post("/api/quiz/create")
-async def create_quiz(quiz_data: QuizCreate, current_user: User = Depends(get_current_user)):
+def create_quiz(quiz_data: QuizCreate, current_user: User = Depends(get_current_user)):
     """Create a new quiz"""
     try:
         tutor_id = current_user.id
@@ -133,7 +134,7 @@ async def create_quiz(quiz_data: QuizCreate, current_user: User = Depends(get_cu
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/quiz/tutor/list")
-async def get_tutor_quizzes(current_user: User = Depends(get_current_user)):
+def get_tutor_quizzes(current_user: User = Depends(get_current_user)):
     """Get all quizzes created by the tutor"""
     try:
         tutor_id = current_user.id
@@ -174,7 +175,7 @@ async def get_tutor_quizzes(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/quiz/{quiz_id}")
-async def get_quiz_details(quiz_id: str, current_user: User = Depends(get_current_user)):
+def get_quiz_details(quiz_id: str, current_user: User = Depends(get_current_user)):
     """Get quiz details with questions"""
     try:
         conn = get_db_connection()
@@ -229,7 +230,7 @@ async def get_quiz_details(quiz_id: str, current_user: User = Depends(get_curren
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/api/quiz/{quiz_id}")
-async def update_quiz(quiz_id: str, quiz_data: QuizUpdate, current_user: User = Depends(get_current_user)):
+def update_quiz(quiz_id: str, quiz_data: QuizUpdate, current_user: User = Depends(get_current_user)):
     """Update an existing quiz"""
     try:
         tutor_id = current_user.id
@@ -319,7 +320,7 @@ async def update_quiz(quiz_id: str, quiz_data: QuizUpdate, current_user: User =
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/api/quiz/{quiz_id}")
-async def delete_quiz(quiz_id: str, current_user: User = Depends(get_current_user)):
+def delete_quiz(quiz_id: str, current_user: User = Depends(get_current_user)):
     """Delete a quiz"""
     try:
         tutor_id = current_user.id
@@ -356,7 +357,7 @@ async def delete_quiz(quiz_id: str, current_user: User = Depends(get_current_use
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/quiz/student/list")
-async def get_student_quizzes(current_user: User = Depends(get_current_user)):
+def get_student_quizzes(current_user: User = Depends(get_current_user)):
     """Get all quizzes assigned to the student"""
     try:
         student_id = current_user.id
@@ -397,7 +398,7 @@ async def get_student_quizzes(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/api/quiz/submit")
-async def submit_quiz(submission: QuizSubmission, current_user: User = Depends(get_current_user)):
+def submit_quiz(submission: QuizSubmission, current_user: User = Depends(get_current_user)):
     """Submit quiz answers"""
     try:
         student_id = current_user.id
@@ -35,7 +35,7 @@ def generate_referral_code(user_id: int, profile_type: str, db: Session) -> str:
 
 
 @router.get("/my-code", response_model=ReferralCodeResponse)
-async def get_my_referral_code(
+def get_my_referral_code(
     profile_type: str,
     request: Request,
     db: Session = Depends(get_db),
@@ -94,7 +94,7 @@ async def get_my_referral_code(
 
 
 @router.get("/referrer-info/{referral_code}")
-async def get_referrer_info(referral_code: str, db: Session = Depends(get_db)):
+def get_referrer_info(referral_code: str, db: Session = Depends(get_db)):
     """
     Public endpoint: get basic referrer info by referral code.
     Used on the landing page to show 'You were invited by X' message.
@@ -121,7 +121,7 @@ async def get_referrer_info(referral_code: str, db: Session = Depends(get_db)):
 
 
 @router.post("/track-click")
-async def track_referral_click(
+def track_referral_click(
     referral_code: str,
     request: Request,
     db: Session = Depends(get_db)
@@ -154,7 +154,7 @@ async def track_referral_click(
 
 
 @router.post("/register-referral")
-async def register_referral(
+def register_referral(
     referral_code: str,
     referred_user_id: int,
     db: Session = Depends(get_db)
@@ -220,7 +220,7 @@ async def register_referral(
 
 
 @router.get("/my-referrals", response_model=List[ReferredUserResponse])
-async def get_my_referrals(
+def get_my_referrals(
     profile_type: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -254,7 +254,7 @@ async def get_my_referrals(
 
 
 @router.get("/stats", response_model=ReferralStatsResponse)
-async def get_referral_stats(
+def get_referral_stats(
     profile_type: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -321,7 +321,7 @@ async def get_referral_stats(
 
 
 @router.delete("/referral/{referral_id}")
-async def remove_referral(
+def remove_referral(
     referral_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
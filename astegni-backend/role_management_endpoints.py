@@ -17,6 +17,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'app.py modules'))
 from models import SessionLocal, User, StudentProfile, TutorProfile, ParentProfile, UserProfile, OTP
 from advertiser_models import AdvertiserProfile, AdvertiserSessionLocal
 from utils import get_current_user
+from user_context_cache import invalidate_user_context
 from datetime import datetime
 
 router = APIRouter()
@@ -58,7 +59,7 @@ def get_db():
 
 
 @router.post("/api/role/deactivate")
-async def deactivate_role(
+def deactivate_role(
     request: RoleActionRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -139,6 +140,7 @@ async def deactivate_role(
         user.active_role = None
 
     db.commit()
+    invalidate_user_context(user.id)
 
     # Get list of remaining active roles
     all_remaining_active_roles = []
@@ -185,7 +187,7 @@ async def deactivate_role(
 
 
 @router.delete("/api/role/remove")
-async def remove_role(
+def remove_role(
     request: RoleRemovalRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -311,6 +313,7 @@ async def remove_role(
         new_active_role = None
 
     db.commit()
+    invalidate_user_context(user.id)
 
     # Get list of all remaining ACTIVE roles
     all_remaining_active_roles = []
@@ -364,7 +367,7 @@ async def remove_role(
 
 
 @router.get("/api/role/deletion-status")
-async def get_role_deletion_status(
+def get_role_deletion_status(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -466,7 +469,7 @@ class RoleRestoreRequest(BaseModel):
 
 
 @router.post("/api/role/restore")
-async def restore_role(
+def restore_role(
     request: RoleRestoreRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -539,6 +542,7 @@ async def restore_role(
         )
 
     db.commit()
+    invalidate_user_context(user.id)
 
     return {
         "success": True,
@@ -14,9 +14,10 @@ from fastapi import (
     BackgroundTasks, WebSocket, Form, File, UploadFile, Query, Body, Header
 )
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc, func, text, cast, String
+from sqlalchemy import and_, or_, desc, func, text, case
 
 # Import models and utilities
 from models import *
@@ -31,9 +32,18 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from utils import *
 from config import *
 from advertiser_auth_endpoints import resolve_advertiser  # advertiser-token auth dependency
-from backblaze_service import get_backblaze_service  # Import Backblaze service
+from backblaze_service import PRIVATE_FILE_PREFIXES, get_backblaze_service  # Import Backblaze service
+from upload_spool import spool_upload  # Streamed request bodies for B2 uploads
+from b2_downloads import RangeNotSatisfiable, parse_range_header  # Streamed B2 downloads
 from admin_auth_endpoints import get_current_admin  # Import admin authentication
 from tutor_scoring import TutorScoringCalculator  # Import enhanced tutor scoring
+from tutor_ranking_index import smart_score_expression  # Materialized smart-ranking scores
+from tutor_search import search_filter as tutor_search_filter, search_relevance, search_relevance_map  # Indexed tutor search
+from db_pool import pooled_connect  # Shared Postgres connection pools
+from user_context_cache import invalidate_user_context  # Cached get_current_user rows
+from ad_serving_index import invalidate_ad_index  # In-process ad placement index
+from tutor_availability_index import get_availability_index  # Interval index for "free at" search
+from availability_endpoints import parse_slot as parse_availability_slot
 
 # Create router
 router = APIRouter()
@@ -842,6 +852,7 @@ def login(
                 )
 
                 db.commit()
+                invalidate_user_context(user.id)
 
                 # Refresh user object
                 db.refresh(user)
@@ -1359,6 +1370,9 @@ def get_tutors(
     sort_by: Optional[str] = Query("smart"),  # Default to smart ranking
     search_history_ids: Optional[str] = Query(None),  # Comma-separated tutor IDs from search history
     user_location: Optional[str] = Query(None),  # Filter tutors by location matching user's location
+    available_date: Optional[date] = Query(None),  # "Free at" filter: YYYY-MM-DD ...
+    available_from: Optional[str] = Query(None),  # ... HH:MM ...
+    available_to: Optional[str] = Query(None),  # ... HH:MM (see tutor_availability_index.py)
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1401,78 +1415,9 @@ def get_tutors(
 
     # Apply filters
     if search:
-        search_lower = search.lower()
-
-        # Build subquery to find tutor IDs that have courses with matching tags/names
-        # tutor_packages.tutor_id -> tutor_packages.course_ids -> courses.tags/course_name
-        course_search_subquery = text("""
-            SELECT DISTINCT tp.tutor_id
-            FROM tutor_packages tp
-            JOIN courses c ON c.id = ANY(tp.course_ids)
-            WHERE c.status = 'verified'
-            AND tp.visibility = 'public'
-            AND (
-                c.tags::text ILIKE :search_pattern
-                OR c.course_name ILIKE :search_pattern
-                OR c.course_category ILIKE :search_pattern
-            )
-        """)
-
-        # Build subquery to find tutor IDs teaching at schools with matching names
-        # credentials.uploader_id (tutor profile ID) -> credentials.title (school name)
-        school_search_subquery = text("""
-            SELECT DISTINCT cr.uploader_id as tutor_id
-            FROM credentials cr
-            WHERE cr.uploader_role = 'tutor'
-            AND cr.document_type = 'experience'
-            AND cr.is_current = true
-            AND cr.title ILIKE :search_pattern
-        """)
-
-        # Additionally search schools table for verified schools
-        verified_school_search_subquery = text("""
-            SELECT DISTINCT cr.uploader_id as tutor_id
-            FROM credentials cr
-            JOIN schools s ON LOWER(cr.title) = LOWER(s.name)
-            WHERE cr.uploader_role = 'tutor'
-            AND cr.document_type = 'experience'
-            AND s.status = 'verified'
-            AND s.name ILIKE :search_pattern
-        """)
-
-        # Get tutor IDs that match course search
-        course_matching_tutor_ids = db.execute(
-            course_search_subquery,
-            {"search_pattern": f'%{search_lower}%'}
-        ).scalars().all()
-
-        # Get tutor IDs that match school search (from credentials)
-        school_matching_tutor_ids = db.execute(
-            school_search_subquery,
-            {"search_pattern": f'%{search_lower}%'}
-        ).scalars().all()
-
-        # Get tutor IDs that match verified school search
-        verified_school_matching_tutor_ids = db.execute(
-            verified_school_search_subquery,
-            {"search_pattern": f'%{search_lower}%'}
-        ).scalars().all()
-
-        # Combine all school matches
-        all_school_matching_tutor_ids = list(set(school_matching_tutor_ids) | set(verified_school_matching_tutor_ids))
-
-        search_filter = or_(
-            func.lower(User.first_name).contains(search_lower),
-            func.lower(User.father_name).contains(search_lower),
-            func.lower(User.location).contains(search_lower),  # From users table (migrated from tutor_profiles)
-            # Search in JSON arrays - languages (from users table)
-            cast(User.languages, String).ilike(f'%{search_lower}%'),
-            # Include tutors who have courses with matching tags/names
-            TutorProfile.id.in_(course_matching_tutor_ids) if course_matching_tutor_ids else False,
-            # Include tutors teaching at schools with matching names
-            TutorProfile.id.in_(all_school_matching_tutor_ids) if all_school_matching_tutor_ids else False
-        )
-        query = query.filter(search_filter)
+        # Indexed match on names, location, languages, course names/tags/categories
+        # and schools (tutor_search_documents, see tutor_search.py)
+        query = query.filter(tutor_search_filter(search))
 
     if gender:
         genders = [g.strip() for g in gender.split(',')]
@@ -1493,6 +1438,14 @@ def get_tutors(
             )
         )
 
+    # "Free at" filter - schedule covers the slot and no session is booked in it
+    if available_date and available_from and available_to:
+        free_tutor_ids = get_availability_index().free_tutors(
+            available_date, *parse_availability_slot(available_from, available_to)
+        )
+        print(f"[Availability Filter] {available_date} {available_from}-{available_to}: {len(free_tutor_ids)} free tutors")
+        query = query.filter(TutorProfile.id.in_(free_tutor_ids) if free_tutor_ids else False)
+
     # courseType, gradeLevel, sessionFormat filters removed - columns no longer exist
 
     # Price filter disabled - price column doesn't exist in tutor_profiles
@@ -1509,61 +1462,34 @@ def get_tutors(
     # if max_rating is not None:
     #     query = query.filter(TutorProfile.rating <= max_rating)
 
-    # Get total count for pagination (before sorting/limiting)
-    total = query.count()
-
-    # Get all tutors for smart ranking (we'll do pagination after sorting)
-    all_tutors = query.all()
-
-    # Apply exclusive session format filtering (v2.2)
+    # Apply exclusive session format filtering (v2.2) in SQL so the count and
+    # the SQL-paginated smart sort both see the filtered set.
     # Filter tutors who have ONLY the specified format (excluding hybrid tutors),
     # or for sessionFormat=Hybrid, tutors who have BOTH formats.
-    # Uses a single batched SQL query to avoid N+1.
-    if (sessionFormat and sessionFormatExclusive == "true") or sessionFormat == 'Hybrid':
-        tutor_ids = [t.id for t in all_tutors]
-        # Map of tutor_id -> set of distinct session_format values for active packages
-        formats_by_tutor = {}
-        if tutor_ids:
-            rows = db.execute(
-                text("""
-                    SELECT tutor_id, session_format
-                    FROM tutor_packages
-                    WHERE is_active = true
-                      AND visibility = 'public'
-                      AND tutor_id = ANY(:tutor_ids)
-                      AND session_format IS NOT NULL
-                      AND session_format != ''
-                """),
-                {"tutor_ids": tutor_ids}
-            ).fetchall()
-            for tutor_id, fmt in rows:
-                formats_by_tutor.setdefault(tutor_id, set()).add(fmt)
-
-        if sessionFormat == 'Hybrid':
-            print(f"[Hybrid Filter] Filtering for tutors with BOTH Online and In-person packages")
-            all_tutors = [
-                t for t in all_tutors
-                if 'Online' in formats_by_tutor.get(t.id, set())
-                and 'In-person' in formats_by_tutor.get(t.id, set())
-            ]
-            total = len(all_tutors)
-            print(f"[Hybrid Filter] Filtered to {total} hybrid tutors")
-        else:
-            print(f"[Exclusive Filter] Filtering for tutors with ONLY {sessionFormat} packages")
-            if sessionFormat == 'Online':
-                all_tutors = [
-                    t for t in all_tutors
-                    if 'Online' in formats_by_tutor.get(t.id, set())
-                    and 'In-person' not in formats_by_tutor.get(t.id, set())
-                ]
-            elif sessionFormat == 'In-person':
-                all_tutors = [
-                    t for t in all_tutors
-                    if 'In-person' in formats_by_tutor.get(t.id, set())
-                    and 'Online' not in formats_by_tutor.get(t.id, set())
-                ]
-            total = len(all_tutors)
-            print(f"[Exclusive Filter] Filtered to {total} tutors with ONLY {sessionFormat} packages")
+    def has_package_format(fmt: str, present: bool = True):
+        # fmt is one of the fixed literals below, never user input
+        return text(f"""
+            {'' if present else 'NOT '}EXISTS (
+                SELECT 1 FROM tutor_packages pf
+                WHERE pf.tutor_id = tutor_profiles.id
+                AND pf.is_active = true
+                AND pf.visibility = 'public'
+                AND pf.session_format = '{fmt}'
+            )
+        """)
+
+    if sessionFormat == 'Hybrid':
+        print(f"[Hybrid Filter] Filtering for tutors with BOTH Online and In-person packages")
+        query = query.filter(has_package_format('Online'), has_package_format('In-person'))
+    elif sessionFormat and sessionFormatExclusive == "true":
+        print(f"[Exclusive Filter] Filtering for tutors with ONLY {sessionFormat} packages")
+        if sessionFormat == 'Online':
+            query = query.filter(has_package_format('Online'), has_package_format('In-person', present=False))
+        elif sessionFormat == 'In-person':
+            query = query.filter(has_package_format('In-person'), has_package_format('Online', present=False))
+
+    # Get total count for pagination (before sorting/limiting)
+    total = query.count()
 
     # Parse search history IDs
     search_history_tutor_ids = []
@@ -1573,173 +1499,99 @@ def get_tutors(
         except:
             search_history_tutor_ids = []
 
+    offset = (page - 1) * limit
+
     # Apply smart ranking or traditional sorting
     if sort_by == "smart":
         # SMART RANKING ALGORITHM
-        import random
-        from datetime import datetime, timedelta
-
-        def calculate_tutor_score(tutor):
-            """
-            Calculate ranking score for each tutor based on multiple factors
-            Higher score = Higher priority in results
-
-            SCORING SYSTEM (subscription plan removed - rating is now primary,
-            to reward genuinely good tutors over paid placement):
-            - Rating (confidence-weighted): 0-500 points (PRIMARY, via TutorScoringCalculator)
-            - Experience: 0-300 points (SECOND: account age + credentials)
-            - Total Students: 0-200 points
-            - Completion Rate: 0-150 points
-            - Interest/Hobby Match: 0-120 points
-            - Trending Score: 0-100 points
-            - Response Time (package requests): -60 to +60 points (ignoring requests penalized)
-            - Search History: 0-50 points
-            - New Tutor Bonus: 0-50 points
-            - Verification: 0-25 points
-            - Combo Bonus (New + Search History): 0-60 points
-            - Payment Reliability: 0 to -300 points (penalty)
-            """
-            score = 0
-
-            # TRENDING SCORE (0-100 points) - POPULARITY BOOST
-            trending_score = getattr(tutor, 'trending_score', 0) or 0
-            search_count = getattr(tutor, 'search_count', 0) or 0
-
-            if trending_score > 0:
-                if trending_score >= 100:
-                    score += 100  # Maximum trending bonus
-                elif trending_score >= 50:
-                    score += 50 + (trending_score - 50)  # 50-100 points
-                else:
-                    score += trending_score  # 0-50 points
-
-                # Additional boost for very high search counts (viral tutors)
-                if search_count >= 1000:
-                    score += 50  # Viral tutor bonus
-                elif search_count >= 500:
-                    score += 25  # Very popular tutor bonus
-                elif search_count >= 100:
-                    score += 12  # Popular tutor bonus
-
-            # NEW: Calculate all new scoring factors using TutorScoringCalculator
-            try:
-                scoring_calculator = TutorScoringCalculator(db)
-
-                # Get student interests/hobbies if available (for interest matching)
-                student_interests = []
-                student_hobbies = []
-                # Note: student data passed from outer scope if available
-
-                new_scores, score_breakdown = scoring_calculator.calculate_all_new_scores(
-                    tutor_id=tutor.id,
-                    tutor_user_id=tutor.user_id,
-                    tutor_profile_created_at=tutor.created_at,
-                    student_interests=student_interests,
-                    student_hobbies=student_hobbies
-                )
-
-                score += new_scores
-
-                # Store breakdown for debugging
-                tutor._score_breakdown = score_breakdown
-
-            except Exception as e:
-                print(f"⚠️ Error calculating new scores for tutor {tutor.id}: {e}")
-                # Continue with base scoring if new scoring fails
-
-            # Check if tutor is in search history (50 points)
-            in_search_history = tutor.id in search_history_tutor_ids
-            if in_search_history:
-                score += 50
-
-            # Check if tutor is new (created within last 30 days) (30 points)
-            is_new = False
-            if tutor.created_at:
-                days_old = (datetime.utcnow() - tutor.created_at).days
-                if days_old <= 30:
-                    is_new = True
-                    score += 30
-                    # Bonus for very new tutors (created within 7 days)
-                    if days_old <= 7:
-                        score += 20
-
-            # COMBO BONUS
-            if is_new and in_search_history:
-                score += 60   # New + History combo
-
-            # Verification bonus (25 points)
-            if tutor.user.is_verified:
-                score += 25
-
-            return score
-
-        # Calculate scores for all tutors
-        tutors_with_scores = [(tutor, calculate_tutor_score(tutor)) for tutor in all_tutors]
-
-        # Sort by score (descending)
-        tutors_with_scores.sort(key=lambda x: x[1], reverse=True)
-
-        # Log top 5 tutors with scores for debugging
-        print(f"\n📊 Smart Ranking Results (Total: {len(tutors_with_scores)} tutors)")
-        print("   Top 5 tutors:")
-        for i, (tutor, score) in enumerate(tutors_with_scores[:5], 1):
-            rating_label = ""
-            breakdown = getattr(tutor, '_score_breakdown', None)
-            if breakdown and breakdown.get("rating"):
-                rd = breakdown["rating"]["details"]
-                rating_label = f"RATING({rd.get('avg_rating', 0)}★×{rd.get('review_count', 0)})"
-            basic_label = "BASIC" if (tutor.is_basic or False) else ""
-            new_label = "NEW" if tutor.created_at and (datetime.utcnow() - tutor.created_at).days <= 30 else ""
-            history_label = "HIST" if tutor.id in search_history_tutor_ids else ""
-            trending_count = getattr(tutor, 'search_count', 0) or 0
-            trending_label = f"TREND({trending_count})" if trending_count > 0 else ""
-            labels = f"{rating_label} {basic_label} {new_label} {history_label} {trending_label}".strip()
-            print(f"   {i}. {labels} Score: {score:.0f} - {tutor.user.first_name} {tutor.user.father_name}")
+        #
+        # Request-independent factors are materialized in tutor_ranking_index
+        # (refreshed in the background by tutor_ranking_index.py):
+        # - Rating (confidence-weighted): 0-500 points (PRIMARY, via TutorScoringCalculator)
+        # - Experience: 0-300 points (SECOND: account age + credentials)
+        # - Total Students: 0-200 points
+        # - Completion Rate: 0-150 points
+        # - Trending Score: 0-150 points
+        # - Response Time (package requests): -60 to +60 points (ignoring requests penalized)
+        # - Verification: 0-25 points
+        # - Payment Reliability: 0 to -300 points (penalty)
+        #
+        # Per-request boosts are added in SQL (smart_score_expression):
+        # - Search History: 0-50 points
+        # - New Tutor Bonus: 0-50 points
+        # - Combo Bonus (New + Search History): 0-60 points
+        # - Search Relevance: 0-100 points (with a search term, see tutor_search.py)
+        score_expr = smart_score_expression(
+            search_history_tutor_ids,
+            search_relevance(search) if search else None
+        )
+        smart_score = score_expr.label("smart_score")
+        ranked_query = query.outerjoin(
+            TutorRankingIndex, TutorRankingIndex.tutor_id == TutorProfile.id
+        )
+        # Tutor id breaks ties so pagination is stable between pages
+        smart_order = (score_expr.desc(), TutorProfile.id)
 
         # Apply shuffling with 80% probability on first page
         # This provides variety while maintaining general quality ranking
         shuffle_roll = random.random()
         should_shuffle = page == 1 and shuffle_roll < 0.8
 
-        if should_shuffle:
+        if should_shuffle and total > 0:
             print(f"🔀 SHUFFLING (roll: {shuffle_roll:.2f} < 0.80)")
 
             # Shuffle within tier groups to provide variety
             # Tier 1: Top 20% (Premium + Trending + Search History)
             # Tier 2: Next 30% (Standard + Some Trending)
             # Tier 3: Remaining 50% (Basic/Free tutors)
-
-            tier1_end = max(1, int(len(tutors_with_scores) * 0.2))
-            tier2_end = max(tier1_end + 1, int(len(tutors_with_scores) * 0.5))
-
-            tier1 = tutors_with_scores[:tier1_end]
-            tier2 = tutors_with_scores[tier1_end:tier2_end]
-            tier3 = tutors_with_scores[tier2_end:]
-
-            print(f"   Tier 1: {len(tier1)} tutors (top 20%)")
-            print(f"   Tier 2: {len(tier2)} tutors (next 30%)")
-            print(f"   Tier 3: {len(tier3)} tutors (bottom 50%)")
-
-            # Shuffle within each tier
-            random.shuffle(tier1)
-            random.shuffle(tier2)
-            random.shuffle(tier3)
-
-            # Recombine
-            tutors_with_scores = tier1 + tier2 + tier3
+            tier1_end = max(1, int(total * 0.2))
+            tier2_end = max(tier1_end + 1, int(total * 0.5))
+            print(f"   Tiers: top {tier1_end} / next {tier2_end - tier1_end} / remaining {max(total - tier2_end, 0)}")
+
+            ranked = ranked_query.with_entities(
+                TutorProfile.id.label("tutor_id"),
+                func.row_number().over(order_by=smart_order).label("rank")
+            ).subquery()
+            tier = case(
+                (ranked.c.rank <= tier1_end, 1),
+                (ranked.c.rank <= tier2_end, 2),
+                else_=3
+            )
+            page_ids = [
+                row.tutor_id for row in db.query(ranked.c.tutor_id)
+                .order_by(tier, func.random())
+                .limit(limit)
+                .all()
+            ]
+            scored_page = ranked_query.add_columns(smart_score).filter(
+                TutorProfile.id.in_(page_ids)
+            ).all() if page_ids else []
+            position = {tutor_id: i for i, tutor_id in enumerate(page_ids)}
+            scored_page.sort(key=lambda row: position[row[0].id])
             print(f"   ✓ Shuffled within tiers")
         else:
             if page == 1:
                 print(f"⏭️  NO SHUFFLE (roll: {shuffle_roll:.2f} >= 0.80)")
             else:
                 print(f"📄 Page {page} - no shuffle (only page 1 shuffles)")
+            scored_page = ranked_query.add_columns(smart_score).order_by(
+                *smart_order
+            ).offset(offset).limit(limit).all()
+
+        # Log the page with scores for debugging
+        print(f"\n📊 Smart Ranking Results (Total: {total} tutors, page {page})")
+        for i, (tutor, score) in enumerate(scored_page[:5], offset + 1):
+            new_label = "NEW" if tutor.created_at and (datetime.utcnow() - tutor.created_at).days <= 30 else ""
+            history_label = "HIST" if tutor.id in search_history_tutor_ids else ""
+            labels = f"{new_label} {history_label}".strip()
+            print(f"   {i}. {labels} Score: {score:.0f} - {tutor.user.first_name} {tutor.user.father_name}")
 
         # Extract just the tutors (without scores)
-        tutors = [tutor for tutor, score in tutors_with_scores]
+        tutors = [tutor for tutor, score in scored_page]
 
     else:
         # Traditional sorting for explicit sort requests
-        tutors = all_tutors
+        tutors = query.all()
 
         # Experience (students taught per active year), verified-credential counts,
         # and total-students are computed on demand for the relevant sorts.
@@ -1831,9 +1683,8 @@ def get_tutors(
         elif sort_by == "response_time":
             tutors.sort(key=lambda t: response_map.get(t.id, 9999.0))
 
-    # Apply pagination AFTER sorting
-    offset = (page - 1) * limit
-    tutors = tutors[offset:offset + limit]
+        # Apply pagination AFTER sorting
+        tutors = tutors[offset:offset + limit]
 
     # Get tutor IDs for batch fetching package data
     tutor_ids = [tutor.id for tutor in tutors]
@@ -2056,6 +1907,9 @@ def get_tutors_tiered(
     max_rating: Optional[float] = Query(None),
     sort_by: Optional[str] = Query(None),
     user_location: Optional[str] = Query(None),  # Filter tutors by location matching user's location
+    available_date: Optional[date] = Query(None),  # "Free at" filter: YYYY-MM-DD ...
+    available_from: Optional[str] = Query(None),  # ... HH:MM ...
+    available_to: Optional[str] = Query(None),  # ... HH:MM (see tutor_availability_index.py)
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -2079,6 +1933,7 @@ def get_tutors_tiered(
     - min/max_price: Filter by price range
     - min/max_rating: Filter by rating range
     - sort_by: Sort results (smart, rating, price, experience, newest, name, etc.)
+    - available_date + available_from/available_to: Only tutors free for that slot
 
     NOTE: Filters are applied AFTER tiering to maintain tier priority
     """
@@ -2142,77 +1997,9 @@ def get_tutors_tiered(
 
     # Apply search filter
     if search:
-        search_lower = search.lower()
         print(f"[Tiered - Search Filter] Searching for: {search}")
-
-        # Build subquery to find tutor IDs that have courses with matching tags/names
-        course_search_subquery = text("""
-            SELECT DISTINCT tp.tutor_id
-            FROM tutor_packages tp
-            JOIN courses c ON c.id = ANY(tp.course_ids)
-            WHERE c.status = 'verified'
-            AND tp.visibility = 'public'
-            AND (
-                c.tags::text ILIKE :search_pattern
-                OR c.course_name ILIKE :search_pattern
-                OR c.course_category ILIKE :search_pattern
-            )
-        """)
-
-        # Build subquery to find tutor IDs teaching at schools with matching names
-        school_search_subquery = text("""
-            SELECT DISTINCT cr.uploader_id as tutor_id
-            FROM credentials cr
-            WHERE cr.uploader_role = 'tutor'
-            AND cr.document_type = 'experience'
-            AND cr.is_current = true
-            AND cr.title ILIKE :search_pattern
-        """)
-
-        # Additionally search schools table for verified schools
-        verified_school_search_subquery = text("""
-            SELECT DISTINCT cr.uploader_id as tutor_id
-            FROM credentials cr
-            JOIN schools s ON LOWER(cr.title) = LOWER(s.name)
-            WHERE cr.uploader_role = 'tutor'
-            AND cr.document_type = 'experience'
-            AND s.status = 'verified'
-            AND s.name ILIKE :search_pattern
-        """)
-
-        # Get tutor IDs that match course search
-        course_matching_tutor_ids = db.execute(
-            course_search_subquery,
-            {"search_pattern": f'%{search_lower}%'}
-        ).scalars().all()
-
-        # Get tutor IDs that match school search (from credentials)
-        school_matching_tutor_ids = db.execute(
-            school_search_subquery,
-            {"search_pattern": f'%{search_lower}%'}
-        ).scalars().all()
-
-        # Get tutor IDs that match verified school search
-        verified_school_matching_tutor_ids = db.execute(
-            verified_school_search_subquery,
-            {"search_pattern": f'%{search_lower}%'}
-        ).scalars().all()
-
-        # Combine all school matches
-        all_school_matching_tutor_ids = list(set(school_matching_tutor_ids) | set(verified_school_matching_tutor_ids))
-
-        search_filter = or_(
-            func.lower(User.first_name).contains(search_lower),
-            func.lower(User.father_name).contains(search_lower),
-            func.lower(User.location).contains(search_lower),
-            # Search in JSON arrays - languages (from users table)
-            cast(User.languages, String).ilike(f'%{search_lower}%'),
-            # Include tutors who have courses with matching tags/names
-            TutorProfile.id.in_(course_matching_tutor_ids) if course_matching_tutor_ids else False,
-            # Include tutors teaching at schools with matching names
-            TutorProfile.id.in_(all_school_matching_tutor_ids) if all_school_matching_tutor_ids else False
-        )
-        query = query.filter(search_filter)
+        # Indexed match on the tutor search document (see tutor_search.py)
+        query = query.filter(tutor_search_filter(search))
 
     # Apply gender filter
     if gender:
@@ -2234,6 +2021,14 @@ def get_tutors_tiered(
             )
         )
 
+    # "Free at" filter - schedule covers the slot and no session is booked in it
+    if available_date and available_from and available_to:
+        free_tutor_ids = get_availability_index().free_tutors(
+            available_date, *parse_availability_slot(available_from, available_to)
+        )
+        print(f"[Tiered - Availability Filter] {available_date} {available_from}-{available_to}: {len(free_tutor_ids)} free tutors")
+        query = query.filter(TutorProfile.id.in_(free_tutor_ids) if free_tutor_ids else False)
+
     # Get all tutors for tiered ranking
     all_tutors = query.all()
     total = len(all_tutors)
@@ -2320,18 +2115,28 @@ def get_tutors_tiered(
     # Rating is the PRIMARY ranking factor (subscription plan removed) so genuinely
     # well-reviewed tutors rank highest. Confidence-weighted toward a 2★ baseline so
     # new/few-review tutors aren't unfairly buried or boosted by a single review.
-    tier_scoring_calculator = TutorScoringCalculator(db)
+    # Rating scores for every tutor come from one grouped query.
+    try:
+        rating_scores = TutorScoringCalculator(db).calculate_rating_scores_bulk(
+            [tutor.id for tutor in all_tutors]
+        )
+    except Exception as e:
+        print(f"⚠️ [Tiered] rating scores failed: {e}")
+        rating_scores = {}
+
+    # Search relevance points (0-100) for the search term (see tutor_search.py)
+    relevance_points = search_relevance_map(db, search, [tutor.id for tutor in all_tutors]) if search else {}
 
     def calculate_tier_score(tutor):
         """Calculate smart ranking score for tutors within their tier"""
         score = 0
 
         # Rating score (0-500) - PRIMARY FACTOR
-        try:
-            rating_score, _ = tier_scoring_calculator.calculate_rating_score(tutor.id)
-            score += rating_score
-        except Exception as e:
-            print(f"⚠️ [Tiered] rating score failed for tutor {tutor.id}: {e}")
+        if tutor.id in rating_scores:
+            score += rating_scores[tutor.id][0]
+
+        # Search relevance
+        score += relevance_points.get(tutor.id, 0)
 
         # Trending score
         trending_score = getattr(tutor, 'trending_score', 0) or 0
@@ -3242,12 +3047,13 @@ async def upload_profile_picture(
     db: Session = Depends(get_db)
 ):
     """Upload profile picture to Backblaze B2"""
+    spool = None
     try:
         from storage_service import StorageService
 
-        # Read file contents
-        contents = await file.read()
-        file_size_bytes = len(contents)
+        # Stream the body to memory / a temp file (hashed and sized on the way)
+        spool = await spool_upload(file)
+        file_size_bytes = spool.size
 
         # Validate storage limits based on subscription
         is_allowed, error_message = StorageService.validate_file_upload(
@@ -3296,8 +3102,9 @@ async def upload_profile_picture(
         b2_service = get_backblaze_service()
 
         # Upload using profile_id instead of user_id: images/profile/profile_{id}/
-        result = b2_service.upload_file(
-            file_data=contents,
+        result = await run_in_threadpool(
+            b2_service.upload_file,
+            file_data=spool,
             file_name=file.filename,
             file_type='profile',
             user_id=f"profile_{profile_id}"  # Using profile_id with 'profile_' prefix
@@ -3331,6 +3138,9 @@ async def upload_profile_picture(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if spool:
+            spool.close()
 
 @router.post("/api/upload/cover-image")
 async def upload_cover_image(
@@ -3339,12 +3149,13 @@ async def upload_cover_image(
     db: Session = Depends(get_db)
 ):
     """Upload cover image for profile (tutor, student, parent, advertiser, or user)"""
+    spool = None
     try:
         from storage_service import StorageService
 
-        # Read file contents
-        contents = await file.read()
-        file_size_bytes = len(contents)
+        # Stream the body to memory / a temp file (hashed and sized on the way)
+        spool = await spool_upload(file)
+        file_size_bytes = spool.size
 
         # Validate storage limits based on subscription
         is_allowed, error_message = StorageService.validate_file_upload(
@@ -3403,8 +3214,9 @@ async def upload_cover_image(
         b2_service = get_backblaze_service()
 
         # Upload using profile_id instead of user_id: images/cover/profile_{id}/
-        result = b2_service.upload_file(
-            file_data=contents,
+        result = await run_in_threadpool(
+            b2_service.upload_file,
+            file_data=spool,
             file_name=file.filename,
             file_type='cover',
             user_id=f"profile_{profile_id}"  # Using profile_id with 'profile_' prefix
@@ -3438,6 +3250,9 @@ async def upload_cover_image(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if spool:
+            spool.close()
 
 @router.post("/api/upload/story")
 async def upload_story(
@@ -3447,6 +3262,7 @@ async def upload_story(
     db: Session = Depends(get_db)
 ):
     """Upload story (image or video) - all roles can upload stories"""
+    spool = None
     try:
         from storage_service import StorageService
 
@@ -3455,9 +3271,9 @@ async def upload_story(
         print(f"📝 Caption type: {type(caption)}")
         print(f"📝 Caption length: {len(caption) if caption else 0}")
 
-        # Read file contents
-        contents = await file.read()
-        file_size_bytes = len(contents)
+        # Stream the body to memory / a temp file (hashed and sized on the way)
+        spool = await spool_upload(file)
+        file_size_bytes = spool.size
 
         # Determine file type (image or video)
         file_ext = file.filename.split('.')[-1].lower()
@@ -3513,8 +3329,9 @@ async def upload_story(
 
         # Upload using story type - videos go to videos/stories/, images go to images/stories/
         # Using profile_id for organization (one user can have multiple roles with separate stories)
-        result = b2_service.upload_file(
-            file_data=contents,
+        result = await run_in_threadpool(
+            b2_service.upload_file,
+            file_data=spool,
             file_name=file.filename,
             file_type='story_video' if is_video else 'story_image',
             user_id=f"profile_{profile_id}"  # Using profile_id with 'profile_' prefix
@@ -3567,6 +3384,9 @@ async def upload_story(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if spool:
+            spool.close()
 
 @router.get("/api/stories")
 def get_stories(
@@ -3651,7 +3471,7 @@ def increment_story_view(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/api/stories/{story_id}")
-async def delete_story(
+def delete_story(
     story_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -4040,7 +3860,7 @@ async def upload_multiple_images(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/api/upload/delete-file")
-async def delete_file_from_b2(
+def delete_file_from_b2(
     file_url: str = Body(..., embed=True),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -4068,6 +3888,41 @@ async def delete_file_from_b2(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Media that may be streamed through /api/files (the bucket is public; KYC images stay out)
+STREAMABLE_FILE_PREFIXES = ('images/', 'videos/', 'audio/')
+
+
+@router.get("/api/files/{file_path:path}")
+def stream_file(file_path: str, range: Optional[str] = Header(None)):
+    """Stream a media file from Backblaze B2 - supports Range requests for video seeking"""
+    if not file_path.startswith(STREAMABLE_FILE_PREFIXES) or file_path.startswith(PRIVATE_FILE_PREFIXES) \
+            or '..' in file_path.split('/'):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    b2_service = get_backblaze_service()
+    try:
+        download = b2_service.open_download(file_path, parse_range_header(range))
+    except RangeNotSatisfiable as e:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{e.size}"}
+        )
+
+    if download is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    headers = download.headers()
+    # Uploaded file names are timestamped, so a path never changes content
+    headers["Cache-Control"] = "public, max-age=86400"
+    return StreamingResponse(
+        download,
+        status_code=206 if download.partial else 200,
+        media_type=download.content_type,
+        headers=headers
+    )
+
+
 # ============================================
 # SYSTEM MEDIA UPLOAD ENDPOINTS
 # ============================================
@@ -4082,24 +3937,24 @@ async def upload_system_image(
     db: Session = Depends(get_db)
 ):
     """Upload system image to Backblaze B2 with system user_id"""
+    spool = None
     try:
         # Only admins can upload system images
         if "admin" not in current_user.roles and "super_admin" not in current_user.roles:
             raise HTTPException(status_code=403, detail="Only admins can upload system images")
 
-        # Validate file size based on image type
-        contents = await file.read()
+        # Validate file size based on image type (reading stops at the limit)
         max_size = 10 * 1024 * 1024  # 10MB default
         if image_type == 'favicon':
             max_size = 1 * 1024 * 1024  # 1MB for favicon
         elif image_type == 'logo':
             max_size = 5 * 1024 * 1024  # 5MB for logo
 
-        if len(contents) > max_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds {max_size / (1024*1024)}MB limit"
-            )
+        spool = await spool_upload(
+            file,
+            max_bytes=max_size,
+            too_large_detail=f"File size exceeds {max_size / (1024*1024)}MB limit"
+        )
 
         # Validate image type
         if not file.content_type or not file.content_type.startswith('image/'):
@@ -4116,8 +3971,9 @@ async def upload_system_image(
         admin_identifier = f"profile_{admin_profile.id}" if admin_profile else "admin_system"
 
         # Upload with admin profile_id for system-wide files
-        result = b2_service.upload_file(
-            file_data=contents,
+        result = await run_in_threadpool(
+            b2_service.upload_file,
+            file_data=spool,
             file_name=file.filename,
             file_type=image_type,
             user_id=admin_identifier  # Admin profile ID for platform-wide assets
@@ -4134,7 +3990,7 @@ async def upload_system_image(
             file_url=result['url'],
             title=title or f"{image_type.capitalize()} for {target}",
             file_name=result['fileName'],
-            file_size=len(contents),
+            file_size=spool.size,
             uploaded_by=current_user.id
         )
 
@@ -4155,6 +4011,9 @@ async def upload_system_image(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if spool:
+            spool.close()
 
 
 @router.post("/api/upload/system-video")
@@ -4170,6 +4029,8 @@ async def upload_system_video(
     db: Session = Depends(get_db)
 ):
     """Upload system video with thumbnail to Backblaze B2"""
+    video_spool = None
+    thumbnail_spool = None
     try:
         # Only admins can upload system videos
         if "admin" not in current_user.roles and "super_admin" not in current_user.roles:
@@ -4192,15 +4053,17 @@ async def upload_system_video(
         if video_type == 'ad' and not classification:
             raise HTTPException(status_code=400, detail="Ad classification is required for advertisements")
 
-        # Validate file sizes
-        video_contents = await file.read()
-        thumbnail_contents = await thumbnail.read()
-
-        if len(video_contents) > 200 * 1024 * 1024:  # 200MB
-            raise HTTPException(status_code=400, detail="Video size exceeds 200MB limit")
-
-        if len(thumbnail_contents) > 5 * 1024 * 1024:  # 5MB
-            raise HTTPException(status_code=400, detail="Thumbnail size exceeds 5MB limit")
+        # Validate file sizes (reading stops at the limit)
+        video_spool = await spool_upload(
+            file,
+            max_bytes=200 * 1024 * 1024,  # 200MB
+            too_large_detail="Video size exceeds 200MB limit"
+        )
+        thumbnail_spool = await spool_upload(
+            thumbnail,
+            max_bytes=5 * 1024 * 1024,  # 5MB
+            too_large_detail="Thumbnail size exceeds 5MB limit"
+        )
 
         # Validate file types
         if not file.content_type or not file.content_type.startswith('video/'):
@@ -4220,8 +4083,9 @@ async def upload_system_video(
         admin_identifier = f"profile_{admin_profile.id}" if admin_profile else "admin_system"
 
         # Upload video with admin profile_id
-        video_result = b2_service.upload_file(
-            file_data=video_contents,
+        video_result = await run_in_threadpool(
+            b2_service.upload_file,
+            file_data=video_spool,
             file_name=file.filename,
             file_type='ad_video' if video_type == 'ad' else 'video',
             user_id=admin_identifier  # Admin profile ID for platform-wide assets
@@ -4231,8 +4095,9 @@ async def upload_system_video(
             raise HTTPException(status_code=500, detail="Video upload failed")
 
         # Upload thumbnail with admin profile_id
-        thumbnail_result = b2_service.upload_file(
-            file_data=thumbnail_contents,
+        thumbnail_result = await run_in_threadpool(
+            b2_service.upload_file,
+            file_data=thumbnail_spool,
             file_name=thumbnail.filename,
             file_type='thumbnail',
             user_id=admin_identifier  # Admin profile ID for platform-wide assets
@@ -4240,7 +4105,7 @@ async def upload_system_video(
 
         if not thumbnail_result:
             # Clean up video if thumbnail fails
-            b2_service.delete_file(video_result['fileName'], video_result.get('fileId'))
+            await run_in_threadpool(b2_service.delete_file, video_result['fileName'], video_result.get('fileId'))
             raise HTTPException(status_code=500, detail="Thumbnail upload failed")
 
         # Create SystemMedia record
@@ -4254,7 +4119,7 @@ async def upload_system_video(
             title=title,
             description=description,
             file_name=video_result['fileName'],
-            file_size=len(video_contents),
+            file_size=video_spool.size,
             uploaded_by=current_user.id
         )
 
@@ -4280,10 +4145,15 @@ async def upload_system_video(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if video_spool:
+            video_spool.close()
+        if thumbnail_spool:
+            thumbnail_spool.close()
 
 
 @router.get("/api/system-media")
-async def get_system_media(
+def get_system_media(
     media_type: Optional[str] = Query(None),  # 'image' or 'video'
     file_type: Optional[str] = Query(None),
     target: Optional[str] = Query(None),
@@ -4349,7 +4219,7 @@ async def get_system_media(
 
 
 @router.delete("/api/system-media/{media_id}")
-async def delete_system_media(
+def delete_system_media(
     media_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -4398,7 +4268,7 @@ async def delete_system_media(
 
 
 @router.get("/api/my-uploads")
-async def get_my_uploads(
+def get_my_uploads(
     folder: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -7406,7 +7276,7 @@ def update_student_profile(
     }
 
 @router.get("/api/student/{student_id}/reviews")
-async def get_student_reviews(
+def get_student_reviews(
     student_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -7541,7 +7411,7 @@ async def get_student_reviews(
 # ============================================
 
 @router.get("/api/parent/profile")
-async def get_parent_profile(
+def get_parent_profile(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -7602,7 +7472,7 @@ async def get_parent_profile(
     return response
 
 @router.put("/api/parent/profile")
-async def update_parent_profile(
+def update_parent_profile(
     profile_data: ParentProfileUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -7719,7 +7589,7 @@ async def update_parent_profile(
 # ============================================
 
 @router.get("/api/advertiser/profile")
-async def get_advertiser_profile(
+def get_advertiser_profile(
     current_user = Depends(resolve_advertiser),
     adv_db: Session = Depends(get_advertiser_db)
 ):
@@ -7775,7 +7645,7 @@ async def get_advertiser_profile(
     return response_dict
 
 @router.put("/api/advertiser/profile")
-async def update_advertiser_profile(
+def update_advertiser_profile(
     profile_data: AdvertiserProfileUpdate,
     current_user = Depends(resolve_advertiser),
     adv_db: Session = Depends(get_advertiser_db)
@@ -7838,7 +7708,7 @@ async def update_advertiser_profile(
     return {"message": "Profile updated successfully", "id": advertiser_profile.id}
 
 @router.get("/api/advertiser/{advertiser_id}")
-async def get_advertiser_by_id(
+def get_advertiser_by_id(
     advertiser_id: int,
     adv_db: Session = Depends(get_advertiser_db)
 ):
@@ -7869,6 +7739,7 @@ async def upload_campaign_media(
     """Upload campaign media (image or video) to Backblaze B2 with organized folder structure and save to database"""
     import psycopg
 
+    spool = None
     try:
         # Standalone advertiser auth: advertiser_profiles.id straight from the token
         # (no users row). resolve_advertiser already 401s a non-advertiser token.
@@ -7885,15 +7756,20 @@ async def upload_campaign_media(
         if not is_image and not is_video:
             raise HTTPException(status_code=400, detail="File must be an image or video")
 
-        # Read file contents
-        file_contents = await file.read()
-        file_size = len(file_contents)
+        # Stream the body to memory / a temp file; reading stops at the size limit
+        if is_image:
+            spool = await spool_upload(file, max_bytes=5 * 1024 * 1024,  # 5MB for images
+                                       too_large_detail="Image size exceeds 5MB limit")
+        else:
+            spool = await spool_upload(file, max_bytes=200 * 1024 * 1024,  # 200MB for videos
+                                       too_large_detail="Video size exceeds 200MB limit")
+        file_size = spool.size
 
         # DOUBLE VERIFICATION gate (payment-first): block ad media upload until the
         # advance-payment receipt is admin-verified. Checked BEFORE the B2 upload so
         # we don't store an orphaned file for a campaign that can't accept media yet.
         if campaign_id:
-            _adv_conn = psycopg.connect(os.getenv('ADVERTISER_DATABASE_URL'))
+            _adv_conn = pooled_connect(os.getenv('ADVERTISER_DATABASE_URL'))
             try:
                 _c = _adv_conn.cursor()
                 _c.execute("""
@@ -7910,13 +7786,6 @@ async def upload_campaign_media(
                     detail="Your advance payment must be verified before you can upload ad media."
                 )
 
-        # Validate file size
-        if is_image and file_size > 5 * 1024 * 1024:  # 5MB for images
-            raise HTTPException(status_code=400, detail="Image size exceeds 5MB limit")
-
-        if is_video and file_size > 200 * 1024 * 1024:  # 200MB for videos
-            raise HTTPException(status_code=400, detail="Video size exceeds 200MB limit")
-
         # Get Backblaze service
         b2_service = get_backblaze_service()
 
@@ -7932,7 +7801,7 @@ async def upload_campaign_media(
         resolved_company_id = None
         if brand_id:
             try:
-                with psycopg.connect(os.getenv('ADVERTISER_DATABASE_URL')) as _conn:
+                with pooled_connect(os.getenv('ADVERTISER_DATABASE_URL')) as _conn:
                     with _conn.cursor() as _cur:
                         _cur.execute(
                             "SELECT company_id FROM brand_profile WHERE id = %s",
@@ -7945,7 +7814,7 @@ async def upload_campaign_media(
                 pass  # Fall through to advertiser's single-company resolver
 
         try:
-            with psycopg.connect(os.getenv('ADVERTISER_DATABASE_URL')) as _conn:
+            with pooled_connect(os.getenv('ADVERTISER_DATABASE_URL')) as _conn:
                 with _conn.cursor() as _cur:
                     company_id, company_name = resolve_company_for_upload(
                         _cur, advertiser_id, resolved_company_id,
@@ -7966,8 +7835,9 @@ async def upload_campaign_media(
         )
 
         # Upload to Backblaze with custom folder path
-        result = b2_service.upload_file_to_folder(
-            file_data=file_contents,
+        result = await run_in_threadpool(
+            b2_service.upload_file_to_folder,
+            file_data=spool,
             file_name=file.filename,
             folder_path=custom_folder,
             content_type=file.content_type
@@ -7981,7 +7851,7 @@ async def upload_campaign_media(
         if campaign_id and brand_id:
             try:
                 # Get database connection (using psycopg directly)
-                conn = psycopg.connect(os.getenv('ADVERTISER_DATABASE_URL'))
+                conn = pooled_connect(os.getenv('ADVERTISER_DATABASE_URL'))
                 cursor = conn.cursor()
                 # (Payment-verification gate already enforced earlier, before B2 upload.)
 
@@ -8009,6 +7879,7 @@ async def upload_campaign_media(
                 conn.commit()
                 cursor.close()
                 conn.close()
+                invalidate_ad_index()
 
             except HTTPException:
                 # Verification gate (e.g. payment not verified) must reach the client.
@@ -8034,10 +7905,13 @@ async def upload_campaign_media(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload error: {str(e)}")
+    finally:
+        if spool:
+            spool.close()
 
 
 @router.get("/api/campaign/{campaign_id}/media")
-async def get_campaign_media(
+def get_campaign_media(
     campaign_id: int,
     media_type: Optional[str] = Query(None, description="Filter by media type: 'image' or 'video'"),
     placement: Optional[str] = Query(None, description="Filter by placement: 'placeholder', 'widget', 'popup', 'insession'"),
@@ -8051,7 +7925,7 @@ async def get_campaign_media(
         advertiser_id = current_user.role_ids['advertiser']
 
         # Get database connection
-        conn = psycopg.connect(os.getenv('ADVERTISER_DATABASE_URL'), row_factory=dict_row)
+        conn = pooled_connect(os.getenv('ADVERTISER_DATABASE_URL'), row_factory=dict_row)
         cursor = conn.cursor()
 
         # Build query with optional filters. Scope to this advertiser's own media
@@ -8095,7 +7969,7 @@ async def get_campaign_media(
 
 
 @router.delete("/api/campaign/media/{media_id}")
-async def delete_campaign_media(
+def delete_campaign_media(
     media_id: int,
     current_user=Depends(resolve_advertiser)
 ):
@@ -8106,7 +7980,7 @@ async def delete_campaign_media(
         advertiser_id = current_user.role_ids['advertiser']
 
         # Get database connection
-        conn = psycopg.connect(os.getenv('ADVERTISER_DATABASE_URL'))
+        conn = pooled_connect(os.getenv('ADVERTISER_DATABASE_URL'))
         cursor = conn.cursor()
 
         # Get media info to verify ownership (scoped to this advertiser).
@@ -8141,6 +8015,7 @@ async def delete_campaign_media(
 
         cursor.close()
         conn.close()
+        invalidate_ad_index()
 
         # Try to delete from Backblaze (don't fail if this errors)
         if b2_key:
@@ -8187,6 +8062,7 @@ async def upload_company_document(
     - company_logo: Company logo image
     - additional_doc: Additional supporting documents
     """
+    spool = None
     try:
         # Check if user has advertiser role
         if "advertiser" not in current_user.roles:
@@ -8208,23 +8084,20 @@ async def upload_company_document(
                 detail=f"Invalid document type. Must be one of: {', '.join(valid_types)}"
             )
 
-        # Read file contents
-        contents = await file.read()
-
-        # Validate file size based on type
+        # Validate file size based on type (reading stops at the limit)
         if document_type == 'company_logo':
             # Logo: 5MB max, images only
-            if len(contents) > 5 * 1024 * 1024:
-                raise HTTPException(status_code=400, detail="Logo file size exceeds 5MB limit")
             if not file.content_type or not file.content_type.startswith('image/'):
                 raise HTTPException(status_code=400, detail="Logo must be an image file (PNG, JPG)")
+            spool = await spool_upload(file, max_bytes=5 * 1024 * 1024,
+                                       too_large_detail="Logo file size exceeds 5MB limit")
         else:
             # Documents: 10MB max, PDF or images
-            if len(contents) > 10 * 1024 * 1024:
-                raise HTTPException(status_code=400, detail="Document file size exceeds 10MB limit")
             allowed_types = ['application/pdf', 'image/jpeg', 'image/png', 'image/jpg']
             if file.content_type not in allowed_types:
                 raise HTTPException(status_code=400, detail="Document must be PDF, JPG, or PNG")
+            spool = await spool_upload(file, max_bytes=10 * 1024 * 1024,
+                                       too_large_detail="Document file size exceeds 10MB limit")
 
         # Get Backblaze service
         b2_service = get_backblaze_service()
@@ -8234,7 +8107,7 @@ async def upload_company_document(
         import psycopg
         from advertiser_b2_paths import resolve_company_for_upload, company_folder, CompanyResolutionError
         try:
-            with psycopg.connect(os.getenv('ADVERTISER_DATABASE_URL')) as _conn:
+            with pooled_connect(os.getenv('ADVERTISER_DATABASE_URL')) as _conn:
                 with _conn.cursor() as _cur:
                     resolved_company_id, resolved_company_name = resolve_company_for_upload(
                         _cur, advertiser_profile.id,
@@ -8248,8 +8121,9 @@ async def upload_company_document(
         folder_path = company_folder(media_type_for_path, resolved_company_name)
 
         # Upload file to that explicit folder.
-        result = b2_service.upload_file_to_folder(
-            file_data=contents,
+        result = await run_in_threadpool(
+            b2_service.upload_file_to_folder,
+            file_data=spool,
             file_name=file.filename,
             folder_path=folder_path,
             content_type=file.content_type,
@@ -8273,7 +8147,7 @@ async def upload_company_document(
 
         # Also write to the new company_profile row so per-company UI sees it.
         try:
-            with psycopg.connect(os.getenv('ADVERTISER_DATABASE_URL')) as _conn2:
+            with pooled_connect(os.getenv('ADVERTISER_DATABASE_URL')) as _conn2:
                 with _conn2.cursor() as _cur2:
                     if document_type == 'business_license':
                         _cur2.execute(
@@ -8319,10 +8193,13 @@ async def upload_company_document(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload error: {str(e)}")
+    finally:
+        if spool:
+            spool.close()
 
 
 @router.post("/api/advertiser/submit-verification")
-async def submit_company_verification(
+def submit_company_verification(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     adv_db: Session = Depends(get_advertiser_db)
@@ -8386,7 +8263,7 @@ async def submit_company_verification(
 
 
 @router.get("/api/advertiser/verification-status")
-async def get_company_verification_status(
+def get_company_verification_status(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     adv_db: Session = Depends(get_advertiser_db)
@@ -9,86 +9,29 @@ Updated to use new 'schedules' table with:
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
+from tutor_availability_index import invalidate_availability_index
+from booking_conflicts import schedule_conflicts
 import os
-import jwt
-from jwt import PyJWTError
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# OAuth2 scheme
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # Get config from environment
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 def get_db_connection():
     """Get database connection"""
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise Exception("DATABASE_URL not found in environment variables")
-    return psycopg.connect(database_url)
-
-def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current authenticated user - returns dict with user data"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
-
-        # Convert string back to int
-        user_id = int(user_id_str)
-    except (PyJWTError, ValueError, TypeError) as e:
-        print(f"JWT decode error: {e}")
-        raise credentials_exception
-    except Exception as e:
-        print(f"Unexpected error in get_current_user: {e}")
-        raise credentials_exception
-
-    # Fetch user from database
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, first_name, father_name, email, phone, roles, active_role,
-                       grandfather_name, profile_picture
-                FROM users WHERE id = %s
-            """, (user_id,))
-            row = cur.fetchone()
-
-            if not row:
-                raise credentials_exception
+    return pooled_connect(database_url)
 
-            return {
-                'id': row[0],
-                'first_name': row[1],
-                'father_name': row[2],
-                'email': row[3],
-                'phone': row[4],
-                'roles': row[5] or [],
-                'active_role': row[6],
-                'grandfather_name': row[7],
-                'profile_picture': row[8]
-            }
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Database error in get_current_user: {e}")
-        raise credentials_exception
-    finally:
-        conn.close()
 
 router = APIRouter()
 
@@ -137,19 +80,35 @@ class ScheduleResponse(BaseModel):
     notification_sound: bool
     created_at: datetime
     updated_at: Optional[datetime]
+    conflicting_schedule_ids: List[int] = []  # Own active schedules overlapping this one (create/update)
 
     class Config:
         from_attributes = True
 
 
+def find_overlapping_schedules(cur, row) -> List[int]:
+    """Ids of the scheduler's other active schedules (same role) overlapping a RETURNING row"""
+    if row[14] != 'active':
+        return []
+    cur.execute("""
+        SELECT id, schedule_type, year, months, days, specific_dates, start_time, end_time
+        FROM schedules
+        WHERE scheduler_id = %s AND scheduler_role = %s AND status = 'active' AND id <> %s
+    """, (row[1], row[2], row[0]))
+    others = cur.fetchall()
+    if not others:
+        return []
+    return schedule_conflicts((row[0], row[6], row[5], row[7], row[8], row[9], row[10], row[11]), others)
+
+
 # ============================================
 # ENDPOINTS
 # ============================================
 
 @router.post("/api/schedules", response_model=ScheduleResponse, status_code=status.HTTP_201_CREATED)
-async def create_schedule(
+def create_schedule(
     schedule: ScheduleCreate,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Create a new schedule for the current user
@@ -201,8 +160,12 @@ async def create_schedule(
 
             row = cur.fetchone()
             conn.commit()
+            if scheduler_role == 'tutor':
+                invalidate_availability_index()
 
             if row:
+                # Flagged, not rejected (see booking_conflicts.py)
+                conflicting_schedule_ids = find_overlapping_schedules(cur, row)
                 return ScheduleResponse(
                     id=row[0],
                     scheduler_id=row[1],
@@ -225,7 +188,8 @@ async def create_schedule(
                     notification_browser=row[18],
                     notification_sound=row[19],
                     created_at=row[20],
-                    updated_at=row[21]
+                    updated_at=row[21],
+                    conflicting_schedule_ids=conflicting_schedule_ids
                 )
             else:
                 raise HTTPException(
@@ -245,8 +209,8 @@ async def create_schedule(
 
 
 @router.get("/api/schedules", response_model=List[ScheduleResponse])
-async def get_user_schedules(
-    current_user = Depends(get_current_user),
+def get_user_schedules(
+    current_user = Depends(get_current_user_dict),
     role_filter: Optional[str] = None
 ):
     """
@@ -322,9 +286,9 @@ async def get_user_schedules(
 
 
 @router.get("/api/schedules/{schedule_id}", response_model=ScheduleResponse)
-async def get_schedule(
+def get_schedule(
     schedule_id: int,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Get a specific schedule by ID
@@ -387,10 +351,10 @@ async def get_schedule(
 
 
 @router.put("/api/schedules/{schedule_id}", response_model=ScheduleResponse)
-async def update_schedule(
+def update_schedule(
     schedule_id: int,
     schedule: ScheduleCreate,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Update an existing schedule
@@ -438,6 +402,8 @@ async def update_schedule(
 
             row = cur.fetchone()
             conn.commit()
+            if row and row[2] == 'tutor':
+                invalidate_availability_index()
 
             if not row:
                 raise HTTPException(
@@ -445,6 +411,7 @@ async def update_schedule(
                     detail="Schedule not found or you don't have permission to update it"
                 )
 
+            conflicting_schedule_ids = find_overlapping_schedules(cur, row)
             return ScheduleResponse(
                 id=row[0],
                 scheduler_id=row[1],
@@ -467,7 +434,8 @@ async def update_schedule(
                 notification_browser=row[18],
                 notification_sound=row[19],
                 created_at=row[20],
-                updated_at=row[21]
+                updated_at=row[21],
+                conflicting_schedule_ids=conflicting_schedule_ids
             )
 
     except psycopg.Error as e:
@@ -482,9 +450,9 @@ async def update_schedule(
 
 
 @router.delete("/api/schedules/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_schedule(
+def delete_schedule(
     schedule_id: int,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Delete a schedule
@@ -497,11 +465,13 @@ async def delete_schedule(
             cur.execute("""
                 DELETE FROM schedules
                 WHERE id = %s AND scheduler_id = %s
-                RETURNING id
+                RETURNING id, scheduler_role
             """, (schedule_id, current_user['id']))
 
             row = cur.fetchone()
             conn.commit()
+            if row and row[1] == 'tutor':
+                invalidate_availability_index()
 
             if not row:
                 raise HTTPException(
@@ -534,10 +504,10 @@ class ToggleAlarmRequest(BaseModel):
 
 
 @router.patch("/api/schedules/{schedule_id}/toggle-notification")
-async def toggle_schedule_notification(
+def toggle_schedule_notification(
     schedule_id: int,
     request: ToggleNotificationRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """Toggle browser notification for a specific schedule"""
     conn = get_db_connection()
@@ -585,10 +555,10 @@ async def toggle_schedule_notification(
 
 
 @router.patch("/api/schedules/{schedule_id}/toggle-alarm")
-async def toggle_schedule_alarm(
+def toggle_schedule_alarm(
     schedule_id: int,
     request: ToggleAlarmRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """Toggle alarm for a specific schedule"""
     conn = get_db_connection()
@@ -640,10 +610,10 @@ class ToggleFeaturedRequest(BaseModel):
 
 
 @router.patch("/api/schedules/{schedule_id}/toggle-featured")
-async def toggle_schedule_featured(
+def toggle_schedule_featured(
     schedule_id: int,
     request: ToggleFeaturedRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """Toggle featured status for a specific schedule"""
     conn = get_db_connection()
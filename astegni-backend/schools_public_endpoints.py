@@ -24,7 +24,7 @@ def get_db():
 
 
 @router.get("/api/schools")
-async def get_schools(
+def get_schools(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
     status: Optional[str] = Query(None),
@@ -130,7 +130,7 @@ async def get_schools(
 
 
 @router.get("/api/schools/{school_id}")
-async def get_school(
+def get_school(
     school_id: int,
     db: Session = Depends(get_db)
 ):
@@ -0,0 +1,72 @@
+"""
+Session Conflict Endpoints
+Double-booked upcoming sessions for the tutor, student and parent views
+
+GET /api/sessions/conflicts?role=tutor|student|parent
+- tutor:   overlapping sessions of the caller's tutor profile
+- student: overlapping sessions of the caller's student profile (across tutors)
+- parent:  overlapping sessions of each of the caller's children
+
+Overlaps come from session_slots (see booking_conflicts.py).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import datetime
+from db_pool import pooled_connect
+from auth import get_current_user_dict
+from booking_conflicts import participant_conflicts
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def get_db_connection():
+    """Get database connection"""
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise Exception("DATABASE_URL not found in environment variables")
+    return pooled_connect(database_url)
+
+
+router = APIRouter()
+
+
+@router.get("/api/sessions/conflicts")
+def get_session_conflicts(
+    role: str = Query(..., pattern="^(tutor|student|parent)$"),
+    current_user = Depends(get_current_user_dict)
+):
+    """Pairs of the caller's upcoming booked sessions that overlap"""
+    if role not in current_user.get('roles', []):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"You don't have the {role} role"
+        )
+
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            if role == 'parent':
+                cur.execute("SELECT children_ids FROM parent_profiles WHERE user_id = %s", (current_user['id'],))
+                row = cur.fetchone()
+                participant_role, participant_ids = 'student', list(row[0] or []) if row else []
+            else:
+                cur.execute(f"SELECT id FROM {role}_profiles WHERE user_id = %s", (current_user['id'],))
+                row = cur.fetchone()
+                participant_role, participant_ids = role, [row[0]] if row else []
+
+            if not row:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"{role.capitalize()} profile not found"
+                )
+
+            conflicts = participant_conflicts(cur, participant_role, participant_ids, datetime.now())
+            return {
+                "role": role,
+                "conflicts": conflicts,
+                "count": len(conflicts)
+            }
+    finally:
+        conn.close()
@@ -3,16 +3,18 @@ Session Request Endpoints
 Handles tutor session booking requests from students and parents
 """
 from fastapi import APIRouter, HTTPException, Depends, Header
-from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Literal
 from datetime import datetime, time
 import json
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
+from market_pricing_index import invalidate_market_index
+from tutor_availability_index import invalidate_availability_index
+from booking_conflicts import find_session_conflicts
 from dotenv import load_dotenv
 import os
-import jwt
-from jwt import PyJWTError
 
 # Import 2FA protection helper
 try:
@@ -24,11 +26,8 @@ except ImportError:
 
 load_dotenv()
 DATABASE_URL = os.getenv('DATABASE_URL')
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 router = APIRouter(tags=["session-requests"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # ============================================
 # AUTHENTICATION
@@ -39,68 +38,7 @@ def get_db_connection():
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise HTTPException(status_code=500, detail="Database URL not configured")
-    return psycopg.connect(database_url)
-
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current user from JWT token"""
-    credentials_exception = HTTPException(
-        status_code=401,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        # Decode JWT token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-
-        if user_id is None:
-            raise credentials_exception
-
-        # Convert to integer
-        user_id = int(user_id)
-
-        # Extract role_ids and active_role from JWT token
-        role_ids = payload.get("role_ids", {})
-        active_role = payload.get("role")
-
-    except (PyJWTError, ValueError):
-        raise credentials_exception
-
-    # Get user from database
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    try:
-        cur.execute("""
-            SELECT id, first_name, father_name, email, phone, roles, active_role,
-                   grandfather_name, profile_picture
-            FROM users
-            WHERE id = %s
-        """, (user_id,))
-
-        row = cur.fetchone()
-
-        if not row:
-            raise credentials_exception
-
-        # Return user dict with role_ids from JWT
-        return {
-            "id": row[0],
-            "first_name": row[1],
-            "father_name": row[2],
-            "email": row[3],
-            "phone": row[4],
-            "roles": row[5] if isinstance(row[5], list) else [],
-            "active_role": row[6],
-            "grandfather_name": row[7],
-            "profile_picture": row[8],
-            "role_ids": role_ids  # Add role_ids from JWT payload
-        }
-
-    finally:
-        cur.close()
-        conn.close()
+    return pooled_connect(database_url)
 
 
 # ============================================
@@ -210,7 +148,7 @@ def _fetch_shared_students(cur, request_id):
 
 
 @router.get("/api/students/search", response_model=dict)
-async def search_students(q: str, current_user: dict = Depends(get_current_user)):
+def search_students(q: str, current_user: dict = Depends(get_current_user_dict)):
     """
     Live search for VERIFIED student profiles by name, for adding to a
     shared (cost-sharing) package booking.
@@ -222,7 +160,7 @@ async def search_students(q: str, current_user: dict = Depends(get_current_user)
     if len(q) < 2:
         return {"students": []}
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
     try:
         related_ids = _booker_related_student_ids(cur, current_user)
@@ -268,9 +206,9 @@ class SendShareOtp(BaseModel):
 
 
 @router.post("/api/students/send-share-otp", response_model=dict)
-async def send_share_otp(
+def send_share_otp(
     payload: SendShareOtp,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Email a 6-digit OTP to a student's registered address so the booker can
@@ -279,7 +217,7 @@ async def send_share_otp(
     The code is tied to (booker, student) and expires in 10 minutes.
     """
     import random
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
     try:
         cur.execute("""
@@ -351,9 +289,9 @@ class VerifyStudentForSharing(BaseModel):
 
 
 @router.post("/api/students/verify-for-sharing", response_model=dict)
-async def verify_student_for_sharing(
+def verify_student_for_sharing(
     payload: VerifyStudentForSharing,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Validate that a student may be added to a shared booking by the booker.
@@ -365,7 +303,7 @@ async def verify_student_for_sharing(
         * an exact match of the student's stored date of birth, OR
         * a valid OTP previously emailed to the student (send-share-otp).
     """
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
     try:
         cur.execute("""
@@ -526,15 +464,15 @@ class MyStudent(BaseModel):
 # Endpoints
 
 @router.post("/api/session-requests", response_model=dict)
-async def create_session_request(
+def create_session_request(
     request: SessionRequestCreate,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Create a new session request (for students/parents requesting tutoring)
     Also creates a chat conversation and sends a session_request message with package card
     """
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -875,9 +813,9 @@ async def create_session_request(
 
 
 @router.get("/api/session-requests/tutor", response_model=List[SessionRequestResponse])
-async def get_tutor_session_requests(
+def get_tutor_session_requests(
     status: Optional[str] = None,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_dict),
     verification_token: Optional[str] = Header(default=None, alias="X-2FA-Token")
 ):
     """
@@ -891,7 +829,7 @@ async def get_tutor_session_requests(
     if 'tutor' not in current_user.get('roles', []):
         raise HTTPException(status_code=403, detail="Only tutors can access this endpoint")
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -1061,8 +999,8 @@ async def get_tutor_session_requests(
 
 
 @router.get("/api/session-requests/tutor/my-students", response_model=List[MyStudent])
-async def get_my_students(
-    current_user: dict = Depends(get_current_user)
+def get_my_students(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get all accepted students for the current tutor from tutor_students table
@@ -1070,7 +1008,7 @@ async def get_my_students(
     if 'tutor' not in current_user.get('roles', []):
         raise HTTPException(status_code=403, detail="Only tutors can access this endpoint")
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -1157,9 +1095,9 @@ async def get_my_students(
 
 
 @router.get("/api/session-requests/tutor/{request_id}", response_model=SessionRequestResponse)
-async def get_session_request_detail(
+def get_session_request_detail(
     request_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get details of a specific session request
@@ -1167,7 +1105,7 @@ async def get_session_request_detail(
     if 'tutor' not in current_user.get('roles', []):
         raise HTTPException(status_code=403, detail="Only tutors can access this endpoint")
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -1323,10 +1261,10 @@ async def get_session_request_detail(
 
 
 @router.patch("/api/session-requests/tutor/{request_id}", response_model=dict)
-async def update_session_request_status(
+def update_session_request_status(
     request_id: int,
     update: SessionRequestUpdate,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_dict),
     verification_token: Optional[str] = Header(default=None, alias="X-2FA-Token")
 ):
     """
@@ -1341,7 +1279,7 @@ async def update_session_request_status(
     if 'tutor' not in current_user.get('roles', []):
         raise HTTPException(status_code=403, detail="Only tutors can accept/reject session requests")
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -1536,6 +1474,7 @@ async def update_session_request_status(
 
             schedule_data = cur.fetchone()
             sessions_created = 0
+            created_session_ids = []
 
             if schedule_data:
                 schedule_type = schedule_data[0]
@@ -1574,11 +1513,12 @@ async def update_session_request_status(
                                 ) VALUES (
                                     %s, %s, %s, %s, %s, %s, 'online', 'scheduled', 'medium',
                                     CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
-                                )
+                                ) RETURNING id
                             """, (
                                 enrolled_course_id, session_date, start_time, end_time,
                                 duration, json.dumps(topics)
                             ))
+                            created_session_ids.append(cur.fetchone()[0])
                             sessions_created += 1
                         except Exception as e:
                             print(f"Warning: Could not create session for date {date_str}: {e}")
@@ -1613,11 +1553,12 @@ async def update_session_request_status(
                                         ) VALUES (
                                             %s, %s, %s, %s, %s, %s, 'online', 'scheduled', 'medium',
                                             CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
-                                        )
+                                        ) RETURNING id
                                     """, (
                                         enrolled_course_id, current_date, start_time, end_time,
                                         duration, json.dumps(topics)
                                     ))
+                                    created_session_ids.append(cur.fetchone()[0])
                                     sessions_created += 1
                                 except Exception as e:
                                     print(f"Warning: Could not create recurring session for {current_date}: {e}")
@@ -1626,10 +1567,19 @@ async def update_session_request_status(
 
                 print(f"Auto-created {sessions_created} sessions for enrolled_course_id {enrolled_course_id}")
 
+            # Flag auto-created sessions that overlap the tutor's or student's other sessions
+            # (see booking_conflicts.py) - the request is accepted either way
+            session_conflicts = find_session_conflicts(cur, created_session_ids)
+            if session_conflicts:
+                print(f"[Booking Conflicts] {len(session_conflicts)} overlaps for enrolled_course_id {enrolled_course_id}")
+
             # NOTE: Request is kept in requested_sessions with status='accepted'
             # This allows tutors to see history of accepted requests
 
         conn.commit()
+        if update.status == 'accepted':
+            invalidate_market_index()  # New or re-priced enrollment
+            invalidate_availability_index()  # Auto-created sessions
 
         response = {
             "success": True,
@@ -1644,6 +1594,7 @@ async def update_session_request_status(
             response["agreed_price"] = float(agreed_price) if agreed_price else None
             response["sessions_created"] = sessions_created
             response["enrolled_course_id"] = enrolled_course_id
+            response["session_conflicts"] = session_conflicts
 
         return response
 
@@ -1658,8 +1609,8 @@ async def update_session_request_status(
 
 
 @router.get("/api/session-requests/my-requests", response_model=List[SessionRequestResponse])
-async def get_my_session_requests(
-    current_user: dict = Depends(get_current_user)
+def get_my_session_requests(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get session requests for the current user:
@@ -1681,7 +1632,7 @@ async def get_my_session_requests(
     if tutor_id:
         tutor_id = int(tutor_id) if isinstance(tutor_id, str) else tutor_id
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -1959,9 +1910,9 @@ def get_grade_letter(percentage):
 
 
 @router.get("/api/tutor/student-details/{student_profile_id}")
-async def get_student_details(
+def get_student_details(
     student_profile_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get comprehensive student details from users, student_profiles, and enrolled_students tables.
@@ -2279,10 +2230,10 @@ async def get_student_details(
 
 
 @router.get("/api/tutor/student-sessions/{student_profile_id}")
-async def get_student_sessions(
+def get_student_sessions(
     student_profile_id: int,
     status: str = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get all sessions for a specific student from the sessions table.
@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional
 import psycopg
+from db_pool import pooled_connect
 import os
 from dotenv import load_dotenv
 import hashlib
@@ -38,11 +39,11 @@ class ClickTrack(BaseModel):
 
 def get_db():
     """Get database connection"""
-    return psycopg.connect(DATABASE_URL)
+    return pooled_connect(DATABASE_URL)
 
 
 @router.post("/track-impression")
-async def track_impression(request: Request, impression: ImpressionTrack):
+def track_impression(request: Request, impression: ImpressionTrack):
     """
     Track a campaign impression (simplified version)
 
@@ -113,7 +114,7 @@ async def track_impression(request: Request, impression: ImpressionTrack):
 
 
 @router.post("/track-click")
-async def track_click(click: ClickTrack):
+def track_click(click: ClickTrack):
     """
     Track a campaign click (simplified version)
     """
@@ -67,7 +67,7 @@ class StorageUsageResponse(BaseModel):
 
 
 @router.get("/api/storage/usage", response_model=Dict)
-async def get_storage_usage(
+def get_storage_usage(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -120,7 +120,7 @@ async def get_storage_usage(
 
 
 @router.post("/api/storage/validate")
-async def validate_storage_before_upload(
+def validate_storage_before_upload(
     file_size_mb: float,
     file_type: str,  # 'image', 'video', 'document', 'audio'
     current_user: User = Depends(get_current_user),
@@ -165,7 +165,7 @@ async def validate_storage_before_upload(
 
 
 @router.get("/api/storage/limits")
-async def get_storage_limits(
+def get_storage_limits(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -187,7 +187,7 @@ async def get_storage_limits(
 
 
 @router.get("/api/storage/breakdown")
-async def get_storage_breakdown(
+def get_storage_breakdown(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -0,0 +1,226 @@
+"""
+Storage Index
+Per-object metadata for files stored in Backblaze B2 (storage_objects, user database)
+
+BackblazeService records every upload and delete here, so per-user storage
+stats and file listings are indexed queries instead of full bucket scans:
+
+    storage_objects(file_path, file_id, owner, category, size, content_type, uploaded_at)
+
+- owner: the user folder of the path, i.e. the user_id given to
+  BackblazeService.upload_file ('images/profile/user_profile_12/a.jpg' -> 'profile_12');
+  NULL for folders without one (advertisements, system media)
+- category: the top-level folder - images | videos | audio | documents (other otherwise)
+
+Index writes never fail the upload or delete they describe. Drift (a missed
+write, files changed outside the app) is repaired by the reconciliation job,
+which streams the bucket listing once into a staging table and applies the
+difference in three statements:
+
+    python storage_index.py --reconcile
+
+Run migrate_add_storage_objects.py first.
+"""
+
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from config import DATABASE_URL
+from db_pool import pooled_connect
+
+load_dotenv()
+
+STORAGE_CATEGORIES = ('images', 'videos', 'audio', 'documents')
+
+# Serializes reconciliation runs (transaction-scoped advisory lock)
+_RECONCILE_LOCK_KEY = 734_003
+
+
+def object_owner(file_path: str) -> Optional[str]:
+    """'videos/stories/user_profile_3/clip.mp4' -> 'profile_3'"""
+    for segment in file_path.split('/')[:-1]:
+        if segment.startswith('user_') and len(segment) > 5:
+            return segment[5:]
+    return None
+
+
+def object_category(file_path: str) -> str:
+    top = file_path.split('/', 1)[0]
+    return top if top in STORAGE_CATEGORIES else 'other'
+
+
+def _uploaded_at(upload_timestamp: Optional[int]) -> datetime:
+    """B2 upload timestamps are epoch milliseconds; stored as naive UTC"""
+    if upload_timestamp is None:
+        return datetime.utcnow()
+    return datetime.utcfromtimestamp(upload_timestamp / 1000)
+
+
+def _row(file_path: str, file_id: Optional[str], size: int, content_type: Optional[str],
+         upload_timestamp: Optional[int]) -> tuple:
+    return (file_path, file_id, object_owner(file_path), object_category(file_path),
+            size, content_type, _uploaded_at(upload_timestamp))
+
+
+# ============================================
+# WRITES (BackblazeService)
+# ============================================
+
+def record_upload(file_path: str, file_id: Optional[str], size: int, content_type: Optional[str] = None,
+                  upload_timestamp: Optional[int] = None):
+    """Add or replace the index row for an uploaded object"""
+    with pooled_connect(DATABASE_URL) as conn:
+        conn.execute("""
+            INSERT INTO storage_objects
+                (file_path, file_id, owner, category, size, content_type, uploaded_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (file_path) DO UPDATE SET
+                file_id = EXCLUDED.file_id,
+                owner = EXCLUDED.owner,
+                category = EXCLUDED.category,
+                size = EXCLUDED.size,
+                content_type = EXCLUDED.content_type,
+                uploaded_at = EXCLUDED.uploaded_at
+        """, _row(file_path, file_id, size, content_type, upload_timestamp))
+
+
+def record_delete(file_path: str):
+    with pooled_connect(DATABASE_URL) as conn:
+        conn.execute("DELETE FROM storage_objects WHERE file_path = %s", (file_path,))
+
+
+# ============================================
+# QUERIES
+# ============================================
+
+def get_owner_usage(owner: str) -> Dict[str, Tuple[int, int]]:
+    """category -> (file count, total bytes) for one owner"""
+    with pooled_connect(DATABASE_URL) as conn:
+        rows = conn.execute("""
+            SELECT category, COUNT(*), COALESCE(SUM(size), 0)
+            FROM storage_objects
+            WHERE owner = %s
+            GROUP BY category
+        """, (owner,)).fetchall()
+    return {category: (count, size) for category, count, size in rows}
+
+
+def list_owner_objects(owner: str, prefix: Optional[str] = None, limit: int = 100) -> List[tuple]:
+    """Newest first: (file_path, file_id, size, uploaded_at), optionally under one folder"""
+    query = """
+        SELECT file_path, file_id, size, uploaded_at
+        FROM storage_objects
+        WHERE owner = %s
+    """
+    params: list = [owner]
+    if prefix:
+        query += " AND starts_with(file_path, %s)"
+        params.append(prefix)
+    query += " ORDER BY uploaded_at DESC LIMIT %s"
+    params.append(limit)
+    with pooled_connect(DATABASE_URL) as conn:
+        return conn.execute(query, params).fetchall()
+
+
+# ============================================
+# RECONCILIATION
+# ============================================
+
+def reconcile_storage_index(bucket) -> Optional[Dict[str, int]]:
+    """
+    Make storage_objects match the bucket: one streamed listing, then set-based upsert and delete.
+
+    Rows for objects uploaded after the run started are left alone even if the
+    listing missed them. Returns counts, or None if another run holds the lock.
+    """
+    conn = pooled_connect(DATABASE_URL)
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT pg_try_advisory_xact_lock(%s)", (_RECONCILE_LOCK_KEY,))
+        if not cur.fetchone()[0]:
+            return None
+        cur.execute("SELECT NOW() AT TIME ZONE 'UTC'")
+        started_at = cur.fetchone()[0]
+
+        cur.execute("""
+            CREATE TEMP TABLE storage_listing (
+                file_path TEXT, file_id TEXT, owner TEXT, category TEXT,
+                size BIGINT, content_type TEXT, uploaded_at TIMESTAMP
+            ) ON COMMIT DROP
+        """)
+        listed = 0
+        with cur.copy("""
+            COPY storage_listing (file_path, file_id, owner, category, size, content_type, uploaded_at)
+            FROM STDIN
+        """) as copy:
+            for file_version, _ in bucket.ls(recursive=True, latest_only=True):
+                copy.write_row(_row(file_version.file_name, file_version.id_, file_version.size,
+                                    file_version.content_type, file_version.upload_timestamp))
+                listed += 1
+
+        cur.execute("""
+            WITH upserted AS (
+                INSERT INTO storage_objects
+                    (file_path, file_id, owner, category, size, content_type, uploaded_at)
+                SELECT file_path, file_id, owner, category, size, content_type, uploaded_at
+                FROM storage_listing
+                ON CONFLICT (file_path) DO UPDATE SET
+                    file_id = EXCLUDED.file_id,
+                    owner = EXCLUDED.owner,
+                    category = EXCLUDED.category,
+                    size = EXCLUDED.size,
+                    content_type = EXCLUDED.content_type,
+                    uploaded_at = EXCLUDED.uploaded_at
+                WHERE (storage_objects.file_id, storage_objects.owner, storage_objects.category,
+                       storage_objects.size, storage_objects.content_type)
+                      IS DISTINCT FROM
+                      (EXCLUDED.file_id, EXCLUDED.owner, EXCLUDED.category,
+                       EXCLUDED.size, EXCLUDED.content_type)
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted)
+            FROM upserted
+        """)
+        added, updated = cur.fetchone()
+
+        cur.execute("""
+            DELETE FROM storage_objects o
+            WHERE o.uploaded_at < %s
+              AND NOT EXISTS (SELECT 1 FROM storage_listing l WHERE l.file_path = o.file_path)
+        """, (started_at,))
+        removed = cur.rowcount
+
+        conn.commit()
+        return {"listed": listed, "added": added, "updated": updated, "removed": removed}
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    if "--reconcile" not in sys.argv:
+        print("Usage: python storage_index.py --reconcile")
+        sys.exit(1)
+
+    from backblaze_service import get_backblaze_service
+
+    b2_service = get_backblaze_service()
+    if not b2_service.configured:
+        print("Backblaze B2 is not configured - nothing to reconcile")
+        sys.exit(1)
+
+    result = reconcile_storage_index(b2_service.bucket)
+    if result is None:
+        print("Another reconciliation is running")
+    else:
+        print(f"Listed {result['listed']} objects: {result['added']} added, "
+              f"{result['updated']} updated, {result['removed']} removed")
@@ -3,11 +3,19 @@ Storage Service for managing user storage limits and validation
 Enforces subscription-based storage quotas
 """
 
+import os
+import sys
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import Dict, Tuple, Optional
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+# Imported once: re-executing models.py per call rebuilt every model class
+from models import User, UserStorageUsage
+from admin_models import AdminSessionLocal, SystemMediaSettings
+
 
 class StorageService:
     """Service for managing user storage limits and usage tracking"""
@@ -43,22 +51,6 @@ class StorageService:
                 'subscription_plan': str or None
             }
         """
-        # Import models using importlib to handle space in directory name
-        import importlib.util
-
-        # Load User model
-        spec_user = importlib.util.spec_from_file_location("models", "app.py modules/models.py")
-        models_module = importlib.util.module_from_spec(spec_user)
-        spec_user.loader.exec_module(models_module)
-        User = models_module.User
-
-        # Load admin models
-        spec_admin = importlib.util.spec_from_file_location("admin_models", "app.py modules/admin_models.py")
-        admin_module = importlib.util.module_from_spec(spec_admin)
-        spec_admin.loader.exec_module(admin_module)
-        AdminSessionLocal = admin_module.AdminSessionLocal
-        SystemMediaSettings = admin_module.SystemMediaSettings
-
         # Get user's subscription plan ID
         user = db.query(User).filter(User.id == user_id).first()
         if not user or not user.subscription_plan_id:
@@ -122,13 +114,6 @@ class StorageService:
                 'audios_count': int
             }
         """
-        # Import models using importlib
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("models", "app.py modules/models.py")
-        models_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(models_module)
-        UserStorageUsage = models_module.UserStorageUsage
-
         usage = db.query(UserStorageUsage).filter(
             UserStorageUsage.user_id == user_id
         ).first()
@@ -245,13 +230,6 @@ class StorageService:
             file_type: Type of file ('image', 'video', 'document', 'audio')
             operation: 'add' for upload, 'remove' for deletion
         """
-        # Import models using importlib
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("models", "app.py modules/models.py")
-        models_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(models_module)
-        UserStorageUsage = models_module.UserStorageUsage
-
         # Get or create storage usage record
         usage = db.query(UserStorageUsage).filter(
             UserStorageUsage.user_id == user_id
@@ -9,6 +9,7 @@ from typing import Optional, List
 from pydantic import BaseModel, Field
 from datetime import date, datetime
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 import os
 from dotenv import load_dotenv
@@ -65,7 +66,7 @@ class DocumentStats(BaseModel):
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 def validate_file_type(filename: str) -> bool:
     """Validate file type"""
@@ -215,7 +216,7 @@ async def debug_endpoint(
     }
 
 @router.get("/api/student/documents/raw")
-async def get_documents_raw(document_type: Optional[str] = None, current_user = Depends(get_current_user)):
+def get_documents_raw(document_type: Optional[str] = None, current_user = Depends(get_current_user)):
     """Get documents without response model validation - for debugging"""
     print(f"[RAW] Starting raw endpoint")
     print(f"[RAW] document_type: {document_type}")
@@ -259,7 +260,7 @@ async def get_documents_raw(document_type: Optional[str] = None, current_user =
     return {"status": "ok", "message": "Endpoint reached successfully"}
 
 @router.get("/api/student/documents/stats", response_model=DocumentStats)
-async def get_document_stats(
+def get_document_stats(
     current_user = Depends(get_current_user)
 ):
     """
@@ -314,7 +315,7 @@ async def get_document_stats(
 
 
 @router.get("/api/student/documents/{document_id}", response_model=DocumentResponse)
-async def get_document_by_id(
+def get_document_by_id(
     document_id: int,
     current_user = Depends(get_current_user)
 ):
@@ -363,7 +364,7 @@ async def get_document_by_id(
 
 
 @router.get("/api/student/documents", response_model=List[DocumentResponse])
-async def get_student_documents(
+def get_student_documents(
     document_type: Optional[str] = None,
     current_user = Depends(get_current_user)
 ):
@@ -607,7 +608,7 @@ async def update_student_document(
 
 
 @router.get("/api/view-student/{student_profile_id}/credentials")
-async def get_view_student_credentials(
+def get_view_student_credentials(
     student_profile_id: int,
     document_type: Optional[str] = None
 ):
@@ -690,7 +691,7 @@ async def get_view_student_credentials(
 
 
 @router.get("/api/view-student/{student_profile_id}/parents")
-async def get_view_student_parents(student_profile_id: int):
+def get_view_student_parents(student_profile_id: int):
     """
     PUBLIC endpoint to get student's parents for view-student.html
 
@@ -758,7 +759,7 @@ async def get_view_student_parents(student_profile_id: int):
 
 
 @router.delete("/api/student/documents/{document_id}")
-async def delete_document(
+def delete_document(
     document_id: int,
     current_user = Depends(get_current_user)
 ):
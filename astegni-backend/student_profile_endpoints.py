@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 import psycopg
+from db_pool import pooled_connect
 from psycopg.rows import dict_row
 import os
 from dotenv import load_dotenv
@@ -17,6 +18,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
 from utils import get_current_user
+from user_context_cache import invalidate_user_context
 from models import get_db
 
 load_dotenv()
@@ -100,7 +102,7 @@ class CourseEnroll(BaseModel):
 
 def get_db_psycopg():
     """Get database connection using psycopg"""
-    return psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    return pooled_connect(DATABASE_URL, row_factory=dict_row)
 
 # ============================================
 # STUDENT PROFILE ENDPOINTS
@@ -161,7 +163,7 @@ async def get_my_profile(current_user = Depends(get_current_user), db = Depends(
     return await get_student_profile(current_user.id)
 
 @router.put("/api/student/profile")
-async def update_student_profile(
+def update_student_profile(
     profile_data: StudentProfileUpdate,
     current_user = Depends(get_current_user),
     db = Depends(get_db)
@@ -309,6 +311,7 @@ async def update_student_profile(
 
                 updated_profile = cur.fetchone()
                 conn.commit()
+                invalidate_user_context(current_user_id)
 
                 return {
                     "success": True,
@@ -326,7 +329,7 @@ async def update_student_profile(
 # ============================================
 
 @router.get("/api/student/progress/{user_id}")
-async def get_academic_progress(user_id: int):
+def get_academic_progress(user_id: int):
     """Get student academic progress"""
     try:
         with get_db() as conn:
@@ -358,7 +361,7 @@ async def get_academic_progress(user_id: int):
         )
 
 @router.put("/api/student/progress")
-async def update_academic_progress(
+def update_academic_progress(
     progress_data: AcademicProgressUpdate,
     current_user = Depends(get_current_user),
     db = Depends(get_db)
@@ -410,7 +413,7 @@ async def update_academic_progress(
 # ============================================
 
 @router.get("/api/student/guardians/{user_id}")
-async def get_guardians(user_id: int):
+def get_guardians(user_id: int):
     """Get student guardians"""
     try:
         with get_db() as conn:
@@ -430,7 +433,7 @@ async def get_guardians(user_id: int):
         )
 
 @router.post("/api/student/guardians")
-async def add_guardian(
+def add_guardian(
     guardian_data: GuardianCreate,
     current_user = Depends(get_current_user),
     db = Depends(get_db)
@@ -474,7 +477,7 @@ async def add_guardian(
 # ============================================
 
 @router.get("/api/student/courses/{user_id}")
-async def get_enrolled_courses(user_id: int):
+def get_enrolled_courses(user_id: int):
     """Get student enrolled courses"""
     try:
         with get_db() as conn:
@@ -512,7 +515,7 @@ async def get_enrolled_courses(user_id: int):
         )
 
 @router.post("/api/student/courses/enroll")
-async def enroll_course(
+def enroll_course(
     course_data: CourseEnroll,
     current_user = Depends(get_current_user),
     db = Depends(get_db)
@@ -556,7 +559,7 @@ async def enroll_course(
 # ============================================
 
 @router.get("/api/student/stats/{user_id}")
-async def get_student_stats(user_id: int):
+def get_student_stats(user_id: int):
     """Get comprehensive student statistics"""
     try:
         with get_db() as conn:
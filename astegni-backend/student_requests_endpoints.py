@@ -3,24 +3,20 @@ Student Requests Panel Endpoints
 Handles course requests, school requests for students' My Requests panel
 """
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
 import os
-import jwt
-from jwt import PyJWTError
 
 load_dotenv()
 DATABASE_URL = os.getenv('DATABASE_URL')
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 router = APIRouter(tags=["student-requests"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
 # ============================================
@@ -32,55 +28,7 @@ def get_db_connection():
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise HTTPException(status_code=500, detail="Database URL not configured")
-    return psycopg.connect(database_url, row_factory=dict_row)
-
-
-# ============================================
-# AUTHENTICATION
-# ============================================
-
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current user from JWT token"""
-    credentials_exception = HTTPException(
-        status_code=401,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-
-        if user_id is None:
-            raise credentials_exception
-
-        user_id = int(user_id)
-        role_ids = payload.get("role_ids", {})
-
-    except (PyJWTError, ValueError):
-        raise credentials_exception
-
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, first_name, father_name, email, phone, roles, active_role
-                FROM users WHERE id = %s
-            """, (user_id,))
-            row = cur.fetchone()
-
-            if not row:
-                raise credentials_exception
-
-            return {
-                "id": row['id'],
-                "first_name": row['first_name'],
-                "father_name": row['father_name'],
-                "email": row['email'],
-                "phone": row['phone'],
-                "roles": row['roles'] if isinstance(row['roles'], list) else [],
-                "active_role": row['active_role'],
-                "role_ids": role_ids
-            }
+    return pooled_connect(database_url, row_factory=dict_row)
 
 
 # ============================================
@@ -126,9 +74,9 @@ class RequestsCountResponse(BaseModel):
 # ============================================
 
 @router.get("/api/student/my-course-requests", response_model=List[CourseRequestResponse])
-async def get_my_course_requests(
+def get_my_course_requests(
     status: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get courses requested/uploaded by the current student
@@ -195,9 +143,9 @@ async def get_my_course_requests(
 # ============================================
 
 @router.get("/api/student/my-school-requests", response_model=List[SchoolRequestResponse])
-async def get_my_school_requests(
+def get_my_school_requests(
     status: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get schools requested/registered by the current student
@@ -261,8 +209,8 @@ async def get_my_school_requests(
 # ============================================
 
 @router.get("/api/student/my-requests/counts", response_model=RequestsCountResponse)
-async def get_my_requests_counts(
-    current_user: dict = Depends(get_current_user)
+def get_my_requests_counts(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get counts of all request types for the current student
@@ -397,10 +345,10 @@ class ScheduleCreateRequest(BaseModel):
 
 
 @router.get("/api/student/my-schedules", response_model=List[ScheduleResponse])
-async def get_my_schedules(
+def get_my_schedules(
     status: Optional[str] = None,
     schedule_type: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get schedules for the current student
@@ -477,9 +425,9 @@ async def get_my_schedules(
 
 
 @router.post("/api/student/schedules", response_model=ScheduleResponse)
-async def create_schedule(
+def create_schedule(
     schedule_data: ScheduleCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Create a new schedule for the current student
@@ -560,10 +508,10 @@ async def create_schedule(
 
 
 @router.put("/api/student/schedules/{schedule_id}", response_model=ScheduleResponse)
-async def update_schedule(
+def update_schedule(
     schedule_id: int,
     schedule_data: ScheduleCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Update an existing schedule for the current student
@@ -651,9 +599,9 @@ async def update_schedule(
 
 
 @router.delete("/api/student/schedules/{schedule_id}")
-async def delete_schedule(
+def delete_schedule(
     schedule_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Delete a schedule for the current student
@@ -687,10 +635,10 @@ async def delete_schedule(
 
 
 @router.patch("/api/student/schedules/{schedule_id}/status")
-async def update_schedule_status(
+def update_schedule_status(
     schedule_id: int,
     status: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Update the status of a schedule (active, completed, cancelled)
@@ -768,9 +716,9 @@ class SessionCountsResponse(BaseModel):
 
 
 @router.get("/api/student/my-sessions", response_model=List[SessionResponse])
-async def get_my_sessions(
+def get_my_sessions(
     status: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get tutoring sessions for the current student
@@ -881,8 +829,8 @@ async def get_my_sessions(
 
 
 @router.get("/api/student/my-sessions/counts", response_model=SessionCountsResponse)
-async def get_my_sessions_counts(
-    current_user: dict = Depends(get_current_user)
+def get_my_sessions_counts(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get session counts by status for the current student
@@ -930,8 +878,8 @@ async def get_my_sessions_counts(
 
 
 @router.get("/api/student/schedule-panel/counts")
-async def get_schedule_panel_counts(
-    current_user: dict = Depends(get_current_user)
+def get_schedule_panel_counts(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get combined counts for schedule panel cards (schedules + sessions)
@@ -11,38 +11,21 @@ Table columns:
 - created_at, updated_at, is_featured, helpful_count
 """
 
-from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_claims
 import os
-import jwt
 from dotenv import load_dotenv
 
 load_dotenv()
 
 router = APIRouter()
 DATABASE_URL = os.getenv('DATABASE_URL')
-SECRET_KEY = os.getenv('SECRET_KEY')
 
-def get_current_user(authorization: str = Header(None)):
-    """Extract user from JWT token"""
-    if not authorization or not authorization.startswith('Bearer '):
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
-    token = authorization.replace('Bearer ', '')
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        # Normalize user_id from 'sub' field
-        user_id = payload.get('sub')
-        if user_id:
-            payload['user_id'] = int(user_id)
-        return payload
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Invalid token")
 
 # Pydantic Models
 class StudentReviewCreate(BaseModel):
@@ -79,9 +62,9 @@ class StudentReviewResponse(BaseModel):
     helpful_count: int
 
 @router.get("/api/student/{student_id}/reviews", response_model=dict)
-async def get_student_reviews_for_view(
+def get_student_reviews_for_view(
     student_id: int,  # This is student_profiles.id
-    authorization: str = Header(None)
+    current_user: dict = Depends(get_current_user_claims)
 ):
     """
     Get all reviews for a specific student with aggregated stats
@@ -101,10 +84,8 @@ async def get_student_reviews_for_view(
         }
     }
     """
-    # Verify authentication
-    get_current_user(authorization)
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -189,7 +170,7 @@ async def get_student_reviews_for_view(
 
 
 @router.get("/api/student/reviews/{student_id}", response_model=List[StudentReviewResponse])
-async def get_student_reviews(
+def get_student_reviews(
     student_id: int,  # This is student_profiles.id
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
@@ -201,7 +182,7 @@ async def get_student_reviews(
     student_id: The student_profiles.id (not users.id)
     """
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -266,24 +247,21 @@ async def get_student_reviews(
         conn.close()
 
 @router.post("/api/student/reviews/{student_id}", response_model=dict)
-async def create_student_review(
+def create_student_review(
     student_id: int,  # This is student_profiles.id
     review: StudentReviewCreate,
-    authorization: str = Header(None)
+    current_user: dict = Depends(get_current_user_claims)
 ):
     """
     Create a new review for a student (tutors and parents only)
     student_id: The student_profiles.id (not users.id)
     """
 
-    # Verify authentication
-    current_user = get_current_user(authorization)
-
     # Get reviewer role and profile ID
     reviewer_role = None
     reviewer_profile_id = None
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -350,13 +328,13 @@ async def create_student_review(
         conn.close()
 
 @router.get("/api/student/reviews/{student_id}/stats", response_model=dict)
-async def get_student_review_stats(student_id: int):
+def get_student_review_stats(student_id: int):
     """
     Get review statistics for a student
     student_id: The student_profiles.id (not users.id)
     """
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -396,13 +374,13 @@ async def get_student_review_stats(student_id: int):
         conn.close()
 
 @router.get("/api/student/user/{user_id}/profile-id", response_model=dict)
-async def get_student_profile_id(user_id: int):
+def get_student_profile_id(user_id: int):
     """
     Convert user_id to student_profile_id
     This helper endpoint is needed because URLs use user_id but reviews table uses student_profile_id
     """
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -419,10 +397,10 @@ async def get_student_profile_id(user_id: int):
         conn.close()
 
 @router.put("/api/student/reviews/{review_id}/helpful", response_model=dict)
-async def mark_review_helpful(review_id: int):
+def mark_review_helpful(review_id: int):
     """Mark a review as helpful (increment helpful count)"""
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -450,10 +428,10 @@ async def mark_review_helpful(review_id: int):
         conn.close()
 
 @router.get("/api/student/reviews/single/{review_id}", response_model=dict)
-async def get_single_review(review_id: int):
+def get_single_review(review_id: int):
     """Get a single review by ID"""
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -491,16 +469,14 @@ async def get_single_review(review_id: int):
         conn.close()
 
 @router.put("/api/student/reviews/{review_id}", response_model=dict)
-async def update_student_review(
+def update_student_review(
     review_id: int,
     review: StudentReviewCreate,
-    authorization: str = Header(None)
+    current_user: dict = Depends(get_current_user_claims)
 ):
     """Update a review (only by the original reviewer)"""
 
-    current_user = get_current_user(authorization)
-
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -573,15 +549,13 @@ async def update_student_review(
         conn.close()
 
 @router.delete("/api/student/reviews/{review_id}", response_model=dict)
-async def delete_student_review(
+def delete_student_review(
     review_id: int,
-    authorization: str = Header(None)
+    current_user: dict = Depends(get_current_user_claims)
 ):
     """Delete a review (only by the original reviewer)"""
 
-    current_user = get_current_user(authorization)
-
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -623,15 +597,13 @@ async def delete_student_review(
         conn.close()
 
 @router.get("/api/student/reviews/{student_id}/my-review", response_model=dict)
-async def get_my_review_for_student(
+def get_my_review_for_student(
     student_id: int,
-    authorization: str = Header(None)
+    current_user: dict = Depends(get_current_user_claims)
 ):
     """Check if current user has already reviewed this student and return that review"""
 
-    current_user = get_current_user(authorization)
-
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -43,7 +43,7 @@ def get_db():
 
 
 @router.get("/subscriptions", response_model=List[StudentSubscriptionResponse])
-async def get_student_subscriptions(
+def get_student_subscriptions(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -118,7 +118,7 @@ async def get_student_subscriptions(
 
 
 @router.get("/subscriptions/current")
-async def get_current_subscription(
+def get_current_subscription(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -158,7 +158,7 @@ async def get_current_subscription(
 
 
 @router.get("/subscriptions/{subscription_id}")
-async def get_subscription_details(
+def get_subscription_details(
     subscription_id: int,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
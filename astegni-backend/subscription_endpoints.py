@@ -50,14 +50,8 @@ def get_db():
         db.close()
 
 
-def get_current_user_id():
-    """Get current user ID from token - simplified for now"""
-    # TODO: Implement proper JWT token validation
-    return 1
-
-
 @router.get("/tutor/{tutor_profile_id}", response_model=List[SubscriptionResponse])
-async def get_tutor_subscriptions(
+def get_tutor_subscriptions(
     tutor_profile_id: int,
     db: Session = Depends(get_db),
     include_metrics: bool = True
@@ -133,7 +127,7 @@ async def get_tutor_subscriptions(
 
 
 @router.get("/current", response_model=Optional[SubscriptionResponse])
-async def get_current_subscription(
+def get_current_subscription(
     tutor_profile_id: int,
     db: Session = Depends(get_db)
 ):
@@ -209,7 +203,7 @@ async def get_current_subscription(
 
 
 @router.get("/metrics/{investment_id}")
-async def get_subscription_metrics(
+def get_subscription_metrics(
     investment_id: int,
     db: Session = Depends(get_db)
 ):
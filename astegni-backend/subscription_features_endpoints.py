@@ -44,7 +44,7 @@ def get_admin_db():
 
 
 @router.get("/features", response_model=List[FeatureResponse])
-async def get_subscription_features(
+def get_subscription_features(
     role: Optional[str] = None,
     current_user=Depends(get_current_user),
     user_db: Session = Depends(get_user_db),
@@ -110,7 +110,7 @@ async def get_subscription_features(
 
 
 @router.get("/features/check/{feature_name}")
-async def check_feature_access(
+def check_feature_access(
     feature_name: str,
     role: Optional[str] = None,
     current_user=Depends(get_current_user),
@@ -183,7 +183,7 @@ async def check_feature_access(
 
 
 @router.get("/plan/features/all")
-async def get_all_plan_features(
+def get_all_plan_features(
     current_user=Depends(get_current_user),
     user_db: Session = Depends(get_user_db),
     admin_db: Session = Depends(get_admin_db)
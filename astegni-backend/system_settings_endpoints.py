@@ -21,6 +21,7 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime, timedelta
 import psycopg
+from db_pool import pooled_connect
 from dotenv import load_dotenv
 import os
 import json
@@ -174,7 +175,7 @@ class BackupHistory(BaseModel):
 
 def get_connection():
     """Get admin database connection (astegni_admin_db)"""
-    return psycopg.connect(ADMIN_DATABASE_URL)
+    return pooled_connect(ADMIN_DATABASE_URL)
 
 
 def update_env_file(updates: Dict[str, str]):
@@ -245,7 +246,7 @@ def update_env_file(updates: Dict[str, str]):
 # ============================================
 
 @router.get("/dashboard")
-async def get_system_dashboard():
+def get_system_dashboard():
     """Get system dashboard with all statistics (returns 0 if no data)"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -320,7 +321,7 @@ async def get_system_dashboard():
 
 
 @router.get("/general-settings")
-async def get_general_settings():
+def get_general_settings():
     """Get general settings"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -395,7 +396,7 @@ async def get_general_settings():
 
 
 @router.put("/general-settings")
-async def update_general_settings(settings: Dict[str, Any]):
+def update_general_settings(settings: Dict[str, Any]):
     """Update general settings"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -452,7 +453,7 @@ async def update_general_settings(settings: Dict[str, Any]):
 
 
 @router.get("/media-settings")
-async def get_media_settings():
+def get_media_settings():
     """Get media settings for all tiers"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -525,7 +526,7 @@ async def get_media_settings():
 
 
 @router.put("/media-settings/{tier_name}")
-async def update_media_settings(tier_name: str, settings: Dict[str, Any]):
+def update_media_settings(tier_name: str, settings: Dict[str, Any]):
     """Update media settings for a specific tier (subscription_plan_id)"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -583,7 +584,7 @@ async def update_media_settings(tier_name: str, settings: Dict[str, Any]):
 
 
 @router.get("/impressions")
-async def get_impression_stats():
+def get_impression_stats():
     """Get impression statistics (returns 0 if no data)"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -627,7 +628,7 @@ async def get_impression_stats():
 
 
 @router.get("/email-config")
-async def get_email_config():
+def get_email_config():
     """Get email configuration"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -680,7 +681,7 @@ async def get_email_config():
 
 
 @router.get("/email-templates")
-async def get_email_templates():
+def get_email_templates():
     """Get all email templates"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -712,7 +713,7 @@ async def get_email_templates():
 
 
 @router.put("/email-config")
-async def update_email_config(config: Dict[str, Any]):
+def update_email_config(config: Dict[str, Any]):
     """Update email configuration in both database and .env file"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -828,7 +829,7 @@ async def update_email_config(config: Dict[str, Any]):
 
 
 @router.get("/email-templates/{template_id}")
-async def get_email_template(template_id: int):
+def get_email_template(template_id: int):
     """Get a specific email template by ID"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -862,7 +863,7 @@ async def get_email_template(template_id: int):
 
 
 @router.put("/email-templates/{template_id}")
-async def update_email_template(template_id: int, template: Dict[str, Any]):
+def update_email_template(template_id: int, template: Dict[str, Any]):
     """Update an email template"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -895,7 +896,7 @@ async def update_email_template(template_id: int, template: Dict[str, Any]):
 
 
 @router.post("/test-email")
-async def send_test_email(data: Dict[str, Any]):
+def send_test_email(data: Dict[str, Any]):
     """Send a test email to verify configuration"""
     from email_service import email_service
 
@@ -923,7 +924,7 @@ async def send_test_email(data: Dict[str, Any]):
 # Add these endpoints to system_settings_endpoints.py after the @router.post("/test-email") endpoint (line 807)
 
 @router.get("/sms-config")
-async def get_sms_config():
+def get_sms_config():
     """Get SMS configuration"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -969,7 +970,7 @@ async def get_sms_config():
 
 
 @router.put("/sms-config")
-async def update_sms_config(config: Dict[str, Any]):
+def update_sms_config(config: Dict[str, Any]):
     """Update SMS configuration"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1049,7 +1050,7 @@ async def update_sms_config(config: Dict[str, Any]):
 
 
 @router.get("/sms-stats")
-async def get_sms_stats():
+def get_sms_stats():
     """Get SMS statistics for today"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1082,7 +1083,7 @@ async def get_sms_stats():
 
 
 @router.post("/test-sms-connection")
-async def test_sms_connection():
+def test_sms_connection():
     """Test SMS connection (verify Twilio credentials)"""
     try:
         from sms_service import sms_service
@@ -1110,7 +1111,7 @@ async def test_sms_connection():
 
 
 @router.post("/send-test-sms")
-async def send_test_sms(data: Dict[str, Any]):
+def send_test_sms(data: Dict[str, Any]):
     """Send a test SMS to verify configuration"""
     from sms_service import sms_service
 
@@ -1157,7 +1158,7 @@ async def send_test_sms(data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Error sending test SMS: {str(e)}")
 
 @router.get("/payment-gateways")
-async def get_payment_gateways():
+def get_payment_gateways():
     """Get payment gateways"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1189,7 +1190,7 @@ async def get_payment_gateways():
 
 
 @router.get("/subscription-tiers")
-async def get_subscription_tiers():
+def get_subscription_tiers():
     """Get subscription tiers"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1222,7 +1223,7 @@ async def get_subscription_tiers():
 
 
 @router.get("/affiliate-settings")
-async def get_affiliate_settings():
+def get_affiliate_settings():
     """Get affiliate settings"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1261,7 +1262,7 @@ async def get_affiliate_settings():
 
 
 @router.get("/security-settings")
-async def get_security_settings():
+def get_security_settings():
     """Get security settings"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1308,7 +1309,7 @@ async def get_security_settings():
 
 
 @router.get("/backup-config")
-async def get_backup_config():
+def get_backup_config():
     """Get backup configuration"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1350,7 +1351,7 @@ async def get_backup_config():
 
 
 @router.get("/backup-history")
-async def get_backup_history(limit: int = 50):
+def get_backup_history(limit: int = 50):
     """Get backup history (returns empty array if no data)"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1383,7 +1384,7 @@ async def get_backup_history(limit: int = 50):
 
 
 @router.get("/maintenance")
-async def get_maintenance_mode():
+def get_maintenance_mode():
     """Get maintenance mode status"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1420,7 +1421,7 @@ async def get_maintenance_mode():
 
 
 @router.put("/maintenance")
-async def update_maintenance_mode(data: Dict[str, Any]):
+def update_maintenance_mode(data: Dict[str, Any]):
     """Update maintenance mode"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1450,7 +1451,7 @@ async def update_maintenance_mode(data: Dict[str, Any]):
 
 
 @router.get("/logs")
-async def get_system_logs(limit: int = 100, log_level: Optional[str] = None):
+def get_system_logs(limit: int = 100, log_level: Optional[str] = None):
     """Get system logs (returns empty array if no data)"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1491,7 +1492,7 @@ async def get_system_logs(limit: int = 100, log_level: Optional[str] = None):
 
 
 @router.get("/performance")
-async def get_performance_metrics():
+def get_performance_metrics():
     """Get real-time performance metrics (returns 0 if no data)"""
     conn = get_connection()
     cursor = conn.cursor()
@@ -1564,7 +1565,7 @@ def verify_admin_token(authorization: str):
 
 
 @media_router.get("/system-media")
-async def get_system_media_admin(authorization: str = Header(None)):
+def get_system_media_admin(authorization: str = Header(None)):
     """Get all system media (images and videos) for admin panel"""
     verify_admin_token(authorization)
 
@@ -1734,7 +1735,7 @@ async def upload_system_media(
 
 
 @media_router.delete("/{media_type}/{media_id}")
-async def delete_system_media_admin(
+def delete_system_media_admin(
     media_type: str,
     media_id: int,
     authorization: str = Header(None)
@@ -1802,7 +1803,7 @@ async def delete_system_media_admin(
 # ============================================
 
 @router.get("/upload-limits")
-async def get_upload_limits(authorization: str = Header(None)):
+def get_upload_limits(authorization: str = Header(None)):
     """Get all upload/storage limits linked to subscription plans"""
     verify_admin_token(authorization)
 
@@ -1857,7 +1858,7 @@ async def get_upload_limits(authorization: str = Header(None)):
 
 
 @router.get("/subscription-plans-search")
-async def search_subscription_plans(
+def search_subscription_plans(
     q: str = "",
     authorization: str = Header(None)
 ):
@@ -1904,7 +1905,7 @@ async def search_subscription_plans(
 
 
 @router.post("/upload-limits")
-async def create_upload_limit(
+def create_upload_limit(
     data: Dict[str, Any],
     authorization: str = Header(None)
 ):
@@ -1981,7 +1982,7 @@ async def create_upload_limit(
 
 
 @router.put("/upload-limits/{setting_id}")
-async def update_upload_limit(
+def update_upload_limit(
     setting_id: int,
     data: Dict[str, Any],
     authorization: str = Header(None)
@@ -2032,7 +2033,7 @@ async def update_upload_limit(
 
 
 @router.delete("/upload-limits/{setting_id}")
-async def delete_upload_limit(
+def delete_upload_limit(
     setting_id: int,
     authorization: str = Header(None)
 ):
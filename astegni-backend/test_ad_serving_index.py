@@ -0,0 +1,67 @@
+"""
+Test the in-process ad serving index (ad_serving_index.py)
+For every placement x country x page combination, the set of creatives the
+index can serve must equal the rows the old SQL filter returns (no LIMIT),
+and pick() must return distinct creatives from that set.
+
+Needs the advertiser database:
+    python test_ad_serving_index.py
+"""
+
+import sys
+import os
+import itertools
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from ad_serving_index import get_ad_index, refresh_ad_index
+from benchmark_ad_serving import sql_pick
+
+
+def _combinations(index):
+    countries = {None, "ET", "US"}
+    pages = {None, "home", "tutor_profile", "find_tutors"}
+    for row in index.rows:
+        if row[13]:
+            countries.add(row[13])
+        countries.update(code for code in (row[10] or []) if code)
+        pages.update(page for page in (row[14] or []) if page)
+    return itertools.product(index.placements, countries, pages)
+
+
+def test_index_matches_sql():
+    refresh_ad_index()
+    index = get_ad_index()
+    print(f"Index: {index.stats()}")
+
+    checked = 0
+    for placement, country, page in _combinations(index):
+        expected = {row[4] for row in sql_pick(placement, 100000, country, page)}
+        served = {entry.ad["media_id"] for entry in index.candidates(placement, country, page)}
+        assert served == expected, f"{placement}/{country}/{page}: index {served} != sql {expected}"
+
+        picked = index.pick(placement, 3, user_country=country, page_location=page)
+        assert len(picked) == min(3, len(expected))
+        assert len({ad["media_id"] for ad in picked}) == len(picked)
+        assert {ad["media_id"] for ad in picked} <= expected
+        checked += 1
+
+    print(f"[OK] Index matches the SQL filter for {checked} placement/country/page combinations")
+
+
+def test_weighted_pick_stays_in_candidates():
+    index = get_ad_index()
+    for placement in index.placements:
+        candidates = {entry.ad["media_id"] for entry in index.candidates(placement, None, None)}
+        picked = index.pick(placement, 2, weighted=True)
+        assert {ad["media_id"] for ad in picked} <= candidates
+    print("[OK] Weighted picks come from the same candidates")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Ad serving index")
+    print("=" * 80)
+    test_index_matches_sql()
+    test_weighted_pick_stays_in_candidates()
+    print("\n[OK] Ad serving index tests passed")
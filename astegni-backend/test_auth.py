@@ -0,0 +1,114 @@
+"""
+Test the shared auth dependencies (auth.py)
+Checks token decoding, rejection of admin/advertiser tokens, and that the
+claims dependency never touches the database while get_current_user is
+resolved once per request.
+
+Run against a seeded database:
+    python test_auth.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+import jwt
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from auth import decode_access_token, get_current_user, get_current_user_claims, get_current_user_dict
+from config import SECRET_KEY, ALGORITHM
+from models import SessionLocal, User, engine
+from user_context_cache import clear_user_context_cache
+from utils import create_access_token
+
+
+def _first_user_id():
+    db = SessionLocal()
+    try:
+        user = db.query(User).order_by(User.id).first()
+        assert user is not None, "No users found - seed the database first"
+        return user.id
+    finally:
+        db.close()
+
+
+def _client():
+    app = FastAPI()
+
+    @app.get("/claims")
+    def claims(user: dict = Depends(get_current_user_claims)):
+        return user
+
+    @app.get("/user")
+    def user(user=Depends(get_current_user), user_dict: dict = Depends(get_current_user_dict)):
+        return {"id": user.id, "profile_id": user.profile_id, "email": user_dict["email"]}
+
+    return TestClient(app)
+
+
+def test_decode_access_token():
+    token = create_access_token(data={"sub": "42", "role": "tutor", "role_ids": {"tutor": "7"}})
+    claims = decode_access_token(token)
+    assert claims.user_id == 42 and claims.profile_id == 7
+    assert claims.as_dict()["roles"] == ["tutor"]
+
+    for bad in (None, "junk", jwt.encode({"sub": "1", "type": "admin"}, SECRET_KEY, algorithm=ALGORITHM)):
+        try:
+            decode_access_token(bad)
+            assert False, f"token accepted: {bad}"
+        except HTTPException as e:
+            assert e.status_code == 401
+    print("[OK] Tokens decoded; missing, invalid and admin tokens rejected")
+
+
+def test_claims_dependency_is_query_free():
+    client = _client()
+    token = create_access_token(data={"sub": str(_first_user_id()), "role": "student", "role_ids": {}})
+
+    queries = []
+    listener = lambda *args: queries.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.get("/claims", headers={"Authorization": f"Bearer {token}"})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    assert queries == []
+    print(f"[OK] Claims dependency: {response.json()['id']} with 0 queries")
+
+
+def test_user_resolved_once_per_request():
+    clear_user_context_cache()
+    client = _client()
+    user_id = _first_user_id()
+    token = create_access_token(data={"sub": str(user_id), "role": "student", "role_ids": {}})
+
+    queries = []
+    listener = lambda *args: queries.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        first = client.get("/user", headers={"Authorization": f"Bearer {token}"})
+        cold = len(queries)
+        second = client.get("/user", headers={"Authorization": f"Bearer {token}"})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["id"] == user_id
+    assert cold == 1, f"expected one SELECT for a cold request, got {cold}"
+    assert len(queries) == cold, "warm request should not query"
+    print(f"[OK] User dependency: {cold} query cold, 0 warm")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Auth dependencies")
+    print("=" * 80)
+    test_decode_access_token()
+    test_claims_dependency_is_query_free()
+    test_user_resolved_once_per_request()
+    print("\n[OK] Auth tests passed")
@@ -0,0 +1,144 @@
+"""
+Test streaming B2 downloads (b2_downloads.py + BackblazeService.open_download)
+
+- Range headers: single, open-ended and suffix ranges; malformed or
+  multi-range headers fall back to the whole file; out-of-range is a 416
+- Whole and ranged downloads stream the right bytes from B2
+- Small objects are cached on disk as they stream, served from the cache
+  afterwards (ranges too), evicted least-recently-used, and dropped on delete
+- An abandoned download leaves no cache entry or temp file behind
+- KYC documents and selfies (PRIVATE_FILE_PREFIXES) are never written to the cache
+
+Runs against b2sdk's RawSimulator in a temp cache directory - no database or
+B2 credentials needed:
+    python test_b2_downloads.py
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from b2sdk.v2 import B2Api, B2HttpApiConfig, InMemoryAccountInfo, RawSimulator
+
+from b2_downloads import DownloadCache, RangeNotSatisfiable, parse_range_header, resolve_range
+from backblaze_service import BackblazeService
+
+KB = 1024
+
+
+class RealisticPartSizes(RawSimulator):
+    MIN_PART_SIZE = 5 * 1024 * KB
+
+
+def simulated_service(cache_dir: str, cache_kb: int, max_object_kb: int) -> BackblazeService:
+    api = B2Api(InMemoryAccountInfo(), api_config=B2HttpApiConfig(_raw_api_class=RealisticPartSizes))
+    key_id, application_key = api.session.raw_api.create_account()
+    api.authorize_account("production", key_id, application_key)
+
+    service = BackblazeService.__new__(BackblazeService)
+    service.configured = True
+    service.allow_mock = False
+    service.b2_api = api
+    service.bucket = api.create_bucket("astegni-test", "allPublic")
+    service.download_cache = DownloadCache(cache_dir, cache_kb * KB, max_object_kb * KB)
+    service.index_storage = False
+    return service
+
+
+def test_range_parsing():
+    assert parse_range_header("bytes=0-99") == (0, 99)
+    assert parse_range_header("bytes=500-") == (500, None)
+    assert parse_range_header("bytes=-200") == (None, 200)
+    for header in (None, "", "items=0-1", "bytes=0-1,5-6", "bytes=9-3", "bytes=a-b", "bytes=-"):
+        assert parse_range_header(header) is None, header
+
+    assert resolve_range(None, 1000) == (0, 999)
+    assert resolve_range((500, None), 1000) == (500, 999)
+    assert resolve_range((900, 5000), 1000) == (900, 999)
+    assert resolve_range((None, 200), 1000) == (800, 999)
+    assert resolve_range((None, 5000), 1000) == (0, 999)
+    for spec in ((1000, None), (None, 0)):
+        try:
+            resolve_range(spec, 1000)
+            assert False, f"Expected RangeNotSatisfiable for {spec}"
+        except RangeNotSatisfiable as e:
+            assert e.size == 1000
+    print("[OK] Range headers parse and resolve")
+
+
+def test_streaming_and_cache():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service = simulated_service(cache_dir, cache_kb=1024, max_object_kb=600)
+        picture = os.urandom(500 * KB)
+        video = os.urandom(900 * KB)
+        service.bucket.upload_bytes(picture, "images/profile/profile_1/a.jpg", content_type="image/jpeg")
+        service.bucket.upload_bytes(video, "videos/ad/profile_1/v.mp4", content_type="video/mp4")
+
+        # First download streams from B2 and fills the cache
+        with service.open_download("images/profile/profile_1/a.jpg") as download:
+            assert not download.cached and download.content_type == "image/jpeg"
+            assert b"".join(download) == picture
+        with service.open_download("images/profile/profile_1/a.jpg", (100, 199)) as download:
+            assert download.cached and download.partial
+            assert download.read() == picture[100:200]
+            assert download.headers()["Content-Range"] == f"bytes 100-199/{len(picture)}"
+
+        # Larger than max_object_kb: ranges and whole downloads come from B2 every time
+        with service.open_download("videos/ad/profile_1/v.mp4", (None, 1000)) as download:
+            assert not download.cached and download.read() == video[-1000:]
+        assert service.download_file("videos/ad/profile_1/v.mp4") == video
+        with service.open_download("videos/ad/profile_1/v.mp4") as download:
+            assert not download.cached
+
+        try:
+            service.open_download("videos/ad/profile_1/v.mp4", (len(video), None))
+            assert False, "Expected RangeNotSatisfiable"
+        except RangeNotSatisfiable:
+            pass
+        assert service.open_download("images/profile/profile_1/missing.jpg") is None
+
+        # Abandoned mid-stream: nothing cached, no temp file left
+        service.bucket.upload_bytes(picture[:300 * KB], "images/profile/profile_1/b.jpg")
+        download = service.open_download("images/profile/profile_1/b.jpg")
+        next(download)
+        download.close()
+        assert sorted(os.listdir(cache_dir)) == [os.path.basename(service.download_cache.path_for(
+            "images/profile/profile_1/a.jpg"))]
+
+        # 500KB + 300KB + 400KB > 1MB: the least recently used (a.jpg) is evicted
+        service.bucket.upload_bytes(picture[:400 * KB], "images/profile/profile_1/c.jpg")
+        assert service.download_file("images/profile/profile_1/b.jpg") == picture[:300 * KB]
+        assert service.download_file("images/profile/profile_1/c.jpg") == picture[:400 * KB]
+        stats = service.download_cache.stats()
+        assert stats["entries"] == 2 and stats["bytes"] == 700 * KB, stats
+        assert not os.path.exists(service.download_cache.path_for("images/profile/profile_1/a.jpg"))
+
+        assert service.delete_file("images/profile/profile_1/c.jpg")
+        assert service.open_download("images/profile/profile_1/c.jpg") is None
+        print(f"[OK] Streaming downloads and LRU disk cache ({stats})")
+
+
+def test_private_files_not_cached():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service = simulated_service(cache_dir, cache_kb=1024, max_object_kb=600)
+        document = os.urandom(100 * KB)
+        service.bucket.upload_bytes(document, "images/kyc/documents/user_1/id.jpg", content_type="image/jpeg")
+
+        for _ in range(2):
+            assert service.download_file("images/kyc/documents/user_1/id.jpg") == document
+            with service.open_download("images/kyc/documents/user_1/id.jpg") as download:
+                assert not download.cached and download.read() == document
+        assert os.listdir(cache_dir) == []
+        assert service.download_cache.stats()["entries"] == 0
+        print("[OK] KYC images bypass the disk cache")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: B2 downloads")
+    print("=" * 80)
+    test_range_parsing()
+    test_streaming_and_cache()
+    test_private_files_not_cached()
+    print("\n[OK] B2 download tests passed")
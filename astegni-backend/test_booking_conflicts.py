@@ -0,0 +1,90 @@
+"""
+Test the booking conflict helpers (booking_conflicts.py) that run without a database
+
+- slot_range: sessions ending at or before their start run into the next day
+- schedule_conflicts: recurring rules (weekday, months, year) and specific dates
+  are compared on the dates they actually apply
+- before migrate_add_session_slots.py the session checks find nothing
+  instead of failing
+
+The session_slots queries need migrate_add_session_slots.py and a database;
+benchmark_booking_conflicts.py checks them against a full scan.
+    python test_booking_conflicts.py
+"""
+
+import sys
+import os
+from datetime import date, datetime, time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import booking_conflicts
+from booking_conflicts import find_conflicts, find_session_conflicts, schedule_conflicts, slot_range
+
+
+def schedule(schedule_id, start, end, days=(), months=(), year=2026, dates=None):
+    """(id, schedule_type, year, months, days, specific_dates, start_time, end_time)"""
+    return (schedule_id, 'specific' if dates else 'recurring', year, list(months), list(days),
+            dates or [], time(*start), time(*end))
+
+
+def test_slot_range():
+    assert slot_range(date(2026, 3, 3), time(16), time(17, 30)) == (
+        datetime(2026, 3, 3, 16), datetime(2026, 3, 3, 17, 30))
+    assert slot_range(date(2026, 3, 3), time(23), time(0, 30)) == (
+        datetime(2026, 3, 3, 23), datetime(2026, 3, 4, 0, 30))
+    print("[OK] Session slot ranges")
+
+
+def test_schedule_conflicts():
+    school = schedule(1, (8, 0), (12, 0), days=["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"])
+    others = [
+        schedule(2, (11, 0), (13, 0), days=["Saturday"]),                           # other weekday
+        schedule(3, (11, 30), (12, 30), days=["Wednesday"]),                         # overlaps
+        schedule(4, (12, 0), (13, 0), days=["Monday"]),                              # touches only
+        schedule(5, (9, 0), (10, 0), days=["Monday"], year=2025),                    # other year
+        schedule(6, (9, 0), (10, 0), dates=["2026-03-07"]),                          # a Saturday
+        schedule(7, (9, 0), (10, 0), dates=["2026-03-09"]),                          # a Monday
+    ]
+    assert sorted(schedule_conflicts(school, others)) == [3, 7]
+
+    exam = schedule(8, (10, 0), (11, 0), dates=["2026-07-01"])
+    summer = [
+        schedule(9, (9, 0), (12, 0), days=["Wednesday"], months=["June", "July"]),
+        schedule(10, (9, 0), (12, 0), days=["Wednesday"], months=["January"]),
+    ]
+    assert schedule_conflicts(exam, summer) == [9]
+    assert schedule_conflicts(exam, []) == []
+    print("[OK] Schedule overlaps")
+
+
+class NoSlotsCursor:
+    """A database without session_slots: only answers the to_regclass check"""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+        assert "to_regclass" in sql, "queried session_slots"
+
+    def fetchone(self):
+        return (False,)
+
+
+def test_missing_session_slots():
+    booking_conflicts._slots_ready = False
+    cur = NoSlotsCursor()
+    assert find_conflicts(cur, 1, [2], date(2026, 3, 3), time(16), time(17)) == []
+    assert find_session_conflicts(cur, [10, 11]) == []
+    assert len(cur.statements) == 2
+    print("[OK] No session_slots table: conflicts are skipped, not a 500")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Booking conflicts")
+    print("=" * 80)
+    test_slot_range()
+    test_schedule_conflicts()
+    test_missing_session_slots()
+    print("\n[OK] Booking conflict tests passed")
@@ -0,0 +1,136 @@
+"""
+Test the denormalized conversation summary (migrate_add_conversation_summary.py)
+Inserts, soft-deletes and reads messages in an existing two-person conversation
+inside a transaction that is rolled back at the end, and checks the triggers
+keep conversations.last_message_* and the participants' unread_count /
+last_activity_at in step. Also checks the conversation list query plan does
+not touch chat_messages beyond the one last-message lookup per row.
+
+Needs the local database with the migration applied:
+    python migrate_add_conversation_summary.py
+    python test_conversation_summary.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from psycopg.rows import dict_row
+from db_pool import pooled_connect, DATABASE_URL
+
+
+def _find_direct_conversation(cur):
+    cur.execute("""
+        SELECT conversation_id, array_agg(user_id ORDER BY user_id) as user_ids
+        FROM conversation_participants
+        WHERE is_active = true
+        GROUP BY conversation_id
+        HAVING COUNT(*) = 2
+        LIMIT 1
+    """)
+    return cur.fetchone()
+
+
+def _summary(cur, conversation_id, reader_id):
+    cur.execute("""
+        SELECT c.last_message_id, c.last_message_sender_user_id, cp.unread_count, cp.last_activity_at
+        FROM conversations c
+        JOIN conversation_participants cp ON cp.conversation_id = c.id AND cp.user_id = %s
+        WHERE c.id = %s
+    """, (reader_id, conversation_id))
+    return cur.fetchone()
+
+
+def _send(cur, conversation_id, sender_id, content):
+    cur.execute("""
+        INSERT INTO chat_messages (conversation_id, sender_user_id, message_type, content, created_at, updated_at)
+        VALUES (%s, %s, 'text', %s, clock_timestamp(), clock_timestamp())
+        RETURNING id
+    """, (conversation_id, sender_id, content))
+    return cur.fetchone()['id']
+
+
+def test_triggers_maintain_summary():
+    conn = pooled_connect(DATABASE_URL, row_factory=dict_row)
+    cur = conn.cursor()
+    try:
+        conv = _find_direct_conversation(cur)
+        if not conv:
+            print("[SKIP] No two-person conversation in the database")
+            return
+        conversation_id = conv['conversation_id']
+        sender_id, reader_id = conv['user_ids']
+
+        cur.execute("""
+            UPDATE conversation_participants SET unread_count = 0, last_read_at = NOW()
+            WHERE conversation_id = %s
+        """, (conversation_id,))
+
+        first_id = _send(cur, conversation_id, sender_id, "summary test 1")
+        second_id = _send(cur, conversation_id, sender_id, "summary test 2")
+        summary = _summary(cur, conversation_id, reader_id)
+        print(f"After 2 messages: {summary}")
+        assert summary['last_message_id'] == second_id
+        assert summary['last_message_sender_user_id'] == sender_id
+        assert summary['unread_count'] == 2
+
+        # The sender's own messages are never unread for them
+        assert _summary(cur, conversation_id, sender_id)['unread_count'] == 0
+
+        cur.execute("UPDATE chat_messages SET is_deleted = true WHERE id = %s", (second_id,))
+        summary = _summary(cur, conversation_id, reader_id)
+        print(f"After soft delete: {summary}")
+        assert summary['last_message_id'] == first_id
+        assert summary['unread_count'] == 1
+
+        cur.execute("DELETE FROM chat_messages WHERE id = %s", (first_id,))
+        summary = _summary(cur, conversation_id, reader_id)
+        print(f"After delete: {summary}")
+        assert summary['unread_count'] == 0
+        assert summary['last_message_id'] not in (first_id, second_id)
+
+        print("[OK] Insert / soft delete / delete keep the summary in step")
+    finally:
+        conn.rollback()
+        cur.close()
+        conn.close()
+
+
+def test_list_query_plan():
+    conn = pooled_connect(DATABASE_URL, row_factory=dict_row)
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT user_id FROM conversation_participants WHERE is_active = true LIMIT 1")
+        row = cur.fetchone()
+        if not row:
+            print("[SKIP] No conversation participants")
+            return
+
+        cur.execute("""
+            EXPLAIN
+            SELECT c.id, cp.unread_count, m.content
+            FROM conversation_participants cp
+            JOIN conversations c ON c.id = cp.conversation_id
+            LEFT JOIN chat_messages m ON m.id = c.last_message_id
+            WHERE cp.user_id = %s AND cp.is_active = true
+            ORDER BY cp.last_activity_at DESC, cp.conversation_id DESC
+            LIMIT 50
+        """, (row['user_id'],))
+        plan = "\n".join(r['QUERY PLAN'] for r in cur.fetchall())
+        print(plan)
+        assert "SubPlan" not in plan
+        print("[OK] Conversation list has no correlated subqueries")
+    finally:
+        conn.rollback()
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Conversation summary")
+    print("=" * 80)
+    test_triggers_maintain_summary()
+    test_list_query_plan()
+    print("\n[OK] Conversation summary tests passed")
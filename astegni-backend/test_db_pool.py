@@ -0,0 +1,94 @@
+"""
+Test the shared connection pools (db_pool.py)
+Checks that pooled connections are reused, returned on close()/with-exit/GC,
+and that the pool never opens more than DB_POOL_MAX_SIZE connections.
+
+Run against a local database:
+    python test_db_pool.py
+"""
+
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from psycopg.rows import dict_row
+from db_pool import pooled_connect, get_pool_stats, DATABASE_URL, DB_POOL_MAX_SIZE
+
+
+def _user_pool_stats():
+    return get_pool_stats()["sync"]["user"]
+
+
+def test_connection_is_reused():
+    """close() returns the backend to the pool instead of disconnecting"""
+    conn = pooled_connect(DATABASE_URL)
+    cur = conn.cursor()
+    cur.execute("SELECT pg_backend_pid()")
+    first_pid = cur.fetchone()[0]
+    conn.close()
+
+    conn = pooled_connect(DATABASE_URL)
+    cur = conn.cursor()
+    cur.execute("SELECT pg_backend_pid()")
+    pids = {first_pid, cur.fetchone()[0]}
+    conn.close()
+
+    print(f"[OK] Backend pids seen: {pids}")
+    assert conn.closed
+    assert _user_pool_stats()["checked_out"] == 0
+
+
+def test_row_factory_is_reset():
+    """dict_row on one checkout must not leak into the next one"""
+    with pooled_connect(DATABASE_URL, row_factory=dict_row) as conn:
+        row = conn.execute("SELECT 1 AS one").fetchone()
+        assert row == {"one": 1}
+
+    with pooled_connect(DATABASE_URL) as conn:
+        row = conn.execute("SELECT 1 AS one").fetchone()
+        assert row == (1,)
+    print("[OK] row_factory reset between checkouts")
+
+
+def test_leaked_connection_is_returned():
+    """A connection that is never closed goes back when the wrapper is collected"""
+    def leak():
+        conn = pooled_connect(DATABASE_URL)
+        conn.cursor().execute("SELECT 1")
+
+    leak()
+    assert _user_pool_stats()["checked_out"] == 0
+    print("[OK] Leaked connection returned to the pool")
+
+
+def test_pool_is_bounded():
+    """More concurrent requests than max_size wait instead of opening connections"""
+    def work(_):
+        conn = pooled_connect(DATABASE_URL)
+        try:
+            conn.cursor().execute("SELECT pg_sleep(0.05)")
+        finally:
+            conn.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=DB_POOL_MAX_SIZE * 3) as executor:
+        list(executor.map(work, range(DB_POOL_MAX_SIZE * 6)))
+    elapsed = time.perf_counter() - start
+
+    stats = _user_pool_stats()
+    print(f"[OK] {DB_POOL_MAX_SIZE * 6} requests in {elapsed:.2f}s | {stats}")
+    assert stats["size"] <= DB_POOL_MAX_SIZE
+    assert stats["checked_out"] == 0
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Shared connection pools")
+    print("=" * 80)
+    test_connection_is_reused()
+    test_row_factory_is_reset()
+    test_leaked_connection_is_returned()
+    test_pool_is_bounded()
+    print("\n[OK] Connection pool tests passed")
@@ -0,0 +1,160 @@
+"""
+Test the email queue worker's sending side (email_queue_worker.py) against a
+local SMTP sink - no database or real mail server needed
+
+- send_rows() reuses the pool's connections (opened once, not per message)
+- refused recipients are 'bounced', 4xx answers are retried until max_attempts
+- connections are replaced after messages_per_connection
+- the rate limit holds across concurrent senders
+
+The claim/settle queries need the email_queue table:
+    python email_queue_worker.py --once --smtp-host localhost --smtp-port 1025 --no-tls
+
+Run:
+    python test_email_queue_worker.py
+"""
+
+import sys
+import os
+import asyncio
+import time
+from email import message_from_bytes
+from email.header import decode_header, make_header
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from email_queue_worker import RateLimiter, SmtpPool, send_rows
+
+FROM = "Astegni <noreply@astegni.test>"
+
+
+class SmtpSink:
+    """Minimal SMTP server: accepts everything except 'bounce*' (550) and 'later*' (451) recipients"""
+
+    def __init__(self):
+        self.connections = 0
+        self.messages = []
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        writer.write(b"220 sink ESMTP\r\n")
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                writer.write(b"250-sink\r\n250 8BITMIME\r\n")
+            elif command.startswith("RCPT TO:<BOUNCE"):
+                writer.write(b"550 5.1.1 No such user\r\n")
+            elif command.startswith("RCPT TO:<LATER"):
+                writer.write(b"451 4.3.0 Try again later\r\n")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                writer.write(b"250 OK\r\n")
+            elif command == "DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                data = b""
+                while not data.endswith(b"\r\n.\r\n"):
+                    data += await reader.readline()
+                self.messages.append(message_from_bytes(data[:-5]))
+                writer.write(b"250 Queued\r\n")
+            elif command == "QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"502 Not implemented\r\n")
+            await writer.drain()
+        writer.close()
+
+
+def row(email_id, email, attempts=1, max_attempts=3):
+    """(id, recipient_email, recipient_name, subject, body_html, body_text, attempts, max_attempts)"""
+    return (email_id, email, "አበበ በቀለ", f"🔔 New jobs #{email_id}", f"<p>Job {email_id}</p>",
+            f"Job {email_id}", attempts, max_attempts)
+
+
+async def with_sink(test):
+    sink = SmtpSink()
+    server = await asyncio.start_server(sink.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        await test(sink, port)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+async def check_connection_reuse(sink, port):
+    pool = SmtpPool("127.0.0.1", port, start_tls=False, size=4)
+    rows = [row(i, f"user{i}@astegni.test") for i in range(1, 201)]
+    outcomes, latencies = await send_rows(pool, RateLimiter(0), FROM, rows)
+    await pool.close()
+
+    assert sorted(email_id for email_id, _ in outcomes["sent"]) == list(range(1, 201))
+    assert len(latencies) == 200
+    assert sink.connections == 4 and pool.connections_opened == 4
+    assert len(sink.messages) == 200
+    message = sink.messages[0]
+    assert str(make_header(decode_header(message["Subject"]))).startswith("🔔 New jobs #")
+    assert str(make_header(decode_header(message["To"]))).startswith("አበበ በቀለ <user")
+    assert message.get_content_type() == "multipart/alternative"
+    print("[OK] 200 messages over 4 reused connections")
+
+
+async def check_failures(sink, port):
+    pool = SmtpPool("127.0.0.1", port, start_tls=False, size=2)
+    rows = [
+        row(1, "ok@astegni.test"),
+        row(2, "bounce@astegni.test"),
+        row(3, "later@astegni.test"),
+        row(4, "later2@astegni.test", attempts=3),   # out of attempts
+        row(5, "ok2@astegni.test"),
+    ]
+    outcomes, _ = await send_rows(pool, RateLimiter(0), FROM, rows)
+    await pool.close()
+
+    assert sorted(email_id for email_id, _ in outcomes["sent"]) == [1, 5]
+    assert [email_id for email_id, _ in outcomes["bounced"]] == [2]
+    assert [email_id for email_id, _ in outcomes["retry"]] == [3]
+    assert [email_id for email_id, _ in outcomes["failed"]] == [4]
+    assert "No such user" in outcomes["bounced"][0][1]
+    # Refusals don't cost a connection
+    assert sink.connections == 2
+    print("[OK] Bounces, retries and exhausted attempts")
+
+
+async def check_reconnect_and_rate(sink, port):
+    pool = SmtpPool("127.0.0.1", port, start_tls=False, size=2, messages_per_connection=10)
+    rows = [row(i, f"user{i}@astegni.test") for i in range(1, 41)]
+    started = time.perf_counter()
+    outcomes, _ = await send_rows(pool, RateLimiter(200), FROM, rows)
+    elapsed = time.perf_counter() - started
+    await pool.close()
+
+    assert len(outcomes["sent"]) == 40
+    assert pool.connections_opened == 4  # 40 messages / 10 per connection
+    assert elapsed >= 39 / 200, elapsed
+    print(f"[OK] Reconnect every 10 messages, 40 messages at <= 200/s took {elapsed:.2f}s")
+
+
+def test_connection_reuse():
+    asyncio.run(with_sink(check_connection_reuse))
+
+
+def test_failures():
+    asyncio.run(with_sink(check_failures))
+
+
+def test_reconnect_and_rate():
+    asyncio.run(with_sink(check_reconnect_and_rate))
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Email queue worker (SMTP sink)")
+    print("=" * 80)
+    test_connection_reuse()
+    test_failures()
+    test_reconnect_and_rate()
+    print("\n[OK] Email queue worker tests passed")
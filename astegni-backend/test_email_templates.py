@@ -0,0 +1,117 @@
+"""
+Test the email template registry (email_templates.py)
+
+- every EmailService layout is registered and compiles
+- values are HTML-escaped in the HTML part only; *_html placeholders are raw
+- built messages parse back with the standard email package: non-ASCII
+  subjects and sender names are RFC 2047-encoded, bodies base64 UTF-8
+- missing values raise KeyError
+- CR/LF in a header value (substituted subject values, To/From) raises ValueError
+
+Run:
+    python test_email_templates.py
+"""
+
+import sys
+import os
+from email import message_from_bytes, policy
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from email_templates import get_template, register_template, render_message, template_names
+
+
+def parse(message: bytes):
+    parsed = message_from_bytes(message, policy=policy.default)
+    parts = {part.get_content_type(): part.get_content() for part in parsed.iter_parts()}
+    return parsed, parts
+
+
+def test_layouts_registered():
+    expected = {
+        "otp", "admin_invitation", "parent_invitation", "parent_invitation_link", "existing_parent_otp",
+        "parent_invitation_otp", "coparent_invitation", "two_step_reset", "child_invitation",
+        "team_invitation", "branded"
+    }
+    assert expected <= set(template_names())
+    assert get_template("otp").placeholders == ["otp_code", "purpose"]
+    print("[OK] EmailService layouts registered")
+
+
+def test_escaping():
+    template = register_template(
+        "test_escaping",
+        subject="Hi ${name}",
+        text="Hi ${name}, $$5 off",
+        html="<p>Hi ${name}, $$5 off</p>${footer_html}"
+    )
+    subject, text, html = template.render(name="<Abebe & Co>", footer_html="<hr>")
+    assert subject == "Hi <Abebe & Co>"
+    assert text == "Hi <Abebe & Co>, $5 off"
+    assert html == "<p>Hi &lt;Abebe &amp; Co&gt;, $5 off</p><hr>"
+
+    try:
+        template.render(footer_html="")
+        assert False, "missing value accepted"
+    except KeyError:
+        pass
+    print("[OK] Escaping and raw *_html placeholders")
+
+
+def test_message_parses():
+    register_template(
+        "test_message",
+        subject="🔔 ${count} new jobs for ${name}",
+        text="Hello ${name}",
+        html="<h1>ሰላም ${name}</h1>"
+    )
+    message = render_message("test_message", "አስተግኒ <noreply@astegni.com>", "abebe@example.com",
+                             count=3, name="Abebe")
+    assert b"\r\n" in message and b"\n" not in message.replace(b"\r\n", b"")
+    assert message.isascii()
+
+    parsed, parts = parse(message)
+    assert str(parsed["Subject"]) == "🔔 3 new jobs for Abebe"
+    assert str(parsed["From"]) == "አስተግኒ <noreply@astegni.com>"
+    assert str(parsed["To"]) == "abebe@example.com"
+    assert parsed.get_content_type() == "multipart/alternative"
+    assert parts["text/plain"] == "Hello Abebe"
+    assert parts["text/html"] == "<h1>ሰላም Abebe</h1>"
+
+    # to_email is available to layouts that show it
+    parsed, parts = parse(render_message("parent_invitation", "Astegni <noreply@astegni.com>", "almaz@example.com",
+                                         parent_name="Almaz", student_name="Kebede",
+                                         temp_password="Tmp123", relationship_type="Mother"))
+    assert "almaz@example.com" in parts["text/plain"] and "Tmp123" in parts["text/html"]
+    assert str(parsed["Subject"]) == "Astegni - You've been invited as a Mother"
+    print("[OK] Messages parse back (headers, UTF-8 bodies)")
+
+
+def test_header_injection():
+    values = dict(parent_name="Eve\rBcc: victim@evil.test", child_name="Kebede",
+                  temp_password="Tmp123", to_email="almaz@example.com")
+    get_template("child_invitation").render(**values)  # body parts may carry anything
+    cases = [
+        ("child_invitation", "Astegni <noreply@astegni.com>", "almaz@example.com", values),
+        ("otp", "Astegni <noreply@astegni.com>", "almaz@example.com\r\nBcc: victim@evil.test",
+         dict(otp_code="123456", purpose="login")),
+        ("otp", "Astegni\nBcc: victim@evil.test <noreply@astegni.com>", "almaz@example.com",
+         dict(otp_code="123456", purpose="login")),
+    ]
+    for name, from_header, to_email, case_values in cases:
+        try:
+            render_message(name, from_header, to_email, **case_values)
+            raise AssertionError(f"{name}: CR/LF in a header value was accepted")
+        except ValueError:
+            pass
+    print("[OK] CR/LF in header values rejected")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Email templates")
+    print("=" * 80)
+    test_layouts_registered()
+    test_escaping()
+    test_message_parses()
+    test_header_injection()
+    print("\n[OK] Email template tests passed")
@@ -0,0 +1,271 @@
+"""
+Test the write-behind impression pipeline (impression_ingestion.py)
+
+- The in-memory dedupe window slides: a session stays non-unique while it
+  keeps producing impressions, and becomes unique again after a quiet window.
+- Billing replay: the same impressions applied one per flush (the old
+  per-impression path) and in a single batch leave the same charges, counters,
+  balance and campaign status. Both runs happen inside transactions that are
+  rolled back, against a real campaign with a small billing_frequency.
+- A failing impression is isolated by bisecting the batch and dead-lettered
+  after IMPRESSION_MAX_ATTEMPTS flushes; the rest of the batch is written.
+  Connection errors requeue the whole batch. (No database needed.)
+- cancel_campaign writes the campaign's queued impressions before its final
+  charge, and bills them (recording connection, no database needed).
+
+Needs the advertiser database with an active campaign:
+    python test_impression_ingestion.py
+"""
+
+import sys
+import os
+import time
+import psycopg
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from db_pool import pooled_connect
+import campaign_impression_endpoints
+from campaign_impression_endpoints import ImpressionTrack, cancel_campaign
+from impression_ingestion import (
+    DATABASE_URL, IMPRESSION_MAX_ATTEMPTS, ImpressionIngestion, MemoryDedupe, PendingImpression
+)
+
+IMPRESSIONS = 57
+BILLING_FREQUENCY = 10
+
+
+def test_dedupe_window_slides():
+    dedupe = MemoryDedupe(window=0.2)
+    assert not dedupe.seen_recently(1, "session-a")
+    assert dedupe.seen_recently(1, "session-a")
+    assert not dedupe.seen_recently(2, "session-a"), "Sessions are per campaign"
+
+    # Keep the session active past the first window - still a repeat
+    for _ in range(3):
+        time.sleep(0.1)
+        assert dedupe.seen_recently(1, "session-a")
+
+    time.sleep(0.25)
+    assert not dedupe.seen_recently(1, "session-a")
+    print("[OK] Dedupe window slides with the latest impression")
+
+
+class FailingIngestion(ImpressionIngestion):
+    """Writes to a list; batches containing a poisoned id fail"""
+
+    def __init__(self, poisoned, **kwargs):
+        super().__init__(dedupe=MemoryDedupe(), **kwargs)
+        self.poisoned = set(poisoned)
+        self.offline = False
+        self.written = []
+        self.writes = 0
+
+    def _write_batch(self, batch):
+        self.writes += 1
+        if self.offline:
+            raise psycopg.OperationalError("connection refused")
+        if self.poisoned & {pending.id for pending in batch}:
+            raise ValueError("violates check constraint")
+        self.written.extend(pending.id for pending in batch)
+
+    def queue(self, count, campaign_id=1, first_id=1):
+        track = ImpressionTrack(campaign_id=campaign_id, placement="leaderboard-banner")
+        for n in range(first_id, first_id + count):
+            pending = PendingImpression(n, track, "127.0.0.1", "test", f"session-{n}", True)
+            self._pending.append(pending)
+            self._pending_by_id[pending.id] = pending
+
+
+def test_failing_impressions_are_isolated():
+    ingestion = FailingIngestion(poisoned=[37, 90], flush_batch=100)
+    ingestion.queue(100)
+
+    assert ingestion.flush() == 98
+    assert sorted(ingestion.written) == [n for n in range(1, 101) if n not in (37, 90)]
+    assert [pending.id for pending in ingestion._pending] == [37, 90]
+
+    for _ in range(IMPRESSION_MAX_ATTEMPTS - 1):
+        ingestion.flush()
+    assert ingestion.queued() == 0
+    assert [dead[0] for dead in ingestion.dead_letters] == [37, 90]
+    assert ingestion.stats["dead_lettered"] == 2
+    print(f"[OK] Bad impressions isolated and dead-lettered ({ingestion.writes} writes)")
+
+    ingestion = FailingIngestion(poisoned=[], flush_batch=50)
+    ingestion.queue(80)
+    ingestion.offline = True
+    try:
+        ingestion.flush()
+        assert False, "connection error swallowed"
+    except psycopg.OperationalError:
+        pass
+    assert ingestion.writes == 1 and ingestion.queued() == 80
+    assert [pending.id for pending in ingestion._pending[:3]] == [1, 2, 3]
+    ingestion.offline = False
+    assert ingestion.flush() == 50 and ingestion.flush() == 30
+    assert ingestion.written == list(range(1, 81))
+    print("[OK] Connection errors requeue the whole batch")
+
+
+class RecordingConnection:
+    """Answers cancel_campaign's SELECTs from a dict, records every statement"""
+
+    def __init__(self, campaign, balance):
+        self.campaign = campaign
+        self.balance = balance
+        self.statements = []
+        self.committed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.statements.append((" ".join(sql.split()), params))
+
+    def fetchone(self):
+        sql = self.statements[-1][0]
+        if "FROM campaign_profile" in sql:
+            return self.campaign()
+        if sql.startswith("SELECT balance, total_spent"):
+            return (self.balance, 0)
+        if sql.startswith("SELECT balance"):
+            return (self.balance,)
+        if "RETURNING id" in sql:
+            return (501,)
+        return None
+
+    def fetchall(self):
+        return []
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_cancel_bills_queued_impressions():
+    ingestion = FailingIngestion(poisoned=[], flush_batch=10)
+    ingestion.queue(25, campaign_id=7)
+    ingestion.queue(4, campaign_id=8, first_id=100)
+    # delivered = what the flushes wrote for campaign 7, charged = 0, cpi_rate 0.5
+    conn = RecordingConnection(
+        campaign=lambda: ("Test campaign", len([n for n in ingestion.written if n < 100]), 0, 0.5, 0, 3, 5),
+        balance=1000
+    )
+
+    saved = campaign_impression_endpoints.ingestion, campaign_impression_endpoints.get_db
+    campaign_impression_endpoints.ingestion, campaign_impression_endpoints.get_db = ingestion, lambda: conn
+    try:
+        result = cancel_campaign(7)
+    finally:
+        campaign_impression_endpoints.ingestion, campaign_impression_endpoints.get_db = saved
+
+    assert sorted(ingestion.written) == list(range(1, 26))
+    assert [pending.campaign_id for pending in ingestion._pending] == [8] * 4
+    assert result["impressions_delivered"] == 25
+    assert result["final_impression_charge"] == 12.5
+    deduction = [params for sql, params in conn.statements if "INSERT INTO advertiser_transactions" in sql]
+    assert deduction[0][2:4] == ('deduction', 12.5)
+    assert conn.committed
+    print("[OK] cancel_campaign bills impressions that were still queued")
+
+
+def _find_campaign(cur):
+    cur.execute("""
+        SELECT id FROM campaign_profile
+        WHERE campaign_status = 'active'
+          AND verification_status IN ('verified', 'approved')
+          AND advertiser_id IS NOT NULL
+        ORDER BY id
+        LIMIT 1
+    """)
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def _impressions(campaign_id):
+    track = ImpressionTrack(campaign_id=campaign_id, placement="leaderboard-banner")
+    return [PendingImpression(-(n + 1), track, "127.0.0.1", "test", f"session-{n}", True)
+            for n in range(IMPRESSIONS)]
+
+
+def _replay(campaign_id, batch_sizes):
+    """Apply the impressions in batches of the given sizes; return the resulting billing state"""
+    ingestion = ImpressionIngestion(dedupe=MemoryDedupe())
+    conn = pooled_connect(DATABASE_URL)
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            UPDATE campaign_profile
+            SET billing_frequency = %s, impressions_delivered = 0, impressions_charged = 0, total_charged = 0
+            WHERE id = %s
+            RETURNING advertiser_id
+        """, (BILLING_FREQUENCY, campaign_id))
+        advertiser_id = cur.fetchone()[0]
+        cur.execute("SELECT COALESCE(MAX(id), 0) FROM advertiser_transactions")
+        last_transaction = cur.fetchone()[0]
+
+        impressions = _impressions(campaign_id)
+        position = 0
+        for size in batch_sizes:
+            campaigns = ingestion._lock_campaigns(cur, [campaign_id])
+            ingestion._replay(cur, conn, campaigns[campaign_id], impressions[position:position + size], [])
+            ingestion._write_counters(cur, campaigns.values())
+            position += size
+
+        cur.execute("""
+            SELECT impressions_delivered, impressions_charged, total_charged, verification_status
+            FROM campaign_profile WHERE id = %s
+        """, (campaign_id,))
+        campaign = cur.fetchone()
+        cur.execute("""
+            SELECT amount, impressions_count FROM advertiser_transactions
+            WHERE id > %s AND campaign_id = %s
+            ORDER BY id
+        """, (last_transaction, campaign_id))
+        transactions = cur.fetchall()
+        cur.execute("SELECT balance FROM advertiser_profiles WHERE id = %s", (advertiser_id,))
+        balance = cur.fetchone()[0]
+        return campaign, transactions, balance
+    finally:
+        conn.rollback()
+        cur.close()
+        conn.close()
+
+
+def test_batched_billing_matches_per_impression():
+    conn = pooled_connect(DATABASE_URL)
+    cur = conn.cursor()
+    try:
+        campaign_id = _find_campaign(cur)
+    finally:
+        cur.close()
+        conn.close()
+    if campaign_id is None:
+        print("[SKIP] No active campaign in the advertiser database")
+        return
+
+    per_impression = _replay(campaign_id, [1] * IMPRESSIONS)
+    batched = _replay(campaign_id, [IMPRESSIONS])
+    uneven = _replay(campaign_id, [7, 23, 1, 26])
+    print(f"Per impression: {per_impression}")
+    print(f"One batch:      {batched}")
+    assert batched == per_impression
+    assert uneven == per_impression
+    print(f"[OK] Campaign {campaign_id}: batched billing matches the per-impression path")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Impression ingestion")
+    print("=" * 80)
+    test_dedupe_window_slides()
+    test_failing_impressions_are_isolated()
+    test_cancel_bills_queued_impressions()
+    test_batched_billing_matches_per_impression()
+    print("\n[OK] Impression ingestion tests passed")
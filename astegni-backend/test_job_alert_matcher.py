@@ -0,0 +1,167 @@
+"""
+Test the job alert percolator (job_alert_matcher.py) without a database
+
+- every criterion an alert sets must match; unset criteria match anything
+- keywords are phrases over title, description, requirements and skills
+- locations match the post's location or one of its comma-separated parts
+- salary bands overlap the post's range; posts without salary never match a band
+- candidates() only returns alerts sharing a key with the post
+- a match's email is queued through JobEmailService.send_job_alert_email with
+  the user's name (SQLite stand-in for the users/job_alerts/email_queue tables;
+  the percolate_job/digest inserts themselves need PostgreSQL)
+
+Run:
+    python test_job_alert_matcher.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, event, text
+
+from job_alert_matcher import JobAlertIndex, _Post, _email_job, location_keys
+from job_email_service import JobEmailService
+
+
+def alert(alert_id, keywords=None, categories=None, job_type=None, location_type=None, locations=None,
+          min_salary=None, max_salary=None, level=None, frequency='immediate'):
+    """(id, user_id, keywords, job_categories, job_type, location_type, locations,
+        min_salary, max_salary, experience_level, notification_frequency, notify_via_email)"""
+    return (alert_id, 100 + alert_id, keywords, categories, job_type, location_type, locations,
+            min_salary, max_salary, level, frequency, True)
+
+
+JOB = {
+    "id": 1,
+    "title": "Senior Math Teacher",
+    "description": "Teach grade 11 and 12 mathematics at a private school.",
+    "requirements": "Bachelor's degree in Mathematics, 5 years of experience.",
+    "skills": '["Curriculum design", "Calculus"]',
+    "job_type": "full-time",
+    "location_type": "on-site",
+    "location": "Bole, Addis Ababa",
+    "salary_min": 15000,
+    "salary_max": 25000,
+    "experience_level": "senior",
+    "category_ids": [3]
+}
+
+
+def matched_ids(index, job=JOB):
+    return [match["alert_id"] for match in index.percolate(job)]
+
+
+def test_location_keys():
+    assert location_keys("Bole, Addis Ababa") == {"bole addis ababa", "bole", "addis ababa"}
+    assert location_keys(None) == set()
+    print("[OK] Location keys")
+
+
+def test_criteria():
+    index = JobAlertIndex([
+        alert(1, keywords=["math teacher"]),                          # phrase in title
+        alert(2, keywords=["teacher math"]),                          # words, wrong order
+        alert(3, keywords=["physics", "calculus"]),                   # one of two, in skills
+        alert(4, keywords=["math"], job_type="part-time"),            # keyword ok, type not
+        alert(5, locations=["Addis Ababa"], level="Senior"),
+        alert(6, locations=["Hawassa"]),
+        alert(7, categories=[3, 9]),
+        alert(8, job_type="full-time", location_type="remote"),
+        alert(9, min_salary=20000),                                   # band overlaps
+        alert(10, min_salary=30000),                                  # asks more than the max
+        alert(11, max_salary=10000),                                  # below the min
+        alert(12),                                                    # no criteria
+        alert(13, keywords=["mathematics 5 years"]),                  # phrase across a comma
+        alert(14, keywords=["12 mathematics"]),
+        alert(15, keywords=["experience curriculum"]),                # not across fields
+    ])
+    assert matched_ids(index) == [1, 3, 5, 7, 9, 12, 13, 14]
+
+    matches = {match["alert_id"]: match for match in index.percolate(JOB)}
+    assert matches[3]["match_score"] == 50.0
+    assert matches[3]["match_reasons"] == {"keywords": ["calculus"]}
+    assert matches[5]["match_reasons"] == {"locations": ["addis ababa"], "experience_level": "senior"}
+    assert matches[9]["user_id"] == 109
+
+    no_salary = dict(JOB, salary_min=None, salary_max=None)
+    assert 9 not in matched_ids(index, no_salary)
+    only_min = dict(JOB, salary_max=None)
+    assert 11 not in matched_ids(index, only_min) and 9 not in matched_ids(index, only_min)
+    print("[OK] Alert criteria")
+
+
+def test_candidates_are_selective():
+    alerts = [alert(i, keywords=[f"skill{i}"]) for i in range(1, 1001)]
+    alerts += [alert(2000 + i, locations=[f"town{i}"], job_type="full-time") for i in range(500)]
+    alerts += [alert(3000 + i, min_salary=i * 100) for i in range(500)]
+    index = JobAlertIndex(alerts)
+
+    job = dict(JOB, skills='["skill7", "skill42"]', location="town3", salary_min=1000, salary_max=1050)
+    candidates = index.candidates(_Post(job))
+    # 2 keyword alerts, 1 location alert, salary-only alerts asking <= 1050
+    assert candidates == {7, 42, 2003} | {3000 + i for i in range(11)}
+    assert matched_ids(index, job) == sorted(candidates)
+    assert index.stats()["salary_only_alerts"] == 500
+    print("[OK] Candidates only from shared keys")
+
+
+def queue_database():
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def add_concat_ws(dbapi_conn, _):
+        # PostgreSQL's CONCAT_WS (SQLite has it from 3.44)
+        dbapi_conn.create_function(
+            "concat_ws", -1, lambda sep, *parts: sep.join(str(part) for part in parts if part is not None)
+        )
+
+    conn = engine.connect()
+    conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, first_name TEXT, "
+                      "father_name TEXT, last_name TEXT)"))
+    conn.execute(text("CREATE TABLE job_alerts (id INTEGER PRIMARY KEY, alert_name TEXT)"))
+    conn.execute(text("""
+        CREATE TABLE email_queue (
+            id INTEGER PRIMARY KEY, recipient_email TEXT, recipient_name TEXT, user_id INTEGER,
+            subject TEXT, body_html TEXT, body_text TEXT, email_type TEXT, job_id INTEGER,
+            notification_id INTEGER, priority INTEGER, scheduled_for TEXT, tracking_id TEXT DEFAULT 't'
+        )
+    """))
+    conn.execute(text("""
+        INSERT INTO users VALUES (101, 'abebe@example.com', 'Abebe', 'Kebede', NULL),
+                                 (102, 'sara@example.com', 'Sara', NULL, 'Smith')
+    """))
+    conn.execute(text("INSERT INTO job_alerts VALUES (1, 'Math jobs'), (2, NULL)"))
+    conn.commit()
+    return conn
+
+
+def test_alert_email_queued():
+    conn = queue_database()
+    service = JobEmailService.__new__(JobEmailService)  # SMTP settings aren't needed to queue
+    service.db = conn
+
+    job = _email_job(dict(JOB, salary_visibility="public"))
+    assert service.send_job_alert_email(101, 1, [job])
+    assert service.send_job_alert_email(102, 2, [job, dict(job, id=2)])
+
+    rows = conn.execute(text("SELECT recipient_email, recipient_name, subject, email_type, priority "
+                             "FROM email_queue ORDER BY id")).fetchall()
+    assert rows[0] == ("abebe@example.com", "Abebe Kebede",
+                       "🔔 1 New Job Match Your Alert: Math jobs", "job_alert", 3)
+    assert rows[1][:3] == ("sara@example.com", "Sara Smith", "🔔 2 New Jobs Match Your Alert: Your Job Alert")
+    body = conn.execute(text("SELECT body_html FROM email_queue WHERE id = 1")).scalar()
+    assert "Senior Math Teacher" in body and "15,000 - 25,000 ETB" in body
+    conn.close()
+    print("[OK] Alert emails queued with the user's name")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Job alert matcher")
+    print("=" * 80)
+    test_location_keys()
+    test_criteria()
+    test_candidates_are_selective()
+    test_alert_email_queued()
+    print("\n[OK] Job alert matcher tests passed")
@@ -0,0 +1,85 @@
+"""
+Test the KYC pipeline (kyc_pipeline.py)
+
+- Images are EXIF-oriented and downsized once, before any face detection
+- Document encodings are cached by content: a repeat (or concurrent) request
+  reuses the first task instead of encoding again
+- Stage timings from the workers are totalled in pipeline.stats()
+
+face_recognition is not needed - encoding is replaced by a stub that reports
+its stage timings like the real one:
+    python test_kyc_pipeline.py
+"""
+
+import sys
+import os
+import io
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+
+import kyc_pipeline
+from kyc_pipeline import KYCPipeline, normalize_image
+
+
+def _jpeg(size, orientation=None) -> bytes:
+    img = Image.new("RGB", size, (120, 90, 60))
+    exif = img.getexif()
+    if orientation:
+        exif[0x0112] = orientation
+    out = io.BytesIO()
+    img.save(out, "JPEG", exif=exif.tobytes())
+    return out.getvalue()
+
+
+def _stub_encode(image_data: bytes, label: str = "image") -> dict:
+    time.sleep(0.05)
+    return {"encodings": [len(image_data)], "timings": {"normalize_ms": 2.0, "detect_ms": 8.0}}
+
+
+def test_normalize_image():
+    # EXIF orientation 6 (rotated 90 degrees) on a 12MP photo
+    img, exif_oriented = normalize_image(_jpeg((4000, 3000), orientation=6))
+    assert exif_oriented and img.size == (960, 1280), img.size
+
+    img, exif_oriented = normalize_image(_jpeg((640, 480)))
+    assert not exif_oriented and img.size == (640, 480) and img.mode == "RGB"
+    print("[OK] Images are EXIF-oriented and downsized to KYC_MAX_IMAGE_DIM")
+
+
+def test_encoding_cache():
+    original = kyc_pipeline.encode_faces
+    kyc_pipeline.encode_faces = _stub_encode
+    try:
+        for workers in (0, 2):
+            pipeline = KYCPipeline(workers=workers, cache_size=2)
+            try:
+                first, cached = pipeline._cached_encoding(b"document-1", "document")
+                again, cached_again = pipeline._cached_encoding(b"document-1", "document")
+                assert not cached and cached_again
+                assert first.result()["encodings"] == again.result()["encodings"] == [10]
+
+                for document in (b"document-2", b"document-3"):
+                    pipeline._cached_encoding(document, "document")[0].result()
+                time.sleep(0.05)
+
+                stats = pipeline.stats()
+                assert stats["tasks"] == 3, stats
+                assert stats["encoding_cache"]["entries"] == 2  # document-1 evicted
+                assert stats["stages"]["detect"] == {"count": 3, "avg_ms": 8.0, "max_ms": 8.0}
+                assert not pipeline._cached_encoding(b"document-1", "document")[1]
+            finally:
+                pipeline.shutdown()
+            print(f"[OK] Document encodings are cached and shared (workers={workers})")
+    finally:
+        kyc_pipeline.encode_faces = original
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: KYC pipeline")
+    print("=" * 80)
+    test_normalize_image()
+    test_encoding_cache()
+    print("\n[OK] KYC pipeline tests passed")
@@ -0,0 +1,79 @@
+"""
+Test the market pricing feature matrix (market_pricing_index.py)
+On a synthetic market, for a mix of tutors, time periods and filters:
+- market_sample() returns the same (tutor, session format, grade levels) rows
+  and average agreed prices as the old market query
+- the vectorized 9-factor similarity gives the old loop's weighted price and
+  similar-tutor count
+
+No database needed:
+    python test_market_pricing_index.py
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from market_pricing_index import MarketIndex
+from benchmark_market_pricing import (indexed_suggestion, legacy_market_rows, legacy_suggestion,
+                                      request_mix, synthetic_market, tutor_features)
+
+
+def _same_rows(got, expected):
+    return len(got) == len(expected) and all(
+        a[0] == b[0] and abs(a[1] - b[1]) < 1e-6 for a, b in zip(sorted(got), sorted(expected))
+    )
+
+
+def test_market_sample_matches_query():
+    packages, enrollments = synthetic_market(5000, 300)
+    index = MarketIndex(packages, enrollments)
+    now = datetime.now()
+
+    for row, months, filters in request_mix(packages, 60):
+        cutoff = now - timedelta(days=months * 30)
+        expected = [
+            (market_row[0], market_row[4])
+            for market_row in legacy_market_rows(packages, enrollments, row[1], cutoff, packages_since=cutoff, **filters)
+        ]
+        groups, prices = index.market_sample(row[1], cutoff, packages_since=cutoff, **filters)
+        assert _same_rows(list(zip(index.group_tutor[groups].tolist(), prices.tolist())), expected)
+        assert row[1] not in index.group_tutor[groups]
+    print("[OK] Market rows and average prices match the old query for 60 requests")
+
+
+def test_similarity_matches_loop():
+    packages, enrollments = synthetic_market(5000, 300)
+    index = MarketIndex(packages, enrollments)
+    now = datetime.now()
+
+    for row, months, filters in request_mix(packages, 60, seed=3):
+        tutor = tutor_features(row, now)
+        cutoff = now - timedelta(days=months * 30)
+        market_data = legacy_market_rows(packages, enrollments, row[1], cutoff, packages_since=cutoff, **filters)
+        if len(market_data) < 5:
+            market_data = legacy_market_rows(packages, enrollments, row[1], cutoff)
+
+        expected_price, expected_similar = legacy_suggestion(market_data, tutor, filters.get("session_format"), now)
+        price, similar = indexed_suggestion(index, row[1], tutor, cutoff, now, **filters)
+        assert similar == expected_similar and abs(price - expected_price) < 1e-6
+    print("[OK] Weighted price and similar-tutor count match the per-row loop")
+
+
+def test_empty_market():
+    index = MarketIndex([], [])
+    groups, prices = index.market_sample(1, datetime.now() - timedelta(days=90), session_format="Online")
+    assert len(groups) == 0 and len(prices) == 0
+    assert index.stats()["groups"] == 0
+    print("[OK] An empty market yields no rows")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Market pricing index")
+    print("=" * 80)
+    test_market_sample_matches_query()
+    test_similarity_matches_loop()
+    test_empty_market()
+    print("\n[OK] Market pricing index tests passed")
@@ -0,0 +1,87 @@
+"""
+Test coalesced presence writes (presence_service.py)
+Flaps a tutor profile online/offline many times, flushes once, and checks
+that the profile table got the final state from a single batched write.
+
+Needs the local database (uses the first tutor_profiles row):
+    python test_presence_service.py
+"""
+
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from db_pool import open_async_pools, close_async_pools, async_connection
+from presence_service import PresenceService
+
+
+async def _first_tutor_id():
+    async with async_connection("user") as conn:
+        cur = await conn.execute("SELECT id FROM tutor_profiles ORDER BY id LIMIT 1")
+        row = await cur.fetchone()
+        return row[0] if row else None
+
+
+async def _read_presence(tutor_id):
+    async with async_connection("user") as conn:
+        cur = await conn.execute(
+            "SELECT is_online, last_seen, NOW()::timestamp FROM tutor_profiles WHERE id = %s", (tutor_id,)
+        )
+        return await cur.fetchone()
+
+
+def test_flapping_is_coalesced():
+    async def run():
+        await open_async_pools()
+        try:
+            tutor_id = await _first_tutor_id()
+            if tutor_id is None:
+                print("[SKIP] No tutor_profiles rows")
+                return
+
+            presence = PresenceService(flush_interval=3600)
+            for _ in range(10):
+                presence.mark("tutor", tutor_id, is_online=True)
+                presence.mark("tutor", tutor_id, is_online=False)
+            presence.mark("tutor", tutor_id, is_online=True)
+
+            assert presence.pending_last_seen("tutor", tutor_id) is not None
+            written = await presence.flush()
+            print(f"Stats: {presence.stats}")
+            assert written == 1
+            assert presence.stats["coalesced"] == 20
+            assert presence.pending_last_seen("tutor", tutor_id) is None
+
+            is_online, last_seen, now = await _read_presence(tutor_id)
+            assert is_online is True
+            assert abs((now - last_seen).total_seconds()) < 60
+            print(f"[OK] 21 changes for tutor {tutor_id} -> 1 row write (is_online={is_online})")
+
+            presence.mark("tutor", tutor_id, is_online=False)
+            await presence.stop()
+            is_online, _, _ = await _read_presence(tutor_id)
+            assert is_online is False
+            print("[OK] stop() flushes pending changes")
+        finally:
+            await close_async_pools()
+
+    asyncio.run(run())
+
+
+def test_unknown_profile_type_is_ignored():
+    presence = PresenceService()
+    presence.mark("user", 1, is_online=True)
+    assert presence.pending_last_seen("user", 1) is None
+    assert presence.stats["changes"] == 0
+    print("[OK] Unknown profile types are not queued")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Presence service")
+    print("=" * 80)
+    test_unknown_profile_type_is_ignored()
+    test_flapping_is_coalesced()
+    print("\n[OK] Presence service tests passed")
@@ -0,0 +1,73 @@
+"""
+Test the storage object index (storage_index.py)
+
+- Owner and category are derived from B2 paths written by BackblazeService
+- record_upload / record_delete keep storage_objects in step, and per-user
+  usage and listings come from it (uses rows under a throwaway owner, removed
+  afterwards)
+
+Requires migrate_add_storage_objects.py:
+    python test_storage_index.py
+"""
+
+import sys
+import os
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import storage_index
+from storage_index import object_category, object_owner
+
+
+def test_path_parsing():
+    assert object_owner("images/profile/user_profile_12/avatar_20250101_120000.jpg") == "profile_12"
+    assert object_owner("videos/stories/user_42/clip.mp4") == "42"
+    assert object_owner("images/user_115/Brand/Campaign/banner.png") == "115"
+    assert object_owner("images/system/logo.png") is None
+    assert object_owner("images/user_/x.png") is None
+    assert object_owner("user_7") is None  # a file name, not a folder
+
+    assert object_category("images/profile/user_1/a.jpg") == "images"
+    assert object_category("videos/ad/user_1/a.mp4") == "videos"
+    assert object_category("audio/chat/user_1/a.ogg") == "audio"
+    assert object_category("documents/company/user_1/a.pdf") == "documents"
+    assert object_category("backups/db.sql") == "other"
+    print("[OK] Owner and category parsed from paths")
+
+
+def test_record_and_query():
+    owner = f"test_{uuid.uuid4().hex[:8]}"
+    paths = [
+        (f"images/profile/user_{owner}/a.jpg", 1000),
+        (f"images/cover/user_{owner}/b.jpg", 3000),
+        (f"videos/stories/user_{owner}/c.mp4", 50000),
+    ]
+    try:
+        for i, (path, size) in enumerate(paths):
+            storage_index.record_upload(path, f"file_{i}", size, None, 1_700_000_000_000 + i * 1000)
+        # Re-uploading the same path replaces the row
+        storage_index.record_upload(paths[1][0], "file_1b", 4000, "image/jpeg", 1_700_000_010_000)
+
+        usage = storage_index.get_owner_usage(owner)
+        assert usage == {"images": (2, 5000), "videos": (1, 50000)}, usage
+
+        listed = storage_index.list_owner_objects(owner)
+        assert [row[0] for row in listed] == [paths[1][0], paths[2][0], paths[0][0]]
+        assert [row[0] for row in storage_index.list_owner_objects(owner, f"images/profile/user_{owner}/")] \
+            == [paths[0][0]]
+
+        storage_index.record_delete(paths[2][0])
+        assert storage_index.get_owner_usage(owner) == {"images": (2, 5000)}
+        print("[OK] Uploads and deletes are reflected in usage and listings")
+    finally:
+        for path, _ in paths:
+            storage_index.record_delete(path)
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Storage index")
+    print("=" * 80)
+    test_path_parsing()
+    test_record_and_query()
+    print("\n[OK] Storage index tests passed")
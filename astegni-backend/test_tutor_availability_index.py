@@ -0,0 +1,126 @@
+"""
+Test the tutor availability index (tutor_availability_index.py)
+
+- Interval helpers: merging, subtracting bookings, coverage
+- Recurring windows honor weekday, year and months; specific dates only apply on their date
+- Booked sessions remove time; check() reports the conflicting sessions
+- free_tutors() agrees with a per-tutor brute force over random schedules
+
+Runs on synthetic rows (no database):
+    python test_tutor_availability_index.py
+"""
+
+import sys
+import os
+import random
+from datetime import date, time, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tutor_availability_index import (
+    AvailabilityIndex, WEEKDAYS, covers, merge_intervals, subtract_intervals
+)
+
+TUESDAY = date(2026, 3, 3)
+
+
+def schedule(schedule_id, tutor_id, start, end, days=(), months=(), year=2026, dates=None):
+    """schedules row as load_availability_rows() returns it"""
+    schedule_type = 'specific' if dates else 'recurring'
+    return (schedule_id, tutor_id, schedule_type, year, list(months), list(days), dates or [],
+            time(*start), time(*end))
+
+
+def session(session_id, tutor_id, day, start, end):
+    return (session_id, tutor_id, day, time(*start), time(*end))
+
+
+def test_interval_helpers():
+    assert merge_intervals([(60, 120), (0, 30), (120, 180), (100, 110)]) == [(0, 30), (60, 180)]
+    assert subtract_intervals([(0, 100), (200, 300)], [(50, 60), (90, 210)]) == [(0, 50), (60, 90), (210, 300)]
+    assert subtract_intervals([(0, 100)], [(0, 100)]) == []
+    assert covers([(0, 60), (90, 180)], 100, 180)
+    assert not covers([(0, 60), (90, 180)], 30, 120)
+    print("[OK] Interval helpers")
+
+
+def test_recurring_and_specific_windows():
+    index = AvailabilityIndex([
+        schedule(1, 10, (16, 0), (17, 0), days=["Tuesday", "Thursday"]),
+        schedule(2, 10, (17, 0), (18, 0), days=["Tuesday"], months=["March"]),
+        schedule(3, 11, (16, 0), (18, 0), days=["Tuesday"], year=2025),
+        schedule(4, 12, (9, 0), (12, 0), dates=[TUESDAY.isoformat()]),
+        schedule(5, 13, (22, 0), (0, 0), days=["tue"]),
+    ], [])
+
+    assert index.windows(10, TUESDAY) == [(960, 1080)]                  # 16-17 + 17-18 merged
+    assert index.windows(10, TUESDAY + timedelta(days=35)) == [(960, 1020)]  # March rule ends
+    assert index.windows(10, TUESDAY + timedelta(days=1)) == []           # Wednesday
+    assert index.windows(11, TUESDAY) == []                              # last year's schedule
+    assert index.windows(12, TUESDAY) == [(540, 720)]
+    assert index.windows(12, TUESDAY + timedelta(days=7)) == []
+    assert index.windows(13, TUESDAY) == [(1320, 1440)]                  # end 00:00 = midnight
+
+    assert index.free_tutors(TUESDAY, 960, 1080) == [10]
+    assert index.free_tutors(TUESDAY, 600, 660) == [12]
+    assert index.free_tutors(TUESDAY, 600, 660, tutor_ids=[10, 11]) == []
+    print("[OK] Recurring and specific-date windows")
+
+
+def test_bookings():
+    index = AvailabilityIndex(
+        [schedule(1, 10, (14, 0), (18, 0), days=["Tuesday"]),
+         schedule(2, 11, (14, 0), (18, 0), days=["Tuesday"])],
+        [session(100, 10, TUESDAY, (15, 0), (16, 0))]
+    )
+    assert index.free_intervals(10, TUESDAY) == [(840, 900), (960, 1080)]
+    assert index.free_tutors(TUESDAY, 960, 1080) == [10, 11]
+    assert index.free_tutors(TUESDAY, 930, 990) == [11]
+
+    result = index.check(10, TUESDAY, 930, 990)
+    assert result == {"available": False, "within_schedule": True, "conflicting_session_ids": [100]}
+    result = index.check(10, TUESDAY, 1020, 1140)
+    assert result == {"available": False, "within_schedule": False, "conflicting_session_ids": []}
+    assert index.check(10, TUESDAY, 960, 1020)["available"]
+    print("[OK] Bookings remove time and are reported as conflicts")
+
+
+def test_free_tutors_matches_brute_force():
+    rng = random.Random(7)
+    schedules, sessions = [], []
+    for tutor_id in range(1, 301):
+        for _ in range(rng.randint(0, 4)):
+            start = rng.randint(6, 20)
+            end = min(start + rng.randint(1, 4), 24)
+            if rng.random() < 0.7:
+                schedules.append(schedule(len(schedules) + 1, tutor_id, (start, 0), (end % 24, 0),
+                                          days=rng.sample(WEEKDAYS, rng.randint(1, 3)),
+                                          months=rng.choice([[], ["March"], ["January", "February"]])))
+            else:
+                dates = [(TUESDAY + timedelta(days=rng.randint(0, 6))).isoformat()]
+                schedules.append(schedule(len(schedules) + 1, tutor_id, (start, 0), (end % 24, 0), dates=dates))
+        for _ in range(rng.randint(0, 3)):
+            start = rng.randint(6, 21)
+            sessions.append(session(len(sessions) + 1, tutor_id, TUESDAY + timedelta(days=rng.randint(0, 6)),
+                                    (start, 0), (start + 1, 30)))
+
+    index = AvailabilityIndex(schedules, sessions)
+    checked = 0
+    for offset in range(7):
+        day = TUESDAY + timedelta(days=offset)
+        for start in range(6 * 60, 22 * 60, 90):
+            end = start + rng.choice([30, 60, 120])
+            expected = [tutor_id for tutor_id in range(1, 301) if index.check(tutor_id, day, start, end)["available"]]
+            assert index.free_tutors(day, start, end) == expected, (day, start, end)
+            checked += 1
+    print(f"[OK] free_tutors() matches per-tutor checks for {checked} slots ({len(schedules)} schedules)")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Tutor availability index")
+    print("=" * 80)
+    test_interval_helpers()
+    test_recurring_and_specific_windows()
+    test_bookings()
+    test_free_tutors_matches_brute_force()
+    print("\n[OK] Tutor availability index tests passed")
@@ -0,0 +1,112 @@
+"""
+Parity test for bulk tutor scoring
+Checks that TutorScoringCalculator.calculate_all_new_scores_bulk returns exactly
+the same scores and breakdowns as calling calculate_all_new_scores per tutor.
+
+Run against a seeded database (seed_tutor_profile_data.py, seed_tutor_reviews.py,
+seed_session_requests.py, seed_earnings_investments.py, ...):
+    python test_tutor_scoring_bulk.py
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app import SessionLocal
+from tutor_scoring import TutorScoringCalculator
+
+
+STUDENT_INTERESTS = ["Mathematics", "Physics", "English"]
+STUDENT_HOBBIES = ["Reading", "Sports", "Music"]
+
+
+def _compare(db, student_interests, student_hobbies):
+    """Score every active tutor both ways and return (checked, mismatches, timings)"""
+    tutors = db.execute(text("""
+        SELECT id, user_id, created_at
+        FROM tutor_profiles
+        WHERE is_active = true
+        ORDER BY id
+    """)).fetchall()
+
+    calculator = TutorScoringCalculator(db)
+
+    start = time.perf_counter()
+    single = {
+        tutor.id: calculator.calculate_all_new_scores(
+            tutor.id, tutor.user_id, tutor.created_at,
+            student_interests, student_hobbies
+        )
+        for tutor in tutors
+    }
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = calculator.calculate_all_new_scores_bulk(
+        [tutor.id for tutor in tutors], student_interests, student_hobbies
+    )
+    bulk_seconds = time.perf_counter() - start
+
+    mismatches = []
+    for tutor_id, (score, breakdown) in single.items():
+        if tutor_id not in bulk:
+            mismatches.append((tutor_id, "missing from bulk result"))
+            continue
+        bulk_score, bulk_breakdown = bulk[tutor_id]
+        if bulk_score != score or bulk_breakdown != breakdown:
+            for factor, value in breakdown.items():
+                if bulk_breakdown.get(factor) != value:
+                    mismatches.append((tutor_id, f"{factor}: single={value} bulk={bulk_breakdown.get(factor)}"))
+
+    return len(tutors), mismatches, (single_seconds, bulk_seconds)
+
+
+def test_bulk_matches_single_without_student_context():
+    """Smart-sort case: no student interests/hobbies"""
+    db = SessionLocal()
+    try:
+        checked, mismatches, (single_s, bulk_s) = _compare(db, [], [])
+        print(f"[OK] {checked} tutors | single: {single_s:.3f}s | bulk: {bulk_s:.3f}s")
+        for tutor_id, reason in mismatches:
+            print(f"   [MISMATCH] tutor {tutor_id}: {reason}")
+        assert checked > 0, "No tutors found - seed the database first"
+        assert not mismatches
+    finally:
+        db.close()
+
+
+def test_bulk_matches_single_with_student_context():
+    """Tiered case: interest and hobby matching enabled"""
+    db = SessionLocal()
+    try:
+        checked, mismatches, (single_s, bulk_s) = _compare(db, STUDENT_INTERESTS, STUDENT_HOBBIES)
+        print(f"[OK] {checked} tutors | single: {single_s:.3f}s | bulk: {bulk_s:.3f}s")
+        for tutor_id, reason in mismatches:
+            print(f"   [MISMATCH] tutor {tutor_id}: {reason}")
+        assert checked > 0, "No tutors found - seed the database first"
+        assert not mismatches
+    finally:
+        db.close()
+
+
+def test_bulk_skips_unknown_tutors():
+    """Ids that don't exist in tutor_profiles are left out of the result"""
+    db = SessionLocal()
+    try:
+        result = TutorScoringCalculator(db).calculate_all_new_scores_bulk([-1])
+        assert result == {}
+        print("[OK] Unknown tutor ids are skipped")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Bulk vs single-tutor scoring parity")
+    print("=" * 80)
+    test_bulk_matches_single_without_student_context()
+    test_bulk_matches_single_with_student_context()
+    test_bulk_skips_unknown_tutors()
+    print("\n[OK] Bulk and single-tutor scoring are identical")
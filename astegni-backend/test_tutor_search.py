@@ -0,0 +1,94 @@
+"""
+Test the indexed tutor search (tutor_search.py)
+
+- Search words become a prefix tsquery; punctuation cannot break to_tsquery
+- Every tutor the old search found (ILIKE scans over users, courses,
+  credentials and schools) is matched by its search document, for a set of
+  terms taken from the data
+
+Requires migrate_add_tutor_search.py:
+    python test_tutor_search.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from sqlalchemy import text
+
+from models import SessionLocal, TutorProfile
+from tutor_search import prefix_query, search_filter, search_relevance_map
+
+
+def legacy_search_ids(db, term: str) -> set:
+    """Tutors the old get_tutors search matched (before tutor_search_documents)"""
+    pattern = f'%{term.lower()}%'
+    return set(db.execute(text("""
+        SELECT tp.id FROM tutor_profiles tp JOIN users u ON u.id = tp.user_id
+        WHERE LOWER(u.first_name) LIKE :pattern
+           OR LOWER(u.father_name) LIKE :pattern
+           OR LOWER(u.location) LIKE :pattern
+           OR CAST(u.languages AS TEXT) ILIKE :pattern
+           OR tp.id IN (
+               SELECT pkg.tutor_id FROM tutor_packages pkg
+               JOIN courses c ON c.id = ANY(pkg.course_ids)
+               WHERE c.status = 'verified' AND pkg.visibility = 'public'
+                 AND (c.tags::text ILIKE :pattern OR c.course_name ILIKE :pattern
+                      OR c.course_category ILIKE :pattern)
+           )
+           OR tp.id IN (
+               SELECT cr.uploader_id FROM credentials cr
+               WHERE cr.uploader_role = 'tutor' AND cr.document_type = 'experience'
+                 AND cr.is_current = true AND cr.title ILIKE :pattern
+           )
+           OR tp.id IN (
+               SELECT cr.uploader_id FROM credentials cr
+               JOIN schools s ON LOWER(cr.title) = LOWER(s.name)
+               WHERE cr.uploader_role = 'tutor' AND cr.document_type = 'experience'
+                 AND s.status = 'verified' AND s.name ILIKE :pattern
+           )
+    """), {"pattern": pattern}).scalars().all())
+
+
+def test_prefix_query():
+    assert prefix_query("Math") == "math:*"
+    assert prefix_query("  Addis Ababa ") == "addis:* & ababa:*"
+    assert prefix_query("o'neil & (chem)") == "o:* & neil:* & chem:*"
+    assert prefix_query("ሂሳብ") == "ሂሳብ:*"
+    assert prefix_query("%%") is None
+    print("[OK] Search words become prefix tsqueries")
+
+
+def test_documents_cover_legacy_search():
+    db = SessionLocal()
+    try:
+        terms = {"math", "english", "addis", "grade", "school", "a"}
+        terms.update(db.execute(text("""
+            SELECT LOWER(first_name) FROM users u JOIN tutor_profiles tp ON tp.user_id = u.id
+            WHERE first_name IS NOT NULL LIMIT 5
+        """)).scalars().all())
+        terms.update(db.execute(text("""
+            SELECT LOWER(course_name) FROM courses WHERE status = 'verified' AND course_name IS NOT NULL LIMIT 5
+        """)).scalars().all())
+
+        for term in sorted(terms):
+            expected = legacy_search_ids(db, term)
+            found = set(db.query(TutorProfile.id).filter(search_filter(term)).scalars().all())
+            assert expected <= found, f"'{term}': missing tutors {sorted(expected - found)[:10]}"
+
+            relevance = search_relevance_map(db, term, sorted(found))
+            assert all(0 < points <= 100 for points in relevance.values())
+            print(f"   '{term}': {len(expected)} legacy matches, {len(found)} indexed, {len(relevance)} ranked")
+        print(f"[OK] Search documents cover the old search for {len(terms)} terms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Tutor search")
+    print("=" * 80)
+    test_prefix_query()
+    test_documents_cover_legacy_search()
+    print("\n[OK] Tutor search tests passed")
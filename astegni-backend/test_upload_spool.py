@@ -0,0 +1,89 @@
+"""
+Test streamed uploads (upload_spool.py)
+
+- Small bodies stay in memory, large ones roll over to a temp file; size and
+  SHA-1 match the whole body either way, and close() deletes the temp file
+- Reading stops with a 400 as soon as the size limit is exceeded
+
+No database or B2 credentials needed:
+    python test_upload_spool.py
+"""
+
+import sys
+import os
+import asyncio
+import hashlib
+import io
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import HTTPException, UploadFile
+
+from upload_spool import UPLOAD_CHUNK_SIZE, spool_upload
+
+
+class CountingStream(io.BytesIO):
+    """Records how many bytes the spool pulled from the request body"""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+async def _spool(data: bytes, **kwargs):
+    return await spool_upload(UploadFile(io.BytesIO(data), filename="upload.bin"), **kwargs)
+
+
+def test_memory_and_disk_spools():
+    async def run():
+        threshold = 2 * UPLOAD_CHUNK_SIZE
+        for size in (0, 1000, threshold, threshold + 1, 5 * UPLOAD_CHUNK_SIZE + 17):
+            data = os.urandom(size)
+            spool = await _spool(data, threshold=threshold)
+            try:
+                assert spool.size == size
+                assert spool.sha1 == hashlib.sha1(data).hexdigest()
+                assert spool.on_disk == (size > threshold), size
+                assert spool.getvalue() == data
+                path = spool.path
+            finally:
+                spool.close()
+            if path:
+                assert not os.path.exists(path), "Temp file should be deleted on close"
+            spool.close()  # idempotent
+        print("[OK] Spooled uploads keep size, SHA-1 and content; temp files are removed")
+
+    asyncio.run(run())
+
+
+def test_size_limit_stops_reading():
+    async def run():
+        stream = CountingStream(os.urandom(20 * UPLOAD_CHUNK_SIZE))
+        try:
+            await spool_upload(
+                UploadFile(stream, filename="video.mp4"),
+                max_bytes=3 * UPLOAD_CHUNK_SIZE,
+                too_large_detail="Video size exceeds 3MB limit",
+                threshold=UPLOAD_CHUNK_SIZE
+            )
+            assert False, "Expected HTTPException"
+        except HTTPException as e:
+            assert e.status_code == 400
+            assert e.detail == "Video size exceeds 3MB limit"
+        assert stream.bytes_read <= 4 * UPLOAD_CHUNK_SIZE, stream.bytes_read
+        print(f"[OK] Oversized upload rejected after reading {stream.bytes_read} bytes")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: Upload spool")
+    print("=" * 80)
+    test_memory_and_disk_spools()
+    test_size_limit_stops_reading()
+    print("\n[OK] Upload spool tests passed")
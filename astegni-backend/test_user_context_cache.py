@@ -0,0 +1,107 @@
+"""
+Test the get_current_user context cache (user_context_cache.py)
+Checks that a cached user costs zero queries, still behaves as a persistent
+User (update + commit), and is invalidated by ORM writes, explicit
+invalidation and newer tokens.
+
+Run against a seeded database:
+    python test_user_context_cache.py
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from sqlalchemy import event
+from models import SessionLocal, User, engine
+from user_context_cache import load_user, invalidate_user_context, clear_user_context_cache, _cache
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def _first_user_id():
+    db = SessionLocal()
+    try:
+        user = db.query(User).order_by(User.id).first()
+        assert user is not None, "No users found - seed the database first"
+        return user.id
+    finally:
+        db.close()
+
+
+def test_cache_hit_costs_no_queries():
+    clear_user_context_cache()
+    user_id = _first_user_id()
+    counter = QueryCounter()
+
+    db = SessionLocal()
+    try:
+        load_user(db, user_id)
+    finally:
+        db.close()
+
+    event.listen(engine, "before_cursor_execute", counter)
+    db = SessionLocal()
+    try:
+        user = load_user(db, user_id)
+        assert user.id == user_id
+        _ = (user.active_role, user.roles, user.is_verified, user.is_active)
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", counter)
+
+    print(f"[OK] Cached load issued {counter.count} queries")
+    assert counter.count == 0
+
+
+def test_orm_update_invalidates():
+    user_id = _first_user_id()
+    db = SessionLocal()
+    try:
+        user = load_user(db, user_id)
+        original = user.theme
+        user.theme = "dark" if original != "dark" else "light"
+        db.commit()
+        assert user_id not in _cache
+
+        user.theme = original
+        db.commit()
+        print("[OK] ORM update through a cached user invalidated the entry")
+    finally:
+        db.close()
+
+
+def test_explicit_invalidation_and_newer_token():
+    user_id = _first_user_id()
+    db = SessionLocal()
+    try:
+        load_user(db, user_id)
+        assert user_id in _cache
+        invalidate_user_context(user_id)
+        assert user_id not in _cache
+
+        load_user(db, user_id)
+        cached_at = _cache[user_id][0]
+        load_user(db, user_id, issued_at=time.time() + 1)
+        assert _cache[user_id][0] > cached_at
+        print("[OK] Explicit invalidation and newer tokens reload the row")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: User context cache")
+    print("=" * 80)
+    test_cache_hit_costs_no_queries()
+    test_orm_update_invalidates()
+    test_explicit_invalidation_and_newer_token()
+    print("\n[OK] User context cache tests passed")
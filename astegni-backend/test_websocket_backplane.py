@@ -0,0 +1,164 @@
+"""
+Test cross-worker WebSocket delivery (websocket_backplane.py)
+Starts two worker processes, each with its own ConnectionManager on the Redis
+backplane, and checks that a message sent on one worker reaches a socket held
+by the other, that presence is shared, and that it clears on disconnect.
+
+Uses an in-process Redis stand-in (fakeredis TCP server) when fakeredis is
+installed, otherwise the server at TEST_REDIS_URL:
+    pip install fakeredis
+    python test_websocket_backplane.py
+"""
+
+import sys
+import os
+import json
+import asyncio
+import socket
+import time
+import multiprocessing as mp
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+PREFIX = f"ws_test_{os.getpid()}"
+
+
+class FakeWebSocket:
+    """Collects what the manager sends"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.sent.append(json.loads(text))
+
+
+def _serve_fake_redis(port):
+    from fakeredis import TcpFakeServer
+    TcpFakeServer(("127.0.0.1", port), server_type="redis").serve_forever()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+async def _wait_event(event, timeout=10.0):
+    return await asyncio.get_running_loop().run_in_executor(None, event.wait, timeout)
+
+
+def _worker(name, url, events, results):
+    from websocket_backplane import RedisBackplane
+    from websocket_manager import ConnectionManager
+
+    async def run():
+        manager = ConnectionManager(RedisBackplane(url, prefix=PREFIX))
+        await manager.start()
+        ws = FakeWebSocket()
+        key = "tutor_1" if name == "a" else "student_2"
+        await manager.connect(ws, key)
+
+        if name == "a":
+            events["a_connected"].set()
+            got = await _wait_for(lambda: any(m.get("type") == "hello" for m in ws.sent))
+            results.put(("a_received_direct", got))
+            got = await _wait_for(lambda: any(m.get("type") == "announcement" for m in ws.sent))
+            results.put(("a_received_broadcast", got))
+            await _wait_event(events["b_checked"])
+            await manager.disconnect(ws, key)
+            events["a_disconnected"].set()
+        else:
+            await _wait_event(events["a_connected"])
+            results.put(("b_sees_a_online", await manager.is_user_online("tutor_1")))
+            results.put(("b_online_keys", await manager.get_online_keys()))
+            results.put(("b_sent_direct", await manager.send_personal_message({"type": "hello"}, "tutor_1")))
+            await manager.broadcast({"type": "announcement"}, exclude_user=key)
+            events["b_checked"].set()
+            await _wait_event(events["a_disconnected"])
+            results.put(("b_sees_a_offline", not await manager.is_user_online("tutor_1")))
+            await manager.disconnect(ws, key)
+
+        await manager.stop()
+
+    asyncio.run(run())
+
+
+def test_cross_worker_delivery():
+    server = None
+    try:
+        import fakeredis  # noqa: F401
+        port = _free_port()
+        server = mp.Process(target=_serve_fake_redis, args=(port,), daemon=True)
+        server.start()
+        time.sleep(0.5)
+        url = f"redis://127.0.0.1:{port}/0"
+    except ImportError:
+        url = os.getenv("TEST_REDIS_URL", "redis://localhost:6379/15")
+
+    events = {name: mp.Event() for name in ("a_connected", "b_checked", "a_disconnected")}
+    results = mp.Queue()
+    workers = [mp.Process(target=_worker, args=(name, url, events, results)) for name in ("a", "b")]
+    try:
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        outcome = {}
+        while not results.empty():
+            key, value = results.get()
+            outcome[key] = value
+        print(f"Results: {outcome}")
+
+        assert outcome.get("b_sees_a_online") is True
+        assert "tutor_1" in outcome.get("b_online_keys", [])
+        assert outcome.get("b_sent_direct") is True
+        assert outcome.get("a_received_direct") is True
+        assert outcome.get("a_received_broadcast") is True
+        assert outcome.get("b_sees_a_offline") is True
+        print("[OK] Message, broadcast and presence crossed worker processes")
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        if server is not None:
+            server.terminate()
+
+
+def test_in_memory_backplane_is_default():
+    from websocket_backplane import InMemoryBackplane
+    from websocket_manager import ConnectionManager
+
+    async def run():
+        manager = ConnectionManager()
+        assert isinstance(manager.backplane, InMemoryBackplane)
+        ws = FakeWebSocket()
+        await manager.connect(ws, "student_5")
+        assert await manager.is_user_online("student_5")
+        assert await manager.send_personal_message({"type": "hello"}, "student_5")
+        await manager.disconnect(ws, "student_5")
+        assert not await manager.is_user_online("student_5")
+
+    asyncio.run(run())
+    print("[OK] In-memory backplane works in a single worker")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TEST: WebSocket backplane")
+    print("=" * 80)
+    test_in_memory_backplane_is_default()
+    test_cross_worker_delivery()
+    print("\n[OK] WebSocket backplane tests passed")
@@ -0,0 +1,100 @@
+"""
+Soak test: idle WebSockets must not hold database connections (websocket_db.py)
+
+Opens --sockets idle connections to /ws/{profile_id}/{role} on a running
+server, leaves them idle, and while they are open checks that:
+- no connection is held through socket_db() (/api/health/db-pools "websocket")
+- the SQLAlchemy pool shared with HTTP has nothing checked out by the sockets
+- a burst of DB-backed HTTP requests (/api/footer-stats) all succeed quickly
+
+Before websocket_db.py every socket kept a pooled connection for its lifetime,
+so the pool (5 + 10 overflow) ran out after 15 sockets and the HTTP burst
+timed out.
+
+Start the backend first (one worker), then:
+    python test_websocket_idle_soak.py
+    python test_websocket_idle_soak.py --url http://localhost:8000 --sockets 1000 --idle 30
+
+1,000 sockets need a file descriptor limit above 1024 (ulimit -n 4096) in both shells.
+"""
+
+import sys
+import os
+import time
+import asyncio
+import argparse
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import websockets
+
+# Profile ids far above real ones - presence updates for them touch no rows
+PROFILE_ID_BASE = 900_000_000
+
+
+async def _open_socket(ws_url: str, index: int):
+    socket = await websockets.connect(f"{ws_url}/ws/{PROFILE_ID_BASE + index}/student", open_timeout=30)
+    await asyncio.wait_for(socket.recv(), timeout=30)  # {"type": "connection", ...}
+    return socket
+
+
+async def _http_burst(client: httpx.AsyncClient, requests: int):
+    async def one():
+        started = time.perf_counter()
+        response = await client.get("/api/footer-stats")
+        response.raise_for_status()
+        return time.perf_counter() - started
+
+    return await asyncio.gather(*(one() for _ in range(requests)))
+
+
+async def soak(url: str, sockets: int, idle: float, burst: int):
+    ws_url = url.replace("http", "ws", 1)
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        baseline = (await client.get("/api/health/db-pools")).json()["websocket"]
+        print(f"Baseline: {baseline}")
+
+        opened = []
+        started = time.perf_counter()
+        for offset in range(0, sockets, 100):
+            opened += await asyncio.gather(*(
+                _open_socket(ws_url, index) for index in range(offset, min(offset + 100, sockets))
+            ))
+        print(f"Opened {len(opened)} sockets in {time.perf_counter() - started:.1f}s")
+
+        try:
+            await asyncio.sleep(idle)
+            gauge = (await client.get("/api/health/db-pools")).json()["websocket"]
+            print(f"While idle: {gauge}")
+            assert gauge["held"] == 0, f"{gauge['held']} connections held by idle sockets"
+            assert gauge["peak"] <= gauge["engine_pool"]["size"], gauge
+
+            latencies = sorted(await _http_burst(client, burst))
+            print(f"HTTP burst: {burst} requests, p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, "
+                  f"max {latencies[-1] * 1000:.0f} ms")
+            assert latencies[-1] < 5, "HTTP requests waited for the connection pool"
+
+            gauge = (await client.get("/api/health/db-pools")).json()["websocket"]
+            assert gauge["engine_pool"]["checked_out"] == 0, gauge
+        finally:
+            await asyncio.gather(*(socket.close() for socket in opened), return_exceptions=True)
+
+        await asyncio.sleep(1)
+        final = (await client.get("/api/health/db-pools")).json()["websocket"]
+        print(f"After close: {final}")
+        assert final["held"] == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Idle WebSocket soak test")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--sockets", type=int, default=1000)
+    parser.add_argument("--idle", type=float, default=30)
+    parser.add_argument("--burst", type=int, default=50)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("TEST: Idle WebSocket soak")
+    print("=" * 80)
+    asyncio.run(soak(args.url, args.sockets, args.idle, args.burst))
+    print(f"\n[OK] {args.sockets} idle sockets held no database connections")
@@ -194,7 +194,7 @@ def get_role_profile(db: Session, current_user, role: str):
 # ============================================
 
 @router.get("/status", response_model=TFAStatusResponse)
-async def get_2fa_status(
+def get_2fa_status(
     role: Optional[str] = None,  # Optional role override (for profile pages)
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -241,7 +241,7 @@ async def get_2fa_status(
 
 
 @router.post("/enable")
-async def enable_2fa(
+def enable_2fa(
     request: TFAEnableRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -291,7 +291,7 @@ async def enable_2fa(
 
 
 @router.post("/disable/send-otp")
-async def send_disable_otp(
+def send_disable_otp(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -349,7 +349,7 @@ async def send_disable_otp(
 
 
 @router.post("/disable")
-async def disable_2fa(
+def disable_2fa(
     request: TFADisableRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -436,7 +436,7 @@ async def disable_2fa(
 # ============================================
 
 @router.post("/email/send-otp")
-async def send_email_otp(
+def send_email_otp(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -485,7 +485,7 @@ async def send_email_otp(
 
 
 @router.post("/email/verify")
-async def verify_email_otp(
+def verify_email_otp(
     request: TFAEmailVerifyRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -540,7 +540,7 @@ async def verify_email_otp(
 # ============================================
 
 @router.post("/authenticator/setup", response_model=TFAAuthenticatorSetupResponse)
-async def setup_authenticator(
+def setup_authenticator(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -580,7 +580,7 @@ async def setup_authenticator(
 
 
 @router.post("/authenticator/verify")
-async def verify_authenticator(
+def verify_authenticator(
     request: TFAAuthenticatorVerifyRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -627,7 +627,7 @@ async def verify_authenticator(
 # ============================================
 
 @router.post("/inapp/setup")
-async def setup_inapp_verification(
+def setup_inapp_verification(
     request: TFAInAppSetupRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -689,7 +689,7 @@ async def setup_inapp_verification(
 
 
 @router.post("/inapp/verify")
-async def verify_inapp_password(
+def verify_inapp_password(
     request: TFAInAppVerifyRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -730,7 +730,7 @@ async def verify_inapp_password(
 # ============================================
 
 @router.get("/backup-codes")
-async def get_backup_codes(
+def get_backup_codes(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -764,7 +764,7 @@ async def get_backup_codes(
 
 
 @router.post("/backup-codes/regenerate")
-async def regenerate_backup_codes(
+def regenerate_backup_codes(
     request: TFADisableRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -805,7 +805,7 @@ async def regenerate_backup_codes(
 # ============================================
 
 @router.post("/send-action-otp")
-async def send_action_otp(
+def send_action_otp(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -860,7 +860,7 @@ async def send_action_otp(
 
 
 @router.post("/verify")
-async def verify_2fa_for_action(
+def verify_2fa_for_action(
     request: TFAVerifyForActionRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1043,7 +1043,7 @@ class ProtectedPanelsUpdateRequest(BaseModel):
 
 
 @router.get("/protected-panels")
-async def get_protected_panels(
+def get_protected_panels(
     role: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1095,7 +1095,7 @@ async def get_protected_panels(
 
 
 @router.put("/protected-panels")
-async def update_protected_panels(
+def update_protected_panels(
     request: ProtectedPanelsUpdateRequest,
     role: Optional[str] = None,
     current_user: User = Depends(get_current_user),
@@ -1151,7 +1151,7 @@ async def update_protected_panels(
 
 
 @router.post("/protected-panels/reset")
-async def reset_protected_panels(
+def reset_protected_panels(
     role: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1201,7 +1201,7 @@ class PasswordVerifyRequest(BaseModel):
 
 
 @router.post("/verify-password")
-async def verify_password_endpoint(
+def verify_password_endpoint(
     request: PasswordVerifyRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1242,7 +1242,7 @@ async def verify_password_endpoint(
 
 
 @router.get("/is-panel-protected/{panel_id}")
-async def is_panel_protected(
+def is_panel_protected(
     panel_id: str,
     role: Optional[str] = None,
     current_user: User = Depends(get_current_user),
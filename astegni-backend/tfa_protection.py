@@ -9,6 +9,7 @@ from fastapi import HTTPException, Header
 from typing import Optional
 from datetime import datetime, timedelta
 import psycopg
+from db_pool import pooled_connect
 import os
 from dotenv import load_dotenv
 
@@ -66,7 +67,7 @@ def check_2fa_protection(
 
     profile_table = ROLE_PROFILE_TABLES[role]
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -177,7 +178,7 @@ def is_2fa_enabled_for_role(user_id: int, role: str) -> bool:
 
     profile_table = ROLE_PROFILE_TABLES[role]
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -215,7 +216,7 @@ def get_2fa_method_for_role(user_id: int, role: str) -> Optional[str]:
 
     profile_table = ROLE_PROFILE_TABLES[role]
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -254,7 +255,7 @@ def is_panel_protected(user_id: int, role: str, panel_id: str) -> bool:
 
     profile_table = ROLE_PROFILE_TABLES[role]
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -317,7 +318,7 @@ def check_panel_2fa_protection(
 
     profile_table = ROLE_PROFILE_TABLES[role]
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
@@ -409,7 +410,7 @@ def get_protected_panels_for_role(user_id: int, role: str) -> list:
 
     profile_table = ROLE_PROFILE_TABLES[role]
 
-    conn = psycopg.connect(DATABASE_URL)
+    conn = pooled_connect(DATABASE_URL)
     cur = conn.cursor()
 
     try:
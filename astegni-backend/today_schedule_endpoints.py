@@ -4,85 +4,31 @@ Returns combined data from schedules and sessions tables for the current day
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from typing import List, Optional
+from typing import List
 from datetime import datetime, date, time as time_type
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
 import os
-import jwt
-from jwt import PyJWTError
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# OAuth2 scheme
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # Get config from environment
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 def get_db_connection():
     """Get database connection"""
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise Exception("DATABASE_URL not found in environment variables")
-    return psycopg.connect(database_url)
-
-def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current authenticated user"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
-        user_id = int(user_id_str)
-    except (PyJWTError, ValueError, TypeError) as e:
-        print(f"JWT decode error: {e}")
-        raise credentials_exception
-
-    # Fetch user from database
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, first_name, father_name, email, phone, roles, active_role,
-                       grandfather_name, profile_picture
-                FROM users WHERE id = %s
-            """, (user_id,))
-            row = cur.fetchone()
-
-            if not row:
-                raise credentials_exception
-
-            return {
-                'id': row[0],
-                'first_name': row[1],
-                'father_name': row[2],
-                'email': row[3],
-                'phone': row[4],
-                'roles': row[5] or [],
-                'active_role': row[6],
-                'grandfather_name': row[7],
-                'profile_picture': row[8]
-            }
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Database error in get_current_user: {e}")
-        raise credentials_exception
-    finally:
-        conn.close()
+    return pooled_connect(database_url)
+
 
 router = APIRouter()
 
 @router.get("/api/today-schedule")
-async def get_today_schedule(current_user = Depends(get_current_user)):
+def get_today_schedule(current_user = Depends(get_current_user_dict)):
     """
     Get today's schedule combining:
     1. Schedules table - recurring schedules that match today's day, or specific dates that include today
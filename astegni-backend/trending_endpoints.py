@@ -14,6 +14,7 @@ from pydantic import BaseModel
 # Import from modular structure (path already set up by app.py)
 from models import SessionLocal, TutorProfile, User
 from utils import get_current_user
+from view_counters import flush_view_counters, recompute_trending_scores, track_views
 
 router = APIRouter()
 
@@ -50,51 +51,14 @@ class TrendingTutorResponse(BaseModel):
 # TRENDING CALCULATION FUNCTIONS
 # ============================================
 
-def calculate_trending_score(tutor: TutorProfile) -> float:
-    """
-    Calculate time-weighted trending score for a tutor
-
-    Formula:
-    - Recent searches (last 24h): weight = 1.0
-    - Searches 1-7 days ago: weight = 0.7
-    - Searches 7-30 days ago: weight = 0.3
-    - Searches older than 30 days: weight = 0.1
-
-    trending_score = search_count * time_weight
-    """
-    if not tutor.last_search_increment:
-        return tutor.search_count * 0.1  # Old or never searched
-
-    # Calculate time since last search
-    time_since_search = datetime.utcnow() - tutor.last_search_increment
-    hours_since = time_since_search.total_seconds() / 3600
-    days_since = hours_since / 24
-
-    # Apply time-based weight
-    if days_since < 1:
-        weight = 1.0  # Very recent (last 24 hours)
-    elif days_since < 7:
-        weight = 0.7  # Recent (last week)
-    elif days_since < 30:
-        weight = 0.3  # Somewhat recent (last month)
-    else:
-        weight = 0.1  # Old searches
-
-    return tutor.search_count * weight
-
-
 def update_trending_scores(db: Session):
     """
-    Recalculate trending scores for all tutors
-    This should be run periodically (e.g., every hour)
+    Recalculate trending scores for all tutors (one set-based UPDATE, see view_counters.py)
+    The view counter flush loop already runs this every VIEW_COUNTER_FLUSH_INTERVAL seconds
     """
-    tutors = db.query(TutorProfile).all()
-
-    for tutor in tutors:
-        tutor.trending_score = calculate_trending_score(tutor)
-
+    updated = recompute_trending_scores(db, kinds=["tutor"])
     db.commit()
-    return len(tutors)
+    return updated or 0
 
 
 # ============================================
@@ -114,7 +78,14 @@ def smart_rank_tutors(db: Session, tutors: List[TutorProfile]) -> List[TutorProf
     from tutor_scoring import TutorScoringCalculator
     from datetime import datetime
 
-    scoring_calculator = TutorScoringCalculator(db)
+    # One grouped query per factor for the whole candidate pool
+    try:
+        new_scores_by_tutor = TutorScoringCalculator(db).calculate_all_new_scores_bulk(
+            [tutor.id for tutor in tutors]
+        )
+    except Exception as e:
+        print(f"⚠️ Error calculating smart scores for {len(tutors)} tutors: {e}")
+        new_scores_by_tutor = {}
 
     def calculate_tutor_score(tutor: TutorProfile) -> float:
         score = 0
@@ -137,17 +108,8 @@ def smart_rank_tutors(db: Session, tutors: List[TutorProfile]) -> List[TutorProf
                 score += 12
 
         # Composite scoring (rating, students, completion, response, experience, etc.)
-        try:
-            new_scores, _ = scoring_calculator.calculate_all_new_scores(
-                tutor_id=tutor.id,
-                tutor_user_id=tutor.user_id,
-                tutor_profile_created_at=tutor.created_at,
-                student_interests=[],
-                student_hobbies=[]
-            )
-            score += new_scores
-        except Exception as e:
-            print(f"⚠️ Error calculating smart scores for tutor {tutor.id}: {e}")
+        if tutor.id in new_scores_by_tutor:
+            score += new_scores_by_tutor[tutor.id][0]
 
         # New tutor bonus
         if tutor.created_at:
@@ -175,15 +137,14 @@ def smart_rank_tutors(db: Session, tutors: List[TutorProfile]) -> List[TutorProf
 # ============================================
 
 @router.post("/api/tutors/track-views")
-async def track_tutor_views(
-    request: TutorViewRequest,
-    db: Session = Depends(get_db)
-):
+def track_tutor_views(request: TutorViewRequest):
     """
     Track when tutors are viewed/searched
 
-    This endpoint increments search_count and updates trending_score
-    for tutors that appear in search results or are viewed.
+    This endpoint counts a view for tutors that appear in search results
+    or are viewed. Counts are buffered (view_counters.py) and added to
+    search_count, with trending_score recomputed, every
+    VIEW_COUNTER_FLUSH_INTERVAL seconds.
 
     Call this endpoint when:
     - Search results are displayed (all tutors in results)
@@ -194,33 +155,20 @@ async def track_tutor_views(
         return {"message": "No tutor IDs provided", "updated": 0}
 
     try:
-        # Update search count and timestamp for all tutors
-        tutors = db.query(TutorProfile).filter(
-            TutorProfile.id.in_(request.tutor_ids)
-        ).all()
-
-        now = datetime.utcnow()
-
-        for tutor in tutors:
-            tutor.search_count += 1
-            tutor.last_search_increment = now
-            tutor.trending_score = calculate_trending_score(tutor)
-
-        db.commit()
+        tracked = track_views("tutor", request.tutor_ids)
 
         return {
-            "message": f"Updated search tracking for {len(tutors)} tutors",
-            "updated": len(tutors),
-            "timestamp": now.isoformat()
+            "message": f"Updated search tracking for {tracked} tutors",
+            "updated": tracked,
+            "timestamp": datetime.utcnow().isoformat()
         }
 
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to track views: {str(e)}")
 
 
 @router.get("/api/tutors/trending")
-async def get_trending_tutors(
+def get_trending_tutors(
     limit: int = 20,
     min_searches: int = 5,  # Minimum searches to be considered trending
     db: Session = Depends(get_db)
@@ -237,9 +185,7 @@ async def get_trending_tutors(
     Includes enriched data: rating, subjects, teaches_at, profile_picture, location
     """
     try:
-        # Update trending scores before querying
-        update_trending_scores(db)
-
+        # trending_score is kept fresh by the view counter flush loop (view_counters.py)
         # Get trending tutors: verified, and with at least one active public package.
         # tutor_packages has no ORM model (raw-SQL only), so correlate via EXISTS.
         has_active_package = text("""
@@ -365,24 +311,29 @@ async def get_trending_tutors(
 
 
 @router.post("/api/tutors/recalculate-trending")
-async def recalculate_trending_scores(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+def recalculate_trending_scores(
+    current_user: User = Depends(get_current_user)
 ):
     """
     Admin endpoint to manually recalculate all trending scores
 
-    This should be called:
-    - Periodically (e.g., via cron job every hour)
+    Applies pending view counts and recomputes scores now instead of at the
+    next view counter flush. Use it:
     - After bulk updates
     - For maintenance
     """
     try:
-        updated_count = update_trending_scores(db)
+        counted, rescored = flush_view_counters()
+        if rescored is None:
+            # Another worker's flush holds the recompute lock and is doing the same work
+            message = "Trending scores are being recalculated by another worker"
+        else:
+            message = f"Successfully recalculated trending scores ({rescored} changed)"
 
         return {
-            "message": f"Successfully recalculated trending scores for {updated_count} tutors",
-            "updated": updated_count,
+            "message": message,
+            "updated": rescored or 0,
+            "views_applied": counted,
             "timestamp": datetime.utcnow().isoformat()
         }
 
@@ -391,7 +342,7 @@ async def recalculate_trending_scores(
 
 
 @router.get("/api/tutors/search-stats")
-async def get_search_statistics(
+def get_search_statistics(
     db: Session = Depends(get_db)
 ):
     """
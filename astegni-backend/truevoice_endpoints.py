@@ -23,12 +23,13 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Q
 from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg.rows import dict_row
+from psycopg.types.json import Json
+from db_pool import pooled_connect
+from auth import claims_from_authorization
 import os
 import hashlib
 import httpx
-import jwt
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -50,7 +51,7 @@ CACHE_TTL_DAYS = int(os.getenv("TRUEVOICE_CACHE_TTL_DAYS", "30"))
 
 def get_db():
     """Get database connection"""
-    conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
+    conn = pooled_connect(DATABASE_URL, row_factory=dict_row)
     try:
         yield conn
     finally:
@@ -107,40 +108,7 @@ class SynthesisResponse(BaseModel):
 
 def get_current_user_id(authorization: str = None) -> int:
     """Extract user ID from authorization token"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Authorization required")
-
-    # Extract token from Bearer header
-    try:
-        token = authorization.replace("Bearer ", "").strip()
-        SECRET_KEY = os.getenv('SECRET_KEY')
-
-        if not SECRET_KEY:
-            print("[TrueVoice] WARNING: SECRET_KEY not found in environment!")
-            raise HTTPException(status_code=500, detail="Server configuration error")
-
-        ALGORITHM = 'HS256'
-
-        # Decode and verify token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-
-        return int(user_id)
-    except jwt.ExpiredSignatureError as e:
-        print(f"[TrueVoice] Token expired: {e}")
-        raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.InvalidTokenError as e:
-        print(f"[TrueVoice] Invalid token error: {e}")
-        raise HTTPException(status_code=401, detail="Invalid token")
-    except ValueError as e:
-        print(f"[TrueVoice] ValueError: {e}")
-        raise HTTPException(status_code=401, detail="Invalid user ID in token")
-    except Exception as e:
-        print(f"[TrueVoice] Unexpected error: {type(e).__name__}: {e}")
-        raise HTTPException(status_code=401, detail=f"Token verification failed: {str(e)}")
+    return claims_from_authorization(authorization).user_id
 
 
 def generate_content_hash(content: str, voice_id: str) -> str:
@@ -196,7 +164,7 @@ async def synthesize_with_elevenlabs(text: str, voice_id: str) -> tuple:
 # =====================================================
 
 @router.get("/profile")
-async def get_truevoice_profile(
+def get_truevoice_profile(
     authorization: str = Header(None, alias="Authorization"),
     conn = Depends(get_db)
 ):
@@ -224,7 +192,7 @@ async def get_truevoice_profile(
 
 
 @router.post("/enroll")
-async def start_enrollment(
+def start_enrollment(
     request: EnrollmentStartRequest,
     authorization: str = Header(None, alias="Authorization"),
     conn = Depends(get_db)
@@ -369,8 +337,8 @@ async def upload_voice_sample(
             updated_at = CURRENT_TIMESTAMP
         WHERE user_id = %s
     """, (
-        psycopg2.extras.Json(sample_urls),
-        psycopg2.extras.Json(sample_texts_arr),
+        Json(sample_urls),
+        Json(sample_texts_arr),
         progress,
         user_id
     ))
@@ -387,7 +355,7 @@ async def upload_voice_sample(
 
 
 @router.post("/complete-enrollment")
-async def complete_enrollment(
+def complete_enrollment(
     authorization: str = Header(None, alias="Authorization"),
     conn = Depends(get_db)
 ):
@@ -462,7 +430,7 @@ async def complete_enrollment(
 
 
 @router.put("/settings")
-async def update_truevoice_settings(
+def update_truevoice_settings(
     settings: TrueVoiceSettingsUpdate,
     authorization: str = Header(None, alias="Authorization"),
     conn = Depends(get_db)
@@ -529,7 +497,7 @@ async def update_truevoice_settings(
 
 
 @router.delete("/profile")
-async def delete_truevoice_profile(
+def delete_truevoice_profile(
     authorization: str = Header(None, alias="Authorization"),
     conn = Depends(get_db)
 ):
@@ -721,7 +689,7 @@ async def synthesize_message(
 
 
 @router.get("/audio/{message_id}")
-async def get_cached_audio(
+def get_cached_audio(
     message_id: int,
     authorization: str = Header(None, alias="Authorization"),
     conn = Depends(get_db)
@@ -758,7 +726,7 @@ async def get_cached_audio(
 
 
 @router.get("/check/{user_id}")
-async def check_truevoice_status(
+def check_truevoice_status(
     user_id: int,
     conn = Depends(get_db)
 ):
@@ -796,7 +764,7 @@ async def check_truevoice_status(
 # =====================================================
 
 @router.post("/cleanup-cache")
-async def cleanup_expired_cache(
+def cleanup_expired_cache(
     authorization: str = Header(None, alias="Authorization"),
     conn = Depends(get_db)
 ):
@@ -823,7 +791,7 @@ async def cleanup_expired_cache(
 
 
 @router.get("/stats")
-async def get_truevoice_stats(
+def get_truevoice_stats(
     authorization: str = Header(None, alias="Authorization"),
     conn = Depends(get_db)
 ):
@@ -0,0 +1,398 @@
+"""
+Tutor Availability Index
+In-process interval index of when every tutor can teach, for availability
+widgets, "free at" tutor search and booking conflict checks
+
+Two sources (see tutor_sessions_endpoints.py):
+- schedules  when a tutor is AVAILABLE - active rows with scheduler_role 'tutor'
+             recurring:  weekday names in `days`, limited to `months` (all
+                         months if empty) of `year`
+             specific:   'YYYY-MM-DD' strings in `specific_dates`
+- sessions   when a tutor is BOOKED - scheduled / in-progress sessions from
+             the Monday of the current week on (the week view shows the whole
+             week), via enrolled_courses.tutor_id
+
+Both are loaded once and expanded into minute-of-day intervals:
+
+    recurring   per weekday: NumPy columns start, end, tutor, year, month mask
+    specific    per date:    NumPy columns start, end, tutor
+    booked      per date:    NumPy columns start, end, tutor, session id
+
+plus the same rows grouped per tutor for single-tutor lookups. A tutor is free
+for a slot when the merged windows that apply on that date cover it and no
+booking overlaps it. free_tutors() answers "who is free Tuesday 16:00-18:00"
+with a few vectorized masks over that weekday/date instead of walking every
+tutor's schedules.
+
+Freshness:
+- invalidate_availability_index() after this worker changes a schedule or a
+  session - the next query reloads
+- availability_index_refresh_loop() (app.py lifespan) reloads every
+  AVAILABILITY_INDEX_REFRESH_SECONDS and rebuilds only if the rows changed
+
+Usage:
+    python tutor_availability_index.py    # print index stats
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from config import DATABASE_URL
+from db_pool import pooled_connect
+
+load_dotenv()
+
+AVAILABILITY_INDEX_REFRESH_SECONDS = int(os.getenv("AVAILABILITY_INDEX_REFRESH_SECONDS", 60))
+
+# Session statuses that occupy the tutor's time (both spellings are in use)
+BOOKED_SESSION_STATUSES = ('scheduled', 'in-progress', 'in_progress', 'ongoing')
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+_WEEKDAY_NUMBERS = {name[:3].lower(): number for number, name in enumerate(WEEKDAYS)}
+_MONTH_NUMBERS = {
+    name: number for number, name in enumerate(
+        ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1
+    )
+}
+
+DAY_MINUTES = 24 * 60
+
+Interval = Tuple[int, int]
+
+
+def to_minutes(value: Optional[time]) -> Optional[int]:
+    """Minute of day (0-1439) of a time, None for None"""
+    if value is None:
+        return None
+    return value.hour * 60 + value.minute
+
+
+def from_minutes(minutes: int) -> str:
+    """'HH:MM' for a minute of day (1440 -> '24:00')"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _span(start: Optional[time], end: Optional[time]) -> Optional[Interval]:
+    """(start, end) minutes; an end at or before the start runs to midnight"""
+    start_minutes, end_minutes = to_minutes(start), to_minutes(end)
+    if start_minutes is None:
+        return None
+    if end_minutes is None or end_minutes <= start_minutes:
+        end_minutes = DAY_MINUTES
+    return start_minutes, end_minutes
+
+
+def _month_mask(months: Optional[Iterable[str]]) -> int:
+    """Bit per month (bit 1 = January); 0 = every month"""
+    mask = 0
+    for month in months or []:
+        number = _MONTH_NUMBERS.get(str(month).strip()[:3].lower())
+        if number:
+            mask |= 1 << number
+    return mask
+
+
+def _parse_date(value: str) -> Optional[date]:
+    try:
+        return datetime.strptime(str(value).strip()[:10], '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sorted, non-overlapping union of intervals (touching ones are joined)"""
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract_intervals(windows: List[Interval], busy: Iterable[Interval]) -> List[Interval]:
+    """Parts of the (merged) windows not covered by any busy interval"""
+    free = []
+    busy = merge_intervals(busy)
+    for start, end in windows:
+        cursor = start
+        for busy_start, busy_end in busy:
+            if busy_end <= cursor or busy_start >= end:
+                continue
+            if busy_start > cursor:
+                free.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            free.append((cursor, end))
+    return free
+
+
+def covers(windows: List[Interval], start: int, end: int) -> bool:
+    """True if one of the merged windows contains [start, end)"""
+    return any(window_start <= start and end <= window_end for window_start, window_end in windows)
+
+
+# ============================================
+# LOADING
+# ============================================
+
+def load_availability_rows() -> Tuple[List[tuple], List[tuple]]:
+    """(schedule rows, booked session rows), keyed by tutor_profiles.id"""
+    conn = pooled_connect(DATABASE_URL)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT s.id, tp.id, s.schedule_type, s.year, s.months, s.days,
+                   s.specific_dates, s.start_time, s.end_time
+            FROM schedules s
+            INNER JOIN tutor_profiles tp ON tp.user_id = s.scheduler_id
+            WHERE s.scheduler_role = 'tutor' AND s.status = 'active'
+            ORDER BY s.id
+        """)
+        schedules = cursor.fetchall()
+
+        cursor.execute("""
+            SELECT s.id, ec.tutor_id, s.session_date, s.start_time, s.end_time
+            FROM sessions s
+            INNER JOIN enrolled_courses ec ON s.enrolled_courses_id = ec.id
+            WHERE s.session_date >= date_trunc('week', CURRENT_DATE)::date
+              AND s.status = ANY(%s)
+            ORDER BY s.id
+        """, (list(BOOKED_SESSION_STATUSES),))
+        sessions = cursor.fetchall()
+        return schedules, sessions
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# ============================================
+# INDEX
+# ============================================
+
+def _columns(rows: List[tuple], dtypes: Tuple[str, ...]) -> Tuple[np.ndarray, ...]:
+    """Column arrays of (start, end, tutor, ...) tuples"""
+    if not rows:
+        return tuple(np.empty(0, dtype=dtype) for dtype in dtypes)
+    return tuple(np.array(column, dtype=dtype) for column, dtype in zip(zip(*rows), dtypes))
+
+
+class AvailabilityIndex:
+    """Immutable once built - a rebuild swaps in a new instance"""
+
+    def __init__(self, schedules: List[tuple], sessions: List[tuple]):
+        self.schedules = schedules
+        self.sessions = sessions
+
+        recurring = defaultdict(list)   # weekday -> [(start, end, tutor, year, month mask)]
+        specific = defaultdict(list)    # date -> [(start, end, tutor)]
+        booked = defaultdict(list)      # date -> [(start, end, tutor, session id)]
+        self.tutor_recurring: Dict[int, List[tuple]] = defaultdict(list)   # tutor -> [(weekday, start, end, year, mask)]
+        self.tutor_specific: Dict[int, Dict[date, List[Interval]]] = defaultdict(lambda: defaultdict(list))
+        self.tutor_booked: Dict[int, Dict[date, List[tuple]]] = defaultdict(lambda: defaultdict(list))
+
+        for _, tutor_id, schedule_type, year, months, days, specific_dates, start, end in schedules:
+            span = _span(start, end)
+            if span is None:
+                continue
+            if schedule_type == 'specific':
+                for value in specific_dates or []:
+                    day = _parse_date(value)
+                    if day is not None:
+                        specific[day].append((*span, tutor_id))
+                        self.tutor_specific[tutor_id][day].append(span)
+            else:
+                mask = _month_mask(months)
+                for name in days or []:
+                    weekday = _WEEKDAY_NUMBERS.get(str(name).strip()[:3].lower())
+                    if weekday is not None:
+                        recurring[weekday].append((*span, tutor_id, year or 0, mask))
+                        self.tutor_recurring[tutor_id].append((weekday, *span, year or 0, mask))
+
+        for session_id, tutor_id, session_date, start, end in sessions:
+            span = _span(start, end)
+            if span is None or session_date is None:
+                continue
+            booked[session_date].append((*span, tutor_id, session_id))
+            self.tutor_booked[tutor_id][session_date].append((*span, session_id))
+
+        self.recurring = {weekday: _columns(rows, ('i4', 'i4', 'i8', 'i4', 'i4')) for weekday, rows in recurring.items()}
+        self.specific = {day: _columns(rows, ('i4', 'i4', 'i8')) for day, rows in specific.items()}
+        self.booked = {day: _columns(rows, ('i4', 'i4', 'i8', 'i8')) for day, rows in booked.items()}
+        self.tutor_recurring = dict(self.tutor_recurring)
+        self.tutor_specific = {tutor: dict(days) for tutor, days in self.tutor_specific.items()}
+        self.tutor_booked = {tutor: dict(days) for tutor, days in self.tutor_booked.items()}
+
+    # -------------------------------------------
+    # Single tutor
+    # -------------------------------------------
+
+    def windows(self, tutor_id: int, day: date) -> List[Interval]:
+        """Merged availability windows of a tutor on a date"""
+        month_bit = 1 << day.month
+        spans = [
+            (start, end)
+            for weekday, start, end, year, mask in self.tutor_recurring.get(tutor_id, ())
+            if weekday == day.weekday() and year in (0, day.year) and (mask == 0 or mask & month_bit)
+        ]
+        spans.extend(self.tutor_specific.get(tutor_id, {}).get(day, ()))
+        return merge_intervals(spans)
+
+    def bookings(self, tutor_id: int, day: date) -> List[tuple]:
+        """(start, end, session id) of the tutor's booked sessions on a date, by start"""
+        return sorted(self.tutor_booked.get(tutor_id, {}).get(day, ()))
+
+    def free_intervals(self, tutor_id: int, day: date) -> List[Interval]:
+        """Availability windows minus booked sessions"""
+        return subtract_intervals(
+            self.windows(tutor_id, day),
+            [(start, end) for start, end, _ in self.bookings(tutor_id, day)]
+        )
+
+    def check(self, tutor_id: int, day: date, start: int, end: int) -> dict:
+        """Whether [start, end) on a date is inside the tutor's schedule and clear of bookings"""
+        within_schedule = covers(self.windows(tutor_id, day), start, end)
+        conflicts = [
+            session_id for booked_start, booked_end, session_id in self.bookings(tutor_id, day)
+            if booked_start < end and start < booked_end
+        ]
+        return {
+            "available": within_schedule and not conflicts,
+            "within_schedule": within_schedule,
+            "conflicting_session_ids": conflicts,
+        }
+
+    # -------------------------------------------
+    # All tutors
+    # -------------------------------------------
+
+    def _windows_overlapping(self, day: date, start: int, end: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(tutor, start, end) columns of the windows applying on a date that overlap [start, end)"""
+        tutors, starts, ends = [np.empty(0, dtype='i8')], [np.empty(0, dtype='i4')], [np.empty(0, dtype='i4')]
+
+        if day.weekday() in self.recurring:
+            rec_start, rec_end, rec_tutor, rec_year, rec_mask = self.recurring[day.weekday()]
+            applies = (
+                (rec_start < end) & (rec_end > start)
+                & ((rec_year == 0) | (rec_year == day.year))
+                & ((rec_mask == 0) | ((rec_mask & (1 << day.month)) != 0))
+            )
+            tutors.append(rec_tutor[applies])
+            starts.append(rec_start[applies])
+            ends.append(rec_end[applies])
+
+        if day in self.specific:
+            spec_start, spec_end, spec_tutor = self.specific[day]
+            overlaps = (spec_start < end) & (spec_end > start)
+            tutors.append(spec_tutor[overlaps])
+            starts.append(spec_start[overlaps])
+            ends.append(spec_end[overlaps])
+
+        return np.concatenate(tutors), np.concatenate(starts), np.concatenate(ends)
+
+    def overlapping_tutors(self, day: date, start: int, end: int) -> List[int]:
+        """Ids with a window on that date overlapping [start, end) at all"""
+        return np.unique(self._windows_overlapping(day, start, end)[0]).tolist()
+
+    def free_tutors(self, day: date, start: int, end: int,
+                    tutor_ids: Optional[Iterable[int]] = None) -> List[int]:
+        """Ids of tutors free for [start, end) on a date (optionally among tutor_ids)"""
+        tutors, starts, ends = self._windows_overlapping(day, start, end)
+        if not len(tutors):
+            return []
+
+        # One window covering the whole slot - the common case
+        covered = set(np.unique(tutors[(starts <= start) & (ends >= end)]).tolist())
+        # Otherwise adjacent windows (e.g. 16-17 and 17-18) may cover it together
+        for tutor_id in set(np.unique(tutors).tolist()) - covered:
+            mask = tutors == tutor_id
+            if covers(merge_intervals(zip(starts[mask].tolist(), ends[mask].tolist())), start, end):
+                covered.add(tutor_id)
+
+        if day in self.booked:
+            booked_start, booked_end, booked_tutor, _ = self.booked[day]
+            covered -= set(booked_tutor[(booked_start < end) & (booked_end > start)].tolist())
+
+        if tutor_ids is not None:
+            covered &= set(tutor_ids)
+        return sorted(covered)
+
+    def stats(self) -> dict:
+        arrays = [
+            array
+            for columns in (*self.recurring.values(), *self.specific.values(), *self.booked.values())
+            for array in columns
+        ]
+        return {
+            "schedules": len(self.schedules),
+            "booked_sessions": len(self.sessions),
+            "tutors_with_schedules": len(set(self.tutor_recurring) | set(self.tutor_specific)),
+            "recurring_windows": sum(len(columns[0]) for columns in self.recurring.values()),
+            "specific_dates": len(self.specific),
+            "booked_dates": len(self.booked),
+            "array_bytes": sum(array.nbytes for array in arrays),
+        }
+
+
+_index: Optional[AvailabilityIndex] = None
+_stale = False
+_refresh_lock = threading.Lock()
+
+
+def refresh_availability_index() -> bool:
+    """Reload schedules and sessions; rebuild the index only if they changed. Returns True if rebuilt."""
+    global _index, _stale
+    with _refresh_lock:
+        _stale = False
+        schedules, sessions = load_availability_rows()
+        if _index is not None and schedules == _index.schedules and sessions == _index.sessions:
+            return False
+        _index = AvailabilityIndex(schedules, sessions)
+        return True
+
+
+def get_availability_index() -> AvailabilityIndex:
+    """Current index (built on first use, reloaded if a local change made it stale)"""
+    if _index is None:
+        refresh_availability_index()
+    elif _stale:
+        try:
+            refresh_availability_index()
+        except Exception as e:
+            print(f"⚠️ [AvailabilityIndex] Reload after schedule/session change failed: {e}")
+    return _index
+
+
+def invalidate_availability_index():
+    """Mark the index stale after a local schedule or session change (the next query reloads it)"""
+    global _stale
+    _stale = True
+
+
+async def availability_index_refresh_loop():
+    """Background task started from app.py lifespan"""
+    while True:
+        try:
+            if await asyncio.to_thread(refresh_availability_index):
+                print(f"[AvailabilityIndex] Rebuilt with {len(_index.schedules)} schedules, "
+                      f"{len(_index.sessions)} booked sessions")
+        except Exception as e:
+            print(f"⚠️ [AvailabilityIndex] Refresh failed: {e}")
+        await asyncio.sleep(AVAILABILITY_INDEX_REFRESH_SECONDS)
+
+
+if __name__ == "__main__":
+    refresh_availability_index()
+    print(get_availability_index().stats())
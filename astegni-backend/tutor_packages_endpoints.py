@@ -4,15 +4,14 @@ Manages tutor packages with pricing calculator integration
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Header
-from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from decimal import Decimal
 from datetime import datetime
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
 import os
-import jwt
-from jwt import PyJWTError
 from dotenv import load_dotenv
 
 # Import 2FA protection helper
@@ -25,75 +24,16 @@ except ImportError:
 
 load_dotenv()
 
-# OAuth2 scheme
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # Get config from environment
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 def get_db_connection():
     """Get database connection"""
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise Exception("DATABASE_URL not found in environment variables")
-    return psycopg.connect(database_url)
-
-def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current authenticated user - returns dict with user data"""
-    print(f"🔐 get_current_user called! Token: {token[:20]}..." if token else "🔐 get_current_user called! Token: None")
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
-
-        # Convert string back to int
-        user_id = int(user_id_str)
-    except (PyJWTError, ValueError, TypeError) as e:
-        print(f"JWT decode error: {e}")
-        raise credentials_exception
-    except Exception as e:
-        print(f"Unexpected error in get_current_user: {e}")
-        raise credentials_exception
-
-    # Fetch user from database
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, email, phone, roles, active_role,
-                       first_name, father_name, grandfather_name, profile_picture
-                FROM users WHERE id = %s
-            """, (user_id,))
-            row = cur.fetchone()
+    return pooled_connect(database_url)
 
-            if not row:
-                raise credentials_exception
-
-            return {
-                'id': row[0],
-                'email': row[1],
-                'phone': row[2],
-                'roles': row[3] or [],
-                'active_role': row[4],
-                'first_name': row[5],
-                'father_name': row[6],
-                'grandfather_name': row[7],
-                'profile_picture': row[8]
-            }
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Database error in get_current_user: {e}")
-        raise credentials_exception
-    finally:
-        conn.close()
 
 router = APIRouter(prefix="/api/tutor", tags=["tutor-packages"])
 
@@ -253,8 +193,8 @@ def fetch_course_details(cur, course_ids):
 
 # GET - Get all packages for current tutor
 @router.get("/packages", response_model=List[PackageResponse])
-async def get_tutor_packages(
-    current_user = Depends(get_current_user),
+def get_tutor_packages(
+    current_user = Depends(get_current_user_dict),
     verification_token: Optional[str] = Header(default=None, alias="X-2FA-Token")
 ):
     """Get all packages for the authenticated tutor (2FA protected if enabled)"""
@@ -353,9 +293,9 @@ async def get_tutor_packages(
 
 # POST - Create new package
 @router.post("/packages", response_model=PackageResponse, status_code=status.HTTP_201_CREATED)
-async def create_package(
+def create_package(
     package: PackageCreate,
-    current_user = Depends(get_current_user),
+    current_user = Depends(get_current_user_dict),
     verification_token: Optional[str] = Header(default=None, alias="X-2FA-Token")
 ):
     """Create a new tutoring package (2FA protected if enabled)"""
@@ -484,10 +424,10 @@ async def create_package(
 
 # PUT - Update package
 @router.put("/packages/{package_id}", response_model=PackageResponse)
-async def update_package(
+def update_package(
     package_id: int,
     package: PackageUpdate,
-    current_user = Depends(get_current_user),
+    current_user = Depends(get_current_user_dict),
     verification_token: Optional[str] = Header(default=None, alias="X-2FA-Token")
 ):
     """Update an existing package (2FA protected if enabled)"""
@@ -639,9 +579,9 @@ class PackageCourseRequest(BaseModel):
 
 # POST - Create course request from package modal
 @router.post("/packages/course-request")
-async def create_package_course_request(
+def create_package_course_request(
     course: PackageCourseRequest,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Create a course directly from the package modal.
@@ -730,7 +670,7 @@ async def create_package_course_request(
 
 # GET - Get tutor's course requests (courses with pending status)
 @router.get("/packages/course-requests")
-async def get_tutor_course_requests(current_user = Depends(get_current_user)):
+def get_tutor_course_requests(current_user = Depends(get_current_user_dict)):
     """Get all course requests (pending courses) for the current tutor"""
     conn = get_db_connection()
     cur = conn.cursor()
@@ -776,7 +716,7 @@ async def get_tutor_course_requests(current_user = Depends(get_current_user)):
 
 # DELETE - Delete a pending course request
 @router.delete("/packages/course-request/{request_id}")
-async def delete_course_request(request_id: int, current_user = Depends(get_current_user)):
+def delete_course_request(request_id: int, current_user = Depends(get_current_user_dict)):
     """Delete a pending course (only if still pending)"""
     conn = get_db_connection()
     cur = conn.cursor()
@@ -824,9 +764,9 @@ async def delete_course_request(request_id: int, current_user = Depends(get_curr
 
 # DELETE - Delete package (soft-deletes to 'private' when enrollments exist)
 @router.delete("/packages/{package_id}")
-async def delete_package(
+def delete_package(
     package_id: int,
-    current_user = Depends(get_current_user),
+    current_user = Depends(get_current_user_dict),
     verification_token: Optional[str] = Header(default=None, alias="X-2FA-Token")
 ):
     """Delete a package, or mark it private if enrollments exist.
@@ -910,7 +850,7 @@ async def delete_package(
 
 # GET - Get tutor's teaching methods and grade levels for profile header
 @router.get("/profile-summary/{tutor_id}")
-async def get_tutor_profile_summary(tutor_id: int):
+def get_tutor_profile_summary(tutor_id: int):
     """
     Get a tutor's profile summary data for profile header display.
     Returns:
@@ -987,9 +927,9 @@ async def get_tutor_profile_summary(tutor_id: int):
 # ============================================
 
 @router.get("/schools")
-async def get_schools_for_tutor(
+def get_schools_for_tutor(
     status: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Get schools list for tutor requests panel (user-based).
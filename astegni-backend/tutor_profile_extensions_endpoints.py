@@ -3,15 +3,14 @@ Tutor Profile Extensions Endpoints
 Handles certifications, achievements, experience, and videos for tutor profiles
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from typing import Optional, List
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
 from datetime import datetime, date
 import os
 import json
-import jwt
-from jwt import PyJWTError
 from dotenv import load_dotenv
 from backblaze_service import get_backblaze_service
 
@@ -22,86 +21,31 @@ b2_service = get_backblaze_service()
 
 router = APIRouter()
 
-# OAuth2 scheme
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
-# Get config from environment
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
-
 def get_db_connection():
     """Get database connection"""
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise Exception("DATABASE_URL not found in environment variables")
-    return psycopg.connect(database_url)
-
-def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current authenticated user - returns dict with user data"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
-
-        # Convert string back to int
-        user_id = int(user_id_str)
-    except (PyJWTError, ValueError, TypeError) as e:
-        print(f"JWT decode error: {e}")
-        raise credentials_exception
-    except Exception as e:
-        print(f"Unexpected error in get_current_user: {e}")
-        raise credentials_exception
-
-    # Fetch user from database
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT u.id, u.username, u.email, u.phone, u.roles, u.active_role,
-                       u.first_name, u.father_name, u.grandfather_name, u.profile_picture,
-                       tp.id as tutor_id
-                FROM users u
-                LEFT JOIN tutor_profiles tp ON tp.user_id = u.id
-                WHERE u.id = %s
-            """, (user_id,))
-            row = cur.fetchone()
-
-            if not row:
-                raise credentials_exception
-
-            return {
-                'id': row[0],
-                'username': row[1],
-                'email': row[2],
-                'phone': row[3],
-                'roles': row[4] or [],
-                'active_role': row[5],
-                'first_name': row[6],
-                'father_name': row[7],
-                'grandfather_name': row[8],
-                'profile_picture': row[9],
-                'tutor_id': row[10]
-            }
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Database error in get_current_user: {e}")
-        raise credentials_exception
-    finally:
-        conn.close()
+    return pooled_connect(database_url)
+
+def get_current_tutor(current_user: dict = Depends(get_current_user_dict)) -> dict:
+    """Current user dict plus tutor_id (tutor_profiles.id) from the token's role_ids"""
+    tutor_id = (current_user.get('role_ids') or {}).get('tutor')
+    if tutor_id is None and 'tutor' in current_user.get('roles', []):
+        # Tokens issued before the tutor profile existed carry no tutor id
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT id FROM tutor_profiles WHERE user_id = %s", (current_user['id'],))
+                row = cur.fetchone()
+                tutor_id = row[0] if row else None
+    return {**current_user, 'tutor_id': int(tutor_id) if tutor_id is not None else None}
 
 # ============================================
 # CERTIFICATIONS ENDPOINTS
 # ============================================
 
 @router.get("/api/tutor/certifications")
-async def get_tutor_certifications(current_user: dict = Depends(get_current_user)):
+def get_tutor_certifications(current_user: dict = Depends(get_current_tutor)):
     """Get all certifications for the current tutor"""
 
     if 'tutor' not in current_user.get('roles', []):
@@ -150,7 +94,7 @@ async def get_tutor_certifications(current_user: dict = Depends(get_current_user
 
 
 @router.post("/api/tutor/certifications")
-async def create_certification(
+def create_certification(
     name: str = Form(...),
     issuing_organization: str = Form(...),
     description: Optional[str] = Form(None),
@@ -161,7 +105,7 @@ async def create_certification(
     certificate_type: Optional[str] = Form("certification"),
     field_of_study: Optional[str] = Form(None),
     certificate_image: Optional[UploadFile] = File(None),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Create a new certification for the current tutor"""
 
@@ -219,9 +163,9 @@ async def create_certification(
 
 
 @router.delete("/api/tutor/certifications/{certification_id}")
-async def delete_certification(
+def delete_certification(
     certification_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Delete a certification (soft delete)"""
 
@@ -262,7 +206,7 @@ async def delete_certification(
 # ============================================
 
 @router.get("/api/tutor/achievements")
-async def get_tutor_achievements(current_user: dict = Depends(get_current_user)):
+def get_tutor_achievements(current_user: dict = Depends(get_current_tutor)):
     """Get all achievements for the current tutor"""
 
     if 'tutor' not in current_user.get('roles', []):
@@ -327,7 +271,7 @@ async def create_achievement(
     verification_url: Optional[str] = Form(None),
     is_featured: Optional[str] = Form(None),
     certificate_file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Create a new achievement for the current tutor"""
 
@@ -415,9 +359,9 @@ async def create_achievement(
 
 
 @router.delete("/api/tutor/achievements/{achievement_id}")
-async def delete_achievement(
+def delete_achievement(
     achievement_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Delete an achievement"""
 
@@ -457,7 +401,7 @@ async def delete_achievement(
 # ============================================
 
 @router.get("/api/tutor/experience")
-async def get_tutor_experience(current_user: dict = Depends(get_current_user)):
+def get_tutor_experience(current_user: dict = Depends(get_current_tutor)):
     """Get all experience entries for the current tutor"""
 
     if 'tutor' not in current_user.get('roles', []):
@@ -521,7 +465,7 @@ async def create_experience(
     achievements: Optional[str] = Form(None),
     employment_type: Optional[str] = Form("full-time"),
     certificate_file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Create a new experience entry for the current tutor"""
 
@@ -608,9 +552,9 @@ async def create_experience(
 
 
 @router.delete("/api/tutor/experience/{experience_id}")
-async def delete_experience(
+def delete_experience(
     experience_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Delete an experience entry"""
 
@@ -651,9 +595,9 @@ async def delete_experience(
 
 # Individual Certification Endpoints
 @router.get("/api/tutor/certifications/{certification_id}")
-async def get_certification(
+def get_certification(
     certification_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Get a single certification by ID"""
 
@@ -715,7 +659,7 @@ async def update_certification(
     certificate_type: Optional[str] = Form("certification"),
     field_of_study: Optional[str] = Form(None),
     certificate_image: Optional[UploadFile] = File(None),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Update a certification"""
 
@@ -790,9 +734,9 @@ async def update_certification(
 
 # Individual Achievement Endpoints
 @router.get("/api/tutor/achievements/{achievement_id}")
-async def get_achievement(
+def get_achievement(
     achievement_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Get a single achievement by ID"""
 
@@ -855,7 +799,7 @@ async def update_achievement(
     issuer: Optional[str] = Form(None),
     verification_url: Optional[str] = Form(None),
     certificate: Optional[UploadFile] = File(None),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Update an achievement"""
 
@@ -926,9 +870,9 @@ async def update_achievement(
 
 # Individual Experience Endpoints
 @router.get("/api/tutor/experience/{experience_id}")
-async def get_experience(
+def get_experience(
     experience_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Get a single experience by ID"""
 
@@ -991,7 +935,7 @@ async def update_experience(
     is_current: bool = Form(False),
     employment_type: Optional[str] = Form(None),
     certificate: Optional[UploadFile] = File(None),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_tutor)
 ):
     """Update an experience"""
 
@@ -0,0 +1,267 @@
+"""
+Tutor Ranking Index
+Materialized smart-ranking scores for the /api/tutors "smart" sort
+
+Every component TutorScoringCalculator computes (rating, total students,
+completion rate, response time, experience, payment penalty) plus the trending
+and verification bonuses is stored per tutor in tutor_ranking_index. A
+background job keeps the table fresh incrementally, so get_tutors only adds the
+per-request boosts (search history, new-tutor bonus, tier shuffle) and
+paginates in SQL - page latency depends on page size, not on tutor count.
+
+Incremental refresh picks up, oldest first:
+- tutors missing from the index (new tutors)
+- tutors whose profile changed since they were scored (e.g. trending updates)
+- rows older than RANKING_MAX_AGE_MINUTES (reviews, enrollments, payments, ...)
+
+Usage:
+    python tutor_ranking_index.py          # refresh one incremental batch
+    python tutor_ranking_index.py --full   # rebuild every tutor
+"""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, case, false, func, text
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from models import SessionLocal, TutorProfile, TutorRankingIndex
+from tutor_scoring import TutorScoringCalculator
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+RANKING_REFRESH_INTERVAL_SECONDS = int(os.getenv("RANKING_REFRESH_INTERVAL_SECONDS", 60))
+RANKING_MAX_AGE_MINUTES = int(os.getenv("RANKING_MAX_AGE_MINUTES", 60))
+RANKING_REFRESH_BATCH = int(os.getenv("RANKING_REFRESH_BATCH", 200))
+
+VERIFICATION_BONUS = 25
+
+# Score used for a tutor the job has not indexed yet: the 2-star rating
+# baseline (200) plus the verification bonus (listable tutors are verified).
+UNINDEXED_BASE_SCORE = round(
+    TutorScoringCalculator.RATING_PRIOR_VALUE / 5.0 * TutorScoringCalculator.RATING_MAX_POINTS
+) + VERIFICATION_BONUS
+
+# Serializes refreshes across uvicorn workers (transaction-scoped advisory lock)
+_REFRESH_LOCK_KEY = 734_001
+
+
+# ============================================
+# SCORE COMPONENTS
+# ============================================
+
+def calculate_trending_bonus(trending_score: float, search_count: int) -> float:
+    """
+    Trending/popularity boost used by the smart sort (0-150 points)
+
+    - trending_score >= 100: 100 points, 50-99: 50-100 points, <50: trending_score
+    - viral bonus on top: 1000+ searches +50, 500+ +25, 100+ +12
+    """
+    trending_score = trending_score or 0
+    search_count = search_count or 0
+    if trending_score <= 0:
+        return 0
+
+    if trending_score >= 100:
+        bonus = 100
+    elif trending_score >= 50:
+        bonus = 50 + (trending_score - 50)
+    else:
+        bonus = trending_score
+
+    if search_count >= 1000:
+        bonus += 50
+    elif search_count >= 500:
+        bonus += 25
+    elif search_count >= 100:
+        bonus += 12
+
+    return bonus
+
+
+def _build_index_row(tutor, new_score: int, breakdown: dict) -> dict:
+    """Index row for one tutor (id, user_id, trending_score, search_count, is_verified)"""
+    trending_bonus = calculate_trending_bonus(tutor.trending_score, tutor.search_count)
+    verification_bonus = VERIFICATION_BONUS if tutor.is_verified else 0
+
+    return {
+        "tutor_id": tutor.id,
+        "user_id": tutor.user_id,
+        "rating_score": breakdown["rating"]["score"],
+        "total_students_score": breakdown["total_students"]["score"],
+        "completion_rate_score": breakdown["completion_rate"]["score"],
+        "response_time_score": breakdown["response_time"]["score"],
+        "experience_score": breakdown["experience"]["score"],
+        "payment_penalty": breakdown["payment_reliability"]["score"],
+        "trending_bonus": float(trending_bonus),
+        "verification_bonus": verification_bonus,
+        "base_score": float(new_score + trending_bonus + verification_bonus),
+        "breakdown": json.dumps(breakdown, default=str),
+    }
+
+
+# ============================================
+# INCREMENTAL REFRESH
+# ============================================
+
+def refresh_tutor_ranking_index(
+    db: Session,
+    full: bool = False,
+    batch_size: int = RANKING_REFRESH_BATCH,
+    max_age_minutes: int = RANKING_MAX_AGE_MINUTES
+) -> int:
+    """
+    Recompute index rows for tutors that are missing, changed or stale.
+
+    Returns the number of tutors refreshed (0 if another worker holds the lock).
+    """
+    locked = db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _REFRESH_LOCK_KEY}
+    ).scalar()
+    if not locked:
+        db.rollback()
+        return 0
+
+    stale_filter = "" if full else """
+        AND (
+            ri.tutor_id IS NULL
+            OR ri.computed_at < :cutoff
+            OR tp.updated_at > ri.computed_at
+        )
+    """
+    tutors = db.execute(text(f"""
+        SELECT tp.id, tp.user_id, tp.trending_score, tp.search_count, u.is_verified
+        FROM tutor_profiles tp
+        JOIN users u ON u.id = tp.user_id
+        LEFT JOIN tutor_ranking_index ri ON ri.tutor_id = tp.id
+        WHERE tp.is_active = true
+        {stale_filter}
+        ORDER BY ri.computed_at ASC NULLS FIRST, tp.id
+        {"" if full else "LIMIT :batch_size"}
+    """), {
+        "cutoff": datetime.utcnow() - timedelta(minutes=max_age_minutes),
+        "batch_size": batch_size
+    }).fetchall()
+
+    if not tutors:
+        db.commit()
+        return 0
+
+    scores = TutorScoringCalculator(db).calculate_all_new_scores_bulk(
+        [tutor.id for tutor in tutors]
+    )
+    rows = [
+        _build_index_row(tutor, *scores[tutor.id])
+        for tutor in tutors if tutor.id in scores
+    ]
+
+    if rows:
+        db.execute(text("""
+            INSERT INTO tutor_ranking_index (
+                tutor_id, user_id, rating_score, total_students_score,
+                completion_rate_score, response_time_score, experience_score,
+                payment_penalty, trending_bonus, verification_bonus,
+                base_score, breakdown, computed_at
+            ) VALUES (
+                :tutor_id, :user_id, :rating_score, :total_students_score,
+                :completion_rate_score, :response_time_score, :experience_score,
+                :payment_penalty, :trending_bonus, :verification_bonus,
+                :base_score, CAST(:breakdown AS JSON), NOW() AT TIME ZONE 'UTC'
+            )
+            ON CONFLICT (tutor_id) DO UPDATE SET
+                user_id = EXCLUDED.user_id,
+                rating_score = EXCLUDED.rating_score,
+                total_students_score = EXCLUDED.total_students_score,
+                completion_rate_score = EXCLUDED.completion_rate_score,
+                response_time_score = EXCLUDED.response_time_score,
+                experience_score = EXCLUDED.experience_score,
+                payment_penalty = EXCLUDED.payment_penalty,
+                trending_bonus = EXCLUDED.trending_bonus,
+                verification_bonus = EXCLUDED.verification_bonus,
+                base_score = EXCLUDED.base_score,
+                breakdown = EXCLUDED.breakdown,
+                computed_at = EXCLUDED.computed_at
+        """), rows)
+
+    db.commit()
+    return len(rows)
+
+
+def _refresh_once(full: bool = False) -> int:
+    """Run one refresh pass on its own session (used by the background loop)"""
+    db = SessionLocal()
+    try:
+        return refresh_tutor_ranking_index(db, full=full)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def ranking_refresh_loop():
+    """
+    Background task started from app.py lifespan.
+    Scoring is blocking SQL, so each pass runs in a worker thread.
+    """
+    while True:
+        try:
+            refreshed = await asyncio.to_thread(_refresh_once)
+            if refreshed:
+                print(f"[RankingIndex] Refreshed {refreshed} tutors")
+        except Exception as e:
+            print(f"⚠️ [RankingIndex] Refresh failed: {e}")
+        await asyncio.sleep(RANKING_REFRESH_INTERVAL_SECONDS)
+
+
+# ============================================
+# QUERY-TIME SCORING
+# ============================================
+
+def smart_score_expression(search_history_tutor_ids: Optional[List[int]] = None,
+                           search_relevance=None):
+    """
+    SQL expression for the full smart score of a tutor row.
+
+    Requires the query to outer-join TutorRankingIndex on TutorProfile.id.
+    Adds the per-request boosts to the materialized base score:
+    - Search history: +50
+    - New tutor (<= 30 days old): +30, very new (<= 7 days): +20 more
+    - New + search history combo: +60
+    - search_relevance: optional points expression for the search term
+      (tutor_search.search_relevance)
+    """
+    now = datetime.utcnow()
+    # (now - created_at).days <= N  <=>  created_at > now - (N + 1) days
+    is_new = TutorProfile.created_at > now - timedelta(days=31)
+    is_very_new = TutorProfile.created_at > now - timedelta(days=8)
+    in_history = (
+        TutorProfile.id.in_(search_history_tutor_ids)
+        if search_history_tutor_ids else false()
+    )
+
+    score = (
+        func.coalesce(TutorRankingIndex.base_score, UNINDEXED_BASE_SCORE)
+        + case((in_history, 50), else_=0)
+        + case((is_new, 30), else_=0)
+        + case((is_very_new, 20), else_=0)
+        + case((and_(is_new, in_history), 60), else_=0)
+    )
+    if search_relevance is not None:
+        score = score + search_relevance
+    return score
+
+
+if __name__ == "__main__":
+    full_rebuild = "--full" in sys.argv
+    count = _refresh_once(full=full_rebuild)
+    print(f"[RankingIndex] {'Rebuilt' if full_rebuild else 'Refreshed'} {count} tutors")
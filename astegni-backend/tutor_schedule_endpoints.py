@@ -5,86 +5,28 @@ Uses unified 'schedules' table with scheduler_id and scheduler_role fields
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
+from tutor_availability_index import invalidate_availability_index
 import os
-import jwt
-from jwt import PyJWTError
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# OAuth2 scheme
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # Get config from environment
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 def get_db_connection():
     """Get database connection"""
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise Exception("DATABASE_URL not found in environment variables")
-    return psycopg.connect(database_url)
-
-def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current authenticated user - returns dict with user data"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
-
-        # Convert string back to int
-        user_id = int(user_id_str)
-    except (PyJWTError, ValueError, TypeError) as e:
-        print(f"JWT decode error: {e}")
-        raise credentials_exception
-    except Exception as e:
-        print(f"Unexpected error in get_current_user: {e}")
-        raise credentials_exception
-
-    # Fetch user from database
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, first_name, father_name, email, phone, roles, active_role,
-                       grandfather_name, profile_picture
-                FROM users WHERE id = %s
-            """, (user_id,))
-            row = cur.fetchone()
+    return pooled_connect(database_url)
 
-            if not row:
-                raise credentials_exception
-
-            return {
-                'id': row[0],
-                'first_name': row[1],
-                'father_name': row[2],
-                'email': row[3],
-                'phone': row[4],
-                'roles': row[5] or [],
-                'active_role': row[6],
-                'grandfather_name': row[7],
-                'profile_picture': row[8]
-            }
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Database error in get_current_user: {e}")
-        raise credentials_exception
-    finally:
-        conn.close()
 
 router = APIRouter()
 
@@ -144,9 +86,9 @@ class ScheduleResponse(BaseModel):
 # ============================================
 
 @router.post("/api/tutor/schedules", response_model=ScheduleResponse, status_code=status.HTTP_201_CREATED)
-async def create_schedule(
+def create_schedule(
     schedule: ScheduleCreate,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Create a new teaching schedule for the tutor
@@ -213,6 +155,7 @@ async def create_schedule(
 
             row = cur.fetchone()
             conn.commit()
+            invalidate_availability_index()
 
             if row:
                 return ScheduleResponse(
@@ -257,8 +200,8 @@ async def create_schedule(
 
 
 @router.get("/api/tutor/schedules", response_model=List[ScheduleResponse])
-async def get_tutor_schedules(
-    current_user = Depends(get_current_user)
+def get_tutor_schedules(
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Get all schedules for the authenticated tutor from unified schedules table
@@ -342,9 +285,9 @@ async def get_tutor_schedules(
 
 
 @router.get("/api/tutor/schedules/{schedule_id}", response_model=ScheduleResponse)
-async def get_schedule(
+def get_schedule(
     schedule_id: int,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Get a specific schedule by ID from unified schedules table
@@ -426,10 +369,10 @@ async def get_schedule(
 
 
 @router.put("/api/tutor/schedules/{schedule_id}", response_model=ScheduleResponse)
-async def update_schedule(
+def update_schedule(
     schedule_id: int,
     schedule: ScheduleCreate,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Update an existing schedule in unified schedules table
@@ -496,6 +439,7 @@ async def update_schedule(
 
             row = cur.fetchone()
             conn.commit()
+            invalidate_availability_index()
 
             if not row:
                 raise HTTPException(
@@ -540,9 +484,9 @@ async def update_schedule(
 
 
 @router.delete("/api/tutor/schedules/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_schedule(
+def delete_schedule(
     schedule_id: int,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Delete a schedule from unified schedules table
@@ -579,6 +523,7 @@ async def delete_schedule(
 
             row = cur.fetchone()
             conn.commit()
+            invalidate_availability_index()
 
             if not row:
                 raise HTTPException(
@@ -614,10 +559,10 @@ class ToggleFeaturedRequest(BaseModel):
 
 
 @router.patch("/api/tutor/schedules/{schedule_id}/toggle-notification")
-async def toggle_schedule_notification(
+def toggle_schedule_notification(
     schedule_id: int,
     request: ToggleNotificationRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """Toggle browser notification for a specific schedule in unified schedules table"""
     conn = get_db_connection()
@@ -677,10 +622,10 @@ async def toggle_schedule_notification(
 
 
 @router.patch("/api/tutor/schedules/{schedule_id}/toggle-alarm")
-async def toggle_schedule_alarm(
+def toggle_schedule_alarm(
     schedule_id: int,
     request: ToggleAlarmRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """Toggle alarm for a specific schedule in unified schedules table"""
     conn = get_db_connection()
@@ -740,10 +685,10 @@ async def toggle_schedule_alarm(
 
 
 @router.patch("/api/tutor/schedules/{schedule_id}/toggle-featured")
-async def toggle_schedule_featured(
+def toggle_schedule_featured(
     schedule_id: int,
     request: ToggleFeaturedRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """Toggle featured status for a specific schedule in unified schedules table"""
     conn = get_db_connection()
@@ -16,6 +16,27 @@ from sqlalchemy.orm import Session
 from typing import List, Dict, Optional
 
 
+# Aggregates over user_investments (alias ui, joined to enrolled_students es)
+# shared by the single-tutor and bulk payment reliability queries
+PAYMENT_STATS_COLUMNS = """
+    COUNT(*) as total_payments,
+    COUNT(*) FILTER (WHERE ui.payment_status = 'paid') as paid_count,
+    COUNT(*) FILTER (WHERE ui.payment_status = 'late') as late_count,
+    COUNT(*) FILTER (WHERE ui.payment_status = 'missed') as missed_count,
+    COALESCE(
+        SUM(
+            CASE
+                WHEN ui.investment_type = 'booking' THEN es.agreed_price
+                ELSE ui.amount
+            END
+        ) FILTER (WHERE ui.payment_status IN ('pending', 'late', 'missed')),
+        0
+    ) as total_debt,
+    COALESCE(SUM(ui.late_fee), 0) as total_late_fees,
+    MAX(ui.days_overdue) as max_days_overdue
+"""
+
+
 class TutorScoringCalculator:
     """Calculate comprehensive tutor ranking scores"""
 
@@ -43,23 +64,48 @@ class TutorScoringCalculator:
         if not student_interests and not student_hobbies:
             return 0, {"reason": "No student interests/hobbies"}
 
-        score = 0
-        details = {
-            "interest_matches": [],
-            "hobby_matches": [],
-            "match_count": 0
-        }
-
-        # Check interest matches (via courses)
+        tutor_courses = []
         if student_interests:
             interest_query = text("""
                 SELECT DISTINCT c.course_name, c.tags, c.course_category
                 FROM tutor_packages tp
                 JOIN courses c ON c.id = ANY(tp.course_ids)
                 WHERE tp.tutor_id = :tutor_id AND c.status = 'verified' AND tp.visibility = 'public'
+                ORDER BY c.course_name, c.course_category
             """)
             tutor_courses = self.db.execute(interest_query, {"tutor_id": tutor_id}).fetchall()
 
+        tutor_hobbies = []
+        if student_hobbies:
+            hobby_query = text("""
+                SELECT hobbies FROM users u
+                JOIN tutor_profiles tp ON tp.user_id = u.id
+                WHERE tp.id = :tutor_id
+            """)
+            result = self.db.execute(hobby_query, {"tutor_id": tutor_id}).fetchone()
+            tutor_hobbies = result.hobbies if result and result.hobbies else []
+
+        return self._score_interest_hobby(
+            tutor_courses, tutor_hobbies, student_interests, student_hobbies
+        )
+
+    @staticmethod
+    def _score_interest_hobby(
+        tutor_courses,
+        tutor_hobbies: List[str],
+        student_interests: List[str] = None,
+        student_hobbies: List[str] = None
+    ) -> tuple[int, dict]:
+        """Score interest/hobby matches from already-fetched course rows and hobbies"""
+        score = 0
+        details = {
+            "interest_matches": [],
+            "hobby_matches": [],
+            "match_count": 0
+        }
+
+        # Check interest matches (via courses)
+        if student_interests:
             perfect_matches = 0
             partial_matches = 0
 
@@ -91,14 +137,6 @@ class TutorScoringCalculator:
 
         # Check hobby matches
         if student_hobbies:
-            hobby_query = text("""
-                SELECT hobbies FROM users u
-                JOIN tutor_profiles tp ON tp.user_id = u.id
-                WHERE tp.id = :tutor_id
-            """)
-            result = self.db.execute(hobby_query, {"tutor_id": tutor_id}).fetchone()
-            tutor_hobbies = result.hobbies if result and result.hobbies else []
-
             hobby_match_count = 0
             for student_hobby in student_hobbies:
                 for tutor_hobby in tutor_hobbies:
@@ -150,6 +188,11 @@ class TutorScoringCalculator:
         result = self.db.execute(query, {"tutor_id": tutor_id}).fetchone()
         total_students = result.total_students if result else 0
 
+        return self._score_total_students(total_students)
+
+    @staticmethod
+    def _score_total_students(total_students: int) -> tuple[int, dict]:
+        """Map a distinct-student count onto the total-students tiers"""
         # Calculate score based on thresholds
         if total_students >= 100:
             score = 200
@@ -195,7 +238,6 @@ class TutorScoringCalculator:
 
         Returns: (score, details_dict)
         """
-        CONFIDENCE_K = 4  # enrollments needed before completion is ~half-trusted
         # Get session completion data from enrolled_students
         # Assuming enrolled_students tracks active/completed enrollments
         query = text("""
@@ -207,11 +249,20 @@ class TutorScoringCalculator:
         """)
         result = self.db.execute(query, {"tutor_id": tutor_id}).fetchone()
 
-        if not result or result.total_enrollments == 0:
+        if not result:
+            return self._score_completion_rate(0, 0)
+        return self._score_completion_rate(result.total_enrollments, result.active_enrollments)
+
+    COMPLETION_CONFIDENCE_K = 4  # enrollments needed before completion is ~half-trusted
+
+    @classmethod
+    def _score_completion_rate(cls, total_enrollments: int, active_enrollments: int) -> tuple[int, dict]:
+        """Score completion rate from enrollment counts (see calculate_completion_rate_score)"""
+        if not total_enrollments:
             return 0, {"reason": "No enrollment data", "completion_rate": 0}
 
         # Calculate completion rate (assume active enrollments are completed)
-        completion_rate = (result.active_enrollments / result.total_enrollments) * 100
+        completion_rate = (active_enrollments / total_enrollments) * 100
 
         # Score based on completion rate (only counts from 70% up)
         if completion_rate >= 95:
@@ -231,12 +282,12 @@ class TutorScoringCalculator:
 
         # Confidence weight by sample size: a perfect rate from 1 enrollment is
         # untrustworthy, so scale toward 0 for small samples.
-        confidence = result.total_enrollments / (result.total_enrollments + CONFIDENCE_K)
+        confidence = total_enrollments / (total_enrollments + cls.COMPLETION_CONFIDENCE_K)
         score = int(round(tier_score * confidence))
 
         return score, {
-            "total_enrollments": result.total_enrollments,
-            "active_enrollments": result.active_enrollments,
+            "total_enrollments": total_enrollments,
+            "active_enrollments": active_enrollments,
             "completion_rate": round(completion_rate, 1),
             "tier_score": tier_score,
             "confidence": round(confidence, 2),
@@ -290,15 +341,21 @@ class TutorScoringCalculator:
             "ignore_hours": self.IGNORE_AFTER_HOURS
         }).fetchone()
 
-        answered = (result.answered if result else 0) or 0
-        ignored = (result.ignored if result else 0) or 0
+        if not result:
+            return self._score_response_time(0, 0, None)
+        return self._score_response_time(result.answered, result.ignored, result.avg_response_minutes)
+
+    @staticmethod
+    def _score_response_time(answered: int, ignored: int, avg_response_minutes) -> tuple[int, dict]:
+        """Blend the answered-request speed tier with the ignore penalty"""
+        answered = answered or 0
+        ignored = ignored or 0
         total = answered + ignored
 
         if total == 0:
             return 0, {"reason": "No session requests", "avg_response_time": None}
 
         # Speed tier from answered requests
-        avg_response_minutes = result.avg_response_minutes
         if answered > 0 and avg_response_minutes is not None:
             m = avg_response_minutes
             if m < 5:
@@ -348,6 +405,22 @@ class TutorScoringCalculator:
 
         Returns: (score, details_dict)
         """
+        # Count credentials/achievements
+        # Note: credentials table uses uploader_id (user-based system)
+        credentials_query = text("""
+            SELECT COUNT(*) as credential_count
+            FROM credentials
+            WHERE uploader_id = :tutor_user_id
+        """)
+
+        cred_result = self.db.execute(credentials_query, {"tutor_user_id": tutor_user_id}).fetchone()
+        credential_count = cred_result.credential_count if cred_result else 0
+
+        return self._score_experience(tutor_profile_created_at, credential_count)
+
+    @staticmethod
+    def _score_experience(tutor_profile_created_at: datetime, credential_count: int) -> tuple[int, dict]:
+        """Score account age plus credential count"""
         score = 0
 
         # Calculate account age in months
@@ -362,17 +435,6 @@ class TutorScoringCalculator:
             account_age_months = 0
             age_score = 0
 
-        # Count credentials/achievements
-        # Note: credentials table uses uploader_id (user-based system)
-        credentials_query = text("""
-            SELECT COUNT(*) as credential_count
-            FROM credentials
-            WHERE uploader_id = :tutor_user_id
-        """)
-
-        cred_result = self.db.execute(credentials_query, {"tutor_user_id": tutor_user_id}).fetchone()
-        credential_count = cred_result.credential_count if cred_result else 0
-
         # 30 points per credential, max 120 points (4+ credentials)
         credential_score = min(credential_count * 30, 120)
         score += credential_score
@@ -402,35 +464,11 @@ class TutorScoringCalculator:
 
         Returns: (penalty_score, details_dict)
         """
-        penalty = 0
-        details = {
-            "late_payments": 0,
-            "missed_payments": 0,
-            "total_debt": 0.0,
-            "payment_history_count": 0,
-            "on_time_percentage": 100.0
-        }
-
         try:
             # Get payment history for BOTH subscription AND booking payments
             # For bookings, get amount from enrolled_students.agreed_price
-            query = text("""
-                SELECT
-                    COUNT(*) as total_payments,
-                    COUNT(*) FILTER (WHERE ui.payment_status = 'paid') as paid_count,
-                    COUNT(*) FILTER (WHERE ui.payment_status = 'late') as late_count,
-                    COUNT(*) FILTER (WHERE ui.payment_status = 'missed') as missed_count,
-                    COALESCE(
-                        SUM(
-                            CASE
-                                WHEN ui.investment_type = 'booking' THEN es.agreed_price
-                                ELSE ui.amount
-                            END
-                        ) FILTER (WHERE ui.payment_status IN ('pending', 'late', 'missed')),
-                        0
-                    ) as total_debt,
-                    COALESCE(SUM(ui.late_fee), 0) as total_late_fees,
-                    MAX(ui.days_overdue) as max_days_overdue
+            query = text(f"""
+                SELECT {PAYMENT_STATS_COLUMNS}
                 FROM user_investments ui
                 LEFT JOIN enrolled_students es ON es.id = ui.student_payment_id
                 WHERE ui.user_id = :user_id
@@ -439,73 +477,86 @@ class TutorScoringCalculator:
             """)
 
             result = self.db.execute(query, {"user_id": tutor_user_id}).fetchone()
-
-            if not result or result.total_payments == 0:
-                return 0, {"reason": "No payment history", "penalty": 0}
-
-            late_count = result.late_count or 0
-            missed_count = result.missed_count or 0
-            total_debt = float(result.total_debt or 0)
-            max_days_overdue = result.max_days_overdue or 0
-            paid_count = result.paid_count or 0
-            total_payments = result.total_payments
-
-            # Calculate on-time percentage
-            on_time_percentage = (paid_count / total_payments * 100) if total_payments > 0 else 100.0
-
-            details.update({
-                "late_payments": late_count,
-                "missed_payments": missed_count,
-                "total_debt": total_debt,
-                "payment_history_count": total_payments,
-                "on_time_percentage": round(on_time_percentage, 1),
-                "max_days_overdue": max_days_overdue
-            })
-
-            # Calculate penalties
-
-            # 1. Late payment penalty (-15 points each)
-            if late_count > 0:
-                late_penalty = max(late_count * -15, -150)  # Max -150 for late payments
-                penalty += late_penalty
-                details["late_payment_penalty"] = late_penalty
-
-            # 2. Missed payment penalty (-45 points each)
-            if missed_count > 0:
-                missed_penalty = max(missed_count * -45, -150)  # Max -150 for missed payments
-                penalty += missed_penalty
-                details["missed_payment_penalty"] = missed_penalty
-
-            # 3. Accumulated debt penalty (-3 points per 100 ETB)
-            if total_debt > 0:
-                debt_penalty = max(int(total_debt / 100) * -3, -150)  # Max -150 for debt
-                penalty += debt_penalty
-                details["debt_penalty"] = debt_penalty
-
-            # 4. Severe overdue penalty (payment > 60 days overdue)
-            if max_days_overdue > 60:
-                severe_penalty = -90
-                penalty += severe_penalty
-                details["severe_overdue_penalty"] = severe_penalty
-
-            # 5. Complete non-payment check (total debt > 5000 ETB and missed > 2)
-            if total_debt > 5000 and missed_count >= 2:
-                # Complete removal from visibility
-                penalty = -300
-                details["complete_non_payment"] = True
-                details["reason"] = f"Total debt {total_debt} ETB with {missed_count} missed payments"
-
-            # Cap penalty at -300 (complete score removal)
-            penalty = max(penalty, -300)
-
-            details["total_penalty"] = penalty
-
-            return penalty, details
+            return self._score_payment_reliability(result)
 
         except Exception as e:
             print(f"⚠️ Error calculating payment reliability for user {tutor_user_id}: {e}")
             return 0, {"error": str(e), "penalty": 0}
 
+    @staticmethod
+    def _score_payment_reliability(result) -> tuple[int, dict]:
+        """Turn a PAYMENT_STATS_COLUMNS row into (penalty, details)"""
+        penalty = 0
+        details = {
+            "late_payments": 0,
+            "missed_payments": 0,
+            "total_debt": 0.0,
+            "payment_history_count": 0,
+            "on_time_percentage": 100.0
+        }
+
+        if not result or result.total_payments == 0:
+            return 0, {"reason": "No payment history", "penalty": 0}
+
+        late_count = result.late_count or 0
+        missed_count = result.missed_count or 0
+        total_debt = float(result.total_debt or 0)
+        max_days_overdue = result.max_days_overdue or 0
+        paid_count = result.paid_count or 0
+        total_payments = result.total_payments
+
+        # Calculate on-time percentage
+        on_time_percentage = (paid_count / total_payments * 100) if total_payments > 0 else 100.0
+
+        details.update({
+            "late_payments": late_count,
+            "missed_payments": missed_count,
+            "total_debt": total_debt,
+            "payment_history_count": total_payments,
+            "on_time_percentage": round(on_time_percentage, 1),
+            "max_days_overdue": max_days_overdue
+        })
+
+        # Calculate penalties
+
+        # 1. Late payment penalty (-15 points each)
+        if late_count > 0:
+            late_penalty = max(late_count * -15, -150)  # Max -150 for late payments
+            penalty += late_penalty
+            details["late_payment_penalty"] = late_penalty
+
+        # 2. Missed payment penalty (-45 points each)
+        if missed_count > 0:
+            missed_penalty = max(missed_count * -45, -150)  # Max -150 for missed payments
+            penalty += missed_penalty
+            details["missed_payment_penalty"] = missed_penalty
+
+        # 3. Accumulated debt penalty (-3 points per 100 ETB)
+        if total_debt > 0:
+            debt_penalty = max(int(total_debt / 100) * -3, -150)  # Max -150 for debt
+            penalty += debt_penalty
+            details["debt_penalty"] = debt_penalty
+
+        # 4. Severe overdue penalty (payment > 60 days overdue)
+        if max_days_overdue > 60:
+            severe_penalty = -90
+            penalty += severe_penalty
+            details["severe_overdue_penalty"] = severe_penalty
+
+        # 5. Complete non-payment check (total debt > 5000 ETB and missed > 2)
+        if total_debt > 5000 and missed_count >= 2:
+            # Complete removal from visibility
+            penalty = -300
+            details["complete_non_payment"] = True
+            details["reason"] = f"Total debt {total_debt} ETB with {missed_count} missed payments"
+
+        # Cap penalty at -300 (complete score removal)
+        penalty = max(penalty, -300)
+
+        details["total_penalty"] = penalty
+
+        return penalty, details
+
     # New tutors (no reviews) are treated as this rating, and few-review tutors
     # are pulled toward it (Bayesian prior), so a single 5★ review can't top the list.
     RATING_PRIOR_VALUE = 2.0   # default ("2 stars") for tutors with no/few reviews
@@ -539,8 +590,13 @@ class TutorScoringCalculator:
         review_count = int(result.review_count) if result else 0
         avg_rating = float(result.avg_rating) if result and result.avg_rating else 0.0
 
-        prior_v = self.RATING_PRIOR_VALUE
-        prior_w = self.RATING_PRIOR_WEIGHT
+        return self._score_rating(review_count, avg_rating)
+
+    @classmethod
+    def _score_rating(cls, review_count: int, avg_rating: float) -> tuple[int, dict]:
+        """Confidence-weighted rating score from review count and average"""
+        prior_v = cls.RATING_PRIOR_VALUE
+        prior_w = cls.RATING_PRIOR_WEIGHT
 
         # Confidence-weighted rating on the 0-5 scale
         effective_rating = (
@@ -548,7 +604,7 @@ class TutorScoringCalculator:
             / (review_count + prior_w)
         )
 
-        score = round(effective_rating / 5.0 * self.RATING_MAX_POINTS)
+        score = round(effective_rating / 5.0 * cls.RATING_MAX_POINTS)
 
         return score, {
             "review_count": review_count,
@@ -571,73 +627,316 @@ class TutorScoringCalculator:
 
         Returns: (total_new_score, detailed_breakdown_dict)
         """
+        return self._combine_scores(
+            rating=self.calculate_rating_score(tutor_id),
+            interest_hobby=self.calculate_interest_hobby_score(
+                tutor_id, student_interests, student_hobbies
+            ),
+            total_students=self.calculate_total_students_score(tutor_id),
+            completion_rate=self.calculate_completion_rate_score(tutor_id),
+            response_time=self.calculate_response_time_score(tutor_id, tutor_user_id),
+            experience=self.calculate_experience_score(tutor_user_id, tutor_profile_created_at),
+            payment_reliability=self.calculate_payment_reliability_penalty(tutor_user_id)
+        )
+
+    @staticmethod
+    def _combine_scores(
+        rating: tuple,
+        interest_hobby: tuple,
+        total_students: tuple,
+        completion_rate: tuple,
+        response_time: tuple,
+        experience: tuple,
+        payment_reliability: tuple
+    ) -> tuple[int, dict]:
+        """Sum per-factor (score, details) results into the total + breakdown dict"""
         total_score = 0
         breakdown = {}
 
         # 0. Rating (0-500 points) - PRIMARY FACTOR (replaces subscription plan)
-        rating_score, rating_details = self.calculate_rating_score(tutor_id)
-        total_score += rating_score
-        breakdown["rating"] = {
-            "score": rating_score,
-            "details": rating_details
+        # 1. Interest/Hobby Matching (0-120 points)
+        # 2. Total Students (0-200 points)
+        # 3. Completion Rate (0-150 points)
+        # 4. Response Time (-60 to +60 points)
+        # 5. Experience (0-300 points)
+        for key, (score, details) in (
+            ("rating", rating),
+            ("interest_hobby_matching", interest_hobby),
+            ("total_students", total_students),
+            ("completion_rate", completion_rate),
+            ("response_time", response_time),
+            ("experience", experience),
+        ):
+            total_score += score
+            breakdown[key] = {
+                "score": score,
+                "details": details
+            }
+
+        # 6. Payment Reliability (0 to -300 points) - PENALTY for late/missed payments
+        payment_penalty, payment_details = payment_reliability
+        total_score += payment_penalty  # This will be negative or zero
+        breakdown["payment_reliability"] = {
+            "score": payment_penalty,
+            "details": payment_details
         }
 
-        # 1. Interest/Hobby Matching (0-150 points)
-        interest_score, interest_details = self.calculate_interest_hobby_score(
-            tutor_id, student_interests, student_hobbies
-        )
-        total_score += interest_score
-        breakdown["interest_hobby_matching"] = {
-            "score": interest_score,
-            "details": interest_details
+        breakdown["total_new_score"] = total_score
+        breakdown["max_possible_new_score"] = 1330  # 500(rating)+120(interest)+200(students)+150(completion)+60(response)+300(experience)
+        breakdown["payment_penalty_applied"] = payment_penalty
+
+        return total_score, breakdown
+
+    # ============================================
+    # BULK (SET-BASED) SCORING
+    # One grouped query per factor for a whole list of tutors, instead of
+    # one query per factor per tutor. Results are identical to the
+    # single-tutor methods above because both share the _score_* helpers.
+    # ============================================
+
+    def calculate_interest_hobby_scores_bulk(
+        self,
+        tutor_ids: List[int],
+        student_interests: List[str] = None,
+        student_hobbies: List[str] = None
+    ) -> Dict[int, tuple[int, dict]]:
+        """Interest/hobby matching for many tutors: {tutor_id: (score, details)}"""
+        if not student_interests and not student_hobbies:
+            return {
+                tutor_id: (0, {"reason": "No student interests/hobbies"})
+                for tutor_id in tutor_ids
+            }
+
+        courses_by_tutor: Dict[int, list] = {}
+        if student_interests and tutor_ids:
+            interest_query = text("""
+                SELECT DISTINCT tp.tutor_id, c.course_name, c.tags, c.course_category
+                FROM tutor_packages tp
+                JOIN courses c ON c.id = ANY(tp.course_ids)
+                WHERE tp.tutor_id = ANY(:tutor_ids) AND c.status = 'verified' AND tp.visibility = 'public'
+                ORDER BY tp.tutor_id, c.course_name, c.course_category
+            """)
+            for row in self.db.execute(interest_query, {"tutor_ids": tutor_ids}).fetchall():
+                courses_by_tutor.setdefault(row.tutor_id, []).append(row)
+
+        hobbies_by_tutor: Dict[int, list] = {}
+        if student_hobbies and tutor_ids:
+            hobby_query = text("""
+                SELECT tp.id AS tutor_id, u.hobbies FROM users u
+                JOIN tutor_profiles tp ON tp.user_id = u.id
+                WHERE tp.id = ANY(:tutor_ids)
+            """)
+            for row in self.db.execute(hobby_query, {"tutor_ids": tutor_ids}).fetchall():
+                hobbies_by_tutor[row.tutor_id] = row.hobbies or []
+
+        return {
+            tutor_id: self._score_interest_hobby(
+                courses_by_tutor.get(tutor_id, []),
+                hobbies_by_tutor.get(tutor_id, []),
+                student_interests,
+                student_hobbies
+            )
+            for tutor_id in tutor_ids
         }
 
-        # 2. Total Students (0-100 points)
-        students_score, students_details = self.calculate_total_students_score(tutor_id)
-        total_score += students_score
-        breakdown["total_students"] = {
-            "score": students_score,
-            "details": students_details
+    def calculate_total_students_scores_bulk(self, tutor_ids: List[int]) -> Dict[int, tuple[int, dict]]:
+        """Total students for many tutors: {tutor_id: (score, details)}"""
+        query = text("""
+            SELECT tutor_id, COUNT(DISTINCT student_id) as total_students
+            FROM enrolled_students
+            WHERE tutor_id = ANY(:tutor_ids)
+            GROUP BY tutor_id
+        """)
+        counts = {
+            row.tutor_id: row.total_students
+            for row in self.db.execute(query, {"tutor_ids": tutor_ids}).fetchall()
+        } if tutor_ids else {}
+
+        return {
+            tutor_id: self._score_total_students(counts.get(tutor_id, 0))
+            for tutor_id in tutor_ids
         }
 
-        # 3. Completion Rate (0-80 points)
-        completion_score, completion_details = self.calculate_completion_rate_score(tutor_id)
-        total_score += completion_score
-        breakdown["completion_rate"] = {
-            "score": completion_score,
-            "details": completion_details
+    def calculate_completion_rate_scores_bulk(self, tutor_ids: List[int]) -> Dict[int, tuple[int, dict]]:
+        """Completion rate for many tutors: {tutor_id: (score, details)}"""
+        query = text("""
+            SELECT
+                tutor_id,
+                COUNT(*) as total_enrollments,
+                COUNT(*) FILTER (WHERE enrolled_at IS NOT NULL) as active_enrollments
+            FROM enrolled_students
+            WHERE tutor_id = ANY(:tutor_ids)
+            GROUP BY tutor_id
+        """)
+        stats = {
+            row.tutor_id: (row.total_enrollments, row.active_enrollments)
+            for row in self.db.execute(query, {"tutor_ids": tutor_ids}).fetchall()
+        } if tutor_ids else {}
+
+        return {
+            tutor_id: self._score_completion_rate(*stats.get(tutor_id, (0, 0)))
+            for tutor_id in tutor_ids
         }
 
-        # 4. Response Time (0-60 points)
-        response_score, response_details = self.calculate_response_time_score(
-            tutor_id, tutor_user_id
-        )
-        total_score += response_score
-        breakdown["response_time"] = {
-            "score": response_score,
-            "details": response_details
+    def calculate_response_time_scores_bulk(self, tutor_ids: List[int]) -> Dict[int, tuple[int, dict]]:
+        """Response time for many tutors (tutor profile ids): {tutor_id: (score, details)}"""
+        query = text("""
+            SELECT
+                tutor_id,
+                COUNT(*) FILTER (
+                    WHERE responded_at IS NOT NULL
+                ) AS answered,
+                COUNT(*) FILTER (
+                    WHERE responded_at IS NULL
+                    AND status = 'pending'
+                    AND created_at < (NOW() - (:ignore_hours || ' hours')::interval)
+                ) AS ignored,
+                AVG(
+                    EXTRACT(EPOCH FROM (responded_at - created_at)) / 60
+                ) FILTER (WHERE responded_at IS NOT NULL) AS avg_response_minutes
+            FROM requested_sessions
+            WHERE tutor_id = ANY(:tutor_ids)
+            GROUP BY tutor_id
+        """)
+        stats = {
+            row.tutor_id: (row.answered, row.ignored, row.avg_response_minutes)
+            for row in self.db.execute(query, {
+                "tutor_ids": tutor_ids,
+                "ignore_hours": self.IGNORE_AFTER_HOURS
+            }).fetchall()
+        } if tutor_ids else {}
+
+        return {
+            tutor_id: self._score_response_time(*stats.get(tutor_id, (0, 0, None)))
+            for tutor_id in tutor_ids
         }
 
-        # 5. Experience (0-50 points)
-        experience_score, experience_details = self.calculate_experience_score(
-            tutor_user_id, tutor_profile_created_at
-        )
-        total_score += experience_score
-        breakdown["experience"] = {
-            "score": experience_score,
-            "details": experience_details
+    def calculate_experience_scores_bulk(
+        self,
+        tutors: Dict[int, tuple[int, datetime]]
+    ) -> Dict[int, tuple[int, dict]]:
+        """
+        Experience for many tutors.
+
+        tutors: {tutor_id: (tutor_user_id, tutor_profile_created_at)}
+        Returns: {tutor_id: (score, details)}
+        """
+        user_ids = list({user_id for user_id, _ in tutors.values()})
+        query = text("""
+            SELECT uploader_id, COUNT(*) as credential_count
+            FROM credentials
+            WHERE uploader_id = ANY(:user_ids)
+            GROUP BY uploader_id
+        """)
+        counts = {
+            row.uploader_id: row.credential_count
+            for row in self.db.execute(query, {"user_ids": user_ids}).fetchall()
+        } if user_ids else {}
+
+        return {
+            tutor_id: self._score_experience(created_at, counts.get(user_id, 0))
+            for tutor_id, (user_id, created_at) in tutors.items()
         }
 
-        # 6. Payment Reliability (0 to -100 points) - PENALTY for late/missed payments
-        payment_penalty, payment_details = self.calculate_payment_reliability_penalty(tutor_user_id)
-        total_score += payment_penalty  # This will be negative or zero
-        breakdown["payment_reliability"] = {
-            "score": payment_penalty,
-            "details": payment_details
+    def calculate_payment_reliability_penalties_bulk(self, user_ids: List[int]) -> Dict[int, tuple[int, dict]]:
+        """Payment reliability for many tutors keyed by USER id: {user_id: (penalty, details)}"""
+        if not user_ids:
+            return {}
+
+        try:
+            query = text(f"""
+                SELECT ui.user_id, {PAYMENT_STATS_COLUMNS}
+                FROM user_investments ui
+                LEFT JOIN enrolled_students es ON es.id = ui.student_payment_id
+                WHERE ui.user_id = ANY(:user_ids)
+                AND ui.investment_type IN ('subscription', 'booking')
+                AND ui.due_date IS NOT NULL
+                GROUP BY ui.user_id
+            """)
+            stats = {
+                row.user_id: row
+                for row in self.db.execute(query, {"user_ids": user_ids}).fetchall()
+            }
+
+        except Exception as e:
+            print(f"⚠️ Error calculating bulk payment reliability for {len(user_ids)} users: {e}")
+            return {user_id: (0, {"error": str(e), "penalty": 0}) for user_id in user_ids}
+
+        return {
+            user_id: self._score_payment_reliability(stats.get(user_id))
+            for user_id in user_ids
         }
 
-        breakdown["total_new_score"] = total_score
-        breakdown["max_possible_new_score"] = 1330  # 500(rating)+120(interest)+200(students)+150(completion)+60(response)+300(experience)
-        breakdown["payment_penalty_applied"] = payment_penalty
+    def calculate_rating_scores_bulk(self, tutor_ids: List[int]) -> Dict[int, tuple[int, dict]]:
+        """Rating for many tutors: {tutor_id: (score, details)}"""
+        query = text("""
+            SELECT
+                tutor_id,
+                COUNT(*) AS review_count,
+                COALESCE(AVG(rating), 0) AS avg_rating
+            FROM tutor_reviews
+            WHERE tutor_id = ANY(:tutor_ids)
+            GROUP BY tutor_id
+        """)
+        stats = {
+            row.tutor_id: (
+                int(row.review_count),
+                float(row.avg_rating) if row.avg_rating else 0.0
+            )
+            for row in self.db.execute(query, {"tutor_ids": tutor_ids}).fetchall()
+        } if tutor_ids else {}
+
+        return {
+            tutor_id: self._score_rating(*stats.get(tutor_id, (0, 0.0)))
+            for tutor_id in tutor_ids
+        }
 
-        return total_score, breakdown
+    def calculate_all_new_scores_bulk(
+        self,
+        tutor_ids: List[int],
+        student_interests: List[str] = None,
+        student_hobbies: List[str] = None
+    ) -> Dict[int, tuple[int, dict]]:
+        """
+        Bulk equivalent of calculate_all_new_scores.
+
+        Looks up user_id/created_at for every tutor in one query, then runs one
+        grouped query per factor. Tutor ids that don't exist are omitted.
+
+        Returns: {tutor_id: (total_new_score, detailed_breakdown_dict)}
+        """
+        tutor_ids = list(dict.fromkeys(tutor_ids))
+        if not tutor_ids:
+            return {}
+
+        profile_rows = self.db.execute(text("""
+            SELECT id, user_id, created_at
+            FROM tutor_profiles
+            WHERE id = ANY(:tutor_ids)
+        """), {"tutor_ids": tutor_ids}).fetchall()
+        tutors = {row.id: (row.user_id, row.created_at) for row in profile_rows}
+        tutor_ids = [tutor_id for tutor_id in tutor_ids if tutor_id in tutors]
+        user_ids = list({user_id for user_id, _ in tutors.values()})
+
+        rating = self.calculate_rating_scores_bulk(tutor_ids)
+        interest_hobby = self.calculate_interest_hobby_scores_bulk(
+            tutor_ids, student_interests, student_hobbies
+        )
+        total_students = self.calculate_total_students_scores_bulk(tutor_ids)
+        completion_rate = self.calculate_completion_rate_scores_bulk(tutor_ids)
+        response_time = self.calculate_response_time_scores_bulk(tutor_ids)
+        experience = self.calculate_experience_scores_bulk(tutors)
+        payment_reliability = self.calculate_payment_reliability_penalties_bulk(user_ids)
+
+        return {
+            tutor_id: self._combine_scores(
+                rating=rating[tutor_id],
+                interest_hobby=interest_hobby[tutor_id],
+                total_students=total_students[tutor_id],
+                completion_rate=completion_rate[tutor_id],
+                response_time=response_time[tutor_id],
+                experience=experience[tutor_id],
+                payment_reliability=payment_reliability[tutors[tutor_id][0]]
+            )
+            for tutor_id in tutor_ids
+        }
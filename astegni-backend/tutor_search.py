@@ -0,0 +1,136 @@
+"""
+Tutor Search
+Indexed matching and ranking for the `search` parameter of /api/tutors and /api/tutors/tiered
+
+Each tutor has one row in tutor_search_documents (models.TutorSearchDocument)
+with everything the search used to scan table by table:
+
+    names       users.first_name, father_name
+    location    users.location
+    languages   users.languages
+    courses     name, category and tags of verified courses in the tutor's public packages
+    schools     titles of experience credentials - current ones, or a verified school's name
+
+Triggers on users, tutor_profiles, tutor_packages, courses, credentials and
+schools rebuild a tutor's row whenever one of its sources changes
+(migrate_add_tutor_search.py). A search then costs two GIN index lookups
+instead of three ILIKE scans plus per-column filters:
+
+- document ILIKE '%term%'     pg_trgm index - the old substring semantics
+- search_vector @@ prefixes   full-text index - every word of the search as a
+                              prefix, in any field (e.g. "math addis")
+
+Matches are ranked by ts_rank over the weighted vector (names > courses >
+schools > location/languages); search_relevance() turns that into
+0-SEARCH_RELEVANCE_POINTS smart-score points.
+
+Usage:
+    python tutor_search.py --rebuild    # rebuild every tutor's document
+    python tutor_search.py "math"       # print the best matches
+"""
+
+import os
+import re
+import sys
+from typing import Dict, List, Optional
+
+from sqlalchemy import desc, func, literal, or_, select, text
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from models import SessionLocal, TutorProfile, TutorSearchDocument
+
+# Smart-score points for a perfect relevance match (ts_rank normalized to 0-1)
+SEARCH_RELEVANCE_POINTS = 100
+
+# ts_rank normalization 32: rank / (rank + 1)
+_RANK_NORMALIZATION = 32
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def prefix_query(search: str) -> Optional[str]:
+    """to_tsquery text matching every word of the search as a prefix, None if it has no words"""
+    words = _WORD.findall(search.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def _rank(search: str):
+    query = prefix_query(search)
+    if query is None:
+        return None
+    return func.ts_rank(
+        TutorSearchDocument.search_vector,
+        func.to_tsquery('simple', query),
+        _RANK_NORMALIZATION
+    )
+
+
+def search_filter(search: str):
+    """Filter for a TutorProfile query: tutors whose search document matches"""
+    conditions = [TutorSearchDocument.document.ilike(f'%{search.lower()}%')]
+    query = prefix_query(search)
+    if query is not None:
+        conditions.append(TutorSearchDocument.search_vector.op('@@')(func.to_tsquery('simple', query)))
+    return TutorProfile.id.in_(
+        select(TutorSearchDocument.tutor_id).where(or_(*conditions))
+    )
+
+
+def search_relevance(search: str):
+    """Smart-score points (0-SEARCH_RELEVANCE_POINTS) of the current TutorProfile row for the search"""
+    rank = _rank(search)
+    if rank is None:
+        return None
+    return func.coalesce(
+        select(rank * SEARCH_RELEVANCE_POINTS)
+        .where(TutorSearchDocument.tutor_id == TutorProfile.id)
+        .scalar_subquery(),
+        0
+    )
+
+
+def search_relevance_map(db: Session, search: str, tutor_ids: List[int]) -> Dict[int, float]:
+    """Relevance points per tutor id (tutors without a full-text match are omitted)"""
+    rank = _rank(search)
+    if rank is None or not tutor_ids:
+        return {}
+    rows = db.execute(
+        select(TutorSearchDocument.tutor_id, rank * SEARCH_RELEVANCE_POINTS)
+        .where(TutorSearchDocument.tutor_id.in_(tutor_ids))
+    ).all()
+    return {tutor_id: float(points) for tutor_id, points in rows if points}
+
+
+def rebuild_search_documents(db: Session) -> int:
+    """Recompute every tutor's document (backfill / repair). Returns the number of tutors."""
+    count = db.execute(text(
+        "SELECT COUNT(*) FROM tutor_profiles WHERE refresh_tutor_search_document(id)"
+    )).scalar()
+    db.execute(text("""
+        DELETE FROM tutor_search_documents d
+        WHERE NOT EXISTS (SELECT 1 FROM tutor_profiles tp WHERE tp.id = d.tutor_id)
+    """))
+    db.commit()
+    return count
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        if "--rebuild" in sys.argv:
+            print(f"[TutorSearch] Rebuilt {rebuild_search_documents(db)} tutor documents")
+        elif len(sys.argv) > 1:
+            term = " ".join(sys.argv[1:])
+            points = search_relevance(term)
+            relevance = (points if points is not None else literal(0)).label("relevance")
+            rows = db.query(TutorProfile.id, relevance).filter(search_filter(term)) \
+                .order_by(desc("relevance")).limit(20).all()
+            for tutor_id, relevance in rows:
+                print(f"  tutor {tutor_id}: {float(relevance):.1f}")
+            print(f"[TutorSearch] {len(rows)} matches shown for '{term}'")
+    finally:
+        db.close()
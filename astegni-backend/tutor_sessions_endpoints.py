@@ -12,78 +12,30 @@ This endpoint manages the unified sessions table linked to enrolled_students.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, date, time
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_dict
+from tutor_availability_index import invalidate_availability_index
+from booking_conflicts import BOOKED_SESSION_STATUSES, enrollment_participants, find_conflicts, lock_participants
 import os
-import jwt
 import json
-from jwt import PyJWTError
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# OAuth2 scheme
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # Get config from environment
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 def get_db_connection():
     """Get database connection"""
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise Exception("DATABASE_URL not found in environment variables")
-    return psycopg.connect(database_url)
-
-def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Get current authenticated user - returns dict with user data"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
+    return pooled_connect(database_url)
 
-        user_id = int(user_id_str)
-    except (PyJWTError, ValueError, TypeError) as e:
-        print(f"JWT decode error: {e}")
-        raise credentials_exception
-
-    # Fetch user from database
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, first_name, father_name, email, phone, roles, active_role,
-                       grandfather_name, profile_picture
-                FROM users WHERE id = %s
-            """, (user_id,))
-            row = cur.fetchone()
-
-            if not row:
-                raise credentials_exception
-
-            return {
-                'id': row[0],
-                'first_name': row[1],
-                'father_name': row[2],
-                'email': row[3],
-                'phone': row[4],
-                'roles': row[5] or [],
-                'active_role': row[6],
-                'grandfather_name': row[7],
-                'profile_picture': row[8]
-            }
-    finally:
-        conn.close()
 
 router = APIRouter()
 
@@ -149,6 +101,7 @@ class SessionCreate(BaseModel):
     notification_enabled: Optional[bool] = False
     alarm_enabled: Optional[bool] = False
     alarm_before_minutes: Optional[int] = 15
+    allow_conflict: Optional[bool] = False  # Book even if the tutor or a student is already booked then
 
 
 class SessionUpdate(BaseModel):
@@ -164,6 +117,7 @@ class SessionUpdate(BaseModel):
     tutor_attendance_status: Optional[str] = None
     student_attendance_status: Optional[str] = None
     priority_level: Optional[str] = None
+    allow_conflict: Optional[bool] = False  # Reschedule even if the new time overlaps another session
 
 
 # ============================================
@@ -171,9 +125,9 @@ class SessionUpdate(BaseModel):
 # ============================================
 
 @router.post("/api/tutor/sessions")
-async def create_session(
+def create_session(
     session_data: SessionCreate,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Create a new tutoring session.
@@ -220,6 +174,23 @@ async def create_session(
                     detail="You can only create sessions for your own enrolled courses"
                 )
 
+            # Overlapping sessions of the tutor or the enrolled students (see booking_conflicts.py)
+            tutor_id, student_ids = enrollment_participants(cur, session_data.enrolled_courses_id)
+            lock_participants(cur, tutor_id, student_ids)
+            conflicts = find_conflicts(
+                cur, tutor_id, student_ids,
+                session_data.session_date, session_data.start_time, session_data.end_time
+            )
+            if conflicts and not session_data.allow_conflict:
+                conn.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail={
+                        "message": "The tutor or a student already has a session at this time",
+                        "conflicts": conflicts
+                    }
+                )
+
             # Calculate duration in minutes
             start_dt = datetime.combine(session_data.session_date, session_data.start_time)
             end_dt = datetime.combine(session_data.session_date, session_data.end_time)
@@ -251,6 +222,7 @@ async def create_session(
 
             session_id = cur.fetchone()[0]
             conn.commit()
+            invalidate_availability_index()
 
             return {
                 "success": True,
@@ -258,7 +230,8 @@ async def create_session(
                 "session_id": session_id,
                 "enrolled_courses_id": session_data.enrolled_courses_id,
                 "session_date": session_data.session_date.isoformat(),
-                "duration": duration
+                "duration": duration,
+                "conflicts": conflicts
             }
 
     except HTTPException:
@@ -275,10 +248,10 @@ async def create_session(
 
 
 @router.put("/api/tutor/sessions/{session_id}")
-async def update_session(
+def update_session(
     session_id: int,
     session_data: SessionUpdate,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Update an existing session.
@@ -307,7 +280,7 @@ async def update_session(
 
             # Verify the session belongs to this tutor via enrolled_courses
             cur.execute("""
-                SELECT s.id, ec.tutor_id
+                SELECT s.id, ec.tutor_id, s.session_date, s.start_time, s.end_time, s.status, ec.students_id
                 FROM sessions s
                 JOIN enrolled_courses ec ON s.enrolled_courses_id = ec.id
                 WHERE s.id = %s
@@ -377,6 +350,31 @@ async def update_session(
             if not update_fields:
                 return {"success": True, "message": "No fields to update"}
 
+            # Moved, or back to a booked status: check the new time (see booking_conflicts.py)
+            conflicts = []
+            new_date = session_data.session_date if session_data.session_date is not None else session_row[2]
+            # time(0, 0) is falsy - a move to midnight must not fall back to the old time
+            new_start = session_data.start_time if session_data.start_time is not None else session_row[3]
+            new_end = session_data.end_time if session_data.end_time is not None else session_row[4]
+            new_status = session_data.status if session_data.status is not None else session_row[5]
+            rebooked = (new_date, new_start, new_end) != tuple(session_row[2:5]) or new_status != session_row[5]
+            if rebooked and new_status in BOOKED_SESSION_STATUSES:
+                student_ids = list(session_row[6] or [])
+                lock_participants(cur, session_row[1], student_ids)
+                conflicts = find_conflicts(
+                    cur, session_row[1], student_ids, new_date, new_start, new_end,
+                    exclude_session_id=session_id
+                )
+                if conflicts and not session_data.allow_conflict:
+                    conn.rollback()
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail={
+                            "message": "The tutor or a student already has a session at this time",
+                            "conflicts": conflicts
+                        }
+                    )
+
             update_fields.append("updated_at = NOW()")
             update_values.append(session_id)
 
@@ -389,12 +387,14 @@ async def update_session(
             cur.execute(query, update_values)
             result = cur.fetchone()
             conn.commit()
+            invalidate_availability_index()
 
             return {
                 "success": True,
                 "message": "Session updated successfully",
                 "session_id": result[0],
-                "status": result[1]
+                "status": result[1],
+                "conflicts": conflicts
             }
 
     except HTTPException:
@@ -411,9 +411,9 @@ async def update_session(
 
 
 @router.delete("/api/tutor/sessions/{session_id}")
-async def delete_session(
+def delete_session(
     session_id: int,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Delete a session. Only allows deleting scheduled sessions (not completed ones).
@@ -469,6 +469,7 @@ async def delete_session(
             # Delete the session
             cur.execute("DELETE FROM sessions WHERE id = %s", (session_id,))
             conn.commit()
+            invalidate_availability_index()
 
             return {
                 "success": True,
@@ -490,11 +491,11 @@ async def delete_session(
 
 
 @router.get("/api/tutor/sessions", response_model=List[TutoringSessionResponse])
-async def get_tutor_sessions(
+def get_tutor_sessions(
     status_filter: Optional[str] = None,  # scheduled, in-progress, completed, cancelled
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Get all tutoring sessions for the authenticated tutor from unified sessions table
@@ -629,9 +630,9 @@ async def get_tutor_sessions(
 
 
 @router.get("/api/tutor/sessions/{session_id}", response_model=TutoringSessionResponse)
-async def get_session(
+def get_session(
     session_id: int,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Get a specific tutoring session by ID from unified sessions table
@@ -741,8 +742,8 @@ async def get_session(
 
 
 @router.get("/api/tutor/sessions/stats/summary")
-async def get_sessions_stats(
-    current_user = Depends(get_current_user)
+def get_sessions_stats(
+    current_user = Depends(get_current_user_dict)
 ):
     """
     Get summary statistics for tutor's sessions from unified sessions table
@@ -828,10 +829,10 @@ class ToggleFeaturedRequest(BaseModel):
 
 
 @router.patch("/api/tutor/sessions/{session_id}/toggle-notification")
-async def toggle_session_notification(
+def toggle_session_notification(
     session_id: int,
     request: ToggleNotificationRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """Toggle notification for a specific session in unified sessions table"""
     conn = get_db_connection()
@@ -894,10 +895,10 @@ async def toggle_session_notification(
 
 
 @router.patch("/api/tutor/sessions/{session_id}/toggle-alarm")
-async def toggle_session_alarm(
+def toggle_session_alarm(
     session_id: int,
     request: ToggleAlarmRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """Toggle alarm for a specific session in unified sessions table"""
     conn = get_db_connection()
@@ -960,10 +961,10 @@ async def toggle_session_alarm(
 
 
 @router.patch("/api/tutor/sessions/{session_id}/toggle-featured")
-async def toggle_session_featured(
+def toggle_session_featured(
     session_id: int,
     request: ToggleFeaturedRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """Toggle featured status for a specific session in unified sessions table"""
     conn = get_db_connection()
@@ -1034,10 +1035,10 @@ class UpdateCourseStatusRequest(BaseModel):
 
 
 @router.patch("/api/tutor/enrolled-courses/{course_id}/status")
-async def update_enrolled_course_status(
+def update_enrolled_course_status(
     course_id: int,
     request: UpdateCourseStatusRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Update the status of an enrolled course.
@@ -1118,8 +1119,8 @@ async def update_enrolled_course_status(
 
 
 @router.post("/api/tutor/enrolled-courses/auto-complete")
-async def auto_complete_expired_courses(
-    current_user: dict = Depends(get_current_user)
+def auto_complete_expired_courses(
+    current_user: dict = Depends(get_current_user_dict)
 ):
     """
     Automatically mark courses as completed if their year_range has ended.
@@ -64,7 +64,7 @@ def get_db():
 
 
 @router.get("/subscriptions", response_model=List[TutorSubscriptionResponse])
-async def get_tutor_subscriptions(
+def get_tutor_subscriptions(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -155,7 +155,7 @@ async def get_tutor_subscriptions(
 
 
 @router.get("/subscriptions/current")
-async def get_current_subscription(
+def get_current_subscription(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -195,7 +195,7 @@ async def get_current_subscription(
 
 
 @router.get("/subscriptions/{subscription_id}/metrics")
-async def get_subscription_metrics(
+def get_subscription_metrics(
     subscription_id: int,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
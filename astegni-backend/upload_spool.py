@@ -0,0 +1,136 @@
+"""
+Upload Spool
+Streams an UploadFile into memory or a temp file, sizing and hashing it on the way
+
+The /api/upload/* handlers used to `await file.read()` whole bodies (up to
+hundreds of MB) and then call the synchronous B2 SDK on the event loop. Now:
+
+    spool = await spool_upload(file, max_bytes=200 * 1024 * 1024,
+                               too_large_detail="Video size exceeds 200MB limit")
+    try:
+        ...validate spool.size...
+        result = await run_in_threadpool(b2_service.upload_file, file_data=spool, ...)
+    finally:
+        spool.close()
+
+- reads UPLOAD_CHUNK_SIZE at a time; SHA-1 and size are computed per chunk
+- stays in memory up to UPLOAD_SPOOL_THRESHOLD, then rolls over to a temp file
+  in UPLOAD_SPOOL_DIR (disk writes and hashing run in the threadpool)
+- stops reading as soon as max_bytes is exceeded (400 with too_large_detail)
+
+BackblazeService.upload_file / upload_file_to_folder accept a SpooledUpload
+and send disk-spooled files as B2 large files, parts uploaded in parallel.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+UPLOAD_SPOOL_THRESHOLD = int(os.getenv("UPLOAD_SPOOL_THRESHOLD", 2 * 1024 * 1024))
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+# Hard cap for handlers without a tighter per-type limit
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 500 * 1024 * 1024))
+
+
+class SpooledUpload:
+    """An upload body held in memory (small) or in a named temp file (large)"""
+
+    def __init__(self, threshold: int = UPLOAD_SPOOL_THRESHOLD):
+        self.threshold = threshold
+        self.size = 0
+        self._sha1 = hashlib.sha1()
+        self._buffer: Optional[io.BytesIO] = io.BytesIO()
+        self._file: Optional[BinaryIO] = None
+        self.path: Optional[str] = None
+
+    @property
+    def sha1(self) -> str:
+        return self._sha1.hexdigest()
+
+    @property
+    def on_disk(self) -> bool:
+        return self.path is not None
+
+    def write(self, chunk: bytes):
+        self._sha1.update(chunk)
+        self.size += len(chunk)
+        if self._file is None and self.size > self.threshold:
+            self._roll_over()
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            self._buffer.write(chunk)
+
+    def _roll_over(self):
+        handle = tempfile.NamedTemporaryFile(prefix="upload_", dir=UPLOAD_SPOOL_DIR, delete=False)
+        self.path = handle.name
+        handle.write(self._buffer.getvalue())
+        self._buffer = None
+        self._file = handle
+
+    def finish(self):
+        """Done writing - flush the temp file so it can be re-opened by path"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def getvalue(self) -> bytes:
+        """Whole body as bytes (reads the temp file for disk-spooled uploads)"""
+        if self._buffer is not None:
+            return self._buffer.getvalue()
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def close(self):
+        """Release the memory / delete the temp file (idempotent)"""
+        self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_bytes: int = UPLOAD_MAX_BYTES,
+    too_large_detail: Optional[str] = None,
+    threshold: int = UPLOAD_SPOOL_THRESHOLD
+) -> SpooledUpload:
+    """Stream `file` into a SpooledUpload; 400 as soon as it exceeds max_bytes"""
+    spool = SpooledUpload(threshold)
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            if spool.size + len(chunk) > max_bytes:
+                raise HTTPException(
+                    status_code=400,
+                    detail=too_large_detail or f"File size exceeds {max_bytes / (1024 * 1024):g}MB limit"
+                )
+            if spool.on_disk or spool.size + len(chunk) > threshold:
+                await run_in_threadpool(spool.write, chunk)
+            else:
+                spool.write(chunk)
+        await run_in_threadpool(spool.finish)
+        return spool
+    except BaseException:
+        spool.close()
+        raise
@@ -0,0 +1,113 @@
+"""
+User Context Cache
+Short-lived per-worker cache of users rows for utils.get_current_user
+
+get_current_user runs on almost every authenticated request. Instead of a
+SELECT (plus the old expire/refresh round trip) per request, the users row is
+cached by user id for USER_CONTEXT_TTL_SECONDS and re-attached to the request's
+session without touching the database, so handlers still get a normal
+persistent User they can modify, commit and refresh.
+
+An entry is dropped when:
+- the TTL expires
+- the token was issued after the entry was cached (login, role switch, refresh)
+- the User is updated or deleted through the ORM (session events below)
+- invalidate_user_context() is called - required after raw-SQL writes to
+  the users table (account deletion/restore, role changes via psycopg, ...)
+
+Each uvicorn worker has its own cache, so writes made by another worker are
+picked up after at most one TTL or when the client gets a new token.
+"""
+
+import copy
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from models import User
+
+
+USER_CONTEXT_TTL_SECONDS = float(os.getenv("USER_CONTEXT_TTL_SECONDS", 30))
+
+# user_id -> (cached_at, column values)
+_cache: Dict[int, Tuple[float, dict]] = {}
+_lock = threading.Lock()
+
+_USER_COLUMNS = [attr.key for attr in inspect(User).column_attrs]
+
+
+def invalidate_user_context(user_id: int):
+    """Forget the cached row for a user (call after raw-SQL writes to users)"""
+    with _lock:
+        _cache.pop(int(user_id), None)
+
+
+def clear_user_context_cache():
+    with _lock:
+        _cache.clear()
+
+
+def _snapshot(user: User) -> dict:
+    return {key: copy.deepcopy(getattr(user, key)) for key in _USER_COLUMNS}
+
+
+def load_user(db: Session, user_id: int, issued_at: Optional[float] = None) -> Optional[User]:
+    """
+    Return the User for user_id attached to `db`, from cache when possible.
+
+    issued_at is the token's iat (epoch seconds); entries cached before the
+    token was issued are treated as stale.
+    """
+    now = time.time()
+    with _lock:
+        entry = _cache.get(user_id)
+
+    if entry is not None:
+        cached_at, columns = entry
+        fresh = now - cached_at < USER_CONTEXT_TTL_SECONDS
+        if fresh and (issued_at is None or cached_at >= issued_at):
+            user = User(**copy.deepcopy(columns))
+            make_transient_to_detached(user)
+            # load=False attaches the row as persistent without a SELECT
+            return db.merge(user, load=False)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        invalidate_user_context(user_id)
+        return None
+
+    with _lock:
+        _cache[user_id] = (now, _snapshot(user))
+    return user
+
+
+# ============================================
+# ORM INVALIDATION
+# ============================================
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_users(session, flush_context):
+    changed = {
+        obj.id for obj in list(session.dirty) + list(session.deleted)
+        if isinstance(obj, User) and obj.id is not None
+    }
+    if changed:
+        for user_id in changed:
+            invalidate_user_context(user_id)
+        session.info.setdefault("_user_context_dirty", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    # A concurrent request may have re-cached the old row between flush and commit
+    for user_id in session.info.pop("_user_context_dirty", ()):
+        invalidate_user_context(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_flushed_users(session):
+    session.info.pop("_user_context_dirty", None)
@@ -59,7 +59,7 @@ class UserProfileResponse(BaseModel):
         from_attributes = True
 
 @router.get("/api/user/profile", response_model=UserProfileResponse)
-async def get_user_profile(
+def get_user_profile(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -126,7 +126,7 @@ async def get_user_profile(
     }
 
 @router.put("/api/user/profile")
-async def update_user_profile(
+def update_user_profile(
     profile_data: UserProfileUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -216,7 +216,7 @@ async def update_user_profile(
     }
 
 @router.get("/api/user/profile/full")
-async def get_full_user_profile(
+def get_full_user_profile(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -275,7 +275,7 @@ async def get_full_user_profile(
     return full_profile
 
 @router.put("/api/user/profile/full")
-async def update_full_user_profile(
+def update_full_user_profile(
     profile_data: dict,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -78,7 +78,7 @@ class LanguageSettings(BaseModel):
 # ==========================================
 
 @router.get("/2fa/status")
-async def get_2fa_status(
+def get_2fa_status(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -118,7 +118,7 @@ async def get_2fa_status(
 
 
 @router.post("/2fa/setup")
-async def setup_2fa(
+def setup_2fa(
     request: TwoFactorSetupRequest,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -170,7 +170,7 @@ async def setup_2fa(
 
 
 @router.post("/2fa/send-code")
-async def send_2fa_code(
+def send_2fa_code(
     request: TwoFactorSetupRequest,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -196,7 +196,7 @@ async def send_2fa_code(
 
 
 @router.post("/2fa/verify")
-async def verify_2fa(
+def verify_2fa(
     request: TwoFactorVerifyRequest,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -246,7 +246,7 @@ async def verify_2fa(
 
 
 @router.post("/2fa/disable")
-async def disable_2fa(
+def disable_2fa(
     request: TwoFactorDisableRequest,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -277,7 +277,7 @@ async def disable_2fa(
 # ==========================================
 
 @router.get("/sessions")
-async def get_active_sessions(
+def get_active_sessions(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -333,7 +333,7 @@ async def get_active_sessions(
 
 
 @router.delete("/sessions/{session_id}")
-async def terminate_session(
+def terminate_session(
     session_id: str,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -356,7 +356,7 @@ async def terminate_session(
 
 
 @router.delete("/sessions/all")
-async def terminate_all_other_sessions(
+def terminate_all_other_sessions(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -377,7 +377,7 @@ async def terminate_all_other_sessions(
 
 
 @router.get("/login-history")
-async def get_login_history(
+def get_login_history(
     days: int = 30,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -416,7 +416,7 @@ async def get_login_history(
 # ==========================================
 
 @router.post("/unlink-google")
-async def unlink_google_account(
+def unlink_google_account(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -442,7 +442,7 @@ async def unlink_google_account(
 
 
 @router.post("/set-password")
-async def set_password(
+def set_password(
     request: SetPasswordRequest,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -467,7 +467,7 @@ async def set_password(
 
 
 @router.post("/verify-password")
-async def verify_password(
+def verify_password(
     request: PasswordVerifyRequest,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -492,7 +492,7 @@ async def verify_password(
 # ==========================================
 
 @router.post("/export/request")
-async def request_data_export(
+def request_data_export(
     background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -522,7 +522,7 @@ async def request_data_export(
 
 
 @router.post("/export/verify")
-async def verify_and_export(
+def verify_and_export(
     code: str,
     categories: List[str],
     format: str = "json",
@@ -582,7 +582,7 @@ async def verify_and_export(
 # ==========================================
 
 @router.get("/platform-review")
-async def get_my_platform_review(
+def get_my_platform_review(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -612,7 +612,7 @@ async def get_my_platform_review(
 
 
 @router.post("/platform-review")
-async def submit_platform_review(
+def submit_platform_review(
     request: PlatformReviewRequest,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -656,7 +656,7 @@ async def submit_platform_review(
 # ==========================================
 
 @router.get("/settings/appearance")
-async def get_appearance_settings(
+def get_appearance_settings(
     current_user: dict = Depends(get_current_user),
     verification_token: Optional[str] = Header(default=None, alias="X-2FA-Token"),
     db: Session = Depends(get_db)
@@ -698,7 +698,7 @@ async def get_appearance_settings(
 
 
 @router.put("/settings/appearance")
-async def update_appearance_settings(
+def update_appearance_settings(
     settings: AppearanceSettings,
     current_user: dict = Depends(get_current_user),
     verification_token: Optional[str] = Header(default=None, alias="X-2FA-Token"),
@@ -728,7 +728,7 @@ async def update_appearance_settings(
 
 
 @router.get("/settings/language")
-async def get_language_settings(
+def get_language_settings(
     current_user: dict = Depends(get_current_user),
     verification_token: Optional[str] = Header(default=None, alias="X-2FA-Token"),
     db: Session = Depends(get_db)
@@ -766,7 +766,7 @@ async def get_language_settings(
 
 
 @router.put("/settings/language")
-async def update_language_settings(
+def update_language_settings(
     settings: LanguageSettings,
     current_user: dict = Depends(get_current_user),
     verification_token: Optional[str] = Header(default=None, alias="X-2FA-Token"),
@@ -3,6 +3,7 @@ Utility functions for Astegni Educational Platform
 """
 
 import os
+import time
 import uuid
 import jwt
 import bcrypt
@@ -10,13 +11,18 @@ import aiofiles
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import HTTPException, status, Depends, UploadFile
-from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from models import User, get_db
 from config import SECRET_KEY, REFRESH_SECRET_KEY, ALGORITHM
 
-# OAuth2 scheme
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+# Auth dependencies live in auth.py; re-exported here for existing imports
+from auth import (
+    oauth2_scheme,
+    get_current_user,
+    get_current_user_optional,
+    get_current_user_claims,
+    get_current_user_dict,
+)
 
 # ============================================
 # AUTHENTICATION UTILITIES
@@ -56,7 +62,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         # 7-day access token (balances security and convenience)
         expire = datetime.utcnow() + timedelta(days=7)
-    to_encode.update({"exp": expire})
+    # iat lets get_current_user drop user context cached before this token existed
+    to_encode.update({"exp": expire, "iat": time.time()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -217,96 +224,6 @@ def get_role_ids_from_user(user: User, db: Session) -> dict:
     return role_ids
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    """Get current authenticated user from JWT token"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        # Reject admin/advertiser tokens on user-facing endpoints (symmetric to
-        # the admin/advertiser dependencies rejecting plain user tokens). User
-        # tokens carry no "type"; these do.
-        if payload.get("type") in ("admin", "advertiser"):
-            raise credentials_exception
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
-
-        # Convert string back to int (PyJWT requires string, but our DB uses int)
-        user_id = int(user_id_str)
-    except jwt.PyJWTError as e:
-        print(f"[get_current_user] JWT decode error: {e}")
-        raise credentials_exception
-    except (ValueError, TypeError) as e:
-        print(f"[get_current_user] Value/Type error: {e}")
-        raise credentials_exception
-
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        print(f"[get_current_user] User not found: {user_id}")
-        raise credentials_exception
-
-    # CRITICAL FIX: Expire and refresh user object to get fresh data from database
-    # This prevents SQLAlchemy session cache from returning stale active_role data
-    # after role switches (fixes role reversion bug after grace period expires)
-    db.expire(user)
-    db.refresh(user)
-    print(f"[get_current_user] Refreshed user {user.id} from database - active_role: {user.active_role}")
-
-    # Attach role_ids to user object for easy access
-    user.role_ids = payload.get("role_ids", {})
-
-    # Attach current active role from token (the role user is currently logged in as)
-    user.current_role = payload.get("role", user.active_role)
-    print(f"[get_current_user] User {user.id} current_role from token: {user.current_role}")
-    print(f"[get_current_user] User {user.id} role_ids from token: {user.role_ids}")
-
-    # Convert string IDs back to integers
-    if user.role_ids:
-        try:
-            user.role_ids = {
-                role: int(role_id) if role_id and isinstance(role_id, str) and role_id.isdigit() else None
-                for role, role_id in user.role_ids.items()
-            }
-            print(f"[get_current_user] Converted role_ids: {user.role_ids}")
-        except Exception as e:
-            print(f"[get_current_user] Error converting role_ids: {e}")
-            user.role_ids = {}
-
-    # Attach profile_id and profile_type based on current active role
-    user.profile_type = user.current_role
-    user.profile_id = user.role_ids.get(user.current_role) if user.role_ids else None
-    print(f"[get_current_user] Profile context: profile_type={user.profile_type}, profile_id={user.profile_id}")
-
-    return user
-
-def get_current_user_optional(
-    authorization: Optional[str] = None,
-    db: Session = Depends(get_db)
-) -> Optional[User]:
-    """Get current user if authenticated, None otherwise"""
-    if not authorization or not authorization.startswith("Bearer "):
-        return None
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            return None
-
-        # Convert string back to int
-        user_id = int(user_id_str)
-
-        user = db.query(User).filter(User.id == user_id).first()
-        return user
-    except (jwt.PyJWTError, ValueError, TypeError):
-        return None
-
 # ============================================
 # FILE HANDLING UTILITIES
 # ============================================
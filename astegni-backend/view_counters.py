@@ -0,0 +1,305 @@
+"""
+View Counters
+Buffered search/view counts and set-based trending scores for tutors, courses and schools
+
+/api/tutors/track-views and /api/courses-schools/track-views run on every
+search-results render. They only add 1 per listed id to a counter here; a
+background task (app.py lifespan) every VIEW_COUNTER_FLUSH_INTERVAL seconds:
+
+1. drains the counters and applies them with one UPDATE ... FROM unnest(...)
+   per table: search_count += views, last_search_increment = latest view
+2. recomputes trending_score for the whole table with one UPDATE that only
+   rewrites rows whose score changed (one worker at a time, advisory lock)
+
+trending_score = search_count x weight of the last search:
+    last 24h: 1.0    1-7 days: 0.7    7-30 days: 0.3    older / never: 0.1
+
+Counter backends (VIEW_COUNTERS env var):
+    memory  (default) per worker - each worker flushes its own increments
+    redis   HINCRBY into shared hashes in REDIS_URL, drained atomically by whichever worker flushes
+
+Usage:
+    python view_counters.py    # recompute every trending score now
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from models import SessionLocal
+
+load_dotenv()
+
+VIEW_COUNTERS = os.getenv("VIEW_COUNTERS", "memory").lower()
+VIEW_COUNTER_PREFIX = os.getenv("VIEW_COUNTER_PREFIX", "views")
+VIEW_COUNTER_FLUSH_INTERVAL = float(os.getenv("VIEW_COUNTER_FLUSH_INTERVAL", 30))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Counted entity -> table with search_count / last_search_increment / trending_score
+VIEW_COUNTER_TABLES = {
+    "tutor": "tutor_profiles",
+    "course": "courses",
+    "school": "schools",
+}
+
+# Serializes trending recomputes across uvicorn workers (transaction-scoped advisory lock)
+_TRENDING_LOCK_KEY = 734_002
+
+# Timestamps are naive UTC (datetime.utcnow() in the ORM)
+_NOW_UTC = "(NOW() AT TIME ZONE 'UTC')"
+
+TRENDING_SCORE_SQL = f"""
+    COALESCE(search_count, 0) * CAST(CASE
+        WHEN last_search_increment IS NULL THEN 0.1
+        WHEN last_search_increment > {_NOW_UTC} - INTERVAL '1 day' THEN 1.0
+        WHEN last_search_increment > {_NOW_UTC} - INTERVAL '7 days' THEN 0.7
+        WHEN last_search_increment > {_NOW_UTC} - INTERVAL '30 days' THEN 0.3
+        ELSE 0.1
+    END AS float8)
+"""
+
+# kind -> {id: (views, seconds since the latest view)}
+Drained = Dict[str, Dict[int, Tuple[int, float]]]
+
+
+# ============================================
+# COUNTER BACKENDS
+# ============================================
+
+class MemoryViewCounters:
+    """Per-worker counts since the last flush"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (kind, id) -> [views, monotonic time of the latest view]
+        self._pending: Dict[Tuple[str, int], list] = {}
+
+    def increment(self, kind: str, ids: Iterable[int]) -> int:
+        ids = set(ids)
+        now = time.monotonic()
+        with self._lock:
+            for entity_id in ids:
+                counter = self._pending.get((kind, entity_id))
+                if counter is None:
+                    self._pending[(kind, entity_id)] = [1, now]
+                else:
+                    counter[0] += 1
+                    counter[1] = now
+        return len(ids)
+
+    def drain(self) -> Drained:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        now = time.monotonic()
+        drained: Drained = defaultdict(dict)
+        for (kind, entity_id), (views, last) in pending.items():
+            drained[kind][entity_id] = (views, now - last)
+        return drained
+
+    def restore(self, drained: Drained):
+        """Put back counts whose flush failed"""
+        now = time.monotonic()
+        with self._lock:
+            for kind, counts in drained.items():
+                for entity_id, (views, age) in counts.items():
+                    counter = self._pending.setdefault((kind, entity_id), [0, now - age])
+                    counter[0] += views
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+
+# HGETALL + DEL of the count and last-view hashes as one step
+_DRAIN_SCRIPT = """
+local counts = redis.call('HGETALL', KEYS[1])
+local last = redis.call('HGETALL', KEYS[2])
+redis.call('DEL', KEYS[1], KEYS[2])
+return {counts, last}
+"""
+
+
+class RedisViewCounters:
+    """Shared counts: <prefix>:<kind> (id -> views) and <prefix>:<kind>:last (id -> epoch seconds)"""
+
+    def __init__(self, url: str = REDIS_URL, prefix: str = VIEW_COUNTER_PREFIX):
+        import redis
+
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self._drain = self.redis.register_script(_DRAIN_SCRIPT)
+
+    def _keys(self, kind: str) -> Tuple[str, str]:
+        return f"{self.prefix}:{kind}", f"{self.prefix}:{kind}:last"
+
+    def increment(self, kind: str, ids: Iterable[int]) -> int:
+        ids = set(ids)
+        if not ids:
+            return 0
+        counts_key, last_key = self._keys(kind)
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=False)
+        for entity_id in ids:
+            pipe.hincrby(counts_key, entity_id, 1)
+        pipe.hset(last_key, mapping={entity_id: now for entity_id in ids})
+        pipe.execute()
+        return len(ids)
+
+    def drain(self) -> Drained:
+        now = time.time()
+        drained: Drained = {}
+        for kind in VIEW_COUNTER_TABLES:
+            counts, last = self._drain(keys=list(self._keys(kind)))
+            counts = dict(zip(counts[::2], counts[1::2]))
+            last = dict(zip(last[::2], last[1::2]))
+            if counts:
+                drained[kind] = {
+                    int(entity_id): (int(views), max(now - float(last.get(entity_id, now)), 0.0))
+                    for entity_id, views in counts.items()
+                }
+        return drained
+
+    def restore(self, drained: Drained):
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=False)
+        for kind, counts in drained.items():
+            counts_key, last_key = self._keys(kind)
+            for entity_id, (views, age) in counts.items():
+                pipe.hincrby(counts_key, entity_id, views)
+                pipe.hsetnx(last_key, entity_id, now - age)
+        pipe.execute()
+
+    def pending(self) -> int:
+        return sum(self.redis.hlen(self._keys(kind)[0]) for kind in VIEW_COUNTER_TABLES)
+
+
+def create_view_counters(kind: Optional[str] = None):
+    """Counter backend selected by VIEW_COUNTERS (memory | redis)"""
+    kind = (kind or VIEW_COUNTERS).lower()
+    if kind == "redis":
+        return RedisViewCounters()
+    if kind != "memory":
+        print(f"[ViewCounters] Unknown VIEW_COUNTERS '{kind}', using in-memory counters")
+    return MemoryViewCounters()
+
+
+view_counters = create_view_counters()
+
+
+def track_views(kind: str, ids: Iterable[int]) -> int:
+    """Count one view for each distinct id (applied at the next flush). Returns the number of ids."""
+    if kind not in VIEW_COUNTER_TABLES:
+        raise ValueError(f"Unknown view counter kind: {kind}")
+    return view_counters.increment(kind, ids)
+
+
+# ============================================
+# FLUSH + TRENDING RECOMPUTE
+# ============================================
+
+def apply_view_counts(db: Session, drained: Drained) -> int:
+    """Add drained views to search_count and move last_search_increment forward"""
+    updated = 0
+    for kind, counts in drained.items():
+        if not counts:
+            continue
+        ids = list(counts)
+        result = db.execute(text(f"""
+            UPDATE {VIEW_COUNTER_TABLES[kind]} AS t
+            SET search_count = COALESCE(t.search_count, 0) + v.views,
+                last_search_increment = GREATEST(
+                    t.last_search_increment,
+                    {_NOW_UTC} - make_interval(secs => v.age)
+                )
+            FROM unnest(CAST(:ids AS int[]), CAST(:views AS int[]), CAST(:ages AS float8[]))
+                AS v(id, views, age)
+            WHERE t.id = v.id
+        """), {
+            "ids": ids,
+            "views": [counts[entity_id][0] for entity_id in ids],
+            "ages": [counts[entity_id][1] for entity_id in ids],
+        })
+        updated += result.rowcount
+    return updated
+
+
+def recompute_trending_scores(db: Session, kinds: Iterable[str] = VIEW_COUNTER_TABLES) -> Optional[int]:
+    """
+    Set-based trending_score recompute; only rows whose score changed are written.
+
+    Returns the number of rows updated, or None if another worker holds the lock.
+    The caller commits.
+    """
+    locked = db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _TRENDING_LOCK_KEY}
+    ).scalar()
+    if not locked:
+        return None
+
+    updated = 0
+    for kind in kinds:
+        table_name = VIEW_COUNTER_TABLES[kind]
+        # tutor_ranking_index re-scores tutors whose profile changed (trending bonus)
+        touch = f", updated_at = {_NOW_UTC}" if table_name == "tutor_profiles" else ""
+        result = db.execute(text(f"""
+            UPDATE {table_name}
+            SET trending_score = {TRENDING_SCORE_SQL}{touch}
+            WHERE trending_score IS DISTINCT FROM {TRENDING_SCORE_SQL}
+        """))
+        updated += result.rowcount
+    return updated
+
+
+def flush_view_counters() -> Tuple[int, Optional[int]]:
+    """Apply pending views, then recompute trending scores. Returns (rows counted, scores changed)."""
+    drained = view_counters.drain()
+    db = SessionLocal()
+    try:
+        counted = apply_view_counts(db, drained)
+        db.commit()
+    except Exception:
+        db.rollback()
+        db.close()
+        view_counters.restore(drained)
+        raise
+
+    try:
+        rescored = recompute_trending_scores(db)
+        db.commit()
+        return counted, rescored
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def view_counter_flush_loop():
+    """Background task started from app.py lifespan"""
+    while True:
+        await asyncio.sleep(VIEW_COUNTER_FLUSH_INTERVAL)
+        try:
+            counted, rescored = await asyncio.to_thread(flush_view_counters)
+            if counted or rescored:
+                print(f"[ViewCounters] Counted views for {counted} rows, {rescored or 0} trending scores changed")
+        except Exception as e:
+            print(f"⚠️ [ViewCounters] Flush failed: {e}")
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        rescored = recompute_trending_scores(db)
+        db.commit()
+        print(f"Trending scores changed: {rescored}")
+    finally:
+        db.close()
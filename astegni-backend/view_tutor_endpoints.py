@@ -8,6 +8,7 @@ from fastapi.security import OAuth2PasswordBearer
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 import psycopg
+from db_pool import pooled_connect
 import os
 from dotenv import load_dotenv
 
@@ -20,14 +21,14 @@ router = APIRouter(prefix="/api/view-tutor", tags=["view-tutor"])
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg.connect(DATABASE_URL)
+    return pooled_connect(DATABASE_URL)
 
 # ============================================
 # GET COMPLETE TUTOR PROFILE (Main endpoint)
 # ============================================
 
 @router.get("/{tutor_id}")
-async def get_complete_tutor_profile(tutor_id: int, by_user_id: bool = Query(False)):
+def get_complete_tutor_profile(tutor_id: int, by_user_id: bool = Query(False)):
     """
     Get complete tutor profile with all related data for view-tutor.html
     Returns: profile, stats, reviews, achievements, certificates, experience, videos, packages, schedules
@@ -187,7 +188,7 @@ async def get_complete_tutor_profile(tutor_id: int, by_user_id: bool = Query(Fal
 # ============================================
 
 @router.get("/{tutor_id}/reviews")
-async def get_tutor_reviews(
+def get_tutor_reviews(
     tutor_id: int,
     limit: int = Query(default=10, le=50),
     offset: int = Query(default=0, ge=0),
@@ -274,7 +275,7 @@ async def get_tutor_reviews(
 # ============================================
 
 @router.get("/{tutor_id}/achievements")
-async def get_tutor_achievements(tutor_id: int, featured_only: bool = False):
+def get_tutor_achievements(tutor_id: int, featured_only: bool = False):
     """Get tutor achievements from credentials table"""
     conn = get_db_connection()
     try:
@@ -333,7 +334,7 @@ async def get_tutor_achievements(tutor_id: int, featured_only: bool = False):
 # ============================================
 
 @router.get("/{tutor_id}/certificates")
-async def get_tutor_certificates(tutor_id: int, active_only: bool = True):
+def get_tutor_certificates(tutor_id: int, active_only: bool = True):
     """Get tutor certificates from credentials table"""
     conn = get_db_connection()
     try:
@@ -392,7 +393,7 @@ async def get_tutor_certificates(tutor_id: int, active_only: bool = True):
 # ============================================
 
 @router.get("/{tutor_id}/experience")
-async def get_tutor_experience(tutor_id: int):
+def get_tutor_experience(tutor_id: int):
     """Get tutor work experience from credentials table"""
     conn = get_db_connection()
     try:
@@ -462,7 +463,7 @@ async def get_tutor_experience(tutor_id: int):
 # ============================================
 
 @router.get("/{tutor_id}/videos")
-async def get_tutor_videos(tutor_id: int, video_type: Optional[str] = None):
+def get_tutor_videos(tutor_id: int, video_type: Optional[str] = None):
     """Get tutor videos"""
     conn = get_db_connection()
     try:
@@ -522,7 +523,7 @@ async def get_tutor_videos(tutor_id: int, video_type: Optional[str] = None):
 # ============================================
 
 @router.get("/{tutor_id}/packages")
-async def get_tutor_packages(tutor_id: int):
+def get_tutor_packages(tutor_id: int):
     """Get tutor packages with course names"""
     conn = get_db_connection()
     try:
@@ -609,111 +610,59 @@ async def get_tutor_packages(tutor_id: int):
 # ============================================
 
 @router.get("/{tutor_id}/availability/week")
-async def get_week_availability(tutor_id: int):
-    """Get this week's availability status for each day"""
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            # First get user_id from tutor_profiles
-            cur.execute("SELECT user_id FROM tutor_profiles WHERE id = %s", (tutor_id,))
-            row = cur.fetchone()
-            if not row:
-                # Return default availability if tutor not found
-                weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-                return {"availability": [{"day": d, "status": "unavailable", "schedule": None} for d in weekdays]}
-            user_id = row[0]
-
-            # Use schedules table - check for recurring schedules (days array contains weekday names)
-            # schedules table has: scheduler_id, scheduler_role, days (text array), start_time, end_time, status
-            cur.execute("""
-                SELECT days, start_time, end_time, status
-                FROM schedules
-                WHERE scheduler_id = %s AND scheduler_role = 'tutor' AND status = 'active'
-            """, (user_id,))
-
-            # Build a set of available days from all schedules
-            available_days = set()
-            day_schedules = {}
-
-            for row in cur.fetchall():
-                days_array = row[0]  # This is a text array like ['Monday', 'Wednesday']
-                start_time = row[1]
-                end_time = row[2]
-
-                if days_array:
-                    for day in days_array:
-                        available_days.add(day)
-                        if day not in day_schedules:
-                            day_schedules[day] = []
-                        day_schedules[day].append({
-                            "start_time": str(start_time) if start_time else None,
-                            "end_time": str(end_time) if end_time else None,
-                            "is_available": True
-                        })
-
-            # Also check enrolled_courses for schedule info
-            cur.execute("""
-                SELECT days, start_time, end_time, status
-                FROM enrolled_courses
-                WHERE tutor_id = %s AND status = 'active'
-            """, (tutor_id,))
-
-            for row in cur.fetchall():
-                days_json = row[0]  # This is a jsonb field
-                start_time = row[1]
-                end_time = row[2]
-
-                if days_json and isinstance(days_json, dict):
-                    # days might be structured as {"Monday": true, "Wednesday": true}
-                    for day, is_active in days_json.items():
-                        if is_active:
-                            available_days.add(day)
-                            if day not in day_schedules:
-                                day_schedules[day] = []
-                            day_schedules[day].append({
-                                "start_time": str(start_time) if start_time else None,
-                                "end_time": str(end_time) if end_time else None,
-                                "is_available": True
-                            })
-                elif days_json and isinstance(days_json, list):
-                    # days might be an array of day names
-                    for day in days_json:
-                        available_days.add(day)
-                        if day not in day_schedules:
-                            day_schedules[day] = []
-                        day_schedules[day].append({
-                            "start_time": str(start_time) if start_time else None,
-                            "end_time": str(end_time) if end_time else None,
-                            "is_available": True
-                        })
-
-            # Calculate status for each day
-            weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-            availability = []
-
-            for day in weekdays:
-                # Check if this day has any schedules
-                day_schedule_list = day_schedules.get(day)
-
-                # Default status
-                if day in available_days:
-                    status = "available"
-                else:
-                    status = "unavailable"
-
-                availability.append({
-                    "day": day,
-                    "status": status,  # available, limited, booked, unavailable
-                    "schedule": day_schedule_list[0] if day_schedule_list else None
-                })
-
-            return {"availability": availability}
+def get_week_availability(tutor_id: int):
+    """
+    Get this week's availability status for each day
+
+    Served from the availability index (tutor_availability_index.py): the
+    tutor's schedule windows on each date of the current week, minus booked
+    sessions.
+    - available: schedule windows and nothing booked in them
+    - limited: some of the windows are booked
+    - booked: every window is booked
+    - unavailable: no schedule that day
+    """
+    from datetime import timedelta
+    from tutor_availability_index import WEEKDAYS, from_minutes, get_availability_index
 
+    try:
+        index = get_availability_index()
     except Exception as e:
         print(f"Error fetching availability: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        conn.close()
+
+    today = date.today()
+    week_start = today - timedelta(days=today.weekday())  # Monday
+
+    availability = []
+    for offset, day in enumerate(WEEKDAYS):
+        day_date = week_start + timedelta(days=offset)
+        windows = index.windows(tutor_id, day_date)
+        free = index.free_intervals(tutor_id, day_date)
+        free_minutes = sum(end - start for start, end in free)
+
+        if not windows:
+            status = "unavailable"
+        elif not free:
+            status = "booked"
+        elif free_minutes < sum(end - start for start, end in windows):
+            status = "limited"
+        else:
+            status = "available"
+
+        # First free window (or first window if fully booked)
+        shown = free[0] if free else (windows[0] if windows else None)
+        availability.append({
+            "day": day,
+            "status": status,  # available, limited, booked, unavailable
+            "schedule": {
+                "start_time": f"{from_minutes(shown[0])}:00",
+                "end_time": f"{from_minutes(shown[1])}:00",
+                "is_available": bool(free)
+            } if shown else None
+        })
+
+    return {"availability": availability}
 
 
 # ============================================
@@ -721,7 +670,7 @@ async def get_week_availability(tutor_id: int):
 # ============================================
 
 @router.get("/{tutor_id}/availability/featured")
-async def get_featured_availability(tutor_id: int, by_user_id: bool = Query(False)):
+def get_featured_availability(tutor_id: int, by_user_id: bool = Query(False)):
     """
     Get featured schedules and sessions for THIS WEEK availability widget
     Returns:
@@ -856,7 +805,7 @@ async def get_featured_availability(tutor_id: int, by_user_id: bool = Query(Fals
 # ============================================
 
 @router.get("/{tutor_id}/similar")
-async def get_similar_tutors(
+def get_similar_tutors(
     tutor_id: int,
     limit: int = Query(default=8, le=20),
     by_user_id: bool = Query(False)
@@ -0,0 +1,239 @@
+"""
+websocket_backplane.py - Cross-worker fan-out for websocket_manager.ConnectionManager
+
+Each uvicorn worker only holds its own sockets. The backplane lets a worker
+deliver to sockets owned by another worker and answers "is this connection
+key online anywhere?".
+
+Backends (WS_BACKPLANE env var):
+    memory  (default) single process - presence is this worker's sockets only
+    redis   pub/sub + shared presence in REDIS_URL (same server as cache.py)
+
+Redis layout (prefix WS_BACKPLANE_PREFIX, default "ws"):
+    ws:node:<node_id>          pub/sub channel for messages to one worker
+    ws:all                     pub/sub channel for broadcasts
+    ws:nodes                   set of worker node ids
+    ws:alive:<node_id>         heartbeat key with TTL - a node without it is dead
+    ws:presence:<key>          set of node ids holding sockets for a connection key
+    ws:node_keys:<node_id>     set of connection keys held by a node
+
+Presence entries left behind by a crashed worker are ignored once its heartbeat
+expires (WS_NODE_TTL seconds) and cleaned up lazily.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import uuid
+from typing import Awaitable, Callable, Optional, Set, Union
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+WS_BACKPLANE = os.getenv("WS_BACKPLANE", "memory").lower()
+WS_BACKPLANE_PREFIX = os.getenv("WS_BACKPLANE_PREFIX", "ws")
+WS_NODE_TTL = int(os.getenv("WS_NODE_TTL", 30))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+_node_id: Optional[str] = None
+_node_pid: Optional[int] = None
+
+
+def get_node_id() -> str:
+    """Unique id of this worker process (regenerated after fork, e.g. gunicorn --preload)"""
+    global _node_id, _node_pid
+    if _node_pid != os.getpid():
+        _node_pid = os.getpid()
+        _node_id = f"{socket.gethostname()}:{_node_pid}:{uuid.uuid4().hex[:8]}"
+    return _node_id
+
+ConnectionKey = Union[str, int]
+MessageHandler = Callable[[dict], Awaitable[None]]
+
+
+class InMemoryBackplane:
+    """Single-process backplane: there are no other workers to reach"""
+
+    distributed = False
+
+    def __init__(self):
+        self._keys: Set[ConnectionKey] = set()
+
+    async def start(self, on_message: MessageHandler):
+        pass
+
+    async def stop(self):
+        self._keys.clear()
+
+    async def add_presence(self, connection_key: ConnectionKey):
+        self._keys.add(connection_key)
+
+    async def remove_presence(self, connection_key: ConnectionKey):
+        self._keys.discard(connection_key)
+
+    async def nodes_for(self, connection_key: ConnectionKey) -> Set[str]:
+        return {get_node_id()} if connection_key in self._keys else set()
+
+    async def online_keys(self) -> Set[str]:
+        return {str(key) for key in self._keys}
+
+    async def publish(self, node_id: str, envelope: dict):
+        pass
+
+    async def publish_all(self, envelope: dict):
+        pass
+
+
+class RedisBackplane:
+    """Redis pub/sub for delivery plus shared presence sets"""
+
+    distributed = True
+
+    def __init__(self, url: str = REDIS_URL, prefix: str = WS_BACKPLANE_PREFIX, node_ttl: int = WS_NODE_TTL):
+        self.url = url
+        self.prefix = prefix
+        self.node_ttl = node_ttl
+        self.redis = None
+        self._pubsub = None
+        self._tasks = []
+
+    # ---------- keys ----------
+
+    def _k(self, *parts) -> str:
+        return ":".join([self.prefix, *map(str, parts)])
+
+    @property
+    def node_channel(self) -> str:
+        return self._k("node", get_node_id())
+
+    # ---------- lifecycle ----------
+
+    async def start(self, on_message: MessageHandler):
+        import redis.asyncio as aioredis
+
+        self.redis = aioredis.from_url(self.url, decode_responses=True)
+        await self.redis.ping()
+        await self._heartbeat_once()
+
+        self._pubsub = self.redis.pubsub()
+        await self._pubsub.subscribe(self.node_channel, self._k("all"))
+        self._tasks = [
+            asyncio.create_task(self._reader(on_message)),
+            asyncio.create_task(self._heartbeat_loop()),
+        ]
+        print(f"[WS] Redis backplane started for node {get_node_id()}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self.redis is None:
+            return
+        try:
+            await self._forget_node(get_node_id())
+            if self._pubsub is not None:
+                await self._pubsub.unsubscribe()
+                await self._pubsub.aclose()
+        finally:
+            await self.redis.aclose()
+            self.redis = None
+
+    async def _heartbeat_once(self):
+        pipe = self.redis.pipeline()
+        pipe.sadd(self._k("nodes"), get_node_id())
+        pipe.set(self._k("alive", get_node_id()), 1, ex=self.node_ttl)
+        await pipe.execute()
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.node_ttl / 3)
+            try:
+                await self._heartbeat_once()
+            except Exception as e:
+                print(f"[WS] Backplane heartbeat failed: {e}")
+
+    async def _reader(self, on_message: MessageHandler):
+        while True:
+            try:
+                async for item in self._pubsub.listen():
+                    if item.get("type") != "message":
+                        continue
+                    envelope = json.loads(item["data"])
+                    if envelope.get("origin") == get_node_id():
+                        continue
+                    try:
+                        await on_message(envelope)
+                    except Exception as e:
+                        print(f"[WS] Backplane delivery error: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[WS] Backplane subscription lost, retrying: {e}")
+                await asyncio.sleep(1)
+
+    # ---------- presence ----------
+
+    async def add_presence(self, connection_key: ConnectionKey):
+        pipe = self.redis.pipeline()
+        pipe.sadd(self._k("presence", connection_key), get_node_id())
+        pipe.sadd(self._k("node_keys", get_node_id()), str(connection_key))
+        await pipe.execute()
+
+    async def remove_presence(self, connection_key: ConnectionKey):
+        pipe = self.redis.pipeline()
+        pipe.srem(self._k("presence", connection_key), get_node_id())
+        pipe.srem(self._k("node_keys", get_node_id()), str(connection_key))
+        await pipe.execute()
+
+    async def _alive(self, node_ids) -> Set[str]:
+        node_ids = list(node_ids)
+        if not node_ids:
+            return set()
+        flags = await self.redis.mget([self._k("alive", node_id) for node_id in node_ids])
+        return {node_id for node_id, flag in zip(node_ids, flags) if flag}
+
+    async def _forget_node(self, node_id: str):
+        """Drop every presence entry of a stopped or dead node"""
+        keys = await self.redis.smembers(self._k("node_keys", node_id))
+        pipe = self.redis.pipeline()
+        for key in keys:
+            pipe.srem(self._k("presence", key), node_id)
+        pipe.delete(self._k("node_keys", node_id), self._k("alive", node_id))
+        pipe.srem(self._k("nodes"), node_id)
+        await pipe.execute()
+
+    async def nodes_for(self, connection_key: ConnectionKey) -> Set[str]:
+        members = await self.redis.smembers(self._k("presence", connection_key))
+        alive = await self._alive(members)
+        for dead in members - alive:
+            await self._forget_node(dead)
+        return alive
+
+    async def online_keys(self) -> Set[str]:
+        nodes = await self.redis.smembers(self._k("nodes"))
+        alive = await self._alive(nodes)
+        for dead in nodes - alive:
+            await self._forget_node(dead)
+        if not alive:
+            return set()
+        return await self.redis.sunion([self._k("node_keys", node_id) for node_id in alive])
+
+    # ---------- delivery ----------
+
+    async def publish(self, node_id: str, envelope: dict):
+        await self.redis.publish(self._k("node", node_id), json.dumps({**envelope, "origin": get_node_id()}))
+
+    async def publish_all(self, envelope: dict):
+        await self.redis.publish(self._k("all"), json.dumps({**envelope, "origin": get_node_id()}))
+
+
+def create_backplane(kind: Optional[str] = None):
+    """Backplane selected by WS_BACKPLANE (memory | redis)"""
+    kind = (kind or WS_BACKPLANE).lower()
+    if kind == "redis":
+        return RedisBackplane()
+    if kind != "memory":
+        print(f"[WS] Unknown WS_BACKPLANE '{kind}', using in-memory backplane")
+    return InMemoryBackplane()
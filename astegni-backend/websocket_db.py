@@ -0,0 +1,85 @@
+"""
+websocket_db.py - Per-message database access for the WebSocket endpoints in app.py
+
+The socket endpoints used to open a SessionLocal() on connect and close it
+when the socket closed. The first presence lookup checked out a connection and
+autobegin kept it "idle in transaction" for the lifetime of the socket - hours
+for an open chat tab - so a few dozen idle sockets exhausted the SQLAlchemy
+pool (pool_size 5 + max_overflow 10) and HTTP requests timed out waiting.
+
+socket_db() is opened around one unit of socket work (connect, disconnect,
+one message) instead:
+
+    with socket_db() as db:
+        await handle_video_call_message(message, connection_key, db)
+
+A Session checks out nothing until its first query, so messages that never
+touch the database cost no connection; a handler that does query holds one
+only until the block exits.
+
+get_socket_db_stats() is the gauge (/api/health/db-pools): connections held
+right now through socket_db(), the peak, how many messages needed one, and the
+SQLAlchemy pool it shares with HTTP requests.
+"""
+
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py modules'))
+
+from models import engine
+
+# Same settings as models.SessionLocal, with the gauge listeners below
+SocketSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+_lock = threading.Lock()
+_stats = {"held": 0, "peak": 0, "checkouts": 0, "sessions": 0}
+
+
+@event.listens_for(SocketSessionLocal, "after_begin")
+def _on_connection_checkout(session, transaction, connection):
+    if session.info.get("socket_db_holding"):
+        return
+    session.info["socket_db_holding"] = True
+    with _lock:
+        _stats["held"] += 1
+        _stats["checkouts"] += 1
+        _stats["peak"] = max(_stats["peak"], _stats["held"])
+
+
+@event.listens_for(SocketSessionLocal, "after_transaction_end")
+def _on_connection_release(session, transaction):
+    # Only the outermost transaction gives the connection back
+    if transaction.parent is None and session.info.pop("socket_db_holding", False):
+        with _lock:
+            _stats["held"] -= 1
+
+
+@contextmanager
+def socket_db():
+    """Session for one unit of WebSocket work; its connection (if any) is returned on exit"""
+    db = SocketSessionLocal()
+    with _lock:
+        _stats["sessions"] += 1
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_socket_db_stats() -> dict:
+    """Connections held by WebSocket handlers, and the shared SQLAlchemy pool"""
+    with _lock:
+        stats = dict(_stats)
+    pool = engine.pool
+    stats["engine_pool"] = {
+        "size": pool.size() if hasattr(pool, "size") else None,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+        "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+    }
+    return stats
@@ -10,11 +10,18 @@ Handles real-time chat, notifications, and live sessions
 
 from typing import Dict, List, Set, Union, Optional, Tuple
 from fastapi import WebSocket, WebSocketDisconnect, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime
 import json
 import asyncio
+import os
+import time
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from db_pool import async_connection
+from presence_service import PresenceService, PROFILE_TABLES
+from websocket_backplane import create_backplane, get_node_id
+from websocket_sender import ConnectionSender
 
 # Connection key type: can be string (profile-based) like "tutor_123" or int (legacy user_id)
 ConnectionKey = Union[str, int]
@@ -37,55 +44,81 @@ def parse_connection_key(connection_key: ConnectionKey) -> Tuple[Optional[str],
     return None, None
 
 
-def update_profile_online_status(db: Session, profile_type: str, profile_id: int, is_online: bool):
-    """
-    Update the is_online and last_seen fields in the profile table.
+# How long a user's presence audience (contacts) is reused across reconnects
+WS_CONTACTS_CACHE_TTL = int(os.getenv("WS_CONTACTS_CACHE_TTL", 300))
+_contacts_cache: Dict[int, Tuple[float, Set[int]]] = {}
 
-    Args:
-        db: Database session
-        profile_type: 'tutor', 'student', 'parent', or 'advertiser'
-        profile_id: The profile ID
-        is_online: Whether the user is online
-    """
-    table_map = {
-        "tutor": "tutor_profiles",
-        "student": "student_profiles",
-        "parent": "parent_profiles",
-        "advertiser": "advertiser_profiles"
-    }
 
-    table_name = table_map.get(profile_type)
-    if not table_name:
-        print(f"⚠️ Unknown profile type: {profile_type}")
-        return
+def get_connection_user_id(db: Session, connection_key: ConnectionKey) -> Optional[int]:
+    """users.id behind a connection key ("user_5", "tutor_12" or a legacy int user id)"""
+    if isinstance(connection_key, int):
+        return connection_key
+
+    profile_type, profile_id = parse_connection_key(connection_key)
+    if profile_type == "user":
+        return profile_id
+
+    table_name = PROFILE_TABLES.get(profile_type)
+    if not table_name or db is None:
+        return None
 
     try:
-        if is_online:
-            # Set online and update last_seen
-            db.execute(
-                text(f"""
-                    UPDATE {table_name}
-                    SET is_online = TRUE, last_seen = NOW()
-                    WHERE id = :profile_id
-                """),
-                {"profile_id": profile_id}
-            )
-        else:
-            # Set offline and update last_seen
-            db.execute(
-                text(f"""
-                    UPDATE {table_name}
-                    SET is_online = FALSE, last_seen = NOW()
-                    WHERE id = :profile_id
-                """),
-                {"profile_id": profile_id}
-            )
-        db.commit()
-        status = "online" if is_online else "offline"
-        print(f"📊 Updated {profile_type} {profile_id} status: {status}")
+        row = db.execute(
+            text(f"SELECT user_id FROM {table_name} WHERE id = :profile_id"),
+            {"profile_id": profile_id}
+        ).fetchone()
+        return row[0] if row else None
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Failed to resolve user for {connection_key}: {e}")
+        return None
+
+
+def get_contact_user_ids(db: Session, user_id: int) -> Optional[Set[int]]:
+    """
+    Users who should see this user's online/offline status: accepted connections,
+    chat conversation partners and tutor/student enrollments.
+    Returns None if the lookup fails (callers fall back to a full broadcast).
+    """
+    cached = _contacts_cache.get(user_id)
+    if cached and time.monotonic() - cached[0] < WS_CONTACTS_CACHE_TTL:
+        return cached[1]
+
+    try:
+        rows = db.execute(text("""
+            SELECT recipient_id FROM connections
+            WHERE requested_by = :user_id AND status = 'accepted'
+            UNION
+            SELECT requested_by FROM connections
+            WHERE recipient_id = :user_id AND status = 'accepted'
+            UNION
+            SELECT other.user_id
+            FROM conversation_participants mine
+            JOIN conversation_participants other
+              ON other.conversation_id = mine.conversation_id AND other.is_active = true
+            WHERE mine.user_id = :user_id AND mine.is_active = true
+            UNION
+            SELECT sp.user_id
+            FROM enrolled_students es
+            JOIN tutor_profiles tp ON tp.id = es.tutor_id
+            JOIN student_profiles sp ON sp.id = es.student_id
+            WHERE tp.user_id = :user_id
+            UNION
+            SELECT tp.user_id
+            FROM enrolled_students es
+            JOIN tutor_profiles tp ON tp.id = es.tutor_id
+            JOIN student_profiles sp ON sp.id = es.student_id
+            WHERE sp.user_id = :user_id
+        """), {"user_id": user_id}).fetchall()
     except Exception as e:
         db.rollback()
-        print(f"❌ Failed to update online status for {profile_type} {profile_id}: {e}")
+        print(f"❌ Failed to load contacts for user {user_id}: {e}")
+        return None
+
+    contacts = {row[0] for row in rows if row[0] is not None and row[0] != user_id}
+    _contacts_cache[user_id] = (time.monotonic(), contacts)
+    return contacts
+
 
 class ConnectionManager:
     """
@@ -94,11 +127,33 @@ class ConnectionManager:
     Connection keys can be:
     - Profile-based (string): "tutor_123", "student_456" for whiteboard video calls
     - User ID (int): Legacy support for chat and other features
+
+    active_connections only holds this worker's sockets. Messages for keys held by
+    other workers, cluster-wide presence and broadcasts go through the backplane
+    (websocket_backplane.py, WS_BACKPLANE=redis for multi-worker deployments).
+
+    Each socket is wrapped in a ConnectionSender (websocket_sender.py): sending
+    only enqueues, and a per-socket writer task does the actual write, so a slow
+    client never blocks delivery to anyone else.
     """
 
-    def __init__(self):
-        # Active connections by connection key (string or int)
-        self.active_connections: Dict[ConnectionKey, List[WebSocket]] = {}
+    def __init__(self, backplane=None):
+        # Active connections by connection key (string or int) - this worker only
+        self.active_connections: Dict[ConnectionKey, List[ConnectionSender]] = {}
+
+        # users.id behind each local connection key, and the reverse index
+        # (presence updates go to a user's contacts, not to everyone)
+        self.connection_users: Dict[ConnectionKey, int] = {}
+        self.user_connection_keys: Dict[int, Set[ConnectionKey]] = {}
+
+        # Cross-worker delivery and shared presence
+        self.backplane = backplane or create_backplane()
+
+        # Batched is_online/last_seen writes to the profile tables
+        self.presence = PresenceService()
+
+        # Deferred per-connection work (missed call notifications)
+        self._background_tasks: Set[asyncio.Task] = set()
 
         # Room-based connections (for group chats, live sessions)
         self.room_connections: Dict[str, Set[ConnectionKey]] = {}
@@ -106,22 +161,53 @@ class ConnectionManager:
         # Connection key to rooms mapping
         self.user_rooms: Dict[ConnectionKey, Set[str]] = {}
 
+    async def start(self):
+        """Start the backplane and presence flushing (app lifespan startup)"""
+        await self.backplane.start(self._on_backplane_message)
+        await self.presence.start()
+
+    async def stop(self):
+        """Flush presence, stop the backplane and drop this worker's presence (app lifespan shutdown)"""
+        for task in self._background_tasks:
+            task.cancel()
+        await self.presence.stop()
+        await self.backplane.stop()
+
+    async def _on_backplane_message(self, envelope: dict):
+        """Deliver a message published by another worker to local sockets"""
+        if envelope.get("type") == "direct":
+            await self._send_local(envelope["message"], envelope["key"])
+        elif envelope.get("type") == "broadcast":
+            self._broadcast_local(envelope["message"], envelope.get("exclude"))
+        elif envelope.get("type") == "users":
+            self._send_to_users_local(envelope["message"], envelope["users"], envelope.get("exclude"))
+
     async def connect(self, websocket: WebSocket, connection_key: ConnectionKey, db: Session = None):
         """Accept a new WebSocket connection and update online status in DB"""
         await websocket.accept()
 
         if connection_key not in self.active_connections:
             self.active_connections[connection_key] = []
+            await self.backplane.add_presence(connection_key)
 
-        self.active_connections[connection_key].append(websocket)
+        self.active_connections[connection_key].append(ConnectionSender(websocket, connection_key))
 
-        # Update online status in database (profile tables)
+        if db and connection_key not in self.connection_users:
+            user_id = await run_in_threadpool(get_connection_user_id, db, connection_key)
+            if user_id is not None:
+                self.connection_users[connection_key] = user_id
+                self.user_connection_keys.setdefault(user_id, set()).add(connection_key)
+
+        # Queue the online status for the profile tables (flushed in batches)
         if db:
             profile_type, profile_id = parse_connection_key(connection_key)
             if profile_type and profile_id:
-                update_profile_online_status(db, profile_type, profile_id, is_online=True)
-                # Broadcast online status to other connected users
-                await self.broadcast_online_status(profile_type, profile_id, is_online=True)
+                self.presence.mark(profile_type, profile_id, is_online=True)
+                # Tell the user's contacts they came online
+                await self.broadcast_online_status(
+                    profile_type, profile_id, is_online=True,
+                    contact_user_ids=await self._contacts_for(db, connection_key)
+                )
 
         # Send connection confirmation
         await self.send_personal_message(
@@ -129,36 +215,58 @@ class ConnectionManager:
             connection_key
         )
 
-        # Check for missed calls and notify user
+        # Check for missed calls after the handshake, off the connect path
         if db:
             profile_type, profile_id = parse_connection_key(connection_key)
             if profile_type and profile_id:
-                missed_calls = get_missed_calls_for_user(db, profile_type, profile_id)
-                if missed_calls:
-                    print(f"📞 User {connection_key} has {len(missed_calls)} missed call(s) - sending notification")
-                    await self.send_personal_message(
-                        {
-                            "type": "missed_calls_notification",
-                            "count": len(missed_calls),
-                            "calls": missed_calls
-                        },
-                        connection_key
-                    )
+                self._run_in_background(self._notify_missed_calls(connection_key, profile_type, profile_id))
 
         print(f"🔌 Connection {connection_key} established via WebSocket")
 
+    def _run_in_background(self, coro):
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _notify_missed_calls(self, connection_key: ConnectionKey, profile_type: str, profile_id: int):
+        missed_calls = await get_missed_calls_for_user(profile_type, profile_id)
+        if missed_calls:
+            print(f"📞 User {connection_key} has {len(missed_calls)} missed call(s) - sending notification")
+            await self.send_personal_message(
+                {
+                    "type": "missed_calls_notification",
+                    "count": len(missed_calls),
+                    "calls": missed_calls
+                },
+                connection_key
+            )
+
     async def disconnect(self, websocket: WebSocket, connection_key: ConnectionKey, db: Session = None):
         """Remove a WebSocket connection and update online status in DB"""
         should_mark_offline = False
+        contact_user_ids = None
 
         if connection_key in self.active_connections:
-            if websocket in self.active_connections[connection_key]:
-                self.active_connections[connection_key].remove(websocket)
+            senders = self.active_connections[connection_key]
+            for sender in [s for s in senders if s.websocket is websocket]:
+                await sender.stop()
+                senders.remove(sender)
 
             # Remove connection key if no more connections
-            if not self.active_connections[connection_key]:
+            if not senders:
                 del self.active_connections[connection_key]
-                should_mark_offline = True  # Only mark offline when last connection closes
+                await self.backplane.remove_presence(connection_key)
+                # Only mark offline when the last connection closes on every worker
+                should_mark_offline = not await self.backplane.nodes_for(connection_key)
+                if db:
+                    contact_user_ids = await self._contacts_for(db, connection_key)
+
+                user_id = self.connection_users.pop(connection_key, None)
+                if user_id is not None:
+                    keys = self.user_connection_keys.get(user_id, set())
+                    keys.discard(connection_key)
+                    if not keys:
+                        self.user_connection_keys.pop(user_id, None)
 
                 # Leave all rooms
                 if connection_key in self.user_rooms:
@@ -167,59 +275,124 @@ class ConnectionManager:
                             self.room_connections[room].discard(connection_key)
                     del self.user_rooms[connection_key]
 
-        # Update online status in database (profile tables)
+        # Queue the offline status for the profile tables (flushed in batches)
         if should_mark_offline and db:
             profile_type, profile_id = parse_connection_key(connection_key)
             if profile_type and profile_id:
-                update_profile_online_status(db, profile_type, profile_id, is_online=False)
-                # Broadcast offline status to other connected users
-                await self.broadcast_online_status(profile_type, profile_id, is_online=False)
+                self.presence.mark(profile_type, profile_id, is_online=False)
+                # Tell the user's contacts they went offline
+                await self.broadcast_online_status(
+                    profile_type, profile_id, is_online=False, contact_user_ids=contact_user_ids
+                )
 
         print(f"🔌 Connection {connection_key} disconnected from WebSocket")
 
     async def send_personal_message(self, message: dict, connection_key: ConnectionKey) -> bool:
         """
-        Send a message to a specific connection (by profile key or user ID).
+        Send a message to a specific connection (by profile key or user ID),
+        on this worker or any other.
         Returns True if message was sent, False if user is offline.
         """
-        if connection_key in self.active_connections:
-            message_text = json.dumps(message)
-
-            # Send to all connections of this key
-            sent = False
-            for connection in self.active_connections[connection_key]:
-                try:
-                    await connection.send_text(message_text)
-                    sent = True
-                except:
-                    # Remove dead connections
-                    self.active_connections[connection_key].remove(connection)
-            return sent
-        else:
-            print(f"⚠️ No active connection for {connection_key}")
-            print(f"📋 Active connections: {list(self.active_connections.keys())}")
-            return False
+        message_text = json.dumps(message)
+        sent = await self._send_local(message_text, connection_key)
 
-    def is_user_online(self, connection_key: ConnectionKey) -> bool:
-        """Check if a user is currently connected via WebSocket"""
-        return connection_key in self.active_connections and len(self.active_connections[connection_key]) > 0
-    
-    async def broadcast(self, message: dict, exclude_user: int = None):
-        """Broadcast a message to all connected users"""
+        # Same key may also be connected on other workers (second tab, other device)
+        if self.backplane.distributed:
+            remote_nodes = await self.backplane.nodes_for(connection_key) - {get_node_id()}
+            for node_id in remote_nodes:
+                await self.backplane.publish(node_id, {"type": "direct", "key": connection_key, "message": message_text})
+            sent = sent or bool(remote_nodes)
+
+        if not sent:
+            print(f"⚠️ No active connection for {connection_key}")
+        return sent
+
+    async def _send_local(self, message_text: str, connection_key: ConnectionKey) -> bool:
+        """Queue pre-serialized text on this worker's sockets for a connection key"""
+        sent = False
+        for sender in list(self.active_connections.get(connection_key, [])):
+            if await sender.send(message_text):
+                sent = True
+        return sent
+
+    async def reply(self, websocket: WebSocket, connection_key: ConnectionKey, message: dict):
+        """Send to one socket only (e.g. pong), through its queue"""
+        for sender in self.active_connections.get(connection_key, []):
+            if sender.websocket is websocket:
+                await sender.send(json.dumps(message))
+                return
+
+    async def is_user_online(self, connection_key: ConnectionKey) -> bool:
+        """Check if a user is currently connected via WebSocket on any worker"""
+        if self.active_connections.get(connection_key):
+            return True
+        if self.backplane.distributed:
+            return bool(await self.backplane.nodes_for(connection_key))
+        return False
+
+    async def get_online_keys(self) -> List[str]:
+        """Connection keys with at least one socket on any worker"""
+        if self.backplane.distributed:
+            return sorted(await self.backplane.online_keys())
+        return [str(key) for key in self.active_connections]
+
+    async def broadcast(self, message: dict, exclude_user: ConnectionKey = None):
+        """Broadcast a message to all connected users on every worker"""
         message_text = json.dumps(message)
+        self._broadcast_local(message_text, exclude_user)
+        if self.backplane.distributed:
+            await self.backplane.publish_all({"type": "broadcast", "exclude": exclude_user, "message": message_text})
+
+    def _broadcast_local(self, message_text: str, exclude_user: ConnectionKey = None):
+        """Best-effort enqueue on every local socket - never awaits a socket"""
+        for connection_key, senders in list(self.active_connections.items()):
+            if connection_key != exclude_user:
+                for sender in senders:
+                    sender.offer(message_text)
+
+    async def send_to_users(self, user_ids, message: dict, exclude_key: ConnectionKey = None):
+        """Best-effort delivery to every socket of the given users (users.id), on every worker"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        message_text = json.dumps(message)
+        self._send_to_users_local(message_text, user_ids, exclude_key)
+        if self.backplane.distributed:
+            await self.backplane.publish_all(
+                {"type": "users", "users": user_ids, "exclude": exclude_key, "message": message_text}
+            )
 
-        for user_id, connections in self.active_connections.items():
-            if user_id != exclude_user:
-                for connection in connections:
-                    try:
-                        await connection.send_text(message_text)
-                    except:
-                        # Remove dead connections
-                        connections.remove(connection)
+    def _send_to_users_local(self, message_text: str, user_ids, exclude_key: ConnectionKey = None):
+        for user_id in user_ids:
+            for connection_key in self.user_connection_keys.get(user_id, ()):
+                if connection_key != exclude_key:
+                    for sender in self.active_connections.get(connection_key, []):
+                        sender.offer(message_text)
+
+    async def _contacts_for(self, db: Session, connection_key: ConnectionKey) -> Optional[Set[int]]:
+        """Contacts of the user behind a key; cache misses query the DB in the threadpool"""
+        user_id = self.connection_users.get(connection_key)
+        if user_id is None:
+            return None
+        cached = _contacts_cache.get(user_id)
+        if cached and time.monotonic() - cached[0] < WS_CONTACTS_CACHE_TTL:
+            return cached[1]
+        return await run_in_threadpool(get_contact_user_ids, db, user_id)
+
+    def get_send_stats(self) -> dict:
+        """Queue depth and drops across this worker's sockets"""
+        senders = [sender for senders in self.active_connections.values() for sender in senders]
+        return {
+            "connections": len(senders),
+            "queued": sum(sender.queue.qsize() for sender in senders),
+            "dropped": sum(sender.dropped for sender in senders),
+        }
 
-    async def broadcast_online_status(self, profile_type: str, profile_id: int, is_online: bool):
+    async def broadcast_online_status(self, profile_type: str, profile_id: int, is_online: bool,
+                                      contact_user_ids: Optional[Set[int]] = None):
         """
-        Broadcast online/offline status to all connected users.
+        Broadcast online/offline status to the user's contacts (users.id), or to all
+        connected users when the contacts are unknown.
         Uses profile-based message format for frontend compatibility.
         """
         message = {
@@ -231,10 +404,14 @@ class ConnectionManager:
 
         # Don't send to the user who just came online/offline
         exclude_key = f"{profile_type}_{profile_id}"
-        await self.broadcast(message, exclude_user=exclude_key)
+        if contact_user_ids is None:
+            await self.broadcast(message, exclude_user=exclude_key)
+        else:
+            await self.send_to_users(contact_user_ids, message, exclude_key=exclude_key)
 
         status = "online" if is_online else "offline"
-        print(f"📡 Broadcast {profile_type} {profile_id} is now {status}")
+        audience = "everyone" if contact_user_ids is None else f"{len(contact_user_ids)} contacts"
+        print(f"📡 Broadcast {profile_type} {profile_id} is now {status} to {audience}")
 
     async def join_room(self, room_id: str, user_id: int):
         """Join a room for group communication"""
@@ -287,10 +464,6 @@ class ConnectionManager:
     def get_user_rooms(self, user_id: int) -> List[str]:
         """Get list of rooms a user is in"""
         return list(self.user_rooms.get(user_id, set()))
-    
-    def is_user_online(self, user_id: int) -> bool:
-        """Check if a user is online"""
-        return user_id in self.active_connections
 
 # Create global manager instance
 manager = ConnectionManager()
@@ -523,12 +696,11 @@ def get_profile_info(db: Session, profile_type: str, profile_id: int) -> dict:
     return None
 
 
-def get_missed_calls_for_user(db: Session, profile_type: str, profile_id: int) -> list:
+async def get_missed_calls_for_user(profile_type: str, profile_id: int) -> list:
     """
-    Get unseen missed calls for a user.
+    Get unseen missed calls for a user (async pool - called after the WebSocket handshake).
 
     Args:
-        db: Database session
         profile_type: 'tutor', 'student', 'parent', or 'advertiser'
         profile_id: The profile ID
 
@@ -536,25 +708,27 @@ def get_missed_calls_for_user(db: Session, profile_type: str, profile_id: int) -
         List of missed call records
     """
     try:
-        result = db.execute(
-            text("""
+        async with async_connection("user") as conn:
+            cur = await conn.execute(
+                """
                 SELECT
                     id, caller_profile_id, caller_profile_type, caller_name, caller_avatar,
                     callee_profile_id, callee_profile_type, callee_name, callee_avatar,
                     status, tutor_package_name, initiated_at
                 FROM whiteboard_call_history
-                WHERE callee_profile_id = :profile_id
-                AND callee_profile_type = :profile_type
+                WHERE callee_profile_id = %(profile_id)s
+                AND callee_profile_type = %(profile_type)s
                 AND callee_seen = FALSE
                 AND status IN ('offline', 'missed', 'no_answer')
                 ORDER BY initiated_at DESC
                 LIMIT 10
-            """),
-            {"profile_id": profile_id, "profile_type": profile_type}
-        )
+                """,
+                {"profile_id": profile_id, "profile_type": profile_type}
+            )
+            rows = await cur.fetchall()
 
         missed_calls = []
-        for row in result.fetchall():
+        for row in rows:
             missed_calls.append({
                 "id": row[0],
                 "caller_profile_id": row[1],
@@ -636,7 +810,7 @@ async def handle_video_call_message(data: dict, sender_key: str, db: Session = N
 
     if message_type == "video_call_invitation":
         # Check if recipient is online before sending invitation
-        is_recipient_online = manager.is_user_online(recipient_key)
+        is_recipient_online = await manager.is_user_online(recipient_key)
 
         if not is_recipient_online:
             print(f"📞 Recipient {recipient_key} is OFFLINE - storing missed call and notifying caller")
@@ -791,7 +965,7 @@ async def handle_video_call_message(data: dict, sender_key: str, db: Session = N
         print(f"📞 Chat call invitation: {data.get('call_type')} from {sender_key} to {recipient_key}")
 
         # Check if recipient is online
-        is_recipient_online = manager.is_user_online(recipient_key)
+        is_recipient_online = await manager.is_user_online(recipient_key)
 
         if not is_recipient_online:
             # Recipient is offline - notify caller
@@ -855,13 +1029,16 @@ async def handle_video_call_message(data: dict, sender_key: str, db: Session = N
         print(f"⚠️ Unknown video call message type: {message_type}")
 
 
-def get_online_users_from_db(db: Session, profile_types: list = None) -> list:
+def get_online_users_from_db(db: Session, online_keys, profile_types: list = None) -> list:
     """
-    Query the profile tables for online users.
+    Look up names and avatars for the online profiles.
+    Who is online comes from the connection manager (online_keys), not from
+    profile_tables.is_online, which is only flushed every few seconds.
     Joins with users table to get the full name (first_name + father_name).
 
     Args:
         db: Database session
+        online_keys: Connection keys online anywhere in the cluster (manager.get_online_keys())
         profile_types: List of profile types to query (e.g., ['tutor', 'student'])
                       If None, queries all profile types
 
@@ -871,18 +1048,17 @@ def get_online_users_from_db(db: Session, profile_types: list = None) -> list:
     if profile_types is None:
         profile_types = ['tutor', 'student', 'parent', 'advertiser']
 
-    # Profile tables - all have user_id FK to users table and profile_picture
-    profile_tables = {
-        'tutor': 'tutor_profiles',
-        'student': 'student_profiles',
-        'parent': 'parent_profiles',
-        'advertiser': 'advertiser_profiles'
-    }
+    online_ids: Dict[str, List[int]] = {}
+    for key in online_keys:
+        profile_type, profile_id = parse_connection_key(key)
+        if profile_type in profile_types:
+            online_ids.setdefault(profile_type, []).append(profile_id)
 
     online_users = []
 
-    for profile_type in profile_types:
-        table_name = profile_tables.get(profile_type)
+    for profile_type, profile_ids in online_ids.items():
+        # Profile tables - all have user_id FK to users table and profile_picture
+        table_name = PROFILE_TABLES.get(profile_type)
         if not table_name:
             continue
 
@@ -900,8 +1076,9 @@ def get_online_users_from_db(db: Session, profile_types: list = None) -> list:
                         p.profile_picture
                     FROM {table_name} p
                     LEFT JOIN users u ON p.user_id = u.id
-                    WHERE p.is_online = TRUE
-                """)
+                    WHERE p.id = ANY(:profile_ids)
+                """),
+                {"profile_ids": profile_ids}
             )
 
             for row in result.fetchall():
@@ -914,6 +1091,7 @@ def get_online_users_from_db(db: Session, profile_types: list = None) -> list:
                     'is_online': True
                 })
         except Exception as e:
+            db.rollback()
             print(f"❌ Error querying online {profile_type}s: {e}")
 
     return online_users
@@ -928,7 +1106,8 @@ async def handle_get_online_users(db: Session, sender_key: str, profile_types: l
         sender_key: The sender's connection key
         profile_types: Optional list of profile types to filter
     """
-    online_users = get_online_users_from_db(db, profile_types)
+    online_keys = await manager.get_online_keys()
+    online_users = get_online_users_from_db(db, online_keys, profile_types)
 
     # Send the list back to the requester
     await manager.send_personal_message({
@@ -0,0 +1,108 @@
+"""
+websocket_sender.py - Per-connection outbound queues for websocket_manager.ConnectionManager
+
+Every WebSocket gets a bounded queue drained by its own writer task, so the
+code that produces a message never awaits a socket write. One slow client
+fills its own queue instead of stalling everybody else's deliveries.
+
+Two ways to enqueue:
+    offer(text)  best-effort (broadcasts, presence) - dropped when the queue is full
+    send(text)   must-deliver (chat, call signaling) - waits up to
+                 WS_BACKPRESSURE_TIMEOUT for space, then applies WS_SLOW_CONSUMER_POLICY:
+                     close  close the socket (1013 try again later); the client reconnects
+                     drop   drop the message and keep the socket
+
+A write that takes longer than WS_SEND_TIMEOUT or fails marks the sender
+closed and closes the socket; ConnectionManager.disconnect does the cleanup
+when the receive loop ends.
+"""
+
+import asyncio
+import os
+
+from fastapi import WebSocket
+
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", 256))
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", 10))
+WS_BACKPRESSURE_TIMEOUT = float(os.getenv("WS_BACKPRESSURE_TIMEOUT", 2))
+WS_SLOW_CONSUMER_POLICY = os.getenv("WS_SLOW_CONSUMER_POLICY", "close").lower()
+
+# RFC 6455 "Try Again Later"
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class ConnectionSender:
+    """Bounded outbound queue and writer task for one WebSocket"""
+
+    def __init__(self, websocket: WebSocket, connection_key, queue_size: int = WS_SEND_QUEUE_SIZE):
+        self.websocket = websocket
+        self.connection_key = connection_key
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.closed = False
+        self._writer_task = asyncio.create_task(self._writer())
+
+    def offer(self, message_text: str) -> bool:
+        """Best-effort enqueue; drops the message if this client is behind"""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message_text)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def send(self, message_text: str) -> bool:
+        """Enqueue a message that should not be dropped, waiting briefly for space"""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message_text)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        try:
+            await asyncio.wait_for(self.queue.put(message_text), WS_BACKPRESSURE_TIMEOUT)
+            return True
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            if WS_SLOW_CONSUMER_POLICY == "close":
+                print(f"🐢 Closing slow WebSocket consumer {self.connection_key} "
+                      f"({self.queue.qsize()} queued, {self.dropped} dropped)")
+                await self.close(SLOW_CONSUMER_CLOSE_CODE)
+            return False
+
+    async def _writer(self):
+        try:
+            while True:
+                message_text = await self.queue.get()
+                await asyncio.wait_for(self.websocket.send_text(message_text), WS_SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # Dead or stuck socket
+            await self.close()
+
+    async def close(self, code: int = 1000):
+        """Stop writing and close the socket (idempotent)"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._writer_task is not asyncio.current_task():
+            self._writer_task.cancel()
+        try:
+            await self.websocket.close(code)
+        except Exception:
+            pass
+
+    async def stop(self):
+        """Stop the writer after the socket is already gone (disconnect path)"""
+        self.closed = True
+        self._writer_task.cancel()
+        if self._writer_task is not asyncio.current_task():
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
@@ -22,41 +22,23 @@ from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 import psycopg
+from db_pool import pooled_connect
+from auth import get_current_user_claims
 import os
-import jwt
-from jwt.exceptions import PyJWTError
 from dotenv import load_dotenv
 
 load_dotenv()
 
 router = APIRouter()
 
-# JWT Configuration
-SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
-ALGORITHM = "HS256"
 
 def get_db_connection():
     """Get database connection"""
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise Exception("DATABASE_URL not found in environment variables")
-    return psycopg.connect(database_url)
+    return pooled_connect(database_url)
 
-def get_current_user(authorization: str):
-    """Extract user from JWT token"""
-    try:
-        token = authorization.replace("Bearer ", "").strip()
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {
-            "id": int(user_id),
-            "roles": payload.get("roles", []),
-            "active_role": payload.get("role")
-        }
-    except (PyJWTError, ValueError):
-        raise HTTPException(status_code=401, detail="Could not validate credentials")
 
 # ============================================
 # PYDANTIC MODELS
@@ -125,10 +107,10 @@ def calculate_active_seconds(connected_at: datetime, last_activity_at: datetime)
 # ============================================
 
 @router.post("/api/whiteboard/sessions/{session_id}/connect")
-async def mark_user_connected(
+def mark_user_connected(
     session_id: int,
     event: ConnectionEvent,
-    authorization: str = Depends(lambda auth: auth)
+    current_user: dict = Depends(get_current_user_claims)
 ):
     """
     Mark a user as connected to the whiteboard session.
@@ -136,7 +118,6 @@ async def mark_user_connected(
 
     This is the PRIMARY indicator of attendance - connection = presence.
     """
-    current_user = get_current_user(authorization)
     user_id = event.user_id or current_user["id"]
     user_type = event.user_type.lower()
 
@@ -230,10 +211,10 @@ async def mark_user_connected(
 
 
 @router.post("/api/whiteboard/sessions/{session_id}/disconnect")
-async def mark_user_disconnected(
+def mark_user_disconnected(
     session_id: int,
     event: ConnectionEvent,
-    authorization: str = Depends(lambda auth: auth)
+    current_user: dict = Depends(get_current_user_claims)
 ):
     """
     Mark a user as disconnected from the whiteboard session.
@@ -241,7 +222,6 @@ async def mark_user_disconnected(
 
     Also calculates total active time based on last_activity timestamp.
     """
-    current_user = get_current_user(authorization)
     user_id = event.user_id or current_user["id"]
     user_type = event.user_type.lower()
 
@@ -331,10 +311,10 @@ async def mark_user_disconnected(
 
 
 @router.post("/api/whiteboard/sessions/{session_id}/heartbeat")
-async def update_heartbeat(
+def update_heartbeat(
     session_id: int,
     event: HeartbeatEvent,
-    authorization: str = Depends(lambda auth: auth)
+    current_user: dict = Depends(get_current_user_claims)
 ):
     """
     Update user's last activity timestamp.
@@ -342,7 +322,6 @@ async def update_heartbeat(
 
     This tracks active engagement vs. idle connection.
     """
-    current_user = get_current_user(authorization)
     user_id = event.user_id or current_user["id"]
     user_type = event.user_type.lower()
 
@@ -406,9 +385,9 @@ async def update_heartbeat(
 
 
 @router.get("/api/whiteboard/sessions/{session_id}/connection-status", response_model=ConnectionStatusResponse)
-async def get_connection_status(
+def get_connection_status(
     session_id: int,
-    authorization: str = Depends(lambda auth: auth)
+    current_user: dict = Depends(get_current_user_claims)
 ):
     """
     Get real-time connection status for a whiteboard session.
@@ -419,7 +398,6 @@ async def get_connection_status(
     - Session analytics
     - Attendance suggestion preparation
     """
-    current_user = get_current_user(authorization)
 
     conn = get_db_connection()
     try:
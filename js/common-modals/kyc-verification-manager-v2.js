@@ -922,7 +922,6 @@ class KYCVerificationManager {
 
         try {
             // Upload selfie with liveliness frames
-            let token = localStorage.getItem('token') || localStorage.getItem('access_token');
             const formData = new FormData();
             formData.append('verification_id', this.verificationId);
             formData.append('image_data', this.selfieImage);
@@ -934,31 +933,12 @@ class KYCVerificationManager {
                 liveliness_frames: this.livelinessFrames.length
             });
 
-            let response = await fetch(`${window.API_BASE_URL || 'http://localhost:8000'}${window.KYC_API_BASE || '/api/kyc'}/upload-selfie`, {
-                method: 'POST',
-                headers: {
-                    'Authorization': `Bearer ${token}`
-                },
-                body: formData
-            });
-
-            // If 401, try to refresh token and retry
-            if (response.status === 401) {
-                kycDebug('Token expired during selfie upload, refreshing', 'warn');
-                const refreshed = await this.refreshToken();
-                if (refreshed) {
-                    token = localStorage.getItem('token') || localStorage.getItem('access_token');
-                    response = await fetch(`${window.API_BASE_URL || 'http://localhost:8000'}${window.KYC_API_BASE || '/api/kyc'}/upload-selfie`, {
-                        method: 'POST',
-                        headers: {
-                            'Authorization': `Bearer ${token}`
-                        },
-                        body: formData
-                    });
-                }
-            }
-
-            const data = await response.json();
+            // The user KYC API processes the selfie in the background (POST /selfie-jobs,
+            // then poll); other KYC bases (advertiser) still answer synchronously.
+            const selfieJobs = !window.KYC_API_BASE || window.KYC_API_BASE === '/api/kyc';
+            const { response, data } = selfieJobs
+                ? await this.runSelfieJob(formData)
+                : await this.postSelfie('upload-selfie', formData);
             kycDebug(`Selfie upload response: HTTP ${response.status}`, response.ok ? 'ok' : 'err', {
                 status: data.status,
                 face_match_passed: data.face_match_passed,
@@ -1013,6 +993,80 @@ class KYCVerificationManager {
         }
     }
 
+    /**
+     * POST the selfie form to {KYC base}/{path}, refreshing the token once on 401
+     */
+    async postSelfie(path, formData) {
+        const url = `${window.API_BASE_URL || 'http://localhost:8000'}${window.KYC_API_BASE || '/api/kyc'}/${path}`;
+        let token = localStorage.getItem('token') || localStorage.getItem('access_token');
+        let response = await fetch(url, {
+            method: 'POST',
+            headers: {
+                'Authorization': `Bearer ${token}`
+            },
+            body: formData
+        });
+
+        // If 401, try to refresh token and retry
+        if (response.status === 401) {
+            kycDebug('Token expired during selfie upload, refreshing', 'warn');
+            const refreshed = await this.refreshToken();
+            if (refreshed) {
+                token = localStorage.getItem('token') || localStorage.getItem('access_token');
+                response = await fetch(url, {
+                    method: 'POST',
+                    headers: {
+                        'Authorization': `Bearer ${token}`
+                    },
+                    body: formData
+                });
+            }
+        }
+
+        return { response, data: await response.json() };
+    }
+
+    /**
+     * Queue the selfie as a background job and poll until it finishes.
+     * Resolves like postSelfie('upload-selfie') would: { response, data }.
+     */
+    async runSelfieJob(formData) {
+        const queued = await this.postSelfie('selfie-jobs', formData);
+        if (!queued.response.ok) {
+            return queued;
+        }
+
+        const jobId = queued.data.job_id;
+        const url = `${window.API_BASE_URL || 'http://localhost:8000'}${window.KYC_API_BASE || '/api/kyc'}/selfie-jobs/${jobId}`;
+        kycDebug(`Selfie job ${jobId} queued, waiting for the result`, 'info');
+
+        const deadline = Date.now() + 5 * 60 * 1000;
+        while (Date.now() < deadline) {
+            await new Promise(resolve => setTimeout(resolve, 1000));
+
+            const token = localStorage.getItem('token') || localStorage.getItem('access_token');
+            const response = await fetch(url, {
+                headers: {
+                    'Authorization': `Bearer ${token}`
+                }
+            });
+            if (response.status === 401 && await this.refreshToken()) {
+                continue;
+            }
+
+            const data = await response.json();
+            if (!response.ok || data.job_status === 'done') {
+                kycDebug(`Selfie job ${jobId}: ${data.job_status || response.status}`, 'info', data.timings || null);
+                return { response, data };
+            }
+            if (data.job_status === 'failed' || data.job_status === 'error') {
+                return { response: { ok: false, status: data.job_status === 'failed' ? 400 : 500 }, data };
+            }
+        }
+
+        throw new Error('Verification is taking longer than expected. Please check your status again shortly.');
+    }
+
     /**
      * Show verification success result
      */